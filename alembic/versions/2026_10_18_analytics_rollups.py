@@ -0,0 +1,71 @@
+"""Add analytics_rollups / analytics_rollup_watermarks for pre-aggregated dashboards.
+
+Revision ID: 2026_10_18_analytics_rollups
+Revises: 2026_10_18_member_sync_hash
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = "2026_10_18_analytics_rollups"
+down_revision = "2026_10_18_member_sync_hash"
+branch_labels = None
+depends_on = None
+
+_COUNTERS = (
+    "count", "escalated", "unresolved", "rating_count",
+    "rating_1", "rating_2", "rating_3", "rating_4", "rating_5",
+    "promoters", "detractors", "message_count_n", "message_count_sum",
+    "confidence_count", "confidence_high", "confidence_mid", "confidence_low_mid", "confidence_low",
+)
+
+
+def _table_exists(name: str) -> bool:
+    return name in inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    if not _table_exists("analytics_rollups"):
+        op.create_table(
+            "analytics_rollups",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("tenant_id", sa.Integer(), nullable=True),
+            sa.Column("source", sa.String(16), nullable=False),
+            sa.Column("granularity", sa.String(8), nullable=False),
+            sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("channel", sa.String(64), nullable=False, server_default="unknown"),
+            sa.Column("intent", sa.String(128), nullable=False, server_default=""),
+            sa.Column("agent", sa.String(64), nullable=False, server_default=""),
+            sa.Column("escalation_reason", sa.String(128), nullable=False, server_default=""),
+            *(sa.Column(name, sa.Integer(), nullable=False, server_default="0") for name in _COUNTERS),
+            sa.Column("rating_sum", sa.Float(), nullable=False, server_default="0"),
+            sa.Column("confidence_sum", sa.Float(), nullable=False, server_default="0"),
+            sa.UniqueConstraint(
+                "tenant_id", "source", "granularity", "bucket_start",
+                "channel", "intent", "agent", "escalation_reason",
+                name="uq_analytics_rollup_bucket",
+            ),
+        )
+        op.create_index("ix_analytics_rollups_id", "analytics_rollups", ["id"])
+        op.create_index("ix_analytics_rollups_tenant_id", "analytics_rollups", ["tenant_id"])
+        op.create_index("ix_analytics_rollups_bucket_start", "analytics_rollups", ["bucket_start"])
+    if not _table_exists("analytics_rollup_watermarks"):
+        op.create_table(
+            "analytics_rollup_watermarks",
+            sa.Column("source", sa.String(16), primary_key=True),
+            sa.Column("last_id", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    if _table_exists("analytics_rollup_watermarks"):
+        op.drop_table("analytics_rollup_watermarks")
+    if _table_exists("analytics_rollups"):
+        op.drop_index("ix_analytics_rollups_bucket_start", table_name="analytics_rollups")
+        op.drop_index("ix_analytics_rollups_tenant_id", table_name="analytics_rollups")
+        op.drop_index("ix_analytics_rollups_id", table_name="analytics_rollups")
+        op.drop_table("analytics_rollups")
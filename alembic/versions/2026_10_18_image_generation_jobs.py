@@ -0,0 +1,52 @@
+"""Add image_generation_jobs for queued AI image generation with credit reservation.
+
+Revision ID: 2026_10_18_image_generation_jobs
+Revises: 2026_10_18_media_content_hash
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = "2026_10_18_image_generation_jobs"
+down_revision = "2026_10_18_media_content_hash"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(name: str) -> bool:
+    return name in inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    if _table_exists("image_generation_jobs"):
+        return
+    op.create_table(
+        "image_generation_jobs",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("tenant_id", sa.Integer(), sa.ForeignKey("tenants.id"), nullable=False),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("kind", sa.String(16), nullable=False, server_default="generate"),
+        sa.Column("status", sa.String(16), nullable=False, server_default="queued"),
+        sa.Column("stage", sa.String(32), nullable=True),
+        sa.Column("progress", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("request", sa.JSON(), nullable=False),
+        sa.Column("source_asset_id", sa.Integer(), sa.ForeignKey("media_assets.id"), nullable=True),
+        sa.Column("credits_reserved", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("credit_state", sa.String(16), nullable=False, server_default="reserved"),
+        sa.Column("asset_id", sa.Integer(), sa.ForeignKey("media_assets.id"), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_image_generation_jobs_tenant_status", "image_generation_jobs", ["tenant_id", "status"])
+    op.create_index("ix_image_generation_jobs_tenant_created", "image_generation_jobs", ["tenant_id", "created_at"])
+
+
+def downgrade() -> None:
+    if _table_exists("image_generation_jobs"):
+        op.drop_table("image_generation_jobs")
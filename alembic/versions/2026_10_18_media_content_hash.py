@@ -0,0 +1,51 @@
+"""Add media_assets.content_sha256 / derivatives for upload dedup and thumbnails.
+
+Revision ID: 2026_10_18_media_content_hash
+Revises: 2026_10_18_stripe_mirror
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = "2026_10_18_media_content_hash"
+down_revision = "2026_10_18_stripe_mirror"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(name: str) -> bool:
+    return name in inspect(op.get_bind()).get_table_names()
+
+
+def _column_exists(table: str, column: str) -> bool:
+    cols = [c["name"] for c in inspect(op.get_bind()).get_columns(table)]
+    return column in cols
+
+
+def _index_exists(table: str, name: str) -> bool:
+    return name in [i["name"] for i in inspect(op.get_bind()).get_indexes(table)]
+
+
+def upgrade() -> None:
+    if not _table_exists("media_assets"):
+        return
+    if not _column_exists("media_assets", "content_sha256"):
+        op.add_column("media_assets", sa.Column("content_sha256", sa.String(64), nullable=True))
+    if not _column_exists("media_assets", "derivatives"):
+        op.add_column("media_assets", sa.Column("derivatives", sa.JSON(), nullable=True))
+    if not _index_exists("media_assets", "ix_media_assets_tenant_sha256"):
+        op.create_index("ix_media_assets_tenant_sha256", "media_assets", ["tenant_id", "content_sha256"])
+
+
+def downgrade() -> None:
+    if not _table_exists("media_assets"):
+        return
+    if _index_exists("media_assets", "ix_media_assets_tenant_sha256"):
+        op.drop_index("ix_media_assets_tenant_sha256", table_name="media_assets")
+    if _column_exists("media_assets", "derivatives"):
+        op.drop_column("media_assets", "derivatives")
+    if _column_exists("media_assets", "content_sha256"):
+        op.drop_column("media_assets", "content_sha256")
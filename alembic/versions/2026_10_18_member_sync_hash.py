@@ -0,0 +1,43 @@
+"""Add studio_members.sync_hash / contract_synced_at for incremental Magicline sync.
+
+Revision ID: 2026_10_18_member_sync_hash
+Revises: b3c4d5e6f7a8
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = "2026_10_18_member_sync_hash"
+down_revision = "b3c4d5e6f7a8"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(name: str) -> bool:
+    return name in inspect(op.get_bind()).get_table_names()
+
+
+def _column_exists(table: str, column: str) -> bool:
+    cols = [c["name"] for c in inspect(op.get_bind()).get_columns(table)]
+    return column in cols
+
+
+def upgrade() -> None:
+    if not _table_exists("studio_members"):
+        return
+    if not _column_exists("studio_members", "sync_hash"):
+        op.add_column("studio_members", sa.Column("sync_hash", sa.String(64), nullable=True))
+    if not _column_exists("studio_members", "contract_synced_at"):
+        op.add_column("studio_members", sa.Column("contract_synced_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    if not _table_exists("studio_members"):
+        return
+    if _column_exists("studio_members", "contract_synced_at"):
+        op.drop_column("studio_members", "contract_synced_at")
+    if _column_exists("studio_members", "sync_hash"):
+        op.drop_column("studio_members", "sync_hash")
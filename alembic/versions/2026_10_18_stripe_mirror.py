@@ -0,0 +1,95 @@
+"""Add billing_stripe_subscriptions / billing_stripe_invoices / billing_stripe_sync_cursors.
+
+Local mirror of Stripe billing data for the admin revenue dashboard.
+
+Revision ID: 2026_10_18_stripe_mirror
+Revises: 2026_10_18_analytics_rollups
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = "2026_10_18_stripe_mirror"
+down_revision = "2026_10_18_analytics_rollups"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(name: str) -> bool:
+    return name in inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    if not _table_exists("billing_stripe_subscriptions"):
+        op.create_table(
+            "billing_stripe_subscriptions",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("stripe_subscription_id", sa.String(100), nullable=False),
+            sa.Column("stripe_customer_id", sa.String(100), nullable=True),
+            sa.Column("tenant_id", sa.Integer(), nullable=True),
+            sa.Column("status", sa.String(30), nullable=False),
+            sa.Column("currency", sa.String(3), nullable=True),
+            sa.Column("mrr_cents", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("cancel_at_period_end", sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column("stripe_created_at", sa.DateTime(), nullable=True),
+            sa.Column("source_updated_at", sa.DateTime(), nullable=False),
+            sa.Column("synced_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_billing_stripe_subscriptions_id", "billing_stripe_subscriptions", ["id"])
+        op.create_index(
+            "ix_billing_stripe_subscriptions_stripe_subscription_id",
+            "billing_stripe_subscriptions", ["stripe_subscription_id"], unique=True,
+        )
+        op.create_index(
+            "ix_billing_stripe_subscriptions_stripe_customer_id",
+            "billing_stripe_subscriptions", ["stripe_customer_id"],
+        )
+        op.create_index("ix_billing_stripe_subscriptions_tenant_id", "billing_stripe_subscriptions", ["tenant_id"])
+        op.create_index("ix_stripe_sub_mirror_status", "billing_stripe_subscriptions", ["status"])
+
+    if not _table_exists("billing_stripe_invoices"):
+        op.create_table(
+            "billing_stripe_invoices",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("stripe_invoice_id", sa.String(100), nullable=False),
+            sa.Column("stripe_customer_id", sa.String(100), nullable=True),
+            sa.Column("stripe_subscription_id", sa.String(100), nullable=True),
+            sa.Column("tenant_id", sa.Integer(), nullable=True),
+            sa.Column("status", sa.String(20), nullable=False),
+            sa.Column("currency", sa.String(3), nullable=False, server_default="eur"),
+            sa.Column("amount_due_cents", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("amount_paid_cents", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("stripe_created_at", sa.DateTime(), nullable=False),
+            sa.Column("paid_at", sa.DateTime(), nullable=True),
+            sa.Column("source_updated_at", sa.DateTime(), nullable=False),
+            sa.Column("synced_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_billing_stripe_invoices_id", "billing_stripe_invoices", ["id"])
+        op.create_index(
+            "ix_billing_stripe_invoices_stripe_invoice_id",
+            "billing_stripe_invoices", ["stripe_invoice_id"], unique=True,
+        )
+        op.create_index("ix_billing_stripe_invoices_stripe_customer_id", "billing_stripe_invoices", ["stripe_customer_id"])
+        op.create_index("ix_billing_stripe_invoices_tenant_id", "billing_stripe_invoices", ["tenant_id"])
+        op.create_index(
+            "ix_stripe_invoice_mirror_status_created",
+            "billing_stripe_invoices", ["status", "stripe_created_at"],
+        )
+
+    if not _table_exists("billing_stripe_sync_cursors"):
+        op.create_table(
+            "billing_stripe_sync_cursors",
+            sa.Column("resource", sa.String(30), primary_key=True),
+            sa.Column("starting_after", sa.String(100), nullable=True),
+            sa.Column("pass_started_at", sa.DateTime(), nullable=True),
+            sa.Column("last_completed_at", sa.DateTime(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    for table in ("billing_stripe_sync_cursors", "billing_stripe_invoices", "billing_stripe_subscriptions"):
+        if _table_exists(table):
+            op.drop_table(table)
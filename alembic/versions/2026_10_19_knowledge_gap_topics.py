@@ -0,0 +1,53 @@
+"""Add knowledge_gap_topics for aggregated Ghost Mode knowledge-gap counters.
+
+Revision ID: 2026_10_19_knowledge_gap_topics
+Revises: 2026_10_19_librarian_jobs
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = "2026_10_19_knowledge_gap_topics"
+down_revision = "2026_10_19_librarian_jobs"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(name: str) -> bool:
+    return name in inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    if _table_exists("knowledge_gap_topics"):
+        return
+    op.create_table(
+        "knowledge_gap_topics",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("tenant_id", sa.Integer(), nullable=True),
+        sa.Column("topic_key", sa.String(200), nullable=False),
+        sa.Column("category", sa.String(32), nullable=False, server_default="unknown"),
+        sa.Column("topic", sa.String(200), nullable=False, server_default=""),
+        sa.Column("occurrences", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("confidence_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("max_confidence", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("sample_query", sa.Text(), nullable=True),
+        sa.Column("sample_response", sa.Text(), nullable=True),
+        sa.Column("conversation_id", sa.String(), nullable=True),
+        sa.Column("first_seen", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_seen", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("resolved", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.UniqueConstraint("tenant_id", "topic_key", name="uq_knowledge_gap_topic"),
+    )
+    op.create_index("ix_knowledge_gap_topics_id", "knowledge_gap_topics", ["id"])
+    op.create_index("ix_knowledge_gap_topics_tenant_id", "knowledge_gap_topics", ["tenant_id"])
+    op.create_index("ix_knowledge_gap_topics_last_seen", "knowledge_gap_topics", ["last_seen"])
+
+
+def downgrade() -> None:
+    if _table_exists("knowledge_gap_topics"):
+        for column in ("last_seen", "tenant_id", "id"):
+            op.drop_index(f"ix_knowledge_gap_topics_{column}", table_name="knowledge_gap_topics")
+        op.drop_table("knowledge_gap_topics")
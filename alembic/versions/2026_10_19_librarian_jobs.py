@@ -0,0 +1,50 @@
+"""Add librarian_jobs to persist librarian archival job state.
+
+Revision ID: 2026_10_19_librarian_jobs
+Revises: 2026_10_19_member_memory_watermarks
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = "2026_10_19_librarian_jobs"
+down_revision = "2026_10_19_member_memory_watermarks"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(name: str) -> bool:
+    return name in inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    if _table_exists("librarian_jobs"):
+        return
+    op.create_table(
+        "librarian_jobs",
+        sa.Column("job_id", sa.String(32), primary_key=True),
+        sa.Column("tenant_id", sa.Integer(), nullable=True),
+        sa.Column("member_id", sa.String(), nullable=False),
+        sa.Column("session_id", sa.String(), nullable=True),
+        sa.Column("chat_session_id", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(16), nullable=False, server_default="pending"),
+        sa.Column("retry_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_librarian_jobs_tenant_id", "librarian_jobs", ["tenant_id"])
+    op.create_index("ix_librarian_jobs_chat_session_id", "librarian_jobs", ["chat_session_id"])
+    op.create_index("ix_librarian_jobs_status", "librarian_jobs", ["status"])
+    op.create_index("ix_librarian_jobs_created_at", "librarian_jobs", ["created_at"])
+
+
+def downgrade() -> None:
+    if _table_exists("librarian_jobs"):
+        for column in ("created_at", "status", "chat_session_id", "tenant_id"):
+            op.drop_index(f"ix_librarian_jobs_{column}", table_name="librarian_jobs")
+        op.drop_table("librarian_jobs")
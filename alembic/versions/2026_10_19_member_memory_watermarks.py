@@ -0,0 +1,44 @@
+"""Add member_memory_watermarks for incremental member memory analysis.
+
+Revision ID: 2026_10_19_member_memory_watermarks
+Revises: 2026_10_18_image_generation_jobs
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = "2026_10_19_member_memory_watermarks"
+down_revision = "2026_10_18_image_generation_jobs"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(name: str) -> bool:
+    return name in inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    if _table_exists("member_memory_watermarks"):
+        return
+    op.create_table(
+        "member_memory_watermarks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("tenant_id", sa.Integer(), nullable=True),
+        sa.Column("member_id", sa.String(64), nullable=False),
+        sa.Column("last_message_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("input_hash", sa.String(64), nullable=False, server_default=""),
+        sa.Column("analyzed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("tenant_id", "member_id", name="uq_member_memory_watermark"),
+    )
+    op.create_index("ix_member_memory_watermarks_id", "member_memory_watermarks", ["id"])
+    op.create_index("ix_member_memory_watermarks_tenant_id", "member_memory_watermarks", ["tenant_id"])
+
+
+def downgrade() -> None:
+    if _table_exists("member_memory_watermarks"):
+        op.drop_index("ix_member_memory_watermarks_tenant_id", table_name="member_memory_watermarks")
+        op.drop_index("ix_member_memory_watermarks_id", table_name="member_memory_watermarks")
+        op.drop_table("member_memory_watermarks")
@@ -8,6 +8,7 @@ Enterprise-grade billing data model with:
 - Idempotent webhook event tracking
 - Coupon/discount support
 - Invoice history
+- Stripe subscription/invoice mirror for revenue analytics
 
 All V2 tables use the prefix 'billing_' to coexist with V1 during migration.
 """
@@ -570,6 +571,80 @@ class InvoiceRecord(Base):
     due_date = Column(DateTime, nullable=True)
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# STRIPE MIRROR (revenue analytics)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class StripeSubscriptionMirror(Base):
+    """
+    Platform-wide copy of every Stripe subscription, including ones that
+    cannot be matched to a tenant. Kept current by webhooks and the
+    reconciliation job (app/billing/stripe_mirror.py).
+    """
+    __tablename__ = "billing_stripe_subscriptions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    stripe_subscription_id = Column(String(100), unique=True, nullable=False, index=True)
+    stripe_customer_id = Column(String(100), nullable=True, index=True)
+    tenant_id = Column(Integer, nullable=True, index=True)  # from Stripe metadata
+
+    status = Column(String(30), nullable=False)
+    currency = Column(String(3), nullable=True)
+    mrr_cents = Column(Integer, nullable=False, default=0)  # yearly prices / 12
+    cancel_at_period_end = Column(Boolean, nullable=False, default=False)
+
+    stripe_created_at = Column(DateTime, nullable=True)
+    source_updated_at = Column(DateTime, nullable=False)  # Stripe time of the state held here
+    synced_at = Column(DateTime, default=_utcnow, onupdate=_utcnow)
+
+    __table_args__ = (
+        Index("ix_stripe_sub_mirror_status", "status"),
+    )
+
+
+class StripeInvoiceMirror(Base):
+    """
+    Platform-wide copy of every Stripe invoice. Unlike InvoiceRecord it
+    also holds invoices of customers without a local subscription, so
+    revenue sums match Stripe.
+    """
+    __tablename__ = "billing_stripe_invoices"
+
+    id = Column(Integer, primary_key=True, index=True)
+    stripe_invoice_id = Column(String(100), unique=True, nullable=False, index=True)
+    stripe_customer_id = Column(String(100), nullable=True, index=True)
+    stripe_subscription_id = Column(String(100), nullable=True)
+    tenant_id = Column(Integer, nullable=True, index=True)
+
+    status = Column(String(20), nullable=False)  # draft, open, paid, void, uncollectible
+    currency = Column(String(3), nullable=False, default="eur")
+    amount_due_cents = Column(Integer, nullable=False, default=0)
+    amount_paid_cents = Column(Integer, nullable=False, default=0)
+
+    stripe_created_at = Column(DateTime, nullable=False)
+    paid_at = Column(DateTime, nullable=True)  # status_transitions.paid_at, else created
+    source_updated_at = Column(DateTime, nullable=False)
+    synced_at = Column(DateTime, default=_utcnow, onupdate=_utcnow)
+
+    __table_args__ = (
+        Index("ix_stripe_invoice_mirror_status_created", "status", "stripe_created_at"),
+    )
+
+
+class StripeSyncCursor(Base):
+    """
+    Reconciliation progress per Stripe resource. ``starting_after`` is the
+    last object id of the page already written, so an interrupted pass
+    resumes where it stopped.
+    """
+    __tablename__ = "billing_stripe_sync_cursors"
+
+    resource = Column(String(30), primary_key=True)  # "subscriptions" | "invoices"
+    starting_after = Column(String(100), nullable=True)
+    pass_started_at = Column(DateTime, nullable=True)
+    last_completed_at = Column(DateTime, nullable=True)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # COUPON / DISCOUNT
 # ══════════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,325 @@
+"""
+ARIIA Billing V2 – Stripe Mirror
+
+Local copy of Stripe subscriptions and invoices for revenue analytics.
+The admin revenue dashboard used to page through every active Stripe
+subscription and every paid invoice of the last twelve months on each
+request. It now aggregates these tables in SQL.
+
+Write paths:
+- Webhooks: WebhookProcessorV2 calls ``apply_event`` for every
+  ``customer.subscription.*`` and ``invoice.*`` event, whether or not the
+  customer belongs to a known tenant.
+- Reconciliation: ``reconcile`` lists both resources from the Stripe API
+  and upserts them page by page. The last written object id is stored in
+  ``billing_stripe_sync_cursors``, so an interrupted pass resumes there.
+  The first pass backfills ``STRIPE_MIRROR_BACKFILL_DAYS`` of invoices;
+  ``backfill_completed`` stays False until it has finished for both.
+  Later passes re-read ``STRIPE_MIRROR_LOOKBACK_DAYS`` to catch events
+  that were never delivered.
+
+Every row keeps the Stripe time of the state it holds
+(``source_updated_at``: the event's ``created`` or the time it was
+listed). Older states never overwrite newer ones, so out-of-order or
+replayed webhooks are harmless.
+
+Usage:
+    from app.billing.stripe_mirror import stripe_mirror
+
+    stripe_mirror.apply_event(db, event)
+    mrr_cents, paying = stripe_mirror.mrr(db)
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import structlog
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.billing.models import StripeInvoiceMirror, StripeSubscriptionMirror, StripeSyncCursor
+
+logger = structlog.get_logger()
+
+RECONCILE_INTERVAL_SECONDS = float(os.getenv("STRIPE_MIRROR_RECONCILE_INTERVAL_SECONDS", "3600"))
+BACKFILL_DAYS = int(os.getenv("STRIPE_MIRROR_BACKFILL_DAYS", "400"))
+LOOKBACK_DAYS = int(os.getenv("STRIPE_MIRROR_LOOKBACK_DAYS", "45"))
+PAGE_SIZE = 100
+
+SUBSCRIPTIONS = "subscriptions"
+INVOICES = "invoices"
+
+
+def plain_dict(obj: Any) -> dict:
+    """Stripe SDK objects are not dicts (stripe>=15); webhook fixtures are."""
+    if obj is None:
+        return {}
+    return obj.to_dict() if hasattr(obj, "to_dict") else obj
+
+
+def _from_ts(ts: Optional[int]) -> Optional[datetime]:
+    """Unix timestamp → naive UTC datetime (the billing tables store naive UTC)."""
+    if not ts:
+        return None
+    return datetime.fromtimestamp(int(ts), tz=timezone.utc).replace(tzinfo=None)
+
+
+def _naive(dt: datetime) -> datetime:
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def _tenant_id(obj: dict) -> Optional[int]:
+    try:
+        return int((obj.get("metadata") or {}).get("tenant_id")) or None
+    except (TypeError, ValueError):
+        return None
+
+
+def subscription_mrr_cents(sub: dict) -> int:
+    """Monthly recurring amount of a Stripe subscription (yearly prices / 12)."""
+    mrr = 0
+    for item in (sub.get("items") or {}).get("data", []):
+        price = item.get("price") or {}
+        amount = price.get("unit_amount") or 0
+        interval = (price.get("recurring") or {}).get("interval", "month")
+        mrr += amount // 12 if interval == "year" else amount
+    return mrr
+
+
+class StripeMirror:
+    """Upserts and aggregate queries for the Stripe mirror tables."""
+
+    # ── Write path ──────────────────────────────────────────────────────
+
+    @staticmethod
+    def handles(event_type: str) -> bool:
+        return event_type.startswith(("customer.subscription.", "invoice."))
+
+    def apply_event(self, db: Session, event: Any) -> bool:
+        """Mirror the object of a webhook event; False if it was stale or unrelated."""
+        event = plain_dict(event)
+        event_type = event.get("type", "")
+        obj = (event.get("data") or {}).get("object") or {}
+        version = _from_ts(event.get("created")) or _naive(datetime.now(timezone.utc))
+        if event_type.startswith("customer.subscription."):
+            return self.upsert_subscription(db, obj, version) is not None
+        if event_type.startswith("invoice."):
+            return self.upsert_invoice(db, obj, version) is not None
+        return False
+
+    def upsert_subscription(
+        self, db: Session, sub: Any, version: datetime,
+    ) -> Optional[StripeSubscriptionMirror]:
+        sub = plain_dict(sub)
+        row = db.query(StripeSubscriptionMirror).filter(
+            StripeSubscriptionMirror.stripe_subscription_id == sub["id"],
+        ).first()
+        if row is not None and row.source_updated_at and version < row.source_updated_at:
+            return None
+        if row is None:
+            row = StripeSubscriptionMirror(stripe_subscription_id=sub["id"])
+            db.add(row)
+
+        row.stripe_customer_id = sub.get("customer")
+        row.tenant_id = _tenant_id(sub) or row.tenant_id
+        row.status = sub.get("status") or "unknown"
+        row.currency = sub.get("currency")
+        row.mrr_cents = subscription_mrr_cents(sub)
+        row.cancel_at_period_end = bool(sub.get("cancel_at_period_end"))
+        row.stripe_created_at = _from_ts(sub.get("created"))
+        row.source_updated_at = version
+        return row
+
+    def upsert_invoice(
+        self, db: Session, invoice: Any, version: datetime,
+    ) -> Optional[StripeInvoiceMirror]:
+        invoice = plain_dict(invoice)
+        row = db.query(StripeInvoiceMirror).filter(
+            StripeInvoiceMirror.stripe_invoice_id == invoice["id"],
+        ).first()
+        if row is not None and row.source_updated_at and version < row.source_updated_at:
+            return None
+        if row is None:
+            row = StripeInvoiceMirror(stripe_invoice_id=invoice["id"])
+            db.add(row)
+
+        created = _from_ts(invoice.get("created")) or version
+        paid_at = _from_ts((invoice.get("status_transitions") or {}).get("paid_at"))
+        row.stripe_customer_id = invoice.get("customer")
+        row.stripe_subscription_id = invoice.get("subscription")
+        row.tenant_id = _tenant_id(invoice.get("subscription_details") or {}) or row.tenant_id
+        row.status = invoice.get("status") or "draft"
+        row.currency = invoice.get("currency") or "eur"
+        row.amount_due_cents = invoice.get("amount_due") or 0
+        row.amount_paid_cents = invoice.get("amount_paid") or 0
+        row.stripe_created_at = created
+        row.paid_at = (paid_at or created) if row.status == "paid" else None
+        row.source_updated_at = version
+        return row
+
+    # ── Reconciliation ──────────────────────────────────────────────────
+
+    def reconcile(
+        self,
+        db: Session,
+        stripe: Any,
+        now: Optional[datetime] = None,
+        page_size: int = PAGE_SIZE,
+        max_pages: Optional[int] = None,
+    ) -> dict[str, int]:
+        """Backfill/refresh both resources from the API; returns objects written."""
+        return {
+            SUBSCRIPTIONS: self._reconcile_resource(db, stripe, SUBSCRIPTIONS, now, page_size, max_pages),
+            INVOICES: self._reconcile_resource(db, stripe, INVOICES, now, page_size, max_pages),
+        }
+
+    def _reconcile_resource(
+        self,
+        db: Session,
+        stripe: Any,
+        resource: str,
+        now: Optional[datetime],
+        page_size: int,
+        max_pages: Optional[int],
+    ) -> int:
+        now = _naive(now or datetime.now(timezone.utc))
+        cursor = db.get(StripeSyncCursor, resource)
+        if cursor is None:
+            cursor = StripeSyncCursor(resource=resource)
+            db.add(cursor)
+        if cursor.starting_after is None:
+            cursor.pass_started_at = now
+
+        if resource == SUBSCRIPTIONS:
+            api, params, upsert = stripe.Subscription, {"status": "all"}, self.upsert_subscription
+        else:
+            days = LOOKBACK_DAYS if cursor.last_completed_at else BACKFILL_DAYS
+            since = cursor.pass_started_at.replace(tzinfo=timezone.utc) - timedelta(days=days)
+            api, params, upsert = stripe.Invoice, {"created": {"gte": int(since.timestamp())}}, self.upsert_invoice
+
+        written = pages = 0
+        while True:
+            if cursor.starting_after:
+                params["starting_after"] = cursor.starting_after
+            page = plain_dict(api.list(limit=page_size, **params))
+            items = page.get("data") or []
+            for obj in items:
+                upsert(db, obj, now)
+            written += len(items)
+            pages += 1
+            if items and page.get("has_more"):
+                cursor.starting_after = items[-1]["id"]
+            else:
+                cursor.starting_after = None
+                cursor.last_completed_at = now
+            db.commit()  # per page: the cursor and the rows it covers
+            if cursor.starting_after is None or (max_pages and pages >= max_pages):
+                break
+
+        logger.info(
+            "billing.stripe_mirror.reconciled",
+            resource=resource, written=written, complete=cursor.starting_after is None,
+        )
+        return written
+
+    # ── Aggregates ──────────────────────────────────────────────────────
+
+    def backfill_completed(self, db: Session) -> bool:
+        """True once a full reconciliation pass has completed for both resources.
+
+        Webhook rows alone are not enough: until the backfill has listed
+        everything, aggregates over the mirror undercount MRR and revenue.
+        """
+        completed = (
+            db.query(func.count(StripeSyncCursor.resource))
+            .filter(
+                StripeSyncCursor.resource.in_((SUBSCRIPTIONS, INVOICES)),
+                StripeSyncCursor.last_completed_at.isnot(None),
+            )
+            .scalar()
+        )
+        return completed == 2
+
+    def last_synced_at(self, db: Session) -> Optional[datetime]:
+        return db.query(func.max(StripeSyncCursor.last_completed_at)).scalar()
+
+    def mrr(self, db: Session) -> tuple[int, int]:
+        """(MRR in cents, number of active subscriptions)."""
+        total, count = db.query(
+            func.coalesce(func.sum(StripeSubscriptionMirror.mrr_cents), 0),
+            func.count(StripeSubscriptionMirror.id),
+        ).filter(StripeSubscriptionMirror.status == "active").one()
+        return int(total or 0), int(count or 0)
+
+    def _paid(self, db: Session, *columns, since: datetime):
+        return db.query(*columns).filter(
+            StripeInvoiceMirror.status == "paid",
+            StripeInvoiceMirror.stripe_created_at >= _naive(since),
+        )
+
+    def paid_revenue_cents(self, db: Session, since: datetime) -> int:
+        """Sum of paid invoices created since *since*."""
+        total = self._paid(
+            db, func.coalesce(func.sum(StripeInvoiceMirror.amount_paid_cents), 0), since=since,
+        ).scalar()
+        return int(total or 0)
+
+    def paid_revenue_by_customer(self, db: Session, since: datetime) -> dict[str, int]:
+        rows = (
+            self._paid(
+                db, StripeInvoiceMirror.stripe_customer_id, func.sum(StripeInvoiceMirror.amount_paid_cents), since=since,
+            )
+            .filter(StripeInvoiceMirror.stripe_customer_id.isnot(None))
+            .group_by(StripeInvoiceMirror.stripe_customer_id)
+            .all()
+        )
+        return {cid: int(cents or 0) for cid, cents in rows}
+
+    def paid_revenue_by_month(self, db: Session, since: datetime) -> dict[str, int]:
+        """"YYYY-MM" of the payment → cents, for invoices created since *since*."""
+        year = func.extract("year", StripeInvoiceMirror.paid_at)
+        month = func.extract("month", StripeInvoiceMirror.paid_at)
+        rows = (
+            self._paid(db, year, month, func.sum(StripeInvoiceMirror.amount_paid_cents), since=since)
+            .group_by(year, month)
+            .all()
+        )
+        return {f"{int(y)}-{int(m):02d}": int(cents or 0) for y, m, cents in rows}
+
+
+stripe_mirror = StripeMirror()
+
+
+# ── Background job ──────────────────────────────────────────────────────
+
+def _reconcile_once() -> dict[str, int]:
+    from app.billing.stripe_service import _get_stripe
+    from app.shared.db import open_session
+
+    try:
+        stripe = _get_stripe()
+    except (ImportError, ValueError) as exc:
+        logger.debug("billing.stripe_mirror.skipped", reason=str(exc))
+        return {}
+
+    db = open_session()
+    try:
+        return stripe_mirror.reconcile(db, stripe)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def reconcile_loop(interval: float = RECONCILE_INTERVAL_SECONDS) -> None:
+    """Background job: backfill and re-check the Stripe mirror."""
+    while True:
+        try:
+            await asyncio.to_thread(_reconcile_once)
+        except Exception as exc:
+            logger.error("billing.stripe_mirror.reconcile_failed", error=str(exc))
+        await asyncio.sleep(interval)
@@ -18,6 +18,10 @@ Supported events:
 - customer.created
 - customer.updated
 
+Subscription and invoice events also update the revenue mirror
+(app/billing/stripe_mirror.py), including events that are otherwise
+skipped.
+
 Usage:
     from app.billing.webhook_processor import webhook_processor
 
@@ -39,6 +43,7 @@ from app.billing.models import (
     SubscriptionStatus,
     TenantAddonV2,
 )
+from app.billing.stripe_mirror import plain_dict, stripe_mirror
 from app.billing.subscription_repository import subscription_repository
 from app.billing.webhook_repository import webhook_repository
 from app.billing.subscription_service import subscription_service
@@ -77,12 +82,20 @@ class WebhookProcessorV2:
         event = self._verify_event(payload, sig_header)
         if not event:
             return {"status": "error", "reason": "Ungültige Webhook-Signatur"}
+        return await self.process_event(db, plain_dict(event))
 
+    async def process_event(self, db: Session, event: dict[str, Any]) -> dict[str, Any]:
+        """Process an already verified Stripe event (also used for replays)."""
         event_type = event.get("type", "unknown")
         event_id = event.get("id", "unknown")
 
         logger.info("billing.webhook.received", event_type=event_type, event_id=event_id)
 
+        # Revenue mirror first: it covers customers without a tenant, and
+        # replays are harmless because stale states are ignored.
+        if stripe_mirror.handles(event_type):
+            self._update_mirror(db, event)
+
         # Check idempotency
         existing = billing_events.get_events_by_stripe_id(db, event_id)
         if existing:
@@ -118,6 +131,15 @@ class WebhookProcessorV2:
             db.commit()
             return {"status": "error", "event_type": event_type, "reason": str(exc)}
 
+    def _update_mirror(self, db: Session, event: dict) -> None:
+        """Keep the Stripe mirror current; a failure is repaired by reconciliation."""
+        try:
+            stripe_mirror.apply_event(db, event)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            logger.warning("billing.webhook.mirror_failed", event_id=event.get("id"), error=str(exc))
+
     # ── Event Verification ──────────────────────────────────────────────
 
     def _verify_event(self, payload: bytes, sig_header: str) -> Optional[dict]:
@@ -21,6 +21,7 @@ import structlog
 from sqlalchemy.orm import Session
 
 from app.core.contact_models import Contact
+from app.core.cpu_executor import RENDER, run_cpu_retrying
 from app.domains.campaigns.models import Campaign, CampaignTemplate
 from app.domains.identity.models import Tenant
 
@@ -113,8 +114,8 @@ class MessageRenderer:
             footer = self._render_part(template.footer_html, context) if template and template.footer_html else ""
             full_html = self._wrap_email_html(header, body, footer, primary_color, logo_url)
 
-            # Gold Standard: CSS Inlining
-            full_html = self._inline_css(full_html)
+            # Gold Standard: CSS Inlining (CPU-heavy, runs off the event loop)
+            full_html = await run_cpu_retrying(RENDER, self._inline_css, full_html)
         else:
             full_html = body  # WhatsApp/SMS/Telegram: no HTML wrapping
 
@@ -3,15 +3,26 @@ import hashlib
 import hmac
 import json
 import os
+import queue
 import secrets
 import sys
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
 import structlog
 from fastapi import Cookie, Header, HTTPException
 
+from app.core.auth_cache import (
+    INVALIDATION_PATTERN,
+    AuthContextCache,
+    apply_invalidation,
+    encode_invalidation,
+    register_orm_invalidation,
+)
+from app.core.cpu_executor import PASSWORD_HASH, ExecutorSaturated, run_cpu
 from app.core.db import Base, engine
 from app.domains.identity.models import Tenant, UserAccount
 from app.shared.db import open_session
@@ -43,6 +54,139 @@ def _get_blacklist_redis():
     return _blacklist_redis_client
 
 
+# Short-lived jti -> AuthContext cache (see app/core/auth_cache.py).
+# AUTH_CONTEXT_CACHE_TTL_SECONDS=0 disables it.
+_auth_context_cache = AuthContextCache(
+    ttl_seconds=float(os.getenv("AUTH_CONTEXT_CACHE_TTL_SECONDS", "5")),
+    max_entries=int(os.getenv("AUTH_CONTEXT_CACHE_MAX_ENTRIES", "10000")),
+)
+_invalidation_listener: threading.Thread | None = None
+_invalidation_listener_lock = threading.Lock()
+
+
+def _run_invalidation_listener() -> None:
+    """Consume cache invalidations from Redis; reconnect with backoff on errors."""
+    backoff = 1.0
+    while True:
+        pubsub = None
+        subscribed = False
+        try:
+            pubsub = _get_blacklist_redis().pubsub(ignore_subscribe_messages=True)
+            pubsub.psubscribe(INVALIDATION_PATTERN)
+            subscribed = True
+            # Invalidations may have been missed while disconnected
+            _auth_context_cache.clear()
+            backoff = 1.0
+            while True:
+                message = pubsub.get_message(timeout=1.0)
+                if message and message.get("type") == "pmessage":
+                    apply_invalidation(_auth_context_cache, message["data"])
+        except Exception as exc:
+            logger.debug("auth.invalidation_listener_error", error=str(exc))
+            if subscribed:
+                _auth_context_cache.clear()
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+        finally:
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+
+def _ensure_invalidation_listener() -> None:
+    global _invalidation_listener
+    if _invalidation_listener is not None or not _auth_context_cache.enabled:
+        return
+    with _invalidation_listener_lock:
+        if _invalidation_listener is None:
+            _invalidation_listener = threading.Thread(
+                target=_run_invalidation_listener,
+                name="auth-cache-invalidation",
+                daemon=True,
+            )
+            _invalidation_listener.start()
+
+
+# Cross-process invalidations are published by a background thread so a
+# commit never waits on Redis. Messages are dropped when the outbox is full
+# or Redis is down; other processes then fall back to the cache TTL.
+AUTH_INVALIDATION_OUTBOX_SIZE = int(os.getenv("AUTH_INVALIDATION_OUTBOX_SIZE", "10000"))
+AUTH_INVALIDATION_RETRY_SECONDS = float(os.getenv("AUTH_INVALIDATION_RETRY_SECONDS", "5"))
+_invalidation_outbox: queue.Queue[tuple[int, str]] = queue.Queue(maxsize=AUTH_INVALIDATION_OUTBOX_SIZE)
+_invalidation_publisher: threading.Thread | None = None
+
+
+def _run_invalidation_publisher(outbox: queue.Queue[tuple[int, str]]) -> None:
+    """Drain ``outbox``; after a failure, skip publishing until the retry delay passes."""
+    from app.core.redis_keys import auth_invalidation_channel
+
+    down_until = 0.0
+    while True:
+        tenant_id, message = outbox.get()
+        if time.monotonic() < down_until:
+            continue
+        try:
+            _get_blacklist_redis().publish(auth_invalidation_channel(tenant_id), message)
+        except Exception as exc:
+            if not down_until:
+                logger.warning("auth.invalidation_publish_failed", tenant_id=tenant_id, error=str(exc))
+            down_until = time.monotonic() + AUTH_INVALIDATION_RETRY_SECONDS
+            continue
+        if down_until:
+            down_until = 0.0
+            logger.info("auth.invalidation_publish_recovered")
+
+
+def _ensure_invalidation_publisher() -> None:
+    global _invalidation_publisher
+    if _invalidation_publisher is not None:
+        return
+    with _invalidation_listener_lock:
+        if _invalidation_publisher is None:
+            _invalidation_publisher = threading.Thread(
+                target=_run_invalidation_publisher,
+                args=(_invalidation_outbox,),
+                name="auth-cache-invalidation-publisher",
+                daemon=True,
+            )
+            _invalidation_publisher.start()
+
+
+def invalidate_auth_context(
+    tenant_id: int,
+    *,
+    user_id: int | None = None,
+    jti: str | None = None,
+) -> None:
+    """Evict cached AuthContexts locally and broadcast the eviction to other processes.
+
+    Without ``user_id`` / ``jti`` every entry of the tenant is dropped. The
+    local eviction is immediate; the broadcast is queued and never blocks.
+    """
+    _auth_context_cache.invalidate(
+        jti=jti,
+        user_id=user_id,
+        tenant_id=tenant_id if user_id is None and jti is None else None,
+    )
+    try:
+        _invalidation_outbox.put_nowait((tenant_id, encode_invalidation(tenant_id, user_id=user_id, jti=jti)))
+    except queue.Full:
+        return
+    _ensure_invalidation_publisher()
+
+
+def _invalidate_committed_changes(changes: list[dict]) -> None:
+    for change in changes:
+        if change.get("tenant_id") is None:
+            continue
+        invalidate_auth_context(change["tenant_id"], user_id=change.get("user_id"))
+
+
+register_orm_invalidation(UserAccount, Tenant, _invalidate_committed_changes)
+
+
 @dataclass
 class AuthContext:
     user_id: int
@@ -89,6 +233,27 @@ def verify_password(password: str, password_hash: str) -> bool:
         return False
 
 
+async def _run_password_hash(fn, *args):
+    try:
+        return await run_cpu(PASSWORD_HASH, fn, *args)
+    except ExecutorSaturated as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="Authentication is temporarily overloaded, please retry",
+            headers={"Retry-After": str(int(exc.retry_after))},
+        ) from exc
+
+
+async def hash_password_async(password: str) -> str:
+    """``hash_password`` off the event loop, for async request handlers."""
+    return await _run_password_hash(hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    """``verify_password`` off the event loop, for async request handlers."""
+    return await _run_password_hash(verify_password, password, password_hash)
+
+
 def create_refresh_token(
     *,
     user_id: int,
@@ -199,7 +364,10 @@ def decode_access_token(token: str) -> dict:
 
 
 def _check_token_blacklist(payload: dict) -> None:
-    """Raise 401 if this token's JTI or the user is blacklisted in Redis (S1.4)."""
+    """Raise 401 if this token's JTI or the user is blacklisted in Redis (S1.4).
+
+    Both flags are read in a single MGET round trip.
+    """
     jti = payload.get("jti")
     tenant_id = payload.get("tenant_id")
     user_id = payload.get("sub")
@@ -208,19 +376,44 @@ def _check_token_blacklist(payload: dict) -> None:
     try:
         from app.core.redis_keys import jti_blacklist_key, user_blacklisted_key
         r = _get_blacklist_redis()
-        if r.exists(jti_blacklist_key(tenant_id, jti)):
-            raise HTTPException(status_code=401, detail="Token has been revoked")
-        if user_id and r.exists(user_blacklisted_key(tenant_id, user_id)):
-            raise HTTPException(status_code=401, detail="User session has been revoked")
-    except HTTPException:
-        raise
+        keys = [jti_blacklist_key(tenant_id, jti)]
+        if user_id:
+            keys.append(user_blacklisted_key(tenant_id, user_id))
+        flags = r.mget(keys)
     except Exception:
         # Redis unavailable — fail open (token validity remains HMAC-guaranteed)
-        pass
+        return
+    if flags[0] is not None:
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    if len(flags) > 1 and flags[1] is not None:
+        raise HTTPException(status_code=401, detail="User session has been revoked")
 
 
 def _resolve_context_from_payload(payload: dict) -> AuthContext:
     _check_token_blacklist(payload)
+    from app.core.db import tenant_context
+
+    jti = payload.get("jti")
+    if jti:
+        _ensure_invalidation_listener()
+        cached = _auth_context_cache.get(jti)
+        if cached is not None:
+            tenant_context.set(cached.tenant_id)
+            return replace(cached)
+
+    context = _load_context_from_db(payload)
+    if jti:
+        _auth_context_cache.put(
+            jti,
+            replace(context),
+            user_ids={context.user_id, context.impersonator_user_id} - {None},
+            tenant_ids={context.tenant_id, context.impersonator_tenant_id} - {None},
+        )
+    tenant_context.set(context.tenant_id)
+    return context
+
+
+def _load_context_from_db(payload: dict) -> AuthContext:
     db = open_session()
     try:
         user = db.query(UserAccount).filter(UserAccount.id == int(payload["sub"])).first()
@@ -256,10 +449,6 @@ def _resolve_context_from_payload(payload: dict) -> AuthContext:
             context.impersonator_tenant_slug = actor_tenant.slug
             context.impersonation_reason = str(imp.get("reason") or "")
             context.impersonation_started_at = str(imp.get("started_at") or "")
-        
-        from app.core.db import tenant_context
-        tenant_context.set(context.tenant_id)
-
         return context
     finally:
         db.close()
@@ -340,6 +529,7 @@ def invalidate_user_sessions(user_id: int, tenant_id: int, ttl_seconds: int = 43
         from app.core.redis_keys import user_blacklisted_key
         r = _get_blacklist_redis()
         r.setex(user_blacklisted_key(tenant_id, user_id), ttl_seconds, "1")
+        invalidate_auth_context(tenant_id, user_id=user_id)
     except HTTPException:
         raise
     except Exception as exc:
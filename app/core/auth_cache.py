@@ -0,0 +1,204 @@
+"""Short-lived per-process cache for resolved AuthContexts.
+
+Resolving a token into an ``AuthContext`` costs two to four synchronous DB
+queries (user, tenant and, for impersonation, actor user and tenant). The
+cache keeps the result per token ``jti`` for a few seconds so a burst of
+requests from the same session resolves only once.
+
+Staleness is bounded by the TTL and cut short by invalidations: ORM updates
+or deletes of ``UserAccount`` / ``Tenant`` and explicit revocations publish a
+message on ``t{tenant_id}:auth:invalidate``. Every process subscribes to
+``t*:auth:invalidate`` and evicts matching entries. Token revocation itself
+is still checked against Redis on every request, so the cache never extends
+the lifetime of a revoked token.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+logger = structlog.get_logger()
+
+INVALIDATION_PATTERN = "t*:auth:invalidate"
+
+
+@dataclass
+class _Entry:
+    expires_at: float
+    context: Any
+    user_ids: frozenset[int]
+    tenant_ids: frozenset[int]
+
+
+class AuthContextCache:
+    """Bounded LRU with per-entry TTL, keyed by token jti. Thread-safe."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 5.0,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, jti: str) -> Any | None:
+        if not self.enabled:
+            return None
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(jti)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    del self._entries[jti]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(jti)
+            self.hits += 1
+            return entry.context
+
+    def put(
+        self,
+        jti: str,
+        context: Any,
+        *,
+        user_ids: Iterable[int],
+        tenant_ids: Iterable[int],
+    ) -> None:
+        if not self.enabled:
+            return
+        entry = _Entry(
+            expires_at=self._clock() + self.ttl_seconds,
+            context=context,
+            user_ids=frozenset(user_ids),
+            tenant_ids=frozenset(tenant_ids),
+        )
+        with self._lock:
+            self._entries[jti] = entry
+            self._entries.move_to_end(jti)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(
+        self,
+        *,
+        jti: str | None = None,
+        user_id: int | None = None,
+        tenant_id: int | None = None,
+    ) -> int:
+        """Drop the entry for ``jti`` and every entry involving ``user_id`` / ``tenant_id``."""
+        with self._lock:
+            doomed = set()
+            if jti is not None and jti in self._entries:
+                doomed.add(jti)
+            if user_id is not None or tenant_id is not None:
+                for key, entry in self._entries.items():
+                    if user_id is not None and user_id in entry.user_ids:
+                        doomed.add(key)
+                    elif tenant_id is not None and user_id is None and tenant_id in entry.tenant_ids:
+                        doomed.add(key)
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ── Invalidation messages ────────────────────────────────────────────
+
+
+def encode_invalidation(
+    tenant_id: int,
+    *,
+    user_id: int | None = None,
+    jti: str | None = None,
+) -> str:
+    return json.dumps({"tenant_id": tenant_id, "user_id": user_id, "jti": jti})
+
+
+def apply_invalidation(cache: AuthContextCache, raw: str | bytes) -> int:
+    """Apply a published invalidation message to ``cache``. Malformed messages are ignored."""
+    try:
+        msg = json.loads(raw)
+        user_id = msg.get("user_id")
+        tenant_id = msg.get("tenant_id")
+        return cache.invalidate(
+            jti=msg.get("jti"),
+            user_id=int(user_id) if user_id is not None else None,
+            tenant_id=int(tenant_id) if tenant_id is not None else None,
+        )
+    except (TypeError, ValueError, AttributeError):
+        logger.warning("auth_cache.bad_invalidation_message")
+        return 0
+
+
+# ── ORM hooks ────────────────────────────────────────────────────────
+
+_SESSION_KEY = "auth_cache_invalidations"
+_orm_hooks_registered = False
+
+
+def register_orm_invalidation(
+    user_model: type,
+    tenant_model: type,
+    on_commit: Callable[[list[dict[str, Any]]], None],
+) -> None:
+    """Call ``on_commit`` with the users/tenants changed by each committed session.
+
+    Updates and deletes are collected per session at flush time and only
+    reported once the transaction commits; rollbacks discard them. Bulk
+    ``query.update()`` statements bypass mapper events and rely on the TTL.
+    """
+    global _orm_hooks_registered
+    if _orm_hooks_registered:
+        return
+    _orm_hooks_registered = True
+
+    def _record(change: dict[str, Any], target: Any) -> None:
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(_SESSION_KEY, []).append(change)
+
+    def _user_changed(mapper, connection, target) -> None:
+        _record({"tenant_id": target.tenant_id, "user_id": target.id}, target)
+
+    def _tenant_changed(mapper, connection, target) -> None:
+        _record({"tenant_id": target.id, "user_id": None}, target)
+
+    for evt in ("after_update", "after_delete"):
+        event.listen(user_model, evt, _user_changed)
+        event.listen(tenant_model, evt, _tenant_changed)
+
+    @event.listens_for(Session, "after_commit")
+    def _publish_changes(session: Session) -> None:
+        changes = session.info.pop(_SESSION_KEY, None)
+        if changes:
+            unique = [dict(t) for t in {tuple(sorted(c.items())) for c in changes}]
+            on_commit(unique)
+
+    @event.listens_for(Session, "after_rollback")
+    def _discard_changes(session: Session) -> None:
+        session.info.pop(_SESSION_KEY, None)
@@ -0,0 +1,230 @@
+"""Shared, size-bounded executor for CPU-heavy work on the request path.
+
+Password hashing (PBKDF2, 200k rounds), CSS inlining, document parsing and
+image decoding/resizing take tens to hundreds of milliseconds of pure CPU.
+Run inline in an async handler they stall every other coroutine of the
+worker. ``run_cpu`` moves them to a worker pool instead.
+
+Each category (``password_hash``, ``render``, ``document_parse``, ``image``)
+gets its own fixed number of workers and a bounded queue, so a burst of PDF
+uploads cannot starve logins and a login flood cannot queue unbounded work.
+When a category's queue is full, ``ExecutorSaturated`` is raised
+immediately; HTTP handlers map it to 503 with ``Retry-After``, background
+callers use ``run_cpu_retrying`` to wait and retry a few times.
+
+Threads are the default: ``hashlib.pbkdf2_hmac`` and the native inliners
+release the GIL. A category can be switched to a process pool with
+``CPU_EXECUTOR_<CATEGORY>_KIND=process`` for pure-Python work, provided the
+submitted callables are picklable.
+
+Metrics (via ``get_metrics()``):
+  cpu_executor_queue_wait_seconds{category}  histogram, submit -> start
+  cpu_executor_run_seconds{category}         histogram, start -> finish
+  cpu_executor_rejected_total{category}      counter, queue full
+  cpu_executor_in_flight{category}           gauge, running + queued
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar
+
+import structlog
+
+from app.core.telemetry import get_metrics
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+PASSWORD_HASH = "password_hash"
+RENDER = "render"
+DOCUMENT_PARSE = "document_parse"
+IMAGE = "image"
+
+RETRY_ATTEMPTS = max(1, int(os.getenv("CPU_EXECUTOR_RETRY_ATTEMPTS", "3")))
+
+
+class ExecutorSaturated(RuntimeError):
+    """The category's queue is full; the caller should shed load."""
+
+    def __init__(self, category: str, retry_after: float = 1.0) -> None:
+        super().__init__(f"CPU executor category '{category}' is saturated")
+        self.category = category
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class CategoryLimits:
+    """``max_workers`` run concurrently, up to ``max_queue`` more wait."""
+
+    max_workers: int
+    max_queue: int
+    kind: str = "thread"  # "thread" | "process"
+
+
+def _default_limits() -> dict[str, CategoryLimits]:
+    # Leave one core to the event loop thread; busy workers on every core
+    # would show up as loop lag again, just via the OS scheduler.
+    spare = max(1, (os.cpu_count() or 2) - 1)
+    defaults = {
+        PASSWORD_HASH: CategoryLimits(max_workers=spare, max_queue=256),
+        RENDER: CategoryLimits(max_workers=max(1, spare // 2), max_queue=512),
+        DOCUMENT_PARSE: CategoryLimits(max_workers=min(2, spare), max_queue=32),
+        IMAGE: CategoryLimits(max_workers=min(2, spare), max_queue=64),
+    }
+    limits = {}
+    for name, default in defaults.items():
+        prefix = f"CPU_EXECUTOR_{name.upper()}"
+        limits[name] = CategoryLimits(
+            max_workers=int(os.getenv(f"{prefix}_WORKERS", default.max_workers)),
+            max_queue=int(os.getenv(f"{prefix}_QUEUE", default.max_queue)),
+            kind=os.getenv(f"{prefix}_KIND", default.kind),
+        )
+    return limits
+
+
+def _timed_call(fn: Callable[..., T], submitted_at: float, args: tuple, kwargs: dict) -> tuple[float, float, T]:
+    # Runs inside the worker; time.monotonic() is system-wide on Linux, so this also
+    # holds for process pools.
+    started_at = time.monotonic()
+    result = fn(*args, **kwargs)
+    return started_at - submitted_at, time.monotonic() - started_at, result
+
+
+class _Category:
+    def __init__(self, name: str, limits: CategoryLimits) -> None:
+        self.name = name
+        self.limits = limits
+        self.in_flight = 0
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> Executor:
+        if self._pool is None:
+            if self.limits.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.limits.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.limits.max_workers,
+                    thread_name_prefix=f"cpu-{self.name}",
+                )
+        return self._pool
+
+    def acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.limits.max_workers + self.limits.max_queue:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def shutdown(self, wait: bool) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+class CPUExecutor:
+    """Per-category bounded worker pools behind one ``run()`` entry point."""
+
+    def __init__(self, limits: Optional[dict[str, CategoryLimits]] = None) -> None:
+        self._categories = {
+            name: _Category(name, category_limits)
+            for name, category_limits in (limits or _default_limits()).items()
+        }
+
+    def _category(self, name: str) -> _Category:
+        try:
+            return self._categories[name]
+        except KeyError:
+            raise ValueError(f"Unknown CPU executor category: {name}") from None
+
+    async def run(self, category: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(*args, **kwargs)`` in ``category``'s pool and await the result."""
+        cat = self._category(category)
+        metrics = get_metrics()
+        labels = {"category": category}
+        if not cat.acquire():
+            metrics.increment("cpu_executor_rejected_total", labels=labels)
+            logger.warning("cpu_executor.saturated", category=category, in_flight=cat.in_flight)
+            raise ExecutorSaturated(category)
+        metrics.set_gauge("cpu_executor_in_flight", cat.in_flight, labels=labels)
+
+        def _done(_future: Optional[Future]) -> None:
+            # Released when the job itself finishes (or is cancelled before it
+            # started), not when the awaiting coroutine is cancelled, so
+            # abandoned jobs still count against the bound while they run.
+            cat.release()
+            metrics.set_gauge("cpu_executor_in_flight", cat.in_flight, labels=labels)
+
+        try:
+            future = cat.pool.submit(_timed_call, fn, time.monotonic(), args, kwargs)
+        except BaseException:
+            _done(None)
+            raise
+        future.add_done_callback(_done)
+        wait, run, result = await asyncio.wrap_future(future)
+        metrics.observe("cpu_executor_queue_wait_seconds", wait, labels=labels)
+        metrics.observe("cpu_executor_run_seconds", run, labels=labels)
+        return result
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            name: {
+                "in_flight": cat.in_flight,
+                "max_workers": cat.limits.max_workers,
+                "max_queue": cat.limits.max_queue,
+                "kind": cat.limits.kind,
+            }
+            for name, cat in self._categories.items()
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        for cat in self._categories.values():
+            cat.shutdown(wait)
+
+
+_executor: Optional[CPUExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_cpu_executor() -> CPUExecutor:
+    """Return the process-wide executor singleton."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = CPUExecutor()
+    return _executor
+
+
+async def run_cpu(category: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Shorthand for ``get_cpu_executor().run(...)``."""
+    return await get_cpu_executor().run(category, fn, *args, **kwargs)
+
+
+async def run_cpu_retrying(category: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """``run_cpu`` for background work: wait out a saturated queue and retry.
+
+    Up to ``CPU_EXECUTOR_RETRY_ATTEMPTS`` attempts, sleeping ``retry_after``
+    between them; ``ExecutorSaturated`` from the last attempt propagates.
+    """
+    attempt = 1
+    while True:
+        try:
+            return await run_cpu(category, fn, *args, **kwargs)
+        except ExecutorSaturated as exc:
+            if attempt >= RETRY_ATTEMPTS:
+                raise
+            await asyncio.sleep(exc.retry_after * attempt)
+            attempt += 1
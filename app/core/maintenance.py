@@ -13,7 +13,7 @@ from app.domains.identity.models import AuditLog
 from app.domains.support.models import ChatMessage
 from app.gateway.persistence import persistence
 from app.shared.db import open_session
-from app.memory.librarian_v2 import LibrarianWorker
+from app.memory.librarian_v2 import DatabaseJobStore, LibrarianWorker
 
 logger = structlog.get_logger()
 
@@ -24,7 +24,7 @@ async def run_data_retention_cleanup() -> dict:
     
     try:
         # 1. Archive old sessions via Librarian (Titan Upgrade)
-        librarian = LibrarianWorker()
+        librarian = LibrarianWorker(job_store=DatabaseJobStore())
         await librarian.run_archival_cycle()
         
         # 2. Load retention settings from system tenant
@@ -1,11 +1,14 @@
 """MediaAsset ORM model for tenant media uploads and AI-generated images."""
 from __future__ import annotations
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
 from app.core.db import Base
 
 class MediaAsset(Base):
     __tablename__ = "media_assets"
+    __table_args__ = (
+        Index("ix_media_assets_tenant_sha256", "tenant_id", "content_sha256"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
     filename = Column(String(255), nullable=False)
@@ -28,6 +31,8 @@ class MediaAsset(Base):
     brightness      = Column(String(16), nullable=True)    # "light"|"dark"|"neutral"
     orientation     = Column(String(16), nullable=True)    # "landscape"|"portrait"|"square"
     aspect_ratio    = Column(String(16), nullable=True)    # e.g. "16:9"
+    content_sha256  = Column(String(64), nullable=True)    # per-tenant upload dedup
+    derivatives     = Column(JSON, nullable=True)          # {"thumb": "<uuid>_thumb.webp", "preview": ...}
 
 
 class TenantBrandReference(Base):
@@ -39,3 +44,30 @@ class TenantBrandReference(Base):
     asset_id = Column(Integer, ForeignKey("media_assets.id"), nullable=True)
     label = Column(String(128), nullable=True)   # e.g. "Logo", "Hero", "Color Reference"
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class ImageGenerationJob(Base):
+    """Queued AI image generation/edit; credits are reserved while it runs."""
+    __tablename__ = "image_generation_jobs"
+    __table_args__ = (
+        Index("ix_image_generation_jobs_tenant_status", "tenant_id", "status"),
+        Index("ix_image_generation_jobs_tenant_created", "tenant_id", "created_at"),
+    )
+
+    id = Column(String(36), primary_key=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    kind = Column(String(16), nullable=False, default="generate")        # "generate" | "edit"
+    status = Column(String(16), nullable=False, default="queued")        # "queued"|"running"|"succeeded"|"failed"
+    stage = Column(String(32), nullable=True)                            # e.g. "generating", "saving"
+    progress = Column(Integer, nullable=False, default=0)                # 0-100
+    request = Column(JSON, nullable=False)
+    source_asset_id = Column(Integer, ForeignKey("media_assets.id"), nullable=True)
+    credits_reserved = Column(Integer, nullable=False, default=0)
+    credit_state = Column(String(16), nullable=False, default="reserved")  # "reserved"|"committed"|"released"
+    asset_id = Column(Integer, ForeignKey("media_assets.id"), nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -38,6 +38,8 @@ from app.domains.identity.models import (
 from app.domains.knowledge.models import IngestionJob, IngestionJobStatus
 from app.domains.platform.models import Setting, TenantConfig
 from app.domains.support.models import (
+    AnalyticsRollup,
+    AnalyticsRollupWatermark,
     ChatMessage,
     ChatSession,
     ContactConsent,
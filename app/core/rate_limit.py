@@ -0,0 +1,188 @@
+"""Distributed sliding-window rate limiting shared by all gateway workers.
+
+Each limit is a sliding log kept in a Redis sorted set (score = request time
+in ms). A single Lua script prunes, counts and records every limit of a
+request atomically, so N uvicorn workers enforce the configured limit once
+instead of N times, and several limits (e.g. per IP + per tenant) cost one
+round trip. A request is only recorded if *all* its limits allow it, so a
+rejected request does not burn quota on the other limits.
+
+Timestamps come from the Redis server clock (``TIME``), keeping workers on
+different hosts consistent. If Redis is unreachable the limiter degrades to
+an in-process sliding window with identical semantics and retries Redis
+after ``redis_retry_seconds``. Async request handlers use ``check_async`` so
+the event loop never waits on the Redis socket.
+
+Note: all keys of one ``check()`` are touched by one script, so on Redis
+Cluster they must share a hash slot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import structlog
+
+from config.settings import get_settings
+
+logger = structlog.get_logger()
+
+# KEYS: one sorted set per limit
+# ARGV: [1] unique member id, then per key: max_requests, window_ms
+# Returns {0, 0} if allowed, else {index of violated limit (1-based), retry_after_ms}
+SLIDING_WINDOW_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[2 * i])
+    local window = tonumber(ARGV[2 * i + 1])
+    redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', now - window)
+    if redis.call('ZCARD', KEYS[i]) >= limit then
+        local retry = window
+        local oldest = redis.call('ZRANGE', KEYS[i], 0, 0, 'WITHSCORES')
+        if oldest[2] then
+            retry = tonumber(oldest[2]) + window - now
+        end
+        return {i, retry}
+    end
+end
+for i = 1, #KEYS do
+    redis.call('ZADD', KEYS[i], now, ARGV[1])
+    redis.call('PEXPIRE', KEYS[i], tonumber(ARGV[2 * i + 1]))
+end
+return {0, 0}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """``max_requests`` per sliding ``window_seconds`` on ``key``."""
+
+    key: str
+    max_requests: int
+    window_seconds: float
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    violated: Optional[RateLimit] = None
+    retry_after: float = 0.0
+    backend: str = "redis"
+
+
+class InProcessSlidingWindow:
+    """Per-process sliding-log fallback with the same semantics as the Lua script."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, max_keys: int = 100_000) -> None:
+        self._clock = clock
+        self._max_keys = max_keys
+        self._windows: dict[str, tuple[float, deque[float]]] = {}  # key -> (window_seconds, timestamps)
+        self._lock = threading.Lock()
+
+    def check(self, limits: tuple[RateLimit, ...]) -> RateLimitResult:
+        now = self._clock()
+        with self._lock:
+            for limit in limits:
+                entry = self._windows.get(limit.key)
+                if entry is None:
+                    continue
+                window = entry[1]
+                cutoff = now - limit.window_seconds
+                while window and window[0] <= cutoff:
+                    window.popleft()
+                if len(window) >= limit.max_requests:
+                    retry_after = window[0] + limit.window_seconds - now if window else limit.window_seconds
+                    return RateLimitResult(False, limit, max(0.0, retry_after), backend="memory")
+            for limit in limits:
+                entry = self._windows.get(limit.key)
+                if entry is None:
+                    entry = self._windows[limit.key] = (limit.window_seconds, deque())
+                entry[1].append(now)
+            if len(self._windows) > self._max_keys:
+                self._prune(now)
+        return RateLimitResult(True, backend="memory")
+
+    def _prune(self, now: float) -> None:
+        """Drop keys whose newest request has left their window (the PEXPIRE equivalent)."""
+        stale = [k for k, (span, w) in self._windows.items() if not w or w[-1] <= now - span]
+        for key in stale:
+            del self._windows[key]
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+
+class DistributedRateLimiter:
+    """Sliding-window limiter backed by Redis, with in-process fallback."""
+
+    def __init__(
+        self,
+        redis_client: Any = None,
+        fallback: Optional[InProcessSlidingWindow] = None,
+        redis_retry_seconds: float = 5.0,
+    ) -> None:
+        self._redis = redis_client
+        self._script: Any = None
+        self.fallback = fallback or InProcessSlidingWindow()
+        self.redis_retry_seconds = redis_retry_seconds
+        self._redis_down_until = 0.0
+
+    def _get_script(self) -> Any:
+        if self._redis is None:
+            import redis as _redis
+            self._redis = _redis.from_url(
+                get_settings().redis_url,
+                socket_timeout=0.25,
+                socket_connect_timeout=0.25,
+            )
+        if self._script is None:
+            self._script = self._redis.register_script(SLIDING_WINDOW_LUA)
+        return self._script
+
+    def check(self, *limits: RateLimit) -> RateLimitResult:
+        """Check (and on success record) all ``limits`` in one atomic step."""
+        if not limits:
+            return RateLimitResult(True)
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                args: list[Any] = [uuid.uuid4().hex]
+                for limit in limits:
+                    args.extend((limit.max_requests, int(limit.window_seconds * 1000)))
+                index, retry_ms = self._get_script()(keys=[limit.key for limit in limits], args=args)
+                if self._redis_down_until:
+                    self._redis_down_until = 0.0
+                    logger.info("rate_limit.redis_recovered")
+                index = int(index)
+                if index == 0:
+                    return RateLimitResult(True)
+                return RateLimitResult(False, limits[index - 1], max(0.0, int(retry_ms) / 1000))
+            except Exception as exc:
+                if not self._redis_down_until:
+                    logger.warning("rate_limit.redis_unavailable", error=str(exc))
+                self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+        return self.fallback.check(limits)
+
+    async def check_async(self, *limits: RateLimit) -> RateLimitResult:
+        """``check`` for async callers; the blocking Redis round trip runs in a worker thread."""
+        return await asyncio.to_thread(self.check, *limits)
+
+    def is_allowed(self, key: str, max_requests: int, window_seconds: float) -> bool:
+        return self.check(RateLimit(key, max_requests, window_seconds)).allowed
+
+
+_limiter: Optional[DistributedRateLimiter] = None
+
+
+def get_distributed_rate_limiter() -> DistributedRateLimiter:
+    """Return the process-wide limiter singleton."""
+    global _limiter
+    if _limiter is None:
+        _limiter = DistributedRateLimiter()
+    return _limiter
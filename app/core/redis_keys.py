@@ -14,7 +14,9 @@ Examples:
     t7:dialog:+4915112345678
     t7:blacklist:jti:{jti}
     t7:user_blacklisted:{user_id}
+    t7:auth:invalidate  (pub/sub channel)
     t7:rate_limit:user:+4915112345678
+    anon:rate_limit:login:{ip}  (pre-tenant endpoints only)
     t7:session:cache:{session_id}
     t7:usage:{year}:{month}
     t7:circuit_breaker:{integration_name}
@@ -68,6 +70,11 @@ def user_blacklisted_key(tenant_id: int | str, user_id: int | str) -> str:
     return redis_key(tenant_id, "user_blacklisted", str(user_id))
 
 
+def auth_invalidation_channel(tenant_id: int | str) -> str:
+    """Pub/sub channel for AuthContext cache invalidations (pattern: t*:auth:invalidate)."""
+    return redis_key(tenant_id, "auth", "invalidate")
+
+
 # ─── Conversation State Keys ────────────────────────────────────────────────
 
 
@@ -99,6 +106,17 @@ def rate_limit_key(tenant_id: int | str, level: str, identifier: str) -> str:
     return redis_key(tenant_id, "rate_limit", level, identifier)
 
 
+def anonymous_rate_limit_key(scope: str, identifier: str) -> str:
+    """Rate limit counter for requests not yet bound to a tenant (login, webhook ingress).
+
+    The only key family without a tenant prefix: these limits must apply
+    *before* a tenant can be resolved.
+    """
+    if not scope:
+        raise ValueError("anonymous_rate_limit_key requires a scope")
+    return f"anon:rate_limit:{scope}:{identifier}"
+
+
 # ─── Usage & Metering Keys ──────────────────────────────────────────────────
 
 
@@ -146,6 +164,16 @@ def integration_cache_key(
     return redis_key(tenant_id, *parts)
 
 
+def answer_cache_generation_key(tenant_slug: str | None) -> str:
+    """Answer-cache generation counter, bumped on every knowledge write.
+
+    Knowledge collections and the answer cache are keyed by tenant slug, so
+    this family is prefixed with the slug; ``None`` is the counter for
+    writes that affect every tenant (shared documents).
+    """
+    return f"slug:{tenant_slug}:answer_cache:generation" if tenant_slug else "all:answer_cache:generation"
+
+
 # ─── Context-Aware Helpers ───────────────────────────────────────────────────
 
 
@@ -21,8 +21,11 @@ from __future__ import annotations
 
 import time
 import functools
+import math
 import secrets
-from collections import defaultdict
+import threading
+import weakref
+from bisect import bisect_left
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -228,6 +231,199 @@ class TracingManager:
         return traces
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# HISTOGRAM PRIMITIVES
+# ══════════════════════════════════════════════════════════════════════════════
+
+_log = math.log
+_ceil = math.ceil
+
+# Prometheus client defaults (seconds) and the same scale for *_ms metrics
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+DEFAULT_MS_BUCKETS: tuple[float, ...] = (
+    5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)
+
+
+class DDSketch:
+    """Mergeable quantile sketch with bounded relative error (DDSketch).
+
+    Values are mapped to logarithmic bins ``ceil(log_gamma(v))`` with
+    ``gamma = (1 + a) / (1 - a)``, so every quantile estimate is within
+    relative accuracy ``a`` of the true value. Memory is bounded by
+    ``max_bins`` per sign; when exceeded, the lowest bins are collapsed,
+    which only degrades accuracy for the smallest values.
+    """
+
+    __slots__ = ("relative_accuracy", "max_bins", "_log_gamma", "_gamma",
+                 "positive", "negative", "zero_count", "count")
+
+    _MIN_INDEXABLE = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.positive: dict[int, int] = {}
+        self.negative: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value > self._MIN_INDEXABLE:
+            bins = self.positive
+        elif value < -self._MIN_INDEXABLE:
+            bins = self.negative
+            value = -value
+        else:
+            self.zero_count += 1
+            return
+        k = _ceil(_log(value) / self._log_gamma)
+        n = bins.get(k)
+        if n is None:
+            bins[k] = 1
+            if len(bins) > self.max_bins:
+                self._collapse(bins)
+        else:
+            bins[k] = n + 1
+
+    def _collapse(self, bins: dict[int, int]) -> None:
+        keys = sorted(bins)
+        excess = len(keys) - self.max_bins
+        target = keys[excess]
+        bins[target] += sum(bins.pop(k) for k in keys[:excess])
+
+    def merge(self, other: "DDSketch") -> None:
+        """Fold ``other`` into this sketch (both must share ``relative_accuracy``)."""
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for k, n in dict(theirs).items():
+                mine[k] = mine.get(k, 0) + n
+            if len(mine) > self.max_bins:
+                self._collapse(mine)
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def _value(self, k: int) -> float:
+        return 2 * self._gamma ** k / (self._gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile ``q`` using the 0-based rank ``int(q * count)``."""
+        if self.count == 0:
+            return 0.0
+        rank = min(int(q * self.count), self.count - 1)
+        seen = 0
+        for k in sorted(self.negative, reverse=True):
+            seen += self.negative[k]
+            if seen > rank:
+                return -self._value(k)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for k in sorted(self.positive):
+            seen += self.positive[k]
+            if seen > rank:
+                return self._value(k)
+        return self._value(max(self.positive)) if self.positive else 0.0
+
+    def __len__(self) -> int:
+        return len(self.positive) + len(self.negative)
+
+
+class _HistogramShard:
+    """One thread's share of a histogram series. Written only by its owner thread."""
+
+    __slots__ = ("bounds", "buckets", "sum", "count", "min", "max", "sketch", "exact")
+
+    def __init__(self, bounds: tuple[float, ...], relative_accuracy: float, exact_limit: int):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = DDSketch(relative_accuracy)
+        # Raw values are kept only for the first few observations so low-volume
+        # series report exact quantiles; afterwards only the sketch is used.
+        self.exact: Optional[list[float]] = [] if exact_limit > 0 else None
+
+    def observe(self, value: float, exact_limit: int) -> None:
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.sketch.add(value)
+        exact = self.exact
+        if exact is not None:
+            if len(exact) < exact_limit:
+                exact.append(value)
+            else:
+                self.exact = None
+
+
+@dataclass
+class HistogramSnapshot:
+    """Point-in-time merge of all shards of one histogram series."""
+
+    bounds: tuple[float, ...]
+    buckets: list[int]
+    sum: float
+    count: int
+    min: float
+    max: float
+    sketch: DDSketch
+    exact: Optional[list[float]]
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        if self.exact is not None and len(self.exact) == self.count:
+            values = sorted(self.exact)
+            return values[min(int(self.count * q), self.count - 1)]
+        return min(max(self.sketch.quantile(q), self.min), self.max)
+
+    def cumulative_buckets(self) -> list[tuple[str, int]]:
+        """``(le, cumulative count)`` pairs for Prometheus ``_bucket`` lines."""
+        out, running = [], 0
+        for bound, n in zip(self.bounds, self.buckets):
+            running += n
+            out.append((_format_value(bound), running))
+        out.append(("+Inf", running + self.buckets[-1]))
+        return out
+
+
+class _Shard:
+    """Counters and histograms written by a single thread."""
+
+    __slots__ = ("thread", "counters", "histograms")
+
+    def __init__(self, thread: Optional[threading.Thread]):
+        self.thread = weakref.ref(thread) if thread is not None else None
+        self.counters: dict[str, float] = {}
+        self.histograms: dict[str, _HistogramShard] = {}
+
+    def is_dead(self) -> bool:
+        if self.thread is None:
+            return False
+        thread = self.thread()
+        return thread is None or not thread.is_alive()
+
+
+def _format_value(value: float) -> str:
+    """Render a bucket bound the way the Prometheus client does (``5.0``, ``0.005``)."""
+    return repr(float(value))
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # METRICS COLLECTOR
 # ══════════════════════════════════════════════════════════════════════════════
@@ -242,31 +438,97 @@ class MetricsCollector:
     - Error rates (counter)
     - Active connections (gauge)
     - LLM call latency (histogram)
+
+    Counters and histograms are sharded per thread: each thread writes only
+    its own shard, so ``increment``/``observe`` take no lock. Reads and
+    scrapes merge the shards; shards of finished threads are folded into a
+    retired shard so their data survives. Histograms use fixed buckets
+    (``_bucket``/``_sum``/``_count`` exposition) plus a DDSketch for
+    quantiles, so memory per series is constant and quantiles cover all
+    observations since start rather than the most recent ones.
     """
 
-    def __init__(self):
-        self._counters: dict[str, float] = defaultdict(float)
-        self._gauges: dict[str, float] = defaultdict(float)
-        self._histograms: dict[str, list[float]] = defaultdict(list)
-        self._histogram_max_size = 10_000
+    def __init__(self, relative_accuracy: float = 0.01, exact_sample_limit: int = 64):
+        self._relative_accuracy = relative_accuracy
+        self._exact_limit = exact_sample_limit
+        self._gauges: dict[str, float] = {}
+        self._bucket_overrides: dict[str, tuple[float, ...]] = {}
+        self._series: dict[str, tuple[str, str]] = {}  # key -> (name, label body)
+        self._key_cache: dict[tuple, str] = {}
+        self._local = threading.local()
+        self._shards: list[_Shard] = []
+        self._retired = _Shard(None)
+        self._shards_lock = threading.Lock()
 
     def _key(self, name: str, labels: Optional[dict] = None) -> str:
-        """Create a metric key with labels."""
+        """Create a metric key with labels (Prometheus series syntax)."""
         if not labels:
             return name
-        label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
-        return f"{name}{{{label_str}}}"
+        cache_key = (name, *labels.items())
+        key = self._key_cache.get(cache_key)
+        if key is None:
+            body = ",".join(f'{k}="{_escape_label(v)}"' for k, v in sorted(labels.items()))
+            key = f"{name}{{{body}}}"
+            self._series[key] = (name, body)
+            self._key_cache[cache_key] = key
+        return key
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard(threading.current_thread())
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def _all_shards(self) -> list[_Shard]:
+        """Fold shards of finished threads into the retired shard, return all shards."""
+        with self._shards_lock:
+            dead = [s for s in self._shards if s.is_dead()]
+            if dead:
+                for shard in dead:
+                    self._absorb(self._retired, shard)
+                self._shards = [s for s in self._shards if s not in dead]
+            return [self._retired, *self._shards]
+
+    @staticmethod
+    def _absorb(target: _Shard, source: _Shard) -> None:
+        for key, value in source.counters.items():
+            target.counters[key] = target.counters.get(key, 0.0) + value
+        for key, hist in source.histograms.items():
+            mine = target.histograms.get(key)
+            if mine is None:
+                target.histograms[key] = hist
+                continue
+            mine.buckets = [a + b for a, b in zip(mine.buckets, hist.buckets)]
+            mine.sum += hist.sum
+            mine.count += hist.count
+            mine.min = min(mine.min, hist.min)
+            mine.max = max(mine.max, hist.max)
+            mine.sketch.merge(hist.sketch)
+            mine.exact = None
 
     # --- Counters ---
 
     def increment(self, name: str, value: float = 1.0,
                   labels: Optional[dict] = None) -> None:
         """Increment a counter metric."""
-        self._counters[self._key(name, labels)] += value
+        key = self._key(name, labels)
+        counters = self._shard().counters
+        counters[key] = counters.get(key, 0.0) + value
 
     def get_counter(self, name: str, labels: Optional[dict] = None) -> float:
         """Get current counter value."""
-        return self._counters.get(self._key(name, labels), 0)
+        key = self._key(name, labels)
+        return sum(s.counters.get(key, 0) for s in self._all_shards())
+
+    def _merged_counters(self) -> dict[str, float]:
+        merged: dict[str, float] = {}
+        for shard in self._all_shards():
+            for key, value in list(shard.counters.items()):
+                merged[key] = merged.get(key, 0.0) + value
+        return merged
 
     # --- Gauges ---
 
@@ -281,83 +543,144 @@ class MetricsCollector:
 
     # --- Histograms ---
 
+    def register_histogram(self, name: str, buckets: tuple[float, ...]) -> None:
+        """Use custom bucket bounds for ``name`` (before its first observation)."""
+        self._bucket_overrides[name] = tuple(sorted(buckets))
+
+    def _bounds_for(self, name: str) -> tuple[float, ...]:
+        bounds = self._bucket_overrides.get(name)
+        if bounds is not None:
+            return bounds
+        return DEFAULT_MS_BUCKETS if name.endswith("_ms") else DEFAULT_BUCKETS
+
     def observe(self, name: str, value: float,
                 labels: Optional[dict] = None) -> None:
         """Record a histogram observation."""
         key = self._key(name, labels)
-        self._histograms[key].append(value)
-
-        # Limit memory
-        if len(self._histograms[key]) > self._histogram_max_size:
-            self._histograms[key] = self._histograms[key][-self._histogram_max_size // 2:]
+        histograms = self._shard().histograms
+        hist = histograms.get(key)
+        if hist is None:
+            hist = histograms[key] = _HistogramShard(
+                self._bounds_for(name), self._relative_accuracy, self._exact_limit,
+            )
+        hist.observe(value, self._exact_limit)
+
+    def _snapshot(self, key: str, shards: Optional[list[_Shard]] = None) -> Optional[HistogramSnapshot]:
+        snap: Optional[HistogramSnapshot] = None
+        for shard in shards if shards is not None else self._all_shards():
+            hist = shard.histograms.get(key)
+            if hist is None or hist.count == 0:
+                continue
+            exact = list(hist.exact) if hist.exact is not None else None
+            if snap is None:
+                sketch = DDSketch(self._relative_accuracy)
+                sketch.merge(hist.sketch)
+                snap = HistogramSnapshot(
+                    bounds=hist.bounds, buckets=list(hist.buckets), sum=hist.sum,
+                    count=hist.count, min=hist.min, max=hist.max, sketch=sketch, exact=exact,
+                )
+                continue
+            snap.buckets = [a + b for a, b in zip(snap.buckets, hist.buckets)]
+            snap.sum += hist.sum
+            snap.count += hist.count
+            snap.min = min(snap.min, hist.min)
+            snap.max = max(snap.max, hist.max)
+            snap.sketch.merge(hist.sketch)
+            snap.exact = snap.exact + exact if snap.exact is not None and exact is not None else None
+        return snap
+
+    def get_histogram(self, name: str, labels: Optional[dict] = None) -> Optional[HistogramSnapshot]:
+        """Merged snapshot of one histogram series, or ``None`` if never observed."""
+        return self._snapshot(self._key(name, labels))
 
     def get_histogram_stats(self, name: str,
                             labels: Optional[dict] = None) -> dict[str, float]:
         """Get histogram statistics (count, avg, p50, p95, p99)."""
-        key = self._key(name, labels)
-        values = self._histograms.get(key, [])
-        if not values:
+        snap = self.get_histogram(name, labels)
+        if snap is None:
             return {"count": 0, "sum": 0, "avg": 0, "min": 0, "max": 0,
                     "p50": 0, "p95": 0, "p99": 0}
+        return self._stats(snap)
 
-        sorted_vals = sorted(values)
-        n = len(sorted_vals)
-
+    @staticmethod
+    def _stats(snap: HistogramSnapshot) -> dict[str, float]:
         return {
-            "count": n,
-            "sum": round(sum(sorted_vals), 2),
-            "avg": round(sum(sorted_vals) / n, 2),
-            "min": round(sorted_vals[0], 2),
-            "max": round(sorted_vals[-1], 2),
-            "p50": round(sorted_vals[int(n * 0.5)], 2),
-            "p95": round(sorted_vals[min(int(n * 0.95), n - 1)], 2),
-            "p99": round(sorted_vals[min(int(n * 0.99), n - 1)], 2),
+            "count": snap.count,
+            "sum": round(snap.sum, 2),
+            "avg": round(snap.sum / snap.count, 2),
+            "min": round(snap.min, 2),
+            "max": round(snap.max, 2),
+            "p50": round(snap.quantile(0.5), 2),
+            "p95": round(snap.quantile(0.95), 2),
+            "p99": round(snap.quantile(0.99), 2),
         }
 
+    def _histogram_keys(self, shards: list[_Shard]) -> set[str]:
+        keys: set[str] = set()
+        for shard in shards:
+            keys.update(list(shard.histograms))
+        return keys
+
     # --- Export ---
 
     def get_all_metrics(self) -> dict[str, Any]:
         """Get all metrics in a structured format."""
+        shards = self._all_shards()
+        histograms = {}
+        for key in self._histogram_keys(shards):
+            snap = self._snapshot(key, shards)
+            if snap is not None:
+                histograms[key] = self._stats(snap)
         return {
-            "counters": dict(self._counters),
+            "counters": self._merged_counters(),
             "gauges": dict(self._gauges),
-            "histograms": {
-                k: self.get_histogram_stats(k)
-                for k in self._histograms
-            },
+            "histograms": histograms,
         }
 
+    def _split(self, key: str) -> tuple[str, str]:
+        return self._series.get(key, (key, ""))
+
     def to_prometheus(self) -> str:
         """Export metrics in Prometheus text format."""
         lines = []
+        typed: set[str] = set()
+
+        def _type(name: str, kind: str) -> None:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
 
-        for key, value in sorted(self._counters.items()):
-            name = key.split("{")[0]
-            lines.append(f"# TYPE {name} counter")
+        for key, value in sorted(self._merged_counters().items()):
+            _type(self._split(key)[0], "counter")
             lines.append(f"{key} {value}")
 
-        for key, value in sorted(self._gauges.items()):
-            name = key.split("{")[0]
-            lines.append(f"# TYPE {name} gauge")
+        for key, value in sorted(dict(self._gauges).items()):
+            _type(self._split(key)[0], "gauge")
             lines.append(f"{key} {value}")
 
-        for key in sorted(self._histograms.keys()):
-            name = key.split("{")[0]
-            stats = self.get_histogram_stats(key)
-            lines.append(f"# TYPE {name} summary")
-            lines.append(f'{key}{{quantile="0.5"}} {stats["p50"]}')
-            lines.append(f'{key}{{quantile="0.95"}} {stats["p95"]}')
-            lines.append(f'{key}{{quantile="0.99"}} {stats["p99"]}')
-            lines.append(f"{name}_count {stats['count']}")
-            lines.append(f"{name}_sum {stats['sum']}")
+        shards = self._all_shards()
+        for key in sorted(self._histogram_keys(shards)):
+            snap = self._snapshot(key, shards)
+            if snap is None:
+                continue
+            name, body = self._split(key)
+            _type(name, "histogram")
+            prefix = f"{body}," if body else ""
+            for le, count in snap.cumulative_buckets():
+                lines.append(f'{name}_bucket{{{prefix}le="{le}"}} {count}')
+            suffix = f"{{{body}}}" if body else ""
+            lines.append(f"{name}_sum{suffix} {snap.sum}")
+            lines.append(f"{name}_count{suffix} {snap.count}")
 
         return "\n".join(lines) + "\n"
 
     def reset(self) -> None:
         """Reset all metrics."""
-        self._counters.clear()
+        with self._shards_lock:
+            for shard in [self._retired, *self._shards]:
+                shard.counters.clear()
+                shard.histograms.clear()
         self._gauges.clear()
-        self._histograms.clear()
 
 
 # ══════════════════════════════════════════════════════════════════════════════
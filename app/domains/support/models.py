@@ -67,6 +67,8 @@ class StudioMember(Base, TenantScopedMixin):
     checkin_stats = Column(Text, nullable=True)
     recent_bookings = Column(Text, nullable=True)
     enriched_at = Column(DateTime(timezone=True), nullable=True)
+    sync_hash = Column(String(64), nullable=True)
+    contract_synced_at = Column(DateTime(timezone=True), nullable=True)
     source = Column(String, default="manual", nullable=False)
     source_id = Column(String, nullable=True)
     tags = Column(Text, nullable=True)
@@ -167,13 +169,138 @@ class ContactConsent(Base):
     optin_token = Column(String(255), nullable=True, unique=True)
 
 
+class AnalyticsRollup(Base, TenantScopedMixin):
+    """Pre-aggregated analytics counters per hour/day bucket.
+
+    ``source`` is ``"session"`` (chat sessions) or ``"message"`` (assistant
+    messages). Maintained by ``app.platform.analytics_rollups``.
+    """
+
+    __tablename__ = "analytics_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id", "source", "granularity", "bucket_start",
+            "channel", "intent", "agent", "escalation_reason",
+            name="uq_analytics_rollup_bucket",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(16), nullable=False)
+    granularity = Column(String(8), nullable=False)  # "hour" | "day"
+    bucket_start = Column(DateTime(timezone=True), nullable=False, index=True)
+    channel = Column(String(64), nullable=False, default="unknown")
+    intent = Column(String(128), nullable=False, default="")
+    agent = Column(String(64), nullable=False, default="")
+    escalation_reason = Column(String(128), nullable=False, default="")
+    count = Column(Integer, nullable=False, default=0)
+    escalated = Column(Integer, nullable=False, default=0)
+    unresolved = Column(Integer, nullable=False, default=0)
+    rating_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Float, nullable=False, default=0.0)
+    rating_1 = Column(Integer, nullable=False, default=0)
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
+    promoters = Column(Integer, nullable=False, default=0)
+    detractors = Column(Integer, nullable=False, default=0)
+    message_count_n = Column(Integer, nullable=False, default=0)
+    message_count_sum = Column(Integer, nullable=False, default=0)
+    confidence_count = Column(Integer, nullable=False, default=0)
+    confidence_sum = Column(Float, nullable=False, default=0.0)
+    confidence_high = Column(Integer, nullable=False, default=0)
+    confidence_mid = Column(Integer, nullable=False, default=0)
+    confidence_low_mid = Column(Integer, nullable=False, default=0)
+    confidence_low = Column(Integer, nullable=False, default=0)
+
+
+class AnalyticsRollupWatermark(Base):
+    """Highest source row id folded into ``analytics_rollups``, per source."""
+
+    __tablename__ = "analytics_rollup_watermarks"
+
+    source = Column(String(16), primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+
+class MemberMemoryWatermark(Base, TenantScopedMixin):
+    """Inputs folded into a member's memory file at its last analysis.
+
+    ``last_message_id`` is the newest chat message seen; ``input_hash``
+    covers the CRM data and extraction instructions. Maintained by
+    ``app.memory.member_memory_analyzer``.
+    """
+
+    __tablename__ = "member_memory_watermarks"
+    __table_args__ = (UniqueConstraint("tenant_id", "member_id", name="uq_member_memory_watermark"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    member_id = Column(String(64), nullable=False)
+    last_message_id = Column(Integer, nullable=False, default=0)
+    input_hash = Column(String(64), nullable=False, default="")
+    analyzed_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class LibrarianJob(Base, TenantScopedMixin):
+    """Persisted state of a librarian archival job (``app.memory.librarian_v2``)."""
+
+    __tablename__ = "librarian_jobs"
+
+    job_id = Column(String(32), primary_key=True)
+    member_id = Column(String, nullable=False)
+    session_id = Column(String, nullable=True)
+    chat_session_id = Column(Integer, nullable=True, index=True)
+    status = Column(String(16), nullable=False, default="pending", index=True)
+    retry_count = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class KnowledgeGapTopic(Base, TenantScopedMixin):
+    """Aggregated knowledge-gap counters per tenant and normalized topic.
+
+    Flushed periodically by ``KnowledgeGapDetector`` in
+    ``app.platform.ghost_mode_v2``.
+    """
+
+    __tablename__ = "knowledge_gap_topics"
+    __table_args__ = (UniqueConstraint("tenant_id", "topic_key", name="uq_knowledge_gap_topic"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    topic_key = Column(String(200), nullable=False)
+    category = Column(String(32), nullable=False, default="unknown")
+    topic = Column(String(200), nullable=False, default="")
+    occurrences = Column(Integer, nullable=False, default=0)
+    confidence_sum = Column(Float, nullable=False, default=0.0)
+    max_confidence = Column(Float, nullable=False, default=0.0)
+    sample_query = Column(Text, nullable=True)
+    sample_response = Column(Text, nullable=True)
+    conversation_id = Column(String, nullable=True)
+    first_seen = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    last_seen = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True)
+    resolved = Column(Boolean, nullable=False, default=False)
+
+
 __all__ = [
+    "AnalyticsRollup",
+    "AnalyticsRollupWatermark",
     "ChatMessage",
     "ChatSession",
     "ContactConsent",
+    "KnowledgeGapTopic",
+    "LibrarianJob",
     "MemberCustomColumn",
     "MemberFeedback",
     "MemberImportLog",
+    "MemberMemoryWatermark",
     "MemberSegment",
     "ScheduledFollowUp",
     "StudioMember",
@@ -49,6 +49,24 @@ def get_support_workers() -> list[WorkerDefinition]:
             class_name="run_member_memory_scheduler_forever",
             kind="async",
         ),
+        WorkerDefinition(
+            name="analytics-rollup",
+            module_path="app.worker_runtime.support_loops",
+            class_name="run_analytics_rollup_forever",
+            kind="async",
+        ),
+        WorkerDefinition(
+            name="stripe-mirror-reconcile",
+            module_path="app.worker_runtime.support_loops",
+            class_name="run_stripe_mirror_reconcile_forever",
+            kind="async",
+        ),
+        WorkerDefinition(
+            name="image-job-reaper",
+            module_path="app.worker_runtime.support_loops",
+            class_name="run_image_job_reaper_forever",
+            kind="async",
+        ),
     ]
 
 
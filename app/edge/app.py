@@ -39,9 +39,33 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         # Unlike legacy main.py, we might want to fail hard if a core infrastructural component fails
         # but for compatibility, we log it.
 
+    # 2. Memory platform event bus: per-topic workers (and stream readers in redis mode)
+    try:
+        from app.memory_platform.event_bus import get_event_bus
+        await get_event_bus().start()
+    except Exception as exc:
+        logger.error("edge.startup.event_bus_failed", error=str(exc))
+
+    # 3. Image jobs left queued by a worker that died before running them
+    try:
+        from app.media.image_jobs import get_image_job_runner
+        await get_image_job_runner().resume_queued()
+    except Exception as exc:
+        logger.error("edge.startup.image_jobs_resume_failed", error=str(exc))
+
     yield  # Application is running
 
     logger.info("edge.shutdown.begin")
+    try:
+        from app.memory_platform.prefetcher import get_context_prefetcher
+        await get_context_prefetcher().aclose()
+    except Exception as exc:
+        logger.error("edge.shutdown.prefetcher_failed", error=str(exc))
+    try:
+        from app.memory_platform.event_bus import get_event_bus
+        await get_event_bus().stop()
+    except Exception as exc:
+        logger.error("edge.shutdown.event_bus_failed", error=str(exc))
     try:
         from app.gateway.dependencies import redis_bus
         await redis_bus.disconnect()
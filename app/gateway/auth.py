@@ -13,13 +13,11 @@ Security features:
   - Password complexity validation
 """
 from datetime import datetime, timedelta, timezone
-from collections import defaultdict
 import hashlib
 import math
 import re
 import secrets
 import threading
-import time
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
@@ -33,12 +31,14 @@ from app.core.auth import (
     create_refresh_token,
     decode_refresh_token,
     get_current_user,
-    hash_password,
+    hash_password_async,
     invalidate_user_sessions,
     normalize_tenant_slug,
     require_role,
-    verify_password,
+    verify_password_async,
 )
+from app.core.rate_limit import RateLimit, get_distributed_rate_limiter
+from app.core.redis_keys import anonymous_rate_limit_key
 from app.domains.billing.models import Plan, Subscription
 from app.domains.identity.models import AuditLog, PendingInvitation, Tenant, UserAccount
 from app.shared.db import session_scope
@@ -53,25 +53,7 @@ AUTH_COOKIE = "ariia_access_token"
 CSRF_COOKIE = "ariia_csrf_token"
 IMPERSONATION_TTL_SECONDS = 45 * 60
 
-# ─── Rate Limiting (per-endpoint, in-memory) ────────────────────────────────
-
-class _SlidingWindowCounter:
-    """Simple sliding-window rate limiter."""
-    def __init__(self):
-        self._windows: dict[str, list[float]] = defaultdict(list)
-
-    def is_allowed(self, key: str, max_requests: int, window_seconds: int) -> bool:
-        now = time.monotonic()
-        window = self._windows[key]
-        # Remove expired entries
-        cutoff = now - window_seconds
-        self._windows[key] = [t for t in window if t > cutoff]
-        if len(self._windows[key]) >= max_requests:
-            return False
-        self._windows[key].append(now)
-        return True
-
-_rate_limiter = _SlidingWindowCounter()
+# ─── Rate Limiting (per-endpoint, shared across workers via Redis) ──────────
 
 def _get_client_ip(request: Request) -> str:
     forwarded = request.headers.get("x-forwarded-for", "")
@@ -79,17 +61,19 @@ def _get_client_ip(request: Request) -> str:
         return forwarded.split(",")[0].strip()
     return request.client.host if request.client else "unknown"
 
-def _check_rate_limit(request: Request, endpoint: str, max_requests: int, window_seconds: int, extra_key: str = ""):
+async def _check_rate_limit(request: Request, endpoint: str, max_requests: int, window_seconds: int, extra_key: str = ""):
     import os
     if os.getenv("ENVIRONMENT") == "testing":
         return  # Skip rate limiting in test mode
     ip = _get_client_ip(request)
-    key = f"{endpoint}:{ip}:{extra_key}"
-    if not _rate_limiter.is_allowed(key, max_requests, window_seconds):
-        logger.warning("auth.rate_limit_exceeded", endpoint=endpoint, ip=ip)
+    key = anonymous_rate_limit_key(endpoint, f"{ip}:{extra_key}")
+    result = await get_distributed_rate_limiter().check_async(RateLimit(key, max_requests, window_seconds))
+    if not result.allowed:
+        logger.warning("auth.rate_limit_exceeded", endpoint=endpoint, ip=ip, backend=result.backend)
         raise HTTPException(
             status_code=429,
             detail="Too many requests. Please try again later.",
+            headers={"Retry-After": str(int(result.retry_after) + 1)},
         )
 
 # ─── Account Lockout ────────────────────────────────────────────────────────
@@ -398,7 +382,7 @@ def _send_password_changed_email(user: UserAccount) -> None:
 @router.post("/register")
 async def register(req: RegisterRequest, request: Request, response: Response) -> dict:
     # Rate limit: 3 registrations per IP per hour
-    _check_rate_limit(request, "register", max_requests=3, window_seconds=3600)
+    await _check_rate_limit(request, "register", max_requests=3, window_seconds=3600)
 
     # Password complexity check
     pw_error = validate_password_strength(req.password)
@@ -446,7 +430,7 @@ async def register(req: RegisterRequest, request: Request, response: Response) -
             email=email,
             full_name=req.full_name,
             role="tenant_admin",
-            password_hash=hash_password(req.password),
+            password_hash=await hash_password_async(req.password),
             is_active=True,
             email_verified=False,
             email_verification_token=_hash_token(verification_code),
@@ -531,7 +515,7 @@ async def register(req: RegisterRequest, request: Request, response: Response) -
 @router.post("/verify-email")
 async def verify_email(req: VerifyEmailRequest, request: Request) -> dict:
     """Verify email address with 6-digit code."""
-    _check_rate_limit(request, "verify-email", max_requests=5, window_seconds=900)
+    await _check_rate_limit(request, "verify-email", max_requests=5, window_seconds=900)
 
     with session_scope() as db:
         email = _normalize_email(req.email)
@@ -576,7 +560,7 @@ async def verify_email(req: VerifyEmailRequest, request: Request) -> dict:
 @router.post("/resend-verification")
 async def resend_verification(req: ResendVerificationRequest, request: Request) -> dict:
     """Resend email verification code (max 3 per hour)."""
-    _check_rate_limit(request, "resend-verification", max_requests=3, window_seconds=3600)
+    await _check_rate_limit(request, "resend-verification", max_requests=3, window_seconds=3600)
 
     with session_scope() as db:
         email = _normalize_email(req.email)
@@ -600,7 +584,7 @@ async def resend_verification(req: ResendVerificationRequest, request: Request)
 @router.post("/login")
 async def login(req: LoginRequest, request: Request, response: Response) -> dict:
     # Rate limit: 10 login attempts per IP per 15 minutes
-    _check_rate_limit(request, "login", max_requests=10, window_seconds=900)
+    await _check_rate_limit(request, "login", max_requests=10, window_seconds=900)
 
     with session_scope() as db:
         email = _normalize_email(req.email)
@@ -613,7 +597,7 @@ async def login(req: LoginRequest, request: Request, response: Response) -> dict
         _check_account_lockout(user)
 
         # Verify password
-        if not user.password_hash or not verify_password(req.password, user.password_hash):
+        if not user.password_hash or not await verify_password_async(req.password, user.password_hash):
             _record_failed_login(db, user)
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
@@ -697,7 +681,7 @@ async def refresh_token_endpoint(
     1. Request body (JSON)
     2. HttpOnly cookie (ariia_refresh_token)
     """
-    _check_rate_limit(request, "refresh", max_requests=30, window_seconds=900)
+    await _check_rate_limit(request, "refresh", max_requests=30, window_seconds=900)
 
     # Get refresh token from body or cookie
     rt = None
@@ -769,7 +753,7 @@ async def refresh_token_endpoint(
 @router.post("/forgot-password")
 async def forgot_password(req: ForgotPasswordRequest, request: Request) -> dict:
     """Send password reset email. Always returns 200 to prevent email enumeration."""
-    _check_rate_limit(request, "forgot-password", max_requests=3, window_seconds=3600)
+    await _check_rate_limit(request, "forgot-password", max_requests=3, window_seconds=3600)
 
     with session_scope() as db:
         email = _normalize_email(req.email)
@@ -790,7 +774,7 @@ async def forgot_password(req: ForgotPasswordRequest, request: Request) -> dict:
 @router.post("/reset-password")
 async def reset_password(req: ResetPasswordRequest, request: Request) -> dict:
     """Reset password with code from email."""
-    _check_rate_limit(request, "reset-password", max_requests=5, window_seconds=900)
+    await _check_rate_limit(request, "reset-password", max_requests=5, window_seconds=900)
 
     # Password complexity check
     pw_error = validate_password_strength(req.new_password)
@@ -822,7 +806,7 @@ async def reset_password(req: ResetPasswordRequest, request: Request) -> dict:
 
         # Update password
         now = datetime.now(timezone.utc)
-        user.password_hash = hash_password(req.new_password)
+        user.password_hash = await hash_password_async(req.new_password)
         user.password_changed_at = now
         user.password_reset_token = None
         user.password_reset_sent_at = None
@@ -832,7 +816,7 @@ async def reset_password(req: ResetPasswordRequest, request: Request) -> dict:
 
         # Invalidate all sessions
         try:
-            invalidate_user_sessions(user.id)
+            invalidate_user_sessions(user.id, user.tenant_id)
         except Exception:
             pass
 
@@ -846,7 +830,7 @@ async def reset_password(req: ResetPasswordRequest, request: Request) -> dict:
 @router.post("/change-password")
 async def change_password(req: ChangePasswordRequest, request: Request, user: AuthContext = Depends(get_current_user)) -> dict:
     """Change password for authenticated user."""
-    _check_rate_limit(request, "change-password", max_requests=5, window_seconds=900)
+    await _check_rate_limit(request, "change-password", max_requests=5, window_seconds=900)
 
     pw_error = validate_password_strength(req.new_password)
     if pw_error:
@@ -858,11 +842,11 @@ async def change_password(req: ChangePasswordRequest, request: Request, user: Au
             raise HTTPException(status_code=404, detail="User not found")
 
         # Verify current password
-        if not db_user.password_hash or not verify_password(req.current_password, db_user.password_hash):
+        if not db_user.password_hash or not await verify_password_async(req.current_password, db_user.password_hash):
             raise HTTPException(status_code=401, detail="Current password is incorrect")
 
         # Update password
-        db_user.password_hash = hash_password(req.new_password)
+        db_user.password_hash = await hash_password_async(req.new_password)
         db_user.password_changed_at = datetime.now(timezone.utc)
         db.commit()
 
@@ -962,12 +946,12 @@ async def update_profile_settings(req: ProfileSettingsUpdate, user: AuthContext
         if req.new_password:
             if not req.current_password:
                 raise HTTPException(status_code=422, detail="Current password required to set new password")
-            if not verify_password(req.current_password, db_user.password_hash):
+            if not await verify_password_async(req.current_password, db_user.password_hash):
                 raise HTTPException(status_code=401, detail="Current password is incorrect")
             pw_error = validate_password_strength(req.new_password)
             if pw_error:
                 raise HTTPException(status_code=422, detail=pw_error)
-            db_user.password_hash = hash_password(req.new_password)
+            db_user.password_hash = await hash_password_async(req.new_password)
             db_user.password_changed_at = datetime.now(timezone.utc)
             db.commit()
             _send_password_changed_email(db_user)
@@ -1037,7 +1021,7 @@ async def create_user(req: CreateUserRequest, user: AuthContext = Depends(get_cu
             email=email,
             full_name=req.full_name,
             role=role,
-            password_hash=hash_password(req.password),
+            password_hash=await hash_password_async(req.password),
             is_active=True,
             email_verified=True,  # Admin-created users are pre-verified
         )
@@ -1090,7 +1074,7 @@ async def update_user(user_id: int, req: UpdateUserRequest, user: AuthContext =
             changes["is_active"] = req.is_active
             if not req.is_active:
                 try:
-                    invalidate_user_sessions(target.id)
+                    invalidate_user_sessions(target.id, target.tenant_id)
                 except Exception:
                     pass
         if req.tenant_id is not None and user.role == "system_admin":
@@ -1100,7 +1084,7 @@ async def update_user(user_id: int, req: UpdateUserRequest, user: AuthContext =
             pw_error = validate_password_strength(req.password)
             if pw_error:
                 raise HTTPException(status_code=422, detail=pw_error)
-            target.password_hash = hash_password(req.password)
+            target.password_hash = await hash_password_async(req.password)
             target.password_changed_at = datetime.now(timezone.utc)
             changes["password"] = "changed"
         db.commit()
@@ -1222,7 +1206,7 @@ async def invite_team_member(
     if user.role not in ("system_admin", "tenant_admin"):
         raise HTTPException(status_code=403, detail="Admin role required to invite team members")
 
-    _check_rate_limit(request, "invite", max_requests=20, window_seconds=3600)
+    await _check_rate_limit(request, "invite", max_requests=20, window_seconds=3600)
 
     with session_scope() as db:
         email = _normalize_email(req.email)
@@ -1377,7 +1361,7 @@ async def accept_invitation(
     response: Response,
 ) -> dict:
     """Accept a team invitation and create user account."""
-    _check_rate_limit(request, "accept-invitation", max_requests=5, window_seconds=900)
+    await _check_rate_limit(request, "accept-invitation", max_requests=5, window_seconds=900)
 
     body = await request.json()
     token = body.get("token", "").strip()
@@ -1425,7 +1409,7 @@ async def accept_invitation(
             email=invitation.email,
             full_name=full_name or None,
             role=invitation.role,
-            password_hash=hash_password(password),
+            password_hash=await hash_password_async(password),
             is_active=True,
             email_verified=True,  # Invitation-based users are pre-verified
         )
@@ -1678,7 +1662,7 @@ async def mfa_setup(
     user: AuthContext = Depends(get_current_user),
 ) -> dict:
     """Begin MFA setup: generate TOTP secret and QR code URI."""
-    _check_rate_limit(request, "mfa-setup", max_requests=5, window_seconds=900)
+    await _check_rate_limit(request, "mfa-setup", max_requests=5, window_seconds=900)
 
     from app.core.mfa import generate_totp_secret, get_totp_uri, encrypt_secret
 
@@ -1691,7 +1675,7 @@ async def mfa_setup(
             raise HTTPException(status_code=400, detail="MFA is already enabled")
 
         # Verify password
-        if not db_user.password_hash or not verify_password(req.password, db_user.password_hash):
+        if not db_user.password_hash or not await verify_password_async(req.password, db_user.password_hash):
             raise HTTPException(status_code=401, detail="Invalid password")
 
         # Generate secret
@@ -1722,7 +1706,7 @@ async def mfa_verify_setup(
     user: AuthContext = Depends(get_current_user),
 ) -> dict:
     """Complete MFA setup by verifying a TOTP code. Returns backup codes."""
-    _check_rate_limit(request, "mfa-verify-setup", max_requests=5, window_seconds=900)
+    await _check_rate_limit(request, "mfa-verify-setup", max_requests=5, window_seconds=900)
 
     from app.core.mfa import verify_totp, decrypt_secret, generate_backup_codes, hash_backup_codes
 
@@ -1793,7 +1777,7 @@ async def mfa_verify_login(
     response: Response,
 ) -> dict:
     """Verify MFA code during login (step 2 of 2-step login)."""
-    _check_rate_limit(request, "mfa-verify", max_requests=10, window_seconds=900)
+    await _check_rate_limit(request, "mfa-verify", max_requests=10, window_seconds=900)
 
     from app.core.mfa import verify_totp, decrypt_secret, verify_backup_code
 
@@ -1906,7 +1890,7 @@ async def mfa_disable(
     user: AuthContext = Depends(get_current_user),
 ) -> dict:
     """Disable MFA. Requires password and current TOTP code."""
-    _check_rate_limit(request, "mfa-disable", max_requests=3, window_seconds=900)
+    await _check_rate_limit(request, "mfa-disable", max_requests=3, window_seconds=900)
 
     from app.core.mfa import verify_totp, decrypt_secret
 
@@ -1919,7 +1903,7 @@ async def mfa_disable(
             raise HTTPException(status_code=400, detail="MFA is not enabled")
 
         # Verify password
-        if not verify_password(req.password, db_user.password_hash):
+        if not await verify_password_async(req.password, db_user.password_hash):
             raise HTTPException(status_code=401, detail="Invalid password")
 
         # Verify TOTP code
@@ -1955,7 +1939,7 @@ async def mfa_regenerate_backup_codes(
     user: AuthContext = Depends(get_current_user),
 ) -> dict:
     """Regenerate backup codes. Requires authenticated user with MFA enabled."""
-    _check_rate_limit(request, "mfa-backup", max_requests=3, window_seconds=3600)
+    await _check_rate_limit(request, "mfa-backup", max_requests=3, window_seconds=3600)
 
     from app.core.mfa import generate_backup_codes, hash_backup_codes
 
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from app.core.auth import AuthContext, get_current_user
 from app.gateway.admin_shared import require_tenant_admin_or_system, resolve_tenant_id_for_slug
@@ -18,31 +20,31 @@ router = APIRouter(
 @router.get("/analytics/overview")
 async def get_analytics_overview(user: AuthContext = Depends(get_current_user)) -> dict[str, Any]:
     require_tenant_admin_or_system(user)
-    return service.get_overview(user)
+    return await asyncio.to_thread(service.get_overview, user)
 
 
 @router.get("/analytics/satisfaction")
 async def analytics_satisfaction(user: AuthContext = Depends(get_current_user)) -> dict[str, Any]:
     require_tenant_admin_or_system(user)
-    return service.get_satisfaction(user)
+    return await asyncio.to_thread(service.get_satisfaction, user)
 
 
 @router.get("/analytics/hourly")
 async def get_analytics_hourly(user: AuthContext = Depends(get_current_user)) -> list[dict[str, Any]]:
     require_tenant_admin_or_system(user)
-    return service.get_hourly(user)
+    return await asyncio.to_thread(service.get_hourly, user)
 
 
 @router.get("/analytics/weekly")
 async def get_analytics_weekly(user: AuthContext = Depends(get_current_user)) -> list[dict[str, Any]]:
     require_tenant_admin_or_system(user)
-    return service.get_weekly(user)
+    return await asyncio.to_thread(service.get_weekly, user)
 
 
 @router.get("/analytics/intents")
 async def get_analytics_intents(user: AuthContext = Depends(get_current_user)) -> list[dict[str, Any]]:
     require_tenant_admin_or_system(user)
-    return service.get_intents(user)
+    return await asyncio.to_thread(service.get_intents, user)
 
 
 @router.get("/analytics/channels")
@@ -53,7 +55,7 @@ async def analytics_channels(
 ) -> list[dict[str, Any]]:
     require_tenant_admin_or_system(user)
     effective_tid = resolve_tenant_id_for_slug(user, tenant_slug)
-    return service.get_channels(effective_tid, days=min(max(days, 1), 90))
+    return await asyncio.to_thread(service.get_channels, effective_tid, days=min(max(days, 1), 90))
 
 
 @router.get("/analytics/sessions/recent")
@@ -67,6 +69,24 @@ async def analytics_recent_sessions(
     return service.get_recent_sessions(effective_tid, limit=min(max(limit, 1), 50))
 
 
+@router.get("/analytics/export")
+async def analytics_export(
+    dataset: str = Query("conversations"),
+    format: str = Query("csv"),
+    columns: str | None = Query(None),
+    days: int = Query(30, ge=1, le=365),
+    gzip: bool = Query(False),
+    tenant_slug: str | None = Query(None),
+    user: AuthContext = Depends(get_current_user),
+) -> StreamingResponse:
+    require_tenant_admin_or_system(user)
+    effective_tid = resolve_tenant_id_for_slug(user, tenant_slug)
+    try:
+        return service.export_rows(effective_tid, dataset=dataset, format=format, columns=columns, days=days, gzip=gzip)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @router.get("/audit")
 async def get_audit_logs(
     limit: int = Query(50, le=500),
@@ -1,14 +1,17 @@
 """Media upload and AI image generation API endpoints."""
 from __future__ import annotations
-from typing import Optional
+import asyncio
+import json
+from typing import AsyncIterator, Optional
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.core.db import get_db
 from app.core.auth import AuthContext, get_current_user
-from app.core.media_models import MediaAsset
+from app.core.media_models import ImageGenerationJob, MediaAsset
 from app.domains.billing.models import ImageCreditPack
 from app.domains.billing.queries import billing_queries
 from app.domains.campaigns.queries import campaign_queries
@@ -43,13 +46,23 @@ class MediaAssetUpdate(BaseModel):
 
 @router.post("/upload", status_code=201)
 async def upload_media(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     alt_text: Optional[str] = None,
     user: AuthContext = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Upload an image file. Supported: PNG, JPG, GIF, WebP. Max 10MB."""
-    from app.media.storage import ALLOWED_EXTENSIONS, MAX_FILE_SIZE, save_upload_bytes, get_public_url
+    """Upload an image file. Supported: PNG, JPG, GIF, WebP. Max 10MB.
+
+    The upload is streamed to disk and hashed on the way; an identical
+    image of the same tenant is returned instead of being stored twice.
+    Metadata and WebP thumbnails are generated in the background.
+    """
+    from app.media.storage import (
+        ALLOWED_EXTENSIONS, IMAGE_MIME_TYPES, MAX_FILE_SIZE, UploadTooLarge,
+        get_images_dir, stage_upload,
+    )
+    from app.media.derivatives import process_asset_derivatives
     from app.media.service import MediaService
     from pathlib import Path
 
@@ -58,55 +71,71 @@ async def upload_media(
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
-    # Read file data first
-    data = await file.read()
-    size = len(data)
-
     # Validate before writing to disk
     ext = Path(file.filename or "").suffix.lower()
     if ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(status_code=400, detail=f"Unsupported file type: {ext}. Allowed: PNG, JPG, GIF, WebP")
-    if size > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail=f"File too large: {size / 1024 / 1024:.1f}MB (max 10MB)")
-
-    # Check storage quota BEFORE writing
-    svc = MediaService(db=db, tenant_id=user.tenant_id, tenant_slug=tenant.slug)
-    svc.check_storage_quota(bytes_to_add=size)
 
-    # Save to disk
+    # Stream to a temp file; size limit and SHA-256 are enforced chunk by chunk
     try:
-        filename, saved_size, mime_type = await save_upload_bytes(data, tenant.slug, file.filename or "upload.jpg")
+        staged = await stage_upload(file, get_images_dir(tenant.slug), ext, MAX_FILE_SIZE)
+    except UploadTooLarge:
+        raise HTTPException(status_code=400, detail="File too large (max 10MB)")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    svc = MediaService(db=db, tenant_id=user.tenant_id, tenant_slug=tenant.slug)
+    try:
+        duplicate = svc.find_duplicate(staged.sha256)
+        if duplicate is None:
+            # Check storage quota BEFORE the file becomes visible
+            svc.check_storage_quota(bytes_to_add=staged.size)
+    except BaseException:
+        await staged.discard()
+        raise
+
+    if duplicate is not None:
+        await staged.discard()
+        if alt_text and not duplicate.alt_text:
+            duplicate.alt_text = alt_text
+            db.commit()
+        logger.info("media.upload_deduplicated", asset_id=duplicate.id, tenant_id=user.tenant_id)
+        return {**_upload_response(duplicate, tenant.slug), "deduplicated": True}
+
+    filename = await staged.commit()
+
     # Record in DB
     asset = svc.record_upload(
         filename=filename,
         original_filename=file.filename,
-        file_size=saved_size,
-        mime_type=mime_type,
+        file_size=staged.size,
+        mime_type=IMAGE_MIME_TYPES[ext],
         width=None,
         height=None,
         created_by=user.user_id,
-        image_data=data,
+        content_sha256=staged.sha256,
     )
     if alt_text:
         asset.alt_text = alt_text
         db.commit()
 
-    svc.increment_storage_usage(saved_size)
+    svc.increment_storage_usage(staged.size)
+    background_tasks.add_task(process_asset_derivatives, asset.id, tenant.slug, filename)
 
-    url = get_public_url(tenant.slug, filename)
-    logger.info("media.upload_complete", asset_id=asset.id, tenant_id=user.tenant_id, size=saved_size)
+    logger.info("media.upload_complete", asset_id=asset.id, tenant_id=user.tenant_id, size=staged.size)
+    return {**_upload_response(asset, tenant.slug), "deduplicated": False}
 
+
+def _upload_response(asset: MediaAsset, tenant_slug: str) -> dict:
+    from app.media.storage import get_public_url
     return {
         "id": asset.id,
-        "url": url,
-        "filename": filename,
-        "original_filename": file.filename,
-        "mime_type": mime_type,
-        "file_size": saved_size,
-        "source": "upload",
+        "url": get_public_url(tenant_slug, asset.filename),
+        "filename": asset.filename,
+        "original_filename": asset.original_filename,
+        "mime_type": asset.mime_type,
+        "file_size": asset.file_size,
+        "source": asset.source,
         "created_at": asset.created_at.isoformat() if asset.created_at else None,
     }
 
@@ -123,12 +152,18 @@ async def upload_document(
     Returns a public URL that can be used as campaign attachment_url.
     The file is stored on the local media volume and served via the
     existing /media/tenants/ static files endpoint — no external service.
+    Every upload gets its own filename; identical content is stored only
+    once on disk and ``deduplicated`` reports whether it already existed.
     """
     from app.media.storage import (
         ALLOWED_DOCUMENT_EXTENSIONS,
+        ALLOWED_DOCUMENT_MIME_TYPES,
         MAX_DOCUMENT_SIZE,
-        save_document_bytes,
+        UploadTooLarge,
         get_document_public_url,
+        get_documents_dir,
+        stage_upload,
+        store_document,
     )
     from pathlib import Path
 
@@ -136,44 +171,40 @@ async def upload_document(
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
-    data = await file.read()
-    size = len(data)
     ext = Path(file.filename or "").suffix.lower()
-
     if ext not in ALLOWED_DOCUMENT_EXTENSIONS:
         allowed = ", ".join(sorted(ALLOWED_DOCUMENT_EXTENSIONS))
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported file type: {ext}. Allowed: {allowed}",
         )
-    if size > MAX_DOCUMENT_SIZE:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large: {size / 1024 / 1024:.1f} MB (max 25 MB)",
-        )
 
+    doc_dir = get_documents_dir(tenant.slug)
     try:
-        filename, saved_size, mime_type = await save_document_bytes(
-            data, tenant.slug, file.filename or "document"
-        )
+        staged = await stage_upload(file, doc_dir, ext, MAX_DOCUMENT_SIZE)
+    except UploadTooLarge:
+        raise HTTPException(status_code=400, detail="File too large (max 25 MB)")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    filename, deduplicated = await store_document(staged, tenant.slug)
     url = get_document_public_url(tenant.slug, filename)
     logger.info(
         "media.document_upload_complete",
         tenant_id=user.tenant_id,
         filename=filename,
         original=file.filename,
-        size=saved_size,
+        size=staged.size,
+        deduplicated=deduplicated,
     )
 
     return {
         "url": url,
         "filename": filename,
         "original_filename": file.filename,
-        "mime_type": mime_type,
-        "file_size": saved_size,
+        "mime_type": ALLOWED_DOCUMENT_MIME_TYPES.get(ext, "application/octet-stream"),
+        "file_size": staged.size,
+        "deduplicated": deduplicated,
     }
 
 
@@ -216,6 +247,7 @@ async def delete_document(
 ):
     """Delete an uploaded document."""
     from app.media.storage import delete_document as _delete, _validate_tenant_slug
+    import asyncio
 
     tenant = identity_queries.get_tenant_by_id(db, user.tenant_id)
     if not tenant:
@@ -225,7 +257,7 @@ async def delete_document(
     if "/" in filename or "\\" in filename or ".." in filename:
         raise HTTPException(status_code=400, detail="Invalid filename")
 
-    deleted = _delete(tenant.slug, filename)
+    deleted = await asyncio.to_thread(_delete, tenant.slug, filename)
     if not deleted:
         raise HTTPException(status_code=404, detail="Document not found")
 
@@ -410,168 +442,150 @@ async def sync_image_models(
     return report
 
 
-@router.post("/ai-generate", status_code=201)
+@router.post("/ai-generate", status_code=202)
 async def ai_generate_image(
     body: AIImageGenerateRequest,
     user: AuthContext = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Generate an image using AI (DALL-E 3 or configured provider)."""
+    """Queue an AI image generation (DALL-E 3 or configured provider).
+
+    Credits are reserved now; poll ``status_url`` for the resulting asset.
+    """
     from app.media.service import MediaService
-    from app.media.storage import save_bytes, get_public_url
-    from app.ai_config.image_service import ImageConfigService
-    from app.ai_config.image_generator import generate_image
-    import httpx
-    import base64
+    from app.media.credit_service import maybe_grant_monthly_credits
+    from app.ai_config.image_credits_config import get_credit_cost
+    from app.media.image_jobs import enqueue_image_job, get_image_job_runner
 
     tenant = identity_queries.get_tenant_by_id(db, user.tenant_id)
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
-    svc = MediaService(db=db, tenant_id=user.tenant_id, tenant_slug=tenant.slug)
-
-    # Credit check — grant monthly credits first, then verify balance
-    from app.media.credit_service import maybe_grant_monthly_credits, deduct_credits, get_balance
-    from app.ai_config.image_credits_config import get_credit_cost
-
     maybe_grant_monthly_credits(db, user.tenant_id)
-    model_slug_for_cost = body.model_slug or "flux2_pro"
-    credit_cost = get_credit_cost(model_slug_for_cost)
-    current_balance = get_balance(db, user.tenant_id)
-    if current_balance < credit_cost:
-        raise HTTPException(
-            status_code=402,
-            detail=f"Nicht genügend Credits. Jetzt aufladen. (Benötigt: {credit_cost}, Verfügbar: {current_balance})",
-        )
+    credit_cost = get_credit_cost(body.model_slug or "flux2_pro")
 
     # If campaign context provided, route through CampaignOrchestrator (image_generation stage)
-    if body.campaign_name or body.task_context != "general" or body.channel != "email":
-        from app.swarm.agents.campaign.orchestrator import CampaignOrchestrator, CampaignGenerationRequest
-        from app.swarm.llm import LLMClient
-        from config.settings import get_settings
-        settings = get_settings()
-        llm = LLMClient(openai_api_key=settings.openai_api_key)
-        orch = CampaignOrchestrator(llm)
-        req = CampaignGenerationRequest(
-            campaign_name=body.campaign_name or "",
-            channel=body.channel or "email",
-            tone=body.tone or "professional",
-            prompt=body.prompt,
-            tenant_id=user.tenant_id,
-            generate_image=True,
-            image_size=body.size,
-            image_quality=body.quality,
-            image_model_slug=body.model_slug,
-            created_by=user.user_id,
-        )
-        result = await orch.run(req, db=db)
-        if result.error:
-            raise HTTPException(status_code=502, detail=result.error)
-        # Deduct credits after successful generation
-        deduct_credits(db, user.tenant_id, credit_cost, "generation", str(result.image_asset_id) if result.image_asset_id else None)
-        return {
-            "id": result.image_asset_id,
-            "url": result.image_url,
-            "source": "ai_generated",
-            "qa_passed": result.qa_passed,
-            "qa_issues": result.qa_issues,
-            "pipeline_steps": result.pipeline_steps,
-            "created_at": None,
-        }
-
-    # Feature gates and quota checks
-    from app.core.feature_gates import FeatureGate
-    gate = FeatureGate(user.tenant_id)
+    use_orchestrator = bool(body.campaign_name or body.task_context != "general" or body.channel != "email")
+    if not use_orchestrator:
+        # Feature gates and quota checks
+        from app.core.feature_gates import FeatureGate
+        gate = FeatureGate(user.tenant_id)
+
+        if body.use_brand_style:
+            gate.require_brand_style()
+        if body.has_text_overlay:
+            gate.require_text_overlay_images()
+
+        if body.mode == "preview":
+            gate.check_image_preview_limit()
+        else:
+            # Check quota BEFORE queueing
+            MediaService(db=db, tenant_id=user.tenant_id, tenant_slug=tenant.slug).check_image_gen_quota()
+            gate.check_image_generation_limit()
 
-    if body.use_brand_style:
-        gate.require_brand_style()
-    if body.has_text_overlay:
-        gate.require_text_overlay_images()
-
-    if body.mode == "preview":
-        gate.check_image_preview_limit()
-    else:
-        # Check quota BEFORE calling API
-        svc.check_image_gen_quota()
-        gate.check_image_generation_limit()
-
-    # Resolve provider based on mode and features
-    img_svc = ImageConfigService(db)
-    config = img_svc.resolve_provider_for_mode(
-        user.tenant_id,
-        mode=body.mode,
-        has_text_overlay=body.has_text_overlay,
-        use_brand_style=body.use_brand_style,
+    job = enqueue_image_job(
+        db,
+        tenant_id=user.tenant_id,
+        kind="generate",
+        request={**body.model_dump(), "use_orchestrator": use_orchestrator},
+        credit_cost=credit_cost,
+        created_by=user.user_id,
     )
+    get_image_job_runner().submit(job.id, job.tenant_id)
+    return _job_accepted(job)
 
-    # Generate image
-    try:
-        result = await generate_image(
-            config=config,
-            prompt=body.prompt,
-            size=body.size,
-            quality=body.quality,
-            brand_colors=[],
-        )
-    except Exception as e:
-        logger.error("media.ai_generate_failed", error=str(e), tenant_id=user.tenant_id)
-        raise HTTPException(status_code=502, detail=f"Image generation failed: {str(e)}")
 
-    if not result.urls:
-        raise HTTPException(status_code=502, detail="Image generation returned no results")
+def _job_accepted(job: ImageGenerationJob) -> dict:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "credits_reserved": job.credits_reserved,
+        "status_url": f"/admin/media/jobs/{job.id}",
+        "events_url": f"/admin/media/jobs/{job.id}/events",
+    }
 
-    # Download and save image
-    image_url = result.urls[0]
-    try:
-        if image_url.startswith("data:"):
-            # Base64 data URI (Stability AI)
-            b64_data = image_url.split(",", 1)[1]
-            image_data = base64.b64decode(b64_data)
-        else:
-            # Remote URL (DALL-E)
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.get(image_url)
-                image_data = resp.content
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Failed to download generated image: {str(e)}")
 
-    svc.check_storage_quota(bytes_to_add=len(image_data))
-    filename, file_size = await save_bytes(image_data, tenant.slug, ".png")
+def _get_job_or_404(db: Session, job_id: str, tenant_id: int) -> ImageGenerationJob:
+    job = db.query(ImageGenerationJob).filter(
+        ImageGenerationJob.id == job_id,
+        ImageGenerationJob.tenant_id == tenant_id,
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Image job not found")
+    return job
 
-    asset = svc.record_ai_generated(
-        filename=filename,
-        file_size=file_size,
-        mime_type="image/png",
-        prompt=body.prompt,
-        provider_slug=config.provider_slug,
-        created_by=user.user_id,
-        image_data=image_data,
-    )
 
-    if body.mode == "preview":
-        gate.increment_image_preview_usage()
-    else:
-        svc.increment_image_gen_usage()
-        gate.increment_image_generation_usage()
-    svc.increment_storage_usage(file_size)
+@router.get("/jobs")
+async def list_image_jobs(
+    status: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    user: AuthContext = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Recent image generation jobs of the tenant, newest first."""
+    from app.media.image_jobs import job_to_dict
 
-    # Deduct credits after successful generation (direct path)
-    deduct_credits(db, user.tenant_id, credit_cost, "generation", str(asset.id))
+    q = db.query(ImageGenerationJob).filter(ImageGenerationJob.tenant_id == user.tenant_id)
+    if status:
+        q = q.filter(ImageGenerationJob.status == status)
+    return [job_to_dict(j) for j in q.order_by(ImageGenerationJob.created_at.desc()).limit(limit).all()]
 
-    url = get_public_url(tenant.slug, filename)
-    logger.info("media.ai_generate_complete", asset_id=asset.id, tenant_id=user.tenant_id, provider=config.provider_slug)
 
-    return {
-        "id": asset.id,
-        "url": url,
-        "revised_prompt": result.revised_prompt,
-        "provider_slug": config.provider_slug,
-        "model": result.model,
-        "file_size": file_size,
-        "source": "ai_generated",
-        "mode": body.mode,
-        "created_at": asset.created_at.isoformat() if asset.created_at else None,
-    }
+@router.get("/jobs/{job_id}")
+async def get_image_job(
+    job_id: str,
+    user: AuthContext = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Status, progress and (once finished) the result of an image job."""
+    from app.media.image_jobs import job_to_dict
+
+    return job_to_dict(_get_job_or_404(db, job_id, user.tenant_id))
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_image_job(
+    job_id: str,
+    user: AuthContext = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Server-Sent Events: one event per status/progress change until the job is final."""
+    from app.media.image_jobs import FINAL_STATUSES, IMAGE_JOB_TIMEOUT_SECONDS, job_to_dict
+    from app.shared.db import open_session
+
+    _get_job_or_404(db, job_id, user.tenant_id)
+    tenant_id = user.tenant_id
+
+    def _snapshot() -> dict:
+        session = open_session()
+        try:
+            return job_to_dict(_get_job_or_404(session, job_id, tenant_id))
+        finally:
+            session.close()
+
+    async def _event_stream() -> AsyncIterator[str]:
+        last = None
+        polls = 0
+        max_polls = int(IMAGE_JOB_TIMEOUT_SECONDS * 2) + 30
+        while polls < max_polls:
+            current = await asyncio.to_thread(_snapshot)
+            if current != last:
+                yield f"data: {json.dumps(current)}\n\n"
+                last = current
+            if current["status"] in FINAL_STATUSES:
+                yield "data: {\"type\": \"STREAM_END\"}\n\n"
+                return
+            polls += 1
+            if polls % 15 == 0:
+                yield ": heartbeat\n\n"
+            await asyncio.sleep(1)
+        yield "data: {\"type\": \"STREAM_TIMEOUT\", \"message\": \"Reconnect empfohlen\"}\n\n"
+
+    return StreamingResponse(
+        _event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("")
@@ -739,20 +753,18 @@ class AIImageEditRequest(BaseModel):
     strength: float = 0.75   # 0.0–1.0, only used by models with supports_strength=True
 
 
-@router.post("/{asset_id}/ai-edit", status_code=201)
+@router.post("/{asset_id}/ai-edit", status_code=202)
 async def ai_edit_image(
     asset_id: int,
     body: AIImageEditRequest,
     user: AuthContext = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Edit an existing media asset using img2img AI (reference image → new image)."""
+    """Queue an img2img edit of an existing media asset (reference image → new image)."""
     from app.media.service import MediaService
-    from app.media.storage import save_bytes, get_public_url
-    from app.ai_config.image_service import ImageConfigService
-    from app.ai_config.image_generator import generate_edit_image
-    import httpx
-    import base64
+    from app.media.credit_service import maybe_grant_monthly_credits
+    from app.ai_config.image_credits_config import get_credit_cost
+    from app.media.image_jobs import enqueue_image_job, get_image_job_runner
 
     # Load source asset
     asset = db.query(MediaAsset).filter(
@@ -770,75 +782,19 @@ async def ai_edit_image(
     svc.check_image_gen_quota()
     svc.check_storage_quota(bytes_to_add=500_000)
 
-    # Credit check for edit
-    from app.media.credit_service import maybe_grant_monthly_credits as _grant_monthly
-    from app.media.credit_service import deduct_credits as _deduct_credits
-    from app.media.credit_service import get_balance as _get_balance
-    from app.ai_config.image_credits_config import get_credit_cost as _get_credit_cost
-
-    _grant_monthly(db, user.tenant_id)
-    _edit_credit_cost = _get_credit_cost(body.edit_model_slug)
-    _edit_balance = _get_balance(db, user.tenant_id)
-    if _edit_balance < _edit_credit_cost:
-        raise HTTPException(
-            status_code=402,
-            detail=f"Nicht genügend Credits. Jetzt aufladen. (Benötigt: {_edit_credit_cost}, Verfügbar: {_edit_balance})",
-        )
-
-    # Build publicly accessible source image URL for fal.ai to fetch
-    image_url = get_public_url(tenant.slug, asset.filename)
-
-    # Resolve fal.ai API key — edit models share the same fal.ai key as t2i models
-    img_svc = ImageConfigService(db)
-    try:
-        config = img_svc.resolve_provider_by_slug(user.tenant_id, body.edit_model_slug)
-    except Exception as e:
-        logger.warning("media.resolve_provider_by_slug_failed", error=str(e))
-        config = img_svc.resolve_image_provider(user.tenant_id)
-
-    # Run img2img edit
-    result = await generate_edit_image(
-        config=config,
-        image_url=image_url,
-        prompt=body.prompt,
-        edit_model_slug=body.edit_model_slug,
-        strength=body.strength,
-    )
-
-    if not result.urls:
-        raise HTTPException(status_code=502, detail="Image edit returned no results")
-
-    # Download result image
-    result_url = result.urls[0]
-    if result_url.startswith("data:"):
-        b64_data = result_url.split(",", 1)[1]
-        image_data = base64.b64decode(b64_data)
-    else:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.get(result_url)
-            resp.raise_for_status()
-            image_data = resp.content
-
-    # Save to disk and DB
-    svc.check_storage_quota(bytes_to_add=len(image_data))
-    filename, file_size = await save_bytes(image_data, tenant.slug, ".png")
-    new_asset = svc.record_ai_generated(
-        filename=filename,
-        file_size=file_size,
-        mime_type="image/png",
-        prompt=body.prompt,
-        provider_slug=body.edit_model_slug,
+    maybe_grant_monthly_credits(db, user.tenant_id)
+    job = enqueue_image_job(
+        db,
+        tenant_id=user.tenant_id,
+        kind="edit",
+        request=body.model_dump(),
+        credit_cost=get_credit_cost(body.edit_model_slug),
         created_by=user.user_id,
-        image_data=image_data,
+        source_asset_id=asset.id,
     )
-    svc.increment_image_gen_usage()
-    svc.increment_storage_usage(file_size)
-
-    # Deduct credits after successful edit
-    _deduct_credits(db, user.tenant_id, _edit_credit_cost, "edit", str(new_asset.id))
-
-    logger.info("media.ai_edit.complete", asset_id=asset_id, new_asset_id=new_asset.id, model=body.edit_model_slug)
-    return _asset_to_dict(new_asset, tenant.slug)
+    get_image_job_runner().submit(job.id, job.tenant_id)
+    logger.info("media.ai_edit.queued", asset_id=asset_id, job_id=job.id, model=body.edit_model_slug)
+    return _job_accepted(job)
 
 
 @router.delete("/{asset_id}")
@@ -875,6 +831,8 @@ async def delete_media(
 
     file_size = asset.file_size or 0
     delete_file(slug, asset.filename)
+    for derivative in (asset.derivatives or {}).values():
+        delete_file(slug, derivative)
 
     svc = MediaService(db=db, tenant_id=user.tenant_id, tenant_slug=slug)
     svc.decrement_storage_usage(file_size)
@@ -973,9 +931,15 @@ async def delete_brand_reference(ref_id: int, user: AuthContext = Depends(get_cu
 
 def _asset_to_dict(asset: MediaAsset, tenant_slug: str) -> dict:
     from app.media.storage import get_public_url
+    url = get_public_url(tenant_slug, asset.filename)
+    # The library shows renditions; the original is only fetched when opened
+    derivatives = {variant: get_public_url(tenant_slug, name) for variant, name in (asset.derivatives or {}).items()}
     return {
         "id": asset.id,
-        "url": get_public_url(tenant_slug, asset.filename),
+        "url": url,
+        "thumbnail_url": derivatives.get("thumb", url),
+        "preview_url": derivatives.get("preview", url),
+        "derivatives": derivatives,
         "filename": asset.filename,
         "original_filename": asset.original_filename,
         "mime_type": asset.mime_type,
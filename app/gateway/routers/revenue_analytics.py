@@ -1,17 +1,20 @@
 """app/gateway/routers/revenue_analytics.py — Revenue & Token Analytics for System Admin.
 
-Revenue data is sourced from **Stripe Invoices & Charges** (source of truth)
-with local DB data as fallback / enrichment for usage metrics.
+Revenue data is aggregated from the local Stripe mirror (app/billing/stripe_mirror.py),
+kept current by webhooks and a reconciliation job, with local DB data as
+fallback / enrichment for usage metrics. Only /stripe-invoices calls Stripe directly.
 
 Endpoints (prefix /admin/revenue):
-    GET  /admin/revenue/overview       → MRR, ARR, total revenue, subscriber counts (Stripe-backed)
-    GET  /admin/revenue/monthly        → Monthly revenue breakdown from Stripe invoices
-    GET  /admin/revenue/tenants        → Per-tenant revenue from Stripe + local usage
+    GET  /admin/revenue/overview       → MRR, ARR, total revenue, subscriber counts (mirror-backed)
+    GET  /admin/revenue/monthly        → Monthly revenue breakdown from mirrored invoices
+    GET  /admin/revenue/tenants        → Per-tenant revenue from mirrored invoices + local usage
     GET  /admin/revenue/tokens         → Token usage analytics across all tenants
     GET  /admin/revenue/stripe-invoices → Raw Stripe invoice list for verification
 """
 from __future__ import annotations
 
+import asyncio
+
 import structlog
 from datetime import datetime, timezone, timedelta
 from typing import Any
@@ -19,6 +22,7 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import func
 
+from app.billing.stripe_mirror import stripe_mirror
 from app.core.auth import AuthContext, get_current_user
 from app.domains.billing.models import (
     AddonDefinition,
@@ -41,6 +45,10 @@ def _require_system_admin(user: AuthContext) -> None:
         raise HTTPException(status_code=403, detail="Forbidden")
 
 
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
+
+
 def _get_stripe_for_system():
     """Get Stripe module configured with the system-level secret key."""
     try:
@@ -58,9 +66,12 @@ def _get_stripe_for_system():
 
 @router.get("/overview")
 async def revenue_overview(user: AuthContext = Depends(get_current_user)) -> dict[str, Any]:
-    """High-level revenue KPIs sourced from Stripe + local DB."""
+    """High-level revenue KPIs from the Stripe mirror + local DB."""
     _require_system_admin(user)
+    return await asyncio.to_thread(_revenue_overview)
 
+
+def _revenue_overview() -> dict[str, Any]:
     db = open_session()
     try:
         # ── Local DB: subscriber counts & plan distribution ──
@@ -82,40 +93,20 @@ async def revenue_overview(user: AuthContext = Depends(get_current_user)) -> dic
 
         total_tenants = db.query(func.count(Tenant.id)).filter(Tenant.is_active.is_(True)).scalar() or 0
 
-        # ── Stripe: actual revenue data ──
+        # ── Stripe mirror: MRR and 12-month revenue ──
         stripe_mrr_cents = 0
         stripe_total_revenue_cents = 0
         paying_tenants = 0
+        data_source = "stripe"
 
-        try:
-            stripe = _get_stripe_for_system()
-
-            # Get all active subscriptions from Stripe for accurate MRR
-            stripe_subs = stripe.Subscription.list(status="active", limit=100)
-            for s in stripe_subs.auto_paging_iter():
-                for item in s.get("items", {}).get("data", []):
-                    price = item.get("price", {})
-                    amount = price.get("unit_amount", 0)
-                    interval = price.get("recurring", {}).get("interval", "month")
-                    if interval == "year":
-                        stripe_mrr_cents += amount // 12
-                    else:
-                        stripe_mrr_cents += amount
-                paying_tenants += 1
-
-            # Get total revenue from paid invoices (last 12 months)
-            twelve_months_ago = int((datetime.now(timezone.utc) - timedelta(days=365)).timestamp())
-            invoices = stripe.Invoice.list(
-                status="paid",
-                created={"gte": twelve_months_ago},
-                limit=100,
+        if stripe_mirror.backfill_completed(db):
+            stripe_mrr_cents, paying_tenants = stripe_mirror.mrr(db)
+            stripe_total_revenue_cents = stripe_mirror.paid_revenue_cents(
+                db, datetime.now(timezone.utc) - timedelta(days=365),
             )
-            for inv in invoices.auto_paging_iter():
-                stripe_total_revenue_cents += inv.get("amount_paid", 0)
-
-        except Exception as exc:
-            logger.warning("revenue.stripe_fetch_failed", error=str(exc))
-            # Fallback to local DB estimates
+        else:
+            # Mirror incomplete until the first reconciliation pass has finished
+            data_source = "local_estimate"
             for sub, plan in active_subs:
                 stripe_mrr_cents += plan.price_monthly_cents or 0
                 if (plan.price_monthly_cents or 0) > 0:
@@ -157,7 +148,8 @@ async def revenue_overview(user: AuthContext = Depends(get_current_user)) -> dic
             "canceled_total": canceled_count,
             "total_tenants": total_tenants,
             "plan_distribution": plan_distribution,
-            "data_source": "stripe",
+            "data_source": data_source,
+            "stripe_synced_at": _isoformat(stripe_mirror.last_synced_at(db)),
         }
     finally:
         db.close()
@@ -168,34 +160,24 @@ async def revenue_monthly(
     months: int = Query(12, ge=1, le=24),
     user: AuthContext = Depends(get_current_user),
 ) -> list[dict[str, Any]]:
-    """Monthly revenue breakdown from Stripe invoices (source of truth)."""
+    """Monthly revenue breakdown from the Stripe invoice mirror."""
     _require_system_admin(user)
+    return await asyncio.to_thread(_revenue_monthly, months)
+
 
+def _revenue_monthly(months: int) -> list[dict[str, Any]]:
     db = open_session()
     try:
         now = datetime.now(timezone.utc)
 
-        # ── Fetch paid invoices from Stripe for the requested period ──
+        # ── Paid invoices of the requested period, grouped by payment month ──
         start_date = datetime(now.year, now.month, 1, tzinfo=timezone.utc) - timedelta(days=30 * months)
-        start_ts = int(start_date.timestamp())
-
-        monthly_revenue = {}  # "YYYY-MM" -> cents
+        monthly_revenue = stripe_mirror.paid_revenue_by_month(db, start_date)  # "YYYY-MM" -> cents
 
-        try:
-            stripe = _get_stripe_for_system()
-            invoices = stripe.Invoice.list(
-                status="paid",
-                created={"gte": start_ts},
-                limit=100,
-            )
-            for inv in invoices.auto_paging_iter():
-                paid_at = inv.get("status_transitions", {}).get("paid_at") or inv.get("created")
-                if paid_at:
-                    dt = datetime.fromtimestamp(paid_at, tz=timezone.utc)
-                    key = f"{dt.year}-{dt.month:02d}"
-                    monthly_revenue[key] = monthly_revenue.get(key, 0) + inv.get("amount_paid", 0)
-        except Exception as exc:
-            logger.warning("revenue.monthly_stripe_failed", error=str(exc))
+        # Active subscriber count (current, the same for every month)
+        active_count = db.query(func.count(Subscription.id)).filter(
+            Subscription.status.in_(["active", "trialing"]),
+        ).scalar() or 0
 
         # ── Build result with local usage data enrichment ──
         result = []
@@ -228,11 +210,6 @@ async def revenue_monthly(
                 func.extract("month", TokenPurchase.created_at) == month,
             ).scalar() or 0
 
-            # Active subscriber count
-            active_count = db.query(func.count(Subscription.id)).filter(
-                Subscription.status.in_(["active", "trialing"]),
-            ).scalar() or 0
-
             stripe_revenue = monthly_revenue.get(key, 0)
 
             result.append({
@@ -256,48 +233,20 @@ async def revenue_monthly(
 
 @router.get("/tenants")
 async def revenue_tenants(user: AuthContext = Depends(get_current_user)) -> list[dict[str, Any]]:
-    """Per-tenant revenue from Stripe invoices + local usage data."""
+    """Per-tenant revenue from the Stripe invoice mirror + local usage data."""
     _require_system_admin(user)
+    return await asyncio.to_thread(_revenue_tenants)
 
+
+def _revenue_tenants() -> list[dict[str, Any]]:
     db = open_session()
     try:
         now = datetime.now(timezone.utc)
 
-        # ── Build a map of Stripe customer → total paid (current month) ──
-        customer_revenue = {}  # stripe_customer_id -> cents
-        customer_total_revenue = {}  # stripe_customer_id -> all-time cents
-
-        try:
-            stripe = _get_stripe_for_system()
-
-            # Current month invoices
-            month_start = datetime(now.year, now.month, 1, tzinfo=timezone.utc)
-            month_start_ts = int(month_start.timestamp())
-
-            invoices = stripe.Invoice.list(
-                status="paid",
-                created={"gte": month_start_ts},
-                limit=100,
-            )
-            for inv in invoices.auto_paging_iter():
-                cid = inv.get("customer")
-                if cid:
-                    customer_revenue[cid] = customer_revenue.get(cid, 0) + inv.get("amount_paid", 0)
-
-            # All-time invoices (last 12 months for performance)
-            twelve_months_ago = int((now - timedelta(days=365)).timestamp())
-            all_invoices = stripe.Invoice.list(
-                status="paid",
-                created={"gte": twelve_months_ago},
-                limit=100,
-            )
-            for inv in all_invoices.auto_paging_iter():
-                cid = inv.get("customer")
-                if cid:
-                    customer_total_revenue[cid] = customer_total_revenue.get(cid, 0) + inv.get("amount_paid", 0)
-
-        except Exception as exc:
-            logger.warning("revenue.tenants_stripe_failed", error=str(exc))
+        # ── Stripe customer → paid (current month / last 12 months) ──
+        month_start = datetime(now.year, now.month, 1, tzinfo=timezone.utc)
+        customer_revenue = stripe_mirror.paid_revenue_by_customer(db, month_start)
+        customer_total_revenue = stripe_mirror.paid_revenue_by_customer(db, now - timedelta(days=365))
 
         # Single JOIN query replacing N+1: one query fetches Tenant + Subscription + Plan together
         tenant_rows = (
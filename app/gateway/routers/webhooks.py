@@ -7,6 +7,7 @@ import asyncio
 import base64
 import hmac
 import json
+import os
 import re
 import urllib.parse
 from uuid import uuid4
@@ -14,7 +15,7 @@ from datetime import datetime
 from typing import Any
 
 import structlog
-from fastapi import APIRouter, Header, HTTPException, Request, Response, Form, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, Form, Query
 from pydantic import BaseModel, ValidationError
 
 from app.gateway.persistence import persistence
@@ -35,7 +36,9 @@ from app.core.redis_keys import (
     user_token_key,
     human_mode_key,
     dialog_context_key,
+    anonymous_rate_limit_key,
 )
+from app.core.rate_limit import RateLimit, get_distributed_rate_limiter
 from app.gateway.member_matching import match_member_by_phone
 from app.gateway.persistence_helpers import save_inbound_to_db, save_outbound_to_db
 from app.core.security import (
@@ -46,9 +49,44 @@ from app.core.security import (
 from app.shared.db import open_session
 
 logger = structlog.get_logger()
-router = APIRouter(tags=["webhooks"])
 settings = get_settings()
 
+# Ingress limits per minute, checked in one Redis round trip before any
+# tenant lookup or signature verification.
+WEBHOOK_RATE_LIMIT_PER_IP = int(os.getenv("WEBHOOK_RATE_LIMIT_PER_IP", "600"))
+WEBHOOK_RATE_LIMIT_PER_TENANT = int(os.getenv("WEBHOOK_RATE_LIMIT_PER_TENANT", "3000"))
+
+
+def _enforce_webhook_rate_limit(request: Request) -> None:
+    """Reject webhook floods per client IP and per tenant slug (429 + Retry-After)."""
+    if os.getenv("ENVIRONMENT") == "testing":
+        return
+    forwarded = request.headers.get("x-forwarded-for", "")
+    ip = forwarded.split(",")[0].strip() if forwarded else (request.client.host if request.client else "unknown")
+    limits = [RateLimit(anonymous_rate_limit_key("webhook_ip", ip), WEBHOOK_RATE_LIMIT_PER_IP, 60)]
+    tenant_slug = request.path_params.get("tenant_slug")
+    if tenant_slug:
+        limits.append(RateLimit(
+            anonymous_rate_limit_key("webhook_tenant", tenant_slug), WEBHOOK_RATE_LIMIT_PER_TENANT, 60,
+        ))
+    result = get_distributed_rate_limiter().check(*limits)
+    if not result.allowed:
+        logger.warning(
+            "webhook.rate_limited",
+            ip=ip,
+            tenant_slug=tenant_slug,
+            limit=result.violated.key if result.violated else None,
+            backend=result.backend,
+        )
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(int(result.retry_after) + 1)},
+        )
+
+
+router = APIRouter(tags=["webhooks"], dependencies=[Depends(_enforce_webhook_rate_limit)])
+
 ARIIA_ERROR_MESSAGES = [
     "Hoppla, Hantel fallen gelassen... 🏋️ Versuch's gleich nochmal!",
     "Kurze technische Pause – ich bin gleich wieder da! 💪",
@@ -294,6 +332,7 @@ async def _send_verification_email(
 
 async def process_and_reply(message: InboundMessage) -> None:
     """Core pipeline: Inbound -> Redis -> Swarm -> Reply."""
+    prefetch = None
     try:
         # 1. Extract metadata (Names, etc.)
         user_name_extracted = None
@@ -429,6 +468,14 @@ async def process_and_reply(message: InboundMessage) -> None:
                 return
             await bus.disconnect()
 
+        # 5a. Speculative context warm-up: load the member's memory context now
+        # so it overlaps with the checks below and with intent classification.
+        if session.member_id and message.tenant_id:
+            from app.memory_platform.prefetcher import get_context_prefetcher
+            prefetch = get_context_prefetcher().start_prefetch(
+                message.tenant_id, str(session.member_id), message.content or "",
+            )
+
         # 5b. Human-Mode Check: If user is in escalation mode, bypass AI
         try:
             hm_bus = RedisBus(settings.redis_url)
@@ -538,7 +585,7 @@ async def process_and_reply(message: InboundMessage) -> None:
             pass
 
         lead = LeadAgent(llm=llm, redis_client=redis_client)
-        result = await lead.handle(message, tenant_context)
+        result = await lead.handle(message, tenant_context, prefetch=prefetch)
 
         # 8. Handle escalation metadata from LeadAgent
         if result.metadata and result.metadata.get("needs_handoff"):
@@ -568,6 +615,11 @@ async def process_and_reply(message: InboundMessage) -> None:
         logger.error("swarm.reply_failed", error=str(e))
         import random
         await send_to_user(message.user_id, message.platform, random.choice(ARIIA_ERROR_MESSAGES))
+    finally:
+        # Early returns (human mode, feature gate, campaign replies) never consume it
+        if prefetch is not None:
+            from app.memory_platform.prefetcher import get_context_prefetcher
+            get_context_prefetcher().discard_prefetch(prefetch)
 
 
 # --- Routes ---
@@ -11,6 +11,8 @@ from app.core.auth import AuthContext
 from app.domains.identity.models import AuditLog
 from app.domains.support.models import ChatMessage, ChatSession, MemberFeedback
 from app.gateway.admin_analytics_repository import admin_analytics_repository
+from app.platform.analytics_export import export_response, resolve_export
+from app.platform.analytics_rollups import DAY, HOUR, SOURCE_MESSAGE, Cell, fetch_cells, group_by, total
 from app.shared.db import session_scope
 
 _CHANNEL_NAMES: dict[str, str] = {
@@ -67,80 +69,55 @@ class AdminAnalyticsService:
             return (parts[0][0] + parts[-1][0]).upper()
         return name[:2].upper()
 
-    def _fetch_window(self, db, tenant_id: int, since: datetime) -> list[dict[str, Any]]:
-        rows = admin_analytics_repository.list_assistant_messages_since(
-            db,
-            tenant_id=tenant_id,
-            since=since,
-        )
-        result: list[dict[str, Any]] = []
-        for row in rows:
-            meta = self._parse_msg_meta_safe(row.metadata_json)
-            conf_raw = meta.get("confidence")
-            conf: float | None = None
-            if isinstance(conf_raw, (int, float)):
-                conf = float(conf_raw)
-            elif isinstance(conf_raw, str):
-                try:
-                    conf = float(conf_raw)
-                except ValueError:
-                    pass
-            result.append({
-                "escalated": meta.get("escalated") is True or meta.get("escalated") == "true",
-                "confidence": conf,
-                "channel": str(meta.get("channel") or "unknown").lower(),
-                "ts": row.timestamp,
-            })
-        return result
+    @staticmethod
+    def _message_cells(db, tenant_id: int, start: datetime, end: datetime, finest: str = DAY) -> list[Cell]:
+        """Assistant-message counters (channel, intent, escalation, confidence) from the rollups."""
+        return fetch_cells(db, SOURCE_MESSAGE, tenant_id, start, end, finest=finest)
 
     def get_overview(self, user: AuthContext) -> dict[str, Any]:
         from datetime import timedelta
 
         now = datetime.now(timezone.utc)
-        cutoff_24h = (now - timedelta(hours=24)).replace(tzinfo=None)
-        cutoff_30d = (now - timedelta(days=30)).replace(tzinfo=None)
-        cutoff_60d = (now - timedelta(days=60)).replace(tzinfo=None)
+        cutoff_24h = now - timedelta(hours=24)
+        cutoff_30d = now - timedelta(days=30)
+        cutoff_60d = now - timedelta(days=60)
 
         with session_scope() as db:
-            msgs_24h = self._fetch_window(db, user.tenant_id, cutoff_24h)
-            msgs_30d = self._fetch_window(db, user.tenant_id, cutoff_30d)
-            msgs_60d = self._fetch_window(db, user.tenant_id, cutoff_60d)
-            msgs_prev_30d = [msg for msg in msgs_60d if msg["ts"] < cutoff_30d]
-
-            escal_24h = sum(1 for msg in msgs_24h if msg["escalated"])
-            total_24h = len(msgs_24h)
-            confs = [msg["confidence"] for msg in msgs_24h if msg["confidence"] is not None]
-            conf_avg = round((sum(confs) / len(confs)) * 100, 1) if confs else 0.0
-            channels_24h: dict[str, int] = {}
-            for msg in msgs_24h:
-                channels_24h[msg["channel"]] = channels_24h.get(msg["channel"], 0) + 1
-
-            conf_dist = [
-                {"range": "90–100%", "count": sum(1 for c in confs if c >= 0.9)},
-                {"range": "75–89%", "count": sum(1 for c in confs if 0.75 <= c < 0.9)},
-                {"range": "50–74%", "count": sum(1 for c in confs if 0.5 <= c < 0.75)},
-                {"range": "<50%", "count": sum(1 for c in confs if c < 0.5)},
-            ]
-            conf_total = len(confs)
-            tickets_30d = len(msgs_30d)
-            tickets_prev = len(msgs_prev_30d)
-            ai_rate = round(((total_24h - escal_24h) / max(1, total_24h)) * 100, 1)
-            month_trend = round(((tickets_30d - tickets_prev) / max(1, tickets_prev)) * 100, 1)
-            return {
-                "tickets_24h": total_24h,
-                "resolved_24h": total_24h - escal_24h,
-                "escalated_24h": escal_24h,
-                "ai_resolution_rate": ai_rate,
-                "escalation_rate": round((escal_24h / max(1, total_24h)) * 100, 1),
-                "confidence_avg": conf_avg,
-                "confidence_high_pct": round(sum(1 for c in confs if c >= 0.9) / max(1, conf_total) * 100),
-                "confidence_low_pct": round(sum(1 for c in confs if c < 0.5) / max(1, conf_total) * 100),
-                "confidence_distribution": conf_dist,
-                "channels_24h": channels_24h,
-                "tickets_30d": tickets_30d,
-                "tickets_prev_30d": tickets_prev,
-                "month_trend_pct": month_trend,
-            }
+            cells_24h = self._message_cells(db, user.tenant_id, cutoff_24h, now)
+            tickets_30d = total(self._message_cells(db, user.tenant_id, cutoff_30d, now)).count
+            tickets_prev = total(self._message_cells(db, user.tenant_id, cutoff_60d, cutoff_30d)).count
+
+        day = total(cells_24h)
+        total_24h, escal_24h = day.count, day.escalated
+        conf_total = day.confidence_count
+        conf_avg = round((day.confidence_sum / conf_total) * 100, 1) if conf_total else 0.0
+        channels_24h: dict[str, int] = {}
+        for cell in cells_24h:
+            channels_24h[cell.dims.channel] = channels_24h.get(cell.dims.channel, 0) + cell.measures.count
+
+        conf_dist = [
+            {"range": "90–100%", "count": day.confidence_high},
+            {"range": "75–89%", "count": day.confidence_mid},
+            {"range": "50–74%", "count": day.confidence_low_mid},
+            {"range": "<50%", "count": day.confidence_low},
+        ]
+        ai_rate = round(((total_24h - escal_24h) / max(1, total_24h)) * 100, 1)
+        month_trend = round(((tickets_30d - tickets_prev) / max(1, tickets_prev)) * 100, 1)
+        return {
+            "tickets_24h": total_24h,
+            "resolved_24h": total_24h - escal_24h,
+            "escalated_24h": escal_24h,
+            "ai_resolution_rate": ai_rate,
+            "escalation_rate": round((escal_24h / max(1, total_24h)) * 100, 1),
+            "confidence_avg": conf_avg,
+            "confidence_high_pct": round(day.confidence_high / max(1, conf_total) * 100),
+            "confidence_low_pct": round(day.confidence_low / max(1, conf_total) * 100),
+            "confidence_distribution": conf_dist,
+            "channels_24h": channels_24h,
+            "tickets_30d": tickets_30d,
+            "tickets_prev_30d": tickets_prev,
+            "month_trend_pct": month_trend,
+        }
 
     def get_satisfaction(self, user: AuthContext) -> dict[str, Any]:
         with session_scope() as db:
@@ -153,32 +130,17 @@ class AdminAnalyticsService:
         from datetime import timedelta
 
         now = datetime.now(timezone.utc)
-        cutoff = (now - timedelta(hours=24)).replace(tzinfo=None)
+        cutoff = now - timedelta(hours=24)
         with session_scope() as db:
-            rows = (
-                db.query(ChatMessage)
-                .filter(
-                    ChatMessage.tenant_id == user.tenant_id,
-                    ChatMessage.role == "assistant",
-                    ChatMessage.timestamp >= cutoff,
-                )
-                .all()
-            )
-            hourly: dict[int, dict[str, int]] = {hour: {"aiResolved": 0, "escalated": 0} for hour in range(24)}
-            for row in rows:
-                ts = row.timestamp
-                if ts and ts.tzinfo is None:
-                    ts = ts.replace(tzinfo=timezone.utc)
-                hour = ts.hour if ts else 0
-                meta = self._parse_msg_meta_safe(row.metadata_json)
-                if meta.get("escalated") is True or meta.get("escalated") == "true":
-                    hourly[hour]["escalated"] += 1
-                else:
-                    hourly[hour]["aiResolved"] += 1
-            return [
-                {"hour": f"{hour:02d}:00", "aiResolved": hourly[hour]["aiResolved"], "escalated": hourly[hour]["escalated"]}
-                for hour in range(24)
-            ]
+            cells = self._message_cells(db, user.tenant_id, cutoff, now, finest=HOUR)
+        hourly: dict[int, dict[str, int]] = {hour: {"aiResolved": 0, "escalated": 0} for hour in range(24)}
+        for cell in cells:
+            hourly[cell.start.hour]["escalated"] += cell.measures.escalated
+            hourly[cell.start.hour]["aiResolved"] += cell.measures.count - cell.measures.escalated
+        return [
+            {"hour": f"{hour:02d}:00", "aiResolved": hourly[hour]["aiResolved"], "escalated": hourly[hour]["escalated"]}
+            for hour in range(24)
+        ]
 
     def get_weekly(self, user: AuthContext) -> list[dict[str, Any]]:
         from datetime import timedelta
@@ -186,44 +148,27 @@ class AdminAnalyticsService:
         now = datetime.now(timezone.utc)
         cutoff = now - timedelta(days=7)
         with session_scope() as db:
-            rows = (
-                db.query(ChatMessage)
-                .filter(
-                    ChatMessage.tenant_id == user.tenant_id,
-                    ChatMessage.role == "assistant",
-                    ChatMessage.timestamp >= cutoff,
-                )
-                .all()
-            )
-            day_labels = ["So", "Mo", "Di", "Mi", "Do", "Fr", "Sa"]
-            daily: dict[str, dict[str, int]] = {}
-            for row in rows:
-                ts = row.timestamp
-                if ts and ts.tzinfo is None:
-                    ts = ts.replace(tzinfo=timezone.utc)
-                day_key = ts.strftime("%Y-%m-%d") if ts else ""
-                if not day_key:
-                    continue
-                if day_key not in daily:
-                    daily[day_key] = {"tickets": 0, "escalated": 0}
-                daily[day_key]["tickets"] += 1
-                meta = self._parse_msg_meta_safe(row.metadata_json)
-                if meta.get("escalated") is True or meta.get("escalated") == "true":
-                    daily[day_key]["escalated"] += 1
-
-            result: list[dict[str, Any]] = []
-            for idx in range(7):
-                day = now - timedelta(days=6 - idx)
-                key = day.strftime("%Y-%m-%d")
-                rec = daily.get(key, {"tickets": 0, "escalated": 0})
-                result.append({
-                    "day": day_labels[day.weekday() % 7],
-                    "date": key,
-                    "tickets": rec["tickets"],
-                    "resolved": rec["tickets"] - rec["escalated"],
-                    "escalated": rec["escalated"],
-                })
-            return result
+            cells = self._message_cells(db, user.tenant_id, cutoff, now)
+        day_labels = ["So", "Mo", "Di", "Mi", "Do", "Fr", "Sa"]
+        daily: dict[str, dict[str, int]] = {}
+        for cell in cells:
+            rec = daily.setdefault(cell.day, {"tickets": 0, "escalated": 0})
+            rec["tickets"] += cell.measures.count
+            rec["escalated"] += cell.measures.escalated
+
+        result: list[dict[str, Any]] = []
+        for idx in range(7):
+            day = now - timedelta(days=6 - idx)
+            key = day.strftime("%Y-%m-%d")
+            rec = daily.get(key, {"tickets": 0, "escalated": 0})
+            result.append({
+                "day": day_labels[day.weekday() % 7],
+                "date": key,
+                "tickets": rec["tickets"],
+                "resolved": rec["tickets"] - rec["escalated"],
+                "escalated": rec["escalated"],
+            })
+        return result
 
     def get_intents(self, user: AuthContext) -> list[dict[str, Any]]:
         from datetime import timedelta
@@ -231,89 +176,49 @@ class AdminAnalyticsService:
         now = datetime.now(timezone.utc)
         cutoff = now - timedelta(days=30)
         with session_scope() as db:
-            rows = (
-                db.query(ChatMessage)
-                .filter(
-                    ChatMessage.tenant_id == user.tenant_id,
-                    ChatMessage.role == "assistant",
-                    ChatMessage.timestamp >= cutoff,
-                )
-                .all()
-            )
-            intent_stats: dict[str, dict[str, int]] = {}
-            for row in rows:
-                meta = self._parse_msg_meta_safe(row.metadata_json)
-                intent = str(meta.get("intent") or "unknown").strip() or "unknown"
-                if intent not in intent_stats:
-                    intent_stats[intent] = {"count": 0, "resolved": 0}
-                intent_stats[intent]["count"] += 1
-                if not (meta.get("escalated") is True or meta.get("escalated") == "true"):
-                    intent_stats[intent]["resolved"] += 1
-
-            sorted_intents = sorted(intent_stats.items(), key=lambda item: item[1]["count"], reverse=True)[:8]
-            return [
-                {
-                    "intent": intent,
-                    "label": intent.replace("_", " ").title(),
-                    "count": stats["count"],
-                    "aiRate": round((stats["resolved"] / max(1, stats["count"])) * 100),
-                }
-                for intent, stats in sorted_intents
-            ]
+            cells = self._message_cells(db, user.tenant_id, cutoff, now)
+        intent_stats = {
+            intent: total(intent_cells)
+            for intent, intent_cells in group_by(cells, lambda cell: cell.dims.intent).items()
+        }
+        sorted_intents = sorted(intent_stats.items(), key=lambda item: item[1].count, reverse=True)[:8]
+        return [
+            {
+                "intent": intent,
+                "label": intent.replace("_", " ").title(),
+                "count": stats.count,
+                "aiRate": round(((stats.count - stats.escalated) / max(1, stats.count)) * 100),
+            }
+            for intent, stats in sorted_intents
+        ]
 
     def get_channels(self, effective_tid: int, *, days: int) -> list[dict[str, Any]]:
-        from collections import defaultdict
         from datetime import timedelta
 
         now = datetime.now(timezone.utc)
-        since = (now - timedelta(days=days)).replace(tzinfo=None)
+        since = now - timedelta(days=days)
         with session_scope() as db:
-            messages = (
-                db.query(ChatMessage)
-                .filter(
-                    ChatMessage.tenant_id == effective_tid,
-                    ChatMessage.role == "assistant",
-                    ChatMessage.timestamp >= since,
-                )
-                .all()
-            )
-            channel_stats: dict[str, dict[str, int]] = defaultdict(lambda: {"count": 0, "resolved": 0})
-            for message in messages:
-                meta = self._parse_msg_meta_safe(message.metadata_json)
-                channel = str(meta.get("channel") or "unknown").lower()
-                channel_stats[channel]["count"] += 1
-                if not meta.get("escalated"):
-                    channel_stats[channel]["resolved"] += 1
-
-            channel_order = ["whatsapp", "telegram", "email", "sms", "phone"]
-            result = []
-            for channel in channel_order:
-                if channel not in channel_stats:
-                    continue
-                stats = channel_stats[channel]
-                total = stats["count"]
-                ai_rate = round(stats["resolved"] / max(total, 1) * 100)
-                result.append({
-                    "ch": channel,
-                    "name": _CHANNEL_NAMES.get(channel, channel.capitalize()),
-                    "tickets": total,
-                    "aiRate": ai_rate,
-                    "esc": f"{100 - ai_rate}%",
-                })
-
-            for channel, stats in channel_stats.items():
-                if channel in channel_order:
-                    continue
-                total = stats["count"]
-                ai_rate = round(stats["resolved"] / max(total, 1) * 100)
-                result.append({
-                    "ch": channel,
-                    "name": _CHANNEL_NAMES.get(channel, channel.capitalize()),
-                    "tickets": total,
-                    "aiRate": ai_rate,
-                    "esc": f"{100 - ai_rate}%",
-                })
-            return result
+            cells = self._message_cells(db, effective_tid, since, now)
+        channel_stats = {
+            channel: total(channel_cells)
+            for channel, channel_cells in group_by(cells, lambda cell: cell.dims.channel).items()
+        }
+
+        channel_order = ["whatsapp", "telegram", "email", "sms", "phone"]
+        ordered = [ch for ch in channel_order if ch in channel_stats]
+        ordered += [ch for ch in channel_stats if ch not in channel_order]
+        result = []
+        for channel in ordered:
+            stats = channel_stats[channel]
+            ai_rate = round((stats.count - stats.escalated) / max(stats.count, 1) * 100)
+            result.append({
+                "ch": channel,
+                "name": _CHANNEL_NAMES.get(channel, channel.capitalize()),
+                "tickets": stats.count,
+                "aiRate": ai_rate,
+                "esc": f"{100 - ai_rate}%",
+            })
+        return result
 
     def get_recent_sessions(self, effective_tid: int, *, limit: int) -> list[dict[str, Any]]:
         with session_scope() as db:
@@ -389,5 +294,22 @@ class AdminAnalyticsService:
                 ],
             }
 
+    def export_rows(
+        self,
+        effective_tid: int,
+        *,
+        dataset: str,
+        format: str,
+        columns: str | None,
+        days: int,
+        gzip: bool,
+    ):
+        """Stream the rows of the last *days* as CSV/NDJSON; ``ValueError`` for unknown names."""
+        from datetime import timedelta
+
+        spec, names = resolve_export(dataset, format, columns)
+        now = datetime.now(timezone.utc)
+        return export_response(spec, names, effective_tid, now - timedelta(days=days), now, format=format, gzip=gzip)
+
 
 service = AdminAnalyticsService()
@@ -1,9 +1,9 @@
 """CSV/XLSX Streaming Parser."""
 from __future__ import annotations
-import asyncio
 from pathlib import Path
 from typing import AsyncIterator
 import structlog
+from app.core.cpu_executor import DOCUMENT_PARSE, run_cpu_retrying
 from app.ingestion.parsers.base import ParserRegistry, StreamingParser, TextChunk
 
 logger = structlog.get_logger()
@@ -16,8 +16,6 @@ class CSVParser(StreamingParser):
     CHUNK_ROWS = 1000
 
     async def parse(self, file_path: Path) -> AsyncIterator[TextChunk]:
-        loop = asyncio.get_event_loop()
-
         def _iter_chunks():
             try:
                 import pandas as pd
@@ -40,7 +38,7 @@ class CSVParser(StreamingParser):
 
             return results
 
-        rows = await loop.run_in_executor(None, _iter_chunks)
+        rows = await run_cpu_retrying(DOCUMENT_PARSE, _iter_chunks)
 
         for text, char_offset in rows:
             yield TextChunk(
@@ -58,8 +56,6 @@ class XLSXParser(StreamingParser):
     """Streaming XLSX-Parser via openpyxl read_only mode."""
 
     async def parse(self, file_path: Path) -> AsyncIterator[TextChunk]:
-        loop = asyncio.get_event_loop()
-
         def _iter_rows():
             try:
                 import openpyxl
@@ -94,7 +90,7 @@ class XLSXParser(StreamingParser):
             wb.close()
             return results
 
-        rows = await loop.run_in_executor(None, _iter_rows)
+        rows = await run_cpu_retrying(DOCUMENT_PARSE, _iter_rows)
 
         for text, char_offset in rows:
             yield TextChunk(
@@ -1,9 +1,9 @@
 """DOCX Streaming Parser via python-docx."""
 from __future__ import annotations
-import asyncio
 from pathlib import Path
 from typing import AsyncIterator
 import structlog
+from app.core.cpu_executor import DOCUMENT_PARSE, run_cpu_retrying
 from app.ingestion.parsers.base import ParserRegistry, StreamingParser, TextChunk
 
 logger = structlog.get_logger()
@@ -16,8 +16,6 @@ class DOCXParser(StreamingParser):
     """Streaming DOCX-Parser. Paragraph-Iterator ohne vollständiges RAM-Laden."""
 
     async def parse(self, file_path: Path) -> AsyncIterator[TextChunk]:
-        loop = asyncio.get_event_loop()
-
         def _iter_paragraphs():
             try:
                 from docx import Document
@@ -45,7 +43,7 @@ class DOCXParser(StreamingParser):
 
             return results
 
-        paragraphs = await loop.run_in_executor(None, _iter_paragraphs)
+        paragraphs = await run_cpu_retrying(DOCUMENT_PARSE, _iter_paragraphs)
 
         for text, section, char_offset in paragraphs:
             yield TextChunk(
@@ -7,12 +7,12 @@ ODP: Präsentationen (Impress) — liest Folieninhalte
 """
 from __future__ import annotations
 
-import asyncio
 from pathlib import Path
 from typing import AsyncIterator
 
 import structlog
 
+from app.core.cpu_executor import DOCUMENT_PARSE, run_cpu_retrying
 from app.ingestion.parsers.base import ParserRegistry, StreamingParser, TextChunk
 
 logger = structlog.get_logger()
@@ -31,8 +31,7 @@ class ODTParser(StreamingParser):
     """
 
     async def parse(self, file_path: Path) -> AsyncIterator[TextChunk]:
-        loop = asyncio.get_event_loop()
-        texts = await loop.run_in_executor(None, self._extract_texts, file_path)
+        texts = await run_cpu_retrying(DOCUMENT_PARSE, self._extract_texts, file_path)
         char_offset = 0
         for text, page_num in texts:
             yield TextChunk(
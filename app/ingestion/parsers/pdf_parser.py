@@ -1,9 +1,9 @@
 """PDF Streaming Parser via pdfplumber."""
 from __future__ import annotations
-import asyncio
 from pathlib import Path
 from typing import AsyncIterator
 import structlog
+from app.core.cpu_executor import DOCUMENT_PARSE, run_cpu_retrying
 from app.ingestion.parsers.base import ParserRegistry, StreamingParser, TextChunk
 
 logger = structlog.get_logger()
@@ -16,8 +16,6 @@ class PDFParser(StreamingParser):
     MIN_PAGE_TEXT_LENGTH = 50  # Seiten mit weniger Text überspringen (Bilder etc.)
 
     async def parse(self, file_path: Path) -> AsyncIterator[TextChunk]:
-        loop = asyncio.get_event_loop()
-
         def _iter_pages():
             try:
                 import pdfplumber
@@ -33,7 +31,7 @@ class PDFParser(StreamingParser):
 
         char_offset = 0
         # Seiten in Executor um Event-Loop nicht zu blockieren
-        pages = await loop.run_in_executor(None, lambda: list(_iter_pages()))
+        pages = await run_cpu_retrying(DOCUMENT_PARSE, lambda: list(_iter_pages()))
 
         for page_num, text in pages:
             # Seite in Absätze aufteilen
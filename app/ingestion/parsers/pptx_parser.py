@@ -5,12 +5,12 @@ Kein komplettes Laden in RAM – Shapes werden einzeln verarbeitet.
 """
 from __future__ import annotations
 
-import asyncio
 from pathlib import Path
 from typing import AsyncIterator
 
 import structlog
 
+from app.core.cpu_executor import DOCUMENT_PARSE, run_cpu_retrying
 from app.ingestion.parsers.base import ParserRegistry, StreamingParser, TextChunk
 
 logger = structlog.get_logger()
@@ -28,8 +28,7 @@ class PPTXParser(StreamingParser):
     """
 
     async def parse(self, file_path: Path) -> AsyncIterator[TextChunk]:
-        loop = asyncio.get_event_loop()
-        slides_data = await loop.run_in_executor(None, self._extract_slides, file_path)
+        slides_data = await run_cpu_retrying(DOCUMENT_PARSE, self._extract_slides, file_path)
         char_offset = 0
         for slide_num, texts in slides_data:
             for text in texts:
@@ -5,12 +5,12 @@ Kein HTML-Rendering, kein Cloud-Call – vollständig lokal.
 """
 from __future__ import annotations
 
-import asyncio
 from pathlib import Path
 from typing import AsyncIterator
 
 import structlog
 
+from app.core.cpu_executor import DOCUMENT_PARSE, run_cpu_retrying
 from app.ingestion.parsers.base import ParserRegistry, StreamingParser, TextChunk
 
 logger = structlog.get_logger()
@@ -28,8 +28,7 @@ class RTFParser(StreamingParser):
     """
 
     async def parse(self, file_path: Path) -> AsyncIterator[TextChunk]:
-        loop = asyncio.get_event_loop()
-        paragraphs = await loop.run_in_executor(None, self._extract_paragraphs, file_path)
+        paragraphs = await run_cpu_retrying(DOCUMENT_PARSE, self._extract_paragraphs, file_path)
         char_offset = 0
         for para in paragraphs:
             yield TextChunk(
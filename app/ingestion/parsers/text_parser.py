@@ -1,9 +1,9 @@
 """Plain Text / Markdown Streaming Parser."""
 from __future__ import annotations
-import asyncio
 from pathlib import Path
 from typing import AsyncIterator
 import structlog
+from app.core.cpu_executor import DOCUMENT_PARSE, run_cpu_retrying
 from app.ingestion.parsers.base import ParserRegistry, StreamingParser, TextChunk
 
 logger = structlog.get_logger()
@@ -16,8 +16,6 @@ class TextParser(StreamingParser):
     PARAGRAPH_MIN_CHARS = 50
 
     async def parse(self, file_path: Path) -> AsyncIterator[TextChunk]:
-        loop = asyncio.get_event_loop()
-
         def _iter_paragraphs():
             results = []
             char_offset = 0
@@ -42,7 +40,7 @@ class TextParser(StreamingParser):
 
             return results
 
-        paragraphs = await loop.run_in_executor(None, _iter_paragraphs)
+        paragraphs = await run_cpu_retrying(DOCUMENT_PARSE, _iter_paragraphs)
 
         for text, char_offset in paragraphs:
             yield TextChunk(
@@ -1,9 +1,9 @@
 """Unstructured.io Fallback Parser für unbekannte Formate."""
 from __future__ import annotations
-import asyncio
 from pathlib import Path
 from typing import AsyncIterator
 import structlog
+from app.core.cpu_executor import DOCUMENT_PARSE, run_cpu_retrying
 from app.ingestion.parsers.base import ParserRegistry, StreamingParser, TextChunk
 
 logger = structlog.get_logger()
@@ -16,8 +16,6 @@ class UnstructuredParser(StreamingParser):
     """
 
     async def parse(self, file_path: Path) -> AsyncIterator[TextChunk]:
-        loop = asyncio.get_event_loop()
-
         def _parse():
             try:
                 from unstructured.partition.auto import partition
@@ -38,7 +36,7 @@ class UnstructuredParser(StreamingParser):
 
             return results
 
-        elements = await loop.run_in_executor(None, _parse)
+        elements = await run_cpu_retrying(DOCUMENT_PARSE, _parse)
 
         for text, char_offset in elements:
             yield TextChunk(
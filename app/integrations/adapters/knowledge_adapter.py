@@ -249,7 +249,8 @@ class KnowledgeAdapter(BaseAdapter):
                 error_code="MISSING_PARAM",
             )
 
-        collection_name = kwargs.get("collection_name") or self._resolve_collection(tenant_id)
+        tenant_slug = self._resolve_slug(tenant_id)
+        collection_name = kwargs.get("collection_name") or self._collection_for(tenant_slug)
         source = kwargs.get("source", "manual")
         doc_id = kwargs.get("doc_id")
         extra_metadata = kwargs.get("metadata", {})
@@ -259,6 +260,7 @@ class KnowledgeAdapter(BaseAdapter):
             doc_id = f"doc_{hashlib.md5(content[:200].encode()).hexdigest()[:12]}"
 
         try:
+            from app.knowledge.ingest import _invalidate_answer_cache
             from app.knowledge.store import KnowledgeStore
 
             store = KnowledgeStore(collection_name=collection_name)
@@ -268,6 +270,7 @@ class KnowledgeAdapter(BaseAdapter):
                 metadatas=[metadata],
                 ids=[doc_id],
             )
+            _invalidate_answer_cache(tenant_slug)
 
             return AdapterResult(
                 success=True,
@@ -290,7 +293,8 @@ class KnowledgeAdapter(BaseAdapter):
         """
         doc_ids = kwargs.get("doc_ids")
         where_filter = kwargs.get("where_filter")
-        collection_name = kwargs.get("collection_name") or self._resolve_collection(tenant_id)
+        tenant_slug = self._resolve_slug(tenant_id)
+        collection_name = kwargs.get("collection_name") or self._collection_for(tenant_slug)
 
         if not doc_ids and not where_filter:
             return AdapterResult(
@@ -300,18 +304,21 @@ class KnowledgeAdapter(BaseAdapter):
             )
 
         try:
+            from app.knowledge.ingest import _invalidate_answer_cache
             from app.knowledge.store import KnowledgeStore
 
             store = KnowledgeStore(collection_name=collection_name)
 
             if doc_ids:
                 store.delete_documents(ids=doc_ids)
+                _invalidate_answer_cache(tenant_slug)
                 return AdapterResult(
                     success=True,
                     data={"deleted_ids": doc_ids, "collection": collection_name},
                 )
             elif where_filter:
                 store.delete_by_metadata(where_filter=where_filter)
+                _invalidate_answer_cache(tenant_slug)
                 return AdapterResult(
                     success=True,
                     data={"filter": where_filter, "collection": collection_name, "action": "deleted_by_filter"},
@@ -398,16 +405,28 @@ class KnowledgeAdapter(BaseAdapter):
 
         Falls back to the system default collection if tenant lookup fails.
         """
+        return self._collection_for(self._resolve_slug(tenant_id))
+
+    @staticmethod
+    def _resolve_slug(tenant_id: int) -> str | None:
+        """Tenant slug for *tenant_id*; "system" if unknown, None if the lookup fails."""
         try:
             from app.shared.db import open_session
             from app.domains.identity.models import Tenant
-            from app.knowledge.ingest import collection_name_for_slug
 
             db = open_session()
-            tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
-            slug = tenant.slug if tenant else "system"
-            db.close()
-            return collection_name_for_slug(slug)
+            try:
+                tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
+                return tenant.slug if tenant else "system"
+            finally:
+                db.close()
         except Exception:
+            return None
+
+    @staticmethod
+    def _collection_for(tenant_slug: str | None) -> str:
+        if tenant_slug is None:
             from app.core.knowledge.retriever import DEFAULT_COLLECTION
             return DEFAULT_COLLECTION
+        from app.knowledge.ingest import collection_name_for_slug
+        return collection_name_for_slug(tenant_slug)
@@ -1,13 +1,26 @@
-"""Magicline member sync for admin/member lookup use cases."""
+"""Magicline member sync for admin/member lookup use cases.
+
+Incremental by default:
+  - Customer pages are normalized without per-member contract calls
+  - A content hash per member (``StudioMember.sync_hash``) skips unchanged rows
+  - Contracts are fetched concurrently (bounded + rate limited) only for new
+    members, members whose pause status flipped, or when the last contract
+    fetch is older than CONTRACT_REFRESH_HOURS
+  - Inserts / updates / deletes are applied as bulk statements
+"""
 
 from __future__ import annotations
 
+import hashlib
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
 import structlog
-from sqlalchemy import text
+from sqlalchemy import delete, insert, text, update
 from sqlalchemy.exc import IntegrityError
 
 from app.core.db import engine
@@ -25,6 +38,17 @@ _SYNC_FIELDS = (
     "gender", "preferred_language", "member_since", "is_paused", "pause_info", "contract_info", "additional_info",
 )
 
+# Fields covered by sync_hash (contract_info is refreshed on its own cadence)
+_HASH_FIELDS = tuple(f for f in _SYNC_FIELDS if f != "contract_info")
+
+# Contract info older than this is re-fetched even if the member is unchanged
+CONTRACT_REFRESH_HOURS = 24
+# Parallel contract requests per sync and global request pacing (req/s)
+CONTRACT_FETCH_CONCURRENCY = 8
+CONTRACT_FETCH_RATE_PER_SEC = 10.0
+# Rows per bulk INSERT/UPDATE/DELETE statement
+_BULK_CHUNK_SIZE = 500
+
 # Fallback mapping observed in production data when field-def endpoint is not permitted.
 # 1229489651 values are mostly training goals, 1229489650 contains notes/health/context.
 _FALLBACK_FIELD_NAMES: dict[int, str] = {
@@ -168,28 +192,92 @@ def _resolve_additional_info(
     return json.dumps(result, ensure_ascii=False) if result else None
 
 
+def _fetch_contract_info(client: MagiclineClient, customer_id: int) -> str | None:
+    """Fetch active contracts for a member and return summarized JSON (raises on API errors)."""
+    contracts = client.customer_contracts(customer_id, status="ACTIVE")
+    if not contracts:
+        return None
+
+    # We take the most relevant active contract
+    c = contracts[0]
+    payload = {
+        "plan_name": c.get("rateName") or c.get("name") or "Unbekannt",
+        "status": "ACTIVE",
+        "start_date": c.get("startDate"),
+        "end_date": c.get("endDate"),
+        "is_canceled": bool(c.get("cancellationDate")),
+        "cancellation_date": c.get("cancellationDate"),
+    }
+    return json.dumps(payload, ensure_ascii=False)
+
+
 def _build_contract_info(client: MagiclineClient, customer_id: int) -> str | None:
     """Fetch active contracts for a member and return summarized JSON."""
     try:
-        contracts = client.customer_contracts(customer_id, status="ACTIVE")
-        if not contracts:
-            return None
-        
-        # We take the most relevant active contract
-        c = contracts[0]
-        payload = {
-            "plan_name": c.get("rateName") or c.get("name") or "Unbekannt",
-            "status": "ACTIVE",
-            "start_date": c.get("startDate"),
-            "end_date": c.get("endDate"),
-            "is_canceled": bool(c.get("cancellationDate")),
-            "cancellation_date": c.get("cancellationDate"),
-        }
-        return json.dumps(payload, ensure_ascii=False)
+        return _fetch_contract_info(client, customer_id)
     except Exception:
         return None
 
 
+class _RateLimiter:
+    """Thread-safe request pacing shared by all contract fetch workers."""
+
+    def __init__(self, rate_per_sec: float):
+        self._interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _fetch_contract_infos(
+    client: MagiclineClient,
+    customer_ids: list[int],
+    *,
+    concurrency: int = CONTRACT_FETCH_CONCURRENCY,
+    rate_per_sec: float = CONTRACT_FETCH_RATE_PER_SEC,
+) -> dict[int, str | None]:
+    """Fetch contract info for many members with bounded parallelism.
+
+    Members whose request failed are absent from the result so callers keep
+    their previously stored contract info instead of wiping it.
+    """
+    if not customer_ids:
+        return {}
+    limiter = _RateLimiter(rate_per_sec)
+
+    def _one(customer_id: int) -> tuple[int, str | None, bool]:
+        limiter.acquire()
+        try:
+            return customer_id, _fetch_contract_info(client, customer_id), True
+        except Exception as e:
+            logger.debug("magicline.members_sync.contract_fetch_failed", customer_id=customer_id, error=str(e))
+            return customer_id, None, False
+
+    results: dict[int, str | None] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(customer_ids))),
+                            thread_name_prefix="ml-contracts") as pool:
+        for customer_id, info, ok in pool.map(_one, customer_ids):
+            if ok:
+                results[customer_id] = info
+    return results
+
+
+def _member_hash(item: dict[str, Any]) -> str:
+    """Stable content hash over the synced member fields (excluding contract_info)."""
+    payload = {f: item.get(f) for f in _HASH_FIELDS}
+    raw = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
 def _normalize_member(
     raw: dict[str, Any],
     field_defs: dict[int, str],
@@ -254,8 +342,66 @@ def _is_studio_members_pk_sequence_error(exc: Exception) -> bool:
     return "studio_members_pkey" in msg and "duplicate key value violates unique constraint" in msg
 
 
-def sync_members_from_magicline(tenant_id: int | None = None) -> dict[str, int]:
-    """Sync MEMBER status customers from Magicline into local studio_members table."""
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _load_existing_members(tenant_id: int | None) -> tuple[int | None, dict[int, dict[str, Any]]]:
+    """Load the per-member sync state (not full ORM rows) for diffing."""
+    db = open_session()
+    try:
+        if tenant_id is None:
+            tenant_row = db.execute(text("SELECT id FROM tenants WHERE slug = 'system' LIMIT 1")).first()
+            tenant_id = int(tenant_row[0]) if tenant_row else None
+
+        q = db.query(
+            StudioMember.id,
+            StudioMember.customer_id,
+            StudioMember.sync_hash,
+            StudioMember.is_paused,
+            StudioMember.contract_info,
+            StudioMember.contract_synced_at,
+        )
+        if tenant_id is not None:
+            q = q.filter(StudioMember.tenant_id == tenant_id)
+
+        existing = {
+            int(row.customer_id): {
+                "id": row.id,
+                "sync_hash": row.sync_hash,
+                "is_paused": row.is_paused,
+                "contract_info": row.contract_info,
+                "contract_synced_at": _as_utc(row.contract_synced_at),
+            }
+            for row in q.all()
+        }
+        return tenant_id, existing
+    finally:
+        db.close()
+
+
+def _needs_contract_refresh(item: dict[str, Any], current: dict[str, Any] | None, stale_before: datetime) -> bool:
+    if current is None:
+        return True
+    if bool(current["is_paused"]) != bool(item["is_paused"]):
+        return True
+    synced_at = current["contract_synced_at"]
+    return synced_at is None or synced_at < stale_before
+
+
+def _chunks(items: list, size: int = _BULK_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def sync_members_from_magicline(tenant_id: int | None = None, *, full_refresh: bool = False) -> dict[str, int]:
+    """Sync MEMBER status customers from Magicline into local studio_members table.
+
+    Incremental: unchanged members (same sync_hash, contract still fresh) are
+    skipped. ``full_refresh=True`` re-fetches contract info for every member.
+    """
     client = get_client(tenant_id=tenant_id)
     if not client:
         logger.warning("magicline.members_sync.client_unavailable")
@@ -290,49 +436,85 @@ def sync_members_from_magicline(tenant_id: int | None = None) -> dict[str, int]:
             raise ValueError("Magicline Authentifizierung fehlgeschlagen (401). API-Key ungültig.")
         raise
 
-    normalized = [m for m in (_normalize_member(row, field_defs, client=client) for row in rows) if m]
-    incoming_ids = {m["customer_id"] for m in normalized}
+    # Contract info is resolved below, only for members that need it
+    normalized_by_id: dict[int, dict[str, Any]] = {}
+    for row in rows:
+        item = _normalize_member(row, field_defs)
+        if item:
+            normalized_by_id[item["customer_id"]] = item
+    normalized = list(normalized_by_id.values())
+
+    tenant_id, existing = _load_existing_members(tenant_id)
+
+    now = datetime.now(timezone.utc)
+    stale_before = now - timedelta(hours=CONTRACT_REFRESH_HOURS)
+    refresh_ids = [
+        item["customer_id"]
+        for item in normalized
+        if full_refresh or _needs_contract_refresh(item, existing.get(item["customer_id"]), stale_before)
+    ]
+    contracts = _fetch_contract_infos(
+        client,
+        refresh_ids,
+        concurrency=CONTRACT_FETCH_CONCURRENCY,
+        rate_per_sec=CONTRACT_FETCH_RATE_PER_SEC,
+    )
 
-    upserted = 0
-    deleted = 0
+    insert_rows: list[dict[str, Any]] = []
+    update_rows: list[dict[str, Any]] = []
+    changed = 0
+    skipped = 0
+    for item in normalized:
+        customer_id = item["customer_id"]
+        current = existing.get(customer_id)
+        sync_hash = _member_hash(item)
+        contract_fetched = customer_id in contracts
+
+        if current is None:
+            insert_rows.append({
+                **item,
+                "tenant_id": tenant_id,
+                "contract_info": contracts.get(customer_id),
+                "sync_hash": sync_hash,
+                "contract_synced_at": now if contract_fetched else None,
+            })
+            continue
+
+        contract_info = contracts[customer_id] if contract_fetched else current["contract_info"]
+        content_changed = sync_hash != current["sync_hash"] or contract_info != current["contract_info"]
+        if not content_changed and not contract_fetched:
+            skipped += 1
+            continue
+        if content_changed:
+            changed += 1
+        update_rows.append({
+            **{f: item[f] for f in _HASH_FIELDS},
+            "id": current["id"],
+            "contract_info": contract_info,
+            "sync_hash": sync_hash,
+            "contract_synced_at": now if contract_fetched else current["contract_synced_at"],
+        })
+
+    stale_ids = [cur["id"] for cid, cur in existing.items() if cid not in normalized_by_id]
+    upserted = len(insert_rows) + changed
+    deleted = len(stale_ids)
 
     for attempt in range(2):
         db = open_session()
         try:
-            if tenant_id is None:
-                tenant_row = db.execute(text("SELECT id FROM tenants WHERE slug = 'system' LIMIT 1")).first()
-                tenant_id = int(tenant_row[0]) if tenant_row else None
-
             # Pre-emptive sequence realignment for Postgres restore/import scenarios.
             _align_studio_members_sequence(db)
 
-            base_q = db.query(StudioMember)
-            if tenant_id is not None:
-                base_q = base_q.filter(StudioMember.tenant_id == tenant_id)
-
-            existing = {row.customer_id: row for row in base_q.all()}
-            upserted = 0
-            deleted = 0
-
-            for item in normalized:
-                current = existing.get(item["customer_id"])
-                if current is None:
-                    db.add(StudioMember(tenant_id=tenant_id, **item))
-                    upserted += 1
-                    continue
-
-                changed = False
-                for field in _SYNC_FIELDS:
-                    if getattr(current, field) != item[field]:
-                        setattr(current, field, item[field])
-                        changed = True
-                if changed:
-                    upserted += 1
-
-            for row in existing.values():
-                if row.customer_id not in incoming_ids:
-                    db.delete(row)
-                    deleted += 1
+            for chunk in _chunks(insert_rows):
+                db.execute(insert(StudioMember), chunk)
+            for chunk in _chunks(update_rows):
+                db.execute(update(StudioMember), chunk)
+            for chunk in _chunks(stale_ids):
+                db.execute(
+                    delete(StudioMember)
+                    .where(StudioMember.id.in_(chunk))
+                    .execution_options(synchronize_session=False)
+                )
 
             db.commit()
             logger.info(
@@ -340,9 +522,17 @@ def sync_members_from_magicline(tenant_id: int | None = None) -> dict[str, int]:
                 fetched=len(rows),
                 normalized=len(normalized),
                 upserted=upserted,
+                skipped=skipped,
+                contracts_fetched=len(contracts),
                 deleted=deleted,
             )
-            return {"fetched": len(rows), "upserted": upserted, "deleted": deleted}
+            return {
+                "fetched": len(rows),
+                "upserted": upserted,
+                "deleted": deleted,
+                "skipped": skipped,
+                "contracts_fetched": len(contracts),
+            }
         except IntegrityError as e:
             db.rollback()
             if attempt == 0 and _is_studio_members_pk_sequence_error(e):
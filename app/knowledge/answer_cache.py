@@ -0,0 +1,379 @@
+"""Semantic answer cache for repeated knowledge-base questions.
+
+Members ask the same questions over and over (opening hours, prices,
+cancellation rules). An expert agent answering one of them runs the whole
+retrieval + generation loop. This cache keeps, per tenant and agent, the
+embedding of the normalized question next to the final answer. A later
+question whose cosine similarity reaches ``ANSWER_CACHE_THRESHOLD`` is
+answered from the cache without calling the LLM.
+
+Only answers that are safe to share between members are stored. Every
+tool call of the turn must be a knowledge-only tool (``knowledge_search``)
+and succeed. The answer must not contain the member's name or id.
+Short follow-ups ("und am Sonntag?") depend on the conversation, so
+utterances of fewer than three words are neither looked up nor stored
+when history is present.
+
+Every knowledge write (ingest, document add/delete) calls
+``invalidate(tenant_slug)``. That drops the tenant's entries and bumps its
+generation, so an answer still being generated from the old documents is
+not stored. The entries live in process memory; with ``ANSWER_CACHE_SHARED``
+the generation is also a Redis counter (``RedisAnswerGenerations``) that
+every worker re-reads at most every ``ANSWER_CACHE_GENERATION_CHECK_SECONDS``.
+A worker that sees the counter move drops its own entries for the tenant.
+While Redis is unreachable the cache neither serves nor stores answers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Sequence
+
+import numpy as np
+import structlog
+
+from app.core.redis_keys import answer_cache_generation_key
+from app.core.telemetry import get_metrics
+from app.swarm.contracts import AgentTask, TenantContext
+from app.swarm.lead.fast_path import normalize_utterance
+
+logger = structlog.get_logger()
+
+ANSWER_CACHE_ENABLED = os.getenv(
+    "ANSWER_CACHE", "false" if os.getenv("ENVIRONMENT") == "testing" else "true",
+).lower() == "true"
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92"))
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "512"))  # entries per tenant
+ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "86400"))
+ANSWER_CACHE_SHARED = os.getenv(
+    "ANSWER_CACHE_SHARED", "false" if os.getenv("ENVIRONMENT") == "testing" else "true",
+).lower() == "true"
+ANSWER_CACHE_GENERATION_CHECK_SECONDS = float(os.getenv("ANSWER_CACHE_GENERATION_CHECK_SECONDS", "1"))
+ANSWER_CACHE_AGENTS = frozenset(
+    a.strip() for a in os.getenv("ANSWER_CACHE_AGENTS", "knowledge").split(",") if a.strip()
+)
+
+# Tools whose output is the same for every member of a tenant
+KNOWLEDGE_ONLY_TOOLS = frozenset({"knowledge_search"})
+
+# Recently embedded questions, so a miss followed by a store embeds once
+_EMBED_MEMO_SIZE = 256
+
+Embedder = Callable[[list[str]], Sequence[Sequence[float]]]
+
+
+def default_embedder(texts: list[str]) -> list[list[float]]:
+    """Embed with ChromaDB's local default model (the one the knowledge store uses)."""
+    global _default_ef
+    if _default_ef is None:
+        from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+        _default_ef = DefaultEmbeddingFunction()
+    return [list(map(float, v)) for v in _default_ef(texts)]
+
+
+_default_ef = None
+
+
+class RedisAnswerGenerations:
+    """Tenant generation counters in Redis, shared by all workers.
+
+    Reads and bumps from the event loop use ``redis.asyncio``; a bump from
+    synchronous code without a running loop (ingest scripts, worker
+    threads) uses a blocking client.
+    """
+
+    def __init__(self, client: Any = None, sync_client: Any = None) -> None:
+        self._client = client
+        self._sync_client = sync_client
+
+    @staticmethod
+    def _url() -> str:
+        from config.settings import get_settings
+
+        return get_settings().redis_url
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self._url(), decode_responses=True, socket_timeout=1)
+        return self._client
+
+    @property
+    def sync_client(self) -> Any:
+        if self._sync_client is None:
+            import redis
+
+            self._sync_client = redis.from_url(self._url(), decode_responses=True, socket_timeout=1)
+        return self._sync_client
+
+    async def get(self, tenant_slug: str) -> int:
+        """Tenant counter plus the all-tenants counter."""
+        values = await self.client.mget(answer_cache_generation_key(tenant_slug), answer_cache_generation_key(None))
+        return sum(int(value) for value in values if value)
+
+    async def bump(self, tenant_slug: str | None) -> None:
+        await self.client.incr(answer_cache_generation_key(tenant_slug))
+
+    def bump_blocking(self, tenant_slug: str | None) -> None:
+        self.sync_client.incr(answer_cache_generation_key(tenant_slug))
+
+
+@dataclass
+class CachedAnswer:
+    """A stored answer and what it cost to produce."""
+
+    question: str
+    content: str
+    vector: np.ndarray
+    tokens: int
+    created_at: float
+    hits: int = 0
+
+
+class SemanticAnswerCache:
+    """Per-tenant LRU of (question embedding, answer), matched by cosine similarity."""
+
+    def __init__(
+        self,
+        embedder: Embedder | None = None,
+        threshold: float = ANSWER_CACHE_THRESHOLD,
+        max_entries: int = ANSWER_CACHE_SIZE,
+        ttl_seconds: float = ANSWER_CACHE_TTL_SECONDS,
+        agents: Iterable[str] = ANSWER_CACHE_AGENTS,
+        enabled: bool = ANSWER_CACHE_ENABLED,
+        shared: RedisAnswerGenerations | None = None,
+        generation_check_seconds: float = ANSWER_CACHE_GENERATION_CHECK_SECONDS,
+    ) -> None:
+        self.enabled = enabled
+        self._embedder = embedder or default_embedder
+        self._threshold = threshold
+        self._max_entries = max(1, max_entries)
+        self._ttl = ttl_seconds
+        self._agents = frozenset(agents)
+        self._entries: dict[tuple[str, str], OrderedDict[str, CachedAnswer]] = {}
+        self._generations: dict[str, int] = {}
+        self._epoch = 0  # bumped by invalidate() for all tenants
+        self._shared = shared
+        self._generation_check = generation_check_seconds
+        # Last shared generation seen per tenant and when it was read
+        self._remote: dict[str, tuple[int, float]] = {}
+        self._publishing: set[asyncio.Task[None]] = set()
+        self._embedded: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    # ── Eligibility ──────────────────────────────────────────────────
+
+    def accepts(self, task: AgentTask, agent_id: str) -> bool:
+        """Whether *task* may be answered from, and stored in, the cache."""
+        if not self.enabled or agent_id not in self._agents:
+            return False
+        words = normalize_utterance(task.original_message).split()
+        if not words:
+            return False
+        return not (task.conversation_history and len(words) < 3)
+
+    @staticmethod
+    def is_shareable(tools_used: Iterable[str], content: str, context: TenantContext) -> bool:
+        """True if an answer built from *tools_used* can be served to other members."""
+        used = set(tools_used)
+        if not used or not used <= KNOWLEDGE_ONLY_TOOLS:
+            return False
+        lowered = content.lower()
+        personal = [context.user_name, context.member_id]
+        return not any(value and str(value).lower() in lowered for value in personal)
+
+    # ── Lookup / store ───────────────────────────────────────────────
+
+    async def generation(self, tenant_slug: str) -> int | None:
+        """Counter bumped by ``invalidate``; pass it back to ``store``.
+
+        None while the shared generation cannot be read.
+        """
+        remote = await self._remote_generation(tenant_slug)
+        if remote is None:
+            return None
+        return self._epoch + self._generations.get(tenant_slug, 0) + remote
+
+    async def lookup(self, tenant_slug: str, agent_id: str, question: str) -> CachedAnswer | None:
+        """Return the closest stored answer at or above the threshold."""
+        metrics = get_metrics()
+        if await self._remote_generation(tenant_slug) is None:
+            metrics.increment("answer_cache_lookups_total", labels={"result": "miss"})
+            return None
+        normalized = normalize_utterance(question)
+        entries = self._entries.get((tenant_slug, agent_id))
+        hit = self._match(entries, normalized) if entries else None
+        if entries and hit is None:
+            vector = await self._embed(normalized)
+            if vector is not None:
+                hit = self._match(entries, normalized, vector)
+
+        if hit is None:
+            metrics.increment("answer_cache_lookups_total", labels={"result": "miss"})
+            return None
+        hit.hits += 1
+        entries.move_to_end(normalize_utterance(hit.question))
+        metrics.increment("answer_cache_lookups_total", labels={"result": "hit"})
+        metrics.increment("answer_cache_saved_tokens_total", value=hit.tokens)
+        logger.info("answer_cache.hit", tenant=tenant_slug, agent_id=agent_id, tokens_saved=hit.tokens)
+        return hit
+
+    async def store(
+        self,
+        tenant_slug: str,
+        agent_id: str,
+        question: str,
+        content: str,
+        tokens: int = 0,
+        generation: int | None = None,
+    ) -> bool:
+        """Remember *content* as the answer to *question*; False if dropped."""
+        normalized = normalize_utterance(question)
+        if not normalized or not content:
+            return False
+        vector = await self._embed(normalized)
+        if vector is None:
+            return False
+        current = await self.generation(tenant_slug)
+        if current is None or (generation is not None and generation != current):
+            # The knowledge base was re-ingested while the answer was generated
+            return False
+        entries = self._entries.setdefault((tenant_slug, agent_id), OrderedDict())
+        entries[normalized] = CachedAnswer(
+            question=question, content=content, vector=vector, tokens=tokens, created_at=time.time(),
+        )
+        entries.move_to_end(normalized)
+        while len(entries) > self._max_entries:
+            entries.popitem(last=False)
+        get_metrics().increment("answer_cache_stores_total")
+        return True
+
+    def invalidate(self, tenant_slug: str | None = None) -> int:
+        """Drop the entries of *tenant_slug* (all tenants if None) here and in other workers.
+
+        Returns the number of entries dropped in this process.
+        """
+        if tenant_slug is None:
+            self._epoch += 1
+            self._remote.clear()
+        else:
+            self._generations[tenant_slug] = self._generations.get(tenant_slug, 0) + 1
+            self._remote.pop(tenant_slug, None)
+        dropped = self._drop(tenant_slug)
+        self._publish_invalidation(tenant_slug)
+        logger.info("answer_cache.invalidated", tenant=tenant_slug or "*", entries=dropped)
+        return dropped
+
+    async def flush(self) -> None:
+        """Wait for invalidations still being published to Redis."""
+        if self._publishing:
+            await asyncio.gather(*self._publishing, return_exceptions=True)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    def _drop(self, tenant_slug: str | None) -> int:
+        keys = [k for k in self._entries if tenant_slug is None or k[0] == tenant_slug]
+        dropped = sum(len(self._entries.pop(key)) for key in keys)
+        if dropped:
+            get_metrics().increment("answer_cache_invalidated_total", value=dropped)
+        return dropped
+
+    async def _remote_generation(self, tenant_slug: str) -> int | None:
+        """Shared generation of *tenant_slug* (0 without Redis); None if unreadable."""
+        if self._shared is None:
+            return 0
+        now = time.monotonic()
+        seen = self._remote.get(tenant_slug)
+        if seen is not None and now - seen[1] < self._generation_check:
+            return seen[0]
+        try:
+            value = await self._shared.get(tenant_slug)
+        except Exception as exc:
+            logger.warning("answer_cache.generation_read_failed", tenant=tenant_slug, error=str(exc))
+            return None
+        if seen is not None and value != seen[0]:
+            # Another worker wrote to this tenant's knowledge base
+            dropped = self._drop(tenant_slug)
+            logger.info("answer_cache.invalidated_remotely", tenant=tenant_slug, entries=dropped)
+        self._remote[tenant_slug] = (value, now)
+        return value
+
+    def _publish_invalidation(self, tenant_slug: str | None) -> None:
+        if self._shared is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                self._shared.bump_blocking(tenant_slug)
+            except Exception as exc:
+                logger.warning("answer_cache.invalidation_publish_failed", tenant=tenant_slug or "*", error=str(exc))
+            return
+        task = loop.create_task(self._bump(tenant_slug))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    async def _bump(self, tenant_slug: str | None) -> None:
+        try:
+            await self._shared.bump(tenant_slug)
+        except Exception as exc:
+            logger.warning("answer_cache.invalidation_publish_failed", tenant=tenant_slug or "*", error=str(exc))
+
+    def _match(
+        self,
+        entries: OrderedDict[str, CachedAnswer],
+        normalized: str,
+        vector: np.ndarray | None = None,
+    ) -> CachedAnswer | None:
+        cutoff = time.time() - self._ttl
+        for key in [k for k, e in entries.items() if e.created_at < cutoff]:
+            del entries[key]
+        if vector is None:
+            return entries.get(normalized)
+        if not entries:
+            return None
+        candidates = list(entries.values())
+        scores = np.stack([c.vector for c in candidates]) @ vector
+        best = int(np.argmax(scores))
+        return candidates[best] if scores[best] >= self._threshold else None
+
+    async def _embed(self, normalized: str) -> np.ndarray | None:
+        vector = self._embedded.get(normalized)
+        if vector is not None:
+            return vector
+        try:
+            raw = (await asyncio.to_thread(self._embedder, [normalized]))[0]
+        except Exception as exc:
+            logger.warning("answer_cache.embed_failed", error=str(exc))
+            return None
+        vector = np.asarray(raw, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        vector = vector / norm
+        self._embedded[normalized] = vector
+        while len(self._embedded) > _EMBED_MEMO_SIZE:
+            self._embedded.popitem(last=False)
+        return vector
+
+
+# ── Singleton ────────────────────────────────────────────────────────
+
+_cache: SemanticAnswerCache | None = None
+
+
+def get_answer_cache() -> SemanticAnswerCache:
+    """Return the process-wide answer cache."""
+    global _cache
+    if _cache is None:
+        _cache = SemanticAnswerCache(shared=RedisAnswerGenerations() if ANSWER_CACHE_SHARED else None)
+    return _cache
@@ -24,6 +24,13 @@ def collection_name_for_slug(tenant_slug: str) -> str:
     return f"ariia_knowledge_{safe}"
 
 
+def _invalidate_answer_cache(tenant_slug: str | None) -> None:
+    """Cached answers were generated from the previous documents."""
+    from app.knowledge.answer_cache import get_answer_cache
+
+    get_answer_cache().invalidate(tenant_slug)
+
+
 def ingest_tenant_knowledge(tenant_id: int | None = None, tenant_slug: str | None = None) -> dict:
     """Ingest global knowledge AND tenant-specific knowledge for a studio."""
     # 1. Resolve slug and ID
@@ -119,6 +126,7 @@ def ingest_tenant_knowledge(tenant_id: int | None = None, tenant_slug: str | Non
 
     store = KnowledgeStore(collection_name=collection_name)
     store.upsert_documents(documents, metadatas, ids)
+    _invalidate_answer_cache(slug)
 
     logger.info("knowledge.ingest.success", collection=collection_name, chunks=len(documents))
     return {"status": "ok", "collection": collection_name, "chunks": len(documents)}
@@ -346,6 +346,9 @@ class KnowledgeManager:
                 None, store.upsert_documents, documents, metadatas, ids,
             )
             logger.info("knowledge.shared_added", count=len(documents))
+            # Shared documents are searched by every tenant
+            from app.knowledge.ingest import _invalidate_answer_cache
+            _invalidate_answer_cache(None)
             return len(documents)
         except Exception as e:
             logger.error("knowledge.shared_add_failed", error=str(e))
@@ -379,6 +382,8 @@ class KnowledgeManager:
             await loop.run_in_executor(
                 None, store.upsert_documents, documents, metadatas, ids,
             )
+            from app.knowledge.ingest import _invalidate_answer_cache
+            _invalidate_answer_cache(tenant_slug)
             logger.info(
                 "knowledge.tenant_added",
                 tenant=tenant_slug,
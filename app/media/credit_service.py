@@ -63,6 +63,43 @@ def deduct_credits(db: Session, tenant_id: int, amount: int, reason: str, refere
     return True
 
 
+def reserve_credits(
+    db: Session, tenant_id: int, amount: int, reason: str, reference_id: str | None = None, commit: bool = True,
+) -> bool:
+    """Atomically take *amount* credits if the balance covers them. Returns False if not.
+
+    One conditional UPDATE (``balance >= amount``), so concurrent requests
+    cannot overspend the way a read-check-deduct sequence can. Give the
+    credits back with ``add_credits`` if the reserved work fails.
+    """
+    taken = db.query(ImageCreditBalance).filter(
+        ImageCreditBalance.tenant_id == tenant_id,
+        ImageCreditBalance.balance >= amount,
+    ).update(
+        {
+            ImageCreditBalance.balance: ImageCreditBalance.balance - amount,
+            ImageCreditBalance.updated_at: datetime.now(timezone.utc),
+        },
+        synchronize_session=False,
+    )
+    if not taken:
+        return False
+
+    balance = db.query(ImageCreditBalance.balance).filter(ImageCreditBalance.tenant_id == tenant_id).scalar()
+    tx = ImageCreditTransaction(
+        tenant_id=tenant_id,
+        delta=-amount,
+        reason=reason,
+        reference_id=reference_id,
+        balance_after=balance,
+    )
+    db.add(tx)
+    if commit:
+        db.commit()
+    logger.info("image_credits.reserved", tenant_id=tenant_id, amount=amount, reason=reason, balance=balance)
+    return True
+
+
 def maybe_grant_monthly_credits(db: Session, tenant_id: int) -> int:
     """Grant monthly plan credits if not already granted this month. Returns credits granted (0 if already done)."""
 
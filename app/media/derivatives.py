@@ -0,0 +1,156 @@
+"""Image metadata and WebP derivatives for media assets.
+
+Uploads and AI images used to be decoded in full on the event loop just to
+read a few metadata fields, and the media library then loaded every
+original. ``build_derivatives`` decodes once, at reduced resolution where
+the format allows it (JPEG draft mode), and writes WebP renditions next to
+the original:
+
+    <uuid>_preview.webp   longest side DERIVATIVE_SIZES["preview"]
+    <uuid>_thumb.webp     longest side DERIVATIVE_SIZES["thumb"]
+
+``process_asset_derivatives`` runs it on the CPU executor (``image``
+category) after the upload response has been sent and stores metadata and
+derivative names on the MediaAsset.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+try:
+    from PIL import Image, ImageOps, ImageStat
+    _PILLOW_AVAILABLE = True
+except ImportError:
+    _PILLOW_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+DERIVATIVE_SIZES = {"preview": 1280, "thumb": 320}
+WEBP_QUALITY = int(os.getenv("MEDIA_WEBP_QUALITY", "80"))
+
+
+def derivative_filename(filename: str, variant: str) -> str:
+    return f"{Path(filename).stem}_{variant}.webp"
+
+
+def describe_image(image: "Image.Image", width: int, height: int) -> dict:
+    """Orientation, aspect ratio, dominant colors and brightness.
+
+    ``width``/``height`` are the original dimensions; *image* may be a
+    reduced decode of it.
+    """
+    # Orientation
+    if width > height:
+        orientation = "landscape"
+    elif height > width:
+        orientation = "portrait"
+    else:
+        orientation = "square"
+
+    # Aspect ratio (reduced by GCD)
+    divisor = math.gcd(width, height)
+    aspect_ratio = f"{width // divisor}:{height // divisor}"
+
+    # Dominant colors: resize to 50x50 and count most common pixel colors
+    small = image.resize((50, 50), Image.LANCZOS).convert("RGB")
+    counter = Counter(small.getdata())
+    dominant_colors = [f"#{r:02x}{g:02x}{b:02x}" for (r, g, b), _ in counter.most_common(5)]
+
+    # Brightness: convert to grayscale and get mean
+    mean_brightness = ImageStat.Stat(image.convert("L")).mean[0]
+    if mean_brightness < 85:
+        brightness = "dark"
+    elif mean_brightness > 170:
+        brightness = "light"
+    else:
+        brightness = "neutral"
+
+    return {
+        "width": width,
+        "height": height,
+        "orientation": orientation,
+        "aspect_ratio": aspect_ratio,
+        "dominant_colors": dominant_colors,
+        "brightness": brightness,
+    }
+
+
+def build_derivatives(source: Path) -> dict[str, Any]:
+    """Blocking: metadata plus WebP renditions of *source*.
+
+    Returns {"metadata": {...}, "derivatives": {variant: filename}}.
+    """
+    if not _PILLOW_AVAILABLE:
+        return {"metadata": {}, "derivatives": {}}
+
+    largest = max(DERIVATIVE_SIZES.values())
+    derivatives: dict[str, str] = {}
+    with Image.open(source) as image:
+        width, height = image.size
+        # JPEG: let the decoder downscale by 1/2..1/8 instead of decoding full size
+        image.draft("RGB", (largest, largest))
+        base = ImageOps.exif_transpose(image)
+        base = base.convert("RGBA" if "A" in base.getbands() or "transparency" in image.info else "RGB")
+
+        metadata = describe_image(base, width, height)
+
+        rendition = base
+        # Largest first: each smaller rendition is resized from the previous one
+        for variant, size in sorted(DERIVATIVE_SIZES.items(), key=lambda kv: -kv[1]):
+            rendition = rendition.copy()
+            rendition.thumbnail((size, size), Image.LANCZOS)
+            name = derivative_filename(source.name, variant)
+            tmp = source.with_name(f".{name}.part")
+            rendition.save(tmp, "WEBP", quality=WEBP_QUALITY, method=4)
+            os.replace(tmp, source.with_name(name))
+            derivatives[variant] = name
+
+    return {"metadata": metadata, "derivatives": derivatives}
+
+
+def _store_result(asset_id: int, tenant_slug: str, result: dict[str, Any]) -> None:
+    from app.core.media_models import MediaAsset
+    from app.media.storage import delete_file
+    from app.shared.db import open_session
+
+    db = open_session()
+    try:
+        asset = db.get(MediaAsset, asset_id)
+        if asset is None:
+            # Deleted while we were resizing
+            for name in result["derivatives"].values():
+                delete_file(tenant_slug, name)
+            return
+        meta = result["metadata"]
+        for column in ("width", "height", "orientation", "aspect_ratio", "dominant_colors", "brightness"):
+            if getattr(asset, column) is None and meta.get(column) is not None:
+                setattr(asset, column, meta[column])
+        asset.derivatives = result["derivatives"]
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def process_asset_derivatives(asset_id: int, tenant_slug: str, filename: str) -> None:
+    """Background task: build derivatives off the loop and attach them to the asset."""
+    from app.core.cpu_executor import IMAGE, run_cpu
+    from app.media.storage import get_media_path
+
+    try:
+        result = await run_cpu(IMAGE, build_derivatives, get_media_path(tenant_slug, filename))
+        await asyncio.to_thread(_store_result, asset_id, tenant_slug, result)
+    except Exception as e:
+        # The library falls back to the original until derivatives exist
+        logger.warning("media.derivatives_failed", asset_id=asset_id, error=str(e))
+        return
+    logger.info("media.derivatives_built", asset_id=asset_id, variants=sorted(result["derivatives"]))
@@ -0,0 +1,577 @@
+"""Queued AI image generation and editing.
+
+``POST /admin/media/ai-generate`` and ``/{asset_id}/ai-edit`` used to hold
+the request open for the whole provider call (or ``CampaignOrchestrator.run``)
+and check the credit balance before the call but deduct after it, so slow
+providers tied up workers and concurrent requests could overspend.
+
+Now the endpoints only validate and call ``enqueue_image_job``:
+
+    reserve credits (one conditional UPDATE)  ─┐ same transaction
+    insert ImageGenerationJob(status=queued)  ─┘
+    ImageJobRunner.submit(job_id)              → 202 + job id
+
+The runner executes jobs as asyncio tasks, at most
+``IMAGE_JOBS_PER_TENANT`` per tenant and ``IMAGE_JOBS_MAX_CONCURRENCY``
+overall in this process. On success the result is stored through
+``MediaService.record_ai_generated`` and the reservation is committed; on
+failure or timeout the credits are refunded. Clients poll
+``GET /admin/media/jobs/{id}`` or follow ``/jobs/{id}/events`` (SSE).
+
+Jobs are claimed with a conditional ``queued → running`` UPDATE, so a job
+runs at most once even if several processes submit it. On startup the
+gateway resubmits jobs left ``queued`` by a process that died
+(``ImageJobRunner.resume_queued``). ``reaper_loop`` (worker
+``image-job-reaper``) fails and refunds jobs still running long after
+``started_at`` and jobs queued for longer than
+``IMAGE_JOB_QUEUED_TIMEOUT_SECONDS``. If the reaper released a reservation
+first, the late success is rolled back instead of committing credits that
+were already refunded.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import os
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+import structlog
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.media_models import ImageGenerationJob
+from app.media.credit_service import add_credits, reserve_credits
+
+logger = structlog.get_logger()
+
+IMAGE_JOBS_MAX_CONCURRENCY = int(os.getenv("IMAGE_JOBS_MAX_CONCURRENCY", "8"))
+IMAGE_JOBS_PER_TENANT = int(os.getenv("IMAGE_JOBS_PER_TENANT", "2"))
+IMAGE_JOBS_MAX_PENDING_PER_TENANT = int(os.getenv("IMAGE_JOBS_MAX_PENDING_PER_TENANT", "10"))
+IMAGE_JOB_TIMEOUT_SECONDS = float(os.getenv("IMAGE_JOB_TIMEOUT_SECONDS", "300"))
+IMAGE_JOB_QUEUED_TIMEOUT_SECONDS = float(os.getenv("IMAGE_JOB_QUEUED_TIMEOUT_SECONDS", "3600"))
+IMAGE_JOB_REAPER_INTERVAL_SECONDS = float(os.getenv("IMAGE_JOB_REAPER_INTERVAL_SECONDS", "60"))
+
+PENDING_STATUSES = ("queued", "running")
+FINAL_STATUSES = ("succeeded", "failed")
+
+ProgressFn = Callable[[int, str], None]
+
+
+@dataclass
+class GeneratedImage:
+    """What a provider call produced.
+
+    Either raw image ``data`` that the runner stores as a new asset, or an
+    ``asset_id``/``url`` of an asset the provider already persisted (the
+    campaign orchestrator records its own image).
+    """
+    provider_slug: str
+    data: Optional[bytes] = None
+    model: Optional[str] = None
+    revised_prompt: Optional[str] = None
+    asset_id: Optional[int] = None
+    url: Optional[str] = None
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+ImageProvider = Callable[[ImageGenerationJob, Session, ProgressFn], Awaitable[GeneratedImage]]
+
+
+class ImageJobFailed(Exception):
+    """Provider-side failure with a message that is safe to show the user."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _reference(job_id: str) -> str:
+    return f"image_job:{job_id}"
+
+
+# ── Enqueue ──────────────────────────────────────────────────────────────────
+
+def enqueue_image_job(
+    db: Session,
+    tenant_id: int,
+    kind: str,
+    request: dict[str, Any],
+    credit_cost: int,
+    created_by: Optional[int] = None,
+    source_asset_id: Optional[int] = None,
+) -> ImageGenerationJob:
+    """Reserve *credit_cost* credits and insert a queued job, atomically.
+
+    Raises 429 if the tenant already has too many jobs pending and 402 if
+    the balance does not cover the reservation.
+    """
+    pending = db.query(ImageGenerationJob).filter(
+        ImageGenerationJob.tenant_id == tenant_id,
+        ImageGenerationJob.status.in_(PENDING_STATUSES),
+    ).count()
+    if pending >= IMAGE_JOBS_MAX_PENDING_PER_TENANT:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Zu viele laufende Bildaufträge ({pending}). Bitte warten, bis einer abgeschlossen ist.",
+        )
+
+    job_id = str(uuid.uuid4())
+    reason = "edit" if kind == "edit" else "generation"
+    if not reserve_credits(db, tenant_id, credit_cost, reason, _reference(job_id), commit=False):
+        db.rollback()
+        from app.media.credit_service import get_balance
+        raise HTTPException(
+            status_code=402,
+            detail=f"Nicht genügend Credits. Jetzt aufladen. (Benötigt: {credit_cost}, Verfügbar: {get_balance(db, tenant_id)})",
+        )
+
+    job = ImageGenerationJob(
+        id=job_id,
+        tenant_id=tenant_id,
+        created_by=created_by,
+        kind=kind,
+        status="queued",
+        progress=0,
+        stage="queued",
+        request=request,
+        source_asset_id=source_asset_id,
+        credits_reserved=credit_cost,
+        credit_state="reserved",
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    logger.info("media.image_job.enqueued", job_id=job_id, tenant_id=tenant_id, kind=kind, credits=credit_cost)
+    return job
+
+
+# ── Reservation settlement ───────────────────────────────────────────────────
+
+def _settle(db: Session, job_id: str, to_state: str) -> bool:
+    """Move the reservation out of "reserved" exactly once."""
+    moved = db.query(ImageGenerationJob).filter(
+        ImageGenerationJob.id == job_id,
+        ImageGenerationJob.credit_state == "reserved",
+    ).update({ImageGenerationJob.credit_state: to_state}, synchronize_session=False)
+    return bool(moved)
+
+
+def _claim(db: Session, job_id: str, to_status: str = "running") -> bool:
+    """Move a job out of "queued" exactly once."""
+    values: dict[Any, Any] = {ImageGenerationJob.status: to_status, ImageGenerationJob.stage: "starting"}
+    if to_status == "running":
+        values[ImageGenerationJob.started_at] = _now()
+    moved = db.query(ImageGenerationJob).filter(
+        ImageGenerationJob.id == job_id,
+        ImageGenerationJob.status == "queued",
+    ).update(values, synchronize_session=False)
+    db.commit()
+    return bool(moved)
+
+
+def release_reservation(db: Session, job: ImageGenerationJob) -> bool:
+    """Refund the job's reserved credits; a no-op if already settled."""
+    if not _settle(db, job.id, "released"):
+        db.commit()
+        return False
+    if job.credits_reserved:
+        add_credits(db, job.tenant_id, job.credits_reserved, "generation_refund", _reference(job.id))
+    else:
+        db.commit()
+    return True
+
+
+def fail_job(db: Session, job: ImageGenerationJob, error: str) -> None:
+    job.status = "failed"
+    job.stage = "failed"
+    job.error = error[:2000]
+    job.finished_at = _now()
+    db.commit()
+    release_reservation(db, job)
+    db.refresh(job)
+
+
+# ── Serialization ────────────────────────────────────────────────────────────
+
+def job_to_dict(job: ImageGenerationJob) -> dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": job.progress,
+        "credits_reserved": job.credits_reserved,
+        "credit_state": job.credit_state,
+        "source_asset_id": job.source_asset_id,
+        "asset_id": job.asset_id,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+# ── Real provider ────────────────────────────────────────────────────────────
+
+async def _fetch_image(url: str, timeout: float = 60.0) -> bytes:
+    if url.startswith("data:"):
+        # Base64 data URI (Stability AI)
+        return base64.b64decode(url.split(",", 1)[1])
+    import httpx
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        resp = await client.get(url)
+        resp.raise_for_status()
+        return resp.content
+
+
+async def generate_for_job(job: ImageGenerationJob, db: Session, report: ProgressFn) -> GeneratedImage:
+    """Run the provider call that used to happen inside the request handler."""
+    from app.ai_config.image_service import ImageConfigService
+
+    body = job.request
+    img_svc = ImageConfigService(db)
+
+    if job.kind == "edit":
+        from app.ai_config.image_generator import generate_edit_image
+        from app.core.media_models import MediaAsset
+        from app.domains.identity.queries import identity_queries
+        from app.media.storage import get_public_url
+
+        source = db.get(MediaAsset, job.source_asset_id)
+        tenant = identity_queries.get_tenant_by_id(db, job.tenant_id)
+        if source is None or tenant is None:
+            raise ImageJobFailed("Source asset no longer exists")
+        try:
+            config = img_svc.resolve_provider_by_slug(job.tenant_id, body["edit_model_slug"])
+        except Exception as e:
+            logger.warning("media.resolve_provider_by_slug_failed", error=str(e))
+            config = img_svc.resolve_image_provider(job.tenant_id)
+
+        report(10, "editing")
+        result = await generate_edit_image(
+            config=config,
+            image_url=get_public_url(tenant.slug, source.filename),
+            prompt=body["prompt"],
+            edit_model_slug=body["edit_model_slug"],
+            strength=body.get("strength", 0.75),
+        )
+        if not result.urls:
+            raise ImageJobFailed("Image edit returned no results")
+        report(70, "downloading")
+        return GeneratedImage(
+            provider_slug=body["edit_model_slug"], data=await _fetch_image(result.urls[0]), model=result.model,
+        )
+
+    if body.get("use_orchestrator"):
+        from app.swarm.agents.campaign.orchestrator import CampaignOrchestrator, CampaignGenerationRequest
+        from app.swarm.llm import LLMClient
+        from config.settings import get_settings
+
+        report(10, "orchestrating")
+        orch = CampaignOrchestrator(LLMClient(openai_api_key=get_settings().openai_api_key))
+        result = await orch.run(CampaignGenerationRequest(
+            campaign_name=body.get("campaign_name") or "",
+            channel=body.get("channel") or "email",
+            tone=body.get("tone") or "professional",
+            prompt=body["prompt"],
+            tenant_id=job.tenant_id,
+            generate_image=True,
+            image_size=body["size"],
+            image_quality=body["quality"],
+            image_model_slug=body.get("model_slug"),
+            created_by=job.created_by,
+        ), db=db)
+        if result.error:
+            raise ImageJobFailed(result.error)
+        if not result.image_asset_id:
+            raise ImageJobFailed("Image generation returned no results")
+        return GeneratedImage(
+            provider_slug=body.get("model_slug") or "orchestrator",
+            asset_id=result.image_asset_id,
+            url=result.image_url,
+            extra={
+                "qa_passed": result.qa_passed,
+                "qa_issues": result.qa_issues,
+                "pipeline_steps": result.pipeline_steps,
+            },
+        )
+
+    from app.ai_config.image_generator import generate_image
+
+    config = img_svc.resolve_provider_for_mode(
+        job.tenant_id,
+        mode=body["mode"],
+        has_text_overlay=body.get("has_text_overlay", False),
+        use_brand_style=body.get("use_brand_style", False),
+    )
+    report(10, "generating")
+    result = await generate_image(
+        config=config,
+        prompt=body["prompt"],
+        size=body["size"],
+        quality=body["quality"],
+        brand_colors=[],
+    )
+    if not result.urls:
+        raise ImageJobFailed("Image generation returned no results")
+    report(70, "downloading")
+    try:
+        data = await _fetch_image(result.urls[0], timeout=30.0)
+    except Exception as e:
+        raise ImageJobFailed(f"Failed to download generated image: {e}") from e
+    return GeneratedImage(
+        provider_slug=config.provider_slug, data=data, model=result.model, revised_prompt=result.revised_prompt,
+    )
+
+
+# ── Runner ───────────────────────────────────────────────────────────────────
+
+def _default_session_factory() -> Session:
+    from app.shared.db import open_session
+    return open_session()
+
+
+class ImageJobRunner:
+    """Executes queued jobs in this process with per-tenant and global bounds."""
+
+    def __init__(
+        self,
+        provider: Optional[ImageProvider] = None,
+        session_factory: Callable[[], Session] = _default_session_factory,
+        max_concurrency: int = IMAGE_JOBS_MAX_CONCURRENCY,
+        per_tenant: int = IMAGE_JOBS_PER_TENANT,
+        timeout_seconds: float = IMAGE_JOB_TIMEOUT_SECONDS,
+    ) -> None:
+        self._provider = provider or generate_for_job
+        self._session_factory = session_factory
+        self._max_concurrency = max(1, max_concurrency)
+        self._per_tenant = max(1, per_tenant)
+        self._timeout = timeout_seconds
+        self._global: Optional[asyncio.Semaphore] = None
+        self._tenants: dict[int, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self._per_tenant))
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, job_id: str, tenant_id: int) -> asyncio.Task:
+        task = asyncio.create_task(self._run_bounded(job_id, tenant_id), name=f"image-job-{job_id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def resume_queued(self) -> int:
+        """Resubmit jobs left queued by a process that died before running them.
+
+        Jobs still queued in a live process are submitted here too; the
+        claim in ``run`` lets only one of the two execute each job.
+        """
+        def queued() -> list[tuple[str, int]]:
+            db = self._session_factory()
+            try:
+                return [
+                    (job_id, tenant_id)
+                    for job_id, tenant_id in db.query(ImageGenerationJob.id, ImageGenerationJob.tenant_id)
+                    .filter(ImageGenerationJob.status == "queued")
+                    .order_by(ImageGenerationJob.created_at)
+                ]
+            finally:
+                db.close()
+
+        jobs = await asyncio.to_thread(queued)
+        for job_id, tenant_id in jobs:
+            self.submit(job_id, tenant_id)
+        if jobs:
+            logger.info("media.image_job.resumed", count=len(jobs))
+        return len(jobs)
+
+    async def drain(self) -> None:
+        """Wait for all submitted jobs (tests, shutdown)."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def _run_bounded(self, job_id: str, tenant_id: int) -> None:
+        if self._global is None:
+            self._global = asyncio.Semaphore(self._max_concurrency)
+        # Tenant slot first: one tenant's backlog must not hold global slots while it waits
+        async with self._tenants[tenant_id]:
+            async with self._global:
+                await self.run(job_id)
+
+    async def run(self, job_id: str) -> None:
+        db = self._session_factory()
+        try:
+            if not _claim(db, job_id):
+                return
+            job = db.get(ImageGenerationJob, job_id)
+
+            def report(progress: int, stage: str) -> None:
+                job.progress = max(job.progress or 0, min(int(progress), 99))
+                job.stage = stage
+                db.commit()
+
+            try:
+                generated = await asyncio.wait_for(self._provider(job, db, report), timeout=self._timeout)
+                report(80, "saving")
+                result = await self._persist(db, job, generated)
+            except Exception as e:
+                db.rollback()
+                if isinstance(e, asyncio.TimeoutError):
+                    error = f"Image generation timed out after {self._timeout:.0f}s"
+                elif isinstance(e, (ImageJobFailed, HTTPException)):
+                    error = str(e.detail) if isinstance(e, HTTPException) else str(e)
+                else:
+                    error = f"Image generation failed: {e}"
+                logger.error("media.image_job.failed", job_id=job_id, tenant_id=job.tenant_id, error=str(e))
+                fail_job(db, job, error)
+                return
+
+            job.status = "succeeded"
+            job.stage = "done"
+            job.progress = 100
+            job.asset_id = result.get("id")
+            job.result = result
+            job.finished_at = _now()
+            if not _settle(db, job.id, "committed"):
+                # The reaper failed the job and refunded its credits meanwhile
+                db.rollback()
+                logger.warning(
+                    "media.image_job.settle_conflict", job_id=job_id, tenant_id=job.tenant_id,
+                    asset_id=result.get("id"),
+                )
+                return
+            db.commit()
+            logger.info(
+                "media.image_job.complete", job_id=job_id, tenant_id=job.tenant_id,
+                asset_id=job.asset_id, provider=generated.provider_slug,
+            )
+        finally:
+            db.close()
+
+        if generated.data is not None and result.get("id"):
+            from app.media.derivatives import process_asset_derivatives
+            await process_asset_derivatives(result["id"], result["tenant_slug"], result["filename"])
+
+    async def _persist(self, db: Session, job: ImageGenerationJob, generated: GeneratedImage) -> dict[str, Any]:
+        """Store the image as a MediaAsset and account usage; returns the job result."""
+        body = job.request
+        if generated.data is None:
+            return {
+                "id": generated.asset_id,
+                "url": generated.url,
+                "source": "ai_generated",
+                "provider_slug": generated.provider_slug,
+                **generated.extra,
+            }
+
+        from app.domains.identity.queries import identity_queries
+        from app.media.service import MediaService
+        from app.media.storage import get_public_url, save_bytes
+
+        tenant = identity_queries.get_tenant_by_id(db, job.tenant_id)
+        if tenant is None:
+            raise ImageJobFailed("Tenant not found")
+        svc = MediaService(db=db, tenant_id=job.tenant_id, tenant_slug=tenant.slug)
+        svc.check_storage_quota(bytes_to_add=len(generated.data))
+        filename, file_size = await save_bytes(generated.data, tenant.slug, ".png")
+        asset = svc.record_ai_generated(
+            filename=filename,
+            file_size=file_size,
+            mime_type="image/png",
+            prompt=body["prompt"],
+            provider_slug=generated.provider_slug,
+            created_by=job.created_by,
+            # Metadata comes from process_asset_derivatives, off the loop
+            image_data=None,
+        )
+
+        if job.kind == "generate":
+            from app.core.feature_gates import FeatureGate
+            gate = FeatureGate(job.tenant_id)
+            if body.get("mode") == "preview":
+                gate.increment_image_preview_usage()
+            else:
+                svc.increment_image_gen_usage()
+                gate.increment_image_generation_usage()
+        else:
+            svc.increment_image_gen_usage()
+        svc.increment_storage_usage(file_size)
+
+        return {
+            "id": asset.id,
+            "url": get_public_url(tenant.slug, filename),
+            "filename": filename,
+            "tenant_slug": tenant.slug,
+            "revised_prompt": generated.revised_prompt,
+            "provider_slug": generated.provider_slug,
+            "model": generated.model,
+            "file_size": file_size,
+            "source": "ai_generated",
+            "mode": body.get("mode"),
+            "created_at": asset.created_at.isoformat() if asset.created_at else None,
+            **generated.extra,
+        }
+
+
+_runner: Optional[ImageJobRunner] = None
+
+
+def get_image_job_runner() -> ImageJobRunner:
+    global _runner
+    if _runner is None:
+        _runner = ImageJobRunner()
+    return _runner
+
+
+# ── Reaper ───────────────────────────────────────────────────────────────────
+
+def fail_stale_jobs(
+    db: Session,
+    older_than_seconds: float = IMAGE_JOB_TIMEOUT_SECONDS * 2,
+    now: Optional[datetime] = None,
+    queued_older_than_seconds: float = IMAGE_JOB_QUEUED_TIMEOUT_SECONDS,
+) -> int:
+    """Fail and refund jobs whose process died before finishing them.
+
+    A live runner gives up after ``IMAGE_JOB_TIMEOUT_SECONDS``, so a job
+    still running long after it started has lost its process. Queued jobs
+    may just be waiting for a concurrency slot and get the longer
+    *queued_older_than_seconds*; if no gateway restarted to resume them,
+    they are failed then.
+    """
+    now = now or _now()
+    running = db.query(ImageGenerationJob).filter(
+        ImageGenerationJob.status == "running",
+        ImageGenerationJob.started_at < now - timedelta(seconds=older_than_seconds),
+    ).all()
+    queued = db.query(ImageGenerationJob).filter(
+        ImageGenerationJob.status == "queued",
+        ImageGenerationJob.created_at < now - timedelta(seconds=queued_older_than_seconds),
+    ).all()
+    # A queued job is only failed if no runner claimed it in the meantime
+    stale = running + [job for job in queued if _claim(db, job.id, "failed")]
+    for job in stale:
+        fail_job(db, job, "Job abandoned (worker restarted or timed out)")
+    if stale:
+        logger.warning("media.image_job.reaped", count=len(stale))
+    return len(stale)
+
+
+def _reap_once() -> int:
+    db = _default_session_factory()
+    try:
+        return fail_stale_jobs(db)
+    finally:
+        db.close()
+
+
+async def reaper_loop(interval: float = IMAGE_JOB_REAPER_INTERVAL_SECONDS) -> None:
+    """Background job: refund credits of jobs that were never finished."""
+    while True:
+        try:
+            await asyncio.to_thread(_reap_once)
+        except Exception as exc:
+            logger.error("media.image_job.reap_failed", error=str(exc))
+        await asyncio.sleep(interval)
@@ -3,17 +3,17 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Optional
 import io
-import math
-from collections import Counter
 import structlog
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app.core.media_models import MediaAsset
 from app.domains.billing.models import UsageRecord
 from app.domains.billing.queries import billing_queries
+from app.media.derivatives import describe_image
+from app.media.storage import get_media_path
 
 try:
-    from PIL import Image, ImageStat
+    from PIL import Image
     _PILLOW_AVAILABLE = True
 except ImportError:
     _PILLOW_AVAILABLE = False
@@ -34,48 +34,23 @@ class MediaService:
             if not _PILLOW_AVAILABLE:
                 return {}
             image = Image.open(io.BytesIO(data))
-            width, height = image.size
-
-            # Orientation
-            if width > height:
-                orientation = "landscape"
-            elif height > width:
-                orientation = "portrait"
-            else:
-                orientation = "square"
-
-            # Aspect ratio (reduced by GCD)
-            divisor = math.gcd(width, height)
-            aspect_ratio = f"{width // divisor}:{height // divisor}"
-
-            # Dominant colors: resize to 50x50 and count most common pixel colors
-            small = image.resize((50, 50), Image.LANCZOS).convert("RGB")
-            pixels = list(small.getdata())
-            counter = Counter(pixels)
-            top5 = counter.most_common(5)
-            dominant_colors = [f"#{r:02x}{g:02x}{b:02x}" for (r, g, b), _ in top5]
-
-            # Brightness: convert to grayscale and get mean
-            gray = image.convert("L")
-            mean_brightness = ImageStat.Stat(gray).mean[0]
-            if mean_brightness < 85:
-                brightness = "dark"
-            elif mean_brightness > 170:
-                brightness = "light"
-            else:
-                brightness = "neutral"
-
-            return {
-                "width": width,
-                "height": height,
-                "orientation": orientation,
-                "aspect_ratio": aspect_ratio,
-                "dominant_colors": dominant_colors,
-                "brightness": brightness,
-            }
+            return describe_image(image, *image.size)
         except Exception:
             return {}
 
+    def find_duplicate(self, content_sha256: str) -> Optional[MediaAsset]:
+        """An existing asset of this tenant with the same content whose file is still on disk."""
+        candidates = (
+            self._db.query(MediaAsset)
+            .filter(MediaAsset.tenant_id == self._tenant_id, MediaAsset.content_sha256 == content_sha256)
+            .order_by(MediaAsset.id.asc())
+            .all()
+        )
+        for asset in candidates:
+            if get_media_path(self._tenant_slug, asset.filename).exists():
+                return asset
+        return None
+
     def _get_plan_limits(self) -> dict:
         return billing_queries.get_plan_limits_for_tenant(
             self._db,
@@ -148,12 +123,14 @@ class MediaService:
 
     def record_upload(self, filename: str, original_filename: str, file_size: int,
                       mime_type: str, width: Optional[int], height: Optional[int],
-                      created_by: Optional[int], image_data: bytes = None) -> MediaAsset:
+                      created_by: Optional[int], image_data: bytes = None,
+                      content_sha256: Optional[str] = None) -> MediaAsset:
         meta = self._extract_image_metadata(image_data) if image_data else {}
         asset = MediaAsset(
             tenant_id=self._tenant_id,
             filename=filename,
             original_filename=original_filename,
+            content_sha256=content_sha256,
             file_size=file_size,
             mime_type=mime_type,
             width=meta.get("width") if meta.get("width") is not None else width,
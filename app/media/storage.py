@@ -1,9 +1,22 @@
-"""Media file storage utilities with path traversal protection."""
+"""Media file storage utilities with path traversal protection.
+
+Uploads are streamed (``stage_upload``): chunks go to a hidden temp file in
+the tenant's target directory while the SHA-256 and the size limit are
+computed on the fly, so a 25 MB upload never sits in memory. The staged
+file is then renamed into place (same filesystem, atomic) or discarded.
+
+Documents keep a unique name per upload; identical content is stored once
+in the hidden ``.blobs/`` content store and each upload name is a hard link
+to it, so the link count is the reference count.
+"""
 from __future__ import annotations
+import asyncio
+import hashlib
 import uuid
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, Protocol
 import structlog
 
 logger = structlog.get_logger()
@@ -11,6 +24,9 @@ logger = structlog.get_logger()
 ALLOWED_MIME_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp"}
 ALLOWED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+IMAGE_MIME_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
+                    ".gif": "image/gif", ".webp": "image/webp"}
+UPLOAD_CHUNK_SIZE = int(os.getenv("MEDIA_UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
 
 # Document upload support
 ALLOWED_DOCUMENT_EXTENSIONS = {".pdf", ".docx", ".doc", ".xlsx", ".xls", ".pptx", ".ppt", ".txt"}
@@ -25,6 +41,7 @@ ALLOWED_DOCUMENT_MIME_TYPES = {
     ".txt": "text/plain",
 }
 MAX_DOCUMENT_SIZE = 25 * 1024 * 1024  # 25MB
+DOCUMENT_BLOB_DIR = ".blobs"
 
 
 def _validate_tenant_slug(tenant_slug: str) -> None:
@@ -70,6 +87,82 @@ def get_document_public_url(tenant_slug: str, filename: str) -> str:
     return f"{base}/media/tenants/{tenant_slug}/documents/{filename}"
 
 
+class UploadTooLarge(ValueError):
+    """The upload stream exceeded its size limit."""
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__(f"File too large (max {max_size // 1024 // 1024} MB)")
+        self.max_size = max_size
+
+
+class _AsyncReadable(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+@dataclass
+class StagedUpload:
+    """A fully received upload in a temp file, not yet visible under its final name."""
+    path: Path
+    ext: str
+    size: int
+    sha256: str
+
+    async def commit(self, filename: Optional[str] = None) -> str:
+        """Move the file to *filename* (default: a fresh UUID name); returns the name."""
+        name = filename or f"{uuid.uuid4()}{self.ext}"
+        await asyncio.to_thread(os.replace, self.path, self.path.with_name(name))
+        return name
+
+    async def discard(self) -> None:
+        await asyncio.to_thread(self.path.unlink, missing_ok=True)
+
+
+def _write_chunk(handle: Any, hasher: Any, chunk: bytes) -> None:
+    hasher.update(chunk)
+    handle.write(chunk)
+
+
+async def stage_upload(
+    upload: _AsyncReadable,
+    directory: Path,
+    ext: str,
+    max_size: int,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> StagedUpload:
+    """Stream *upload* into a temp file in *directory*, hashing as it goes.
+
+    Raises UploadTooLarge as soon as more than *max_size* bytes arrive; the
+    temp file is removed in that case.
+    """
+    await asyncio.to_thread(directory.mkdir, parents=True, exist_ok=True)
+    path = directory / f".upload-{uuid.uuid4().hex}.part"
+    hasher = hashlib.sha256()
+    size = 0
+    handle = await asyncio.to_thread(open, path, "wb")
+    try:
+        while chunk := await upload.read(chunk_size):
+            size += len(chunk)
+            if size > max_size:
+                raise UploadTooLarge(max_size)
+            await asyncio.to_thread(_write_chunk, handle, hasher, chunk)
+    except BaseException:
+        await asyncio.to_thread(handle.close)
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+        raise
+    await asyncio.to_thread(handle.close)
+    return StagedUpload(path=path, ext=ext, size=size, sha256=hasher.hexdigest())
+
+
+def get_images_dir(tenant_slug: str) -> Path:
+    _validate_tenant_slug(tenant_slug)
+    return _get_media_root() / tenant_slug / "images"
+
+
+def get_documents_dir(tenant_slug: str) -> Path:
+    _validate_tenant_slug(tenant_slug)
+    return _get_media_root() / tenant_slug / "documents"
+
+
 async def save_document_bytes(
     data: bytes,
     tenant_slug: str,
@@ -98,7 +191,7 @@ async def save_document_bytes(
     uuid_name = f"{uuid.uuid4()}{ext}"
     dest = get_document_path(tenant_slug, uuid_name)
     dest.parent.mkdir(parents=True, exist_ok=True)
-    dest.write_bytes(data)
+    await asyncio.to_thread(dest.write_bytes, data)
 
     logger.info(
         "media.document_saved",
@@ -110,14 +203,73 @@ async def save_document_bytes(
     return uuid_name, size, mime_type
 
 
+def _document_blob_path(tenant_slug: str, sha256: str, ext: str) -> Path:
+    return get_documents_dir(tenant_slug) / DOCUMENT_BLOB_DIR / f"{sha256}{ext}"
+
+
+def _link_document(staged: StagedUpload, blob: Path, dest: Path) -> bool:
+    """Hard-link *dest* to the content blob; returns True if the blob existed."""
+    blob.parent.mkdir(exist_ok=True)
+    for _ in range(3):
+        try:
+            os.link(staged.path, blob)
+        except FileExistsError:
+            try:
+                os.link(blob, dest)
+            except FileNotFoundError:
+                continue  # blob released by a concurrent delete, store ours
+            staged.path.unlink(missing_ok=True)
+            return True
+        os.replace(staged.path, dest)
+        return False
+    raise OSError(f"Could not link document blob {blob.name}")
+
+
+async def store_document(staged: StagedUpload, tenant_slug: str) -> tuple[str, bool]:
+    """Publish a staged document under a fresh per-upload name.
+
+    Returns (filename, deduplicated). Identical content shares one blob in
+    the content store; where hard links are not supported the upload is
+    stored as a plain copy.
+    """
+    filename = f"{uuid.uuid4()}{staged.ext}"
+    blob = _document_blob_path(tenant_slug, staged.sha256, staged.ext)
+    try:
+        deduplicated = await asyncio.to_thread(
+            _link_document, staged, blob, get_document_path(tenant_slug, filename)
+        )
+    except OSError as e:
+        logger.warning("media.document_link_failed", error=str(e), tenant_slug=tenant_slug)
+        return await staged.commit(filename), False
+    return filename, deduplicated
+
+
+def _file_sha256(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
 def delete_document(tenant_slug: str, filename: str) -> bool:
-    """Delete a document file from disk."""
+    """Delete a document file from disk.
+
+    Only the upload's own name is removed; the content blob goes with the
+    last upload that links to it.
+    """
     try:
         _validate_tenant_slug(tenant_slug)
         path = get_document_path(tenant_slug, filename)
-        if path.exists():
-            path.unlink()
-            return True
+        if not path.exists():
+            return False
+        blob = None
+        if path.stat().st_nlink == 2:
+            blob = _document_blob_path(tenant_slug, _file_sha256(path), path.suffix.lower())
+        path.unlink()
+        if blob is not None and blob.exists() and blob.stat().st_nlink == 1:
+            blob.unlink()
+        return True
     except Exception as e:
         logger.warning("media.document_delete_failed", error=str(e))
     return False
@@ -136,15 +288,13 @@ async def save_upload_bytes(data: bytes, tenant_slug: str, original_filename: st
         raise ValueError(f"Unsupported file type: {ext}")
 
     # Detect MIME type
-    mime_map = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
-                ".gif": "image/gif", ".webp": "image/webp"}
-    mime_type = mime_map.get(ext, "application/octet-stream")
+    mime_type = IMAGE_MIME_TYPES.get(ext, "application/octet-stream")
 
     uuid_name = f"{uuid.uuid4()}{ext}"
     dest = get_media_path(tenant_slug, uuid_name)
     dest.parent.mkdir(parents=True, exist_ok=True)
 
-    dest.write_bytes(data)
+    await asyncio.to_thread(dest.write_bytes, data)
     logger.info("media.upload_saved", filename=uuid_name, size=size, tenant_slug=tenant_slug)
     return uuid_name, size, mime_type
 
@@ -155,7 +305,7 @@ async def save_bytes(data: bytes, tenant_slug: str, ext: str = ".png") -> tuple[
     uuid_name = f"{uuid.uuid4()}{ext}"
     dest = get_media_path(tenant_slug, uuid_name)
     dest.parent.mkdir(parents=True, exist_ok=True)
-    dest.write_bytes(data)
+    await asyncio.to_thread(dest.write_bytes, data)
     logger.info("media.ai_image_saved", filename=uuid_name, size=len(data), tenant_slug=tenant_slug)
     return uuid_name, len(data)
 
@@ -2,7 +2,10 @@
 
 Replaces the fragile Librarian with a robust background worker that:
 - Reads tasks from a Redis Stream (not Pub/Sub)
-- Tracks job status (pending → running → completed/failed)
+- Tracks job status (pending → running → completed/failed), persisted
+  in ``librarian_jobs`` so it survives restarts
+- Drains the stale-session backlog page by page with bounded
+  concurrent summarization
 - Retries with exponential backoff
 - Falls back to raw chat history on repeated failures
 - Stores episodic memories in the vector DB
@@ -15,14 +18,19 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
 import time
 import structlog
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from enum import Enum
 from typing import Any, Optional
 
-from app.domains.support.models import ChatMessage, ChatSession
+from sqlalchemy import func
+
+from app.domains.identity.models import Tenant
+from app.domains.support.models import ChatMessage, ChatSession, LibrarianJob
 from app.shared.db import open_session
 
 logger = structlog.get_logger()
@@ -34,7 +42,8 @@ MAX_RETRIES = 3
 BACKOFF_BASE = 2  # seconds
 BACKOFF_MAX = 60  # seconds
 JOB_TTL_HOURS = 168  # 7 days
-BATCH_SIZE = 10
+BATCH_SIZE = int(os.getenv("LIBRARIAN_BATCH_SIZE", "100"))  # sessions per scanned page
+LIBRARIAN_CONCURRENCY = int(os.getenv("LIBRARIAN_CONCURRENCY", "4"))  # concurrent summarizations
 SESSION_AGE_HOURS = 24  # Archive sessions older than this
 
 
@@ -53,6 +62,7 @@ class ArchivalJob:
     member_id: str
     tenant_id: int
     session_id: Optional[str] = None
+    chat_session_id: Optional[int] = None
     status: JobStatus = JobStatus.PENDING
     retry_count: int = 0
     last_error: str = ""
@@ -67,6 +77,7 @@ class ArchivalJob:
             "member_id": self.member_id,
             "tenant_id": self.tenant_id,
             "session_id": self.session_id,
+            "chat_session_id": self.chat_session_id,
             "status": self.status.value,
             "retry_count": self.retry_count,
             "last_error": self.last_error,
@@ -82,6 +93,7 @@ class ArchivalJob:
             member_id=data.get("member_id", ""),
             tenant_id=int(data.get("tenant_id", 0)),
             session_id=data.get("session_id"),
+            chat_session_id=data.get("chat_session_id"),
             status=JobStatus(data.get("status", "pending")),
             retry_count=int(data.get("retry_count", 0)),
             last_error=data.get("last_error", ""),
@@ -92,6 +104,152 @@ class ArchivalJob:
         )
 
 
+# ─── Job Stores ───────────────────────────────────────────────────────────────
+
+_FINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.FALLBACK)
+
+
+class InMemoryJobStore:
+    """Process-local job store; state is lost on restart."""
+
+    def __init__(self):
+        self._jobs: dict[str, ArchivalJob] = {}
+
+    def save(self, jobs: list[ArchivalJob]) -> None:
+        for job in jobs:
+            self._jobs[job.job_id] = job
+
+    def get(self, job_id: str) -> Optional[ArchivalJob]:
+        return self._jobs.get(job_id)
+
+    def by_status(self, status: JobStatus, limit: Optional[int] = None) -> list[ArchivalJob]:
+        jobs = [j for j in self._jobs.values() if j.status == status]
+        return jobs[:limit] if limit is not None else jobs
+
+    def count_by_status(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status.value] = counts.get(job.status.value, 0) + 1
+        return counts
+
+    def purge(self, finished_before: float) -> int:
+        stale = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in _FINAL_STATUSES and (job.completed_at or job.created_at) < finished_before
+        ]
+        for job_id in stale:
+            del self._jobs[job_id]
+        return len(stale)
+
+
+def _to_datetime(ts: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(ts, timezone.utc) if ts else None
+
+
+def _to_timestamp(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    if value.tzinfo is None:  # SQLite drops the offset; rows are written in UTC
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class DatabaseJobStore:
+    """Job store backed by the ``librarian_jobs`` table.
+
+    Summaries are not persisted here; they live in the vector DB.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Any]] = None):
+        self._session_factory = session_factory or open_session
+
+    @staticmethod
+    def _apply(row: LibrarianJob, job: ArchivalJob) -> None:
+        row.tenant_id = job.tenant_id
+        row.member_id = job.member_id
+        row.session_id = job.session_id
+        row.chat_session_id = job.chat_session_id
+        row.status = job.status.value
+        row.retry_count = job.retry_count
+        row.last_error = job.last_error or None
+        row.created_at = _to_datetime(job.created_at)
+        row.started_at = _to_datetime(job.started_at)
+        row.completed_at = _to_datetime(job.completed_at)
+
+    @staticmethod
+    def _to_job(row: LibrarianJob) -> ArchivalJob:
+        return ArchivalJob(
+            job_id=row.job_id,
+            member_id=row.member_id,
+            tenant_id=row.tenant_id,
+            session_id=row.session_id,
+            chat_session_id=row.chat_session_id,
+            status=JobStatus(row.status),
+            retry_count=row.retry_count or 0,
+            last_error=row.last_error or "",
+            created_at=_to_timestamp(row.created_at) or time.time(),
+            started_at=_to_timestamp(row.started_at),
+            completed_at=_to_timestamp(row.completed_at),
+        )
+
+    def save(self, jobs: list[ArchivalJob]) -> None:
+        if not jobs:
+            return
+        db = self._session_factory()
+        try:
+            existing = {
+                row.job_id: row
+                for row in db.query(LibrarianJob).filter(LibrarianJob.job_id.in_([j.job_id for j in jobs]))
+            }
+            for job in jobs:
+                row = existing.get(job.job_id)
+                if row is None:
+                    row = LibrarianJob(job_id=job.job_id)
+                    db.add(row)
+                self._apply(row, job)
+            db.commit()
+        finally:
+            db.close()
+
+    def get(self, job_id: str) -> Optional[ArchivalJob]:
+        db = self._session_factory()
+        try:
+            row = db.query(LibrarianJob).filter(LibrarianJob.job_id == job_id).first()
+            return self._to_job(row) if row else None
+        finally:
+            db.close()
+
+    def by_status(self, status: JobStatus, limit: Optional[int] = 1000) -> list[ArchivalJob]:
+        db = self._session_factory()
+        try:
+            q = db.query(LibrarianJob).filter(LibrarianJob.status == status.value).order_by(LibrarianJob.created_at.desc())
+            if limit is not None:
+                q = q.limit(limit)
+            return [self._to_job(row) for row in q.all()]
+        finally:
+            db.close()
+
+    def count_by_status(self) -> dict[str, int]:
+        db = self._session_factory()
+        try:
+            rows = db.query(LibrarianJob.status, func.count()).group_by(LibrarianJob.status).all()
+            return {status: int(count) for status, count in rows}
+        finally:
+            db.close()
+
+    def purge(self, finished_before: float) -> int:
+        db = self._session_factory()
+        try:
+            deleted = db.query(LibrarianJob).filter(
+                LibrarianJob.status.in_([s.value for s in _FINAL_STATUSES]),
+                LibrarianJob.completed_at < _to_datetime(finished_before),
+            ).delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+
 # ─── Summarization Strategies ────────────────────────────────────────────────
 
 LIBRARIAN_PROMPT = """Du bist der Bibliothekar von ARIIA. Deine Aufgabe ist es, einen abgeschlossenen Chat-Verlauf 
@@ -210,9 +368,11 @@ class LibrarianWorker:
 
     Features:
     - Exponential backoff retry (2s, 4s, 8s up to 60s)
-    - Job status tracking in Redis
+    - Job status tracking via a pluggable job store
+      (``DatabaseJobStore`` in production, in-memory by default)
     - Fallback summarization on permanent failure
-    - Batch processing of stale sessions
+    - Keyset-paginated processing of stale sessions with bounded
+      concurrent summarization
     - Metrics and logging for observability
     """
 
@@ -223,13 +383,21 @@ class LibrarianWorker:
         max_retries: int = MAX_RETRIES,
         backoff_base: float = BACKOFF_BASE,
         backoff_max: float = BACKOFF_MAX,
+        *,
+        job_store: InMemoryJobStore | DatabaseJobStore | None = None,
+        session_factory: Optional[Callable[[], Any]] = None,
+        concurrency: int = LIBRARIAN_CONCURRENCY,
+        batch_size: int = BATCH_SIZE,
     ):
         self._primary = primary_strategy or LLMSummarization()
         self._fallback = fallback_strategy or FallbackSummarization()
         self._max_retries = max_retries
         self._backoff_base = backoff_base
         self._backoff_max = backoff_max
-        self._jobs: dict[str, ArchivalJob] = {}
+        self._store = job_store or InMemoryJobStore()
+        self._session_factory = session_factory or open_session
+        self._concurrency = max(1, concurrency)
+        self._batch_size = max(1, batch_size)
         self._metrics = {
             "total_processed": 0,
             "successful": 0,
@@ -258,8 +426,15 @@ class LibrarianWorker:
         member_id: str,
         tenant_id: int,
         session_id: Optional[str] = None,
+        *,
+        chat_session_id: Optional[int] = None,
+        persist: bool = True,
     ) -> ArchivalJob:
-        """Create a new archival job."""
+        """Create a new archival job.
+
+        With ``persist=False`` the caller saves the job itself, e.g. a whole
+        page of jobs in one write.
+        """
         import uuid
         job_id = f"lib-{uuid.uuid4().hex[:12]}"
         job = ArchivalJob(
@@ -267,8 +442,10 @@ class LibrarianWorker:
             member_id=member_id,
             tenant_id=tenant_id,
             session_id=session_id,
+            chat_session_id=chat_session_id,
         )
-        self._jobs[job_id] = job
+        if persist:
+            self._store.save([job])
 
         logger.info(
             "librarian.job_created",
@@ -280,18 +457,19 @@ class LibrarianWorker:
 
     def get_job(self, job_id: str) -> Optional[ArchivalJob]:
         """Get a job by ID."""
-        return self._jobs.get(job_id)
+        return self._store.get(job_id)
 
     def get_jobs_by_status(self, status: JobStatus) -> list[ArchivalJob]:
         """Get all jobs with a given status."""
-        return [j for j in self._jobs.values() if j.status == status]
+        return self._store.by_status(status)
 
     def get_metrics(self) -> dict:
         """Get worker metrics."""
+        counts = self._store.count_by_status()
         return {
             **self._metrics,
-            "pending_jobs": len(self.get_jobs_by_status(JobStatus.PENDING)),
-            "running_jobs": len(self.get_jobs_by_status(JobStatus.RUNNING)),
+            "pending_jobs": counts.get(JobStatus.PENDING.value, 0),
+            "running_jobs": counts.get(JobStatus.RUNNING.value, 0),
         }
 
     # ─── Core Processing ──────────────────────────────────────────────
@@ -400,6 +578,12 @@ class LibrarianWorker:
             )
             return job
 
+    @staticmethod
+    def _episodic_fact(job: ArchivalJob) -> str:
+        date_str = datetime.now().strftime("%Y-%m-%d")
+        prefix = "[EPISODE" if job.status == JobStatus.COMPLETED else "[FALLBACK-EPISODE"
+        return f"{prefix} {date_str}]: {job.summary}"
+
     async def store_summary(
         self,
         job: ArchivalJob,
@@ -418,11 +602,7 @@ class LibrarianWorker:
         try:
             from app.memory.member_memory_analyzer import _index_member_memory
 
-            date_str = datetime.now().strftime("%Y-%m-%d")
-            prefix = "[EPISODE" if job.status == JobStatus.COMPLETED else "[FALLBACK-EPISODE"
-            episodic_fact = f"{prefix} {date_str}]: {job.summary}"
-
-            await _index_member_memory(job.member_id, job.tenant_id, episodic_fact)
+            await _index_member_memory(job.member_id, job.tenant_id, self._episodic_fact(job))
 
             logger.info(
                 "librarian.summary_stored",
@@ -442,62 +622,177 @@ class LibrarianWorker:
 
     # ─── Batch Processing ─────────────────────────────────────────────
 
+    def _scan_page(
+        self,
+        cutoff: datetime,
+        before_id: Optional[int] = None,
+    ) -> tuple[list[dict], list[int], Optional[int]]:
+        """Load one page of stale sessions, newest id first, below *before_id*.
+
+        Messages for the whole page are loaded with a single query. Returns
+        the session infos with messages, the ids of stale sessions without
+        any messages, and the cursor for the next page (``None`` when the
+        backlog is exhausted).
+        """
+        db = self._session_factory()
+        try:
+            q = db.query(ChatSession).filter(
+                ChatSession.last_message_at < cutoff,
+                ChatSession.is_active == True,
+            )
+            if before_id is not None:
+                q = q.filter(ChatSession.id < before_id)
+            sessions = q.order_by(ChatSession.id.desc()).limit(self._batch_size).all()
+            if not sessions:
+                return [], [], None
+
+            identifiers = {sess.id: self._session_message_identifiers(sess) for sess in sessions}
+            wanted = sorted({ident for idents in identifiers.values() for ident in idents})
+            by_key: dict[tuple, list[dict]] = {}
+            if wanted:
+                rows = db.query(
+                    ChatMessage.tenant_id, ChatMessage.session_id, ChatMessage.role, ChatMessage.content,
+                ).filter(
+                    ChatMessage.session_id.in_(wanted),
+                ).order_by(ChatMessage.timestamp.asc(), ChatMessage.id.asc()).all()
+                for row in rows:
+                    by_key.setdefault((row.tenant_id, row.session_id), []).append(
+                        {"role": row.role, "content": row.content}
+                    )
+
+            results: list[dict] = []
+            empty: list[int] = []
+            for sess in sessions:
+                msgs = [m for ident in identifiers[sess.id] for m in by_key.get((sess.tenant_id, ident), [])]
+                if not msgs:
+                    empty.append(sess.id)
+                    continue
+                results.append({
+                    "chat_session_id": sess.id,
+                    "session_id": sess.user_id,
+                    "member_id": sess.member_id or sess.user_id,
+                    "tenant_id": sess.tenant_id,
+                    "messages": msgs,
+                    "message_count": len(msgs),
+                })
+            return results, empty, sessions[-1].id
+        finally:
+            db.close()
+
     async def scan_stale_sessions(
         self,
         age_hours: int = SESSION_AGE_HOURS,
+        before_id: Optional[int] = None,
     ) -> list[dict]:
-        """Scan for sessions that need archival.
+        """Scan one page of sessions that need archival.
 
         Returns a list of session info dicts for sessions older than age_hours
-        that haven't been archived yet.
+        that haven't been archived yet. ``run_archival_cycle`` pages through
+        the whole backlog.
         """
         try:
-            db = open_session()
-            try:
-                cutoff = datetime.now(timezone.utc) - timedelta(hours=age_hours)
-                sessions = db.query(ChatSession).filter(
-                    ChatSession.last_message_at < cutoff,
-                    ChatSession.is_active == True,
-                ).order_by(
-                    ChatSession.id.desc(),
-                    ChatSession.last_message_at.desc(),
-                ).limit(BATCH_SIZE).all()
-
-                results = []
-                for sess in sessions:
-                    session_identifiers = self._session_message_identifiers(sess)
-                    msgs = db.query(ChatMessage).filter(
-                        ChatMessage.tenant_id == sess.tenant_id,
-                        ChatMessage.session_id.in_(session_identifiers),
-                    ).order_by(ChatMessage.timestamp.asc()).all()
-
-                    if msgs:
-                        results.append({
-                            "chat_session_id": sess.id,
-                            "session_id": sess.user_id,
-                            "member_id": sess.member_id or sess.user_id,
-                            "tenant_id": sess.tenant_id,
-                            "messages": [
-                                {"role": m.role, "content": m.content}
-                                for m in msgs
-                            ],
-                            "message_count": len(msgs),
-                        })
-
-                return results
+            cutoff = datetime.now(timezone.utc) - timedelta(hours=age_hours)
+            results, _, _ = await asyncio.to_thread(self._scan_page, cutoff, before_id)
+            return results
+        except Exception as e:
+            logger.error("librarian.scan_failed", error=str(e))
+            return []
+
+    def _store_summaries(self, jobs: list[ArchivalJob]) -> None:
+        """Index the episodes of one page, one vector DB upsert per tenant."""
+        if not jobs:
+            return
+        from app.memory.member_memory_analyzer import _index_member_memories
 
+        tenant_ids = {job.tenant_id for job in jobs if job.tenant_id is not None}
+        slugs: dict[Optional[int], str] = {}
+        if tenant_ids:
+            db = self._session_factory()
+            try:
+                for tenant_id, slug in db.query(Tenant.id, Tenant.slug).filter(Tenant.id.in_(tenant_ids)):
+                    slugs[tenant_id] = (slug or "system").strip().lower()
             finally:
                 db.close()
 
-        except Exception as e:
-            logger.error("librarian.scan_failed", error=str(e))
-            return []
+        by_tenant: dict[Optional[int], dict[str, str]] = {}
+        for job in jobs:
+            # Later episodes of the same member replace earlier ones, as sequential upserts would.
+            by_tenant.setdefault(job.tenant_id, {})[job.member_id] = self._episodic_fact(job)
+        for tenant_id, facts in by_tenant.items():
+            _index_member_memories(slugs.get(tenant_id, "system"), facts)
+
+    def _mark_archived(self, chat_session_ids: list[int]) -> None:
+        if not chat_session_ids:
+            return
+        db = self._session_factory()
+        try:
+            for start in range(0, len(chat_session_ids), 500):
+                chunk = chat_session_ids[start:start + 500]
+                db.query(ChatSession).filter(ChatSession.id.in_(chunk)).update(
+                    {ChatSession.is_active: False}, synchronize_session=False,
+                )
+            db.commit()
+        finally:
+            db.close()
 
-    async def run_archival_cycle(self) -> dict:
+    async def _archive_page(
+        self,
+        sessions: list[dict],
+        empty_session_ids: list[int],
+        semaphore: asyncio.Semaphore,
+        results: dict,
+    ) -> None:
+        jobs = [
+            self.create_job(
+                member_id=info["member_id"],
+                tenant_id=info["tenant_id"],
+                session_id=info["session_id"],
+                chat_session_id=info["chat_session_id"],
+                persist=False,
+            )
+            for info in sessions
+        ]
+        await asyncio.to_thread(self._store.save, jobs)
+
+        async def summarize(job: ArchivalJob, messages: list[dict]) -> ArchivalJob:
+            async with semaphore:
+                return await self.process_job(job, messages)
+
+        outcomes = await asyncio.gather(
+            *(summarize(job, info["messages"]) for job, info in zip(jobs, sessions)),
+            return_exceptions=True,
+        )
+        for job, outcome in zip(jobs, outcomes):
+            if isinstance(outcome, BaseException):
+                job.status = JobStatus.FAILED
+                job.last_error = str(outcome)
+                job.completed_at = time.time()
+
+        archived = [job for job in jobs if job.status in (JobStatus.COMPLETED, JobStatus.FALLBACK)]
+        await asyncio.to_thread(self._store_summaries, archived)
+        # Sessions without messages have nothing to summarize but still leave the backlog.
+        await asyncio.to_thread(self._mark_archived, [job.chat_session_id for job in archived] + empty_session_ids)
+        await asyncio.to_thread(self._store.save, jobs)
+
+        for job in jobs:
+            if job.status == JobStatus.COMPLETED:
+                results["completed"] += 1
+            elif job.status == JobStatus.FALLBACK:
+                results["fallback"] += 1
+            else:
+                results["failed"] += 1
+
+    async def run_archival_cycle(
+        self,
+        age_hours: int = SESSION_AGE_HOURS,
+        max_pages: Optional[int] = None,
+    ) -> dict:
         """Run a complete archival cycle.
 
-        Scans for stale sessions, creates jobs, processes them,
-        and stores the results.
+        Pages through all stale sessions (keyset on the session id, so
+        failed sessions are not rescanned within the cycle), summarizes each
+        page concurrently and archives it in bulk. The next page is loaded
+        while the current one is being summarized.
 
         Returns:
             Summary of the cycle results.
@@ -508,51 +803,28 @@ class LibrarianWorker:
             "completed": 0,
             "fallback": 0,
             "failed": 0,
+            "empty_archived": 0,
+            "pages": 0,
         }
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=age_hours)
+        semaphore = asyncio.Semaphore(self._concurrency)
+        next_page: Optional[asyncio.Task] = None
 
         try:
-            stale_sessions = await self.scan_stale_sessions()
-            results["sessions_found"] = len(stale_sessions)
-
-            for session_info in stale_sessions:
-                job = self.create_job(
-                    member_id=session_info["member_id"],
-                    tenant_id=session_info["tenant_id"],
-                    session_id=session_info["session_id"],
-                )
-
-                job = await self.process_job(job, session_info["messages"])
-
-                if job.status in (JobStatus.COMPLETED, JobStatus.FALLBACK):
-                    await self.store_summary(job)
-
-                    # Mark session as archived
-                    try:
-                        db = open_session()
-                        try:
-                            chat_session_id = session_info.get("chat_session_id")
-                            if chat_session_id is not None:
-                                sess = db.query(ChatSession).filter(
-                                    ChatSession.id == chat_session_id,
-                                ).first()
-                            else:
-                                sess = db.query(ChatSession).filter(
-                                    ChatSession.user_id == session_info["session_id"],
-                                ).first()
-                            if sess:
-                                sess.is_active = False
-                                db.commit()
-                        finally:
-                            db.close()
-                    except Exception:
-                        pass
-
-                if job.status == JobStatus.COMPLETED:
-                    results["completed"] += 1
-                elif job.status == JobStatus.FALLBACK:
-                    results["fallback"] += 1
-                else:
-                    results["failed"] += 1
+            await asyncio.to_thread(self._store.purge, time.time() - JOB_TTL_HOURS * 3600)
+            next_page = asyncio.create_task(asyncio.to_thread(self._scan_page, cutoff, None))
+            while next_page is not None:
+                sessions, empty_ids, cursor = await next_page
+                next_page = None
+                if cursor is None:
+                    break
+                results["pages"] += 1
+                if max_pages is None or results["pages"] < max_pages:
+                    next_page = asyncio.create_task(asyncio.to_thread(self._scan_page, cutoff, cursor))
+
+                results["sessions_found"] += len(sessions)
+                results["empty_archived"] += len(empty_ids)
+                await self._archive_page(sessions, empty_ids, semaphore, results)
 
             results["duration_s"] = round(time.time() - cycle_start, 2)
 
@@ -564,6 +836,9 @@ class LibrarianWorker:
         except Exception as e:
             logger.error("librarian.cycle_failed", error=str(e))
             results["error"] = str(e)
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
 
         return results
 
@@ -596,3 +871,4 @@ class LibrarianWorker:
 
         if job.status in (JobStatus.COMPLETED, JobStatus.FALLBACK):
             await self.store_summary(job)
+        self._store.save([job])
@@ -1,14 +1,21 @@
 import asyncio
+import contextlib
+import hashlib
 import json
 import os
 import re
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Final
 
 import structlog
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
 from app.domains.identity.models import Tenant
-from app.domains.support.models import ChatMessage, ChatSession, StudioMember
+from app.domains.support.models import ChatMessage, ChatSession, MemberMemoryWatermark, StudioMember
 from app.shared.db import open_session
 from app.swarm.llm import LLMClient
 from config.settings import get_settings
@@ -24,33 +31,42 @@ LEGACY_MEMORY_DIR = os.path.join(BASE_DIR, "data", "knowledge", "members")
 TENANT_MEMORY_ROOT = os.path.join(BASE_DIR, "data", "knowledge", "tenants")
 GLOBAL_INSTRUCTIONS_PATH = os.path.join(BASE_DIR, "data", "knowledge", "member-memory-instructions.md")
 
+# Members analysed (LLM call + file write) at the same time within one run.
+MEMBER_MEMORY_CONCURRENCY = int(os.getenv("MEMBER_MEMORY_CONCURRENCY", "4"))
+MEMBER_MEMORY_MAX_MESSAGES = 80
+# Upper bound for ids in a single IN (...) clause.
+_IN_BATCH = 500
+
 def member_collection_name_for_slug(tenant_slug: str) -> str:
     """Return the ChromaDB collection name for member memory."""
     safe = re.sub(r"[^a-z0-9_-]", "_", (tenant_slug or "system").lower())
     return f"ariia_member_memory_{safe}"
 
-async def _index_member_memory(member_id: str, tenant_id: int | None, profile_summary: str):
-    """Upsert the member's analytical summary into the vector DB."""
+def _index_member_memories(tenant_slug: str, profiles: dict[str, str]) -> None:
+    """Upsert analytical summaries into the tenant's vector DB collection in one call."""
+    if not profiles:
+        return
     try:
-        db = open_session()
-        try:
-            t = db.query(Tenant).filter(Tenant.id == tenant_id).first()
-            slug = t.slug if t else "system"
-        finally:
-            db.close()
-        
-        collection_name = member_collection_name_for_slug(slug)
-        store = KnowledgeStore(collection_name=collection_name)
-        
+        store = KnowledgeStore(collection_name=member_collection_name_for_slug(tenant_slug))
+        updated_at = datetime.now(timezone.utc).isoformat()
         # We index the summary as a single document per member
-        doc_id = f"member_{member_id}"
         store.upsert_documents(
-            documents=[profile_summary],
-            metadatas=[{"member_id": member_id, "type": "memory", "updated_at": datetime.now(timezone.utc).isoformat()}],
-            ids=[doc_id]
+            documents=list(profiles.values()),
+            metadatas=[{"member_id": member_id, "type": "memory", "updated_at": updated_at} for member_id in profiles],
+            ids=[f"member_{member_id}" for member_id in profiles],
         )
+    except Exception as e:
+        logger.error("member_memory.indexing_failed", tenant_slug=tenant_slug, count=len(profiles), error=str(e))
+
+
+async def _index_member_memory(member_id: str, tenant_id: int | None, profile_summary: str):
+    """Upsert the member's analytical summary into the vector DB."""
+    try:
+        slug = await asyncio.to_thread(_tenant_slug, tenant_id)
     except Exception as e:
         logger.error("member_memory.indexing_failed", member_id=member_id, error=str(e))
+        return
+    await asyncio.to_thread(_index_member_memories, slug, {member_id: profile_summary})
 
 DEFAULT_INSTRUCTIONS: Final[str] = """# Member Memory Extraction Instructions (Gold Standard)
 
@@ -85,20 +101,25 @@ def _cron_due_utc(expr: str, now: datetime) -> bool:
         return False
 
 
-def _tenant_slug(tenant_id: int | None) -> str:
+def _tenant_slug(tenant_id: int | None, db=None) -> str:
     if tenant_id is None:
         return "system"
-    db = open_session()
+    own = db is None
+    db = db or open_session()
     try:
         row = db.query(Tenant).filter(Tenant.id == tenant_id).first()
         return (row.slug if row and row.slug else "system").strip().lower()
     finally:
-        db.close()
+        if own:
+            db.close()
 
 
-def _member_memory_dir_for_tenant(tenant_id: int | None) -> str:
-    slug = _tenant_slug(tenant_id)
-    safe = "".join(ch if (ch.isalnum() or ch in {"-", "_"}) else "-" for ch in slug).strip("-_") or "system"
+def _safe_slug(slug: str) -> str:
+    return "".join(ch if (ch.isalnum() or ch in {"-", "_"}) else "-" for ch in slug).strip("-_") or "system"
+
+
+def _member_memory_dir_for_slug(slug: str) -> str:
+    safe = _safe_slug(slug)
     if safe == "system":
         os.makedirs(LEGACY_MEMORY_DIR, exist_ok=True)
         return LEGACY_MEMORY_DIR
@@ -111,37 +132,41 @@ def _member_memory_dir_for_tenant(tenant_id: int | None) -> str:
     return path
 
 
-def _write_text_safe(path: str, content: str) -> None:
+def _member_memory_dir_for_tenant(tenant_id: int | None) -> str:
+    return _member_memory_dir_for_slug(_tenant_slug(tenant_id))
+
+
+def _replace_text(path: str, content: str) -> None:
+    # Write next to the target and rename, so readers never see a half-written file.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".member-", suffix=".tmp")
     try:
-        with open(path, "w", encoding="utf-8") as f:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
             f.write(content)
-        return
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_text_safe(path: str, content: str) -> None:
+    try:
+        _replace_text(path, content)
     except PermissionError:
-        # If file ownership is stale, replacing the inode can still work when dir is writable.
-        try:
-            if os.path.exists(path):
-                os.remove(path)
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(content)
-            return
-        except Exception:
-            fallback_dir = os.path.join(BASE_DIR, "data", "knowledge", "members-fallback")
-            os.makedirs(fallback_dir, exist_ok=True)
-            fallback_path = os.path.join(fallback_dir, os.path.basename(path))
-            with open(fallback_path, "w", encoding="utf-8") as f:
-                f.write(content)
+        fallback_dir = os.path.join(BASE_DIR, "data", "knowledge", "members-fallback")
+        os.makedirs(fallback_dir, exist_ok=True)
+        _replace_text(os.path.join(fallback_dir, os.path.basename(path)), content)
 
 
-def _instructions_path_for_tenant(tenant_id: int | None) -> str:
-    slug = _tenant_slug(tenant_id)
-    safe = "".join(ch if (ch.isalnum() or ch in {"-", "_"}) else "-" for ch in slug).strip("-_") or "system"
+def _instructions_path_for_slug(slug: str) -> str:
+    safe = _safe_slug(slug)
     if safe == "system":
         return GLOBAL_INSTRUCTIONS_PATH
     return os.path.join(TENANT_MEMORY_ROOT, safe, "prompts", "member-memory-instructions.md")
 
 
-def _load_instructions(tenant_id: int | None) -> str:
-    tenant_path = _instructions_path_for_tenant(tenant_id)
+def _load_instructions(slug: str) -> str:
+    tenant_path = _instructions_path_for_slug(slug)
     if os.path.exists(tenant_path):
         with open(tenant_path, "r", encoding="utf-8") as f:
             return f.read()
@@ -157,36 +182,85 @@ def _load_instructions(tenant_id: int | None) -> str:
     return DEFAULT_INSTRUCTIONS
 
 
-def _chat_summary_for_member(member_id: str, tenant_id: int | None, max_messages: int = 80) -> str:
-    db = open_session()
-    try:
-        q = db.query(ChatSession).filter(ChatSession.member_id == member_id)
-        if tenant_id is not None:
-            q = q.filter(ChatSession.tenant_id == tenant_id)
-        session = q.order_by(ChatSession.last_message_at.desc()).first()
-        if not session:
-            return ""
+def _batches(values: list, size: int = _IN_BATCH):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
 
-        candidate_session_ids = [session.user_id]
-        session_pk = getattr(session, "id", None)
-        if session_pk is not None:
-            candidate_session_ids.append(str(session_pk))
 
-        session_ids = [sid for sid in dict.fromkeys(candidate_session_ids) if sid]
-        qmsg = db.query(ChatMessage).filter(ChatMessage.session_id.in_(session_ids))
+def _latest_session_ids(db, tenant_id: int | None, member_ids: list[str] | None) -> dict[str, list[str]]:
+    """Map member id -> message session ids of the member's most recent chat session."""
+    def rows_for(chunk):
+        q = db.query(ChatSession.member_id, ChatSession.user_id, ChatSession.id).filter(ChatSession.member_id.isnot(None))
         if tenant_id is not None:
-            qmsg = qmsg.filter(ChatMessage.tenant_id == tenant_id)
-        rows = qmsg.order_by(ChatMessage.timestamp.desc()).limit(max_messages).all()
-        rows.reverse()
-        snippets = []
-        for row in rows:
-            role = row.role or "unknown"
-            content = (row.content or "").strip().replace("\n", " ")
-            if content:
-                snippets.append(f"- {role}: {content[:240]}")
-        return "\n".join(snippets)
-    finally:
-        db.close()
+            q = q.filter(ChatSession.tenant_id == tenant_id)
+        if chunk is not None:
+            q = q.filter(ChatSession.member_id.in_(chunk))
+        return q.order_by(ChatSession.last_message_at.desc()).all()
+
+    rows = rows_for(None) if member_ids is None else [r for chunk in _batches(member_ids) for r in rows_for(chunk)]
+    latest = {}
+    for row in rows:
+        # rows arrive newest-first per member; keep the first one seen
+        latest.setdefault(str(row.member_id), row)
+    return {
+        member_id: [sid for sid in dict.fromkeys([row.user_id, str(row.id) if row.id is not None else None]) if sid]
+        for member_id, row in latest.items()
+    }
+
+
+def _last_message_ids(db, tenant_id: int | None, session_ids: list[str]) -> dict[str, int]:
+    result: dict[str, int] = {}
+    for chunk in _batches(session_ids):
+        stmt = select(ChatMessage.session_id, func.max(ChatMessage.id)).where(ChatMessage.session_id.in_(chunk))
+        if tenant_id is not None:
+            stmt = stmt.where(ChatMessage.tenant_id == tenant_id)
+        for session_id, last_id in db.execute(stmt.group_by(ChatMessage.session_id)):
+            result[session_id] = int(last_id or 0)
+    return result
+
+
+def _recent_messages(db, tenant_id: int | None, session_ids: list[str], limit: int) -> dict[str, list]:
+    """Newest *limit* messages per session id, loaded with one windowed query per batch."""
+    result: dict[str, list] = {}
+    rank = func.row_number().over(
+        partition_by=ChatMessage.session_id,
+        order_by=(ChatMessage.timestamp.desc(), ChatMessage.id.desc()),
+    ).label("rank")
+    for chunk in _batches(session_ids):
+        inner = select(
+            ChatMessage.id, ChatMessage.session_id, ChatMessage.role, ChatMessage.content, ChatMessage.timestamp, rank,
+        ).where(ChatMessage.session_id.in_(chunk))
+        if tenant_id is not None:
+            inner = inner.where(ChatMessage.tenant_id == tenant_id)
+        ranked = inner.subquery()
+        for row in db.execute(select(ranked).where(ranked.c.rank <= limit)):
+            result.setdefault(row.session_id, []).append(row)
+    return result
+
+
+def _chat_summary(rows: list, max_messages: int) -> str:
+    rows = sorted(rows, key=lambda r: (r.timestamp is not None, r.timestamp if r.timestamp is not None else 0, r.id))
+    snippets = []
+    for row in rows[-max_messages:]:
+        role = row.role or "unknown"
+        content = (row.content or "").strip().replace("\n", " ")
+        if content:
+            snippets.append(f"- {role}: {content[:240]}")
+    return "\n".join(snippets)
+
+
+def _studio_members(db, tenant_id: int | None, member_ids: list[str]) -> dict[str, StudioMember]:
+    """Resolve member ids (member number or Magicline customer id) to StudioMember rows."""
+    by_number: dict[str, StudioMember] = {}
+    by_customer: dict[str, StudioMember] = {}
+    for chunk in _batches(member_ids):
+        for row in db.query(StudioMember).filter(StudioMember.tenant_id == tenant_id, StudioMember.member_number.in_(chunk)):
+            by_number.setdefault(str(row.member_number), row)
+    customer_ids = [int(m) for m in member_ids if m.isdigit()]
+    for chunk in _batches(customer_ids):
+        for row in db.query(StudioMember).filter(StudioMember.tenant_id == tenant_id, StudioMember.customer_id.in_(chunk)):
+            by_customer.setdefault(str(row.customer_id), row)
+    return {m: row for m in member_ids if (row := by_number.get(m) or by_customer.get(m)) is not None}
 
 
 def _heuristic_profile_summary(chat_summary: str, max_points: int = 8) -> str:
@@ -248,6 +322,18 @@ def _format_llm_profile(data: dict) -> str:
     return "\n".join(lines) if lines else "- Keine belastbaren Signale aus Chatverlauf."
 
 
+def _llm_model(tenant_id: int | None) -> str | None:
+    """Model for LLM extraction, or ``None`` when it is disabled for the tenant."""
+    if not settings.openai_api_key:
+        return None
+    llm_enabled = (
+        persistence.get_setting("member_memory_llm_enabled", "true", tenant_id=tenant_id) or "true"
+    ).lower() == "true"
+    if not llm_enabled:
+        return None
+    return persistence.get_setting("member_memory_llm_model", "gpt-4o-mini", tenant_id=tenant_id) or "gpt-4o-mini"
+
+
 async def _extract_profile_with_llm_async(
     *,
     member_id: str,
@@ -255,15 +341,10 @@ async def _extract_profile_with_llm_async(
     instructions: str,
     magic_summary: str,
     chat_summary: str,
+    model: str | None,
 ) -> str | None:
-    if not settings.openai_api_key:
-        return None
-    llm_enabled = (
-        persistence.get_setting("member_memory_llm_enabled", "true", tenant_id=tenant_id) or "true"
-    ).lower() == "true"
-    if not llm_enabled:
+    if not model:
         return None
-    model = persistence.get_setting("member_memory_llm_model", "gpt-4o-mini", tenant_id=tenant_id) or "gpt-4o-mini"
 
     llm = LLMClient(openai_api_key=settings.openai_api_key)
     system = (
@@ -296,73 +377,35 @@ async def _extract_profile_with_llm_async(
     return _format_llm_profile(payload)
 
 
-def _magicline_summary(member_id: str, tenant_id: int | None) -> str:
-    db = open_session()
-    try:
-        m_id = str(member_id).strip()
-        q = db.query(StudioMember).filter(StudioMember.tenant_id == tenant_id)
-        
-        if m_id.isdigit():
-            cid = int(m_id)
-            q = q.filter((StudioMember.member_number == m_id) | (StudioMember.customer_id == cid))
-        else:
-            q = q.filter(StudioMember.member_number == m_id)
-            
-        row = q.first()
-        if not row:
-            return ""
-        
-        info_lines = [
-            f"- Name: {row.first_name} {row.last_name}",
-            f"- E-Mail: {row.email or '-'}",
-            f"- Telefon: {row.phone_number or '-'}",
-            f"- Sprache: {row.preferred_language or '-'}",
-            f"- Pausiert: {'ja' if row.is_paused else 'nein'}",
-        ]
-        
-        if row.additional_info:
-            try:
-                extra = json.loads(row.additional_info)
-                for k, v in extra.items():
-                    info_lines.append(f"- {k}: {v}")
-            except Exception:
-                pass
-                
-        return "\n".join(info_lines)
-    except Exception:
+def _magicline_summary(row: StudioMember | None) -> str:
+    if row is None:
         return ""
-    finally:
-        db.close()
+    info_lines = [
+        f"- Name: {row.first_name} {row.last_name}",
+        f"- E-Mail: {row.email or '-'}",
+        f"- Telefon: {row.phone_number or '-'}",
+        f"- Sprache: {row.preferred_language or '-'}",
+        f"- Pausiert: {'ja' if row.is_paused else 'nein'}",
+    ]
+
+    if row.additional_info:
+        try:
+            extra = json.loads(row.additional_info)
+            for k, v in extra.items():
+                info_lines.append(f"- {k}: {v}")
+        except Exception:
+            pass
 
+    return "\n".join(info_lines)
 
-def analyze_member(member_id: str, tenant_id: int | None) -> None:
-    memory_dir = _member_memory_dir_for_tenant(tenant_id)
-    chat = _chat_summary_for_member(member_id, tenant_id)
-    magic = _magicline_summary(member_id, tenant_id)
-    instructions = _load_instructions(tenant_id)
-    profile_summary = None
-    try:
-        profile_summary = asyncio.run(
-            _extract_profile_with_llm_async(
-                member_id=member_id,
-                tenant_id=tenant_id,
-                instructions=instructions,
-                magic_summary=magic,
-                chat_summary=chat,
-            )
-        )
-        if profile_summary:
-            # GOLD STANDARD: Index into Vector DB
-            asyncio.run(_index_member_memory(member_id, tenant_id, profile_summary))
-            
-    except Exception as exc:
-        logger.warning("member_memory.llm_extract_failed", member_id=member_id, tenant_id=tenant_id, error=str(exc))
-    
-    if not profile_summary:
-        profile_summary = _heuristic_profile_summary(chat)
-    
+
+def _input_hash(instructions: str, magic_summary: str) -> str:
+    return hashlib.sha256(f"{instructions}\0{magic_summary}".encode("utf-8")).hexdigest()
+
+
+def _render_memory(member_id: str, profile_summary: str, magic: str, chat: str) -> str:
     now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
-    
+
     # Gold Standard Markdown Structure
     content = [
         f"# Member Memory: {member_id}",
@@ -381,30 +424,235 @@ def analyze_member(member_id: str, tenant_id: int | None) -> None:
         "## Relevante Chat-Informationen",
         chat or "- keine Chat-Historie -",
     ]
-    
-    _write_text_safe(os.path.join(memory_dir, f"{member_id}.md"), "\n".join(content))
+    return "\n".join(content)
 
 
-def analyze_all_members(tenant_id: int | None = None) -> dict[str, int]:
-    db = open_session()
+@dataclass
+class _MemberInput:
+    member_id: str
+    last_message_id: int
+    input_hash: str
+    magic: str
+    session_ids: list[str]
+    chat: str = ""
+
+
+@dataclass
+class _TenantPlan:
+    tenant_id: int | None
+    slug: str
+    memory_dir: str
+    instructions: str
+    model: str | None
+    due: list[_MemberInput] = field(default_factory=list)
+    skipped: int = 0
+
+
+def _plan_tenant(
+    session_factory: Callable[[], Session],
+    tenant_id: int | None,
+    member_ids: list[str] | None,
+    force: bool,
+) -> _TenantPlan:
+    """Batch-load the tenant's members and pick those whose inputs moved past their watermark."""
+    db = session_factory()
     try:
-        query = db.query(ChatSession.tenant_id, ChatSession.member_id).filter(ChatSession.member_id.isnot(None))
-        if tenant_id is not None:
-            query = query.filter(ChatSession.tenant_id == tenant_id)
-        pairs = [(row.tenant_id, row.member_id) for row in query.distinct().all() if row.member_id]
+        slug = _tenant_slug(tenant_id, db)
+        memory_dir = _member_memory_dir_for_slug(slug)
+        instructions = _load_instructions(slug)
+        plan = _TenantPlan(tenant_id, slug, memory_dir, instructions, _llm_model(tenant_id))
+
+        sessions = _latest_session_ids(db, tenant_id, member_ids)
+        members = list(dict.fromkeys([*(member_ids or []), *sessions]))
+        last_ids = _last_message_ids(db, tenant_id, [sid for ids in sessions.values() for sid in ids])
+        studio = _studio_members(db, tenant_id, members)
+        watermarks = {
+            wm.member_id: wm
+            for chunk in _batches(members)
+            for wm in db.query(MemberMemoryWatermark).filter(
+                MemberMemoryWatermark.tenant_id == tenant_id, MemberMemoryWatermark.member_id.in_(chunk)
+            )
+        }
+
+        for member_id in members:
+            session_ids = sessions.get(member_id, [])
+            magic = _magicline_summary(studio.get(member_id))
+            item = _MemberInput(
+                member_id=member_id,
+                last_message_id=max((last_ids.get(sid, 0) for sid in session_ids), default=0),
+                input_hash=_input_hash(instructions, magic),
+                magic=magic,
+                session_ids=session_ids,
+            )
+            wm = watermarks.get(member_id)
+            unchanged = (
+                wm is not None
+                and wm.last_message_id == item.last_message_id
+                and wm.input_hash == item.input_hash
+                and os.path.exists(os.path.join(memory_dir, f"{member_id}.md"))
+            )
+            if unchanged and not force:
+                plan.skipped += 1
+            else:
+                plan.due.append(item)
+
+        messages = _recent_messages(
+            db, tenant_id, [sid for item in plan.due for sid in item.session_ids], MEMBER_MEMORY_MAX_MESSAGES,
+        )
+        for item in plan.due:
+            item.chat = _chat_summary(
+                [row for sid in item.session_ids for row in messages.get(sid, [])], MEMBER_MEMORY_MAX_MESSAGES,
+            )
+        return plan
     finally:
         db.close()
 
-    ok = 0
-    err = 0
-    for tenant_id, member_id in pairs:
+
+def _save_watermarks(session_factory: Callable[[], Session], tenant_id: int | None, done: list[_MemberInput]) -> None:
+    if not done:
+        return
+    db = session_factory()
+    try:
+        by_member = {item.member_id: item for item in done}
+        existing = {
+            wm.member_id: wm
+            for chunk in _batches(list(by_member))
+            for wm in db.query(MemberMemoryWatermark).filter(
+                MemberMemoryWatermark.tenant_id == tenant_id, MemberMemoryWatermark.member_id.in_(chunk)
+            )
+        }
+        now = datetime.now(timezone.utc)
+        for member_id, item in by_member.items():
+            wm = existing.get(member_id)
+            if wm is None:
+                wm = MemberMemoryWatermark(tenant_id=tenant_id, member_id=member_id)
+                db.add(wm)
+            wm.last_message_id = item.last_message_id
+            wm.input_hash = item.input_hash
+            wm.analyzed_at = now
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _analyze_due_member(
+    plan: _TenantPlan, item: _MemberInput, extractor, semaphore: asyncio.Semaphore,
+) -> str | None:
+    """Analyse one member and write its memory file; returns the LLM profile, if any."""
+    async with semaphore:
+        llm_profile = None
         try:
-            analyze_member(str(member_id), tenant_id)
-            ok += 1
+            llm_profile = await extractor(
+                member_id=item.member_id,
+                tenant_id=plan.tenant_id,
+                instructions=plan.instructions,
+                magic_summary=item.magic,
+                chat_summary=item.chat,
+                model=plan.model,
+            )
         except Exception as exc:
+            logger.warning(
+                "member_memory.llm_extract_failed", member_id=item.member_id, tenant_id=plan.tenant_id, error=str(exc),
+            )
+        profile_summary = llm_profile or _heuristic_profile_summary(item.chat)
+        content = _render_memory(item.member_id, profile_summary, item.magic, item.chat)
+        await asyncio.to_thread(_write_text_safe, os.path.join(plan.memory_dir, f"{item.member_id}.md"), content)
+        return llm_profile
+
+
+async def _analyze_tenant(
+    tenant_id: int | None,
+    member_ids: list[str] | None,
+    *,
+    force: bool,
+    session_factory: Callable[[], Session],
+    extractor,
+    semaphore: asyncio.Semaphore,
+) -> dict[str, int]:
+    plan = await asyncio.to_thread(_plan_tenant, session_factory, tenant_id, member_ids, force)
+    outcomes = await asyncio.gather(
+        *(_analyze_due_member(plan, item, extractor, semaphore) for item in plan.due), return_exceptions=True,
+    )
+
+    done: list[_MemberInput] = []
+    profiles: dict[str, str] = {}
+    err = 0
+    for item, outcome in zip(plan.due, outcomes):
+        if isinstance(outcome, BaseException):
+            err += 1
+            logger.error(
+                "member_memory.analyze_member_failed", tenant_id=tenant_id, member_id=item.member_id, error=str(outcome),
+            )
+            continue
+        if outcome is None and plan.model is not None:
+            # Heuristic fallback written, but keep the old watermark so the next run retries the LLM
             err += 1
-            logger.error("member_memory.analyze_member_failed", tenant_id=tenant_id, member_id=member_id, error=str(exc))
-    return {"total": len(pairs), "ok": ok, "err": err}
+            continue
+        done.append(item)
+        if outcome:
+            profiles[item.member_id] = outcome
+
+    # GOLD STANDARD: Index into Vector DB
+    await asyncio.to_thread(_index_member_memories, plan.slug, profiles)
+    await asyncio.to_thread(_save_watermarks, session_factory, tenant_id, done)
+    return {"total": len(plan.due) + plan.skipped, "ok": len(done), "err": err, "skipped": plan.skipped}
+
+
+async def analyze_all_members_async(
+    tenant_id: int | None = None,
+    *,
+    member_ids: list[str] | None = None,
+    force: bool = False,
+    session_factory: Callable[[], Session] | None = None,
+    extractor=None,
+    concurrency: int | None = None,
+) -> dict[str, int]:
+    """Re-analyse members whose chat or Magicline data changed since their watermark.
+
+    Without *member_ids*, every member with a chat session is considered —
+    of *tenant_id*, or of all tenants when it is ``None``. With *member_ids*,
+    exactly those members are considered within *tenant_id* (``None`` means
+    unscoped). *force* ignores the watermarks.
+    """
+    session_factory = session_factory or open_session
+    extractor = extractor or _extract_profile_with_llm_async
+    semaphore = asyncio.Semaphore(max(1, concurrency or MEMBER_MEMORY_CONCURRENCY))
+
+    scopes: list[tuple[int | None, list[str] | None]]
+    if member_ids is not None or tenant_id is not None:
+        scopes = [(tenant_id, [str(m) for m in member_ids] if member_ids is not None else None)]
+    else:
+        db = session_factory()
+        try:
+            rows = db.query(ChatSession.tenant_id, ChatSession.member_id).filter(ChatSession.member_id.isnot(None)).distinct().all()
+        finally:
+            db.close()
+        tenants = sorted({row.tenant_id for row in rows if row.tenant_id is not None})
+        scopes = [(tid, None) for tid in tenants]
+        orphaned = sorted({str(row.member_id) for row in rows if row.tenant_id is None and row.member_id})
+        if orphaned:
+            scopes.append((None, orphaned))
+
+    totals = {"total": 0, "ok": 0, "err": 0, "skipped": 0}
+    for scope_tenant_id, scope_members in scopes:
+        result = await _analyze_tenant(
+            scope_tenant_id, scope_members, force=force,
+            session_factory=session_factory, extractor=extractor, semaphore=semaphore,
+        )
+        for key, value in result.items():
+            totals[key] += value
+    logger.info("member_memory.analyze_all_done", tenant_id=tenant_id, **totals)
+    return totals
+
+
+def analyze_member(member_id: str, tenant_id: int | None) -> None:
+    result = asyncio.run(analyze_all_members_async(tenant_id, member_ids=[member_id], force=True))
+    if result["err"]:
+        raise RuntimeError(f"member memory analysis failed for {member_id}")
+
+
+def analyze_all_members(tenant_id: int | None = None) -> dict[str, int]:
+    return asyncio.run(analyze_all_members_async(tenant_id))
 
 
 async def scheduler_loop() -> None:
@@ -23,6 +23,8 @@ import structlog
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, Body
 from pydantic import BaseModel
 
+from app.core.cpu_executor import ExecutorSaturated
+
 logger = structlog.get_logger()
 
 router = APIRouter(prefix="/memory-platform", tags=["Memory Platform"])
@@ -95,6 +97,14 @@ def _get_auth():
         return mock_auth
 
 
+def _overloaded(exc: ExecutorSaturated) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Document processing is temporarily overloaded, please retry",
+        headers={"Retry-After": str(int(exc.retry_after))},
+    )
+
+
 # ── Knowledge Base Endpoints ─────────────────────────────────────────
 
 @router.post("/knowledge/upload")
@@ -114,12 +124,15 @@ async def upload_knowledge_file(
         tmp_path = tmp.name
 
     try:
-        doc = await service.ingest_file(
-            tenant_id=user.tenant_id,
-            file_path=tmp_path,
-            original_filename=file.filename or "unknown",
-            content_type=file.content_type or "",
-        )
+        try:
+            doc = await service.ingest_file(
+                tenant_id=user.tenant_id,
+                file_path=tmp_path,
+                original_filename=file.filename or "unknown",
+                content_type=file.content_type or "",
+            )
+        except ExecutorSaturated as exc:
+            raise _overloaded(exc) from exc
 
         return {
             "status": doc.status,
@@ -143,11 +156,14 @@ async def ingest_knowledge_text(
     from app.memory_platform.ingestion import get_ingestion_service
 
     service = get_ingestion_service()
-    doc = await service.ingest_text(
-        tenant_id=user.tenant_id,
-        content=body.content,
-        title=body.title,
-    )
+    try:
+        doc = await service.ingest_text(
+            tenant_id=user.tenant_id,
+            content=body.content,
+            title=body.title,
+        )
+    except ExecutorSaturated as exc:
+        raise _overloaded(exc) from exc
 
     return {
         "status": doc.status,
@@ -336,6 +352,8 @@ async def search(
         "query": response.query,
         "total_results": response.total_results,
         "search_time_ms": response.search_time_ms,
+        "source_latency_ms": response.source_latency_ms,
+        "degraded_sources": response.degraded_sources,
         "results": [{
             "content": r.content,
             "score": r.score,
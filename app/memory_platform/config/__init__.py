@@ -20,6 +20,8 @@ class Neo4jConfig:
     password: str = os.getenv("NEO4J_PASSWORD", "ariia_memory")
     database: str = os.getenv("NEO4J_DATABASE", "neo4j")
     max_connection_pool_size: int = int(os.getenv("NEO4J_POOL_SIZE", "50"))
+    # In-memory fallback: optional gzip JSON snapshot loaded on start, saved on close
+    memory_snapshot_path: str = os.getenv("GRAPH_MEMORY_SNAPSHOT_PATH", "")
 
 
 @dataclass
@@ -61,6 +63,45 @@ class KafkaConfig:
     })
 
 
+def _parse_topic_concurrency(raw: str) -> dict[str, int]:
+    """Parse ``"extraction.requested=2,ingestion.raw=4"`` into a mapping."""
+    result: dict[str, int] = {}
+    for item in raw.split(","):
+        topic, sep, value = item.partition("=")
+        if sep and topic.strip():
+            result[topic.strip()] = int(value)
+    return result
+
+
+@dataclass
+class EventBusConfig:
+    """Internal event bus settings (backend, worker pools, retries)."""
+
+    backend: str = os.getenv("MEMORY_EVENT_BUS_BACKEND", "memory")  # "memory" | "redis"
+    redis_url: str = os.getenv("MEMORY_EVENT_BUS_REDIS_URL", "")
+    stream_prefix: str = os.getenv("MEMORY_EVENT_BUS_STREAM_PREFIX", "memory:events:")
+    consumer_group: str = os.getenv("MEMORY_EVENT_BUS_GROUP", "memory-platform")
+    stream_maxlen: int = int(os.getenv("MEMORY_EVENT_BUS_STREAM_MAXLEN", "100000"))
+    # Workers per topic; events with the same ordering key always go to the same worker
+    default_concurrency: int = int(os.getenv("MEMORY_EVENT_BUS_CONCURRENCY", "4"))
+    topic_concurrency: dict[str, int] = field(default_factory=lambda: _parse_topic_concurrency(
+        os.getenv("MEMORY_EVENT_BUS_TOPIC_CONCURRENCY", "")
+    ))
+    # Pending events per topic before publish() blocks
+    queue_size: int = int(os.getenv("MEMORY_EVENT_BUS_QUEUE_SIZE", "1000"))
+    max_retries: int = int(os.getenv("MEMORY_EVENT_BUS_MAX_RETRIES", "3"))
+    retry_backoff_seconds: float = float(os.getenv("MEMORY_EVENT_BUS_RETRY_BACKOFF", "0.5"))
+    log_size: int = int(os.getenv("MEMORY_EVENT_BUS_LOG_SIZE", "10000"))
+    # Unacknowledged stream entries idle this long are reclaimed from dead consumers
+    claim_idle_ms: int = int(os.getenv("MEMORY_EVENT_BUS_CLAIM_IDLE_MS", "60000"))
+    # Topics every process must see (cache invalidation); read without the consumer group
+    broadcast_topics: frozenset[str] = field(default_factory=lambda: frozenset(
+        topic.strip()
+        for topic in os.getenv("MEMORY_EVENT_BUS_BROADCAST_TOPICS", "memory.written").split(",")
+        if topic.strip()
+    ))
+
+
 @dataclass
 class IngestionConfig:
     """Ingestion service settings."""
@@ -94,6 +135,12 @@ class ExtractionConfig:
     model: str = os.getenv("EXTRACTION_MODEL", "gpt-4.1-mini")
     max_tokens: int = int(os.getenv("EXTRACTION_MAX_TOKENS", "4096"))
     temperature: float = float(os.getenv("EXTRACTION_TEMPERATURE", "0.1"))
+    # Small chunks are packed into one prompt up to this many (estimated) input tokens
+    batch_token_budget: int = int(os.getenv("EXTRACTION_BATCH_TOKENS", "3000"))
+    # Concurrent LLM calls per tenant
+    tenant_concurrency: int = int(os.getenv("EXTRACTION_TENANT_CONCURRENCY", "4"))
+    # Content hashes remembered to skip chunks that were already extracted
+    hash_cache_size: int = int(os.getenv("EXTRACTION_HASH_CACHE_SIZE", "100000"))
 
 
 @dataclass
@@ -106,6 +153,10 @@ class RetrievalConfig:
     graph_weight: float = float(os.getenv("RETRIEVAL_GRAPH_WEIGHT", "0.3"))
     keyword_weight: float = float(os.getenv("RETRIEVAL_KEYWORD_WEIGHT", "0.1"))
     enable_reranking: bool = os.getenv("RETRIEVAL_ENABLE_RERANKING", "true").lower() == "true"
+    # Per-source deadlines (ms): a source that misses its deadline contributes no results
+    vector_timeout_ms: int = int(os.getenv("RETRIEVAL_VECTOR_TIMEOUT_MS", "1500"))
+    graph_timeout_ms: int = int(os.getenv("RETRIEVAL_GRAPH_TIMEOUT_MS", "1000"))
+    keyword_timeout_ms: int = int(os.getenv("RETRIEVAL_KEYWORD_TIMEOUT_MS", "1000"))
 
 
 @dataclass
@@ -116,6 +167,7 @@ class MemoryPlatformConfig:
     qdrant: QdrantConfig = field(default_factory=QdrantConfig)
     redis: RedisConfig = field(default_factory=RedisConfig)
     kafka: KafkaConfig = field(default_factory=KafkaConfig)
+    event_bus: EventBusConfig = field(default_factory=EventBusConfig)
     ingestion: IngestionConfig = field(default_factory=IngestionConfig)
     notion: NotionConfig = field(default_factory=NotionConfig)
     extraction: ExtractionConfig = field(default_factory=ExtractionConfig)
@@ -1,10 +1,20 @@
 """Internal async event bus for the Memory Platform.
 
-This module provides a lightweight, in-process event bus that decouples
-services within the memory platform.  When Kafka is available, events are
-also forwarded to Kafka topics for external consumers and durability.
-For single-process deployments (the current ARIIA setup), the internal
-bus is sufficient and avoids the operational overhead of a full Kafka cluster.
+This module provides a lightweight event bus that decouples services
+within the memory platform.  Before ``start()`` events are dispatched
+inline.  Once started, they are handed to a backend
+(``MEMORY_EVENT_BUS_BACKEND``):
+
+- ``memory``: bounded in-process queues, the default for single-process
+  deployments.
+- ``redis``: Redis Streams with a consumer group, which is durable across
+  restarts and shared between processes.  Broadcast topics (by default
+  ``memory.written``) reach every process instead of one.
+
+Each topic has its own worker pool, so a slow handler on one topic does
+not stall the others.  Events with the same ordering key (the tenant by
+default) are delivered in order.  Failing handlers are retried with
+exponential backoff and then dead-lettered.
 
 Usage:
     from app.memory_platform.event_bus import get_event_bus
@@ -17,40 +27,83 @@ Usage:
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
-from typing import Any, Awaitable, Callable
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
 
 import structlog
 
+from app.core.telemetry import get_metrics
+from app.memory_platform.config import EventBusConfig, get_config
+from app.memory_platform.event_bus.backends import (
+    EventBusBackend,
+    InProcessBackend,
+    RedisStreamsBackend,
+    TopicPool,
+    create_backend,
+    ordering_key,
+)
 from app.memory_platform.models import MemoryEvent
 
+__all__ = [
+    "DeadLetter",
+    "EventBusBackend",
+    "EventHandler",
+    "InProcessBackend",
+    "InternalEventBus",
+    "RedisStreamsBackend",
+    "TopicPool",
+    "get_event_bus",
+    "ordering_key",
+]
+
 logger = structlog.get_logger()
 
 # Type alias for event handlers
 EventHandler = Callable[[MemoryEvent], Awaitable[None]]
 
 
+@dataclass
+class DeadLetter:
+    """An event whose handler still failed after all retries."""
+
+    event: MemoryEvent
+    handler: str
+    error: str
+    attempts: int
+    failed_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
 class InternalEventBus:
-    """Lightweight async event bus for intra-process communication.
+    """Async event bus with pluggable delivery backends.
 
-    Supports topic-based pub/sub with async handlers.  Handlers are
-    invoked concurrently via ``asyncio.gather`` for maximum throughput.
-    Failed handlers are logged but do not block other subscribers.
+    Supports topic-based pub/sub with async handlers.  The handlers of one
+    event run concurrently via ``asyncio.gather``.  A failing handler is
+    retried on its own, so subscribers that succeeded are not re-run, and
+    it never blocks other subscribers.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        config: EventBusConfig | None = None,
+        backend: EventBusBackend | None = None,
+    ) -> None:
+        self._config = config or get_config().event_bus
+        self._backend = backend or create_backend(self._config)
         self._subscribers: dict[str, list[EventHandler]] = defaultdict(list)
-        self._event_log: list[MemoryEvent] = []
-        self._max_log_size: int = 10_000
+        self._event_log: deque[MemoryEvent] = deque(maxlen=self._config.log_size)
+        self._dead_letters: deque[DeadLetter] = deque(maxlen=1000)
         self._running: bool = False
-        self._queue: asyncio.Queue[MemoryEvent] = asyncio.Queue()
-        self._processor_task: asyncio.Task[None] | None = None
 
     # ── Subscription ─────────────────────────────────────────────────
 
     def subscribe(self, event_type: str, handler: EventHandler) -> None:
         """Register *handler* for events of *event_type*."""
         self._subscribers[event_type].append(handler)
+        if self._running:
+            self._backend.add_topic(event_type)
         logger.debug(
             "event_bus.subscribed",
             event_type=event_type,
@@ -68,87 +121,93 @@ class InternalEventBus:
     async def publish(self, event: MemoryEvent) -> None:
         """Publish *event* to all registered handlers for its type.
 
-        Events are processed asynchronously.  If the background processor
-        is running, the event is queued; otherwise it is dispatched inline.
+        If the bus is running, the event is handed to the backend; this
+        waits while the topic's queue is full.  Otherwise it is dispatched
+        inline.
         """
-        # Append to rolling log
         self._event_log.append(event)
-        if len(self._event_log) > self._max_log_size:
-            self._event_log = self._event_log[-self._max_log_size:]
+        get_metrics().increment("event_bus_published_total", labels={"topic": event.event_type})
 
-        if self._running:
-            await self._queue.put(event)
+        if not self._running:
+            await self._dispatch(event, max_retries=0)
+        elif not self._backend.durable and not self._subscribers.get(event.event_type):
+            logger.debug("event_bus.no_handlers", event_type=event.event_type)
         else:
-            await self._dispatch(event)
+            await self._backend.publish(event)
+
+    async def _dispatch_queued(self, event: MemoryEvent) -> None:
+        await self._dispatch(event, max_retries=self._config.max_retries)
 
-    async def _dispatch(self, event: MemoryEvent) -> None:
+    async def _dispatch(self, event: MemoryEvent, max_retries: int) -> None:
         """Dispatch *event* to all matching handlers."""
-        handlers = self._subscribers.get(event.event_type, [])
+        handlers = list(self._subscribers.get(event.event_type, []))
         if not handlers:
             logger.debug("event_bus.no_handlers", event_type=event.event_type)
             return
 
-        logger.info(
+        logger.debug(
             "event_bus.dispatching",
             event_type=event.event_type,
             event_id=event.event_id,
             handler_count=len(handlers),
         )
 
-        tasks = []
-        for handler in handlers:
-            tasks.append(self._safe_call(handler, event))
-        await asyncio.gather(*tasks)
-
-    async def _safe_call(self, handler: EventHandler, event: MemoryEvent) -> None:
-        """Call *handler* with *event*, catching and logging exceptions."""
-        try:
-            await handler(event)
-        except Exception as exc:
-            logger.error(
-                "event_bus.handler_error",
-                handler=handler.__qualname__,
-                event_type=event.event_type,
-                event_id=event.event_id,
-                error=str(exc),
-            )
-
-    # ── Background processor ─────────────────────────────────────────
+        await asyncio.gather(*(self._safe_call(handler, event, max_retries) for handler in handlers))
+
+    async def _safe_call(self, handler: EventHandler, event: MemoryEvent, max_retries: int = 0) -> None:
+        """Call *handler* with *event*, retrying and finally dead-lettering failures."""
+        metrics = get_metrics()
+        labels = {"topic": event.event_type}
+        for attempt in range(max_retries + 1):
+            started = time.perf_counter()
+            try:
+                await handler(event)
+                metrics.observe("event_bus_handler_seconds", time.perf_counter() - started, labels=labels)
+                return
+            except Exception as exc:
+                error = str(exc) or type(exc).__name__
+                if attempt < max_retries:
+                    metrics.increment("event_bus_retries_total", labels=labels)
+                    logger.warning(
+                        "event_bus.handler_retry",
+                        handler=handler.__qualname__,
+                        event_type=event.event_type,
+                        event_id=event.event_id,
+                        attempt=attempt + 1,
+                        error=error,
+                    )
+                    await asyncio.sleep(self._config.retry_backoff_seconds * 2 ** attempt)
+                    continue
+                logger.error(
+                    "event_bus.handler_error",
+                    handler=handler.__qualname__,
+                    event_type=event.event_type,
+                    event_id=event.event_id,
+                    error=error,
+                )
+                metrics.increment("event_bus_dead_letter_total", labels=labels)
+                self._dead_letters.append(DeadLetter(event, handler.__qualname__, error, attempt + 1))
+                if self._running:
+                    await self._backend.dead_letter(event, handler.__qualname__, error)
+
+    # ── Background processing ────────────────────────────────────────
 
     async def start(self) -> None:
-        """Start the background event processor."""
+        """Start the backend's per-topic workers (and stream readers)."""
         if self._running:
             return
         self._running = True
-        self._processor_task = asyncio.create_task(self._process_loop())
-        logger.info("event_bus.started")
+        await self._backend.start(self._dispatch_queued, list(self._subscribers))
+        logger.info("event_bus.started", backend=self._backend.name)
 
-    async def stop(self) -> None:
-        """Stop the background event processor and drain the queue."""
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """Stop the workers after draining queued events (up to *drain_timeout*)."""
+        if not self._running:
+            return
         self._running = False
-        if self._processor_task:
-            self._processor_task.cancel()
-            try:
-                await self._processor_task
-            except asyncio.CancelledError:
-                pass
-            self._processor_task = None
+        await self._backend.stop(drain_timeout)
         logger.info("event_bus.stopped")
 
-    async def _process_loop(self) -> None:
-        """Continuously process events from the internal queue."""
-        while self._running:
-            try:
-                event = await asyncio.wait_for(self._queue.get(), timeout=1.0)
-                await self._dispatch(event)
-                self._queue.task_done()
-            except asyncio.TimeoutError:
-                continue
-            except asyncio.CancelledError:
-                break
-            except Exception as exc:
-                logger.error("event_bus.process_error", error=str(exc))
-
     # ── Introspection ────────────────────────────────────────────────
 
     @property
@@ -158,12 +217,17 @@ class InternalEventBus:
 
     @property
     def recent_events(self) -> list[MemoryEvent]:
-        """Return the most recent events (up to max_log_size)."""
+        """Return the most recent events (up to the configured log size)."""
         return list(self._event_log)
 
+    @property
+    def dead_letters(self) -> list[DeadLetter]:
+        """Return the most recent dead-lettered deliveries of this process."""
+        return list(self._dead_letters)
+
     @property
     def queue_size(self) -> int:
-        return self._queue.qsize()
+        return self._backend.qsize()
 
 
 # ── Singleton ────────────────────────────────────────────────────────
@@ -0,0 +1,366 @@
+"""Delivery backends for the internal event bus.
+
+``InProcessBackend`` keeps queued events in memory; they are lost on
+restart. ``RedisStreamsBackend`` appends each event to one Redis stream per
+topic and reads it back through a consumer group. Events then survive a
+restart, several processes share the work, and entries left unacknowledged
+by a crashed consumer are reclaimed. Broadcast topics
+(``MEMORY_EVENT_BUS_BROADCAST_TOPICS``, e.g. cache invalidation) are read by
+every process instead.
+
+Both feed a ``TopicPool``: a fixed number of workers per topic, each with
+its own bounded queue. An event is routed to a worker by its ordering key
+(``metadata["ordering_key"]``, else the tenant id). Events sharing a key are
+therefore handled in publish order, while different tenants run in
+parallel. A full queue blocks the producer; that is the backpressure
+publishers see in in-process mode.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import time
+import zlib
+from typing import Awaitable, Callable, Iterable, Optional
+
+import structlog
+
+from app.memory_platform.config import EventBusConfig, get_config
+from app.memory_platform.models import MemoryEvent
+
+logger = structlog.get_logger()
+
+Dispatch = Callable[[MemoryEvent], Awaitable[None]]
+Ack = Optional[Callable[[], Awaitable[None]]]
+
+
+def ordering_key(event: MemoryEvent) -> str:
+    """Key whose events are delivered strictly in order (default: the tenant)."""
+    return str(event.metadata.get("ordering_key", event.tenant_id))
+
+
+def _event_classes() -> dict[str, type[MemoryEvent]]:
+    classes: dict[str, type[MemoryEvent]] = {}
+    pending = [MemoryEvent]
+    while pending:
+        cls = pending.pop()
+        classes[cls.__name__] = cls
+        pending.extend(cls.__subclasses__())
+    return classes
+
+
+def encode_event(event: MemoryEvent) -> dict[str, str]:
+    """Serialise *event* into stream fields, keeping its concrete type."""
+    return {"type": type(event).__name__, "event": event.model_dump_json()}
+
+
+def decode_event(fields: dict[str, str]) -> MemoryEvent:
+    """Inverse of ``encode_event``; unknown types fall back to ``MemoryEvent``."""
+    cls = _event_classes().get(fields.get("type", ""), MemoryEvent)
+    return cls.model_validate_json(fields["event"])
+
+
+class TopicPool:
+    """Worker pool for one topic, with one bounded queue per worker."""
+
+    def __init__(self, topic: str, concurrency: int, queue_size: int, dispatch: Dispatch) -> None:
+        self.topic = topic
+        self.concurrency = max(1, concurrency)
+        per_worker = max(1, queue_size // self.concurrency)
+        self._queues: list[asyncio.Queue[tuple[MemoryEvent, Ack]]] = [
+            asyncio.Queue(maxsize=per_worker) for _ in range(self.concurrency)
+        ]
+        self._dispatch = dispatch
+        self._workers: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._work(queue), name=f"event-bus:{self.topic}:{i}")
+                for i, queue in enumerate(self._queues)
+            ]
+
+    async def put(self, event: MemoryEvent, ack: Ack = None) -> None:
+        """Queue *event* on its key's worker, waiting while that queue is full."""
+        shard = zlib.crc32(ordering_key(event).encode()) % self.concurrency
+        await self._queues[shard].put((event, ack))
+
+    def qsize(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+
+    async def _work(self, queue: asyncio.Queue[tuple[MemoryEvent, Ack]]) -> None:
+        while True:
+            event, ack = await queue.get()
+            try:
+                await self._dispatch(event)
+                if ack is not None:
+                    await ack()
+            except Exception as exc:
+                logger.error("event_bus.worker_error", topic=self.topic, event_id=event.event_id, error=str(exc))
+            finally:
+                queue.task_done()
+
+    async def drain(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(asyncio.gather(*(q.join() for q in self._queues)), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("event_bus.drain_timeout", topic=self.topic, pending=self.qsize())
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+
+class EventBusBackend:
+    """Where queued events live between ``publish()`` and the handlers."""
+
+    name = "base"
+    # Durable backends keep events without a local subscriber for other consumers
+    durable = False
+
+    def __init__(self, config: EventBusConfig) -> None:
+        self._config = config
+        self._pools: dict[str, TopicPool] = {}
+        self._dispatch: Dispatch | None = None
+
+    def _pool(self, topic: str) -> TopicPool:
+        pool = self._pools.get(topic)
+        if pool is None:
+            assert self._dispatch is not None, "backend not started"
+            concurrency = self._config.topic_concurrency.get(topic, self._config.default_concurrency)
+            pool = TopicPool(topic, concurrency, self._config.queue_size, self._dispatch)
+            pool.start()
+            self._pools[topic] = pool
+        return pool
+
+    async def start(self, dispatch: Dispatch, topics: Iterable[str]) -> None:
+        self._dispatch = dispatch
+        for topic in topics:
+            self.add_topic(topic)
+
+    def add_topic(self, topic: str) -> None:
+        """Called for every subscribed topic once the bus is running."""
+
+    async def publish(self, event: MemoryEvent) -> None:
+        raise NotImplementedError
+
+    async def dead_letter(self, event: MemoryEvent, handler: str, error: str) -> None:
+        """Persist an event whose handler failed every attempt."""
+
+    async def stop(self, drain_timeout: float) -> None:
+        for pool in self._pools.values():
+            await pool.drain(drain_timeout)
+        for pool in self._pools.values():
+            await pool.stop()
+        self._pools.clear()
+        self._dispatch = None
+
+    def qsize(self) -> int:
+        return sum(pool.qsize() for pool in self._pools.values())
+
+
+class InProcessBackend(EventBusBackend):
+    """Bounded in-memory queues; ``publish()`` waits while a queue is full."""
+
+    name = "memory"
+
+    def add_topic(self, topic: str) -> None:
+        self._pool(topic)
+
+    async def publish(self, event: MemoryEvent) -> None:
+        await self._pool(event.event_type).put(event)
+
+
+class RedisStreamsBackend(EventBusBackend):
+    """One Redis stream per topic, consumed through a consumer group.
+
+    Entries are acknowledged after all handlers have run (or the event was
+    dead-lettered). A process that dies with events in its local queues
+    leaves them pending; after ``claim_idle_ms`` another consumer, or the
+    restarted one, claims and re-delivers them. Delivery is therefore
+    at-least-once. Order per ordering key holds within one consumer.
+
+    A reader stops fetching while a worker queue is full, so backpressure
+    builds up in the stream. The stream is capped at ``stream_maxlen``
+    entries (approximate trimming).
+
+    Topics in ``broadcast_topics`` bypass the consumer group: each process
+    reads the stream with a plain ``XREAD`` from the entries published
+    after it started, so every subscriber sees every event (at-most-once,
+    no acknowledgement). This is what per-process caches need to
+    invalidate themselves.
+    """
+
+    name = "redis"
+    durable = True
+
+    def __init__(self, config: EventBusConfig, client=None, consumer_name: str | None = None) -> None:
+        super().__init__(config)
+        self._client = client
+        self._owns_client = client is None
+        self._consumer = consumer_name or f"{socket.gethostname()}-{os.getpid()}"
+        self._readers: dict[str, asyncio.Task[None]] = {}
+        # Entry ids handed to local workers but not yet acknowledged, per stream
+        self._in_flight: dict[str, set[str]] = {}
+        self._block_ms = 1000
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self._config.redis_url or _default_redis_url(), decode_responses=True)
+        return self._client
+
+    def stream(self, topic: str) -> str:
+        return f"{self._config.stream_prefix}{topic}"
+
+    @property
+    def dead_letter_stream(self) -> str:
+        return f"{self._config.stream_prefix}dead-letter"
+
+    async def publish(self, event: MemoryEvent) -> None:
+        await self.client.xadd(
+            self.stream(event.event_type),
+            encode_event(event),
+            maxlen=self._config.stream_maxlen,
+            approximate=True,
+        )
+
+    def add_topic(self, topic: str) -> None:
+        if topic not in self._readers:
+            read = self._read_broadcast if topic in self._config.broadcast_topics else self._read
+            self._readers[topic] = asyncio.create_task(read(topic, self._pool(topic)), name=f"event-bus-reader:{topic}")
+
+    async def dead_letter(self, event: MemoryEvent, handler: str, error: str) -> None:
+        try:
+            await self.client.xadd(
+                self.dead_letter_stream,
+                {**encode_event(event), "topic": event.event_type, "handler": handler, "error": error[:1000]},
+                maxlen=self._config.stream_maxlen,
+                approximate=True,
+            )
+        except Exception as exc:
+            logger.error("event_bus.dead_letter_failed", event_id=event.event_id, error=str(exc))
+
+    async def _ensure_group(self, stream: str) -> None:
+        from redis.exceptions import ResponseError
+
+        try:
+            # "0": a new group also picks up events published before the first consumer started
+            await self.client.xgroup_create(stream, self._config.consumer_group, id="0", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    async def _read(self, topic: str, pool: TopicPool) -> None:
+        stream = self.stream(topic)
+        group = self._config.consumer_group
+        batch = max(1, min(100, self._config.queue_size))
+        next_claim = 0.0
+        in_flight = self._in_flight.setdefault(stream, set())
+        while True:
+            try:
+                await self._ensure_group(stream)
+                break
+            except Exception as exc:
+                logger.warning("event_bus.stream_group_failed", topic=topic, error=str(exc))
+                await asyncio.sleep(1.0)
+        while True:
+            try:
+                entries: list[tuple[str, dict[str, str] | None]] = []
+                if time.monotonic() >= next_claim:
+                    claimed = await self.client.xautoclaim(
+                        stream, group, self._consumer,
+                        min_idle_time=self._config.claim_idle_ms, start_id="0-0", count=batch,
+                    )
+                    # Our own queued entries go idle too; they are not abandoned
+                    entries.extend(e for e in claimed[1] if e[0] not in in_flight)
+                    next_claim = time.monotonic() + self._config.claim_idle_ms / 1000
+                if not entries:
+                    response = await self.client.xreadgroup(
+                        group, self._consumer, {stream: ">"}, count=batch, block=self._block_ms,
+                    )
+                    for _, stream_entries in response or []:
+                        entries.extend(stream_entries)
+                for entry_id, fields in entries:
+                    in_flight.add(entry_id)
+                    await self._enqueue(stream, pool, entry_id, fields)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("event_bus.stream_read_failed", topic=topic, error=str(exc))
+                await asyncio.sleep(1.0)
+
+    async def _read_broadcast(self, topic: str, pool: TopicPool) -> None:
+        stream = self.stream(topic)
+        batch = max(1, min(100, self._config.queue_size))
+        last_id: str | None = None
+        while True:
+            try:
+                if last_id is None:
+                    # Start after the newest entry; earlier events predate this process
+                    newest = await self.client.xrevrange(stream, count=1)
+                    last_id = newest[0][0] if newest else "0-0"
+                response = await self.client.xread({stream: last_id}, count=batch, block=self._block_ms)
+                for _, stream_entries in response or []:
+                    for entry_id, fields in stream_entries:
+                        last_id = entry_id
+                        try:
+                            event = decode_event(fields or {})
+                        except Exception as exc:
+                            logger.error("event_bus.stream_entry_invalid", stream=stream, entry_id=entry_id, error=str(exc))
+                            continue
+                        await pool.put(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("event_bus.stream_read_failed", topic=topic, error=str(exc))
+                await asyncio.sleep(1.0)
+
+    async def _enqueue(self, stream: str, pool: TopicPool, entry_id: str, fields: dict[str, str] | None) -> None:
+        group = self._config.consumer_group
+
+        async def ack() -> None:
+            try:
+                await self.client.xack(stream, group, entry_id)
+            finally:
+                self._in_flight.get(stream, set()).discard(entry_id)
+
+        try:
+            event = decode_event(fields or {})
+        except Exception as exc:
+            logger.error("event_bus.stream_entry_invalid", stream=stream, entry_id=entry_id, error=str(exc))
+            await ack()
+            return
+        await pool.put(event, ack)
+
+    async def stop(self, drain_timeout: float) -> None:
+        for reader in self._readers.values():
+            reader.cancel()
+        await asyncio.gather(*self._readers.values(), return_exceptions=True)
+        self._readers.clear()
+        await super().stop(drain_timeout)
+        self._in_flight.clear()
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _default_redis_url() -> str:
+    redis_config = get_config().redis
+    auth = f":{redis_config.password}@" if redis_config.password else ""
+    return f"redis://{auth}{redis_config.host}:{redis_config.port}/{redis_config.db}"
+
+
+def create_backend(config: EventBusConfig) -> EventBusBackend:
+    """Build the backend named by ``config.backend``."""
+    if config.backend == RedisStreamsBackend.name:
+        return RedisStreamsBackend(config)
+    if config.backend != InProcessBackend.name:
+        raise ValueError(f"Unknown event bus backend: {config.backend}")
+    return InProcessBackend(config)
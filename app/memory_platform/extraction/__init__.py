@@ -6,12 +6,22 @@ content chunks, and publishes ExtractionResults for downstream processing.
 
 This service replaces the extraction logic previously embedded in
 ``app/memory/librarian_v2.py`` and ``app/memory/member_memory_analyzer.py``.
+
+Chunks of an ingestion event are packed into as few prompts as the token
+budget allows (``EXTRACTION_BATCH_TOKENS``). The batches run concurrently,
+limited per tenant (``EXTRACTION_TENANT_CONCURRENCY``). A packed response
+that cannot be parsed is retried as two halves, down to single chunks.
+Chunks whose content hash was already extracted for the same tenant and
+member are skipped.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import os
+from collections import OrderedDict
 from typing import Any
 
 import structlog
@@ -88,6 +98,52 @@ CONVERSATION_EXTRACTION_PROMPT = """Du bist ein Experte für die Analyse von Kun
 
 Antworte NUR mit validem JSON, ohne Erklärungen."""
 
+PACKED_SECTIONS_NOTE = """
+
+**Hinweis:** Der Text besteht aus mehreren nummerierten Abschnitten ([[Abschnitt n]]). Gib bei jedem Fakt, jeder Entität und jeder Beziehung im zusätzlichen Feld "chunk" die Nummer des Abschnitts an, aus dem sie stammt."""
+
+# Characters of a chunk that are sent to the LLM
+MAX_CHUNK_CHARS = 4000
+MIN_CHUNK_CHARS = 20
+
+ChunkResult = dict[str, list]
+
+
+def _empty_result() -> ChunkResult:
+    return {"entities": [], "facts": [], "relationships": []}
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _is_extractable(chunk: ContentChunk) -> bool:
+    return len(chunk.content.strip()) >= MIN_CHUNK_CHARS
+
+
+def _pack_chunks(chunks: list[ContentChunk], token_budget: int) -> list[list[ContentChunk]]:
+    """Group consecutive chunks into batches of at most *token_budget* tokens.
+
+    A chunk larger than the budget gets a batch of its own.
+    """
+    batches: list[list[ContentChunk]] = []
+    current: list[ContentChunk] = []
+    used = 0
+    for chunk in chunks:
+        tokens = _estimate_tokens(chunk.content[:MAX_CHUNK_CHARS])
+        if current and used + tokens > token_budget:
+            batches.append(current)
+            current, used = [], 0
+        current.append(chunk)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+class MalformedExtraction(ValueError):
+    """The LLM answer for a packed batch could not be mapped back to its chunks."""
+
 
 class ExtractionService:
     """Extracts structured knowledge from raw content using LLMs."""
@@ -96,6 +152,9 @@ class ExtractionService:
         self._event_bus = get_event_bus()
         self._client: Any = None
         self._initialised: bool = False
+        self._tenant_limits: dict[int, asyncio.Semaphore] = {}
+        # (tenant_id, content hash) of chunks already extracted, oldest first
+        self._extracted: OrderedDict[tuple[int, str], None] = OrderedDict()
 
     async def initialise(self) -> None:
         """Initialise the LLM client and subscribe to events."""
@@ -125,26 +184,37 @@ class ExtractionService:
             chunks=len(event.chunks),
         )
 
+        is_conversation = event.content_type == "conversation"
+        member_id = event.metadata.get("member_id")
+
+        # Skip empty/tiny chunks and content already extracted for this tenant and member
+        pending: list[ContentChunk] = []
+        hashes: list[str] = []
+        seen: set[str] = set()
+        skipped = 0
+        for chunk in event.chunks:
+            if not _is_extractable(chunk):
+                continue
+            digest = self._content_hash(chunk, is_conversation, member_id)
+            if (event.tenant_id, digest) in self._extracted or digest in seen:
+                skipped += 1
+                continue
+            pending.append(chunk)
+            hashes.append(digest)
+            seen.add(digest)
+
+        results = await self._extract_chunks(event.tenant_id, pending, is_conversation, member_id)
+
         all_entities: list[ExtractedEntity] = []
         all_facts: list[ExtractedFact] = []
         all_relationships: list[ExtractedRelationship] = []
-
-        for chunk in event.chunks:
-            try:
-                result = await self._extract_from_chunk(
-                    chunk=chunk,
-                    is_conversation=event.content_type == "conversation",
-                    member_id=event.metadata.get("member_id"),
-                )
-                all_entities.extend(result.get("entities", []))
-                all_facts.extend(result.get("facts", []))
-                all_relationships.extend(result.get("relationships", []))
-            except Exception as exc:
-                logger.error(
-                    "extraction.chunk_error",
-                    chunk_id=chunk.chunk_id,
-                    error=str(exc),
-                )
+        extracted_hashes: list[str] = []
+        for digest, (result, ok) in zip(hashes, results):
+            all_entities.extend(result.get("entities", []))
+            all_facts.extend(result.get("facts", []))
+            all_relationships.extend(result.get("relationships", []))
+            if ok:
+                extracted_hashes.append(digest)
 
         # Deduplicate entities by name
         seen_entities: dict[str, ExtractedEntity] = {}
@@ -165,9 +235,11 @@ class ExtractionService:
                 **event.metadata,
                 "source_type": event.source_type.value if hasattr(event.source_type, 'value') else str(event.source_type),
                 "chunk_count": len(event.chunks),
+                "skipped_chunks": skipped,
             },
         )
         await self._event_bus.publish(extraction_event)
+        self._remember_extracted(event.tenant_id, extracted_hashes)
 
         logger.info(
             "extraction.completed",
@@ -175,33 +247,126 @@ class ExtractionService:
             entities=len(deduped_entities),
             facts=len(all_facts),
             relationships=len(all_relationships),
+            skipped_chunks=skipped,
         )
 
-    async def _extract_from_chunk(
-        self,
-        chunk: ContentChunk,
-        is_conversation: bool = False,
-        member_id: str | None = None,
-    ) -> dict[str, list]:
-        """Extract entities, facts and relationships from a single chunk."""
-        if not chunk.content.strip():
-            return {"entities": [], "facts": [], "relationships": []}
+    # ── Batching ─────────────────────────────────────────────────────
+
+    @staticmethod
+    def _content_hash(chunk: ContentChunk, is_conversation: bool, member_id: str | None) -> str:
+        scope = f"{int(is_conversation)}:{member_id or ''}:"
+        return hashlib.sha256((scope + chunk.content.strip()[:MAX_CHUNK_CHARS]).encode()).hexdigest()
 
-        # Skip very short chunks
-        if len(chunk.content.strip()) < 20:
-            return {"entities": [], "facts": [], "relationships": []}
+    def _remember_extracted(self, tenant_id: int, hashes: list[str]) -> None:
+        limit = get_config().extraction.hash_cache_size
+        for digest in hashes:
+            self._extracted[(tenant_id, digest)] = None
+        while len(self._extracted) > limit:
+            self._extracted.popitem(last=False)
+
+    def _tenant_limit(self, tenant_id: int) -> asyncio.Semaphore:
+        semaphore = self._tenant_limits.get(tenant_id)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, get_config().extraction.tenant_concurrency))
+            self._tenant_limits[tenant_id] = semaphore
+        return semaphore
+
+    async def _extract_chunks(
+        self,
+        tenant_id: int,
+        chunks: list[ContentChunk],
+        is_conversation: bool,
+        member_id: str | None,
+    ) -> list[tuple[ChunkResult, bool]]:
+        """Extract *chunks* in packed batches; returns ``(result, ok)`` per chunk, in order."""
+        batches = _pack_chunks(chunks, get_config().extraction.batch_token_budget)
+        outcomes = await asyncio.gather(
+            *(self._extract_batch(tenant_id, batch, is_conversation, member_id) for batch in batches),
+            return_exceptions=True,
+        )
+        results: list[tuple[ChunkResult, bool]] = []
+        for batch, outcome in zip(batches, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error("extraction.batch_error", chunks=len(batch), error=str(outcome))
+                results.extend((_empty_result(), False) for _ in batch)
+            else:
+                results.extend(outcome)
+        return results
+
+    async def _extract_batch(
+        self,
+        tenant_id: int,
+        batch: list[ContentChunk],
+        is_conversation: bool,
+        member_id: str | None,
+    ) -> list[tuple[ChunkResult, bool]]:
+        """Extract one packed batch, splitting it in half when the answer is malformed."""
+        if len(batch) == 1:
+            return [await self._extract_single(batch[0], is_conversation, member_id, tenant_id)]
+        if self._client is None:
+            return [(self._rule_based_extraction(chunk, member_id), False) for chunk in batch]
 
+        sections = "\n\n".join(
+            f"[[Abschnitt {i}]]\n{chunk.content[:MAX_CHUNK_CHARS]}" for i, chunk in enumerate(batch, start=1)
+        )
         prompt = (
             CONVERSATION_EXTRACTION_PROMPT if is_conversation
             else KNOWLEDGE_EXTRACTION_PROMPT
-        ).format(content=chunk.content[:4000])
+        ).format(content=sections) + PACKED_SECTIONS_NOTE
 
-        cfg = get_config().extraction
+        try:
+            content = await self._complete(prompt, tenant_id)
+            data = json.loads(content or "{}")
+            return [(result, True) for result in self._parse_packed_response(data, batch, member_id)]
+        except (json.JSONDecodeError, MalformedExtraction) as exc:
+            logger.warning("extraction.batch_split", chunks=len(batch), error=str(exc))
+        except Exception as exc:
+            logger.error("extraction.llm_error", error=str(exc))
+            return [(self._rule_based_extraction(chunk, member_id), False) for chunk in batch]
 
-        if self._client is None:
-            # Fallback: simple rule-based extraction
-            return self._rule_based_extraction(chunk, member_id)
+        middle = len(batch) // 2
+        left, right = await asyncio.gather(
+            self._extract_batch(tenant_id, batch[:middle], is_conversation, member_id),
+            self._extract_batch(tenant_id, batch[middle:], is_conversation, member_id),
+        )
+        return left + right
 
+    def _parse_packed_response(
+        self,
+        data: Any,
+        batch: list[ContentChunk],
+        member_id: str | None,
+    ) -> list[ChunkResult]:
+        """Split a packed answer by its ``chunk`` numbers and parse each part."""
+        if not isinstance(data, dict):
+            raise MalformedExtraction("answer is not a JSON object")
+        parts = [_empty_result() for _ in batch]
+        for kind in ("entities", "facts", "relationships"):
+            items = data.get(kind, [])
+            if not isinstance(items, list):
+                raise MalformedExtraction(f"'{kind}' is not a list")
+            for item in items:
+                if not isinstance(item, dict):
+                    raise MalformedExtraction(f"'{kind}' entry is not an object")
+                index = item.get("chunk")
+                if isinstance(index, int) and 1 <= index <= len(batch):
+                    parts[index - 1][kind].append(item)
+                elif kind == "facts":
+                    # Facts carry their source chunk; without it the batch can't be attributed
+                    raise MalformedExtraction(f"fact without valid chunk number: {index!r}")
+                else:
+                    parts[0][kind].append(item)
+        return [
+            self._parse_llm_response(part, chunk.chunk_id, member_id)
+            for part, chunk in zip(parts, batch)
+        ]
+
+    async def _complete(self, prompt: str, tenant_id: int | None) -> str | None:
+        """Run one JSON completion, limited per tenant."""
+        cfg = get_config().extraction
+        semaphore = self._tenant_limit(tenant_id) if tenant_id is not None else None
+        if semaphore is not None:
+            await semaphore.acquire()
         try:
             response = await self._client.chat.completions.create(
                 model=cfg.model,
@@ -210,20 +375,57 @@ class ExtractionService:
                 max_tokens=cfg.max_tokens,
                 response_format={"type": "json_object"},
             )
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+        return response.choices[0].message.content
 
-            content = response.choices[0].message.content
+    async def _extract_from_chunk(
+        self,
+        chunk: ContentChunk,
+        is_conversation: bool = False,
+        member_id: str | None = None,
+        tenant_id: int | None = None,
+    ) -> dict[str, list]:
+        """Extract entities, facts and relationships from a single chunk."""
+        result, _ = await self._extract_single(chunk, is_conversation, member_id, tenant_id)
+        return result
+
+    async def _extract_single(
+        self,
+        chunk: ContentChunk,
+        is_conversation: bool,
+        member_id: str | None,
+        tenant_id: int | None,
+    ) -> tuple[ChunkResult, bool]:
+        """Extract one chunk; the flag is False when the LLM result was not used."""
+        # Skip empty and very short chunks
+        if not _is_extractable(chunk):
+            return _empty_result(), False
+
+        prompt = (
+            CONVERSATION_EXTRACTION_PROMPT if is_conversation
+            else KNOWLEDGE_EXTRACTION_PROMPT
+        ).format(content=chunk.content[:MAX_CHUNK_CHARS])
+
+        if self._client is None:
+            # Fallback: simple rule-based extraction
+            return self._rule_based_extraction(chunk, member_id), False
+
+        try:
+            content = await self._complete(prompt, tenant_id)
             if not content:
-                return {"entities": [], "facts": [], "relationships": []}
+                return _empty_result(), True
 
             data = json.loads(content)
-            return self._parse_llm_response(data, chunk.chunk_id, member_id)
+            return self._parse_llm_response(data, chunk.chunk_id, member_id), True
 
         except json.JSONDecodeError as exc:
             logger.warning("extraction.json_parse_error", error=str(exc))
-            return {"entities": [], "facts": [], "relationships": []}
+            return _empty_result(), False
         except Exception as exc:
             logger.error("extraction.llm_error", error=str(exc))
-            return self._rule_based_extraction(chunk, member_id)
+            return self._rule_based_extraction(chunk, member_id), False
 
     def _parse_llm_response(
         self,
@@ -327,7 +529,7 @@ class ExtractionService:
     ) -> dict[str, list]:
         """Extract entities and facts from arbitrary text (API endpoint)."""
         chunk = ContentChunk(content=text, content_type="text")
-        return await self._extract_from_chunk(chunk, is_conversation, member_id)
+        return await self._extract_from_chunk(chunk, is_conversation, member_id, tenant_id)
 
 
 # ── Singleton ────────────────────────────────────────────────────────
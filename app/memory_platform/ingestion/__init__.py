@@ -19,6 +19,7 @@ from typing import Any
 
 import structlog
 
+from app.core.cpu_executor import ExecutorSaturated
 from app.memory_platform.config import get_config
 from app.memory_platform.event_bus import get_event_bus
 from app.memory_platform.ingestion.parsers import get_parser_registry
@@ -230,6 +231,10 @@ class IngestionService:
                 tenant_id=tenant_id,
             )
 
+        except ExecutorSaturated:
+            # Transient overload, not a broken file: let the caller retry (503 / job retry)
+            os.remove(stored_path)
+            raise
         except Exception as exc:
             doc.status = "error"
             doc.error_message = f"Fehler bei der Verarbeitung: {str(exc)}"
@@ -309,6 +314,9 @@ class IngestionService:
                 chunks=len(chunks),
             )
 
+        except ExecutorSaturated:
+            os.remove(temp_path)
+            raise
         except Exception as exc:
             doc.status = "error"
             doc.error_message = str(exc)
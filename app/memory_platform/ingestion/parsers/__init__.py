@@ -27,6 +27,7 @@ from typing import Any
 
 import structlog
 
+from app.core.cpu_executor import DOCUMENT_PARSE, run_cpu_retrying
 from app.memory_platform.models import ContentChunk
 
 logger = structlog.get_logger()
@@ -59,6 +60,29 @@ class BaseParser(ABC):
         return False
 
 
+class CPUBoundParser(BaseParser):
+    """Base for parsers whose work is CPU-bound (PDF, Office, tabular).
+
+    Subclasses implement the synchronous ``parse_sync``; ``parse`` runs it on
+    the shared ``document_parse`` executor so the event loop stays free.
+    """
+
+    async def parse(
+        self,
+        file_path: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> list[ContentChunk]:
+        return await run_cpu_retrying(DOCUMENT_PARSE, self.parse_sync, file_path, metadata)
+
+    @abstractmethod
+    def parse_sync(
+        self,
+        file_path: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> list[ContentChunk]:
+        ...
+
+
 class MarkdownParser(BaseParser):
     """Parser for Markdown and plain text files."""
 
@@ -151,14 +175,14 @@ class MarkdownParser(BaseParser):
         return chunks
 
 
-class PDFParser(BaseParser):
+class PDFParser(CPUBoundParser):
     """Parser for PDF documents using pdfplumber or fallback to PyPDF2."""
 
     supported_extensions = [".pdf"]
     supported_mimetypes = ["application/pdf"]
     parser_name = "pdf"
 
-    async def parse(
+    def parse_sync(
         self,
         file_path: str,
         metadata: dict[str, Any] | None = None,
@@ -241,7 +265,7 @@ class PDFParser(BaseParser):
         return "\n".join(rows)
 
 
-class DocxParser(BaseParser):
+class DocxParser(CPUBoundParser):
     """Parser for Microsoft Word (.docx) documents."""
 
     supported_extensions = [".docx", ".doc"]
@@ -251,7 +275,7 @@ class DocxParser(BaseParser):
     ]
     parser_name = "docx"
 
-    async def parse(
+    def parse_sync(
         self,
         file_path: str,
         metadata: dict[str, Any] | None = None,
@@ -372,14 +396,14 @@ class HTMLParser(BaseParser):
             return []
 
 
-class CSVParser(BaseParser):
+class CSVParser(CPUBoundParser):
     """Parser for CSV and TSV files."""
 
     supported_extensions = [".csv", ".tsv"]
     supported_mimetypes = ["text/csv", "text/tab-separated-values"]
     parser_name = "csv"
 
-    async def parse(
+    def parse_sync(
         self,
         file_path: str,
         metadata: dict[str, Any] | None = None,
@@ -428,7 +452,7 @@ class CSVParser(BaseParser):
             return []
 
 
-class ExcelParser(BaseParser):
+class ExcelParser(CPUBoundParser):
     """Parser for Excel (.xlsx, .xls) files."""
 
     supported_extensions = [".xlsx", ".xls"]
@@ -438,7 +462,7 @@ class ExcelParser(BaseParser):
     ]
     parser_name = "excel"
 
-    async def parse(
+    def parse_sync(
         self,
         file_path: str,
         metadata: dict[str, Any] | None = None,
@@ -489,7 +513,7 @@ class ExcelParser(BaseParser):
             return []
 
 
-class PowerPointParser(BaseParser):
+class PowerPointParser(CPUBoundParser):
     """Parser for PowerPoint (.pptx) files."""
 
     supported_extensions = [".pptx", ".ppt"]
@@ -498,7 +522,7 @@ class PowerPointParser(BaseParser):
     ]
     parser_name = "pptx"
 
-    async def parse(
+    def parse_sync(
         self,
         file_path: str,
         metadata: dict[str, Any] | None = None,
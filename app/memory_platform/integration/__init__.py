@@ -54,6 +54,9 @@ class MemoryPlatformBridge:
         retrieval = get_retrieval_service()
         await retrieval.initialise()
 
+        from app.memory_platform.prefetcher import get_context_prefetcher
+        await get_context_prefetcher().initialise()
+
         self._initialised = True
         logger.info("memory_platform.bridge_initialised")
 
@@ -10,8 +10,10 @@ Verwaltet den Lebenszyklus von Fakten und Erinnerungen:
 
 import logging
 import math
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -81,9 +83,63 @@ FACT_TYPE_HALF_LIVES = {
 }
 
 
+DEFAULT_HALF_LIFE = 720.0
+
+
 def get_half_life(fact_type: str) -> float:
     """Gibt die Halbwertszeit für einen Faktentyp zurück."""
-    return FACT_TYPE_HALF_LIVES.get(fact_type, 720.0)
+    return FACT_TYPE_HALF_LIVES.get(fact_type, DEFAULT_HALF_LIFE)
+
+
+# ── Vektorisierte Decay-Berechnung ────────────────────────────────────
+
+def decay_scores_vectorized(
+    confidence: np.ndarray,
+    hours_since_update: np.ndarray,
+    half_life_hours: np.ndarray,
+    access_count: np.ndarray,
+    min_score: float = 0.05,
+    boost_factor: float = 0.1,
+    max_score: float = 1.0,
+) -> np.ndarray:
+    """
+    NumPy-Variante von exponential_decay + reinforcement_boost für einen
+    ganzen Batch. Liefert elementweise dieselben Werte wie die Skalar-Funktionen.
+    """
+    conf = np.asarray(confidence, dtype=np.float64)
+    hours = np.asarray(hours_since_update, dtype=np.float64)
+    half_life = np.asarray(half_life_hours, dtype=np.float64)
+    access = np.asarray(access_count, dtype=np.float64)
+
+    decayed = np.maximum(conf * np.power(0.5, hours / half_life), min_score)
+    scores = np.where(hours <= 0, conf, decayed)
+    boosted = np.minimum(scores + boost_factor * access, max_score)
+    return np.where(access > 0, boosted, scores)
+
+
+def _hours_since(values: list, now: datetime) -> np.ndarray:
+    """Stunden seit `updated_at` für einen Batch (naive Werte gelten als UTC)."""
+    now_ts = now.replace(tzinfo=timezone.utc).timestamp() if now.tzinfo is None else now.timestamp()
+    epochs = np.empty(len(values), dtype=np.float64)
+    for i, value in enumerate(values):
+        if isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            except ValueError:
+                value = None
+        if value is None:
+            epochs[i] = now_ts
+        elif value.tzinfo is None:
+            epochs[i] = value.replace(tzinfo=timezone.utc).timestamp()
+        else:
+            epochs[i] = value.timestamp()
+    return (now_ts - epochs) / 3600.0
+
+
+def _half_life_case_sql() -> str:
+    """SQL-CASE-Ausdruck mit den Halbwertszeiten (nur statische Werte)."""
+    whens = " ".join(f"WHEN '{t}' THEN {h}" for t, h in FACT_TYPE_HALF_LIVES.items())
+    return f"CASE fact_type {whens} ELSE {DEFAULT_HALF_LIFE} END"
 
 
 # ── Lifecycle Manager ─────────────────────────────────────────────────
@@ -91,19 +147,33 @@ def get_half_life(fact_type: str) -> float:
 class MemoryLifecycleManager:
     """
     Verwaltet den Lebenszyklus aller Fakten und Erinnerungen.
+
+    Der Decay-Zyklus streamt Fakten in Batches (Keyset-Pagination über
+    fact_id), berechnet Decay/Reinforcement mit NumPy und schreibt Änderungen
+    pro Batch set-basiert zurück. Mit `decay_in_database=True` wird auf
+    PostgreSQL die gesamte Berechnung in einem einzigen UPDATE ausgeführt.
     """
     
+    # Schwelle, ab der ein neuer Score geschrieben wird
+    SCORE_CHANGE_EPSILON = 0.01
+    # Zeilen pro UPDATE ... FROM (VALUES ...)-Statement
+    UPDATE_CHUNK_SIZE = 500
+    
     def __init__(
         self,
         db_session_factory=None,
         archive_threshold: float = 0.1,
         consolidation_similarity: float = 0.85,
         max_facts_per_contact: int = 500,
+        batch_size: int = 5000,
+        decay_in_database: bool = False,
     ):
         self.db_session_factory = db_session_factory
         self.archive_threshold = archive_threshold
         self.consolidation_similarity = consolidation_similarity
         self.max_facts_per_contact = max_facts_per_contact
+        self.batch_size = batch_size
+        self.decay_in_database = decay_in_database
     
     async def run_decay_cycle(self, tenant_id: int) -> dict:
         """
@@ -121,42 +191,26 @@ class MemoryLifecycleManager:
         }
         
         try:
-            # 1. Alle aktiven Fakten laden
-            facts = await self._load_active_facts(tenant_id)
-            stats["facts_processed"] = len(facts)
-            
             now = datetime.utcnow()
             
-            for fact in facts:
-                try:
-                    # 2. Decay berechnen
-                    hours_since = (now - fact.get("updated_at", now)).total_seconds() / 3600
-                    half_life = get_half_life(fact.get("fact_type", ""))
-                    
-                    new_score = exponential_decay(
-                        initial_score=fact.get("confidence", 1.0),
-                        hours_since_update=hours_since,
-                        half_life_hours=half_life,
-                    )
-                    
-                    # 3. Reinforcement durch Zugriffe
-                    access_count = fact.get("access_count_since_decay", 0)
-                    if access_count > 0:
-                        new_score = reinforcement_boost(new_score, access_count)
-                    
-                    # 4. Score aktualisieren
-                    if abs(new_score - fact.get("decay_score", 1.0)) > 0.01:
-                        await self._update_decay_score(fact["fact_id"], new_score)
-                        stats["facts_decayed"] += 1
-                    
-                    # 5. Archivieren wenn unter Schwelle
-                    if new_score < self.archive_threshold:
-                        await self._archive_fact(fact["fact_id"])
-                        stats["facts_archived"] += 1
-                        
-                except Exception as e:
-                    logger.warning(f"Decay error for fact {fact.get('fact_id')}: {e}")
-                    stats["errors"] += 1
+            if self.decay_in_database and await self._is_postgres():
+                # 1-5. Decay, Reinforcement und Archivierung komplett in SQL
+                processed, decayed, archived = await self._apply_decay_in_sql(tenant_id)
+                stats["facts_processed"] = processed
+                stats["facts_decayed"] = decayed
+                stats["facts_archived"] = archived
+            else:
+                # 1. Aktive Fakten batchweise streamen
+                async for batch in self._iter_active_fact_batches(tenant_id):
+                    stats["facts_processed"] += len(batch)
+                    try:
+                        # 2-5. Decay vektorisiert berechnen und set-basiert schreiben
+                        decayed, archived = await self._apply_decay_batch(batch, now)
+                        stats["facts_decayed"] += decayed
+                        stats["facts_archived"] += archived
+                    except Exception as e:
+                        logger.warning(f"Decay error for batch starting at fact {batch[0].get('fact_id')}: {e}")
+                        stats["errors"] += 1
             
             # 6. Konsolidierung durchführen
             consolidated = await self._consolidate_facts(tenant_id)
@@ -221,27 +275,185 @@ class MemoryLifecycleManager:
     
     # ── Private Methoden (DB-Abstraktionen) ───────────────────────────
     
-    async def _load_active_facts(self, tenant_id: int) -> list:
-        """Lädt alle aktiven (nicht archivierten) Fakten eines Mandanten."""
+    async def _iter_active_fact_batches(self, tenant_id: int) -> AsyncIterator[list[dict]]:
+        """Streamt aktive Fakten eines Mandanten in Batches (Keyset über fact_id)."""
         if not self.db_session_factory:
-            return []
-        try:
+            return
+        from sqlalchemy import text
+        after = None
+        while True:
+            params = {"tid": tenant_id, "limit": self.batch_size}
+            cursor_clause = ""
+            if after is not None:
+                params["after"] = after
+                cursor_clause = "AND fact_id > :after"
             async with self.db_session_factory() as session:
-                from sqlalchemy import text
                 result = await session.execute(
-                    text("""
+                    text(f"""
                         SELECT fact_id, fact_type, confidence, decay_score,
                                updated_at, access_count_since_decay
                         FROM memory_facts
-                        WHERE tenant_id = :tid AND archived = false
+                        WHERE tenant_id = :tid AND archived = false {cursor_clause}
+                        ORDER BY fact_id
+                        LIMIT :limit
                     """),
-                    {"tid": tenant_id}
+                    params
                 )
-                rows = result.fetchall()
-                return [dict(r._mapping) for r in rows]
-        except Exception as e:
-            logger.error(f"Failed to load facts: {e}")
-            return []
+                rows = [dict(r._mapping) for r in result.fetchall()]
+            if not rows:
+                return
+            yield rows
+            if len(rows) < self.batch_size:
+                return
+            after = rows[-1]["fact_id"]
+    
+    async def _apply_decay_batch(self, batch: list[dict], now: datetime) -> tuple[int, int]:
+        """
+        Berechnet Decay + Reinforcement für einen Batch mit NumPy und schreibt
+        geänderte Scores und Archivierungen in einer Transaktion zurück.
+        
+        Returns:
+            (Anzahl aktualisierter Scores, Anzahl archivierter Fakten)
+        """
+        n = len(batch)
+        confidence = np.fromiter(
+            (1.0 if f.get("confidence") is None else f["confidence"] for f in batch), np.float64, n
+        )
+        current = np.fromiter(
+            (1.0 if f.get("decay_score") is None else f["decay_score"] for f in batch), np.float64, n
+        )
+        access = np.fromiter((f.get("access_count_since_decay") or 0 for f in batch), np.float64, n)
+        half_life = np.fromiter((get_half_life(f.get("fact_type") or "") for f in batch), np.float64, n)
+        hours = _hours_since([f.get("updated_at") for f in batch], now)
+        
+        new_scores = decay_scores_vectorized(confidence, hours, half_life, access)
+        changed = np.abs(new_scores - current) > self.SCORE_CHANGE_EPSILON
+        to_archive = new_scores < self.archive_threshold
+        
+        fact_ids = [f["fact_id"] for f in batch]
+        updates = [(fact_ids[i], float(new_scores[i])) for i in np.flatnonzero(changed)]
+        archive_ids = [fact_ids[i] for i in np.flatnonzero(to_archive)]
+        
+        if (updates or archive_ids) and self.db_session_factory:
+            async with self.db_session_factory() as session:
+                for start in range(0, len(updates), self.UPDATE_CHUNK_SIZE):
+                    await self._bulk_update_scores(session, updates[start:start + self.UPDATE_CHUNK_SIZE])
+                for start in range(0, len(archive_ids), self.UPDATE_CHUNK_SIZE):
+                    await self._bulk_archive(session, archive_ids[start:start + self.UPDATE_CHUNK_SIZE])
+                await session.commit()
+        
+        return len(updates), len(archive_ids)
+    
+    @staticmethod
+    async def _bulk_update_scores(session, updates: list[tuple[str, float]]) -> None:
+        """UPDATE ... FROM (VALUES ...) für einen Chunk (fact_id, score)."""
+        if not updates:
+            return
+        from sqlalchemy import text
+        values = ", ".join(f"(:f{i}, :s{i})" for i in range(len(updates)))
+        params: dict = {}
+        for i, (fid, score) in enumerate(updates):
+            params[f"f{i}"] = fid
+            params[f"s{i}"] = score
+        await session.execute(
+            text(f"""
+                WITH v(fact_id, score) AS (VALUES {values})
+                UPDATE memory_facts
+                SET decay_score = v.score, access_count_since_decay = 0
+                FROM v
+                WHERE memory_facts.fact_id = v.fact_id
+            """),
+            params,
+        )
+    
+    @staticmethod
+    async def _bulk_archive(session, fact_ids: list[str]) -> None:
+        """Archiviert einen Chunk von Fakten in einem Statement."""
+        if not fact_ids:
+            return
+        from sqlalchemy import bindparam, text
+        await session.execute(
+            text(
+                "UPDATE memory_facts SET archived = true, archived_at = CURRENT_TIMESTAMP "
+                "WHERE fact_id IN :fids"
+            ).bindparams(bindparam("fids", expanding=True)),
+            {"fids": fact_ids},
+        )
+    
+    async def _is_postgres(self) -> bool:
+        if not self.db_session_factory:
+            return False
+        async with self.db_session_factory() as session:
+            return session.bind.dialect.name == "postgresql"
+    
+    async def _apply_decay_in_sql(self, tenant_id: int) -> tuple[int, int, int]:
+        """
+        PostgreSQL-Pfad: Decay, Reinforcement und Archivierung in einem
+        einzigen set-basierten UPDATE (gleiche Semantik wie der NumPy-Pfad).
+        
+        Returns:
+            (verarbeitet, aktualisiert, archiviert)
+        """
+        from sqlalchemy import text
+        async with self.db_session_factory() as session:
+            total = (await session.execute(
+                text("SELECT COUNT(*) FROM memory_facts WHERE tenant_id = :tid AND archived = false"),
+                {"tid": tenant_id},
+            )).scalar() or 0
+            result = await session.execute(
+                text(f"""
+                    WITH scored AS (
+                        SELECT fact_id,
+                               COALESCE(decay_score, 1.0) AS old_score,
+                               COALESCE(access_count_since_decay, 0) AS access_count,
+                               COALESCE(confidence, 1.0) AS conf,
+                               COALESCE(EXTRACT(EPOCH FROM (NOW() - updated_at)) / 3600.0, 0) AS hours,
+                               {_half_life_case_sql()} AS half_life
+                        FROM memory_facts
+                        WHERE tenant_id = :tid AND archived = false
+                    ),
+                    decayed AS (
+                        SELECT fact_id, old_score, access_count,
+                               CASE WHEN hours <= 0 THEN conf
+                                    ELSE GREATEST(conf * power(0.5, hours / half_life), :min_score)
+                               END AS base_score
+                        FROM scored
+                    ),
+                    final AS (
+                        SELECT fact_id, old_score,
+                               CASE WHEN access_count > 0
+                                    THEN LEAST(base_score + :boost * access_count, 1.0)
+                                    ELSE base_score
+                               END AS new_score
+                        FROM decayed
+                    )
+                    UPDATE memory_facts m
+                    SET decay_score = CASE WHEN abs(f.new_score - f.old_score) > :eps
+                                           THEN f.new_score ELSE m.decay_score END,
+                        access_count_since_decay = CASE WHEN abs(f.new_score - f.old_score) > :eps
+                                                        THEN 0 ELSE m.access_count_since_decay END,
+                        archived = f.new_score < :threshold,
+                        archived_at = CASE WHEN f.new_score < :threshold
+                                           THEN NOW() ELSE m.archived_at END
+                    FROM final f
+                    WHERE m.fact_id = f.fact_id
+                      AND (abs(f.new_score - f.old_score) > :eps OR f.new_score < :threshold)
+                    RETURNING abs(f.new_score - f.old_score) > :eps AS decayed,
+                              f.new_score < :threshold AS archived
+                """),
+                {
+                    "tid": tenant_id,
+                    "min_score": 0.05,
+                    "boost": 0.1,
+                    "eps": self.SCORE_CHANGE_EPSILON,
+                    "threshold": self.archive_threshold,
+                },
+            )
+            rows = result.fetchall()
+            await session.commit()
+        decayed = sum(1 for r in rows if r.decayed)
+        archived = sum(1 for r in rows if r.archived)
+        return int(total), decayed, archived
     
     async def _load_contact_facts(self, tenant_id: int, contact_id: str) -> list:
         """Lädt alle Fakten eines Kontakts."""
@@ -330,28 +542,28 @@ class MemoryLifecycleManager:
         try:
             async with self.db_session_factory() as session:
                 from sqlalchemy import text
-                # Finde Duplikate (gleicher Kontakt, Subjekt, Prädikat)
+                # Behalte je (Kontakt, Subjekt, Prädikat) den Fakt mit der
+                # höchsten Konfidenz, archiviere den Rest in einem Statement
                 result = await session.execute(
                     text("""
-                        SELECT contact_id, subject, predicate,
-                               COUNT(*) as cnt,
-                               array_agg(fact_id ORDER BY confidence DESC) as fact_ids
-                        FROM memory_facts
-                        WHERE tenant_id = :tid AND archived = false
-                        GROUP BY contact_id, subject, predicate
-                        HAVING COUNT(*) > 1
+                        UPDATE memory_facts
+                        SET archived = true, archived_at = CURRENT_TIMESTAMP
+                        WHERE fact_id IN (
+                            SELECT fact_id FROM (
+                                SELECT fact_id,
+                                       ROW_NUMBER() OVER (
+                                           PARTITION BY contact_id, subject, predicate
+                                           ORDER BY confidence DESC, fact_id
+                                       ) AS rn
+                                FROM memory_facts
+                                WHERE tenant_id = :tid AND archived = false
+                            ) ranked
+                            WHERE rn > 1
+                        )
                     """),
                     {"tid": tenant_id}
                 )
-                
-                for row in result.fetchall():
-                    mapping = row._mapping
-                    fact_ids = mapping["fact_ids"]
-                    # Behalte den ersten (höchste Konfidenz), archiviere den Rest
-                    for fid in fact_ids[1:]:
-                        await self._archive_fact(fid)
-                        consolidated += 1
-                
+                consolidated = max(result.rowcount or 0, 0)
                 await session.commit()
                 
         except Exception as e:
@@ -231,6 +231,8 @@ class RetrievalResponse(BaseModel):
     context_summary: str = ""
     total_results: int = 0
     search_time_ms: float = 0.0
+    source_latency_ms: dict[str, float] = Field(default_factory=dict)
+    degraded_sources: list[str] = Field(default_factory=list)  # timed out or failed
 
 
 # ── Consent Models ───────────────────────────────────────────────────
@@ -4,22 +4,83 @@ Provides CRUD operations for the knowledge graph including nodes
 (Tenant, Member, Fact, KnowledgeChunk, Conversation, Campaign, Entity)
 and edges (relationships between them).
 
-Falls back gracefully to an in-memory graph when Neo4j is unavailable,
-ensuring the platform can run in development without external dependencies.
+Falls back gracefully to an indexed in-memory graph (see memory_graph.py)
+when Neo4j is unavailable, ensuring the platform can run in development
+without external dependencies.
 """
 
 from __future__ import annotations
 
-import time
-from collections import defaultdict
+import os
+import re
+from dataclasses import dataclass, field
 from typing import Any
 
 import structlog
 
 from app.memory_platform.config import get_config
+from app.memory_platform.models.memory_graph import InMemoryGraph
 
 logger = structlog.get_logger()
 
+_IDENTIFIER_RE = re.compile(r"[^A-Za-z0-9_]")
+
+
+def _safe_identifier(name: str) -> str:
+    """Labels / relationship types are interpolated into Cypher – keep them to [A-Za-z0-9_]."""
+    cleaned = _IDENTIFIER_RE.sub("_", name.strip())
+    if not cleaned or cleaned[0].isdigit():
+        cleaned = f"_{cleaned}"
+    return cleaned
+
+
+@dataclass
+class GraphWriteBatch:
+    """Accumulates node upserts and relationships for a single bulk write.
+
+    Nodes are grouped by (label, key_field) and merged per key, relationships
+    by (source label/key, target label/key, type), so each group becomes one
+    ``UNWIND $rows`` statement.
+    """
+
+    nodes: dict[tuple[str, str], dict[str, dict[str, Any]]] = field(default_factory=dict)
+    relationships: dict[tuple[str, str, str, str, str], dict[tuple[str, str], dict[str, Any]]] = field(
+        default_factory=dict
+    )
+
+    def add_node(self, label: str, key_field: str, key_value: str, properties: dict[str, Any]) -> None:
+        group = self.nodes.setdefault((label, key_field), {})
+        row = group.setdefault(key_value, {})
+        row.update(properties)
+        row[key_field] = key_value
+
+    def add_relationship(
+        self,
+        source_label: str,
+        source_key: str,
+        source_value: str,
+        target_label: str,
+        target_key: str,
+        target_value: str,
+        rel_type: str,
+        properties: dict[str, Any] | None = None,
+    ) -> None:
+        group = self.relationships.setdefault(
+            (source_label, source_key, target_label, target_key, rel_type), {}
+        )
+        group.setdefault((source_value, target_value), {}).update(properties or {})
+
+    @property
+    def node_count(self) -> int:
+        return sum(len(rows) for rows in self.nodes.values())
+
+    @property
+    def relationship_count(self) -> int:
+        return sum(len(rows) for rows in self.relationships.values())
+
+    def __bool__(self) -> bool:
+        return bool(self.nodes or self.relationships)
+
 
 class GraphStore:
     """Abstraction over Neo4j for the Enterprise Knowledge Graph.
@@ -31,8 +92,7 @@ class GraphStore:
     def __init__(self) -> None:
         self._driver: Any = None
         self._in_memory: bool = False
-        self._mem_nodes: dict[str, dict[str, Any]] = {}
-        self._mem_edges: list[dict[str, Any]] = []
+        self._mem = InMemoryGraph()
         self._initialised: bool = False
 
     async def initialise(self) -> None:
@@ -61,13 +121,40 @@ class GraphStore:
             )
             self._in_memory = True
             self._driver = None
+            self._load_memory_snapshot(cfg.memory_snapshot_path)
 
         self._initialised = True
 
     async def close(self) -> None:
-        """Close the Neo4j driver."""
+        """Close the Neo4j driver (or persist the in-memory snapshot)."""
         if self._driver:
             await self._driver.close()
+        elif self._in_memory:
+            self.save_snapshot()
+
+    # ── In-memory snapshot ───────────────────────────────────────────
+
+    def _load_memory_snapshot(self, path: str) -> None:
+        if not path or not os.path.exists(path):
+            return
+        try:
+            count = self._mem.load_snapshot(path)
+            logger.info("graph_store.snapshot_loaded", path=path, nodes=count)
+        except Exception as exc:
+            logger.error("graph_store.snapshot_load_error", path=path, error=str(exc))
+
+    def save_snapshot(self, path: str | None = None) -> bool:
+        """Persist the in-memory graph to disk (no-op in Neo4j mode)."""
+        path = path or get_config().neo4j.memory_snapshot_path
+        if not self._in_memory or not path:
+            return False
+        try:
+            count = self._mem.save_snapshot(path)
+            logger.info("graph_store.snapshot_saved", path=path, nodes=count)
+            return True
+        except Exception as exc:
+            logger.error("graph_store.snapshot_save_error", path=path, error=str(exc))
+            return False
 
     # ── Schema ───────────────────────────────────────────────────────
 
@@ -112,13 +199,7 @@ class GraphStore:
     ) -> dict[str, Any]:
         """Create or update a node with the given label and properties."""
         if self._in_memory:
-            node_key = f"{label}:{key_value}"
-            existing = self._mem_nodes.get(node_key, {})
-            existing.update(properties)
-            existing[key_field] = key_value
-            existing["_label"] = label
-            self._mem_nodes[node_key] = existing
-            return existing
+            return self._mem.upsert_node(label, key_field, key_value, properties)
 
         cfg = get_config().neo4j
         props_str = ", ".join(f"n.{k} = ${k}" for k in properties)
@@ -145,7 +226,7 @@ class GraphStore:
     ) -> dict[str, Any] | None:
         """Retrieve a single node by its key."""
         if self._in_memory:
-            return self._mem_nodes.get(f"{label}:{key_value}")
+            return self._mem.get_node(label, key_value)
 
         cfg = get_config().neo4j
         query = f"MATCH (n:{label} {{{key_field}: $val}}) RETURN n LIMIT 1"
@@ -166,16 +247,7 @@ class GraphStore:
     ) -> list[dict[str, Any]]:
         """Query nodes by label and property filters."""
         if self._in_memory:
-            results = []
-            for node in self._mem_nodes.values():
-                if node.get("_label") != label:
-                    continue
-                match = all(node.get(k) == v for k, v in filters.items())
-                if match:
-                    results.append(node)
-                if len(results) >= limit:
-                    break
-            return results
+            return self._mem.query_nodes(label, filters, limit)
 
         cfg = get_config().neo4j
         where_parts = [f"n.{k} = ${k}" for k in filters]
@@ -199,15 +271,7 @@ class GraphStore:
     ) -> bool:
         """Delete a node and its relationships."""
         if self._in_memory:
-            node_key = f"{label}:{key_value}"
-            if node_key in self._mem_nodes:
-                del self._mem_nodes[node_key]
-                self._mem_edges = [
-                    e for e in self._mem_edges
-                    if e.get("source") != node_key and e.get("target") != node_key
-                ]
-                return True
-            return False
+            return self._mem.delete_node(label, key_value)
 
         cfg = get_config().neo4j
         query = f"MATCH (n:{label} {{{key_field}: $val}}) DETACH DELETE n"
@@ -236,13 +300,12 @@ class GraphStore:
         properties = properties or {}
 
         if self._in_memory:
-            self._mem_edges.append({
-                "source": f"{source_label}:{source_value}",
-                "target": f"{target_label}:{target_value}",
-                "type": rel_type,
-                "properties": properties,
-            })
-            return True
+            return self._mem.create_relationship(
+                InMemoryGraph.node_key(source_label, source_value),
+                InMemoryGraph.node_key(target_label, target_value),
+                rel_type,
+                properties,
+            )
 
         cfg = get_config().neo4j
         props_str = ""
@@ -264,6 +327,46 @@ class GraphStore:
             logger.error("graph_store.create_rel_error", error=str(exc))
             return False
 
+    async def get_related_nodes(
+        self,
+        label: str,
+        key_field: str,
+        key_value: str,
+        rel_type: str | None = None,
+        direction: str = "out",
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        """Return nodes adjacent to a node; the relationship is under ``_rel``.
+
+        direction: "out" | "in" | "both"
+        """
+        if self._in_memory:
+            return self._mem.neighbors(
+                InMemoryGraph.node_key(label, key_value), rel_type, direction, limit
+            )
+
+        cfg = get_config().neo4j
+        rel = f"[r:{rel_type}]" if rel_type else "[r]"
+        pattern = {
+            "out": f"(n:{label} {{{key_field}: $val}})-{rel}->(m)",
+            "in": f"(n:{label} {{{key_field}: $val}})<-{rel}-(m)",
+            "both": f"(n:{label} {{{key_field}: $val}})-{rel}-(m)",
+        }.get(direction)
+        if pattern is None:
+            raise ValueError(f"Invalid direction: {direction}")
+        query = f"MATCH {pattern} RETURN m, type(r) AS rel_type, properties(r) AS rel_props LIMIT $limit"
+        try:
+            async with self._driver.session(database=cfg.database) as session:
+                result = await session.run(query, {"val": key_value, "limit": limit})
+                records = await result.data()
+                return [
+                    {**dict(r["m"]), "_rel": {"type": r["rel_type"], **(r["rel_props"] or {})}}
+                    for r in records
+                ]
+        except Exception as exc:
+            logger.error("graph_store.get_related_nodes_error", error=str(exc))
+            return []
+
     async def get_member_facts(
         self,
         tenant_id: int,
@@ -273,20 +376,7 @@ class GraphStore:
     ) -> list[dict[str, Any]]:
         """Get all facts associated with a member."""
         if self._in_memory:
-            results = []
-            for node in self._mem_nodes.values():
-                if node.get("_label") != "Fact":
-                    continue
-                if node.get("tenant_id") != tenant_id:
-                    continue
-                if node.get("member_id") != member_id:
-                    continue
-                if fact_types and node.get("fact_type") not in fact_types:
-                    continue
-                results.append(node)
-                if len(results) >= limit:
-                    break
-            return results
+            return self._mem.member_facts(tenant_id, member_id, fact_types, limit)
 
         cfg = get_config().neo4j
         type_filter = ""
@@ -323,19 +413,7 @@ class GraphStore:
     ) -> list[dict[str, Any]]:
         """Full-text search across facts in the graph."""
         if self._in_memory:
-            query_lower = query_text.lower()
-            results = []
-            for node in self._mem_nodes.values():
-                if node.get("_label") != "Fact":
-                    continue
-                if node.get("tenant_id") != tenant_id:
-                    continue
-                searchable = f"{node.get('subject', '')} {node.get('predicate', '')} {node.get('value', '')}".lower()
-                if query_lower in searchable:
-                    results.append(node)
-                if len(results) >= limit:
-                    break
-            return results
+            return self._mem.fulltext_search(tenant_id, query_text, limit)
 
         cfg = get_config().neo4j
         query = """
@@ -361,25 +439,132 @@ class GraphStore:
             logger.error("graph_store.fulltext_search_error", error=str(exc))
             return []
 
+    # ── Bulk Operations ──────────────────────────────────────────────
+
+    @staticmethod
+    def _unwind_nodes_query(label: str, key_field: str) -> str:
+        label, key_field = _safe_identifier(label), _safe_identifier(key_field)
+        return (
+            f"UNWIND $rows AS row "
+            f"MERGE (n:{label} {{{key_field}: row.{key_field}}}) "
+            f"SET n += row"
+        )
+
+    @staticmethod
+    def _unwind_relationships_query(
+        source_label: str, source_key: str, target_label: str, target_key: str, rel_type: str,
+    ) -> str:
+        sl, sk = _safe_identifier(source_label), _safe_identifier(source_key)
+        tl, tk = _safe_identifier(target_label), _safe_identifier(target_key)
+        rt = _safe_identifier(rel_type)
+        return (
+            f"UNWIND $rows AS row "
+            f"MATCH (a:{sl} {{{sk}: row.source}}) "
+            f"MATCH (b:{tl} {{{tk}: row.target}}) "
+            f"MERGE (a)-[r:{rt}]->(b) "
+            f"SET r += row.props"
+        )
+
+    async def upsert_nodes_bulk(
+        self,
+        label: str,
+        key_field: str,
+        rows: list[dict[str, Any]],
+    ) -> int:
+        """Upsert many nodes of one label in a single UNWIND transaction.
+
+        Every row must contain ``key_field``. Returns the number of rows written.
+        """
+        batch = GraphWriteBatch()
+        for row in rows:
+            batch.add_node(label, key_field, row[key_field], row)
+        return (await self.write_batch(batch))["nodes"]
+
+    async def create_relationships_bulk(
+        self,
+        source_label: str,
+        source_key: str,
+        target_label: str,
+        target_key: str,
+        rel_type: str,
+        rows: list[dict[str, Any]],
+    ) -> int:
+        """Create many relationships of one type in a single UNWIND transaction.
+
+        rows: ``{"source": <source key value>, "target": <target key value>,
+        "props": {...}}``. Returns the number of rows submitted.
+        """
+        batch = GraphWriteBatch()
+        for row in rows:
+            batch.add_relationship(
+                source_label, source_key, row["source"],
+                target_label, target_key, row["target"],
+                rel_type, row.get("props"),
+            )
+        return (await self.write_batch(batch))["relationships"]
+
+    async def write_batch(self, batch: GraphWriteBatch) -> dict[str, int]:
+        """Write all nodes, then all relationships of a batch in one transaction.
+
+        Returns counts of submitted nodes / relationships (zeros on failure).
+        """
+        counts = {"nodes": batch.node_count, "relationships": batch.relationship_count}
+        if not batch:
+            return counts
+
+        if self._in_memory:
+            for (label, key_field), rows in batch.nodes.items():
+                for key_value, props in rows.items():
+                    self._mem.upsert_node(label, key_field, key_value, props)
+            created = 0
+            for (sl, _sk, tl, _tk, rel_type), rows in batch.relationships.items():
+                for (source, target), props in rows.items():
+                    created += self._mem.create_relationship(
+                        InMemoryGraph.node_key(sl, source),
+                        InMemoryGraph.node_key(tl, target),
+                        _safe_identifier(rel_type),
+                        props,
+                    )
+            counts["relationships"] = created
+            return counts
+
+        statements: list[tuple[str, list[dict[str, Any]]]] = []
+        for (label, key_field), rows in batch.nodes.items():
+            statements.append((self._unwind_nodes_query(label, key_field), list(rows.values())))
+        for (sl, sk, tl, tk, rel_type), rows in batch.relationships.items():
+            statements.append((
+                self._unwind_relationships_query(sl, sk, tl, tk, rel_type),
+                [{"source": s, "target": t, "props": props} for (s, t), props in rows.items()],
+            ))
+
+        async def _run_all(tx: Any) -> None:
+            for query, rows in statements:
+                result = await tx.run(query, {"rows": rows})
+                await result.consume()
+
+        cfg = get_config().neo4j
+        try:
+            async with self._driver.session(database=cfg.database) as session:
+                await session.execute_write(_run_all)
+            return counts
+        except Exception as exc:
+            logger.error(
+                "graph_store.write_batch_error",
+                nodes=counts["nodes"],
+                relationships=counts["relationships"],
+                error=str(exc),
+            )
+            return {"nodes": 0, "relationships": 0}
+
     # ── Stats ────────────────────────────────────────────────────────
 
     async def get_stats(self, tenant_id: int) -> dict[str, Any]:
         """Return graph statistics for a tenant."""
         if self._in_memory:
-            counts: dict[str, int] = defaultdict(int)
-            for node in self._mem_nodes.values():
-                if node.get("tenant_id") == tenant_id:
-                    counts[node.get("_label", "unknown")] += 1
             return {
                 "mode": "in_memory",
-                "node_counts": dict(counts),
-                "edge_count": len([
-                    e for e in self._mem_edges
-                    if any(
-                        self._mem_nodes.get(e["source"], {}).get("tenant_id") == tenant_id
-                        for _ in [None]
-                    )
-                ]),
+                "node_counts": self._mem.count_by_label(tenant_id),
+                "edge_count": self._mem.count_edges_from_tenant(tenant_id),
             }
 
         cfg = get_config().neo4j
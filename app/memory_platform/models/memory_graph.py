@@ -0,0 +1,356 @@
+"""Indexed in-memory graph engine – GraphStore fallback when Neo4j is unavailable.
+
+Keeps nodes in a dict keyed by ``"{label}:{key}"`` plus:
+
+- secondary indexes per label and per (label, property) for ``tenant_id``,
+  ``member_id`` and ``fact_type``
+- outgoing/incoming adjacency maps for relationships (MERGE semantics)
+- a per-tenant inverted token index over Fact ``subject``/``predicate``/``value``
+  with BM25 scoring for full-text search
+- optional JSON snapshot persistence (gzip) to survive restarts
+
+All operations are synchronous and O(result size) rather than O(graph size);
+the async GraphStore wraps them directly since nothing here blocks.
+"""
+
+from __future__ import annotations
+
+import gzip
+import heapq
+import json
+import math
+import os
+import re
+from collections import defaultdict
+from typing import Any, Iterable
+
+import structlog
+
+logger = structlog.get_logger()
+
+INDEXED_PROPERTIES: tuple[str, ...] = ("tenant_id", "member_id", "fact_type")
+FULLTEXT_LABEL = "Fact"
+FULLTEXT_FIELDS: tuple[str, ...] = ("subject", "predicate", "value")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# BM25 parameters (Lucene defaults)
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+_SNAPSHOT_VERSION = 1
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-case word tokens used for both indexing and querying."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _hashable(value: Any) -> Any:
+    """Index key for a property value (unhashable values are not indexed)."""
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return value
+
+
+class InMemoryGraph:
+    """Property graph with secondary, adjacency and full-text indexes."""
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.nodes: dict[str, dict[str, Any]] = {}
+        # label -> ordered set of node keys (dict used for insertion order)
+        self._by_label: dict[str, dict[str, None]] = defaultdict(dict)
+        # (label, property) -> value -> ordered set of node keys
+        self._by_prop: dict[tuple[str, str], dict[Any, dict[str, None]]] = defaultdict(lambda: defaultdict(dict))
+        # node key -> {(rel_type, target key): properties}
+        self._out: dict[str, dict[tuple[str, str], dict[str, Any]]] = defaultdict(dict)
+        # node key -> {(rel_type, source key): None}
+        self._in: dict[str, dict[tuple[str, str], None]] = defaultdict(dict)
+        self._edge_count = 0
+        # Full-text: tenant -> token -> {node key: term frequency}
+        self._postings: dict[Any, dict[str, dict[str, int]]] = defaultdict(lambda: defaultdict(dict))
+        # node key -> (tenant, term frequencies, document length)
+        self._doc_tokens: dict[str, tuple[Any, dict[str, int], int]] = {}
+        self._doc_len_total: dict[Any, int] = defaultdict(int)
+
+    # ── Nodes ────────────────────────────────────────────────────────
+
+    @staticmethod
+    def node_key(label: str, key_value: Any) -> str:
+        return f"{label}:{key_value}"
+
+    def upsert_node(self, label: str, key_field: str, key_value: Any, properties: dict[str, Any]) -> dict[str, Any]:
+        node_key = self.node_key(label, key_value)
+        node = self.nodes.get(node_key)
+        if node is not None:
+            self._unindex(node_key, node)
+        else:
+            node = {}
+            self.nodes[node_key] = node
+        node.update(properties)
+        node[key_field] = key_value
+        node["_label"] = label
+        self._index(node_key, node)
+        return node
+
+    def get_node(self, label: str, key_value: Any) -> dict[str, Any] | None:
+        return self.nodes.get(self.node_key(label, key_value))
+
+    def delete_node(self, label: str, key_value: Any) -> bool:
+        node_key = self.node_key(label, key_value)
+        node = self.nodes.pop(node_key, None)
+        if node is None:
+            return False
+        self._unindex(node_key, node)
+        for rel_type, target in self._out.pop(node_key, {}):
+            self._in.get(target, {}).pop((rel_type, node_key), None)
+            self._edge_count -= 1
+        for rel_type, source in self._in.pop(node_key, {}):
+            if self._out.get(source, {}).pop((rel_type, node_key), None) is not None:
+                self._edge_count -= 1
+        return True
+
+    def query_nodes(self, label: str, filters: dict[str, Any], limit: int = 100) -> list[dict[str, Any]]:
+        candidates = self._candidates(label, filters)
+        indexed = {k for k in filters if k in INDEXED_PROPERTIES and _hashable(filters[k]) is not None}
+        residual = {k: v for k, v in filters.items() if k not in indexed}
+        results: list[dict[str, Any]] = []
+        for node_key in candidates:
+            node = self.nodes[node_key]
+            if all(node.get(k) == v for k, v in residual.items()):
+                results.append(node)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def member_facts(
+        self,
+        tenant_id: Any,
+        member_id: Any,
+        fact_types: list[str] | None = None,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Facts of one member, ordered like the Neo4j query (confidence, updated_at desc)."""
+        keys = self._candidates(FULLTEXT_LABEL, {"tenant_id": tenant_id, "member_id": member_id})
+        facts = [self.nodes[k] for k in keys]
+        if fact_types:
+            wanted = set(fact_types)
+            facts = [f for f in facts if f.get("fact_type") in wanted]
+        facts.sort(
+            key=lambda f: (f.get("confidence") or 0, str(f.get("updated_at") or "")),
+            reverse=True,
+        )
+        return facts[:limit]
+
+    def count_by_label(self, tenant_id: Any) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for (label, prop), values in self._by_prop.items():
+            if prop != "tenant_id":
+                continue
+            n = len(values.get(tenant_id, ()))
+            if n:
+                counts[label] = n
+        return counts
+
+    def count_edges_from_tenant(self, tenant_id: Any) -> int:
+        total = 0
+        for (_label, prop), values in self._by_prop.items():
+            if prop != "tenant_id":
+                continue
+            for node_key in values.get(tenant_id, ()):
+                total += len(self._out.get(node_key, ()))
+        return total
+
+    # ── Relationships ────────────────────────────────────────────────
+
+    def create_relationship(
+        self,
+        source_key: str,
+        target_key: str,
+        rel_type: str,
+        properties: dict[str, Any] | None = None,
+    ) -> bool:
+        """MERGE an edge between existing nodes; repeated calls update its properties."""
+        if source_key not in self.nodes or target_key not in self.nodes:
+            return False
+        edges = self._out[source_key]
+        existing = edges.get((rel_type, target_key))
+        if existing is None:
+            edges[(rel_type, target_key)] = dict(properties or {})
+            self._in[target_key][(rel_type, source_key)] = None
+            self._edge_count += 1
+        elif properties:
+            existing.update(properties)
+        return True
+
+    def neighbors(
+        self,
+        node_key: str,
+        rel_type: str | None = None,
+        direction: str = "out",
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        """Adjacent nodes with the connecting relationship under ``_rel``."""
+        results: list[dict[str, Any]] = []
+        if direction in ("out", "both"):
+            for (rtype, target), props in self._out.get(node_key, {}).items():
+                if rel_type and rtype != rel_type:
+                    continue
+                node = self.nodes.get(target)
+                if node is not None:
+                    results.append({**node, "_rel": {"type": rtype, "direction": "out", **props}})
+                    if len(results) >= limit:
+                        return results
+        if direction in ("in", "both"):
+            for rtype, source in self._in.get(node_key, {}):
+                if rel_type and rtype != rel_type:
+                    continue
+                node = self.nodes.get(source)
+                if node is not None:
+                    props = self._out.get(source, {}).get((rtype, node_key), {})
+                    results.append({**node, "_rel": {"type": rtype, "direction": "in", **props}})
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    @property
+    def edge_count(self) -> int:
+        return self._edge_count
+
+    # ── Full-text (BM25) ─────────────────────────────────────────────
+
+    def fulltext_search(self, tenant_id: Any, query_text: str, limit: int = 10) -> list[dict[str, Any]]:
+        terms = set(tokenize(query_text))
+        postings = self._postings.get(tenant_id)
+        if not terms or not postings:
+            return []
+        n_docs = len(self._by_prop[(FULLTEXT_LABEL, "tenant_id")].get(tenant_id, ()))
+        if not n_docs:
+            return []
+        avg_len = self._doc_len_total[tenant_id] / n_docs or 1.0
+
+        scores: dict[str, float] = defaultdict(float)
+        doc_tokens = self._doc_tokens
+        len_norm = _BM25_K1 * _BM25_B / avg_len
+        base_norm = _BM25_K1 * (1 - _BM25_B)
+        for term in terms:
+            docs = postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            weight = idf * (_BM25_K1 + 1)
+            for node_key, tf in docs.items():
+                norm = tf + base_norm + len_norm * doc_tokens[node_key][2]
+                scores[node_key] += weight * tf / norm
+
+        ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [{**self.nodes[k], "_score": round(score, 6)} for k, score in ranked]
+
+    # ── Snapshot persistence ─────────────────────────────────────────
+
+    def save_snapshot(self, path: str) -> int:
+        """Write nodes and edges as gzipped JSON (atomic replace). Returns node count."""
+        payload = {
+            "version": _SNAPSHOT_VERSION,
+            "nodes": self.nodes,
+            "edges": [
+                [source, rel_type, target, props]
+                for source, edges in self._out.items()
+                for (rel_type, target), props in edges.items()
+            ],
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as fh:
+            json.dump(payload, fh, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        return len(self.nodes)
+
+    def load_snapshot(self, path: str) -> int:
+        """Replace the graph with a snapshot written by save_snapshot. Returns node count."""
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            payload = json.load(fh)
+        if payload.get("version") != _SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported graph snapshot version: {payload.get('version')}")
+        self.clear()
+        for node_key, node in payload.get("nodes", {}).items():
+            self.nodes[node_key] = node
+            self._index(node_key, node)
+        for source, rel_type, target, props in payload.get("edges", []):
+            self.create_relationship(source, target, rel_type, props)
+        return len(self.nodes)
+
+    # ── Index maintenance ────────────────────────────────────────────
+
+    def _candidates(self, label: str, filters: dict[str, Any]) -> Iterable[str]:
+        """Smallest index posting list that satisfies label + indexed filters.
+
+        Property indexes are per label, so the label index is only used when
+        no indexed property is filtered on.
+        """
+        postings: list[dict[str, None]] = []
+        for prop in INDEXED_PROPERTIES:
+            if prop not in filters:
+                continue
+            value = _hashable(filters[prop])
+            if value is None:
+                continue
+            postings.append(self._by_prop[(label, prop)].get(value, {}))
+        if not postings:
+            return iter(list(self._by_label.get(label, {})))
+        postings.sort(key=len)
+        best, others = postings[0], postings[1:]
+        if not others:
+            return iter(list(best))
+        # Lazy so callers with a limit stop early
+        return (k for k in list(best) if all(k in o for o in others))
+
+    def _index(self, node_key: str, node: dict[str, Any]) -> None:
+        label = node.get("_label", "")
+        self._by_label[label][node_key] = None
+        for prop in INDEXED_PROPERTIES:
+            if prop in node:
+                value = _hashable(node[prop])
+                if value is not None:
+                    self._by_prop[(label, prop)][value][node_key] = None
+        if label == FULLTEXT_LABEL:
+            tenant_id = node.get("tenant_id")
+            text = " ".join(str(node.get(f) or "") for f in FULLTEXT_FIELDS)
+            tf: dict[str, int] = defaultdict(int)
+            for token in tokenize(text):
+                tf[token] += 1
+            postings = self._postings[tenant_id]
+            for token, count in tf.items():
+                postings[token][node_key] = count
+            doc_len = sum(tf.values())
+            self._doc_tokens[node_key] = (tenant_id, dict(tf), doc_len)
+            self._doc_len_total[tenant_id] += doc_len
+
+    def _unindex(self, node_key: str, node: dict[str, Any]) -> None:
+        label = node.get("_label", "")
+        self._by_label.get(label, {}).pop(node_key, None)
+        for prop in INDEXED_PROPERTIES:
+            if prop in node:
+                value = _hashable(node[prop])
+                bucket = self._by_prop[(label, prop)].get(value)
+                if bucket is not None:
+                    bucket.pop(node_key, None)
+                    if not bucket:
+                        del self._by_prop[(label, prop)][value]
+        doc = self._doc_tokens.pop(node_key, None)
+        if doc is not None:
+            tenant_id, tf, doc_len = doc
+            postings = self._postings.get(tenant_id, {})
+            for token in tf:
+                docs = postings.get(token)
+                if docs is not None:
+                    docs.pop(node_key, None)
+                    if not docs:
+                        del postings[token]
+            self._doc_len_total[tenant_id] -= doc_len
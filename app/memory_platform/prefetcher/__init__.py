@@ -14,33 +14,116 @@ The Pre-fetcher runs as a middleware in the message processing pipeline:
 
 This implements the "Proactive Context Surfacing" pattern from the
 Gold-Standard analysis.
+
+Cached contexts are keyed by ``(tenant_id, member_id)`` and held in an LRU
+bounded by an approximate memory budget. Concurrent requests for the same
+key share one load (single-flight). The cache subscribes to
+``memory.written`` on the memory event bus and drops the affected members
+(or the whole tenant, for knowledge writes) as soon as new facts land.
+The webhook pipeline calls ``start_prefetch`` when a message arrives, so
+the load overlaps with intent classification. Started tasks are tracked;
+the pipeline discards its task once the turn is over and ``aclose`` cancels
+whatever is left at shutdown. A cancelled shared load counts as a miss for
+the turns waiting on it, which then load for themselves.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
+import os
 import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any
 
 import structlog
 
+from app.memory_platform.event_bus import get_event_bus
+from app.memory_platform.models import MemoryEvent
+
 logger = structlog.get_logger()
 
+CacheKey = tuple[int, str]
+
+
+@dataclass
+class _CacheEntry:
+    context: dict[str, Any]
+    size: int
+    expires_at: float
+
 
 class ContextPrefetcher:
     """Proactively fetches and assembles context for conversations."""
 
-    def __init__(self) -> None:
-        self._cache: dict[str, dict[str, Any]] = {}  # member_id -> cached context
-        self._cache_ttl: int = 300  # 5 minutes
+    def __init__(
+        self,
+        ttl_seconds: float = 300,
+        memory_budget_bytes: int | None = None,
+    ) -> None:
+        self._cache: OrderedDict[CacheKey, _CacheEntry] = OrderedDict()
+        self._cache_ttl = ttl_seconds
+        self._memory_budget = memory_budget_bytes or int(
+            os.getenv("PREFETCH_CACHE_MAX_BYTES", str(32 * 1024 * 1024))
+        )
+        self._cache_bytes: int = 0
+        self._inflight: dict[CacheKey, asyncio.Future[dict[str, Any]]] = {}
+        self._tasks: set[asyncio.Task[dict[str, Any]]] = set()
+        self._invalidation_seq: int = 0
+        self._event_bus = get_event_bus()
         self._initialised: bool = False
+        self.hits = 0
+        self.misses = 0
 
     async def initialise(self) -> None:
-        """Initialise the pre-fetcher."""
+        """Initialise the pre-fetcher and subscribe to memory writes."""
         if self._initialised:
             return
+        self._event_bus.subscribe("memory.written", self._handle_memory_written)
         self._initialised = True
         logger.info("prefetcher.initialised")
 
+    def start_prefetch(
+        self,
+        tenant_id: int,
+        member_id: str | None,
+        query: str,
+        conversation_id: str | None = None,
+    ) -> asyncio.Task[dict[str, Any]]:
+        """Start loading context in the background and return the task.
+
+        Called as soon as a message arrives so retrieval overlaps with the
+        rest of the pipeline; the result also warms the cache.
+        """
+
+        async def _run() -> dict[str, Any]:
+            await self.initialise()
+            return await self.prefetch_context(tenant_id, member_id, query, conversation_id)
+
+        task = asyncio.create_task(_run())
+        self._tasks.add(task)
+        task.add_done_callback(self._prefetch_done)
+        return task
+
+    def _prefetch_done(self, task: asyncio.Task[dict[str, Any]]) -> None:
+        self._tasks.discard(task)
+        # Nobody may await a discarded or timed-out prefetch; retrieve its error here
+        if not task.cancelled() and task.exception() is not None:
+            logger.info("prefetcher.prefetch_failed", error=str(task.exception()))
+
+    def discard_prefetch(self, task: asyncio.Task[dict[str, Any]] | None) -> None:
+        """Cancel a prefetch whose turn no longer needs it."""
+        if task is not None and not task.done():
+            task.cancel()
+
+    async def aclose(self) -> None:
+        """Cancel and await all prefetches still running."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
     async def prefetch_context(
         self,
         tenant_id: int,
@@ -53,6 +136,56 @@ class ContextPrefetcher:
         Returns a context dict that can be injected into the message
         metadata for use by the Orchestrator.
         """
+        if not member_id:
+            return await self._load_context(tenant_id, None, query)
+
+        start = time.time()
+        key = (tenant_id, str(member_id))
+        cached = self._get_cached(key)
+        if cached is not None:
+            context = dict(cached)
+            context["prefetch_time_ms"] = round((time.time() - start) * 1000, 1)
+            context["cache_hit"] = True
+            return context
+
+        # Single-flight: concurrent turns of the same member share one load
+        while (inflight := self._inflight.get(key)) is not None:
+            try:
+                return dict(await asyncio.shield(inflight))
+            except asyncio.CancelledError:
+                if _cancelling():
+                    raise
+                # The owning turn was cancelled: a miss, load for this turn instead
+                logger.debug("prefetcher.shared_load_cancelled", tenant_id=tenant_id)
+
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        seq = self._invalidation_seq
+        try:
+            context = await self._load_context(tenant_id, key[1], query)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; don't warn about it being unretrieved
+            raise
+        else:
+            # A write that landed while loading may not be reflected; don't cache then
+            if seq == self._invalidation_seq:
+                self._set_cached(key, context)
+            future.set_result(context)
+        finally:
+            self._inflight.pop(key, None)
+        return dict(context)
+
+    async def _load_context(
+        self,
+        tenant_id: int,
+        member_id: str | None,
+        query: str,
+    ) -> dict[str, Any]:
+        """Load member facts and knowledge from the retrieval service."""
         start = time.time()
         context: dict[str, Any] = {
             "knowledge_context": "",
@@ -62,15 +195,6 @@ class ContextPrefetcher:
             "prefetch_time_ms": 0,
         }
 
-        # Check cache first
-        if member_id:
-            cached = self._get_cached(member_id)
-            if cached:
-                context.update(cached)
-                context["prefetch_time_ms"] = round((time.time() - start) * 1000, 1)
-                context["cache_hit"] = True
-                return context
-
         try:
             from app.memory_platform.retrieval import get_retrieval_service
             service = get_retrieval_service()
@@ -126,12 +250,9 @@ class ContextPrefetcher:
         context["prefetch_time_ms"] = elapsed
         context["cache_hit"] = False
 
-        # Cache the result
-        if member_id:
-            self._set_cached(member_id, context)
-
         logger.info(
             "prefetcher.completed",
+            tenant_id=tenant_id,
             member_id=member_id,
             facts=len(context.get("member_facts", [])),
             has_knowledge=bool(context.get("knowledge_context")),
@@ -168,36 +289,83 @@ class ContextPrefetcher:
 
     # ── Cache Management ─────────────────────────────────────────────
 
-    def _get_cached(self, member_id: str) -> dict[str, Any] | None:
-        """Get cached context for a member."""
-        entry = self._cache.get(member_id)
-        if not entry:
+    def _get_cached(self, key: CacheKey) -> dict[str, Any] | None:
+        """Get cached context for a (tenant, member) key."""
+        entry = self._cache.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._evict(key)
+            self.misses += 1
             return None
-        if time.time() - entry.get("_cached_at", 0) > self._cache_ttl:
-            del self._cache[member_id]
-            return None
-        return entry
-
-    def _set_cached(self, member_id: str, context: dict[str, Any]) -> None:
-        """Cache context for a member."""
-        context["_cached_at"] = time.time()
-        self._cache[member_id] = context
-
-        # Evict old entries if cache is too large
-        if len(self._cache) > 1000:
-            oldest = sorted(
-                self._cache.items(),
-                key=lambda x: x[1].get("_cached_at", 0),
-            )
-            for key, _ in oldest[:100]:
-                del self._cache[key]
-
-    def invalidate_cache(self, member_id: str | None = None) -> None:
-        """Invalidate cached context."""
-        if member_id:
-            self._cache.pop(member_id, None)
-        else:
+        self._cache.move_to_end(key)
+        self.hits += 1
+        return entry.context
+
+    def _set_cached(self, key: CacheKey, context: dict[str, Any]) -> None:
+        """Cache context for a key, evicting least recently used entries over budget."""
+        size = len(json.dumps(context, default=str))
+        if size > self._memory_budget:
+            return
+        self._evict(key)
+        self._cache[key] = _CacheEntry(context, size, time.monotonic() + self._cache_ttl)
+        self._cache_bytes += size
+        while self._cache_bytes > self._memory_budget:
+            self._evict(next(iter(self._cache)))
+
+    def _evict(self, key: CacheKey) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._cache_bytes -= entry.size
+
+    def invalidate_cache(
+        self,
+        tenant_id: int | None = None,
+        member_id: str | None = None,
+    ) -> int:
+        """Invalidate cached context for a member, a whole tenant, or everything."""
+        self._invalidation_seq += 1
+        if tenant_id is None:
+            count = len(self._cache)
             self._cache.clear()
+            self._cache_bytes = 0
+            return count
+        if member_id is not None:
+            doomed = [(tenant_id, str(member_id))]
+        else:
+            doomed = [key for key in self._cache if key[0] == tenant_id]
+        count = 0
+        for key in doomed:
+            if key in self._cache:
+                self._evict(key)
+                count += 1
+        return count
+
+    async def _handle_memory_written(self, event: MemoryEvent) -> None:
+        """Drop cached contexts made stale by a memory write."""
+        member_ids = event.metadata.get("member_ids") or []
+        if member_ids:
+            for member_id in member_ids:
+                self.invalidate_cache(event.tenant_id, member_id)
+        else:
+            # Knowledge writes can change any member's knowledge_context
+            self.invalidate_cache(event.tenant_id)
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._cache),
+            "bytes": self._cache_bytes,
+            "budget_bytes": self._memory_budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "inflight": len(self._inflight),
+        }
+
+
+def _cancelling() -> bool:
+    """Whether the current task itself is being cancelled (not just something it awaits)."""
+    task = asyncio.current_task()
+    return task is not None and task.cancelling() > 0
 
 
 # ── Singleton ────────────────────────────────────────────────────────
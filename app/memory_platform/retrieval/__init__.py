@@ -13,8 +13,9 @@ and the query methods in ``app/memory/librarian_v2.py``.
 
 from __future__ import annotations
 
+import asyncio
 import time
-from typing import Any
+from typing import Any, Awaitable
 
 import structlog
 
@@ -30,6 +31,9 @@ from app.memory_platform.models.vector_store import get_vector_store
 
 logger = structlog.get_logger()
 
+# Structured facts returned per member query (shared graph fetch)
+MEMBER_FACTS_LIMIT = 50
+
 
 class RetrievalService:
     """Unified retrieval service with hybrid search capabilities."""
@@ -71,54 +75,87 @@ class RetrievalService:
         1. Vector search for semantic similarity
         2. Graph search for structured facts
         3. Full-text search for keyword matching
-        Results are merged, deduplicated, and optionally reranked.
+        The sources run concurrently, each under its own deadline; a source
+        that times out or fails contributes no results instead of stalling
+        the reply. Results are merged, deduplicated, and optionally reranked.
         """
         start_time = time.time()
         self._query_count += 1
 
         cfg = get_config().retrieval
-        all_results: list[SearchResult] = []
 
-        # 1. Vector Search
+        # 1. Run all independent sources concurrently. For member queries the
+        #    graph source is the member-fact fetch, shared by graph results
+        #    and the structured fact list.
+        load_member_facts = bool(query.member_id and query.include_facts)
+        sources: dict[str, tuple[Awaitable[Any], int]] = {}
         if query.search_type in ("hybrid", "vector"):
-            vector_results = await self._vector_search(query)
-            for r in vector_results:
-                r.score *= cfg.vector_weight
-            all_results.extend(vector_results)
+            sources["vector"] = (self._vector_search(query), cfg.vector_timeout_ms)
+        if load_member_facts:
+            sources["graph"] = (self._load_member_facts(query), cfg.graph_timeout_ms)
+        elif query.search_type in ("hybrid", "graph") and query.include_facts:
+            sources["graph"] = (self._graph_search(query), cfg.graph_timeout_ms)
+        if query.search_type in ("hybrid", "keyword"):
+            sources["keyword"] = (self._keyword_search(query), cfg.keyword_timeout_ms)
+
+        outcomes = await asyncio.gather(*(
+            self._run_source(name, coro, timeout_ms)
+            for name, (coro, timeout_ms) in sources.items()
+        ))
+        source_results: dict[str, list[Any]] = {}
+        source_latency: dict[str, float] = {}
+        degraded: list[str] = []
+        for name, (results, elapsed_ms, ok) in zip(sources, outcomes):
+            source_results[name] = results
+            source_latency[name] = elapsed_ms
+            if not ok:
+                degraded.append(name)
+
+        raw_member_facts: list[dict[str, Any]] = source_results.get("graph", []) if load_member_facts else []
+
+        all_results: list[SearchResult] = []
+
+        # 2. Vector Search
+        for r in source_results.get("vector", []):
+            r.score *= cfg.vector_weight
+            all_results.append(r)
 
-        # 2. Graph Search (facts for specific member)
+        # 3. Graph Search (facts for specific member)
         if query.search_type in ("hybrid", "graph") and query.include_facts:
-            graph_results = await self._graph_search(query)
+            if load_member_facts:
+                graph_results = await self._graph_search(query, member_facts=raw_member_facts)
+            else:
+                graph_results = source_results.get("graph", [])
             for r in graph_results:
                 r.score *= cfg.graph_weight
-            all_results.extend(graph_results)
+                all_results.append(r)
 
-        # 3. Keyword Search (full-text on graph)
-        if query.search_type in ("hybrid", "keyword"):
-            keyword_results = await self._keyword_search(query)
-            for r in keyword_results:
-                r.score *= cfg.keyword_weight
-            all_results.extend(keyword_results)
+        # 4. Keyword Search (full-text on graph)
+        for r in source_results.get("keyword", []):
+            r.score *= cfg.keyword_weight
+            all_results.append(r)
 
-        # 4. Deduplicate by content similarity
+        # 5. Deduplicate by content similarity
         deduped = self._deduplicate(all_results)
 
-        # 5. Sort by score
+        # 6. Sort by score
         deduped.sort(key=lambda r: r.score, reverse=True)
 
-        # 6. Rerank top results
+        # 7. Rerank top results
         if self._reranker and cfg.enable_reranking and deduped:
+            rerank_start = time.perf_counter()
             deduped = self._rerank(query.query, deduped, cfg.rerank_top_k)
+            source_latency["rerank"] = round((time.perf_counter() - rerank_start) * 1000, 1)
 
-        # 7. Limit results
+        # 8. Limit results
         final_results = deduped[:query.top_k]
 
-        # 8. Get member-specific facts
+        # 9. Member-specific facts (from the shared fetch)
         facts: list[ExtractedFact] = []
-        if query.member_id and query.include_facts:
-            facts = await self._get_member_facts(query)
+        if load_member_facts:
+            facts = await self._get_member_facts(query, raw_facts=raw_member_facts)
 
-        # 9. Build context summary
+        # 10. Build context summary
         context_summary = self._build_context_summary(final_results, facts)
 
         elapsed = (time.time() - start_time) * 1000
@@ -129,6 +166,8 @@ class RetrievalService:
             results=len(final_results),
             facts=len(facts),
             time_ms=round(elapsed, 1),
+            source_latency_ms=source_latency,
+            degraded_sources=degraded or None,
         )
 
         return RetrievalResponse(
@@ -138,64 +177,106 @@ class RetrievalService:
             context_summary=context_summary,
             total_results=len(final_results),
             search_time_ms=round(elapsed, 1),
+            source_latency_ms=source_latency,
+            degraded_sources=degraded,
         )
 
+    async def _run_source(
+        self,
+        name: str,
+        coro: Awaitable[list[Any]],
+        timeout_ms: int,
+    ) -> tuple[list[Any], float, bool]:
+        """Await one search source under its deadline.
+
+        Returns ``(results, elapsed_ms, ok)``; on timeout or error the source
+        yields no results and ``ok`` is False.
+        """
+        started = time.perf_counter()
+        try:
+            results = await asyncio.wait_for(coro, timeout=timeout_ms / 1000 if timeout_ms > 0 else None)
+            ok = True
+        except asyncio.TimeoutError:
+            logger.warning("retrieval.source_timeout", source=name, timeout_ms=timeout_ms)
+            results, ok = [], False
+        except Exception as exc:
+            logger.warning("retrieval.source_error", source=name, error=str(exc))
+            results, ok = [], False
+        return results, round((time.perf_counter() - started) * 1000, 1), ok
+
     # ── Search Strategies ────────────────────────────────────────────
 
     async def _vector_search(self, query: SearchQuery) -> list[SearchResult]:
-        """Semantic vector search across knowledge and facts."""
+        """Semantic vector search across knowledge and facts (both namespaces concurrently)."""
         results: list[SearchResult] = []
 
-        # Search knowledge chunks
-        if query.include_knowledge:
-            knowledge_hits = await self._vector.search(
+        async def _no_hits() -> list[dict[str, Any]]:
+            return []
+
+        knowledge_hits, fact_hits = await asyncio.gather(
+            self._vector.search(
                 tenant_id=query.tenant_id,
                 query=query.query,
                 top_k=query.top_k,
                 namespace="knowledge",
                 filters=query.filters if query.filters else None,
-            )
-            for hit in knowledge_hits:
-                results.append(SearchResult(
-                    content=hit.get("content", ""),
-                    score=hit.get("score", 0.0),
-                    result_type="knowledge",
-                    source=hit.get("metadata", {}).get("document_id", ""),
-                    metadata=hit.get("metadata", {}),
-                ))
-
-        # Search facts
-        if query.include_facts:
-            fact_hits = await self._vector.search(
+            ) if query.include_knowledge else _no_hits(),
+            self._vector.search(
                 tenant_id=query.tenant_id,
                 query=query.query,
                 top_k=query.top_k,
                 namespace="facts",
                 filters={"member_id": query.member_id} if query.member_id else None,
-            )
-            for hit in fact_hits:
-                results.append(SearchResult(
-                    content=hit.get("content", ""),
-                    score=hit.get("score", 0.0),
-                    result_type="fact",
-                    source="vector_search",
-                    metadata=hit.get("metadata", {}),
-                ))
+            ) if query.include_facts else _no_hits(),
+        )
+
+        # Knowledge chunks
+        for hit in knowledge_hits:
+            results.append(SearchResult(
+                content=hit.get("content", ""),
+                score=hit.get("score", 0.0),
+                result_type="knowledge",
+                source=hit.get("metadata", {}).get("document_id", ""),
+                metadata=hit.get("metadata", {}),
+            ))
+
+        # Facts
+        for hit in fact_hits:
+            results.append(SearchResult(
+                content=hit.get("content", ""),
+                score=hit.get("score", 0.0),
+                result_type="fact",
+                source="vector_search",
+                metadata=hit.get("metadata", {}),
+            ))
 
         return results
 
-    async def _graph_search(self, query: SearchQuery) -> list[SearchResult]:
-        """Structured search in the knowledge graph."""
+    async def _load_member_facts(self, query: SearchQuery) -> list[dict[str, Any]]:
+        """Fetch the raw member facts once for graph search and the fact list."""
+        return await self._graph.get_member_facts(
+            tenant_id=query.tenant_id,
+            member_id=query.member_id,
+            limit=max(MEMBER_FACTS_LIMIT, query.top_k),
+        )
+
+    async def _graph_search(
+        self,
+        query: SearchQuery,
+        member_facts: list[dict[str, Any]] | None = None,
+    ) -> list[SearchResult]:
+        """Structured search in the knowledge graph.
+
+        ``member_facts`` may carry an already loaded member-fact list
+        (see ``_load_member_facts``) to avoid a second graph round trip.
+        """
         results: list[SearchResult] = []
 
         if query.member_id:
-            # Get facts for specific member
-            facts = await self._graph.get_member_facts(
-                tenant_id=query.tenant_id,
-                member_id=query.member_id,
-                limit=query.top_k,
-            )
-            for fact in facts:
+            # Get facts for specific member (sorted by confidence)
+            if member_facts is None:
+                member_facts = await self._load_member_facts(query)
+            for fact in member_facts[:query.top_k]:
                 content = f"{fact.get('subject', '')} {fact.get('predicate', '')} {fact.get('value', '')}"
                 results.append(SearchResult(
                     content=content,
@@ -253,21 +334,22 @@ class RetrievalService:
 
         return results
 
-    async def _get_member_facts(self, query: SearchQuery) -> list[ExtractedFact]:
-        """Get all structured facts for a member."""
+    async def _get_member_facts(
+        self,
+        query: SearchQuery,
+        raw_facts: list[dict[str, Any]] | None = None,
+    ) -> list[ExtractedFact]:
+        """Get all structured facts for a member (reuses ``raw_facts`` if given)."""
         if not query.member_id:
             return []
 
         from app.memory_platform.models import FactType
 
-        raw_facts = await self._graph.get_member_facts(
-            tenant_id=query.tenant_id,
-            member_id=query.member_id,
-            limit=50,
-        )
+        if raw_facts is None:
+            raw_facts = await self._load_member_facts(query)
 
         facts: list[ExtractedFact] = []
-        for f in raw_facts:
+        for f in raw_facts[:MEMBER_FACTS_LIMIT]:
             try:
                 fact_type_str = f.get("fact_type", "attribute")
                 try:
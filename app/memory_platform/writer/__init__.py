@@ -2,7 +2,9 @@
 
 Consumes EnrichmentResults from the event bus and writes the enriched
 entities, facts and relationships to both the Knowledge Graph (Neo4j)
-and the Vector Store (Qdrant/ChromaDB) in a coordinated manner.
+and the Vector Store (Qdrant/ChromaDB) in a coordinated manner. Each
+event is accumulated into one GraphWriteBatch (a single UNWIND
+transaction) that is flushed together with the vector-store upsert.
 
 This is the ONLY service with write access to the persistent stores,
 ensuring data consistency and a single point of control for all mutations.
@@ -10,6 +12,7 @@ ensuring data consistency and a single point of control for all mutations.
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 from typing import Any
 
@@ -24,7 +27,7 @@ from app.memory_platform.models import (
     ExtractedRelationship,
     MemoryEvent,
 )
-from app.memory_platform.models.graph_store import get_graph_store
+from app.memory_platform.models.graph_store import GraphWriteBatch, get_graph_store
 from app.memory_platform.models.vector_store import get_vector_store
 
 logger = structlog.get_logger()
@@ -67,23 +70,21 @@ class MemoryWriterService:
         )
 
         now = datetime.now(timezone.utc).isoformat()
+        tenant_key = str(event.tenant_id)
+        batch = GraphWriteBatch()
 
         # 1. Ensure tenant node exists
-        await self._graph.upsert_node(
-            label="Tenant",
-            key_field="tenant_id",
-            key_value=str(event.tenant_id),
-            properties={"tenant_id": event.tenant_id, "updated_at": now},
+        batch.add_node(
+            "Tenant", "tenant_id", tenant_key,
+            {"tenant_id": event.tenant_id, "updated_at": now},
         )
 
-        # 2. Write entities to graph
+        # 2. Entities (linked to tenant)
         entity_ids: dict[str, str] = {}
         for entity in event.entities:
-            await self._graph.upsert_node(
-                label="Entity",
-                key_field="entity_id",
-                key_value=entity.entity_id,
-                properties={
+            batch.add_node(
+                "Entity", "entity_id", entity.entity_id,
+                {
                     "entity_id": entity.entity_id,
                     "tenant_id": event.tenant_id,
                     "name": entity.name,
@@ -94,30 +95,21 @@ class MemoryWriterService:
                 },
             )
             entity_ids[entity.name.lower()] = entity.entity_id
-
-            # Link entity to tenant
-            await self._graph.create_relationship(
-                source_label="Entity",
-                source_key="entity_id",
-                source_value=entity.entity_id,
-                target_label="Tenant",
-                target_key="tenant_id",
-                target_value=str(event.tenant_id),
-                rel_type="BELONGS_TO",
+            batch.add_relationship(
+                "Entity", "entity_id", entity.entity_id,
+                "Tenant", "tenant_id", tenant_key,
+                "BELONGS_TO",
             )
 
-        # 3. Write facts to graph and vector store
+        # 3. Facts (graph + vector store payload)
         fact_texts: list[str] = []
         fact_ids: list[str] = []
         fact_metadatas: list[dict[str, Any]] = []
 
         for fact in event.facts:
-            # Write fact to graph
-            await self._graph.upsert_node(
-                label="Fact",
-                key_field="fact_id",
-                key_value=fact.fact_id,
-                properties={
+            batch.add_node(
+                "Fact", "fact_id", fact.fact_id,
+                {
                     "fact_id": fact.fact_id,
                     "tenant_id": event.tenant_id,
                     "fact_type": fact.fact_type.value,
@@ -133,43 +125,29 @@ class MemoryWriterService:
                     "decay_score": 1.0,
                 },
             )
-
-            # Link fact to tenant
-            await self._graph.create_relationship(
-                source_label="Fact",
-                source_key="fact_id",
-                source_value=fact.fact_id,
-                target_label="Tenant",
-                target_key="tenant_id",
-                target_value=str(event.tenant_id),
-                rel_type="BELONGS_TO",
+            batch.add_relationship(
+                "Fact", "fact_id", fact.fact_id,
+                "Tenant", "tenant_id", tenant_key,
+                "BELONGS_TO",
             )
 
             # Link fact to member if applicable
             if fact.member_id:
-                await self._graph.upsert_node(
-                    label="Member",
-                    key_field="member_id",
-                    key_value=fact.member_id,
-                    properties={
+                batch.add_node(
+                    "Member", "member_id", fact.member_id,
+                    {
                         "member_id": fact.member_id,
                         "tenant_id": event.tenant_id,
                         "updated_at": now,
                     },
                 )
-                await self._graph.create_relationship(
-                    source_label="Fact",
-                    source_key="fact_id",
-                    source_value=fact.fact_id,
-                    target_label="Member",
-                    target_key="member_id",
-                    target_value=fact.member_id,
-                    rel_type="APPLIES_TO",
+                batch.add_relationship(
+                    "Fact", "fact_id", fact.fact_id,
+                    "Member", "member_id", fact.member_id,
+                    "APPLIES_TO",
                 )
 
-            # Prepare for vector store
-            fact_text = f"{fact.subject} {fact.predicate} {fact.value}"
-            fact_texts.append(fact_text)
+            fact_texts.append(f"{fact.subject} {fact.predicate} {fact.value}")
             fact_ids.append(fact.fact_id)
             fact_metadatas.append({
                 "fact_type": fact.fact_type.value,
@@ -180,43 +158,24 @@ class MemoryWriterService:
                 "tenant_id": event.tenant_id,
             })
 
-        # Batch upsert facts to vector store
-        if fact_texts:
-            await self._vector.upsert(
-                tenant_id=event.tenant_id,
-                documents=fact_texts,
-                ids=fact_ids,
-                metadatas=fact_metadatas,
-                namespace="facts",
-            )
-
-        # 4. Write relationships to graph
+        # 4. Entity relationships
         for rel in event.relationships:
             source_id = entity_ids.get(rel.source_entity.lower())
             target_id = entity_ids.get(rel.target_entity.lower())
             if source_id and target_id:
-                await self._graph.create_relationship(
-                    source_label="Entity",
-                    source_key="entity_id",
-                    source_value=source_id,
-                    target_label="Entity",
-                    target_key="entity_id",
-                    target_value=target_id,
-                    rel_type=rel.relationship_type.upper().replace(" ", "_"),
-                    properties={
-                        "confidence": rel.confidence,
-                        "created_at": now,
-                    },
+                batch.add_relationship(
+                    "Entity", "entity_id", source_id,
+                    "Entity", "entity_id", target_id,
+                    rel.relationship_type.upper().replace(" ", "_"),
+                    {"confidence": rel.confidence, "created_at": now},
                 )
 
-        # 5. Write knowledge chunks to vector store (from document metadata)
+        # 5. Document node (from document metadata)
         document_id = event.metadata.get("document_id")
         if document_id:
-            await self._graph.upsert_node(
-                label="Document",
-                key_field="document_id",
-                key_value=document_id,
-                properties={
+            batch.add_node(
+                "Document", "document_id", document_id,
+                {
                     "document_id": document_id,
                     "tenant_id": event.tenant_id,
                     "source_type": event.metadata.get("source_type", ""),
@@ -224,21 +183,29 @@ class MemoryWriterService:
                 },
             )
 
+        # Flush: one graph transaction + one vector upsert, in parallel
+        writes = [self._graph.write_batch(batch)]
+        if fact_texts:
+            writes.append(self._vector.upsert(
+                tenant_id=event.tenant_id,
+                documents=fact_texts,
+                ids=fact_ids,
+                metadatas=fact_metadatas,
+                namespace="facts",
+            ))
+        await asyncio.gather(*writes)
+
         self._write_count += 1
 
         # Publish completion event
-        from app.memory_platform.models import MemoryEvent as ME
-        completion_event = ME(
-            event_type="memory.written",
-            tenant_id=event.tenant_id,
-            metadata={
-                "source_event_id": event.event_id,
-                "entities_written": len(event.entities),
-                "facts_written": len(event.facts),
-                "relationships_written": len(event.relationships),
-            },
+        await self._publish_written(
+            event.tenant_id,
+            member_ids={fact.member_id for fact in event.facts if fact.member_id},
+            source_event_id=event.event_id,
+            entities_written=len(event.entities),
+            facts_written=len(event.facts),
+            relationships_written=len(event.relationships),
         )
-        await self._event_bus.publish(completion_event)
 
         logger.info(
             "writer.completed",
@@ -290,11 +257,30 @@ class MemoryWriterService:
                 }],
                 namespace="facts",
             )
+            await self._publish_written(
+                tenant_id,
+                member_ids={fact.member_id} if fact.member_id else set(),
+                facts_written=1,
+            )
             return True
         except Exception as exc:
             logger.error("writer.write_fact_error", error=str(exc))
             return False
 
+    async def _publish_written(
+        self,
+        tenant_id: int,
+        member_ids: set[str],
+        **counts: Any,
+    ) -> None:
+        """Announce a completed write; ``member_ids`` lets caches invalidate precisely."""
+        from app.memory_platform.models import MemoryEvent as ME
+        await self._event_bus.publish(ME(
+            event_type="memory.written",
+            tenant_id=tenant_id,
+            metadata={"member_ids": sorted(member_ids), **counts},
+        ))
+
     async def delete_member_data(self, tenant_id: int, member_id: str) -> int:
         """Delete all data for a member (GDPR right to be forgotten)."""
         deleted = 0
@@ -314,6 +300,7 @@ class MemoryWriterService:
 
             # Delete member node
             await self._graph.delete_node("Member", "member_id", member_id)
+            await self._publish_written(tenant_id, member_ids={member_id}, facts_deleted=deleted)
 
             logger.info(
                 "writer.member_data_deleted",
@@ -0,0 +1,253 @@
+"""app/platform/analytics_export.py — Streaming row-level analytics exports.
+
+Exports used to build the whole result in memory before the first byte went
+out, so a year of conversations for a large tenant timed out. Here rows are
+read, encoded and (optionally) compressed one chunk at a time:
+
+    time chunks   the window ``[start, end)`` is split into
+                  ``ANALYTICS_EXPORT_CHUNK_DAYS`` slices, each its own short
+                  query on the dataset's time column (index range scan, no
+                  transaction held open for the whole export);
+    yield_per     each slice is read through a server-side cursor
+                  (``ANALYTICS_EXPORT_YIELD_PER`` rows per fetch);
+    encoding      CSV or NDJSON, flushed every ``ANALYTICS_EXPORT_FLUSH_BYTES``;
+    gzip          a single ``zlib`` stream wrapped around the encoded chunks.
+
+Only the projected columns are selected. Datasets and their columns are a
+whitelist (``DATASETS``); unknown names raise ``ValueError``.
+
+Memory use depends on the fetch and flush sizes, not on the row count.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+import structlog
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.core.db import SessionLocal
+from app.domains.identity.models import AuditLog
+from app.domains.support.models import ChatMessage, ChatSession, MemberFeedback
+from app.shared.db import SessionFactory, session_scope
+
+logger = structlog.get_logger()
+
+EXPORT_CHUNK_DAYS = int(os.getenv("ANALYTICS_EXPORT_CHUNK_DAYS", "7"))
+EXPORT_YIELD_PER = int(os.getenv("ANALYTICS_EXPORT_YIELD_PER", "1000"))
+EXPORT_FLUSH_BYTES = int(os.getenv("ANALYTICS_EXPORT_FLUSH_BYTES", str(64 * 1024)))
+
+FORMAT_CSV = "csv"
+FORMAT_NDJSON = "ndjson"
+FORMATS = (FORMAT_CSV, FORMAT_NDJSON)
+
+_MEDIA_TYPES = {FORMAT_CSV: "text/csv", FORMAT_NDJSON: "application/x-ndjson"}
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """An exportable table: allowed columns, default projection, time column."""
+
+    name: str
+    model: Any
+    time_column: str
+    columns: tuple[str, ...]
+    default_columns: tuple[str, ...]
+
+    def column(self, name: str):
+        return getattr(self.model, name)
+
+
+DATASETS: dict[str, Dataset] = {
+    dataset.name: dataset
+    for dataset in (
+        Dataset(
+            "conversations", ChatSession, "created_at",
+            columns=(
+                "id", "user_id", "platform", "member_id", "user_name", "email", "phone_number",
+                "is_active", "created_at", "last_message_at",
+            ),
+            default_columns=("id", "user_id", "platform", "member_id", "is_active", "created_at", "last_message_at"),
+        ),
+        Dataset(
+            "messages", ChatMessage, "timestamp",
+            columns=("id", "session_id", "role", "content", "metadata_json", "timestamp"),
+            default_columns=("id", "session_id", "role", "metadata_json", "timestamp"),
+        ),
+        Dataset(
+            "feedback", MemberFeedback, "created_at",
+            columns=("id", "session_id", "rating", "comment", "created_at"),
+            default_columns=("id", "session_id", "rating", "comment", "created_at"),
+        ),
+        Dataset(
+            "audit", AuditLog, "created_at",
+            columns=(
+                "id", "actor_user_id", "actor_email", "action", "category", "target_type", "target_id",
+                "details_json", "created_at",
+            ),
+            default_columns=("id", "actor_email", "action", "category", "target_type", "target_id", "created_at"),
+        ),
+    )
+}
+
+
+def resolve_export(dataset: str, format: str, columns: Optional[str]) -> tuple[Dataset, list[str]]:
+    """Validate a dataset/format/column request; ``columns`` is comma-separated."""
+    spec = DATASETS.get(dataset)
+    if spec is None:
+        raise ValueError(f"unknown dataset {dataset!r}, expected one of {', '.join(DATASETS)}")
+    if format not in FORMATS:
+        raise ValueError(f"unknown export format {format!r}, expected one of {', '.join(FORMATS)}")
+    if not columns:
+        return spec, list(spec.default_columns)
+    names = list(dict.fromkeys(name.strip() for name in columns.split(",") if name.strip()))
+    unknown = [name for name in names if name not in spec.columns]
+    if unknown or not names:
+        raise ValueError(f"unknown columns for {dataset}: {', '.join(unknown) or '(none)'}")
+    return spec, names
+
+
+def time_chunks(start: datetime, end: datetime, chunk: timedelta) -> Iterator[tuple[datetime, datetime]]:
+    """Split ``[start, end)`` into consecutive ``[a, b)`` slices of at most *chunk*."""
+    while start < end:
+        upper = min(start + chunk, end)
+        yield start, upper
+        start = upper
+
+
+def iter_rows(
+    dataset: Dataset,
+    columns: Sequence[str],
+    tenant_id: int,
+    start: datetime,
+    end: datetime,
+    *,
+    session_factory: SessionFactory = SessionLocal,
+    chunk: Optional[timedelta] = None,
+    yield_per: Optional[int] = None,
+) -> Iterator[tuple]:
+    """Rows of *dataset* in ``[start, end)``, oldest first, one time slice per query."""
+    time_col = dataset.column(dataset.time_column)
+    projection = [dataset.column(name) for name in columns]
+    for lower, upper in time_chunks(start, end, chunk or timedelta(days=EXPORT_CHUNK_DAYS)):
+        stmt = (
+            select(*projection)
+            .where(dataset.model.tenant_id == tenant_id, time_col >= lower, time_col < upper)
+            .order_by(time_col, dataset.model.id)
+            .execution_options(yield_per=yield_per or EXPORT_YIELD_PER)
+        )
+        with session_scope(session_factory) as db:
+            for partition in db.execute(stmt).partitions():
+                for row in partition:
+                    yield tuple(row)
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode_csv(columns: Sequence[str], rows: Iterable[tuple], *, flush_bytes: Optional[int] = None) -> Iterator[bytes]:
+    """CSV with a header line, in chunks of about *flush_bytes*."""
+    limit = flush_bytes or EXPORT_FLUSH_BYTES
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_plain(value) for value in row])
+        if buffer.tell() >= limit:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def encode_ndjson(columns: Sequence[str], rows: Iterable[tuple], *, flush_bytes: Optional[int] = None) -> Iterator[bytes]:
+    """One JSON object per line, in chunks of about *flush_bytes*."""
+    limit = flush_bytes or EXPORT_FLUSH_BYTES
+    lines: list[str] = []
+    size = 0
+    for row in rows:
+        line = json.dumps(dict(zip(columns, row)), default=_plain, ensure_ascii=False)
+        lines.append(line)
+        size += len(line) + 1
+        if size >= limit:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines, size = [], 0
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream into one gzip member on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_export(
+    dataset: Dataset,
+    columns: Sequence[str],
+    tenant_id: int,
+    start: datetime,
+    end: datetime,
+    *,
+    format: str = FORMAT_CSV,
+    gzip: bool = False,
+    session_factory: SessionFactory = SessionLocal,
+    chunk: Optional[timedelta] = None,
+    yield_per: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Encoded (and optionally gzipped) export body for ``[start, end)``."""
+    rows = iter_rows(
+        dataset, columns, tenant_id, start, end,
+        session_factory=session_factory, chunk=chunk, yield_per=yield_per,
+    )
+    encode = encode_csv if format == FORMAT_CSV else encode_ndjson
+    body = encode(columns, rows)
+    return gzip_chunks(body) if gzip else body
+
+
+def export_response(
+    dataset: Dataset,
+    columns: Sequence[str],
+    tenant_id: int,
+    start: datetime,
+    end: datetime,
+    *,
+    format: str = FORMAT_CSV,
+    gzip: bool = False,
+    session_factory: SessionFactory = SessionLocal,
+) -> StreamingResponse:
+    """``StreamingResponse`` for an export; the body is produced in Starlette's threadpool.
+
+    A gzipped export is a ``.gz`` file download (``application/gzip``), not a
+    transfer encoding, so clients keep the compressed file as is.
+    """
+    filename = f"{dataset.name}_{start:%Y%m%d}-{end:%Y%m%d}.{format}" + (".gz" if gzip else "")
+    logger.info(
+        "analytics_export.started", tenant_id=tenant_id, dataset=dataset.name, format=format,
+        columns=len(columns), gzip=gzip, days=round((end - start) / timedelta(days=1), 1),
+    )
+    return StreamingResponse(
+        stream_export(
+            dataset, columns, tenant_id, start, end,
+            format=format, gzip=gzip, session_factory=session_factory,
+        ),
+        media_type="application/gzip" if gzip else _MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
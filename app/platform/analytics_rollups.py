@@ -0,0 +1,471 @@
+"""app/platform/analytics_rollups.py — Pre-aggregated analytics for tenant dashboards.
+
+The analytics endpoints used to load every chat session / assistant message
+of the requested window (up to a year, twice for trends) and aggregate in
+Python. ``analytics_rollups`` holds hourly and daily counters per tenant,
+channel, intent, agent and escalation reason instead; a background job
+folds new rows in incrementally.
+
+Sources:
+    session   ChatSession rows (``app.platform.api.analytics``)
+    message   assistant ChatMessage rows and their metadata JSON
+              (``AdminAnalyticsService``)
+
+Watermark: each source keeps the highest row id already folded in
+(``analytics_rollup_watermarks``). The job reads rows after it in id order
+and stops at the first row younger than ``ANALYTICS_ROLLUP_SETTLE_SECONDS``,
+so a transaction still holding a lower id is not skipped. Rollup counters
+and the watermark are committed together.
+
+Queries (``fetch_cells``) split a window ``[start, end)`` into
+    raw rows      the partial hour at the start, the current partial hour
+                  at the end, and rows after the watermark in between;
+    hourly rows   whole hours not covered by a whole day;
+    daily rows    whole days.
+The parts do not overlap, so the result equals aggregating the raw rows.
+A session is counted once, with the attributes it had when it was rolled up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Optional
+
+import structlog
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.domains.support.models import (
+    AnalyticsRollup,
+    AnalyticsRollupWatermark,
+    ChatMessage,
+    ChatSession,
+)
+
+logger = structlog.get_logger()
+
+ROLLUP_INTERVAL_SECONDS = float(os.getenv("ANALYTICS_ROLLUP_INTERVAL_SECONDS", "60"))
+ROLLUP_BATCH_SIZE = int(os.getenv("ANALYTICS_ROLLUP_BATCH_SIZE", "5000"))
+ROLLUP_SETTLE_SECONDS = float(os.getenv("ANALYTICS_ROLLUP_SETTLE_SECONDS", "30"))
+
+SOURCE_SESSION = "session"
+SOURCE_MESSAGE = "message"
+SOURCES = (SOURCE_SESSION, SOURCE_MESSAGE)
+
+HOUR = "hour"
+DAY = "day"
+RAW = "raw"
+_STEP = {HOUR: timedelta(hours=1), DAY: timedelta(days=1)}
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# CELLS
+# ══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class Measures:
+    """Additive counters; field names match the ``AnalyticsRollup`` columns."""
+
+    count: int = 0
+    escalated: int = 0
+    unresolved: int = 0
+    rating_count: int = 0
+    rating_sum: float = 0.0
+    rating_1: int = 0
+    rating_2: int = 0
+    rating_3: int = 0
+    rating_4: int = 0
+    rating_5: int = 0
+    promoters: int = 0
+    detractors: int = 0
+    message_count_n: int = 0
+    message_count_sum: int = 0
+    confidence_count: int = 0
+    confidence_sum: float = 0.0
+    confidence_high: int = 0
+    confidence_mid: int = 0
+    confidence_low_mid: int = 0
+    confidence_low: int = 0
+
+    def add(self, other: "Measures") -> None:
+        for name in MEASURES:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+
+MEASURES = tuple(f.name for f in fields(Measures))
+
+
+@dataclass(frozen=True)
+class Dims:
+    """Grouping key of a rollup row (truncated to the column widths)."""
+
+    channel: str = "unknown"
+    intent: str = ""
+    agent: str = ""
+    escalation_reason: str = ""
+
+    @classmethod
+    def of(cls, channel: str, intent: str = "", agent: str = "", escalation_reason: str = "") -> "Dims":
+        return cls(channel[:64], intent[:128], agent[:64], escalation_reason[:128])
+
+
+@dataclass
+class Cell:
+    """Counters for one bucket (or one raw row) and one ``Dims`` key."""
+
+    start: datetime
+    granularity: str
+    dims: Dims
+    measures: Measures = field(default_factory=Measures)
+
+    @property
+    def day(self) -> str:
+        return self.start.strftime("%Y-%m-%d")
+
+
+def as_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    """Timezone-aware UTC; naive values (SQLite) are taken as UTC."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def bucket_start(ts: datetime, granularity: str) -> datetime:
+    ts = ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0) if granularity == DAY else ts
+
+
+def _ceil(ts: datetime, granularity: str) -> datetime:
+    start = bucket_start(ts, granularity)
+    return start if start == ts else start + _STEP[granularity]
+
+
+# ── Row → cell ───────────────────────────────────────────────────────────────
+
+def session_cell(conversation: Any) -> Optional[Cell]:
+    """One session as a cell, read the way ``AnalyticsEngine`` reads it."""
+    ts = as_utc(getattr(conversation, "created_at", None))
+    if ts is None:
+        return None
+    m = Measures(count=1)
+    escalated = bool(getattr(conversation, "escalated", False))
+    m.escalated = int(escalated)
+    m.unresolved = int(escalated or bool(getattr(conversation, "unresolved", False)))
+
+    rating = getattr(conversation, "feedback_rating", None) or getattr(conversation, "rating", None)
+    if rating is not None:
+        try:
+            value = float(rating)
+        except (ValueError, TypeError):
+            value = None
+        if value is not None:
+            m.rating_count, m.rating_sum = 1, value
+            if 1 <= value <= 5:
+                setattr(m, f"rating_{int(value)}", 1)
+            m.promoters = int(value >= 4.5)
+            m.detractors = int(value <= 2)
+
+    if hasattr(conversation, "message_count") and conversation.message_count:
+        m.message_count_n, m.message_count_sum = 1, int(conversation.message_count)
+    elif hasattr(conversation, "messages") and conversation.messages:
+        try:
+            msgs = json.loads(conversation.messages) if isinstance(conversation.messages, str) else conversation.messages
+            m.message_count_n, m.message_count_sum = 1, len(msgs)
+        except (json.JSONDecodeError, TypeError):
+            pass
+
+    intent = getattr(conversation, "intent", None) or getattr(conversation, "detected_intent", None)
+    dims = Dims.of(
+        channel=str(getattr(conversation, "channel", None) or getattr(conversation, "source", "unknown")),
+        intent=str(intent) if intent else "",
+        agent=str(getattr(conversation, "agent", None) or getattr(conversation, "specialist", "general")),
+        escalation_reason=str(getattr(conversation, "escalation_reason", None) or "unknown") if escalated else "",
+    )
+    return Cell(start=ts, granularity=RAW, dims=dims, measures=m)
+
+
+def _parse_meta(raw: Optional[str]) -> dict[str, Any]:
+    if not raw:
+        return {}
+    try:
+        meta = json.loads(raw)
+    except Exception:
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+
+def message_cell(row: Any) -> Optional[Cell]:
+    """One assistant message as a cell, from its ``metadata_json``."""
+    ts = as_utc(row.timestamp)
+    if ts is None:
+        return None
+    meta = _parse_meta(row.metadata_json)
+    escalated = meta.get("escalated") is True or meta.get("escalated") == "true"
+    m = Measures(count=1, escalated=int(escalated), unresolved=int(escalated))
+
+    conf_raw = meta.get("confidence")
+    conf: Optional[float] = None
+    if isinstance(conf_raw, (int, float)):
+        conf = float(conf_raw)
+    elif isinstance(conf_raw, str):
+        try:
+            conf = float(conf_raw)
+        except ValueError:
+            pass
+    if conf is not None:
+        m.confidence_count, m.confidence_sum = 1, conf
+        m.confidence_high = int(conf >= 0.9)
+        m.confidence_mid = int(0.75 <= conf < 0.9)
+        m.confidence_low_mid = int(0.5 <= conf < 0.75)
+        m.confidence_low = int(conf < 0.5)
+
+    dims = Dims.of(
+        channel=str(meta.get("channel") or "unknown").lower(),
+        intent=str(meta.get("intent") or "unknown").strip() or "unknown",
+    )
+    return Cell(start=ts, granularity=RAW, dims=dims, measures=m)
+
+
+@dataclass(frozen=True)
+class _Source:
+    columns: tuple
+    id_column: Any
+    ts_column: Any
+    tenant_column: Any
+    filters: tuple
+    to_cell: Callable[[Any], Optional[Cell]]
+
+
+def _source(name: str) -> _Source:
+    if name == SOURCE_SESSION:
+        return _Source((ChatSession,), ChatSession.id, ChatSession.created_at, ChatSession.tenant_id, (), session_cell)
+    if name == SOURCE_MESSAGE:
+        return _Source(
+            (ChatMessage.id, ChatMessage.tenant_id, ChatMessage.timestamp, ChatMessage.metadata_json),
+            ChatMessage.id, ChatMessage.timestamp, ChatMessage.tenant_id,
+            (ChatMessage.role == "assistant",), message_cell,
+        )
+    raise ValueError(f"Unknown rollup source: {name}")
+
+
+def _ts_of(row: Any, spec: _Source) -> Optional[datetime]:
+    return as_utc(getattr(row, spec.ts_column.key))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# INCREMENTAL JOB
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _watermark(db: Session, source: str) -> AnalyticsRollupWatermark:
+    mark = (
+        db.query(AnalyticsRollupWatermark)
+        .filter(AnalyticsRollupWatermark.source == source)
+        .with_for_update()
+        .one_or_none()
+    )
+    if mark is None:
+        mark = AnalyticsRollupWatermark(source=source, last_id=0)
+        db.add(mark)
+        db.flush()
+    return mark
+
+
+def _apply(db: Session, source: str, deltas: dict[tuple, Measures]) -> None:
+    tenants = {key[0] for key in deltas}
+    starts = {key[2] for key in deltas}
+    existing = {
+        (row.tenant_id, row.granularity, as_utc(row.bucket_start),
+         Dims(row.channel, row.intent, row.agent, row.escalation_reason)): row
+        for row in db.query(AnalyticsRollup).filter(
+            AnalyticsRollup.source == source,
+            AnalyticsRollup.tenant_id.in_(tenants),
+            AnalyticsRollup.bucket_start.in_(starts),
+        )
+    }
+    for key, delta in deltas.items():
+        row = existing.get(key)
+        if row is None:
+            tenant_id, granularity, start, dims = key
+            row = AnalyticsRollup(
+                tenant_id=tenant_id, source=source, granularity=granularity, bucket_start=start,
+                channel=dims.channel, intent=dims.intent, agent=dims.agent,
+                escalation_reason=dims.escalation_reason,
+                **{name: 0 for name in MEASURES},
+            )
+            db.add(row)
+        for name in MEASURES:
+            setattr(row, name, (getattr(row, name) or 0) + getattr(delta, name))
+
+
+def run_rollup_batch(
+    db: Session,
+    source: str,
+    now: Optional[datetime] = None,
+    batch_size: int = ROLLUP_BATCH_SIZE,
+) -> int:
+    """Fold the next rows after the watermark into the rollups; returns rows consumed."""
+    spec = _source(source)
+    mark = _watermark(db, source)
+    rows = (
+        db.query(*spec.columns)
+        .filter(spec.id_column > mark.last_id, *spec.filters)
+        .order_by(spec.id_column)
+        .limit(batch_size)
+        .all()
+    )
+    cutoff = as_utc(now or datetime.now(timezone.utc)) - timedelta(seconds=ROLLUP_SETTLE_SECONDS)
+
+    deltas: dict[tuple, Measures] = {}
+    last_id, consumed = mark.last_id, 0
+    for row in rows:
+        ts = _ts_of(row, spec)
+        if ts is not None and ts >= cutoff:
+            break
+        last_id, consumed = row.id, consumed + 1
+        cell = spec.to_cell(row)
+        tenant_id = getattr(row, spec.tenant_column.key)
+        if cell is None or tenant_id is None:
+            continue
+        for granularity in (HOUR, DAY):
+            key = (tenant_id, granularity, bucket_start(cell.start, granularity), cell.dims)
+            deltas.setdefault(key, Measures()).add(cell.measures)
+
+    if not consumed:
+        db.rollback()
+        return 0
+    _apply(db, source, deltas)
+    mark.last_id = last_id
+    db.commit()
+    return consumed
+
+
+def run_rollups(db: Session, now: Optional[datetime] = None, batch_size: int = ROLLUP_BATCH_SIZE) -> dict[str, int]:
+    """Catch every source up to the settle cutoff; returns rows consumed per source."""
+    consumed: dict[str, int] = {}
+    for source in SOURCES:
+        total = 0
+        while True:
+            count = run_rollup_batch(db, source, now=now, batch_size=batch_size)
+            total += count
+            if count < batch_size:
+                break
+        consumed[source] = total
+    return consumed
+
+
+def _run_rollups_once() -> dict[str, int]:
+    from app.shared.db import open_session
+
+    db = open_session()
+    try:
+        return run_rollups(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def rollup_loop(interval: float = ROLLUP_INTERVAL_SECONDS) -> None:
+    """Background job: keep ``analytics_rollups`` up to date."""
+    while True:
+        try:
+            consumed = await asyncio.to_thread(_run_rollups_once)
+            if any(consumed.values()):
+                logger.info("analytics.rollup.advanced", **consumed)
+        except Exception as exc:
+            logger.error("analytics.rollup.failed", error=str(exc))
+        await asyncio.sleep(interval)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# QUERIES
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _rollup_to_cell(row: AnalyticsRollup) -> Cell:
+    return Cell(
+        start=as_utc(row.bucket_start),
+        granularity=row.granularity,
+        dims=Dims(row.channel, row.intent, row.agent, row.escalation_reason),
+        measures=Measures(**{name: getattr(row, name) or 0 for name in MEASURES}),
+    )
+
+
+def fetch_cells(
+    db: Session,
+    source: str,
+    tenant_id: int,
+    start: datetime,
+    end: datetime,
+    finest: str = DAY,
+) -> list[Cell]:
+    """All counters of *tenant_id* for ``[start, end)``.
+
+    ``finest=HOUR`` never uses daily rows, for callers that group by hour.
+    """
+    start, end = as_utc(start), as_utc(end)
+    if end <= start:
+        return []
+    spec = _source(source)
+    lead_end = min(_ceil(start, HOUR), end)
+    tail_start = max(bucket_start(end, HOUR), lead_end)
+
+    hour_ranges = [(lead_end, tail_start)]
+    day_range = None
+    if finest == DAY:
+        day_from, day_to = _ceil(lead_end, DAY), bucket_start(tail_start, DAY)
+        if day_from < day_to:
+            day_range = (day_from, day_to)
+            hour_ranges = [(lead_end, day_from), (day_to, tail_start)]
+
+    cells: list[Cell] = []
+    bucket_conditions = [
+        and_(AnalyticsRollup.granularity == HOUR, AnalyticsRollup.bucket_start >= lo, AnalyticsRollup.bucket_start < hi)
+        for lo, hi in hour_ranges if lo < hi
+    ]
+    if day_range:
+        bucket_conditions.append(and_(
+            AnalyticsRollup.granularity == DAY,
+            AnalyticsRollup.bucket_start >= day_range[0],
+            AnalyticsRollup.bucket_start < day_range[1],
+        ))
+    if bucket_conditions:
+        rows = db.query(AnalyticsRollup).filter(
+            AnalyticsRollup.tenant_id == tenant_id,
+            AnalyticsRollup.source == source,
+            or_(*bucket_conditions),
+        ).all()
+        cells.extend(_rollup_to_cell(row) for row in rows)
+
+    mark = db.query(AnalyticsRollupWatermark.last_id).filter(AnalyticsRollupWatermark.source == source).scalar() or 0
+    ts = spec.ts_column
+    raw_conditions = [and_(ts >= start, ts < lead_end), and_(ts >= tail_start, ts < end)]
+    if lead_end < tail_start:
+        raw_conditions.append(and_(spec.id_column > mark, ts >= lead_end, ts < tail_start))
+    rows = db.query(*spec.columns).filter(spec.tenant_column == tenant_id, *spec.filters, or_(*raw_conditions)).all()
+    for row in rows:
+        cell = spec.to_cell(row)
+        if cell is not None:
+            cells.append(cell)
+    return cells
+
+
+def total(cells: Iterable[Cell]) -> Measures:
+    """Sum of all cells."""
+    result = Measures()
+    for cell in cells:
+        result.add(cell.measures)
+    return result
+
+
+def group_by(cells: Iterable[Cell], key: Callable[[Cell], str]) -> dict[str, list[Cell]]:
+    groups: dict[str, list[Cell]] = {}
+    for cell in cells:
+        groups.setdefault(key(cell), []).append(cell)
+    return groups
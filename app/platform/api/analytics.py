@@ -7,6 +7,10 @@ Provides comprehensive analytics for tenant admins:
 - Channel performance comparison
 - Trend analysis with configurable time windows
 
+Endpoints read pre-aggregated counters (``app.platform.analytics_rollups``)
+instead of loading every session of the window; only the partial hours at
+the window edges and rows not yet rolled up come from ``chat_sessions``.
+
 Endpoints (prefix /api/v1/analytics):
     GET /dashboard          → Overview dashboard with key KPIs
     GET /conversations      → Conversation metrics over time
@@ -15,10 +19,12 @@ Endpoints (prefix /api/v1/analytics):
     GET /channels           → Channel performance comparison
     GET /agents             → Agent/specialist performance
     GET /escalations        → Escalation analysis
-    GET /export             → Export analytics data as CSV/JSON
+    GET /export             → Export analytics data as CSV/JSON, or stream
+                              raw rows (``dataset=``) as CSV/NDJSON
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import csv
 import io
@@ -32,7 +38,8 @@ from fastapi.responses import Response
 
 from app.core.auth import AuthContext, get_current_user, require_role
 from app.domains.identity.models import Tenant
-from app.domains.support.models import ChatSession
+from app.platform.analytics_export import FORMAT_CSV, FORMAT_NDJSON, export_response, resolve_export
+from app.platform.analytics_rollups import SOURCE_SESSION, Cell, fetch_cells, group_by, total
 from app.shared.db import open_session
 
 logger = structlog.get_logger()
@@ -75,6 +82,33 @@ def _bucket_by_day(items: list, date_field: str = "created_at",
     return dict(sorted(buckets.items()))
 
 
+def _bucket_cells_by_day(cells: list[Cell], days: int = 30, measure: str = "count") -> dict[str, int]:
+    """``_bucket_by_day`` for rollup cells."""
+    now = datetime.now(timezone.utc)
+    buckets = {(now - timedelta(days=i)).strftime("%Y-%m-%d"): 0 for i in range(days)}
+    for cell in cells:
+        if cell.day in buckets:
+            buckets[cell.day] += getattr(cell.measures, measure)
+    return dict(sorted(buckets.items()))
+
+
+def _most_common(counts: Counter, n: int) -> list[tuple[str, int]]:
+    return [(key, count) for key, count in counts.most_common(n) if count]
+
+
+def _load_cells(tenant_id: int, start: datetime, end: datetime) -> list[Cell]:
+    db = open_session()
+    try:
+        return fetch_cells(db, SOURCE_SESSION, tenant_id, start, end)
+    finally:
+        db.close()
+
+
+async def _session_cells(tenant_id: int, start: datetime, end: datetime) -> list[Cell]:
+    """Rollup cells for ``[start, end)``, loaded off the event loop."""
+    return await asyncio.to_thread(_load_cells, tenant_id, start, end)
+
+
 def _safe_avg(values: list[float]) -> float:
     """Safe average that handles empty lists."""
     return round(sum(values) / len(values), 2) if values else 0.0
@@ -249,6 +283,86 @@ class AnalyticsEngine:
         }
 
 
+    # ── From rollups ─────────────────────────────────────────────────────────
+    # Same results as the methods above, computed from rollup cells. Free-text
+    # fields (intent examples, feedback texts, sentiment) are not rolled up.
+
+    @staticmethod
+    def conversation_metrics_from_cells(cells: list[Cell], days: int = 30) -> dict[str, Any]:
+        totals = total(cells)
+        if not totals.count:
+            return AnalyticsEngine.compute_conversation_metrics([], days)
+        channel_counts = Counter()
+        for cell in cells:
+            channel_counts[cell.dims.channel] += cell.measures.count
+        return {
+            "total": totals.count,
+            "daily_average": round(totals.count / max(days, 1), 1),
+            "by_channel": dict(_most_common(channel_counts, 10)),
+            "resolution_rate": round((totals.count - totals.escalated) / totals.count * 100, 1),
+            "avg_messages_per_conversation": (
+                round(totals.message_count_sum / totals.message_count_n, 2) if totals.message_count_n else 0.0
+            ),
+        }
+
+    @staticmethod
+    def intent_analysis_from_cells(cells: list[Cell]) -> dict[str, Any]:
+        intent_counts = Counter()
+        unresolved_intents = Counter()
+        for cell in cells:
+            if cell.dims.intent:
+                intent_counts[cell.dims.intent] += cell.measures.count
+                unresolved_intents[cell.dims.intent] += cell.measures.unresolved
+        detected = sum(intent_counts.values())
+        return {
+            "total_intents_detected": detected,
+            "unique_intents": len(+intent_counts),
+            "top_intents": [
+                {
+                    "intent": intent,
+                    "count": count,
+                    "percent": round(count / detected * 100, 1),
+                    "unresolved": unresolved_intents.get(intent, 0),
+                    "examples": [],
+                }
+                for intent, count in _most_common(intent_counts, 20)
+            ],
+            "unresolved_rate": round(sum(unresolved_intents.values()) / max(detected, 1) * 100, 1),
+        }
+
+    @staticmethod
+    def feedback_metrics_from_cells(cells: list[Cell]) -> dict[str, Any]:
+        totals = total(cells)
+        rated = totals.rating_count
+        distribution = {
+            str(stars): getattr(totals, f"rating_{stars}")
+            for stars in range(1, 6) if getattr(totals, f"rating_{stars}")
+        }
+        return {
+            "total_feedback": rated,
+            "average_rating": round(totals.rating_sum / rated, 2) if rated else 0.0,
+            "nps_score": round((totals.promoters - totals.detractors) / rated * 100, 1) if rated else 0,
+            "rating_distribution": distribution,
+            "sentiment": {},
+            "recent_feedback": [],
+            "feedback_rate": round(rated / totals.count * 100, 1) if totals.count else 0,
+        }
+
+    @staticmethod
+    def escalation_metrics_from_cells(cells: list[Cell]) -> dict[str, Any]:
+        totals = total(cells)
+        reasons = Counter()
+        for cell in cells:
+            if cell.measures.escalated:
+                reasons[cell.dims.escalation_reason or "unknown"] += cell.measures.escalated
+        return {
+            "total_conversations": totals.count,
+            "escalated": totals.escalated,
+            "escalation_rate": round(totals.escalated / max(totals.count, 1) * 100, 1),
+            "reasons": dict(_most_common(reasons, 10)),
+        }
+
+
 # Singleton engine
 _engine = AnalyticsEngine()
 
@@ -264,59 +378,48 @@ async def get_dashboard(
 ) -> dict[str, Any]:
     """Overview dashboard with key KPIs."""
     _require_tenant_admin(user)
-    db = open_session()
-    try:
-        start, end = _parse_period(days)
-
-        conversations = db.query(ChatSession).filter(
-            ChatSession.tenant_id == user.tenant_id,
-            ChatSession.created_at >= start,
-        ).all()
-
-        # Previous period for trend comparison
-        prev_start = start - timedelta(days=days)
-        prev_conversations = db.query(ChatSession).filter(
-            ChatSession.tenant_id == user.tenant_id,
-            ChatSession.created_at >= prev_start,
-            ChatSession.created_at < start,
-        ).all()
-
-        conv_metrics = _engine.compute_conversation_metrics(conversations, days)
-        prev_conv_metrics = _engine.compute_conversation_metrics(prev_conversations, days)
-
-        feedback = _engine.compute_feedback_metrics(conversations)
-        escalations = _engine.compute_escalation_metrics(conversations)
-
-        return {
-            "period": {"days": days, "start": start.isoformat(), "end": end.isoformat()},
-            "kpis": {
-                "total_conversations": {
-                    "value": conv_metrics["total"],
-                    "trend": _trend_percent(conv_metrics["total"], prev_conv_metrics["total"]),
-                },
-                "daily_average": {
-                    "value": conv_metrics["daily_average"],
-                    "trend": _trend_percent(conv_metrics["daily_average"], prev_conv_metrics["daily_average"]),
-                },
-                "resolution_rate": {
-                    "value": conv_metrics["resolution_rate"],
-                    "trend": _trend_percent(conv_metrics["resolution_rate"], prev_conv_metrics["resolution_rate"]),
-                },
-                "customer_satisfaction": {
-                    "value": feedback["average_rating"],
-                    "nps": feedback["nps_score"],
-                },
-                "escalation_rate": {
-                    "value": escalations["escalation_rate"],
-                    "trend": _trend_percent(escalations["escalation_rate"],
-                        _engine.compute_escalation_metrics(prev_conversations)["escalation_rate"]),
-                },
+    start, end = _parse_period(days)
+    # Previous period for trend comparison
+    prev_start = start - timedelta(days=days)
+    cells, prev_cells = await asyncio.gather(
+        _session_cells(user.tenant_id, start, end),
+        _session_cells(user.tenant_id, prev_start, start),
+    )
+
+    conv_metrics = _engine.conversation_metrics_from_cells(cells, days)
+    prev_conv_metrics = _engine.conversation_metrics_from_cells(prev_cells, days)
+
+    feedback = _engine.feedback_metrics_from_cells(cells)
+    escalations = _engine.escalation_metrics_from_cells(cells)
+
+    return {
+        "period": {"days": days, "start": start.isoformat(), "end": end.isoformat()},
+        "kpis": {
+            "total_conversations": {
+                "value": conv_metrics["total"],
+                "trend": _trend_percent(conv_metrics["total"], prev_conv_metrics["total"]),
             },
-            "channels": conv_metrics["by_channel"],
-            "top_escalation_reasons": escalations["reasons"],
-        }
-    finally:
-        db.close()
+            "daily_average": {
+                "value": conv_metrics["daily_average"],
+                "trend": _trend_percent(conv_metrics["daily_average"], prev_conv_metrics["daily_average"]),
+            },
+            "resolution_rate": {
+                "value": conv_metrics["resolution_rate"],
+                "trend": _trend_percent(conv_metrics["resolution_rate"], prev_conv_metrics["resolution_rate"]),
+            },
+            "customer_satisfaction": {
+                "value": feedback["average_rating"],
+                "nps": feedback["nps_score"],
+            },
+            "escalation_rate": {
+                "value": escalations["escalation_rate"],
+                "trend": _trend_percent(escalations["escalation_rate"],
+                    _engine.escalation_metrics_from_cells(prev_cells)["escalation_rate"]),
+            },
+        },
+        "channels": conv_metrics["by_channel"],
+        "top_escalation_reasons": escalations["reasons"],
+    }
 
 
 @router.get("/conversations")
@@ -327,33 +430,21 @@ async def get_conversation_metrics(
 ) -> dict[str, Any]:
     """Detailed conversation metrics over time."""
     _require_tenant_admin(user)
-    db = open_session()
-    try:
-        start, end = _parse_period(days)
+    start, end = _parse_period(days)
+    cells = await _session_cells(user.tenant_id, start, end)
 
-        query = db.query(ChatSession).filter(
-            ChatSession.tenant_id == user.tenant_id,
-            ChatSession.created_at >= start,
-        )
-
-        if channel:
-            if hasattr(ChatSession, "channel"):
-                query = query.filter(ChatSession.channel == channel)
-            elif hasattr(ChatSession, "source"):
-                query = query.filter(ChatSession.source == channel)
+    if channel:
+        cells = [cell for cell in cells if cell.dims.channel == channel]
 
-        conversations = query.all()
-        metrics = _engine.compute_conversation_metrics(conversations, days)
-        by_day = _bucket_by_day(conversations, "created_at", days)
+    metrics = _engine.conversation_metrics_from_cells(cells, days)
+    by_day = _bucket_cells_by_day(cells, days)
 
-        return {
-            "period": {"days": days, "start": start.isoformat(), "end": end.isoformat()},
-            "metrics": metrics,
-            "time_series": by_day,
-            "filter": {"channel": channel},
-        }
-    finally:
-        db.close()
+    return {
+        "period": {"days": days, "start": start.isoformat(), "end": end.isoformat()},
+        "metrics": metrics,
+        "time_series": by_day,
+        "filter": {"channel": channel},
+    }
 
 
 @router.get("/intents")
@@ -363,23 +454,13 @@ async def get_intent_analysis(
 ) -> dict[str, Any]:
     """Intent distribution and trend analysis."""
     _require_tenant_admin(user)
-    db = open_session()
-    try:
-        start, _ = _parse_period(days)
+    start, end = _parse_period(days)
+    cells = await _session_cells(user.tenant_id, start, end)
 
-        conversations = db.query(ChatSession).filter(
-            ChatSession.tenant_id == user.tenant_id,
-            ChatSession.created_at >= start,
-        ).all()
-
-        intents = _engine.compute_intent_analysis(conversations)
-
-        return {
-            "period": {"days": days},
-            "analysis": intents,
-        }
-    finally:
-        db.close()
+    return {
+        "period": {"days": days},
+        "analysis": _engine.intent_analysis_from_cells(cells),
+    }
 
 
 @router.get("/feedback")
@@ -389,23 +470,13 @@ async def get_feedback_metrics(
 ) -> dict[str, Any]:
     """Customer satisfaction scores and feedback analysis."""
     _require_tenant_admin(user)
-    db = open_session()
-    try:
-        start, _ = _parse_period(days)
+    start, end = _parse_period(days)
+    cells = await _session_cells(user.tenant_id, start, end)
 
-        conversations = db.query(ChatSession).filter(
-            ChatSession.tenant_id == user.tenant_id,
-            ChatSession.created_at >= start,
-        ).all()
-
-        feedback = _engine.compute_feedback_metrics(conversations)
-
-        return {
-            "period": {"days": days},
-            "feedback": feedback,
-        }
-    finally:
-        db.close()
+    return {
+        "period": {"days": days},
+        "feedback": _engine.feedback_metrics_from_cells(cells),
+    }
 
 
 @router.get("/channels")
@@ -415,39 +486,25 @@ async def get_channel_performance(
 ) -> dict[str, Any]:
     """Channel performance comparison."""
     _require_tenant_admin(user)
-    db = open_session()
-    try:
-        start, _ = _parse_period(days)
-
-        conversations = db.query(ChatSession).filter(
-            ChatSession.tenant_id == user.tenant_id,
-            ChatSession.created_at >= start,
-        ).all()
-
-        # Group by channel
-        channel_data = defaultdict(list)
-        for c in conversations:
-            ch = getattr(c, "channel", None) or getattr(c, "source", "unknown")
-            channel_data[str(ch)].append(c)
-
-        channels = {}
-        for ch_name, ch_convs in channel_data.items():
-            metrics = _engine.compute_conversation_metrics(ch_convs, days)
-            feedback = _engine.compute_feedback_metrics(ch_convs)
-            channels[ch_name] = {
-                "conversations": metrics["total"],
-                "resolution_rate": metrics["resolution_rate"],
-                "avg_messages": metrics["avg_messages_per_conversation"],
-                "satisfaction": feedback["average_rating"],
-                "feedback_count": feedback["total_feedback"],
-            }
-
-        return {
-            "period": {"days": days},
-            "channels": channels,
+    start, end = _parse_period(days)
+    cells = await _session_cells(user.tenant_id, start, end)
+
+    channels = {}
+    for ch_name, ch_cells in group_by(cells, lambda cell: cell.dims.channel).items():
+        metrics = _engine.conversation_metrics_from_cells(ch_cells, days)
+        feedback = _engine.feedback_metrics_from_cells(ch_cells)
+        channels[ch_name] = {
+            "conversations": metrics["total"],
+            "resolution_rate": metrics["resolution_rate"],
+            "avg_messages": metrics["avg_messages_per_conversation"],
+            "satisfaction": feedback["average_rating"],
+            "feedback_count": feedback["total_feedback"],
         }
-    finally:
-        db.close()
+
+    return {
+        "period": {"days": days},
+        "channels": channels,
+    }
 
 
 @router.get("/escalations")
@@ -457,28 +514,15 @@ async def get_escalation_analysis(
 ) -> dict[str, Any]:
     """Escalation analysis with reasons and trends."""
     _require_tenant_admin(user)
-    db = open_session()
-    try:
-        start, _ = _parse_period(days)
-
-        conversations = db.query(ChatSession).filter(
-            ChatSession.tenant_id == user.tenant_id,
-            ChatSession.created_at >= start,
-        ).all()
-
-        escalations = _engine.compute_escalation_metrics(conversations)
+    start, end = _parse_period(days)
+    cells = await _session_cells(user.tenant_id, start, end)
 
+    return {
+        "period": {"days": days},
+        "escalations": _engine.escalation_metrics_from_cells(cells),
         # Time series of escalations
-        escalated_convs = [c for c in conversations if getattr(c, "escalated", False)]
-        by_day = _bucket_by_day(escalated_convs, "created_at", days)
-
-        return {
-            "period": {"days": days},
-            "escalations": escalations,
-            "time_series": by_day,
-        }
-    finally:
-        db.close()
+        "time_series": _bucket_cells_by_day(cells, days, measure="escalated"),
+    }
 
 
 @router.get("/agents")
@@ -488,101 +532,95 @@ async def get_agent_performance(
 ) -> dict[str, Any]:
     """Agent/specialist performance metrics."""
     _require_tenant_admin(user)
-    db = open_session()
-    try:
-        start, _ = _parse_period(days)
-
-        conversations = db.query(ChatSession).filter(
-            ChatSession.tenant_id == user.tenant_id,
-            ChatSession.created_at >= start,
-        ).all()
-
-        # Group by agent/specialist
-        agent_data = defaultdict(list)
-        for c in conversations:
-            agent = getattr(c, "agent", None) or getattr(c, "specialist", "general")
-            agent_data[str(agent)].append(c)
-
-        agents = {}
-        for agent_name, agent_convs in agent_data.items():
-            metrics = _engine.compute_conversation_metrics(agent_convs, days)
-            feedback = _engine.compute_feedback_metrics(agent_convs)
-            agents[agent_name] = {
-                "conversations": metrics["total"],
-                "resolution_rate": metrics["resolution_rate"],
-                "avg_messages": metrics["avg_messages_per_conversation"],
-                "satisfaction": feedback["average_rating"],
-            }
-
-        return {
-            "period": {"days": days},
-            "agents": agents,
+    start, end = _parse_period(days)
+    cells = await _session_cells(user.tenant_id, start, end)
+
+    agents = {}
+    for agent_name, agent_cells in group_by(cells, lambda cell: cell.dims.agent).items():
+        metrics = _engine.conversation_metrics_from_cells(agent_cells, days)
+        feedback = _engine.feedback_metrics_from_cells(agent_cells)
+        agents[agent_name] = {
+            "conversations": metrics["total"],
+            "resolution_rate": metrics["resolution_rate"],
+            "avg_messages": metrics["avg_messages_per_conversation"],
+            "satisfaction": feedback["average_rating"],
         }
-    finally:
-        db.close()
+
+    return {
+        "period": {"days": days},
+        "agents": agents,
+    }
 
 
 @router.get("/export")
 async def export_analytics(
     user: AuthContext = Depends(get_current_user),
     days: int = Query(30, ge=1, le=365),
-    format: str = Query("json", description="Export format: json or csv"),
+    format: Optional[str] = Query(None, description="json (default) or csv; csv (default) or ndjson with dataset"),
+    dataset: Optional[str] = Query(None, description="Stream raw rows: conversations, messages, feedback or audit"),
+    columns: Optional[str] = Query(None, description="Comma-separated column projection for dataset exports"),
+    gzip: bool = Query(False, description="Gzip a dataset export on the fly"),
 ) -> Any:
-    """Export analytics data."""
+    """Export analytics data.
+
+    Without ``dataset`` the aggregated metrics are returned. With ``dataset``
+    the rows of the window are streamed (see ``app.platform.analytics_export``);
+    there ``json`` means one JSON object per line (NDJSON).
+    """
     _require_tenant_admin(user)
-    db = open_session()
-    try:
-        start, end = _parse_period(days)
-
-        conversations = db.query(ChatSession).filter(
-            ChatSession.tenant_id == user.tenant_id,
-            ChatSession.created_at >= start,
-        ).all()
-
-        conv_metrics = _engine.compute_conversation_metrics(conversations, days)
-        intent_analysis = _engine.compute_intent_analysis(conversations)
-        feedback = _engine.compute_feedback_metrics(conversations)
-        escalations = _engine.compute_escalation_metrics(conversations)
-
-        export_data = {
-            "tenant_id": user.tenant_id,
-            "period": {"days": days, "start": start.isoformat(), "end": end.isoformat()},
-            "conversations": conv_metrics,
-            "intents": intent_analysis,
-            "feedback": feedback,
-            "escalations": escalations,
-            "exported_at": datetime.now(timezone.utc).isoformat(),
-        }
+    start, end = _parse_period(days)
+    if dataset:
+        row_format = FORMAT_NDJSON if format == "json" else format or FORMAT_CSV
+        try:
+            spec, names = resolve_export(dataset, row_format, columns)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        return export_response(spec, names, user.tenant_id, start, end, format=row_format, gzip=gzip)
+
+    cells = await _session_cells(user.tenant_id, start, end)
+
+    conv_metrics = _engine.conversation_metrics_from_cells(cells, days)
+    intent_analysis = _engine.intent_analysis_from_cells(cells)
+    feedback = _engine.feedback_metrics_from_cells(cells)
+    escalations = _engine.escalation_metrics_from_cells(cells)
+
+    export_data = {
+        "tenant_id": user.tenant_id,
+        "period": {"days": days, "start": start.isoformat(), "end": end.isoformat()},
+        "conversations": conv_metrics,
+        "intents": intent_analysis,
+        "feedback": feedback,
+        "escalations": escalations,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    if format == "csv":
+        output = io.StringIO()
+        writer = csv.writer(output)
+
+        # Header
+        writer.writerow(["Metric", "Value", "Category"])
+
+        # Flatten metrics
+        writer.writerow(["Total Conversations", conv_metrics["total"], "conversations"])
+        writer.writerow(["Daily Average", conv_metrics["daily_average"], "conversations"])
+        writer.writerow(["Resolution Rate %", conv_metrics["resolution_rate"], "conversations"])
+        writer.writerow(["Avg Rating", feedback["average_rating"], "feedback"])
+        writer.writerow(["NPS Score", feedback["nps_score"], "feedback"])
+        writer.writerow(["Escalation Rate %", escalations["escalation_rate"], "escalations"])
+
+        for intent_data in intent_analysis.get("top_intents", []):
+            writer.writerow([
+                f"Intent: {intent_data['intent']}",
+                intent_data["count"],
+                "intents",
+            ])
+
+        output.seek(0)
+        return Response(
+            content=output.getvalue(),
+            media_type="text/csv",
+            headers={"Content-Disposition": f"attachment; filename=analytics_{days}d.csv"},
+        )
 
-        if format == "csv":
-            output = io.StringIO()
-            writer = csv.writer(output)
-
-            # Header
-            writer.writerow(["Metric", "Value", "Category"])
-
-            # Flatten metrics
-            writer.writerow(["Total Conversations", conv_metrics["total"], "conversations"])
-            writer.writerow(["Daily Average", conv_metrics["daily_average"], "conversations"])
-            writer.writerow(["Resolution Rate %", conv_metrics["resolution_rate"], "conversations"])
-            writer.writerow(["Avg Rating", feedback["average_rating"], "feedback"])
-            writer.writerow(["NPS Score", feedback["nps_score"], "feedback"])
-            writer.writerow(["Escalation Rate %", escalations["escalation_rate"], "escalations"])
-
-            for intent_data in intent_analysis.get("top_intents", []):
-                writer.writerow([
-                    f"Intent: {intent_data['intent']}",
-                    intent_data["count"],
-                    "intents",
-                ])
-
-            output.seek(0)
-            return Response(
-                content=output.getvalue(),
-                media_type="text/csv",
-                headers={"Content-Disposition": f"attachment; filename=analytics_{days}d.csv"},
-            )
-
-        return export_data
-    finally:
-        db.close()
+    return export_data
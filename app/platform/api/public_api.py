@@ -15,10 +15,10 @@ The Public API enables:
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import hmac
 import secrets
-import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from enum import Enum
@@ -234,7 +234,6 @@ class APIKeyManager:
     def __init__(self):
         self._keys: dict[str, APIKey] = {}  # key_hash -> APIKey
         self._tenant_keys: dict[int, list[str]] = {}  # tenant_id -> [key_hash]
-        self._rate_windows: dict[str, list[float]] = {}  # key_hash -> [timestamps]
 
     def create_key(
         self,
@@ -294,7 +293,7 @@ class APIKeyManager:
             return None
 
         # Rate limiting check
-        if not self._check_rate_limit(key_hash, api_key.rate_limit):
+        if not self._check_rate_limit(key_hash, api_key.rate_limit, tenant_id=api_key.tenant_id):
             logger.warning("api_key.rate_limited",
                            tenant_id=api_key.tenant_id,
                            key_id=api_key.id)
@@ -337,25 +336,13 @@ class APIKeyManager:
                 )
         return None
 
-    def _check_rate_limit(self, key_hash: str, limit: int) -> bool:
-        """Sliding window rate limiting per API key."""
-        now = time.time()
-        window = 3600  # 1 hour
+    def _check_rate_limit(self, key_hash: str, limit: int, tenant_id: int = 0) -> bool:
+        """Sliding window rate limiting per API key (1 hour), shared across workers."""
+        from app.core.rate_limit import RateLimit, get_distributed_rate_limiter
+        from app.core.redis_keys import rate_limit_key
 
-        if key_hash not in self._rate_windows:
-            self._rate_windows[key_hash] = []
-
-        # Remove expired entries
-        self._rate_windows[key_hash] = [
-            t for t in self._rate_windows[key_hash]
-            if now - t < window
-        ]
-
-        if len(self._rate_windows[key_hash]) >= limit:
-            return False
-
-        self._rate_windows[key_hash].append(now)
-        return True
+        key = rate_limit_key(tenant_id, "api_key", key_hash[:32])
+        return get_distributed_rate_limiter().check(RateLimit(key, limit, 3600)).allowed
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -392,7 +379,8 @@ async def verify_api_key(
     if not api_key:
         raise HTTPException(401, "API key required. Pass via X-API-Key header.")
     manager = get_api_key_manager()
-    key_obj = manager.validate_key(api_key)
+    # validate_key checks the shared rate limit in Redis; keep it off the event loop
+    key_obj = await asyncio.to_thread(manager.validate_key, api_key)
     if not key_obj:
         raise HTTPException(403, "Invalid, expired, or rate-limited API key.")
     return key_obj
@@ -6,23 +6,48 @@ Extends the existing Ghost Mode WebSocket with:
 3. Conversation Scoring: Real-time quality scoring of active conversations
 4. Knowledge Gap Analysis: Detects topics where the agent lacks knowledge
 5. Session Recording: Full audit trail of ghost mode sessions
+
+Takeover/pause state, intervention history, scores and event fan-out go
+through a state store (app/platform/ghost_state.py) so that several gateway
+workers see the same conversations; see that module for the Redis layout.
 """
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import os
+import re
 import time
 import uuid
-from collections import defaultdict
-from dataclasses import dataclass, field
+import zlib
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Optional
 
+import numpy as np
 import structlog
 
+from app.platform.ghost_state import (
+    GHOST_SCORE_IDLE_SECONDS,
+    GhostSubscriber,
+    LocalGhostState,
+    RedisEventListener,
+    RedisGhostState,
+)
+
 logger = structlog.get_logger()
 
+GHOST_MODE_STATE_BACKEND = os.getenv("GHOST_MODE_STATE_BACKEND", "redis")  # "redis" | "memory"
+
+# Knowledge-gap detector bounds and persistence interval
+GAP_QUERY_WINDOW = int(os.getenv("GHOST_GAP_QUERY_WINDOW", "20"))  # recent queries per conversation
+GAP_MAX_CONVERSATIONS = int(os.getenv("GHOST_GAP_MAX_CONVERSATIONS", "5000"))
+GAP_MAX_TOPICS_PER_TENANT = int(os.getenv("GHOST_GAP_MAX_TOPICS_PER_TENANT", "500"))
+GAP_FLUSH_SECONDS = float(os.getenv("GHOST_GAP_FLUSH_SECONDS", "60"))
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 # GHOST MODE EVENT TYPES
@@ -134,7 +159,8 @@ class ConversationScore:
 
     # Timing
     avg_response_time_ms: float = 0.0
-    _response_times: list[float] = field(default_factory=list)
+    _response_count: int = 0
+    last_activity: float = field(default_factory=time.time)
 
     @property
     def overall_score(self) -> float:
@@ -153,8 +179,8 @@ class ConversationScore:
         )
 
     def add_response_time(self, ms: float):
-        self._response_times.append(ms)
-        self.avg_response_time_ms = sum(self._response_times) / len(self._response_times)
+        self._response_count += 1
+        self.avg_response_time_ms += (ms - self.avg_response_time_ms) / self._response_count
 
     def to_dict(self) -> dict:
         return {
@@ -168,6 +194,7 @@ class ConversationScore:
             "tool_calls": self.tool_call_count,
             "errors": self.error_count,
             "avg_response_time_ms": round(self.avg_response_time_ms, 1),
+            "last_activity": self.last_activity,
             "flags": {
                 "knowledge_gap": self.has_knowledge_gap,
                 "escalation_signal": self.has_escalation_signal,
@@ -189,6 +216,7 @@ class KnowledgeGap:
     category: str = "unknown"
     detected_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     resolved: bool = False
+    occurrences: int = 1  # exchanges counted under this topic
 
     def to_dict(self) -> dict:
         return {
@@ -201,6 +229,7 @@ class KnowledgeGap:
             "category": self.category,
             "detected_at": self.detected_at.isoformat(),
             "resolved": self.resolved,
+            "occurrences": self.occurrences,
         }
 
 
@@ -233,6 +262,116 @@ class InterventionRecord:
 # KNOWLEDGE GAP DETECTOR
 # ══════════════════════════════════════════════════════════════════════════════
 
+_MINHASH_PERMUTATIONS = 32
+_MINHASH_PRIME = np.uint64(4294967291)  # largest prime below 2**32
+_minhash_rng = np.random.default_rng(0x6A5)
+_MINHASH_A = _minhash_rng.integers(1, 2**31, size=_MINHASH_PERMUTATIONS, dtype=np.uint64)
+_MINHASH_B = _minhash_rng.integers(0, 2**31, size=_MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+
+def _minhash(text: str) -> Optional[np.ndarray]:
+    """MinHash signature over the word shingles of *text* (``None`` if empty).
+
+    The share of equal positions in two signatures estimates the Jaccard
+    similarity of the word sets.
+    """
+    words = set(text.split())
+    if not words:
+        return None
+    hashes = np.array([zlib.crc32(w.encode("utf-8")) for w in words], dtype=np.uint64)
+    return ((hashes[:, None] * _MINHASH_A + _MINHASH_B) % _MINHASH_PRIME).min(axis=0).astype(np.uint32)
+
+
+class _SignatureWindow:
+    """Ring buffer of the last *size* MinHash signatures of one conversation.
+
+    Starts small and grows up to *size*, so short conversations stay cheap.
+    """
+
+    __slots__ = ("size", "rows", "count", "next")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.rows = np.empty((min(size, 4), _MINHASH_PERMUTATIONS), dtype=np.uint32)
+        self.count = 0
+        self.next = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def best_match(self, signature: np.ndarray) -> int:
+        """Most positions any stored signature shares with *signature*."""
+        if not self.count:
+            return 0
+        return int((self.rows[:self.count] == signature).sum(axis=1).max())
+
+    def append(self, signature: np.ndarray) -> None:
+        if self.count == len(self.rows) and self.count < self.size:
+            grown = np.empty((min(self.size, 2 * self.count), _MINHASH_PERMUTATIONS), dtype=np.uint32)
+            grown[:self.count] = self.rows
+            self.rows = grown
+        self.rows[self.next] = signature
+        self.next = (self.next + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+
+def _literal_matcher(patterns: list[str]) -> re.Pattern:
+    return re.compile("|".join(re.escape(p) for p in sorted(patterns, key=len, reverse=True)))
+
+
+_TOPIC_NOISE = re.compile(r"[^\w\s-]+")
+
+
+def _topic_key(category: str, topic: str) -> str:
+    normalized = " ".join(_TOPIC_NOISE.sub(" ", topic.lower()).split())
+    return f"{category}:{normalized}"[:200]
+
+
+@dataclass
+class GapTopic:
+    """Knowledge-gap counters for one normalized topic of a tenant."""
+    tenant_id: int
+    key: str
+    category: str
+    topic: str
+    occurrences: int = 0
+    confidence_sum: float = 0.0
+    max_confidence: float = 0.0
+    sample_query: str = ""
+    sample_response: str = ""
+    conversation_id: str = ""
+    first_seen: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    last_seen: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    resolved: bool = False
+    # Not yet written by ``KnowledgeGapStore``
+    pending_occurrences: int = 0
+    pending_confidence: float = 0.0
+
+    @property
+    def gap_id(self) -> str:
+        """Stable id, the same on every worker and across restarts."""
+        return hashlib.blake2b(f"{self.tenant_id}:{self.key}".encode("utf-8"), digest_size=4).hexdigest()
+
+    @property
+    def avg_confidence(self) -> float:
+        return self.confidence_sum / self.occurrences if self.occurrences else 0.0
+
+    def as_gap(self) -> KnowledgeGap:
+        return KnowledgeGap(
+            gap_id=self.gap_id,
+            tenant_id=self.tenant_id,
+            conversation_id=self.conversation_id,
+            topic=self.topic,
+            user_query=self.sample_query,
+            agent_response=self.sample_response,
+            confidence=self.avg_confidence,
+            category=self.category,
+            detected_at=self.last_seen,
+            resolved=self.resolved,
+            occurrences=self.occurrences,
+        )
+
+
 class KnowledgeGapDetector:
     """Detects knowledge gaps from conversation patterns.
 
@@ -241,6 +380,15 @@ class KnowledgeGapDetector:
     - Agent explicitly says it doesn't know
     - User repeats the same question (agent didn't answer satisfactorily)
     - Agent falls back to general responses for domain-specific queries
+
+    Memory is bounded: each conversation keeps MinHash signatures of its
+    last ``GAP_QUERY_WINDOW`` queries (least recently active conversations
+    are dropped beyond ``GAP_MAX_CONVERSATIONS``), and gaps are folded into
+    per-tenant ``GapTopic`` counters keyed by normalized topic (at most
+    ``GAP_MAX_TOPICS_PER_TENANT``, least recently seen dropped). With a
+    ``store`` the counters are loaded per tenant on first use and flushed
+    as deltas by ``flush``; async callers ``await preload(tenant_id)``
+    first so the store is read in a thread, not on the event loop.
     """
 
     # Patterns indicating the agent doesn't know
@@ -286,9 +434,111 @@ class KnowledgeGapDetector:
         "location": ["adresse", "öffnungszeiten", "standort", "address", "hours", "location"],
     }
 
-    def __init__(self):
-        self._gaps: dict[int, list[KnowledgeGap]] = defaultdict(list)  # tenant_id -> gaps
-        self._conversation_queries: dict[str, list[str]] = defaultdict(list)  # conv_id -> queries
+    REPEAT_SIMILARITY = 0.7
+
+    def __init__(
+        self,
+        store: Optional[KnowledgeGapStore] = None,
+        query_window: Optional[int] = None,
+        max_conversations: Optional[int] = None,
+        max_topics_per_tenant: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        clock=time.monotonic,
+    ):
+        self._uncertainty = _literal_matcher(self.UNCERTAINTY_PATTERNS)
+        self._frustration = _literal_matcher(self.FRUSTRATION_PATTERNS)
+        # one alternation per category, tried in declaration order
+        self._categories = [(cat, _literal_matcher(kws)) for cat, kws in self.TOPIC_CATEGORIES.items()]
+
+        self._store = store
+        self._query_window = query_window or GAP_QUERY_WINDOW
+        self._max_conversations = max_conversations or GAP_MAX_CONVERSATIONS
+        self._max_topics = max_topics_per_tenant or GAP_MAX_TOPICS_PER_TENANT
+        self._flush_interval = GAP_FLUSH_SECONDS if flush_interval is None else flush_interval
+        self._clock = clock
+        self._last_flush = clock()
+
+        # conv_id -> signatures of its recent queries, least recently active first
+        self._recent_queries: OrderedDict[str, _SignatureWindow] = OrderedDict()
+        # tenant_id -> topic key -> counters, least recently seen first
+        self._topics: dict[int, OrderedDict[str, GapTopic]] = {}
+        # counters with changes not yet flushed, also after eviction (only with a store)
+        self._dirty: dict[tuple[int, str], GapTopic] = {}
+        self._loading: dict[int, asyncio.Future] = {}
+
+    def _detect_category(self, text: str) -> Optional[str]:
+        return next((cat for cat, matcher in self._categories if matcher.search(text)), None)
+
+    def _is_repeat(self, conversation_id: str, user_lower: str) -> bool:
+        window = self._recent_queries.get(conversation_id)
+        if window is None:
+            window = self._recent_queries[conversation_id] = _SignatureWindow(self._query_window)
+            while len(self._recent_queries) > self._max_conversations:
+                self._recent_queries.popitem(last=False)
+        else:
+            self._recent_queries.move_to_end(conversation_id)
+
+        signature = _minhash(user_lower)
+        if signature is None:
+            return False
+        repeated = window.best_match(signature) > self.REPEAT_SIMILARITY * _MINHASH_PERMUTATIONS
+        window.append(signature)
+        return repeated
+
+    def _load(self, tenant_id: int) -> OrderedDict[str, GapTopic]:
+        topics: OrderedDict[str, GapTopic] = OrderedDict()
+        if self._store is not None:
+            try:
+                for topic in self._store.load(tenant_id, self._max_topics):
+                    topics[topic.key] = topic
+            except Exception as exc:
+                logger.warning("knowledge_gap.load_failed", tenant_id=tenant_id, error=str(exc))
+        return topics
+
+    def _tenant_topics(self, tenant_id: int) -> OrderedDict[str, GapTopic]:
+        topics = self._topics.get(tenant_id)
+        if topics is None:
+            topics = self._topics[tenant_id] = self._load(tenant_id)
+        return topics
+
+    async def preload(self, tenant_id: int) -> None:
+        """Load the tenant's stored counters in a thread, once, before first use."""
+        if tenant_id in self._topics or self._store is None:
+            return
+        loading = self._loading.get(tenant_id)
+        if loading is None:
+            loading = self._loading[tenant_id] = asyncio.ensure_future(asyncio.to_thread(self._load, tenant_id))
+        try:
+            topics = await asyncio.shield(loading)
+        finally:
+            if loading.done():
+                self._loading.pop(tenant_id, None)
+        self._topics.setdefault(tenant_id, topics)
+
+    def _record(self, gap: KnowledgeGap) -> GapTopic:
+        topics = self._tenant_topics(gap.tenant_id)
+        key = _topic_key(gap.category, gap.topic)
+        topic = topics.get(key)
+        if topic is None:
+            topic = topics[key] = GapTopic(tenant_id=gap.tenant_id, key=key, category=gap.category, topic=gap.topic)
+            while len(topics) > self._max_topics:
+                topics.popitem(last=False)
+        else:
+            topics.move_to_end(key)
+
+        topic.occurrences += 1
+        topic.confidence_sum += gap.confidence
+        topic.max_confidence = max(topic.max_confidence, gap.confidence)
+        topic.pending_occurrences += 1
+        topic.pending_confidence += gap.confidence
+        topic.sample_query = gap.user_query
+        topic.sample_response = gap.agent_response
+        topic.conversation_id = gap.conversation_id
+        topic.last_seen = gap.detected_at
+        topic.resolved = False  # a new occurrence reopens a resolved topic
+        if self._store is not None:
+            self._dirty[(gap.tenant_id, key)] = topic
+        return topic
 
     def analyze_exchange(
         self,
@@ -299,41 +549,29 @@ class KnowledgeGapDetector:
     ) -> Optional[KnowledgeGap]:
         """Analyze a user-agent exchange for knowledge gaps.
 
-        Returns a KnowledgeGap if one is detected, None otherwise.
+        Returns a KnowledgeGap if one is detected, None otherwise. Its
+        ``gap_id`` identifies the topic the exchange was counted under.
         """
         user_lower = user_message.lower()
         agent_lower = agent_response.lower()
 
         confidence = 0.0
-        topic = ""
-        category = "unknown"
 
         # Check for uncertainty patterns in agent response
-        for pattern in self.UNCERTAINTY_PATTERNS:
-            if pattern in agent_lower:
-                confidence += 0.4
-                break
+        if self._uncertainty.search(agent_lower):
+            confidence += 0.4
 
         # Check for user frustration
-        for pattern in self.FRUSTRATION_PATTERNS:
-            if pattern in user_lower:
-                confidence += 0.3
-                break
+        if self._frustration.search(user_lower):
+            confidence += 0.3
 
         # Check for repeated questions
-        prev_queries = self._conversation_queries.get(conversation_id, [])
-        for prev_q in prev_queries:
-            if self._similarity(user_lower, prev_q) > 0.7:
-                confidence += 0.3
-                break
-        self._conversation_queries[conversation_id].append(user_lower)
+        if self._is_repeat(conversation_id, user_lower):
+            confidence += 0.3
 
         # Detect topic category
-        for cat, keywords in self.TOPIC_CATEGORIES.items():
-            if any(kw in user_lower for kw in keywords):
-                category = cat
-                topic = cat
-                break
+        category = self._detect_category(user_lower) or "unknown"
+        topic = category if category != "unknown" else ""
 
         # Extract topic from user message (first noun phrase approximation)
         if not topic:
@@ -355,7 +593,9 @@ class KnowledgeGapDetector:
                 confidence=min(confidence, 1.0),
                 category=category,
             )
-            self._gaps[tenant_id].append(gap)
+            aggregate = self._record(gap)
+            gap.gap_id = aggregate.gap_id
+            gap.occurrences = aggregate.occurrences
 
             logger.info("knowledge_gap.detected",
                         tenant_id=tenant_id,
@@ -375,60 +615,185 @@ class KnowledgeGapDetector:
         min_confidence: float = 0.0,
         limit: int = 50,
     ) -> list[KnowledgeGap]:
-        """Get detected knowledge gaps for a tenant."""
-        gaps = self._gaps.get(tenant_id, [])
+        """Get detected knowledge gaps for a tenant, one per topic."""
+        topics = list(self._tenant_topics(tenant_id).values())
         if category:
-            gaps = [g for g in gaps if g.category == category]
+            topics = [t for t in topics if t.category == category]
         if min_confidence > 0:
-            gaps = [g for g in gaps if g.confidence >= min_confidence]
-        # Sort by confidence descending
-        gaps.sort(key=lambda g: g.confidence, reverse=True)
-        return gaps[:limit]
+            topics = [t for t in topics if t.avg_confidence >= min_confidence]
+        # Sort by confidence descending, frequent topics first
+        topics.sort(key=lambda t: (t.avg_confidence, t.occurrences), reverse=True)
+        return [t.as_gap() for t in topics[:limit]]
 
     def get_gap_summary(self, tenant_id: int) -> dict:
         """Get a summary of knowledge gaps by category."""
-        gaps = self._gaps.get(tenant_id, [])
+        topics = self._tenant_topics(tenant_id).values()
         summary = defaultdict(lambda: {"count": 0, "avg_confidence": 0.0, "topics": []})
 
-        for gap in gaps:
-            cat = gap.category
-            summary[cat]["count"] += 1
-            summary[cat]["avg_confidence"] += gap.confidence
-            if gap.topic not in summary[cat]["topics"]:
-                summary[cat]["topics"].append(gap.topic)
+        for topic in sorted(topics, key=lambda t: t.occurrences, reverse=True):
+            cat = summary[topic.category]
+            cat["count"] += topic.occurrences
+            cat["avg_confidence"] += topic.confidence_sum
+            if topic.topic not in cat["topics"]:
+                cat["topics"].append(topic.topic)
 
         # Calculate averages
-        for cat in summary:
-            if summary[cat]["count"] > 0:
-                summary[cat]["avg_confidence"] /= summary[cat]["count"]
-                summary[cat]["avg_confidence"] = round(summary[cat]["avg_confidence"], 3)
-            summary[cat]["topics"] = summary[cat]["topics"][:10]
+        for cat in summary.values():
+            if cat["count"] > 0:
+                cat["avg_confidence"] = round(cat["avg_confidence"] / cat["count"], 3)
+            cat["topics"] = cat["topics"][:10]
 
         return {
             "tenant_id": tenant_id,
-            "total_gaps": len(gaps),
-            "unresolved": len([g for g in gaps if not g.resolved]),
+            "total_gaps": sum(t.occurrences for t in topics),
+            "unresolved": sum(t.occurrences for t in topics if not t.resolved),
+            "topic_count": len(topics),
             "categories": dict(summary),
         }
 
     def resolve_gap(self, tenant_id: int, gap_id: str) -> bool:
-        """Mark a knowledge gap as resolved."""
-        for gap in self._gaps.get(tenant_id, []):
-            if gap.gap_id == gap_id:
-                gap.resolved = True
+        """Mark a knowledge gap (its whole topic) as resolved."""
+        for topic in self._tenant_topics(tenant_id).values():
+            if topic.gap_id == gap_id:
+                topic.resolved = True
+                if self._store is not None:
+                    self._dirty[(tenant_id, topic.key)] = topic
                 return True
         return False
 
-    @staticmethod
-    def _similarity(a: str, b: str) -> float:
-        """Simple Jaccard similarity between two strings."""
-        words_a = set(a.split())
-        words_b = set(b.split())
-        if not words_a or not words_b:
-            return 0.0
-        intersection = words_a & words_b
-        union = words_a | words_b
-        return len(intersection) / len(union)
+    # ─── Persistence ─────────────────────────────────────────────────
+
+    def flush_due(self) -> bool:
+        return (
+            self._store is not None
+            and bool(self._dirty)
+            and self._clock() - self._last_flush >= self._flush_interval
+        )
+
+    async def flush(self) -> int:
+        """Write pending counter deltas to the store; returns the topics written.
+
+        Deltas are taken on the event loop and written in a thread; on
+        failure they are added back so the next flush retries them.
+        """
+        self._last_flush = self._clock()
+        if self._store is None or not self._dirty:
+            return 0
+        deltas = [replace(topic) for topic in self._dirty.values()]
+        for topic in self._dirty.values():
+            topic.pending_occurrences = 0
+            topic.pending_confidence = 0.0
+        dirty, self._dirty = self._dirty, {}
+        try:
+            await asyncio.to_thread(self._store.save, deltas)
+        except Exception as exc:
+            logger.warning("knowledge_gap.flush_failed", topics=len(deltas), error=str(exc))
+            for delta in deltas:
+                topic = dirty[(delta.tenant_id, delta.key)]
+                topic.pending_occurrences += delta.pending_occurrences
+                topic.pending_confidence += delta.pending_confidence
+                self._dirty[(delta.tenant_id, delta.key)] = topic
+            return 0
+        return len(deltas)
+
+
+class KnowledgeGapStore:
+    """Persists ``GapTopic`` counters in ``knowledge_gap_topics``.
+
+    ``save`` adds the pending deltas to the stored counters, so several
+    workers can flush the same topic.
+    """
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.shared.db import open_session
+
+            self._session_factory = open_session
+        return self._session_factory()
+
+    def load(self, tenant_id: int, limit: int) -> list[GapTopic]:
+        from app.domains.support.models import KnowledgeGapTopic
+
+        db = self._session()
+        try:
+            rows = (
+                db.query(KnowledgeGapTopic)
+                .filter(KnowledgeGapTopic.tenant_id == tenant_id)
+                .order_by(KnowledgeGapTopic.last_seen.desc())
+                .limit(limit)
+                .all()
+            )
+            return [
+                GapTopic(
+                    tenant_id=tenant_id,
+                    key=row.topic_key,
+                    category=row.category,
+                    topic=row.topic,
+                    occurrences=row.occurrences,
+                    confidence_sum=row.confidence_sum,
+                    max_confidence=row.max_confidence,
+                    sample_query=row.sample_query or "",
+                    sample_response=row.sample_response or "",
+                    conversation_id=row.conversation_id or "",
+                    first_seen=_as_utc(row.first_seen),
+                    last_seen=_as_utc(row.last_seen),
+                    resolved=bool(row.resolved),
+                )
+                for row in reversed(rows)  # least recently seen first
+            ]
+        finally:
+            db.close()
+
+    def save(self, deltas: list[GapTopic]) -> None:
+        from app.domains.support.models import KnowledgeGapTopic
+
+        by_tenant: dict[int, list[GapTopic]] = defaultdict(list)
+        for delta in deltas:
+            by_tenant[delta.tenant_id].append(delta)
+
+        db = self._session()
+        try:
+            for tenant_id, items in by_tenant.items():
+                existing = {
+                    row.topic_key: row
+                    for row in db.query(KnowledgeGapTopic).filter(
+                        KnowledgeGapTopic.tenant_id == tenant_id,
+                        KnowledgeGapTopic.topic_key.in_([d.key for d in items]),
+                    )
+                }
+                for delta in items:
+                    row = existing.get(delta.key)
+                    if row is None:
+                        row = KnowledgeGapTopic(
+                            tenant_id=tenant_id, topic_key=delta.key, category=delta.category,
+                            topic=delta.topic[:200], occurrences=0, confidence_sum=0.0, max_confidence=0.0,
+                            first_seen=delta.first_seen,
+                        )
+                        db.add(row)
+                    row.occurrences = (row.occurrences or 0) + delta.pending_occurrences
+                    row.confidence_sum = (row.confidence_sum or 0.0) + delta.pending_confidence
+                    row.max_confidence = max(row.max_confidence or 0.0, delta.max_confidence)
+                    if delta.pending_occurrences:
+                        row.sample_query = delta.sample_query
+                        row.sample_response = delta.sample_response
+                        row.conversation_id = delta.conversation_id
+                        row.last_seen = delta.last_seen
+                    row.resolved = delta.resolved
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+def _as_utc(value: Optional[datetime]) -> datetime:
+    if value is None:
+        return datetime.now(timezone.utc)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -444,15 +809,47 @@ class InterventionEngine:
     - Pause/resume agent
     - Whisper (admin-only notes)
     - Forced escalation
+
+    Conversation control and history live in the state store, so a takeover
+    made on one worker stops the agent on the worker running the
+    conversation. Lookups with a shared store need the tenant; without
+    ``tenant_id`` the engine falls back to tenants it has seen locally.
     """
 
-    def __init__(self):
-        self._conversation_states: dict[str, ConversationStatus] = {}
-        self._takeover_admins: dict[str, dict] = {}  # conv_id -> admin info
-        self._intervention_history: dict[int, list[InterventionRecord]] = defaultdict(list)
-        self._paused_conversations: set[str] = set()
+    def __init__(self, state: Optional[LocalGhostState | RedisGhostState] = None):
+        self._state = state or LocalGhostState()
+        self._tenant_of: dict[str, int] = {}  # conv_id -> tenant_id, local hint only
+
+    async def _record(self, record: InterventionRecord) -> InterventionRecord:
+        self._tenant_of[record.conversation_id] = record.tenant_id
+        await self._state.add_intervention(record.tenant_id, record.to_dict())
+        return record
+
+    async def _control(self, conversation_id: str, tenant_id: Optional[int] = None) -> dict:
+        if tenant_id is None:
+            tenant_id = self._tenant_of.get(conversation_id)
+        return await self._state.get_control(tenant_id, conversation_id) or {
+            "status": ConversationStatus.ACTIVE.value, "paused": False, "admin": None,
+        }
 
-    def inject_message(
+    async def _set_control(
+        self,
+        tenant_id: int,
+        conversation_id: str,
+        status: Optional[ConversationStatus] = None,
+        paused: Optional[bool] = None,
+        admin: Any = ...,
+    ) -> None:
+        current = await self._control(conversation_id, tenant_id)
+        await self._state.set_control(
+            tenant_id,
+            conversation_id,
+            status=(status.value if status else current["status"]),
+            paused=current["paused"] if paused is None else paused,
+            admin=current["admin"] if admin is ... else admin,
+        )
+
+    async def inject_message(
         self,
         tenant_id: int,
         conversation_id: str,
@@ -461,15 +858,14 @@ class InterventionEngine:
         content: str,
     ) -> InterventionRecord:
         """Inject a message into a conversation as the agent."""
-        record = InterventionRecord(
+        record = await self._record(InterventionRecord(
             tenant_id=tenant_id,
             conversation_id=conversation_id,
             admin_user_id=admin_user_id,
             admin_email=admin_email,
             intervention_type=InterventionType.INJECT_MESSAGE,
             content=content,
-        )
-        self._intervention_history[tenant_id].append(record)
+        ))
 
         logger.info("intervention.inject",
                      tenant_id=tenant_id,
@@ -478,7 +874,7 @@ class InterventionEngine:
 
         return record
 
-    def takeover(
+    async def takeover(
         self,
         tenant_id: int,
         conversation_id: str,
@@ -486,22 +882,24 @@ class InterventionEngine:
         admin_email: str,
     ) -> InterventionRecord:
         """Take over a conversation (pause agent, admin responds)."""
-        self._conversation_states[conversation_id] = ConversationStatus.TAKEN_OVER
-        self._takeover_admins[conversation_id] = {
-            "admin_user_id": admin_user_id,
-            "admin_email": admin_email,
-            "started_at": datetime.now(timezone.utc).isoformat(),
-        }
-        self._paused_conversations.add(conversation_id)
+        await self._set_control(
+            tenant_id, conversation_id,
+            status=ConversationStatus.TAKEN_OVER,
+            paused=True,
+            admin={
+                "admin_user_id": admin_user_id,
+                "admin_email": admin_email,
+                "started_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
 
-        record = InterventionRecord(
+        record = await self._record(InterventionRecord(
             tenant_id=tenant_id,
             conversation_id=conversation_id,
             admin_user_id=admin_user_id,
             admin_email=admin_email,
             intervention_type=InterventionType.TAKEOVER,
-        )
-        self._intervention_history[tenant_id].append(record)
+        ))
 
         logger.info("intervention.takeover",
                      tenant_id=tenant_id,
@@ -510,7 +908,7 @@ class InterventionEngine:
 
         return record
 
-    def release(
+    async def release(
         self,
         tenant_id: int,
         conversation_id: str,
@@ -518,18 +916,15 @@ class InterventionEngine:
         admin_email: str,
     ) -> InterventionRecord:
         """Release a taken-over conversation back to the agent."""
-        self._conversation_states[conversation_id] = ConversationStatus.ACTIVE
-        self._takeover_admins.pop(conversation_id, None)
-        self._paused_conversations.discard(conversation_id)
+        await self._set_control(tenant_id, conversation_id, status=ConversationStatus.ACTIVE, paused=False, admin=None)
 
-        record = InterventionRecord(
+        record = await self._record(InterventionRecord(
             tenant_id=tenant_id,
             conversation_id=conversation_id,
             admin_user_id=admin_user_id,
             admin_email=admin_email,
             intervention_type=InterventionType.RELEASE,
-        )
-        self._intervention_history[tenant_id].append(record)
+        ))
 
         logger.info("intervention.release",
                      tenant_id=tenant_id,
@@ -538,35 +933,29 @@ class InterventionEngine:
 
         return record
 
-    def pause_agent(self, tenant_id: int, conversation_id: str, admin_email: str) -> InterventionRecord:
+    async def pause_agent(self, tenant_id: int, conversation_id: str, admin_email: str) -> InterventionRecord:
         """Pause agent responses for a conversation."""
-        self._paused_conversations.add(conversation_id)
-        self._conversation_states[conversation_id] = ConversationStatus.PAUSED
+        await self._set_control(tenant_id, conversation_id, status=ConversationStatus.PAUSED, paused=True)
 
-        record = InterventionRecord(
+        return await self._record(InterventionRecord(
             tenant_id=tenant_id,
             conversation_id=conversation_id,
             admin_email=admin_email,
             intervention_type=InterventionType.PAUSE_AGENT,
-        )
-        self._intervention_history[tenant_id].append(record)
-        return record
+        ))
 
-    def resume_agent(self, tenant_id: int, conversation_id: str, admin_email: str) -> InterventionRecord:
+    async def resume_agent(self, tenant_id: int, conversation_id: str, admin_email: str) -> InterventionRecord:
         """Resume agent responses for a conversation."""
-        self._paused_conversations.discard(conversation_id)
-        self._conversation_states[conversation_id] = ConversationStatus.ACTIVE
+        await self._set_control(tenant_id, conversation_id, status=ConversationStatus.ACTIVE, paused=False)
 
-        record = InterventionRecord(
+        return await self._record(InterventionRecord(
             tenant_id=tenant_id,
             conversation_id=conversation_id,
             admin_email=admin_email,
             intervention_type=InterventionType.RESUME_AGENT,
-        )
-        self._intervention_history[tenant_id].append(record)
-        return record
+        ))
 
-    def force_escalate(
+    async def force_escalate(
         self,
         tenant_id: int,
         conversation_id: str,
@@ -574,16 +963,15 @@ class InterventionEngine:
         reason: str = "",
     ) -> InterventionRecord:
         """Force escalation of a conversation to human support."""
-        self._conversation_states[conversation_id] = ConversationStatus.ESCALATED
+        await self._set_control(tenant_id, conversation_id, status=ConversationStatus.ESCALATED)
 
-        record = InterventionRecord(
+        record = await self._record(InterventionRecord(
             tenant_id=tenant_id,
             conversation_id=conversation_id,
             admin_email=admin_email,
             intervention_type=InterventionType.FORCE_ESCALATE,
             content=reason,
-        )
-        self._intervention_history[tenant_id].append(record)
+        ))
 
         logger.info("intervention.force_escalate",
                      tenant_id=tenant_id,
@@ -592,34 +980,38 @@ class InterventionEngine:
 
         return record
 
-    def is_paused(self, conversation_id: str) -> bool:
+    async def is_paused(self, conversation_id: str, tenant_id: Optional[int] = None) -> bool:
         """Check if a conversation's agent is paused."""
-        return conversation_id in self._paused_conversations
+        return (await self._control(conversation_id, tenant_id))["paused"]
 
-    def is_taken_over(self, conversation_id: str) -> bool:
+    async def is_taken_over(self, conversation_id: str, tenant_id: Optional[int] = None) -> bool:
         """Check if a conversation is taken over by an admin."""
-        return self._conversation_states.get(conversation_id) == ConversationStatus.TAKEN_OVER
+        return (await self._control(conversation_id, tenant_id))["status"] == ConversationStatus.TAKEN_OVER.value
+
+    async def agent_may_respond(self, conversation_id: str, tenant_id: Optional[int] = None) -> bool:
+        """Neither paused nor taken over (one state lookup)."""
+        control = await self._control(conversation_id, tenant_id)
+        return not control["paused"] and control["status"] != ConversationStatus.TAKEN_OVER.value
 
-    def get_conversation_status(self, conversation_id: str) -> ConversationStatus:
+    async def get_conversation_status(self, conversation_id: str, tenant_id: Optional[int] = None) -> ConversationStatus:
         """Get the current status of a conversation."""
-        return self._conversation_states.get(conversation_id, ConversationStatus.ACTIVE)
+        return ConversationStatus((await self._control(conversation_id, tenant_id))["status"])
 
-    def get_takeover_admin(self, conversation_id: str) -> Optional[dict]:
+    async def get_takeover_admin(self, conversation_id: str, tenant_id: Optional[int] = None) -> Optional[dict]:
         """Get info about the admin who took over a conversation."""
-        return self._takeover_admins.get(conversation_id)
+        return (await self._control(conversation_id, tenant_id))["admin"]
 
-    def get_intervention_history(
+    async def get_intervention_history(
         self,
         tenant_id: int,
         conversation_id: str = "",
         limit: int = 50,
     ) -> list[dict]:
-        """Get intervention history for a tenant."""
-        records = self._intervention_history.get(tenant_id, [])
+        """Get intervention history for a tenant (newest first)."""
+        records = await self._state.interventions(tenant_id)
         if conversation_id:
-            records = [r for r in records if r.conversation_id == conversation_id]
-        records.sort(key=lambda r: r.timestamp, reverse=True)
-        return [r.to_dict() for r in records[:limit]]
+            records = [r for r in records if r["conversation_id"] == conversation_id]
+        return records[:limit]
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -627,7 +1019,12 @@ class InterventionEngine:
 # ══════════════════════════════════════════════════════════════════════════════
 
 class ConversationMonitor:
-    """Monitors active conversations and computes real-time quality scores."""
+    """Monitors active conversations and computes real-time quality scores.
+
+    Scores are indexed by tenant and expire after ``idle_seconds`` without
+    activity. With a shared state store every update is mirrored there, so
+    the dashboard on any worker sees conversations handled by all of them.
+    """
 
     # Negative sentiment indicators
     NEGATIVE_INDICATORS = [
@@ -643,25 +1040,64 @@ class ConversationMonitor:
         "wonderful", "satisfied",
     ]
 
-    def __init__(self):
-        self._scores: dict[str, ConversationScore] = {}
+    def __init__(
+        self,
+        state: Optional[LocalGhostState | RedisGhostState] = None,
+        idle_seconds: float = GHOST_SCORE_IDLE_SECONDS,
+        clock=time.time,
+    ):
+        self._state = state or LocalGhostState()
+        self._idle_seconds = idle_seconds
+        self._clock = clock
+        # Least recently active first, so idle eviction stops at the first fresh entry
+        self._scores: OrderedDict[str, ConversationScore] = OrderedDict()
+        self._by_tenant: dict[int, dict[str, ConversationScore]] = defaultdict(dict)
         self._last_user_message_time: dict[str, float] = {}
 
-    def get_or_create_score(self, conversation_id: str, tenant_id: int) -> ConversationScore:
-        """Get or create a conversation score tracker."""
-        if conversation_id not in self._scores:
-            self._scores[conversation_id] = ConversationScore(
-                conversation_id=conversation_id,
-                tenant_id=tenant_id,
-            )
-        return self._scores[conversation_id]
+    def _evict_idle(self, now: float) -> None:
+        cutoff = now - self._idle_seconds
+        while self._scores:
+            conversation_id, score = next(iter(self._scores.items()))
+            if score.last_activity >= cutoff:
+                break
+            self._drop(conversation_id)
 
-    def record_user_message(self, conversation_id: str, tenant_id: int, message: str):
+    def _drop(self, conversation_id: str) -> Optional[ConversationScore]:
+        score = self._scores.pop(conversation_id, None)
+        self._last_user_message_time.pop(conversation_id, None)
+        if score is not None:
+            tenant_scores = self._by_tenant.get(score.tenant_id)
+            if tenant_scores is not None:
+                tenant_scores.pop(conversation_id, None)
+                if not tenant_scores:
+                    del self._by_tenant[score.tenant_id]
+        return score
+
+    async def _touched(self, score: ConversationScore) -> None:
+        """Publish *score* after an update."""
+        if self._state.shared:
+            await self._state.put_score(score.tenant_id, score.conversation_id, score.to_dict(), score.last_activity)
+
+    def get_or_create_score(self, conversation_id: str, tenant_id: int) -> ConversationScore:
+        """Get or create a conversation score tracker and mark it active."""
+        now = self._clock()
+        self._evict_idle(now)
+        score = self._scores.get(conversation_id)
+        if score is None:
+            score = ConversationScore(conversation_id=conversation_id, tenant_id=tenant_id, last_activity=now)
+            self._scores[conversation_id] = score
+            self._by_tenant[tenant_id][conversation_id] = score
+        else:
+            score.last_activity = now
+            self._scores.move_to_end(conversation_id)
+        return score
+
+    async def record_user_message(self, conversation_id: str, tenant_id: int, message: str):
         """Record a user message and update scores."""
         score = self.get_or_create_score(conversation_id, tenant_id)
         score.message_count += 1
         score.user_message_count += 1
-        self._last_user_message_time[conversation_id] = time.time()
+        self._last_user_message_time[conversation_id] = self._clock()
 
         # Update sentiment
         msg_lower = message.lower()
@@ -675,8 +1111,9 @@ class ConversationMonitor:
         # Check if needs attention (many user messages without resolution)
         if score.user_message_count > 5 and score.sentiment_score < 0.3:
             score.needs_attention = True
+        await self._touched(score)
 
-    def record_agent_response(self, conversation_id: str, tenant_id: int, response: str):
+    async def record_agent_response(self, conversation_id: str, tenant_id: int, response: str):
         """Record an agent response and update scores."""
         score = self.get_or_create_score(conversation_id, tenant_id)
         score.message_count += 1
@@ -684,65 +1121,79 @@ class ConversationMonitor:
 
         # Calculate response time
         if conversation_id in self._last_user_message_time:
-            response_time_ms = (time.time() - self._last_user_message_time[conversation_id]) * 1000
+            response_time_ms = (self._clock() - self._last_user_message_time[conversation_id]) * 1000
             score.add_response_time(response_time_ms)
 
         # Update coherence based on response length
         if len(response) < 10:
             score.coherence_score = max(0.0, score.coherence_score - 0.1)
+        await self._touched(score)
 
-    def record_tool_call(self, conversation_id: str, tenant_id: int):
+    async def record_tool_call(self, conversation_id: str, tenant_id: int):
         """Record a tool call in the conversation."""
         score = self.get_or_create_score(conversation_id, tenant_id)
         score.tool_call_count += 1
         # Tool calls generally indicate the agent is working on the problem
         score.resolution_score = min(1.0, score.resolution_score + 0.05)
+        await self._touched(score)
 
-    def record_error(self, conversation_id: str, tenant_id: int):
+    async def record_error(self, conversation_id: str, tenant_id: int):
         """Record an error in the conversation."""
         score = self.get_or_create_score(conversation_id, tenant_id)
         score.error_count += 1
         score.relevance_score = max(0.0, score.relevance_score - 0.15)
         score.needs_attention = True
+        await self._touched(score)
 
-    def record_knowledge_gap(self, conversation_id: str, tenant_id: int):
+    async def record_knowledge_gap(self, conversation_id: str, tenant_id: int):
         """Record a knowledge gap detection."""
         score = self.get_or_create_score(conversation_id, tenant_id)
         score.has_knowledge_gap = True
         score.relevance_score = max(0.0, score.relevance_score - 0.1)
+        await self._touched(score)
 
-    def record_escalation_signal(self, conversation_id: str, tenant_id: int):
+    async def record_escalation_signal(self, conversation_id: str, tenant_id: int):
         """Record an escalation signal."""
         score = self.get_or_create_score(conversation_id, tenant_id)
         score.has_escalation_signal = True
         score.needs_attention = True
+        await self._touched(score)
 
     def get_score(self, conversation_id: str) -> Optional[ConversationScore]:
-        """Get the current score for a conversation."""
+        """Get the current score for a conversation handled by this process."""
+        self._evict_idle(self._clock())
         return self._scores.get(conversation_id)
 
-    def get_active_scores(self, tenant_id: int) -> list[dict]:
+    def get_tenant_id(self, conversation_id: str) -> Optional[int]:
+        score = self._scores.get(conversation_id)
+        return score.tenant_id if score else None
+
+    async def _tenant_scores(self, tenant_id: int) -> list[dict]:
+        now = self._clock()
+        if self._state.shared:
+            return await self._state.active_scores(tenant_id, self._idle_seconds, now)
+        self._evict_idle(now)
+        return [s.to_dict() for s in self._by_tenant.get(tenant_id, {}).values()]
+
+    async def get_active_scores(self, tenant_id: int) -> list[dict]:
         """Get all active conversation scores for a tenant."""
-        scores = [
-            s.to_dict() for s in self._scores.values()
-            if s.tenant_id == tenant_id
-        ]
+        scores = await self._tenant_scores(tenant_id)
         # Sort by needs_attention first, then by overall_score ascending
         scores.sort(key=lambda s: (not s["flags"]["needs_attention"], s["overall_score"]))
         return scores
 
-    def get_attention_needed(self, tenant_id: int) -> list[dict]:
+    async def get_attention_needed(self, tenant_id: int) -> list[dict]:
         """Get conversations that need admin attention."""
-        return [
-            s.to_dict() for s in self._scores.values()
-            if s.tenant_id == tenant_id and s.needs_attention
-        ]
+        return [s for s in await self._tenant_scores(tenant_id) if s["flags"]["needs_attention"]]
 
-    def end_conversation(self, conversation_id: str) -> Optional[dict]:
+    async def end_conversation(self, conversation_id: str) -> Optional[dict]:
         """End monitoring for a conversation and return final score."""
-        score = self._scores.pop(conversation_id, None)
-        self._last_user_message_time.pop(conversation_id, None)
-        return score.to_dict() if score else None
+        score = self._drop(conversation_id)
+        if score is None:
+            return None
+        if self._state.shared:
+            await self._state.remove_score(score.tenant_id, conversation_id)
+        return score.to_dict()
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -757,36 +1208,75 @@ class GhostModeV2:
     - InterventionEngine (admin actions)
     - KnowledgeGapDetector (gap analysis)
     - Event streaming (to WebSocket)
-    """
 
-    def __init__(self):
-        self.monitor = ConversationMonitor()
-        self.intervention = InterventionEngine()
-        self.gap_detector = KnowledgeGapDetector()
-        self._event_listeners: dict[int, list] = defaultdict(list)  # tenant_id -> callbacks
+    With a shared (Redis) state store events are published on the tenant's
+    channel and every worker forwards them to its own listeners; otherwise
+    they are delivered in-process. Either way ``emit_event`` only enqueues:
+    each listener is drained by its own ``GhostSubscriber`` task.
+    """
 
-    def register_listener(self, tenant_id: int, callback):
+    def __init__(
+        self,
+        state: Optional[LocalGhostState | RedisGhostState] = None,
+        gap_store: Optional[KnowledgeGapStore] = None,
+    ):
+        self.state = state or LocalGhostState()
+        self.monitor = ConversationMonitor(self.state)
+        self.intervention = InterventionEngine(self.state)
+        self.gap_detector = KnowledgeGapDetector(store=gap_store)
+        self._subscribers: dict[int, list[GhostSubscriber]] = defaultdict(list)  # tenant_id -> subscribers
+        self._listener: Optional[RedisEventListener] = None
+        self._gap_flush: Optional[asyncio.Task] = None
+
+    async def _ensure_event_listener(self) -> None:
+        if self._listener is not None or not self.state.shared:
+            return
+        self._listener = RedisEventListener(self.state.client, self._deliver)
+        await self._listener.start()
+
+    async def register_listener(self, tenant_id: int, callback) -> GhostSubscriber:
         """Register an event listener for a tenant (e.g., WebSocket broadcast)."""
-        self._event_listeners[tenant_id].append(callback)
+        subscriber = GhostSubscriber(tenant_id, callback, on_close=self._remove_subscriber)
+        self._subscribers[tenant_id].append(subscriber)
+        subscriber.start()
+        await self._ensure_event_listener()
+        return subscriber
 
     def unregister_listener(self, tenant_id: int, callback):
         """Unregister an event listener."""
-        if tenant_id in self._event_listeners:
-            self._event_listeners[tenant_id] = [
-                cb for cb in self._event_listeners[tenant_id] if cb != callback
-            ]
+        for subscriber in list(self._subscribers.get(tenant_id, [])):
+            if subscriber.callback == callback:
+                subscriber.close()
+
+    def _remove_subscriber(self, subscriber: GhostSubscriber) -> None:
+        subscribers = self._subscribers.get(subscriber.tenant_id)
+        if subscribers and subscriber in subscribers:
+            subscribers.remove(subscriber)
+            if not subscribers:
+                del self._subscribers[subscriber.tenant_id]
+
+    def _deliver(self, tenant_id: int, payload: dict) -> None:
+        for subscriber in list(self._subscribers.get(tenant_id, ())):
+            subscriber.offer(payload)
 
     async def emit_event(self, event: GhostEvent):
         """Emit an event to all listeners for the tenant."""
-        listeners = self._event_listeners.get(event.tenant_id, [])
-        for listener in listeners:
-            try:
-                if asyncio.iscoroutinefunction(listener):
-                    await listener(event.to_dict())
-                else:
-                    listener(event.to_dict())
-            except Exception as e:
-                logger.error("ghost.emit_failed", error=str(e))
+        payload = event.to_dict()
+        if await self.state.publish(event.tenant_id, payload):
+            return
+        # Local store, or Redis unreachable: at least this worker's dashboards get it
+        self._deliver(event.tenant_id, payload)
+        # Give the subscriber tasks a turn before the caller continues
+        await asyncio.sleep(0)
+
+    async def close(self) -> None:
+        """Stop the event listener and drop all subscribers."""
+        if self._listener is not None:
+            await self._listener.stop()
+            self._listener = None
+        for subscribers in list(self._subscribers.values()):
+            for subscriber in list(subscribers):
+                subscriber.close()
 
     async def on_user_message(
         self,
@@ -798,7 +1288,7 @@ class GhostModeV2:
     ):
         """Process an incoming user message."""
         # Update monitor
-        self.monitor.record_user_message(conversation_id, tenant_id, message)
+        await self.monitor.record_user_message(conversation_id, tenant_id, message)
 
         # Emit event
         await self.emit_event(GhostEvent(
@@ -824,15 +1314,18 @@ class GhostModeV2:
     ):
         """Process an agent response."""
         # Update monitor
-        self.monitor.record_agent_response(conversation_id, tenant_id, response)
+        await self.monitor.record_agent_response(conversation_id, tenant_id, response)
 
         # Check for knowledge gaps
         if user_message:
+            await self.gap_detector.preload(tenant_id)
             gap = self.gap_detector.analyze_exchange(
                 tenant_id, conversation_id, user_message, response
             )
+            if self.gap_detector.flush_due() and (self._gap_flush is None or self._gap_flush.done()):
+                self._gap_flush = asyncio.create_task(self.gap_detector.flush())
             if gap:
-                self.monitor.record_knowledge_gap(conversation_id, tenant_id)
+                await self.monitor.record_knowledge_gap(conversation_id, tenant_id)
                 await self.emit_event(GhostEvent(
                     event_type=GhostEventType.KNOWLEDGE_GAP,
                     tenant_id=tenant_id,
@@ -876,7 +1369,7 @@ class GhostModeV2:
         tool_args: dict,
     ):
         """Process a tool call by the agent."""
-        self.monitor.record_tool_call(conversation_id, tenant_id)
+        await self.monitor.record_tool_call(conversation_id, tenant_id)
 
         await self.emit_event(GhostEvent(
             event_type=GhostEventType.AGENT_TOOL_CALL,
@@ -892,7 +1385,7 @@ class GhostModeV2:
         error: str,
     ):
         """Process an agent error."""
-        self.monitor.record_error(conversation_id, tenant_id)
+        await self.monitor.record_error(conversation_id, tenant_id)
 
         await self.emit_event(GhostEvent(
             event_type=GhostEventType.AGENT_ERROR,
@@ -901,20 +1394,20 @@ class GhostModeV2:
             data={"error": error},
         ))
 
-    def should_agent_respond(self, conversation_id: str) -> bool:
+    async def should_agent_respond(self, conversation_id: str, tenant_id: Optional[int] = None) -> bool:
         """Check if the agent should respond (not paused/taken over)."""
-        return (
-            not self.intervention.is_paused(conversation_id)
-            and not self.intervention.is_taken_over(conversation_id)
-        )
+        if tenant_id is None:
+            tenant_id = self.monitor.get_tenant_id(conversation_id)
+        return await self.intervention.agent_may_respond(conversation_id, tenant_id)
 
-    def get_dashboard_state(self, tenant_id: int) -> dict:
+    async def get_dashboard_state(self, tenant_id: int) -> dict:
         """Get the full dashboard state for Ghost Mode v2."""
+        await self.gap_detector.preload(tenant_id)
         return {
-            "active_conversations": self.monitor.get_active_scores(tenant_id),
-            "attention_needed": self.monitor.get_attention_needed(tenant_id),
+            "active_conversations": await self.monitor.get_active_scores(tenant_id),
+            "attention_needed": await self.monitor.get_attention_needed(tenant_id),
             "knowledge_gaps": self.gap_detector.get_gap_summary(tenant_id),
-            "recent_interventions": self.intervention.get_intervention_history(tenant_id, limit=20),
+            "recent_interventions": await self.intervention.get_intervention_history(tenant_id, limit=20),
         }
 
 
@@ -941,7 +1434,8 @@ _ghost_mode_v2: Optional[GhostModeV2] = None
 def get_ghost_mode_v2() -> GhostModeV2:
     global _ghost_mode_v2
     if _ghost_mode_v2 is None:
-        _ghost_mode_v2 = GhostModeV2()
+        state = RedisGhostState() if GHOST_MODE_STATE_BACKEND == "redis" else LocalGhostState()
+        _ghost_mode_v2 = GhostModeV2(state, gap_store=KnowledgeGapStore())
     return _ghost_mode_v2
 
 
@@ -953,25 +1447,25 @@ def create_ghost_mode_v2_router() -> APIRouter:
     async def get_dashboard(tenant_id: int):
         """Get the full Ghost Mode v2 dashboard state."""
         gm = get_ghost_mode_v2()
-        return gm.get_dashboard_state(tenant_id)
+        return await gm.get_dashboard_state(tenant_id)
 
     @router.get("/conversations/{tenant_id}")
     async def get_active_conversations(tenant_id: int):
         """Get all active conversations with quality scores."""
         gm = get_ghost_mode_v2()
-        return {"conversations": gm.monitor.get_active_scores(tenant_id)}
+        return {"conversations": await gm.monitor.get_active_scores(tenant_id)}
 
     @router.get("/attention/{tenant_id}")
     async def get_attention_needed(tenant_id: int):
         """Get conversations that need admin attention."""
         gm = get_ghost_mode_v2()
-        return {"conversations": gm.monitor.get_attention_needed(tenant_id)}
+        return {"conversations": await gm.monitor.get_attention_needed(tenant_id)}
 
     @router.post("/intervene/inject/{tenant_id}")
     async def inject_message(tenant_id: int, req: InterventionRequest):
         """Inject a message into a conversation as the agent."""
         gm = get_ghost_mode_v2()
-        record = gm.intervention.inject_message(
+        record = await gm.intervention.inject_message(
             tenant_id, req.conversation_id,
             req.admin_user_id, req.admin_email, req.content
         )
@@ -981,7 +1475,7 @@ def create_ghost_mode_v2_router() -> APIRouter:
     async def takeover_conversation(tenant_id: int, req: InterventionRequest):
         """Take over a conversation."""
         gm = get_ghost_mode_v2()
-        record = gm.intervention.takeover(
+        record = await gm.intervention.takeover(
             tenant_id, req.conversation_id,
             req.admin_user_id, req.admin_email
         )
@@ -991,7 +1485,7 @@ def create_ghost_mode_v2_router() -> APIRouter:
     async def release_conversation(tenant_id: int, req: InterventionRequest):
         """Release a taken-over conversation."""
         gm = get_ghost_mode_v2()
-        record = gm.intervention.release(
+        record = await gm.intervention.release(
             tenant_id, req.conversation_id,
             req.admin_user_id, req.admin_email
         )
@@ -1001,7 +1495,7 @@ def create_ghost_mode_v2_router() -> APIRouter:
     async def pause_agent(tenant_id: int, req: InterventionRequest):
         """Pause agent responses for a conversation."""
         gm = get_ghost_mode_v2()
-        record = gm.intervention.pause_agent(
+        record = await gm.intervention.pause_agent(
             tenant_id, req.conversation_id, req.admin_email
         )
         return record.to_dict()
@@ -1010,7 +1504,7 @@ def create_ghost_mode_v2_router() -> APIRouter:
     async def resume_agent(tenant_id: int, req: InterventionRequest):
         """Resume agent responses for a conversation."""
         gm = get_ghost_mode_v2()
-        record = gm.intervention.resume_agent(
+        record = await gm.intervention.resume_agent(
             tenant_id, req.conversation_id, req.admin_email
         )
         return record.to_dict()
@@ -1019,7 +1513,7 @@ def create_ghost_mode_v2_router() -> APIRouter:
     async def force_escalate(tenant_id: int, req: InterventionRequest):
         """Force escalation of a conversation."""
         gm = get_ghost_mode_v2()
-        record = gm.intervention.force_escalate(
+        record = await gm.intervention.force_escalate(
             tenant_id, req.conversation_id, req.admin_email, req.reason
         )
         return record.to_dict()
@@ -1029,7 +1523,7 @@ def create_ghost_mode_v2_router() -> APIRouter:
         """Get intervention history."""
         gm = get_ghost_mode_v2()
         return {
-            "interventions": gm.intervention.get_intervention_history(
+            "interventions": await gm.intervention.get_intervention_history(
                 tenant_id, conversation_id, limit
             )
         }
@@ -1043,6 +1537,7 @@ def create_ghost_mode_v2_router() -> APIRouter:
     ):
         """Get detected knowledge gaps."""
         gm = get_ghost_mode_v2()
+        await gm.gap_detector.preload(tenant_id)
         gaps = gm.gap_detector.get_gaps(tenant_id, category, min_confidence, limit)
         return {"gaps": [g.to_dict() for g in gaps]}
 
@@ -1050,23 +1545,25 @@ def create_ghost_mode_v2_router() -> APIRouter:
     async def get_knowledge_gap_summary(tenant_id: int):
         """Get knowledge gap summary by category."""
         gm = get_ghost_mode_v2()
+        await gm.gap_detector.preload(tenant_id)
         return gm.gap_detector.get_gap_summary(tenant_id)
 
     @router.post("/knowledge-gaps/{tenant_id}/resolve/{gap_id}")
     async def resolve_knowledge_gap(tenant_id: int, gap_id: str):
         """Mark a knowledge gap as resolved."""
         gm = get_ghost_mode_v2()
+        await gm.gap_detector.preload(tenant_id)
         if not gm.gap_detector.resolve_gap(tenant_id, gap_id):
             raise HTTPException(404, "Knowledge gap not found")
         return {"status": "resolved", "gap_id": gap_id}
 
     @router.get("/conversation/{conversation_id}/status")
-    async def get_conversation_status(conversation_id: str):
+    async def get_conversation_status(conversation_id: str, tenant_id: Optional[int] = None):
         """Get the status of a specific conversation."""
         gm = get_ghost_mode_v2()
-        status = gm.intervention.get_conversation_status(conversation_id)
+        status = await gm.intervention.get_conversation_status(conversation_id, tenant_id)
         score = gm.monitor.get_score(conversation_id)
-        takeover_admin = gm.intervention.get_takeover_admin(conversation_id)
+        takeover_admin = await gm.intervention.get_takeover_admin(conversation_id, tenant_id)
         return {
             "conversation_id": conversation_id,
             "status": status.value,
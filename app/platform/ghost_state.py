@@ -0,0 +1,400 @@
+"""app/platform/ghost_state.py — Shared state and event fan-out for Ghost Mode v2.
+
+Ghost Mode v2 used to keep takeover/pause flags, intervention history and
+conversation scores in process-local dicts and awaited every dashboard
+socket in turn. With several gateway workers a takeover made on one worker
+was invisible to the worker running the conversation, and one slow socket
+delayed all others.
+
+Two interchangeable stores:
+
+    LocalGhostState   single process (tests, dev): plain dicts
+    RedisGhostState   shared by all workers (``redis.asyncio`` client):
+
+        t{tid}:ghost:conv:{conversation_id}   hash   status, paused, admin (JSON)
+        t{tid}:ghost:interventions            list   newest first, capped
+        t{tid}:ghost:scores                   hash   conversation_id → score JSON
+        t{tid}:ghost:score_activity           zset   conversation_id → last activity
+        t{tid}:ghost:events                   pub/sub channel, one per tenant
+
+Every WebSocket listener gets a ``GhostSubscriber``: a bounded send queue
+drained by its own task. Events that only describe the latest state of a
+conversation are coalesced; when the queue is full the oldest event is
+dropped, so a slow client loses events instead of delaying the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from collections import deque
+from typing import Any, Callable, Optional
+
+import structlog
+
+from app.core.redis_keys import redis_key
+
+logger = structlog.get_logger()
+
+GHOST_SCORE_IDLE_SECONDS = float(os.getenv("GHOST_SCORE_IDLE_SECONDS", "1800"))
+GHOST_CONTROL_TTL_SECONDS = int(os.getenv("GHOST_CONTROL_TTL_SECONDS", str(7 * 24 * 3600)))
+GHOST_HISTORY_MAX = int(os.getenv("GHOST_HISTORY_MAX", "500"))
+GHOST_SUBSCRIBER_QUEUE = int(os.getenv("GHOST_SUBSCRIBER_QUEUE", "256"))
+GHOST_SEND_TIMEOUT_SECONDS = float(os.getenv("GHOST_SEND_TIMEOUT_SECONDS", "5"))
+GHOST_SUBSCRIBER_MAX_FAILURES = int(os.getenv("GHOST_SUBSCRIBER_MAX_FAILURES", "3"))
+
+# Event types that describe the current state of a conversation; a newer one
+# replaces a still-queued older one for the same conversation.
+COALESCED_EVENT_TYPES = frozenset({
+    "ghost.agent_thinking",
+    "ghost.quality_alert",
+    "ghost.sentiment_shift",
+    "ghost.system_status",
+})
+
+EVENTS_CHANNEL_PATTERN = "t*:ghost:events"
+
+
+def events_channel(tenant_id: int) -> str:
+    return redis_key(tenant_id, "ghost", "events")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# SUBSCRIBERS
+# ══════════════════════════════════════════════════════════════════════════════
+
+class GhostSubscriber:
+    """One dashboard connection with a bounded, coalescing send queue."""
+
+    def __init__(
+        self,
+        tenant_id: int,
+        callback: Callable[[dict], Any],
+        max_queue: int = GHOST_SUBSCRIBER_QUEUE,
+        send_timeout: float = GHOST_SEND_TIMEOUT_SECONDS,
+        max_failures: int = GHOST_SUBSCRIBER_MAX_FAILURES,
+        on_close: Optional[Callable[["GhostSubscriber"], None]] = None,
+    ) -> None:
+        self.tenant_id = tenant_id
+        self.callback = callback
+        self.max_queue = max(1, max_queue)
+        self.send_timeout = send_timeout
+        self.max_failures = max_failures
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self._failures = 0
+        self._queue: deque[list] = deque()  # [coalesce_key | None, payload]
+        self._latest: dict[tuple, list] = {}
+        self._wake = asyncio.Event()
+        self._closed = False
+        self._on_close = on_close
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def start(self) -> "GhostSubscriber":
+        """Start the sender on the running loop (or on the first ``offer`` if there is none yet)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wake = asyncio.Event()
+            if self._queue:
+                self._wake.set()
+            self._task = loop.create_task(self._drain(), name=f"ghost-subscriber-{self.tenant_id}")
+        return self
+
+    def offer(self, payload: dict) -> None:
+        """Queue *payload* without waiting; never blocks the publisher."""
+        if self._closed:
+            return
+        key = None
+        if payload.get("type") in COALESCED_EVENT_TYPES:
+            key = (payload["type"], payload.get("conversation_id", ""))
+            entry = self._latest.get(key)
+            if entry is not None:
+                entry[1] = payload
+                self.coalesced += 1
+                return
+        if len(self._queue) >= self.max_queue:
+            oldest_key, _ = self._queue.popleft()
+            if oldest_key is not None:
+                self._latest.pop(oldest_key, None)
+            self.dropped += 1
+        entry = [key, payload]
+        self._queue.append(entry)
+        if key is not None:
+            self._latest[key] = entry
+        self.start()
+        self._wake.set()
+
+    async def _drain(self) -> None:
+        try:
+            while not self._closed:
+                await self._wake.wait()
+                self._wake.clear()
+                while self._queue and not self._closed:
+                    key, payload = self._queue.popleft()
+                    if key is not None:
+                        self._latest.pop(key, None)
+                    await self._send(payload)
+        except asyncio.CancelledError:
+            pass
+
+    async def _send(self, payload: dict) -> None:
+        try:
+            if asyncio.iscoroutinefunction(self.callback):
+                await asyncio.wait_for(self.callback(payload), timeout=self.send_timeout)
+            else:
+                self.callback(payload)
+            self.sent += 1
+            self._failures = 0
+        except Exception as e:
+            self._failures += 1
+            logger.warning("ghost.subscriber_send_failed", tenant_id=self.tenant_id,
+                           failures=self._failures, error=str(e) or type(e).__name__)
+            if self._failures >= self.max_failures:
+                self.close()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.clear()
+        self._latest.clear()
+        self._wake.set()
+        if self._task is not None and not self._task.done():
+            try:
+                current = asyncio.current_task()
+            except RuntimeError:
+                current = None
+            if self._task is not current and not self._task.get_loop().is_closed():
+                self._task.cancel()
+        if self._on_close is not None:
+            self._on_close(self)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# STATE STORES
+# ══════════════════════════════════════════════════════════════════════════════
+
+class LocalGhostState:
+    """Process-local store: conversation control, intervention history, scores."""
+
+    shared = False
+
+    def __init__(self) -> None:
+        self._control: dict[str, dict] = {}
+        self._history: dict[int, list[dict]] = {}
+
+    # Conversation control (status / pause / takeover admin)
+    async def set_control(self, tenant_id: int, conversation_id: str, status: str,
+                          paused: bool, admin: Optional[dict] = None) -> None:
+        self._control[conversation_id] = {"status": status, "paused": paused, "admin": admin}
+
+    async def get_control(self, tenant_id: Optional[int], conversation_id: str) -> Optional[dict]:
+        return self._control.get(conversation_id)
+
+    # Intervention history
+    async def add_intervention(self, tenant_id: int, record: dict) -> None:
+        history = self._history.setdefault(tenant_id, [])
+        history.append(record)
+        if len(history) > GHOST_HISTORY_MAX:
+            del history[: len(history) - GHOST_HISTORY_MAX]
+
+    async def interventions(self, tenant_id: int) -> list[dict]:
+        return list(reversed(self._history.get(tenant_id, [])))
+
+    # Scores live in ConversationMonitor itself when not shared
+    async def put_score(self, tenant_id: int, conversation_id: str, score: dict, at: float) -> None:
+        pass
+
+    async def remove_score(self, tenant_id: int, conversation_id: str) -> None:
+        pass
+
+    async def active_scores(self, tenant_id: int, idle_seconds: float, now: float) -> list[dict]:
+        return []
+
+    # Events are delivered in-process by GhostModeV2
+    async def publish(self, tenant_id: int, payload: dict) -> bool:
+        return False
+
+
+class RedisGhostState:
+    """Ghost Mode state shared by all gateway workers through Redis.
+
+    *client* is a ``redis.asyncio`` client, so no lookup blocks the event loop.
+    """
+
+    shared = True
+
+    def __init__(self, client: Any = None) -> None:
+        if client is None:
+            import redis.asyncio as _redis
+            from config.settings import get_settings
+            client = _redis.from_url(get_settings().redis_url, decode_responses=True, socket_timeout=1)
+        self.client = client
+
+    @staticmethod
+    def _text(value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        return value.decode() if isinstance(value, bytes) else value
+
+    def _control_key(self, tenant_id: int, conversation_id: str) -> str:
+        return redis_key(tenant_id, "ghost", "conv", conversation_id)
+
+    async def set_control(self, tenant_id: int, conversation_id: str, status: str,
+                          paused: bool, admin: Optional[dict] = None) -> None:
+        key = self._control_key(tenant_id, conversation_id)
+        async with self.client.pipeline() as pipe:
+            pipe.hset(key, mapping={
+                "status": status,
+                "paused": "1" if paused else "0",
+                "admin": json.dumps(admin) if admin else "",
+            })
+            pipe.expire(key, GHOST_CONTROL_TTL_SECONDS)
+            await pipe.execute()
+
+    async def get_control(self, tenant_id: Optional[int], conversation_id: str) -> Optional[dict]:
+        if tenant_id is None:
+            return None
+        try:
+            raw = await self.client.hgetall(self._control_key(tenant_id, conversation_id))
+        except Exception as e:
+            # Fail open: the agent keeps answering rather than going silent
+            logger.warning("ghost.state_read_failed", tenant_id=tenant_id, error=str(e))
+            return None
+        if not raw:
+            return None
+        data = {self._text(k): self._text(v) for k, v in raw.items()}
+        return {
+            "status": data.get("status") or "active",
+            "paused": data.get("paused") == "1",
+            "admin": json.loads(data["admin"]) if data.get("admin") else None,
+        }
+
+    async def add_intervention(self, tenant_id: int, record: dict) -> None:
+        key = redis_key(tenant_id, "ghost", "interventions")
+        async with self.client.pipeline() as pipe:
+            pipe.lpush(key, json.dumps(record))
+            pipe.ltrim(key, 0, GHOST_HISTORY_MAX - 1)
+            await pipe.execute()
+
+    async def interventions(self, tenant_id: int) -> list[dict]:
+        raw = await self.client.lrange(redis_key(tenant_id, "ghost", "interventions"), 0, -1)
+        return [json.loads(self._text(r)) for r in raw]
+
+    async def put_score(self, tenant_id: int, conversation_id: str, score: dict, at: float) -> None:
+        scores = redis_key(tenant_id, "ghost", "scores")
+        activity = redis_key(tenant_id, "ghost", "score_activity")
+        ttl = int(GHOST_SCORE_IDLE_SECONDS * 2) + 60
+        try:
+            async with self.client.pipeline() as pipe:
+                pipe.hset(scores, conversation_id, json.dumps(score))
+                pipe.zadd(activity, {conversation_id: at})
+                pipe.expire(scores, ttl)
+                pipe.expire(activity, ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("ghost.score_write_failed", tenant_id=tenant_id, error=str(e))
+
+    async def remove_score(self, tenant_id: int, conversation_id: str) -> None:
+        async with self.client.pipeline() as pipe:
+            pipe.hdel(redis_key(tenant_id, "ghost", "scores"), conversation_id)
+            pipe.zrem(redis_key(tenant_id, "ghost", "score_activity"), conversation_id)
+            await pipe.execute()
+
+    async def active_scores(self, tenant_id: int, idle_seconds: float, now: float) -> list[dict]:
+        scores = redis_key(tenant_id, "ghost", "scores")
+        activity = redis_key(tenant_id, "ghost", "score_activity")
+        cutoff = now - idle_seconds
+        idle = await self.client.zrangebyscore(activity, "-inf", f"({cutoff}")
+        if idle:
+            async with self.client.pipeline() as pipe:
+                pipe.zrem(activity, *idle)
+                pipe.hdel(scores, *idle)
+                await pipe.execute()
+        active = [self._text(c) for c in await self.client.zrangebyscore(activity, cutoff, "+inf")]
+        if not active:
+            return []
+        return [json.loads(self._text(v)) for v in await self.client.hmget(scores, active) if v]
+
+    async def publish(self, tenant_id: int, payload: dict) -> bool:
+        try:
+            await self.client.publish(events_channel(tenant_id), json.dumps(payload))
+            return True
+        except Exception as e:
+            logger.warning("ghost.publish_failed", tenant_id=tenant_id, error=str(e))
+            return False
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# REDIS EVENT LISTENER
+# ══════════════════════════════════════════════════════════════════════════════
+
+class RedisEventListener:
+    """Task forwarding ``t*:ghost:events`` messages to ``deliver``.
+
+    ``deliver`` routes by tenant to the local subscribers, so one listener
+    serves every tenant this worker has dashboards for.
+    """
+
+    def __init__(self, client: Any, deliver: Callable[[int, dict], None], poll_timeout: float = 1.0) -> None:
+        self._client = client
+        self._deliver = deliver
+        self._poll_timeout = poll_timeout
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, wait: float = 2.0) -> "RedisEventListener":
+        """Start listening on the running loop; waits up to *wait* seconds for the subscription."""
+        self._task = asyncio.create_task(self._run(), name="ghost-events")
+        try:
+            await asyncio.wait_for(self._ready.wait(), wait)
+        except asyncio.TimeoutError:
+            pass
+        return self
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        backoff = 0.5
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.psubscribe(EVENTS_CHANNEL_PATTERN)
+                self._ready.set()
+                backoff = 0.5
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=self._poll_timeout)
+                    if not message or message.get("type") != "pmessage":
+                        continue
+                    channel = RedisGhostState._text(message["channel"])
+                    tenant_id = int(channel.split(":", 1)[0][1:])
+                    self._deliver(tenant_id, json.loads(RedisGhostState._text(message["data"])))
+            except Exception as e:
+                logger.debug("ghost.event_listener_error", error=str(e))
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
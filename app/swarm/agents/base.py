@@ -118,6 +118,24 @@ class ExpertAgent(ABC):
             MaxTurnsExceeded: If the loop hits max_turns without resolution.
         """
         from app.swarm.llm import LLMClient
+        from app.knowledge.answer_cache import get_answer_cache
+
+        # Semantic answer cache: repeated knowledge questions skip the loop
+        answer_cache = get_answer_cache()
+        tenant_slug = task.tenant_context.tenant_slug
+        cacheable = answer_cache.accepts(task, self.agent_id)
+        if cacheable:
+            cache_generation = await answer_cache.generation(tenant_slug)
+            cached = await answer_cache.lookup(tenant_slug, self.agent_id, task.original_message)
+            if cached is not None:
+                return AgentResult(
+                    agent_id=self.agent_id,
+                    content=cached.content,
+                    confidence=0.9,
+                    metadata={"answer_cache": "hit"},
+                )
+        tools_used: list[str] = []
+        tokens_used = 0
 
         # Build tool schemas for LLM
         tool_schemas = [t.to_openai_schema() for t in tools]
@@ -164,12 +182,21 @@ class ExpertAgent(ABC):
                     content="Es gab ein technisches Problem. Bitte versuche es gleich nochmal!",
                     confidence=0.3,
                 )
+            tokens_used += int(response.total_tokens or 0)
 
             # No tool calls -> final answer
             if not response.has_tool_calls:
                 content = (response.content or "").strip()
                 if not content:
                     content = "Ich konnte keine passende Antwort finden."
+                elif (
+                    cacheable and cache_generation is not None
+                    and answer_cache.is_shareable(tools_used, content, task.tenant_context)
+                ):
+                    await answer_cache.store(
+                        tenant_slug, self.agent_id, task.original_message, content,
+                        tokens=tokens_used, generation=cache_generation,
+                    )
                 return AgentResult(
                     agent_id=self.agent_id,
                     content=content,
@@ -214,6 +241,8 @@ class ExpertAgent(ABC):
                 try:
                     params = json.loads(tc_args_str) if isinstance(tc_args_str, str) else tc_args_str
                     result: ToolResult = await tool.execute(params, task.tenant_context)
+                    # A failed call marks the answer as not shareable
+                    tools_used.append(tc_name if result.success else f"{tc_name}:failed")
                     content = json.dumps(result.data) if result.success else (result.error_message or "Tool-Fehler")
                     # Kontrollinstanz: annotate any date params with verified weekday
                     date_annotation = self._annotate_dates(params)
@@ -226,6 +255,7 @@ class ExpertAgent(ABC):
                         tool=tc_name,
                         error=str(e),
                     )
+                    tools_used.append(f"{tc_name}:failed")
                     content = f"Tool-Fehler: {str(e)}"
 
                 messages.append({
@@ -348,7 +378,7 @@ class ExpertAgent(ABC):
                 "health_advice_scope": settings.get("health_advice_scope", ""),
                 # Member context
                 "user_name": ctx.user_name,
-                "member_profile": "",
+                "member_profile": task.intent_payload.get("member_profile", ""),
             }
 
             # Pop keys that are explicit params of render_for_tenant to avoid
@@ -261,7 +261,7 @@ class GenericExpertAgent(ExpertAgent):
                 "escalation_contact": settings.get("escalation_contact", ""),
                 "health_advice_scope": settings.get("health_advice_scope", ""),
                 "user_name": ctx.user_name,
-                "member_profile": "",
+                "member_profile": task.intent_payload.get("member_profile", ""),
                 # QA revision context (injected by LeadAgent on retry)
                 "qa_feedback": task.intent_payload.get("qa_feedback", ""),
                 "qa_attempt": task.intent_payload.get("qa_attempt", 0),
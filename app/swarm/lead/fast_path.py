@@ -0,0 +1,487 @@
+"""ARIIA Swarm v3 — Fast-path intent classification.
+
+Tiers in front of the LLM classifier (``intent_classifier.classify``):
+
+1. Rules: emergency keywords, exact greetings/thanks, and keyword groups
+   that point at exactly one agent.
+2. Per-tenant LRU of recent normalized utterances and their LLM labels.
+3. A per-tenant TF-IDF nearest-centroid model trained from that tenant's
+   LLM classifications.
+
+A tier answers only at or above ``INTENT_FAST_PATH_THRESHOLD`` and only
+with an agent the tenant has available; otherwise the message falls
+through to the LLM. Every LLM label is fed to the cache, to the tenant's
+training window (the last ``INTENT_TRAINING_WINDOW`` labels) and appended
+to the classification log (``INTENT_LOG_PATH``, JSON lines). The log is
+rotated to ``<path>.1`` once it reaches ``INTENT_LOG_MAX_BYTES``; it is
+read once, in a worker thread, to seed the windows after a restart. A
+tenant's model is refit from its window in a worker thread after
+``INTENT_MODEL_REFIT_EVERY`` new labels of that tenant.
+
+Short replies ("ja", "ok") only make sense with the conversation history,
+so the cache and model tiers skip utterances of fewer than three words
+when history is present.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import re
+import time
+import unicodedata
+from collections import Counter, OrderedDict, defaultdict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+import structlog
+
+from app.core.telemetry import get_metrics
+from app.swarm.contracts import IntentResult, TenantContext
+from app.swarm.lead import intent_classifier
+from app.swarm.lead.intent_classifier import EMERGENCY_KEYWORDS
+
+logger = structlog.get_logger()
+
+FAST_PATH_ENABLED = os.getenv("INTENT_FAST_PATH", "true").lower() == "true"
+FAST_PATH_THRESHOLD = float(os.getenv("INTENT_FAST_PATH_THRESHOLD", "0.8"))
+INTENT_LOG_PATH = os.getenv(
+    "INTENT_LOG_PATH",
+    "" if os.getenv("ENVIRONMENT") == "testing" else "data/intent_classifications.jsonl",
+)
+CACHE_SIZE = int(os.getenv("INTENT_CACHE_SIZE", "2048"))
+CACHE_TTL_SECONDS = float(os.getenv("INTENT_CACHE_TTL_SECONDS", "86400"))
+MODEL_REFIT_EVERY = int(os.getenv("INTENT_MODEL_REFIT_EVERY", "500"))
+TRAINING_WINDOW = int(os.getenv("INTENT_TRAINING_WINDOW", "5000"))
+LOG_MAX_BYTES = int(os.getenv("INTENT_LOG_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Only confident LLM labels are cached and used as training data
+MIN_LABEL_CONFIDENCE = 0.7
+
+GREETINGS = frozenset({
+    "hallo", "hi", "hey", "moin", "servus", "guten morgen", "guten tag", "guten abend",
+    "danke", "danke schön", "dankeschön", "vielen dank", "merci", "thanks", "thank you", "thx",
+    "tschüss", "ciao", "bye", "bis bald", "schönen tag noch",
+})
+
+# Keyword stems per agent; a rule fires only if exactly one agent matches
+KEYWORD_RULES: dict[str, tuple[str, ...]] = {
+    "ops": ("stornier", "absagen", "cancel", "booking", "umbuch", "verschieb", "reschedul"),
+    "knowledge": ("öffnungszeit", "opening hours", "geöffnet"),
+    "medic": ("verletz", "schmerz", "injur", "tut weh"),
+}
+KEYWORD_CONFIDENCE = 0.85
+GREETING_CONFIDENCE = 0.95
+
+_PUNCTUATION = re.compile(r"[^\w\s]", re.UNICODE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_utterance(text: str) -> str:
+    """Lowercase, NFKC-fold, strip punctuation/emoji and collapse whitespace."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", text)).strip()
+
+
+def match_rules(normalized: str, available_agents: dict[str, str]) -> IntentResult | None:
+    """Tier 1: emergency keywords, greetings and unambiguous keyword groups."""
+    words = set(normalized.split())
+    if words & EMERGENCY_KEYWORDS and "medic" in available_agents:
+        return IntentResult(agent_id="medic", confidence=1.0, extracted={"emergency": True})
+    if normalized in GREETINGS and "persona" in available_agents:
+        return IntentResult(agent_id="persona", confidence=GREETING_CONFIDENCE)
+    matched = {
+        agent_id for agent_id, stems in KEYWORD_RULES.items()
+        if agent_id in available_agents and any(stem in normalized for stem in stems)
+    }
+    if len(matched) == 1:
+        return IntentResult(agent_id=matched.pop(), confidence=KEYWORD_CONFIDENCE)
+    return None
+
+
+# ── TF-IDF nearest-centroid model ────────────────────────────────────
+
+
+def _features(normalized: str) -> Counter[str]:
+    """Word unigrams plus character trigrams of each padded word."""
+    features: Counter[str] = Counter()
+    for word in normalized.split():
+        features["w:" + word] += 1
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            features["c:" + padded[i:i + 3]] += 1
+    return features
+
+
+def _normalise_vector(vector: dict[str, float]) -> dict[str, float]:
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    return {k: v / norm for k, v in vector.items()} if norm else {}
+
+
+class CentroidIntentModel:
+    """TF-IDF vectors averaged per agent; cosine similarity picks the agent.
+
+    Confidence is a softmax over the similarities to the allowed agents'
+    centroids; a best similarity under ``min_similarity`` gives 0.
+    """
+
+    def __init__(self, temperature: float = 0.05, min_similarity: float = 0.3) -> None:
+        self.temperature = temperature
+        self.min_similarity = min_similarity
+        self._idf: dict[str, float] = {}
+        self._default_idf = 1.0
+        self._centroids: dict[str, dict[str, float]] = {}
+        self.trained_on = 0
+
+    def fit(self, examples: Iterable[tuple[str, str]]) -> "CentroidIntentModel":
+        """Train on ``(normalized_text, agent_id)`` pairs."""
+        docs = [(_features(text), label) for text, label in examples if text]
+        df: Counter[str] = Counter()
+        for features, _ in docs:
+            df.update(features.keys())
+        n = len(docs)
+        self._idf = {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+        self._default_idf = math.log(1 + n) + 1
+
+        sums: dict[str, defaultdict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for features, label in docs:
+            for term, weight in self._vector(features).items():
+                sums[label][term] += weight
+        self._centroids = {label: _normalise_vector(vector) for label, vector in sums.items()}
+        self.trained_on = n
+        return self
+
+    def _vector(self, features: Counter[str]) -> dict[str, float]:
+        return _normalise_vector({
+            term: (1 + math.log(count)) * self._idf.get(term, self._default_idf)
+            for term, count in features.items()
+        })
+
+    @property
+    def labels(self) -> list[str]:
+        return list(self._centroids)
+
+    def predict(self, normalized: str, allowed: Iterable[str] | None = None) -> tuple[str | None, float]:
+        """Return ``(agent_id, confidence)`` among *allowed* agents (all if None)."""
+        labels = [label for label in (allowed if allowed is not None else self._centroids) if label in self._centroids]
+        if not labels or not normalized:
+            return None, 0.0
+        vector = self._vector(_features(normalized))
+        similarities = {
+            label: sum(weight * self._centroids[label].get(term, 0.0) for term, weight in vector.items())
+            for label in labels
+        }
+        best = max(similarities, key=similarities.get)
+        if similarities[best] < self.min_similarity:
+            return best, 0.0
+        exp = {label: math.exp((sim - similarities[best]) / self.temperature) for label, sim in similarities.items()}
+        return best, exp[best] / sum(exp.values())
+
+
+def _rotated(path: Path) -> Path:
+    return path.with_name(path.name + ".1")
+
+
+def load_labelled_examples(path: str | Path) -> list[dict[str, Any]]:
+    """Read the classification log (rotated part first); malformed lines are skipped."""
+    path = Path(path)
+    examples = []
+    for part in (_rotated(path), path):
+        if not part.exists():
+            continue
+        with part.open(encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("text") and record.get("agent_id"):
+                    examples.append(record)
+    return examples
+
+
+def tenant_training_pairs(
+    records: Iterable[dict[str, Any]], window: int = TRAINING_WINDOW,
+) -> dict[int, deque[tuple[str, str]]]:
+    """Training pairs grouped by tenant, keeping the last *window* per tenant."""
+    pairs: dict[int, deque[tuple[str, str]]] = {}
+    for r in records:
+        if float(r.get("confidence", 0.0)) >= MIN_LABEL_CONFIDENCE:
+            tenant_pairs = pairs.setdefault(int(r.get("tenant_id", 0)), deque(maxlen=window))
+            tenant_pairs.append((r["text"], r["agent_id"]))
+    return pairs
+
+
+# ── Tiered classifier ────────────────────────────────────────────────
+
+
+@dataclass
+class _CachedIntent:
+    result: IntentResult
+    expires_at: float
+
+
+class FastPathClassifier:
+    """Rules → tenant cache → local model → LLM (``intent_classifier.classify``)."""
+
+    def __init__(
+        self,
+        threshold: float = FAST_PATH_THRESHOLD,
+        log_path: str | None = INTENT_LOG_PATH,
+        cache_size: int = CACHE_SIZE,
+        cache_ttl: float = CACHE_TTL_SECONDS,
+        refit_every: int = MODEL_REFIT_EVERY,
+        training_window: int = TRAINING_WINDOW,
+        log_max_bytes: int = LOG_MAX_BYTES,
+    ) -> None:
+        self.threshold = threshold
+        self._log_path = Path(log_path) if log_path else None
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        self._refit_every = refit_every
+        self._training_window = training_window
+        self._log_max_bytes = log_max_bytes
+        self._caches: dict[int, OrderedDict[str, _CachedIntent]] = {}
+        self._models: dict[int, CentroidIntentModel] = {}
+        self._examples: dict[int, deque[tuple[str, str]]] = {}
+        self._models_loaded = False
+        self._load_task: asyncio.Task[None] | None = None
+        self._labels_since_fit: Counter[int] = Counter()
+        self._refit_tasks: dict[int, asyncio.Task[None]] = {}
+
+    # ── Tier 2: per-tenant cache ─────────────────────────────────────
+
+    def _cache_get(self, tenant_id: int, normalized: str) -> IntentResult | None:
+        cache = self._caches.get(tenant_id)
+        entry = cache.get(normalized) if cache else None
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del cache[normalized]
+            return None
+        cache.move_to_end(normalized)
+        return entry.result
+
+    def _cache_put(self, tenant_id: int, normalized: str, result: IntentResult) -> None:
+        cache = self._caches.setdefault(tenant_id, OrderedDict())
+        cache[normalized] = _CachedIntent(result, time.monotonic() + self._cache_ttl)
+        cache.move_to_end(normalized)
+        while len(cache) > self._cache_size:
+            cache.popitem(last=False)
+
+    # ── Tier 3: local model ──────────────────────────────────────────
+
+    def set_model(self, tenant_id: int, model: CentroidIntentModel | None) -> None:
+        if model is None:
+            self._models.pop(tenant_id, None)
+        else:
+            self._models[tenant_id] = model
+        self._models_loaded = True
+
+    async def _ensure_models(self) -> None:
+        """Seed the tenant windows and models from the log once, off the event loop."""
+        if self._models_loaded:
+            return
+        if self._load_task is None:
+            self._load_task = asyncio.create_task(self._load_models())
+        await asyncio.shield(self._load_task)
+
+    async def _load_models(self) -> None:
+        try:
+            if self._log_path is not None:
+                loaded = await asyncio.to_thread(
+                    lambda: tenant_training_pairs(load_labelled_examples(self._log_path), self._training_window)
+                )
+                for tenant_id, pairs in loaded.items():
+                    # Labels recorded while the log was being read come last
+                    pairs.extend(self._examples.get(tenant_id, ()))
+                    self._examples[tenant_id] = pairs
+                models = await asyncio.to_thread(
+                    lambda: {tenant_id: CentroidIntentModel().fit(list(pairs)) for tenant_id, pairs in loaded.items()}
+                )
+                for tenant_id, model in models.items():
+                    self._models.setdefault(tenant_id, model)
+                logger.info(
+                    "intent.fast_path_model_loaded", tenants=len(models),
+                    examples=sum(len(pairs) for pairs in loaded.values()),
+                )
+        except OSError as exc:
+            logger.warning("intent.log_read_failed", error=str(exc))
+        finally:
+            self._models_loaded = True
+
+    async def _refit(self, tenant_id: int) -> None:
+        pairs = list(self._examples.get(tenant_id, ()))
+        if pairs:
+            self._models[tenant_id] = await asyncio.to_thread(CentroidIntentModel().fit, pairs)
+            logger.info("intent.fast_path_model_refit", tenant_id=tenant_id, examples=len(pairs))
+
+    # ── Classification ───────────────────────────────────────────────
+
+    def classify_local(
+        self,
+        message: str,
+        tenant_id: int,
+        available_agents: dict[str, str],
+        has_history: bool = False,
+    ) -> tuple[str, IntentResult | None]:
+        """Run the local tiers; returns ``(tier, result)`` with result None on fall-through."""
+        normalized = normalize_utterance(message)
+        if not normalized:
+            return "llm", None
+
+        rule = match_rules(normalized, available_agents)
+        if rule is not None and rule.confidence >= self.threshold:
+            return "rules", rule
+
+        if has_history and len(normalized.split()) < 3:
+            return "llm", None
+
+        cached = self._cache_get(tenant_id, normalized)
+        if cached is not None and cached.agent_id in available_agents:
+            return "cache", cached
+
+        model = self._models.get(tenant_id)
+        if model is not None:
+            agent_id, confidence = model.predict(normalized, available_agents)
+            if agent_id is not None and confidence >= self.threshold:
+                return "model", IntentResult(agent_id=agent_id, confidence=round(confidence, 3))
+        return "llm", None
+
+    async def classify(
+        self,
+        message: str,
+        context: TenantContext,
+        available_agents: dict[str, str],
+        history: tuple[dict[str, str], ...] = (),
+        llm: Any = None,
+    ) -> IntentResult:
+        """Drop-in replacement for ``intent_classifier.classify``."""
+        metrics = get_metrics()
+        if FAST_PATH_ENABLED and available_agents:
+            await self._ensure_models()
+            tier, result = self.classify_local(message, context.tenant_id, available_agents, bool(history))
+            if result is not None:
+                metrics.increment("intent_classifications_total", labels={"tier": tier})
+                logger.info("intent.fast_path", tier=tier, agent_id=result.agent_id, confidence=result.confidence)
+                return result
+
+        result = await intent_classifier.classify(
+            message=message,
+            context=context,
+            available_agents=available_agents,
+            history=history,
+            llm=llm,
+        )
+        metrics.increment("intent_classifications_total", labels={"tier": "llm"})
+        if llm and result.confidence >= MIN_LABEL_CONFIDENCE:
+            await self.record(context.tenant_id, message, result)
+        return result
+
+    async def record(self, tenant_id: int, message: str, result: IntentResult) -> None:
+        """Cache an LLM label, add it to the tenant's training window and log it."""
+        normalized = normalize_utterance(message)
+        if not normalized:
+            return
+        self._cache_put(tenant_id, normalized, result)
+        if result.confidence >= MIN_LABEL_CONFIDENCE:
+            window = self._examples.setdefault(tenant_id, deque(maxlen=self._training_window))
+            window.append((normalized, result.agent_id))
+            self._labels_since_fit[tenant_id] += 1
+            refit = self._refit_tasks.get(tenant_id)
+            if self._labels_since_fit[tenant_id] >= self._refit_every and (refit is None or refit.done()):
+                self._labels_since_fit[tenant_id] = 0
+                self._refit_tasks[tenant_id] = asyncio.create_task(self._refit(tenant_id))
+        if self._log_path is None:
+            return
+        line = json.dumps({
+            "ts": time.time(),
+            "tenant_id": tenant_id,
+            "text": normalized,
+            "agent_id": result.agent_id,
+            "confidence": result.confidence,
+        }, ensure_ascii=False)
+        try:
+            await asyncio.to_thread(self._append_log, line)
+        except OSError as exc:
+            logger.warning("intent.log_write_failed", error=str(exc))
+
+    def _append_log(self, line: str) -> None:
+        self._log_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if self._log_path.stat().st_size >= self._log_max_bytes:
+                self._log_path.replace(_rotated(self._log_path))
+        except FileNotFoundError:
+            pass
+        with self._log_path.open("a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+
+# ── Offline evaluation ───────────────────────────────────────────────
+
+
+def evaluate_offline(
+    records: list[dict[str, Any]],
+    train_fraction: float = 0.8,
+    threshold: float = FAST_PATH_THRESHOLD,
+) -> dict[str, Any]:
+    """Replay logged LLM labels through the local tiers.
+
+    Records are ordered by time. Each tenant's model is trained on its
+    records in the first *train_fraction* and the rest are replayed in
+    order. A fall-through
+    fills the tenant cache with the LLM label, as in production. Reports
+    the fraction of LLM calls avoided and the agreement with the LLM
+    label, overall and per tier.
+    """
+    ordered = sorted(records, key=lambda r: r.get("ts", 0))
+    split = int(len(ordered) * train_fraction)
+    train, test = ordered[:split], ordered[split:]
+    agents = {r["agent_id"]: "" for r in ordered}
+    agents.setdefault("persona", "")
+
+    classifier = FastPathClassifier(threshold=threshold, log_path=None)
+    for tenant_id, pairs in tenant_training_pairs(train).items():
+        classifier.set_model(tenant_id, CentroidIntentModel().fit(list(pairs)))
+
+    tiers: dict[str, dict[str, int]] = defaultdict(lambda: {"answered": 0, "correct": 0})
+    for record in test:
+        tier, result = classifier.classify_local(record["text"], record.get("tenant_id", 0), agents)
+        if result is None:
+            classifier._cache_put(
+                record.get("tenant_id", 0),
+                normalize_utterance(record["text"]),
+                IntentResult(agent_id=record["agent_id"], confidence=float(record.get("confidence", 1.0))),
+            )
+            continue
+        tiers[tier]["answered"] += 1
+        tiers[tier]["correct"] += int(result.agent_id == record["agent_id"])
+
+    answered = sum(t["answered"] for t in tiers.values())
+    correct = sum(t["correct"] for t in tiers.values())
+    return {
+        "train": len(train),
+        "test": len(test),
+        "avoided_fraction": answered / len(test) if test else 0.0,
+        "accuracy": correct / answered if answered else 0.0,
+        "tiers": {
+            name: {**counts, "accuracy": counts["correct"] / counts["answered"]}
+            for name, counts in tiers.items()
+        },
+    }
+
+
+# ── Singleton ────────────────────────────────────────────────────────
+
+_classifier: FastPathClassifier | None = None
+
+
+def get_fast_path_classifier() -> FastPathClassifier:
+    """Return the process-wide tiered classifier."""
+    global _classifier
+    if _classifier is None:
+        _classifier = FastPathClassifier()
+    return _classifier
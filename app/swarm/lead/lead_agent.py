@@ -14,9 +14,11 @@ Contains NO domain logic — all behavior comes from the expert agents.
 
 from __future__ import annotations
 
+import asyncio
+import os
 import uuid
 import structlog
-from typing import Any
+from typing import Any, Awaitable
 
 from app.gateway.schemas import InboundMessage
 from app.swarm.contracts import (
@@ -28,6 +30,9 @@ from app.orchestration.runtime import DynamicConfigManager
 
 logger = structlog.get_logger()
 
+# How long to wait for a speculative context prefetch once the intent is known
+PREFETCH_WAIT_SECONDS = float(os.getenv("PREFETCH_WAIT_SECONDS", "1.5"))
+
 
 class LeadAgent:
     """Supervisor agent that orchestrates the swarm pipeline.
@@ -51,13 +56,14 @@ class LeadAgent:
         self,
         message: InboundMessage,
         context: TenantContext,
+        prefetch: Awaitable[dict[str, Any]] | None = None,
     ) -> AgentResult:
         """Process a user message through the full swarm pipeline.
 
         Steps:
         0. Load dynamic tenant configuration (AgentTeam + Orchestrator)
         1. Check ConfirmationGate for pending confirmations
-        2. Classify intent via IntentClassifier (dynamic agent list)
+        2. Classify intent via the fast path / IntentClassifier (dynamic agent list)
         3. Load agent via DynamicAgentLoader
         4. Create AgentTask and execute with QA (dynamic QA settings)
         5. If result requires confirmation, store in gate (dynamic TTL)
@@ -65,6 +71,9 @@ class LeadAgent:
         Args:
             message: Normalized inbound message.
             context: Immutable tenant context.
+            prefetch: Optional in-flight member context load (started by the
+                webhook on arrival); awaited after intent classification and
+                rendered into the agent's ``member_profile``.
 
         Returns:
             AgentResult with the final response.
@@ -94,11 +103,11 @@ class LeadAgent:
             except Exception as e:
                 logger.warning("lead_agent.confirmation_check_failed", error=str(e))
 
-        # Step 2: Classify intent
-        from app.swarm.lead.intent_classifier import classify
+        # Step 2: Classify intent (local fast path first, LLM below its threshold)
+        from app.swarm.lead.fast_path import get_fast_path_classifier
 
         available_agents = self._get_available_agents(agent_team.get("agent_ids", []))
-        intent = await classify(
+        intent = await get_fast_path_classifier().classify(
             message=message.content,
             context=context,
             available_agents=available_agents,
@@ -132,11 +141,17 @@ class LeadAgent:
                 )
 
         # Step 4: Create AgentTask
+        intent_payload = dict(intent.extracted) if intent.extracted else {}
+        if prefetch is not None:
+            member_profile = await self._await_prefetch(prefetch)
+            if member_profile:
+                intent_payload["member_profile"] = member_profile
+
         task = AgentTask(
             task_id=uuid.uuid4().hex[:12],
             agent_id=intent.agent_id,
             original_message=message.content,
-            intent_payload=dict(intent.extracted) if intent.extracted else {},
+            intent_payload=intent_payload,
             tenant_context=context,
             conversation_history=self._build_history(message),
         )
@@ -183,6 +198,24 @@ class LeadAgent:
 
         return result
 
+    @staticmethod
+    async def _await_prefetch(prefetch: Awaitable[dict[str, Any]]) -> str:
+        """Wait briefly for the prefetched context; a slow or failed prefetch is skipped."""
+        try:
+            prefetched = await asyncio.wait_for(asyncio.shield(prefetch), PREFETCH_WAIT_SECONDS)
+        except asyncio.CancelledError:
+            task = asyncio.current_task()
+            if task is not None and task.cancelling():
+                raise
+            # The prefetch itself was cancelled (discarded or shut down): a miss
+            logger.info("lead_agent.prefetch_skipped", error="cancelled")
+            return ""
+        except Exception as e:
+            logger.info("lead_agent.prefetch_skipped", error=str(e) or type(e).__name__)
+            return ""
+        from app.memory_platform.prefetcher import get_context_prefetcher
+        return get_context_prefetcher().build_context_prompt(prefetched)
+
     def _get_available_agents(self, agent_ids: list[str]) -> dict[str, str]:
         """Fetch descriptions for the given agent IDs.
 
@@ -19,6 +19,11 @@ from app.vision.rtsp import RTSPConnector
 logger = structlog.get_logger()
 
 
+def _frame_size(frame: Any) -> int:
+    """Byte size of an encoded frame or a decoded array."""
+    return len(frame) if isinstance(frame, (bytes, bytearray)) else int(getattr(frame, "nbytes", 0))
+
+
 @dataclass
 class PrivacyAuditEntry:
     """Audit trail entry for frame processing."""
@@ -104,6 +109,53 @@ class PrivacyEngine:
             frame_data = b""
             del frame_data
 
+    def safe_process_batch(self, frames: dict[str, Any]) -> dict[str, CrowdResult]:
+        """Process one frame per camera in a single batch and discard them.
+
+        ``frames`` maps camera id → frame (bytes or decoded array) and is
+        emptied before returning, so the caller holds no frame afterwards.
+
+        Returns:
+            Camera id → CrowdResult (error results if the batch failed).
+        """
+        start = time.time()
+        camera_ids = list(frames)
+
+        try:
+            sizes = [_frame_size(frames[cid]) for cid in camera_ids]
+            results = self._processor.process_batch([frames[cid] for cid in camera_ids])
+            frames.clear()
+
+            duration_ms = (time.time() - start) * 1000
+            for size, result in zip(sizes, results):
+                self._audit_log.append(PrivacyAuditEntry(
+                    timestamp=start,
+                    frame_size_bytes=size,
+                    processing_duration_ms=round(duration_ms, 1),
+                    frame_discarded=True,
+                    result_count=result.total_count,
+                ))
+
+            logger.info(
+                "privacy.batch_processed",
+                frames=len(camera_ids),
+                duration_ms=round(duration_ms, 1),
+                counts=[r.total_count for r in results],
+                discarded=True,
+            )
+            return dict(zip(camera_ids, results))
+
+        except Exception as e:
+            logger.error("privacy.batch_failed", error=str(e), frames=len(camera_ids))
+            return {
+                cid: CrowdResult(total_count=0, density="unknown", source="error", confidence=0.0)
+                for cid in camera_ids
+            }
+
+        finally:
+            # CRITICAL: drop every frame reference
+            frames.clear()
+
     def get_audit_log(self) -> list[dict[str, Any]]:
         """Get audit trail for privacy compliance review.
 
@@ -4,13 +4,16 @@
 Person counting from video frames with density classification.
 Requires ultralytics (YOLOv8). Returns stub data when unavailable or
 when VISION_ENABLE_YOLO env var is not set (default: stub mode).
+
+``process_batch`` runs the frames of several cameras through a single
+model invocation (see app/vision/scheduler.py).
 """
 
 from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Sequence
 
 import structlog
 
@@ -118,60 +121,89 @@ class VisionProcessor:
         """
         if self._stub_mode:
             logger.debug("vision.stub_mode", msg="Returning stub crowd result (set VISION_ENABLE_YOLO=1 for real inference)")
-            return CrowdResult(
-                total_count=3,
-                density=classify_density(3),
-                areas=[AreaResult(name="main_floor", count=3, density="empty")],
-                source="stub",
-                confidence=1.0,
-            )
+            return self._stub_result()
 
         return self._yolo_process(frame_data)
 
+    def process_batch(self, frames: Sequence[Any]) -> list[CrowdResult]:
+        """Process frames of several cameras in one model invocation.
+
+        PRIVACY: same rules as process_frame; the caller drops the frames.
+
+        Args:
+            frames: JPEG/PNG bytes or decoded BGR arrays (RTSPFrameReader).
+
+        Returns:
+            One CrowdResult per frame, in input order.
+        """
+        if not frames:
+            return []
+        if self._stub_mode:
+            return [self._stub_result() for _ in frames]
+        return self._yolo_process_batch(frames)
+
+    @staticmethod
+    def _stub_result() -> CrowdResult:
+        return CrowdResult(
+            total_count=3,
+            density=classify_density(3),
+            areas=[AreaResult(name="main_floor", count=3, density="empty")],
+            source="stub",
+            confidence=1.0,
+        )
+
     def _yolo_process(self, frame_data: bytes) -> CrowdResult:
         """Real YOLOv8 inference on frame data."""
+        return self._yolo_process_batch([frame_data])[0]
+
+    @staticmethod
+    def _to_array(frame: Any) -> Any:
+        if not isinstance(frame, (bytes, bytearray)):
+            return frame
         import io
         from PIL import Image  # type: ignore[import-untyped]
         import numpy as np  # type: ignore[import-untyped]
 
-        try:
-            image = Image.open(io.BytesIO(frame_data))
-            frame_array = np.array(image)
+        with Image.open(io.BytesIO(frame)) as image:
+            return np.array(image)
 
-            results = self._model(frame_array, verbose=False, conf=self._confidence_threshold)
+    def _yolo_process_batch(self, frames: Sequence[Any]) -> list[CrowdResult]:
+        """Real YOLOv8 inference, one model call for all frames."""
+        try:
+            arrays = [self._to_array(f) for f in frames]
+            results = self._model(arrays, verbose=False, conf=self._confidence_threshold)
 
-            # Count persons (class 0 in COCO)
-            person_count = 0
-            confidences: list[float] = []
+            crowd_results = []
             for result in results:
-                for box in result.boxes:
-                    if int(box.cls[0]) == PERSON_CLASS_ID:
-                        person_count += 1
-                        confidences.append(float(box.conf[0]))
-
-            avg_conf = sum(confidences) / len(confidences) if confidences else 0.0
-
-            # Clear frame from memory explicitly
-            del frame_array, image
-            frame_data = b""
+                # Count persons (class 0 in COCO)
+                confidences = [
+                    float(box.conf[0]) for box in result.boxes if int(box.cls[0]) == PERSON_CLASS_ID
+                ]
+                person_count = len(confidences)
+                avg_conf = sum(confidences) / len(confidences) if confidences else 0.0
+                crowd_results.append(CrowdResult(
+                    total_count=person_count,
+                    density=classify_density(person_count),
+                    source="yolov8",
+                    confidence=avg_conf,
+                ))
+
+            # Clear frames from memory explicitly
+            del arrays, results
 
             logger.info(
                 "vision.processed",
-                count=person_count,
-                density=classify_density(person_count),
-                confidence=round(avg_conf, 2),
-            )
-
-            return CrowdResult(
-                total_count=person_count,
-                density=classify_density(person_count),
-                source="yolov8",
-                confidence=avg_conf,
+                frames=len(crowd_results),
+                counts=[r.total_count for r in crowd_results],
             )
+            return crowd_results
 
         except Exception as e:
-            logger.error("vision.process_error", error=str(e))
-            return CrowdResult(
-                total_count=0, density="unknown", source="error",
-                confidence=0.0, metadata={"error": str(e)},
-            )
+            logger.error("vision.process_error", error=str(e), frames=len(frames))
+            return [
+                CrowdResult(
+                    total_count=0, density="unknown", source="error",
+                    confidence=0.0, metadata={"error": str(e)},
+                )
+                for _ in frames
+            ]
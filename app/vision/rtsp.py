@@ -3,11 +3,20 @@
 @BACKEND: Sprint 5a, Task 5a.2
 Snapshot grabber for CCTV/RTSP streams.
 Requires OpenCV and a configured stream URL.
+
+RTSPFrameReader keeps one capture open per camera on a background
+thread and holds only the latest decoded frame, instead of paying the
+RTSP/codec handshake for every snapshot. A consumed frame is released
+immediately (``take``), so at most one frame per camera is ever in RAM.
 """
 
 from __future__ import annotations
 
 import os
+import threading
+import time
+from typing import Any, Callable, Optional, Protocol
+
 import structlog
 
 logger = structlog.get_logger()
@@ -24,6 +33,149 @@ except ImportError:
 _RTSP_ENABLED = os.getenv("RTSP_ENABLE_LIVE", "").lower() in ("1", "true", "yes")
 
 DEFAULT_TIMEOUT_MS = 5000
+RECONNECT_MIN_SECONDS = float(os.getenv("RTSP_RECONNECT_MIN_SECONDS", "1"))
+RECONNECT_MAX_SECONDS = float(os.getenv("RTSP_RECONNECT_MAX_SECONDS", "30"))
+
+# Minimal JPEG stub: SOI (FFD8) + EOI (FFD9) markers with JFIF APP0 header
+_STUB_JPEG: bytes = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00\xff\xd9"
+
+
+class FrameCapture(Protocol):
+    """The part of ``cv2.VideoCapture`` the reader uses."""
+
+    def isOpened(self) -> bool: ...
+
+    def read(self) -> tuple[bool, Any]: ...
+
+    def release(self) -> None: ...
+
+
+class RTSPFrameReader:
+    """Long-lived capture thread that keeps only the latest decoded frame.
+
+    ``source`` is anything ``cv2.VideoCapture`` opens (RTSP URL, local
+    video file). ``capture_factory`` replaces OpenCV, e.g. with synthetic
+    frames in tests. When the stream drops, the reader reconnects with
+    exponential backoff between ``backoff_min`` and ``backoff_max``.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        capture_factory: Optional[Callable[[], FrameCapture]] = None,
+        timeout_ms: int = DEFAULT_TIMEOUT_MS,
+        backoff_min: float = RECONNECT_MIN_SECONDS,
+        backoff_max: float = RECONNECT_MAX_SECONDS,
+        name: str = "",
+    ) -> None:
+        self._source = source
+        self._open = capture_factory or self._open_cv2
+        self._timeout_ms = timeout_ms
+        self._backoff_min = backoff_min
+        self._backoff_max = backoff_max
+        self._name = name or source
+        self._cond = threading.Condition()
+        self._frame: Any = None
+        self._frame_at = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.frames_decoded = 0
+        self.reconnects = 0
+        self.connected = False
+
+    def _open_cv2(self) -> FrameCapture:
+        cap = cv2.VideoCapture(self._source)
+        cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, self._timeout_ms)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "RTSPFrameReader":
+        if not self.is_running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"rtsp-{self._name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        with self._cond:
+            self._frame = None
+
+    def take(self, max_age: Optional[float] = None) -> Any:
+        """Hand over the latest frame (or None) and release it from the reader."""
+        with self._cond:
+            frame, self._frame = self._frame, None
+            if frame is not None and max_age is not None and time.monotonic() - self._frame_at > max_age:
+                return None
+            return frame
+
+    def wait_frame(self, timeout: float) -> Any:
+        """Like ``take``, but wait up to *timeout* seconds for a frame."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._frame is not None or self._stop.is_set(), timeout)
+            frame, self._frame = self._frame, None
+            return frame
+
+    def _run(self) -> None:
+        backoff = self._backoff_min
+        while not self._stop.is_set():
+            cap = None
+            try:
+                cap = self._open()
+                if not cap.isOpened():
+                    raise ConnectionError("cannot open stream")
+                self.connected = True
+                backoff = self._backoff_min
+                logger.info("rtsp.reader_connected", stream=self._name, reconnects=self.reconnects)
+                while not self._stop.is_set():
+                    ok, frame = cap.read()
+                    if not ok or frame is None:
+                        raise ConnectionError("stream returned no frame")
+                    with self._cond:
+                        # Replaces (and thereby drops) the previous frame
+                        self._frame = frame
+                        self._frame_at = time.monotonic()
+                        self.frames_decoded += 1
+                        self._cond.notify_all()
+                    del frame
+            except Exception as e:
+                logger.warning("rtsp.reader_disconnected", stream=self._name, error=str(e), retry_in=backoff)
+            finally:
+                self.connected = False
+                if cap is not None:
+                    cap.release()
+            if self._stop.wait(backoff):
+                break
+            self.reconnects += 1
+            backoff = min(backoff * 2, self._backoff_max)
+
+
+class StubFrameReader:
+    """Reader stand-in for stub mode: always has the placeholder JPEG."""
+
+    is_running = True
+    connected = True
+
+    def start(self) -> "StubFrameReader":
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        pass
+
+    def take(self, max_age: Optional[float] = None) -> bytes:
+        return _STUB_JPEG
+
+    def wait_frame(self, timeout: float) -> bytes:
+        return _STUB_JPEG
 
 
 class RTSPConnector:
@@ -39,6 +191,7 @@ class RTSPConnector:
         self._timeout_ms = timeout_ms
         # Stub unless explicitly enabled via env var
         self._stub_mode = not (CV2_AVAILABLE and stream_url and _RTSP_ENABLED)
+        self._reader: Optional[RTSPFrameReader] = None
 
     @property
     def is_stub(self) -> bool:
@@ -49,8 +202,21 @@ class RTSPConnector:
     def stream_url(self) -> str:
         return self._stream_url
 
-    # Minimal JPEG stub: SOI (FFD8) + EOI (FFD9) markers with JFIF APP0 header
-    _STUB_JPEG: bytes = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00\xff\xd9"
+    _STUB_JPEG: bytes = _STUB_JPEG
+
+    def reader(self) -> RTSPFrameReader | StubFrameReader:
+        """The connector's persistent frame reader (started on first use)."""
+        if self._stub_mode:
+            return StubFrameReader()
+        if self._reader is None:
+            self._reader = RTSPFrameReader(self._stream_url, timeout_ms=self._timeout_ms)
+        return self._reader.start()
+
+    def close(self) -> None:
+        """Stop the background reader, if any."""
+        if self._reader is not None:
+            self._reader.stop()
+            self._reader = None
 
     def grab_snapshot(self) -> bytes:
         """Grab a single frame from the RTSP stream.
@@ -67,18 +233,11 @@ class RTSPConnector:
         return self._rtsp_grab()
 
     def _rtsp_grab(self) -> bytes:
-        """Real RTSP frame grab via OpenCV."""
-        cap = None
+        """Latest frame of the persistent reader, JPEG-encoded."""
         try:
-            cap = cv2.VideoCapture(self._stream_url)
-            cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, self._timeout_ms)
-
-            if not cap.isOpened():
-                raise ConnectionError(f"Cannot open RTSP stream: {self._stream_url}")
-
-            ret, frame = cap.read()
-            if not ret or frame is None:
-                raise ConnectionError("Failed to grab frame from RTSP stream")
+            frame = self.reader().wait_frame(self._timeout_ms / 1000)
+            if frame is None:
+                raise ConnectionError("No frame from RTSP stream")
 
             # Encode as JPEG
             _, buffer = cv2.imencode(".jpg", frame)
@@ -94,12 +253,6 @@ class RTSPConnector:
             logger.error("rtsp.grab_failed", error=str(e), stream=self._stream_url)
             raise ConnectionError(f"RTSP grab failed: {e}") from e
 
-        finally:
-            if cap is not None:
-                cap.release()
-
-
-
     def test_connection(self) -> bool:
         """Test if RTSP stream is reachable.
 
@@ -0,0 +1,143 @@
+"""ARIIA v1.4 – Multi-Camera Crowd Scheduler.
+
+Polls many cameras at their own rates and runs the frames that are due
+through one batched model invocation (``VisionProcessor.process_batch``)
+instead of one YOLO call per camera.
+
+Every camera has a persistent RTSPFrameReader that holds only its latest
+frame. On each tick the scheduler takes the frames of the due cameras,
+hands them to ``PrivacyEngine.safe_process_batch`` in chunks of at most
+``VISION_MAX_BATCH`` and keeps only the resulting counts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import structlog
+
+from app.vision.privacy import PrivacyEngine
+from app.vision.processor import CrowdResult
+from app.vision.rtsp import RTSPConnector
+
+logger = structlog.get_logger()
+
+VISION_MAX_BATCH = int(os.getenv("VISION_MAX_BATCH", "8"))
+DEFAULT_INTERVAL_SECONDS = float(os.getenv("VISION_POLL_INTERVAL_SECONDS", "10"))
+MAX_FRAME_AGE_SECONDS = float(os.getenv("VISION_MAX_FRAME_AGE_SECONDS", "5"))
+
+
+@dataclass
+class CameraConfig:
+    """One camera and how often it is counted."""
+    camera_id: str
+    stream_url: str = ""
+    interval_seconds: float = DEFAULT_INTERVAL_SECONDS
+    max_frame_age_seconds: float = MAX_FRAME_AGE_SECONDS
+
+
+@dataclass
+class _Camera:
+    config: CameraConfig
+    reader: Any
+    next_due: float = 0.0
+    missed: int = 0
+
+
+def _default_reader(config: CameraConfig) -> Any:
+    return RTSPConnector(stream_url=config.stream_url).reader()
+
+
+class CameraScheduler:
+    """Rate-limited, batched crowd counting over many cameras."""
+
+    def __init__(
+        self,
+        privacy: PrivacyEngine,
+        max_batch: int = VISION_MAX_BATCH,
+        reader_factory: Callable[[CameraConfig], Any] = _default_reader,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._privacy = privacy
+        self._max_batch = max(1, max_batch)
+        self._reader_factory = reader_factory
+        self._clock = clock
+        self._cameras: dict[str, _Camera] = {}
+        self._latest: dict[str, tuple[CrowdResult, float]] = {}
+
+    @property
+    def camera_ids(self) -> list[str]:
+        return list(self._cameras)
+
+    def add_camera(self, config: CameraConfig) -> None:
+        """Register a camera and start its reader; it is due immediately."""
+        self.remove_camera(config.camera_id)
+        reader = self._reader_factory(config).start()
+        self._cameras[config.camera_id] = _Camera(config=config, reader=reader, next_due=self._clock())
+        logger.info("vision.camera_added", camera_id=config.camera_id, interval=config.interval_seconds)
+
+    def remove_camera(self, camera_id: str) -> None:
+        camera = self._cameras.pop(camera_id, None)
+        if camera is not None:
+            camera.reader.stop()
+        self._latest.pop(camera_id, None)
+
+    def close(self) -> None:
+        for camera_id in list(self._cameras):
+            self.remove_camera(camera_id)
+
+    def latest(self, camera_id: str) -> Optional[CrowdResult]:
+        """Most recent count for *camera_id* (None before its first tick)."""
+        entry = self._latest.get(camera_id)
+        return entry[0] if entry else None
+
+    def seconds_until_due(self, now: Optional[float] = None) -> float:
+        if not self._cameras:
+            return DEFAULT_INTERVAL_SECONDS
+        now = self._clock() if now is None else now
+        return max(0.0, min(c.next_due for c in self._cameras.values()) - now)
+
+    def tick(self, now: Optional[float] = None) -> dict[str, CrowdResult]:
+        """Count every due camera; returns camera id → result for this tick."""
+        now = self._clock() if now is None else now
+        due = sorted(
+            (c for c in self._cameras.values() if c.next_due <= now),
+            key=lambda c: c.next_due,
+        )
+
+        frames: dict[str, Any] = {}
+        frame: Any = None
+        for camera in due:
+            # Rescheduled even without a frame, so a dead camera cannot spin the loop
+            camera.next_due = now + camera.config.interval_seconds
+            frame = camera.reader.take(max_age=camera.config.max_frame_age_seconds)
+            if frame is None:
+                camera.missed += 1
+                logger.debug("vision.camera_no_frame", camera_id=camera.config.camera_id, missed=camera.missed)
+                continue
+            camera.missed = 0
+            frames[camera.config.camera_id] = frame
+        frame = None  # only ``frames`` may reference them from here on
+
+        results: dict[str, CrowdResult] = {}
+        while frames:
+            batch = {cid: frames.pop(cid) for cid in list(frames)[: self._max_batch]}
+            results.update(self._privacy.safe_process_batch(batch))
+
+        finished_at = time.time()
+        for camera_id, result in results.items():
+            self._latest[camera_id] = (result, finished_at)
+        return results
+
+    async def run(self) -> None:
+        """Background loop: tick off the event loop, sleep until the next camera is due."""
+        while True:
+            try:
+                await asyncio.to_thread(self.tick)
+            except Exception as e:
+                logger.error("vision.scheduler_tick_failed", error=str(e))
+            await asyncio.sleep(max(0.05, self.seconds_until_due()))
@@ -0,0 +1,105 @@
+"""Incremental audio encoders for sentence-streamed TTS.
+
+Encoders receive 16-bit mono PCM one sentence at a time (``feed``) and
+return the finished file from ``close``. Feeding blocks, so the pipeline
+calls it on the voice worker pool while the next sentence is synthesized.
+
+- OpusStreamEncoder: one ffmpeg process per reply, PCM in on stdin, Ogg/Opus
+  (Telegram/WhatsApp voice note) out on stdout. The whole reply becomes a
+  single Ogg stream, not a chain of per-sentence files.
+- WavEncoder: in-memory WAV, used in stub mode and where no ffmpeg exists.
+"""
+
+from __future__ import annotations
+
+import io
+import subprocess
+import threading
+import wave
+from typing import Protocol
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class AudioEncoder(Protocol):
+    def feed(self, pcm: bytes) -> None: ...
+
+    def close(self) -> bytes: ...
+
+    def abort(self) -> None: ...
+
+
+class WavEncoder:
+    """Collects PCM in memory and wraps it in a WAV header."""
+
+    def __init__(self, sample_rate: int) -> None:
+        self.sample_rate = sample_rate
+        self._chunks: list[bytes] = []
+
+    def feed(self, pcm: bytes) -> None:
+        self._chunks.append(pcm)
+
+    def close(self) -> bytes:
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(b"".join(self._chunks))
+        return buf.getvalue()
+
+    def abort(self) -> None:
+        self._chunks.clear()
+
+
+class OpusStreamEncoder:
+    """Streams PCM through a single ffmpeg process into an Ogg/Opus voice note."""
+
+    def __init__(self, sample_rate: int, bitrate: str = "32k") -> None:
+        self.sample_rate = sample_rate
+        self._process = subprocess.Popen(
+            [
+                "ffmpeg", "-v", "error",
+                "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0",
+                "-c:a", "libopus", "-b:a", bitrate,
+                "-f", "ogg", "pipe:1",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._out: list[bytes] = []
+        self._err: list[bytes] = []
+        # stdout/stderr are drained concurrently so a full pipe never stalls feed()
+        self._readers = [
+            threading.Thread(target=self._drain, args=(self._process.stdout, self._out), daemon=True),
+            threading.Thread(target=self._drain, args=(self._process.stderr, self._err), daemon=True),
+        ]
+        for reader in self._readers:
+            reader.start()
+
+    @staticmethod
+    def _drain(stream, sink: list[bytes]) -> None:
+        for chunk in iter(lambda: stream.read(65536), b""):
+            sink.append(chunk)
+
+    def feed(self, pcm: bytes) -> None:
+        self._process.stdin.write(pcm)
+
+    def close(self, timeout: float = 30.0) -> bytes:
+        self._process.stdin.close()
+        returncode = self._process.wait(timeout=timeout)
+        for reader in self._readers:
+            reader.join(timeout=timeout)
+        if returncode != 0:
+            stderr = b"".join(self._err)[:200].decode(errors="replace")
+            logger.error("voice.opus_encode_failed", returncode=returncode, stderr=stderr)
+            raise RuntimeError(f"ffmpeg exited with {returncode}")
+        return b"".join(self._out)
+
+    def abort(self) -> None:
+        if self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
@@ -2,22 +2,126 @@
 
 Provides VoicePipeline (stub-mode, for tests) and the production
 process_voice_message / generate_voice_reply functions.
+
+STT, TTS and transcoding block for seconds, so they run on the voice
+worker pool (app/voice/workers.py) and never on the event loop. Audio
+stays in memory. Replies are synthesized sentence by sentence: while
+sentence *n+1* is synthesized, sentence *n* is fed to the encoder, which
+produces a single voice note for the whole reply.
 """
+import asyncio
+import io
 import os
+import re
+import textwrap
 import time
 from dataclasses import dataclass, field
-from typing import Awaitable, Callable
+from typing import Awaitable, Callable, Sequence
 
 import structlog
 
+from app.voice.encoding import AudioEncoder, OpusStreamEncoder, WavEncoder
 from app.voice.ingress import AudioFormat
-from app.voice.stt import SpeechToText, TranscriptResult
-from app.voice.tts import TextToSpeech, SpeechResult
+from app.voice.stt import SpeechToText, TranscriptResult, get_stt
+from app.voice.text_cleaner import clean_text_for_tts
+from app.voice.tts import TextToSpeech, SpeechResult, get_tts
+from app.voice.workers import VoiceWorkerPool, get_voice_pool, run_voice_task
 
 logger = structlog.get_logger()
 
 _TARGET_MS = 3000  # 3 s end-to-end target for voice pipeline
 
+VOICE_REPLY_MAX_CHARS = int(os.getenv("VOICE_REPLY_MAX_CHARS", "2000"))
+VOICE_SENTENCE_MAX_CHARS = int(os.getenv("VOICE_SENTENCE_MAX_CHARS", "240"))
+_MIN_SENTENCE_CHARS = 12  # "Ja." / "Gern!" are merged into the next sentence
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+(?=[\"„»(\[]?[A-ZÄÖÜ0-9])")
+_CLAUSE_END = re.compile(r"(?<=[,;:–])\s+")
+
+
+# ── Sentence streaming ────────────────────────────────────────────────────────
+
+def _wrap(sentence: str, max_chars: int) -> list[str]:
+    """Split an overlong sentence at clause boundaries, then at word boundaries."""
+    if len(sentence) <= max_chars:
+        return [sentence]
+    parts: list[str] = []
+    current = ""
+    for clause in _CLAUSE_END.split(sentence):
+        for piece in [clause] if len(clause) <= max_chars else textwrap.wrap(clause, max_chars):
+            if current and len(current) + 1 + len(piece) > max_chars:
+                parts.append(current)
+                current = piece
+            else:
+                current = f"{current} {piece}" if current else piece
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_sentences(text: str, max_chars: int = VOICE_SENTENCE_MAX_CHARS) -> list[str]:
+    """Split a reply into synthesis units of at most *max_chars* characters."""
+    sentences: list[str] = []
+    for raw in _SENTENCE_END.split(text.strip()):
+        raw = " ".join(raw.split())
+        if raw:
+            sentences.extend(_wrap(raw, max_chars))
+    merged: list[str] = []
+    for sentence in sentences:
+        if merged and len(merged[-1]) < _MIN_SENTENCE_CHARS and len(merged[-1]) + 1 + len(sentence) <= max_chars:
+            merged[-1] = f"{merged[-1]} {sentence}"
+        else:
+            merged.append(sentence)
+    return merged
+
+
+def _limit_reply(text: str, max_chars: int = VOICE_REPLY_MAX_CHARS) -> str:
+    """Cap very long replies at a sentence boundary."""
+    if len(text) <= max_chars:
+        return text
+    kept = ""
+    for sentence in split_sentences(text):
+        if len(kept) + len(sentence) + 1 > max_chars:
+            break
+        kept = f"{kept} {sentence}" if kept else sentence
+    return kept or text[:max_chars].rstrip() + "…"
+
+
+async def speak_sentences(
+    sentences: Sequence[str],
+    synthesize: Callable[[str], tuple[bytes, int]],
+    encoder_factory: Callable[[int], AudioEncoder],
+    pool: VoiceWorkerPool | None = None,
+) -> bytes:
+    """Synthesize *sentences* in order into one encoded file.
+
+    ``synthesize`` returns (16-bit mono PCM, sample rate) for one sentence.
+    Feeding sentence n to the encoder overlaps the synthesis of sentence
+    n+1; feeds happen strictly in order.
+    """
+    pool = pool or get_voice_pool()
+    encoder: AudioEncoder | None = None
+    feeding: asyncio.Future | None = None
+    try:
+        for sentence in sentences:
+            pcm, sample_rate = await pool.run(synthesize, sentence)
+            if encoder is None:
+                encoder = await pool.run(encoder_factory, sample_rate)
+            if feeding is not None:
+                await feeding
+            feeding = asyncio.ensure_future(pool.run(encoder.feed, pcm))
+        if encoder is None:
+            return b""
+        if feeding is not None:
+            await feeding
+        return await pool.run(encoder.close)
+    except BaseException:
+        if feeding is not None:
+            await asyncio.gather(feeding, return_exceptions=True)
+        if encoder is not None:
+            encoder.abort()
+        raise
+
 
 # ── Public test-friendly / stub-mode API ──────────────────────────────────────
 
@@ -37,6 +141,16 @@ class VoicePipeline:
 
     is_stub: bool = True
 
+    def __init__(
+        self,
+        stt: SpeechToText | None = None,
+        tts: TextToSpeech | None = None,
+        pool: VoiceWorkerPool | None = None,
+    ) -> None:
+        self.stt = stt or SpeechToText()
+        self.tts = tts or TextToSpeech()
+        self.pool = pool or get_voice_pool()
+
     async def process(
         self,
         audio_data: bytes,
@@ -50,9 +164,8 @@ class VoicePipeline:
         t1 = time.perf_counter()
         stages["convert"] = int((t1 - t0) * 1000)
 
-        # 2. STT
-        stt = SpeechToText()
-        transcript = stt.transcribe(audio_data)
+        # 2. STT (voice worker pool)
+        transcript = await self.pool.run(self.stt.transcribe, audio_data)
         t2 = time.perf_counter()
         stages["stt"] = int((t2 - t1) * 1000)
 
@@ -64,11 +177,19 @@ class VoicePipeline:
         t3 = time.perf_counter()
         stages["process"] = int((t3 - t2) * 1000)
 
-        # 4. TTS
-        tts = TextToSpeech()
-        speech = await tts.synthesize(response_text)
+        # 4. TTS, sentence by sentence
+        audio = await speak_sentences(
+            split_sentences(response_text), self.tts.synthesize_pcm, WavEncoder, pool=self.pool,
+        )
         t4 = time.perf_counter()
         stages["tts"] = int((t4 - t3) * 1000)
+        speech = SpeechResult(
+            audio_data=audio or WavEncoder(self.tts.sample_rate).close(),
+            text_length=len(response_text),
+            duration_ms=stages["tts"],
+            voice_id="stub",
+            source="stub" if self.tts.is_stub else "tts",
+        )
 
         total_ms = int((t4 - t0) * 1000)
         return VoicePipelineResult(
@@ -83,9 +204,6 @@ class VoicePipeline:
 
 # ── Production API ────────────────────────────────────────────────────────────
 
-from app.voice.stt import get_stt  # noqa: E402
-from app.voice.tts import get_tts  # noqa: E402
-
 
 async def process_voice_message(file_id: str, bot) -> dict:
     """Download and transcribe a Telegram voice message.
@@ -101,35 +219,21 @@ async def process_voice_message(file_id: str, bot) -> dict:
             logger.error("voice.pipeline.path_not_found", file_id=file_id)
             return {"text": "", "language": "en"}
         
-        # 2. Download file
+        # 2. Download file (Telegram usually sends OGG Opus)
         logger.info("voice.pipeline.downloading", remote_path=remote_path)
         content = await bot.download_file(remote_path)
-        
-        # 3. Save to temp file
-        # Telegram usually sends OGG Opus
-        ext = remote_path.split(".")[-1]
-        local_path = f"/tmp/{file_id}.{ext}"
-        
-        with open(local_path, "wb") as f:
-            f.write(content)
-            
-        logger.info("voice.pipeline.saved", path=local_path, size=len(content))
-        
-        # 4. Transcribe
-        stt = get_stt()
-        # faster-whisper handles OGG/Opus directly via ffmpeg
-        text, language = stt.transcribe(local_path)
-        
-        # 5. Cleanup
-        if os.path.exists(local_path):
-            os.remove(local_path)
-            
+        logger.info("voice.pipeline.downloaded", size=len(content))
+
+        # 3. Transcribe from memory on the voice pool; the first call also loads the model
+        stt = await run_voice_task(get_stt)
+        text, language = await run_voice_task(stt.transcribe, io.BytesIO(content))
         return {"text": text, "language": language}
 
     except Exception as e:
         logger.error("voice.pipeline.failed", error=str(e))
         return {"text": "", "language": "en"}
 
+
 async def generate_voice_reply(text: str, voice: str = "af_sarah") -> str:
     """Generate OGG voice note from text.
     
@@ -137,38 +241,34 @@ async def generate_voice_reply(text: str, voice: str = "af_sarah") -> str:
         text: Text to speak.
         voice: Voice ID (default: af_sarah). 
                Use 'de_thorsten' for German Piper.
+
+    Returns:
+        Path of the .ogg file in the bounded TTS cache, "" on failure.
     """
     try:
-        # 1. Generate WAV (cached in TTS service)
-        tts = get_tts()
-        # Ensure we don't generate overly long audio for now
-        if len(text) > 400: 
-            text = text[:400] + "..." # Truncate for safety/speed in V1
-            
-        wav_path = tts.generate_audio(text, voice=voice)
-        if not wav_path:
+        tts = await run_voice_task(get_tts)
+        engine, lang = tts.route(voice)
+        text = _limit_reply(clean_text_for_tts(text, lang=lang))
+        if not text.strip():
             return ""
-        
-        # 2. Convert to OGG (Voice Note format)
-        # We start with the wav path
-        ogg_path = wav_path.replace(".wav", ".ogg")
-        
-        if os.path.exists(ogg_path):
-            return ogg_path
-            
-        # Convert using ffmpeg
-        import ffmpeg
-        logger.info("voice.pipeline.converting", src=wav_path, dst=ogg_path)
-        try:
-             stream = ffmpeg.input(wav_path)
-             # Opus codec is standard for Telegram Voice Notes
-             stream = ffmpeg.output(stream, ogg_path, acodec='libopus', audio_bitrate='32k')
-             ffmpeg.run(stream, overwrite_output=True, quiet=True)
-             return ogg_path
-        except ffmpeg.Error as e:
-            logger.error("voice.pipeline.ffmpeg_failed", error=str(e))
+
+        name = f"{tts.cache.key(text, voice, engine)}.ogg"
+        cached = await run_voice_task(tts.cache.get, name)
+        if cached:
+            return cached
+
+        sentences = split_sentences(text)
+        t0 = time.perf_counter()
+        ogg = await speak_sentences(sentences, lambda s: tts.synthesize_pcm(s, voice), OpusStreamEncoder)
+        if not ogg:
             return ""
-            
+        path = await run_voice_task(tts.cache.put, name, ogg)
+        logger.info(
+            "voice.pipeline.reply_generated",
+            sentences=len(sentences), chars=len(text), ms=int((time.perf_counter() - t0) * 1000),
+        )
+        return path
+
     except Exception as e:
         logger.error("voice.pipeline.generation_failed", error=str(e))
         return ""
@@ -4,9 +4,11 @@ Handles transcription of audio files (wav, ogg, mp3) to text.
 Exposes SpeechToText (stub-mode, used by tests / no-model environments)
 and STTService (production, requires faster-whisper model files).
 """
+import io
 import os
 import time
 from dataclasses import dataclass
+from typing import BinaryIO
 
 import structlog
 from faster_whisper import WhisperModel
@@ -72,21 +74,28 @@ class STTService:
             logger.error("stt.load_failed", error=str(e))
             raise
 
-    def transcribe(self, file_path: str) -> tuple[str, str]:
-        """Transcribe audio file to text.
-        
+    def transcribe(self, audio: str | bytes | BinaryIO) -> tuple[str, str]:
+        """Transcribe audio to text. Blocking; run it on the voice worker pool.
+
+        Args:
+            audio: File path, raw bytes or an in-memory buffer (decoded by
+                faster-whisper via PyAV, no temp file needed).
+
         Returns:
             Tuple of (transcribed_text, detected_language_code).
         """
-        if not os.path.exists(file_path):
-            logger.error("stt.file_not_found", path=file_path)
+        if isinstance(audio, str) and not os.path.exists(audio):
+            logger.error("stt.file_not_found", path=audio)
             return "", "en"
+        if isinstance(audio, (bytes, bytearray)):
+            audio = io.BytesIO(audio)
+        source = audio if isinstance(audio, str) else "<memory>"
 
         try:
-            logger.info("stt.transcribing", path=file_path)
+            logger.info("stt.transcribing", path=source)
             # Tune parameters for short voice commands
             segments, info = self.model.transcribe(
-                file_path, 
+                audio,
                 beam_size=5,
                 condition_on_previous_text=False,  # Prevent hallucinations
                 initial_prompt="Hallo, hier ist eine Nachricht.",  # German bias
@@ -101,7 +110,7 @@ class STTService:
             full_text = " ".join(text_segments).strip()
             
             logger.info("stt.success", 
-                        path=file_path, 
+                        path=source, 
                         language=info.language, 
                         prob=info.language_probability,
                         text_len=len(full_text))
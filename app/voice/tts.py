@@ -9,17 +9,17 @@ environments without model files.
 """
 import os
 import hashlib
-import struct
 import time
-import wave
 from dataclasses import dataclass
 
+import numpy as np
 import structlog
 # Kokoro
 from kokoro_onnx import Kokoro
 from app.voice.models import MODEL_PATH, VOICES_PATH
 # Piper
 from piper import PiperVoice
+from app.voice.encoding import WavEncoder
 from app.voice.text_cleaner import clean_text_for_tts
 
 logger = structlog.get_logger()
@@ -37,29 +37,23 @@ class SpeechResult:
     source: str
 
 
-def _minimal_wav() -> bytes:
-    """Return a minimal valid 44-byte WAV header with no audio data."""
-    return (
-        b"RIFF"
-        + struct.pack("<I", 36)
-        + b"WAVE"
-        + b"fmt "
-        + struct.pack("<IHHIIHH", 16, 1, 1, 8000, 16000, 2, 16)
-        + b"data"
-        + struct.pack("<I", 0)
-    )
-
-
 class TextToSpeech:
     """Stub-mode TTS engine used by tests and no-model environments."""
 
     is_stub: bool = True
+    sample_rate: int = 8000
+
+    def synthesize_pcm(self, text: str, voice_id: str = "stub") -> tuple[bytes, int]:
+        """Blocking synthesis of one sentence → (16-bit mono PCM, sample rate)."""
+        return b"", self.sample_rate
 
     async def synthesize(self, text: str, voice_id: str = "stub") -> SpeechResult:
         t0 = time.perf_counter()
-        audio = _minimal_wav()
+        pcm, sample_rate = self.synthesize_pcm(text, voice_id)
+        encoder = WavEncoder(sample_rate)
+        encoder.feed(pcm)
         return SpeechResult(
-            audio_data=audio,
+            audio_data=encoder.close(),
             text_length=len(text),
             duration_ms=int((time.perf_counter() - t0) * 1000),
             voice_id=voice_id,
@@ -78,17 +72,84 @@ KOKORO_VOICES = os.path.join(MODEL_DIR, "voices.npz")
 PIPER_MODEL = os.path.join(MODEL_DIR, "de_DE-thorsten-high.onnx")
 PIPER_CONFIG = os.path.join(MODEL_DIR, "de_DE-thorsten-high.json")
 
-CACHE_DIR = "/tmp/tts_cache"
+CACHE_DIR = os.getenv("TTS_CACHE_DIR", "/tmp/tts_cache")
+CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+CACHE_MAX_FILES = int(os.getenv("TTS_CACHE_MAX_FILES", "2000"))
+
+KOKORO_VOICES_SUPPORTED = ("af_sarah", "bf_emma")
+
+
+class TTSDiskCache:
+    """Size-bounded on-disk audio cache with LRU eviction.
+
+    A hit refreshes the file's mtime; ``put`` evicts the least recently
+    used files once the directory exceeds ``max_bytes`` or ``max_files``.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES,
+                 max_files: int = CACHE_MAX_FILES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(text: str, voice: str, engine: str) -> str:
+        return hashlib.md5(f"{text}_{voice}_{engine}".encode()).hexdigest()
+
+    def get(self, name: str) -> str | None:
+        """Path of a cached file (marked as recently used), or None."""
+        path = os.path.join(self.directory, name)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, name: str, data: bytes) -> str:
+        """Store *data* atomically and return its path."""
+        path = os.path.join(self.directory, name)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: str | None = None) -> int:
+        """Drop least recently used files until the limits hold; returns the count."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes and count <= self.max_files:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            count -= 1
+            removed += 1
+        if removed:
+            logger.info("tts.cache_evicted", files=removed, bytes_left=total)
+        return removed
+
 
 class TTSService:
-    def __init__(self):
+    def __init__(self, cache: TTSDiskCache | None = None):
         """Initialize TTS Engines (Lazy Loading)."""
         self._kokoro = None
         self._piper = None
-        
-        # Ensure cache dir
-        if not os.path.exists(CACHE_DIR):
-            os.makedirs(CACHE_DIR)
+        self.cache = cache or TTSDiskCache()
 
     @property
     def kokoro(self) -> Kokoro:
@@ -126,25 +187,47 @@ class TTSService:
                 raise
         return self._piper
 
+    @staticmethod
+    def route(voice: str) -> tuple[str, str]:
+        """Voice ID → (engine name, language code).
+
+        'de_thorsten' or any 'de_' voice uses Piper (German), everything
+        else Kokoro (English/Default).
+        """
+        is_german = voice.startswith("de_") or "thorsten" in voice
+        return ("piper", "de") if is_german else ("kokoro", "en")
+
+    def synthesize_pcm(self, text: str, voice: str = "af_sarah") -> tuple[bytes, int]:
+        """Synthesize already cleaned *text* → (16-bit mono PCM, sample rate). Blocking."""
+        engine, _ = self.route(voice)
+        if engine == "piper":
+            piper = self.piper_german
+            pcm = b"".join(chunk.audio_int16_bytes for chunk in piper.synthesize(text))
+            return pcm, piper.config.sample_rate
+        # Kokoro.create(text, voice, speed, lang) → float32 samples
+        samples, sample_rate = self.kokoro.create(
+            text,
+            voice=voice if voice in KOKORO_VOICES_SUPPORTED else "af_sarah",
+            speed=1.0,
+            lang="en-us",
+        )
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+        return pcm, sample_rate
+
     def generate_audio(self, text: str, voice: str = "af_sarah") -> str:
         """Generate audio from text.
         
         Args:
             text: Text to speak.
-            voice: Voice ID.
-                   - If 'de_thorsten' or starts with 'de_' -> Use Piper (German).
-                   - Else -> Use Kokoro (English/Default).
+            voice: Voice ID (see ``route``).
             
         Returns:
-            Path to generated .wav file.
+            Path to generated .wav file (in the bounded TTS cache).
         """
         if not text:
             return ""
 
-        # Language Detection / Routing
-        is_german = voice.startswith("de_") or "thorsten" in voice
-        engine_name = "piper" if is_german else "kokoro"
-        lang_code = "de" if is_german else "en"
+        engine_name, lang_code = self.route(voice)
 
         # US-11.5: Text Cleaning (Emoji removal, Time normalization)
         text = clean_text_for_tts(text, lang=lang_code)
@@ -154,39 +237,20 @@ class TTSService:
             return ""
 
         # Cache content based on CLEANED text
-        cache_key = hashlib.md5(f"{text}_{voice}_{engine_name}".encode()).hexdigest()
-        output_path = os.path.join(CACHE_DIR, f"{cache_key}.wav")
-
-        if os.path.exists(output_path):
+        name = f"{self.cache.key(text, voice, engine_name)}.wav"
+        cached = self.cache.get(name)
+        if cached:
             logger.info("tts.cache_hit", engine=engine_name, text_preview=text[:20])
-            return output_path
+            return cached
 
         start_time = time.time()
         try:
             logger.info("tts.generating", engine=engine_name, text_len=len(text), voice=voice)
-            
-            if is_german:
-                # PIPER GENERATION
-                with wave.open(output_path, "wb") as wav_file:
-                    wav_file.setnchannels(1)
-                    wav_file.setsampwidth(2)
-                    wav_file.setframerate(self.piper_german.config.sample_rate)
-                    # Iterate over generator
-                    for audio_chunk in self.piper_german.synthesize(text):
-                        wav_file.writeframes(audio_chunk.audio_int16_bytes)
-            else:
-                # KOKORO GENERATION
-                import soundfile as sf
-                # Kokoro.create(text, voice, speed, lang)
-                # Defaults: speed=1.0, lang='en-us'
-                samples, sample_rate = self.kokoro.create(
-                    text, 
-                    voice=voice if voice in ["af_sarah", "bf_emma"] else "af_sarah", 
-                    speed=1.0, 
-                    lang="en-us"
-                )
-                sf.write(output_path, samples, sample_rate)
-            
+            pcm, sample_rate = self.synthesize_pcm(text, voice)
+            encoder = WavEncoder(sample_rate)
+            encoder.feed(pcm)
+            output_path = self.cache.put(name, encoder.close())
+
             duration = time.time() - start_time
             logger.info("tts.generated", duration=f"{duration:.2f}s", path=output_path)
             
@@ -206,25 +270,8 @@ def get_tts() -> TTSService:
     return _service
 
 # Wrapper for main.py compatibility (Async to match interface expected by main.py)
-import asyncio
-
 async def generate_voice_reply(text: str, voice: str = "af_sarah") -> str:
-    """Generate audio reply asynchronously."""
-    tts = get_tts()
-    loop = asyncio.get_event_loop()
-    
-    # Run in executor
-    wav_path = await loop.run_in_executor(None, tts.generate_audio, text, voice)
-    
-    # Convert to OGG (Telegram requirement)
-    if wav_path and os.path.exists(wav_path):
-        ogg_path = wav_path.replace(".wav", ".ogg")
-        if not os.path.exists(ogg_path):
-             # Simple ffmpeg conversion
-             import subprocess
-             # -y overwrite, -i input, -c:a libopus (codec), -b:a 32k (bitrate)
-             cmd = f"ffmpeg -y -v error -i {wav_path} -c:a libopus -b:a 24k {ogg_path}"
-             subprocess.run(cmd, shell=True)
-             
-        return ogg_path
-    return ""
+    """Generate an OGG voice note asynchronously (see app.voice.pipeline)."""
+    from app.voice.pipeline import generate_voice_reply as _generate
+
+    return await _generate(text, voice=voice)
@@ -0,0 +1,73 @@
+"""Dedicated worker pool for blocking voice work (STT, TTS, transcoding).
+
+faster-whisper, Piper/Kokoro and ffmpeg block for seconds. Running them on
+the event loop froze the whole gateway worker per voice note, and the
+default executor is shared with everything else. Voice jobs get their own
+``VOICE_WORKERS`` threads. At most ``VOICE_MAX_PENDING`` jobs may be
+queued or running per event loop; further callers wait for a slot
+(backpressure) instead of piling up unbounded work.
+
+Two workers are the minimum for sentence streaming: one synthesizes the
+next sentence while the other feeds the previous one to the encoder.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+VOICE_WORKERS = max(1, int(os.getenv("VOICE_WORKERS", "2")))
+VOICE_MAX_PENDING = max(1, int(os.getenv("VOICE_MAX_PENDING", "16")))
+
+
+class VoiceWorkerPool:
+    """Bounded thread pool for blocking voice calls."""
+
+    def __init__(self, workers: int = VOICE_WORKERS, max_pending: int = VOICE_MAX_PENDING) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        # asyncio primitives are bound to one loop; tests run one loop per test
+        self._slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="voice")
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(*args, **kwargs)`` on the pool without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.max_pending)
+        async with slots:
+            return await loop.run_in_executor(self._get_executor(), functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pool: VoiceWorkerPool | None = None
+
+
+def get_voice_pool() -> VoiceWorkerPool:
+    global _pool
+    if _pool is None:
+        _pool = VoiceWorkerPool()
+    return _pool
+
+
+async def run_voice_task(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Shortcut for ``get_voice_pool().run(...)``."""
+    return await get_voice_pool().run(fn, *args, **kwargs)
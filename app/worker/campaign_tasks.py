@@ -11,6 +11,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 import structlog
+from app.core.cpu_executor import ExecutorSaturated
 from app.domains.campaigns.models import Campaign, CampaignRecipient, CampaignVariant
 from app.domains.support.models import ScheduledFollowUp
 from app.shared.db import open_session
@@ -126,6 +127,18 @@ async def send_campaign_batch(
             })
             sent += 1
 
+        except ExecutorSaturated:
+            # Render pool still saturated after retries: put the job back and
+            # end this batch instead of failing the recipient.
+            db.rollback()
+            await redis.rpush("campaign:send_queue", raw)
+            logger.warning(
+                "campaign.send.render_saturated",
+                campaign_id=job_campaign_id,
+                recipient_id=recipient_id,
+                tenant_id=job_tenant_id,
+            )
+            break
         except Exception as exc:
             db.rollback()
             failed += 1
@@ -24,3 +24,21 @@ async def run_member_memory_scheduler_forever() -> None:
     from app.memory.member_memory_analyzer import scheduler_loop
 
     await run_supervised_loop("member-memory-scheduler", scheduler_loop)
+
+
+async def run_analytics_rollup_forever() -> None:
+    from app.platform.analytics_rollups import rollup_loop
+
+    await run_supervised_loop("analytics-rollup", rollup_loop)
+
+
+async def run_stripe_mirror_reconcile_forever() -> None:
+    from app.billing.stripe_mirror import reconcile_loop
+
+    await run_supervised_loop("stripe-mirror-reconcile", reconcile_loop)
+
+
+async def run_image_job_reaper_forever() -> None:
+    from app.media.image_jobs import reaper_loop
+
+    await run_supervised_loop("image-job-reaper", reaper_loop)
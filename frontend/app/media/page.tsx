@@ -6,6 +6,7 @@ import {
   AlertTriangle, RefreshCw, X, ChevronDown, Save, Wand2, Star, Coins, ExternalLink,
 } from "lucide-react";
 import { apiFetch } from "@/lib/api";
+import { runImageJob } from "@/lib/image-jobs";
 import { Card } from "@/components/ui/Card";
 import { T } from "@/lib/tokens";
 
@@ -564,15 +565,7 @@ export default function MediaPage() {
     setGenerating(true);
     setGenerateError(null);
     try {
-      const res = await apiFetch("/admin/media/ai-generate", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(aiForm),
-      });
-      if (!res.ok) {
-        const body = await res.json().catch(() => ({}));
-        throw new Error((body as { detail?: string }).detail || `HTTP ${res.status}`);
-      }
+      await runImageJob("/admin/media/ai-generate", aiForm);
       setShowAiForm(false);
       setAiForm({ prompt: "", size: "1024x1024", quality: "standard", model_slug: imageModels.find(m => m.is_default)?.slug ?? "flux2_pro" });
       await fetchMedia();
@@ -590,18 +583,9 @@ export default function MediaPage() {
     setEditError(null);
     setEditResult(null);
     try {
-      const res = await apiFetch(`/admin/media/${editingItem.id}/ai-edit`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(editForm),
-      });
-      if (!res.ok) {
-        const err = await res.json().catch(() => ({})) as { detail?: string };
-        throw new Error(err.detail ?? `HTTP ${res.status}`);
-      }
-      const newItem = await res.json() as MediaItem;
-      setItems((prev) => [newItem, ...prev]);
-      setEditResult(newItem);
+      const result = await runImageJob(`/admin/media/${editingItem.id}/ai-edit`, editForm);
+      await fetchMedia();
+      setEditResult({ ...editingItem, id: String(result.id), url: result.url ?? "" });
       await fetchCreditBalance();
     } catch (e) {
       setEditError(`Bearbeitung fehlgeschlagen: ${e}`);
@@ -8,6 +8,7 @@ import {
   Link2, Copy, FileText, Paperclip, Upload, RefreshCw,
 } from "lucide-react";
 import { apiFetch } from "@/lib/api";
+import { runImageJob } from "@/lib/image-jobs";
 import { T } from "@/lib/tokens";
 import OrchestrationSteps, { OrchestrationStep } from "@/components/campaigns/OrchestrationSteps";
 import ABTestConfig from "@/components/campaigns/ABTestConfig";
@@ -299,23 +300,17 @@ export default function CreateCampaignWizard({ onCreated, onCancel }: WizardProp
     setAutoImageError(null);
     try {
       const prompt = form.ai_prompt.trim() || form.name;
-      const res = await apiFetch("/admin/media/ai-generate", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          prompt,
-          size: "1024x1024",
-          mode: "final",
-          campaign_name: form.name,
-          channel: form.channel,
-          tone: form.tone,
-          task_context: "email_hero",
-          has_text_overlay: false,
-          model_slug: selectedModelSlug,
-        }),
+      const data = await runImageJob("/admin/media/ai-generate", {
+        prompt,
+        size: "1024x1024",
+        mode: "final",
+        campaign_name: form.name,
+        channel: form.channel,
+        tone: form.tone,
+        task_context: "email_hero",
+        has_text_overlay: false,
+        model_slug: selectedModelSlug,
       });
-      const data = await res.json() as { url?: string; detail?: string };
-      if (!res.ok) throw new Error(data.detail || "Bildgenerierung fehlgeschlagen");
       const imgUrl = data.url ?? "";
       // Persist generated image URL on the campaign
       await apiFetch(`/admin/campaigns/${campaignId}`, {
@@ -358,23 +353,17 @@ export default function CreateCampaignWizard({ onCreated, onCancel }: WizardProp
     setImageGenerating(true);
     setImageError(null);
     try {
-      const res = await apiFetch("/admin/media/ai-generate", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          prompt: imageGenPrompt,
-          size: "1024x1024",
-          mode: "preview",
-          campaign_name: form.name,
-          channel: form.channel,
-          tone: form.tone,
-          task_context: "email",
-          has_text_overlay: imageHasTextOverlay,
-          model_slug: "fal_ai_schnell",  // preview always uses schnell
-        }),
+      const data = await runImageJob("/admin/media/ai-generate", {
+        prompt: imageGenPrompt,
+        size: "1024x1024",
+        mode: "preview",
+        campaign_name: form.name,
+        channel: form.channel,
+        tone: form.tone,
+        task_context: "email",
+        has_text_overlay: imageHasTextOverlay,
+        model_slug: "fal_ai_schnell",  // preview always uses schnell
       });
-      const data = await res.json() as { url?: string; detail?: string };
-      if (!res.ok) throw new Error(data.detail || "Vorschau fehlgeschlagen");
       setImagePreviewUrl(data.url ?? null);
       setImagePreviewMode('previewing');
       // Don't set featured_image_url yet — only on finalize
@@ -390,23 +379,17 @@ export default function CreateCampaignWizard({ onCreated, onCancel }: WizardProp
     setImageGenerating(true);
     setImageError(null);
     try {
-      const res = await apiFetch("/admin/media/ai-generate", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          prompt: imageGenPrompt,
-          size: "1024x1024",
-          mode: "final",
-          campaign_name: form.name,
-          channel: form.channel,
-          tone: form.tone,
-          task_context: "email",
-          has_text_overlay: imageHasTextOverlay,
-          model_slug: selectedModelSlug,
-        }),
+      const data = await runImageJob("/admin/media/ai-generate", {
+        prompt: imageGenPrompt,
+        size: "1024x1024",
+        mode: "final",
+        campaign_name: form.name,
+        channel: form.channel,
+        tone: form.tone,
+        task_context: "email",
+        has_text_overlay: imageHasTextOverlay,
+        model_slug: selectedModelSlug,
       });
-      const data = await res.json() as { url?: string; detail?: string };
-      if (!res.ok) throw new Error(data.detail || "Generierung fehlgeschlagen");
       setForm((f: typeof form) => ({ ...f, featured_image_url: data.url ?? "" }));
       setImagePreviewUrl(data.url ?? null);
       setImagePreviewMode('final');
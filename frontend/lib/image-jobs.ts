@@ -0,0 +1,72 @@
+import { apiFetch } from "@/lib/api";
+
+// AI image generation/edit endpoints queue a job (202) and reserve credits;
+// the image itself arrives via GET /admin/media/jobs/{id}.
+
+export type ImageJobStatus = "queued" | "running" | "succeeded" | "failed";
+
+export interface ImageJob {
+  job_id: string;
+  kind: "generate" | "edit";
+  status: ImageJobStatus;
+  stage: string | null;
+  progress: number;
+  asset_id: number | null;
+  result: ImageJobResult | null;
+  error: string | null;
+}
+
+export interface ImageJobResult {
+  id: number | null;
+  url: string | null;
+  revised_prompt?: string | null;
+  provider_slug?: string;
+  model?: string | null;
+  file_size?: number;
+  source?: string;
+  mode?: string | null;
+  created_at?: string | null;
+  qa_passed?: boolean;
+  qa_issues?: string[];
+}
+
+const POLL_INTERVAL_MS = 1500;
+const POLL_TIMEOUT_MS = 10 * 60 * 1000;
+
+async function readDetail(res: Response) {
+  const body = await res.json().catch(() => ({})) as { detail?: string };
+  return body.detail || `HTTP ${res.status}`;
+}
+
+export async function waitForImageJob(
+  jobId: string,
+  onProgress?: (job: ImageJob) => void,
+): Promise<ImageJobResult> {
+  const deadline = Date.now() + POLL_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    const res = await apiFetch(`/admin/media/jobs/${jobId}`);
+    if (!res.ok) throw new Error(await readDetail(res));
+    const job = await res.json() as ImageJob;
+    onProgress?.(job);
+    if (job.status === "succeeded" && job.result) return job.result;
+    if (job.status === "failed") throw new Error(job.error || "Bildgenerierung fehlgeschlagen");
+    await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+  }
+  throw new Error("Zeitüberschreitung bei der Bildgenerierung");
+}
+
+/** POST to an image job endpoint and resolve with the finished result. */
+export async function runImageJob(
+  path: string,
+  payload: unknown,
+  onProgress?: (job: ImageJob) => void,
+): Promise<ImageJobResult> {
+  const res = await apiFetch(path, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(payload),
+  });
+  if (!res.ok) throw new Error(await readDetail(res));
+  const { job_id } = await res.json() as { job_id: string };
+  return waitForImageJob(job_id, onProgress);
+}
@@ -0,0 +1,119 @@
+"""Benchmark: per-request auth latency with and without the AuthContext cache.
+
+Resolves the same access token repeatedly (as a burst of requests from one
+session would) against a temporary SQLite database and a fakeredis client
+with a simulated network round trip.
+
+  before: two EXISTS calls + user/tenant queries on every request
+  after:  one MGET + cache hit (DB only on the first request per TTL)
+
+Usage:
+    python scripts/benchmarks/bench_auth_context.py --requests 2000 --redis-rtt-ms 0.3
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+_tmpdir = tempfile.mkdtemp(prefix="bench_auth_")
+os.environ["ENVIRONMENT"] = "testing"
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/auth.db"
+
+import fakeredis  # noqa: E402
+
+import app.core.auth as core_auth  # noqa: E402
+from app.core.auth_cache import AuthContextCache  # noqa: E402
+from app.core.db import Base, engine  # noqa: E402
+from app.core.redis_keys import jti_blacklist_key, user_blacklisted_key  # noqa: E402
+from app.domains.identity.models import Tenant, UserAccount  # noqa: E402
+from app.shared.db import open_session  # noqa: E402
+
+
+class SlowFakeRedis(fakeredis.FakeRedis):
+    """fakeredis with a fixed per-command delay standing in for the network."""
+
+    rtt_seconds = 0.0
+
+    def execute_command(self, *args, **options):
+        if self.rtt_seconds:
+            time.sleep(self.rtt_seconds)
+        return super().execute_command(*args, **options)
+
+
+def _seed() -> dict:
+    Base.metadata.create_all(engine, tables=[Tenant.__table__, UserAccount.__table__])
+    db = open_session()
+    try:
+        tenant = Tenant(slug="bench", name="Bench", is_active=True)
+        db.add(tenant)
+        db.flush()
+        user = UserAccount(
+            tenant_id=tenant.id, email="bench@example.com", full_name="Bench",
+            role="tenant_admin", password_hash="x", is_active=True,
+        )
+        db.add(user)
+        db.commit()
+        token = core_auth.create_access_token(
+            user_id=user.id, email=user.email, tenant_id=tenant.id,
+            tenant_slug=tenant.slug, role=user.role,
+        )
+    finally:
+        db.close()
+    return core_auth.decode_access_token(token)
+
+
+def _legacy_resolve(payload: dict):
+    """The previous path: two EXISTS round trips, then the DB lookups."""
+    r = core_auth._get_blacklist_redis()
+    if r.exists(jti_blacklist_key(payload["tenant_id"], payload["jti"])):
+        raise RuntimeError("revoked")
+    if r.exists(user_blacklisted_key(payload["tenant_id"], payload["sub"])):
+        raise RuntimeError("revoked")
+    return core_auth._load_context_from_db(payload)
+
+
+def _timed(fn, payload: dict, n: int) -> list[float]:
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn(payload)
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return samples
+
+
+def _report(name: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"  {name:<28} p50 {statistics.median(samples):8.1f} µs   p99 {p99:8.1f} µs   "
+          f"mean {statistics.fmean(samples):8.1f} µs")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--redis-rtt-ms", type=float, default=0.3)
+    parser.add_argument("--ttl", type=float, default=5.0)
+    args = parser.parse_args()
+
+    SlowFakeRedis.rtt_seconds = args.redis_rtt_ms / 1000
+    core_auth._blacklist_redis_client = SlowFakeRedis(decode_responses=True)
+    core_auth._invalidation_listener = object()  # no pub/sub listener needed here
+    core_auth._auth_context_cache = AuthContextCache(ttl_seconds=args.ttl)
+    payload = _seed()
+
+    print(f"{args.requests} requests, simulated Redis RTT {args.redis_rtt_ms} ms, cache TTL {args.ttl}s")
+    before = _timed(_legacy_resolve, payload, args.requests)
+    after = _timed(core_auth._resolve_context_from_payload, payload, args.requests)
+    _report("before (EXISTS x2 + DB)", before)
+    _report("after  (MGET + cache)", after)
+    print(f"  speed-up (mean): {statistics.fmean(before) / statistics.fmean(after):.1f}x   "
+          f"cache hits {core_auth._auth_context_cache.hits}, misses {core_auth._auth_context_cache.misses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark: indexed in-memory GraphStore vs. the previous linear scans.
+
+Seeds N Fact nodes (plus Member nodes and APPLIES_TO edges) and times
+member-fact lookups, full-text search and query_nodes for both the indexed
+InMemoryGraph and a reimplementation of the old dict/list scan fallback.
+
+Usage:
+    python scripts/benchmarks/bench_graph_store.py --facts 100000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from app.memory_platform.models.memory_graph import InMemoryGraph
+
+_WORDS = [
+    "yoga", "pilates", "krafttraining", "rücken", "knie", "morgen", "abend", "sauna",
+    "spinning", "ausdauer", "abnehmen", "muskelaufbau", "vertrag", "pause", "kurs",
+    "trainer", "termin", "schwimmen", "laufen", "dehnen",
+]
+_TYPES = ["preference", "goal", "attribute", "event", "health", "contract"]
+
+
+class LegacyScanGraph:
+    """The previous fallback: a node dict plus an edge list, scanned per query."""
+
+    def __init__(self) -> None:
+        self.nodes: dict[str, dict] = {}
+        self.edges: list[dict] = []
+
+    def upsert(self, label, key_field, key_value, props):
+        node = self.nodes.get(f"{label}:{key_value}", {})
+        node.update(props)
+        node[key_field] = key_value
+        node["_label"] = label
+        self.nodes[f"{label}:{key_value}"] = node
+
+    def relate(self, source, target, rel_type):
+        self.edges.append({"source": source, "target": target, "type": rel_type})
+
+    def member_facts(self, tenant_id, member_id, limit=50):
+        out = []
+        for n in self.nodes.values():
+            if n.get("_label") == "Fact" and n.get("tenant_id") == tenant_id and n.get("member_id") == member_id:
+                out.append(n)
+                if len(out) >= limit:
+                    break
+        return out
+
+    def fulltext(self, tenant_id, text, limit=10):
+        q = text.lower()
+        out = []
+        for n in self.nodes.values():
+            if n.get("_label") != "Fact" or n.get("tenant_id") != tenant_id:
+                continue
+            if q in f"{n.get('subject', '')} {n.get('predicate', '')} {n.get('value', '')}".lower():
+                out.append(n)
+            if len(out) >= limit:
+                break
+        return out
+
+    def query(self, label, filters, limit=100):
+        out = []
+        for n in self.nodes.values():
+            if n.get("_label") == label and all(n.get(k) == v for k, v in filters.items()):
+                out.append(n)
+            if len(out) >= limit:
+                break
+        return out
+
+    def incoming(self, node_key, rel_type):
+        return [e for e in self.edges if e["target"] == node_key and e["type"] == rel_type]
+
+
+def _seed(n_facts: int, n_tenants: int, members_per_tenant: int):
+    rng = random.Random(1)
+    indexed, legacy = InMemoryGraph(), LegacyScanGraph()
+    for t in range(1, n_tenants + 1):
+        for m in range(members_per_tenant):
+            props = {"member_id": f"t{t}m{m}", "tenant_id": t}
+            indexed.upsert_node("Member", "member_id", f"t{t}m{m}", props)
+            legacy.upsert("Member", "member_id", f"t{t}m{m}", props)
+    for i in range(n_facts):
+        t = rng.randint(1, n_tenants)
+        member = f"t{t}m{rng.randrange(members_per_tenant)}"
+        words = rng.sample(_WORDS, 3)
+        if i % 1000 == 0:
+            words.append(f"selten{i // 1000 % 20}")
+        props = {
+            "fact_id": f"f{i}", "tenant_id": t, "member_id": member,
+            "fact_type": rng.choice(_TYPES), "subject": "member",
+            "predicate": rng.choice(["mag", "will", "hat"]),
+            "value": " ".join(words), "confidence": rng.random(),
+        }
+        indexed.upsert_node("Fact", "fact_id", f"f{i}", props)
+        legacy.upsert("Fact", "fact_id", f"f{i}", props)
+        indexed.create_relationship(f"Fact:f{i}", f"Member:{member}", "APPLIES_TO")
+        legacy.relate(f"Fact:f{i}", f"Member:{member}", "APPLIES_TO")
+    return indexed, legacy
+
+
+def _time(label: str, fn, queries) -> float:
+    started = time.perf_counter()
+    for q in queries:
+        fn(*q)
+    per_query = (time.perf_counter() - started) / len(queries)
+    print(f"  {label:<28} {per_query * 1e6:>12,.1f} µs/query")
+    return per_query
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--facts", type=int, default=100_000)
+    parser.add_argument("--tenants", type=int, default=10)
+    parser.add_argument("--members", type=int, default=500, help="members per tenant")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    indexed, legacy = _seed(args.facts, args.tenants, args.members)
+    print(f"seeded {args.facts:,} facts in {time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(2)
+    member_q = [(t, f"t{t}m{rng.randrange(args.members)}") for t in (rng.randint(1, args.tenants) for _ in range(args.queries))]
+    text_q = [(rng.randint(1, args.tenants), rng.choice(_WORDS)) for _ in range(args.queries)]
+    rare_q = [(rng.randint(1, args.tenants), f"selten{rng.randrange(20)}") for _ in range(args.queries)]
+    node_q = [("Fact", {"tenant_id": rng.randint(1, args.tenants), "fact_type": "health", "predicate": "will"})
+              for _ in range(args.queries)]
+    edge_q = [(f"Member:{m}", "APPLIES_TO") for _, m in member_q]
+
+    for name, new_fn, old_fn, queries in (
+        ("get_member_facts", indexed.member_facts, legacy.member_facts, member_q),
+        ("fulltext_search (common)", indexed.fulltext_search, legacy.fulltext, text_q),
+        ("fulltext_search (rare)", indexed.fulltext_search, legacy.fulltext, rare_q),
+        ("query_nodes", indexed.query_nodes, legacy.query, node_q),
+        ("incoming APPLIES_TO", lambda k, r: indexed.neighbors(k, r, "in"), legacy.incoming, edge_q),
+    ):
+        print(name)
+        old = _time("linear scan", old_fn, queries)
+        new = _time("indexed", new_fn, queries)
+        print(f"  {'speedup':<28} {old / new:>12,.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Benchmark: Knowledge-gap detection throughput (exchanges/second) and memory.
+
+Feeds a synthetic stream of user/agent exchanges through KnowledgeGapDetector
+and through an inline copy of the previous list-scan detector (unbounded
+per-conversation query lists, Jaccard over every earlier query, one stored
+KnowledgeGap per detection). Reports throughput, traced memory and how many
+gap entries each one keeps.
+
+Usage:
+    python scripts/benchmarks/bench_knowledge_gaps.py --exchanges 10000 --conversations 200
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+sys.path.append(os.getcwd())
+
+import structlog
+
+from app.platform.ghost_mode_v2 import KnowledgeGap, KnowledgeGapDetector
+
+QUESTIONS = [
+    "Was kostet das Premium-Abo im Monat?",
+    "Wann hat das Studio am Sonntag geöffnet?",
+    "Kann ich meinen Kurs morgen stornieren?",
+    "Wie funktioniert die Kündigung meines Vertrags?",
+    "Gibt es Parkplätze direkt vor dem Eingang?",
+    "Die App zeigt einen Fehler beim Login an",
+    "Welche Leistungen sind im Angebot enthalten?",
+    "Darf ich einen Freund zum Training mitbringen?",
+]
+ANSWERS = [
+    "Das weiß ich leider nicht.",
+    "Dazu habe ich keine Informationen, ich muss nachfragen.",
+    "Gern! Das Premium-Abo kostet 49 Euro im Monat und enthält alle Kurse sowie die Sauna.",
+    "Klar, das geht ganz einfach über die App unter 'Meine Buchungen' bis zwei Stunden vorher.",
+]
+
+
+class LegacyGapDetector(KnowledgeGapDetector):
+    """The previous detector: linear pattern scans and unbounded lists."""
+
+    def __init__(self) -> None:
+        self._gaps: dict[int, list[KnowledgeGap]] = defaultdict(list)
+        self._conversation_queries: dict[str, list[str]] = defaultdict(list)
+
+    def analyze_exchange(self, tenant_id, conversation_id, user_message, agent_response):
+        user_lower = user_message.lower()
+        agent_lower = agent_response.lower()
+        confidence = 0.0
+        topic = ""
+        category = "unknown"
+        if any(p in agent_lower for p in self.UNCERTAINTY_PATTERNS):
+            confidence += 0.4
+        if any(p in user_lower for p in self.FRUSTRATION_PATTERNS):
+            confidence += 0.3
+        for prev_q in self._conversation_queries.get(conversation_id, []):
+            if self._jaccard(user_lower, prev_q) > 0.7:
+                confidence += 0.3
+                break
+        self._conversation_queries[conversation_id].append(user_lower)
+        for cat, keywords in self.TOPIC_CATEGORIES.items():
+            if any(kw in user_lower for kw in keywords):
+                category = topic = cat
+                break
+        if not topic:
+            words = user_message.split()
+            topic = " ".join(words[:5]) if len(words) > 5 else user_message
+        if len(user_message) > 30 and len(agent_response) < 50:
+            confidence += 0.2
+        if confidence < 0.4:
+            return None
+        gap = KnowledgeGap(
+            tenant_id=tenant_id, conversation_id=conversation_id, topic=topic,
+            user_query=user_message[:500], agent_response=agent_response[:500],
+            confidence=min(confidence, 1.0), category=category,
+        )
+        self._gaps[tenant_id].append(gap)
+        return gap
+
+    @staticmethod
+    def _jaccard(a: str, b: str) -> float:
+        words_a, words_b = set(a.split()), set(b.split())
+        if not words_a or not words_b:
+            return 0.0
+        return len(words_a & words_b) / len(words_a | words_b)
+
+
+def _synthetic_stream(n: int, conversations: int, tenants: int) -> list[tuple[int, str, str, str]]:
+    rng = random.Random(42)
+    stream = []
+    for i in range(n):
+        conv = rng.randrange(conversations)
+        question = rng.choice(QUESTIONS)
+        if rng.random() < 0.3:
+            question = f"{question} Kunde {rng.randrange(500)}"
+        stream.append((1 + conv % tenants, f"conv-{conv}", question, rng.choice(ANSWERS)))
+    return stream
+
+
+def _feed(detector, stream) -> int:
+    detected = 0
+    for tenant_id, conversation_id, user_message, agent_response in stream:
+        if detector.analyze_exchange(tenant_id, conversation_id, user_message, agent_response):
+            detected += 1
+    return detected
+
+
+def bench(name: str, factory, stream) -> None:
+    detector = factory()
+    started = time.perf_counter()
+    detected = _feed(detector, stream)
+    elapsed = time.perf_counter() - started
+
+    # separate pass: tracemalloc slows allocation-heavy code down
+    tracemalloc.start()
+    measured = factory()
+    _feed(measured, stream)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if isinstance(detector, LegacyGapDetector):
+        stored = sum(len(gaps) for gaps in detector._gaps.values())
+    else:
+        stored = sum(len(topics) for topics in detector._topics.values())
+    print(f"{name:<8}: {len(stream) / elapsed:>12,.0f} exchanges/s  retained={retained / 1024:>9,.0f} KiB  "
+          f"detected={detected:,}  stored={stored:,}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--exchanges", type=int, default=10_000)
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--tenants", type=int, default=4)
+    args = parser.parse_args()
+    # per-detection info logs would dominate both timings
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    stream = _synthetic_stream(args.exchanges, args.conversations, args.tenants)
+    print(f"exchanges: {args.exchanges:,}  conversations: {args.conversations:,}  tenants: {args.tenants}")
+    bench("legacy", LegacyGapDetector, stream)
+    bench("indexed", KnowledgeGapDetector, stream)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark: MetricsCollector.observe() throughput and scrape cost.
+
+Compares the previous list-based histogram (capped at 10k raw samples,
+re-sorted on every stats/scrape call) with the bucket + DDSketch
+implementation at 1M observations spread over a few labelled series.
+
+  observe:  single thread, then N threads writing concurrently
+  scrape:   to_prometheus() and get_histogram_stats() after all observations
+  memory:   bytes retained by the collector after 10% of the observations
+
+Usage:
+    python scripts/benchmarks/bench_metrics_histogram.py --observations 1000000 --threads 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+
+sys.path.append(os.getcwd())
+
+from app.core.telemetry import MetricsCollector  # noqa: E402
+
+
+class LegacyHistograms:
+    """The previous implementation: raw values in a list, sorted on read."""
+
+    def __init__(self):
+        self._histograms: dict[str, list[float]] = defaultdict(list)
+        self._histogram_max_size = 10_000
+
+    def _key(self, name, labels=None):
+        if not labels:
+            return name
+        label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+        return f"{name}{{{label_str}}}"
+
+    def observe(self, name, value, labels=None):
+        key = self._key(name, labels)
+        self._histograms[key].append(value)
+        if len(self._histograms[key]) > self._histogram_max_size:
+            self._histograms[key] = self._histograms[key][-self._histogram_max_size // 2:]
+
+    def get_histogram_stats(self, name, labels=None):
+        values = sorted(self._histograms.get(self._key(name, labels), []))
+        n = len(values)
+        return {"count": n, "p50": values[int(n * 0.5)], "p99": values[min(int(n * 0.99), n - 1)]}
+
+    def to_prometheus(self):
+        lines = []
+        for key in sorted(self._histograms):
+            stats = self.get_histogram_stats(key)
+            lines.append(f'{key}{{quantile="0.5"}} {stats["p50"]}')
+            lines.append(f'{key}{{quantile="0.99"}} {stats["p99"]}')
+        return "\n".join(lines)
+
+
+LABELS = [{"method": m, "path": p} for m in ("GET", "POST") for p in ("/a", "/b", "/c", "/d")]
+
+
+def _workload(n: int, seed: int) -> list[tuple[float, dict]]:
+    rng = random.Random(seed)
+    return [(rng.lognormvariate(3.5, 1.0), LABELS[i % len(LABELS)]) for i in range(n)]
+
+
+def _observe_all(collector, work) -> None:
+    for value, labels in work:
+        collector.observe("http_request_duration_ms", value, labels)
+
+
+def _bench_observe(collector, work, threads: int) -> float:
+    chunks = [work[i::threads] for i in range(threads)]
+    workers = [threading.Thread(target=_observe_all, args=(collector, c)) for c in chunks]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - t0
+
+
+def _bench_scrape(collector, repeats: int = 5) -> tuple[float, float]:
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        collector.to_prometheus()
+    scrape = (time.perf_counter() - t0) / repeats
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        collector.get_histogram_stats("http_request_duration_ms", LABELS[0])
+    stats = (time.perf_counter() - t0) / repeats
+    return scrape, stats
+
+
+def _run(name: str, factory, work, threads: int) -> None:
+    collector = factory()
+    single = _bench_observe(collector, work, 1)
+    tracemalloc.start()
+    retained = factory()
+    _observe_all(retained, work[: len(work) // 10])
+    held, _ = tracemalloc.get_traced_memory()
+    del retained
+    tracemalloc.stop()
+    multi = _bench_observe(factory(), work, threads)
+    scrape, stats = _bench_scrape(collector)
+    n = len(work)
+    print(f"  {name:<18} observe {n / single / 1e6:5.2f} M/s (1 thread)  "
+          f"{n / multi / 1e6:5.2f} M/s ({threads} threads)   "
+          f"scrape {scrape * 1000:7.2f} ms   stats {stats * 1000:6.2f} ms   "
+          f"retained {held / 1e6:6.2f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--observations", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    work = _workload(args.observations, seed=42)
+    print(f"{args.observations} observations over {len(LABELS)} series")
+    _run("legacy (list)", LegacyHistograms, work, args.threads)
+    _run("buckets+sketch", MetricsCollector, work, args.threads)
+
+    collector = MetricsCollector()
+    _observe_all(collector, work)
+    exact = sorted(v for v, labels in work if labels is LABELS[0])
+    stats = collector.get_histogram_stats("http_request_duration_ms", LABELS[0])
+    for q, key in ((0.5, "p50"), (0.99, "p99")):
+        true = exact[int(q * len(exact))]
+        print(f"  {key}: sketch {stats[key]:.2f}  exact {true:.2f}  "
+              f"error {abs(stats[key] - true) / true * 100:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Offline evaluation: local intent fast path vs. logged LLM labels.
+
+Replays the intent classification log (JSON lines written by the fast
+path; see ``INTENT_LOG_PATH``) through the rules, tenant cache and
+TF-IDF centroid tiers. Reports how many LLM calls would have been avoided
+and how often the local answer agrees with the LLM label, for a range of
+confidence thresholds.
+
+Usage:
+    python scripts/benchmarks/eval_intent_fast_path.py --log data/intent_classifications.jsonl
+    python scripts/benchmarks/eval_intent_fast_path.py --log data/intent_classifications.jsonl --thresholds 0.7 0.8 0.9
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from app.swarm.lead.fast_path import evaluate_offline, load_labelled_examples  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--log", default=os.getenv("INTENT_LOG_PATH", "data/intent_classifications.jsonl"))
+    parser.add_argument("--train-fraction", type=float, default=0.8)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.7, 0.8, 0.9])
+    args = parser.parse_args()
+
+    records = load_labelled_examples(args.log)
+    if not records:
+        sys.exit(f"no labelled classifications in {args.log}")
+    print(f"{len(records)} logged classifications, {len({r['agent_id'] for r in records})} agents")
+
+    for threshold in args.thresholds:
+        report = evaluate_offline(records, train_fraction=args.train_fraction, threshold=threshold)
+        print(f"\nthreshold {threshold:.2f}: train {report['train']}, test {report['test']}")
+        print(f"  LLM calls avoided  {report['avoided_fraction'] * 100:5.1f}%")
+        print(f"  agreement with LLM {report['accuracy'] * 100:5.1f}%")
+        for tier, stats in sorted(report["tiers"].items()):
+            print(f"    {tier:<6} answered {stats['answered']:6d}  accuracy {stats['accuracy'] * 100:5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
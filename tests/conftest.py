@@ -24,8 +24,13 @@ os.environ.setdefault("SYSTEM_ADMIN_PASSWORD", "Password123")
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 from unittest.mock import AsyncMock
 
+import app.core.models  # noqa: F401
+from app.core.db import Base
+from app.domains.identity.models import Tenant
 from app.edge.app import app
 
 
@@ -99,3 +104,24 @@ async def client():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Isolated SQLite file database with the full schema, per test."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """Session factory on ``engine`` with tenants 1 (studio-a) and 2 (studio-b)."""
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with factory() as db:
+        db.add_all([Tenant(id=1, slug="studio-a", name="A"), Tenant(id=2, slug="studio-b", name="B")])
+        db.commit()
+    return factory
@@ -0,0 +1,181 @@
+"""Tests for the incremental Magicline member sync."""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.core.db import SessionLocal
+from app.domains.support.models import StudioMember
+from app.integrations.magicline import members_sync
+
+
+class _FakeClient:
+    """Minimal MagiclineClient stand-in that records contract calls."""
+
+    def __init__(self, customers: list[dict], contract_delay: float = 0.0):
+        self.customers = customers
+        self.contract_delay = contract_delay
+        self.contract_calls: list[int] = []
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def customer_additional_info_fields(self) -> list[dict]:
+        return []
+
+    def customer_list(self, *, customer_status=None, slice_size=100, offset=None) -> dict:
+        start = int(offset or 0)
+        page = self.customers[start:start + slice_size]
+        end = start + len(page)
+        return {"result": page, "hasNext": end < len(self.customers), "offset": str(end)}
+
+    def customer_contracts(self, customer_id: int, *, status=None) -> list[dict]:
+        with self._lock:
+            self.contract_calls.append(customer_id)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.contract_delay:
+                time.sleep(self.contract_delay)
+            return [{"rateName": f"Plan {customer_id}", "startDate": "2026-01-01"}]
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _customer(cid: int, first_name: str = "Max") -> dict:
+    return {"id": cid, "firstName": first_name, "lastName": f"Member{cid}", "customerNumber": str(cid)}
+
+
+@pytest.fixture
+def tenant_id():
+    tid = 900_000 + (uuid4().int % 90_000)
+    yield tid
+    db = SessionLocal()
+    try:
+        db.query(StudioMember).filter(StudioMember.tenant_id == tid).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    holder: dict[str, _FakeClient] = {}
+
+    def _install(client: _FakeClient) -> _FakeClient:
+        holder["client"] = client
+        return client
+
+    monkeypatch.setattr(members_sync, "get_client", lambda tenant_id=None: holder["client"])
+    monkeypatch.setattr(members_sync, "CONTRACT_FETCH_RATE_PER_SEC", 0.0)
+    return _install
+
+
+def _members(tenant_id: int) -> dict[int, StudioMember]:
+    db = SessionLocal()
+    try:
+        return {m.customer_id: m for m in db.query(StudioMember).filter(StudioMember.tenant_id == tenant_id).all()}
+    finally:
+        db.close()
+
+
+def test_initial_sync_inserts_and_fetches_contracts(tenant_id, fake_client):
+    client = fake_client(_FakeClient([_customer(i) for i in range(1, 6)]))
+
+    result = members_sync.sync_members_from_magicline(tenant_id=tenant_id)
+
+    assert result["fetched"] == 5
+    assert result["upserted"] == 5
+    assert result["contracts_fetched"] == 5
+    rows = _members(tenant_id)
+    assert set(rows) == {1, 2, 3, 4, 5}
+    assert '"plan_name": "Plan 3"' in rows[3].contract_info
+    assert rows[3].sync_hash and rows[3].contract_synced_at is not None
+
+
+def test_unchanged_members_are_skipped_without_contract_calls(tenant_id, fake_client):
+    client = fake_client(_FakeClient([_customer(i) for i in range(1, 6)]))
+    members_sync.sync_members_from_magicline(tenant_id=tenant_id)
+    client.contract_calls.clear()
+
+    result = members_sync.sync_members_from_magicline(tenant_id=tenant_id)
+
+    assert result["upserted"] == 0
+    assert result["skipped"] == 5
+    assert client.contract_calls == []
+
+
+def test_changed_new_and_removed_members(tenant_id, fake_client):
+    client = fake_client(_FakeClient([_customer(i) for i in range(1, 4)]))
+    members_sync.sync_members_from_magicline(tenant_id=tenant_id)
+    client.contract_calls.clear()
+
+    client.customers = [_customer(1, "Erika"), _customer(2), _customer(4)]
+    result = members_sync.sync_members_from_magicline(tenant_id=tenant_id)
+
+    assert result["upserted"] == 2  # 1 changed + 4 new
+    assert result["deleted"] == 1
+    assert result["skipped"] == 1
+    # Only the new member needs a contract lookup; a name change does not
+    assert client.contract_calls == [4]
+    rows = _members(tenant_id)
+    assert set(rows) == {1, 2, 4}
+    assert rows[1].first_name == "Erika"
+    assert rows[1].contract_info  # preserved from the first sync
+
+
+def test_pause_flip_and_stale_contracts_trigger_refresh(tenant_id, fake_client):
+    client = fake_client(_FakeClient([_customer(1), _customer(2)]))
+    members_sync.sync_members_from_magicline(tenant_id=tenant_id)
+    client.contract_calls.clear()
+
+    paused = _customer(1)
+    paused["idlePeriods"] = [{"startDate": "2000-01-01", "unlimited": True}]
+    client.customers = [paused, _customer(2)]
+
+    db = SessionLocal()
+    try:
+        old = datetime.now(timezone.utc) - timedelta(hours=members_sync.CONTRACT_REFRESH_HOURS + 1)
+        db.query(StudioMember).filter(
+            StudioMember.tenant_id == tenant_id, StudioMember.customer_id == 2
+        ).update({"contract_synced_at": old})
+        db.commit()
+    finally:
+        db.close()
+
+    members_sync.sync_members_from_magicline(tenant_id=tenant_id)
+
+    assert sorted(client.contract_calls) == [1, 2]
+    assert _members(tenant_id)[1].is_paused is True
+
+
+def test_contract_fetch_is_concurrent_and_bounded(tenant_id, fake_client, monkeypatch):
+    monkeypatch.setattr(members_sync, "CONTRACT_FETCH_CONCURRENCY", 4)
+    client = fake_client(_FakeClient([_customer(i) for i in range(1, 17)], contract_delay=0.05))
+
+    started = time.perf_counter()
+    members_sync.sync_members_from_magicline(tenant_id=tenant_id)
+    elapsed = time.perf_counter() - started
+
+    assert len(client.contract_calls) == 16
+    assert client.max_in_flight == 4
+    assert elapsed < 16 * 0.05
+
+
+def test_failed_contract_fetch_keeps_previous_info(tenant_id, fake_client):
+    client = fake_client(_FakeClient([_customer(1)]))
+    members_sync.sync_members_from_magicline(tenant_id=tenant_id)
+    before = _members(tenant_id)[1].contract_info
+
+    def _boom(customer_id, *, status=None):
+        raise RuntimeError("502")
+
+    client.customer_contracts = _boom
+    members_sync.sync_members_from_magicline(tenant_id=tenant_id, full_refresh=True)
+
+    assert _members(tenant_id)[1].contract_info == before
@@ -0,0 +1,28 @@
+"""Tests für die Alembic-Revisionskette (alembic/versions).
+
+Die Kette muss genau einen Head haben, und ``run_migrations`` muss auf
+genau diesen Head upgraden — sonst bleiben Revisionen eines Zweigs liegen.
+"""
+
+import inspect
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from app.core import db
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _scripts() -> ScriptDirectory:
+    return ScriptDirectory.from_config(Config(str(REPO_ROOT / "alembic.ini")))
+
+
+def test_single_head():
+    assert len(_scripts().get_heads()) == 1
+
+
+def test_run_migrations_pins_the_head():
+    [head] = _scripts().get_heads()
+    assert f'command.upgrade(alembic_cfg, "{head}")' in inspect.getsource(db.run_migrations)
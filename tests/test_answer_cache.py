@@ -0,0 +1,204 @@
+"""Tests für den semantischen Antwort-Cache der Wissensdatenbank (app/knowledge/answer_cache.py)."""
+
+import asyncio
+import hashlib
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+
+import app.knowledge.answer_cache as answer_cache_module
+from app.core.telemetry import get_metrics
+from app.integrations.adapters.knowledge_adapter import KnowledgeAdapter
+from app.knowledge.answer_cache import RedisAnswerGenerations, SemanticAnswerCache
+from app.knowledge.knowledge_manager import KnowledgeManager
+from app.swarm.agents.generic_agent import GenericExpertAgent
+from app.swarm.contracts import AgentTask, TenantContext, ToolResult
+from app.swarm.llm import LLMResponse
+from app.swarm.tools.base import SkillTool
+
+_SYNONYMS = {"geöffnet": "offen", "öffnungszeiten": "offen", "auf": "offen"}
+
+
+def hash_embedder(texts: list[str]) -> list[list[float]]:
+    """Deterministic bag-of-words embedding: one hashed dimension per word."""
+    vectors = []
+    for text in texts:
+        vector = [0.0] * 64
+        for word in text.split():
+            word = _SYNONYMS.get(word, word)
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1.0
+        vectors.append(vector)
+    return vectors
+
+
+class FakeTool(SkillTool):
+    description = "test"
+    parameters_schema = {"type": "object", "properties": {}}
+
+    def __init__(self, name: str, data: str = "Mo-Fr 6-23 Uhr") -> None:
+        self.name = name
+        self.data = data
+        self.calls = 0
+
+    async def execute(self, params, context):
+        self.calls += 1
+        return ToolResult(success=True, data=self.data)
+
+
+def _ctx(slug: str = "studio", user_name: str = "") -> TenantContext:
+    return TenantContext(
+        tenant_id=1, tenant_slug=slug, plan_slug="pro",
+        active_integrations=frozenset(), settings={}, member_id="4711", user_name=user_name,
+    )
+
+
+def _task(message: str, ctx: TenantContext | None = None, history=()) -> AgentTask:
+    return AgentTask(
+        task_id="t1", agent_id="knowledge", original_message=message,
+        intent_payload={}, tenant_context=ctx or _ctx(), conversation_history=history,
+    )
+
+
+def _llm(tool: str, answer: str) -> MagicMock:
+    """LLM that calls *tool* once and then answers."""
+    llm = MagicMock()
+    tool_call = {"id": "c1", "function": {"name": tool, "arguments": json.dumps({"query": "x"})}}
+    llm.chat_with_tools = AsyncMock(side_effect=lambda **kw: (
+        LLMResponse(content=answer, total_tokens=300)
+        if any(m["role"] == "tool" for m in kw["messages"])
+        else LLMResponse(content="", tool_calls=[tool_call], total_tokens=200)
+    ))
+    return llm
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = SemanticAnswerCache(embedder=hash_embedder, threshold=0.9, enabled=True)
+    monkeypatch.setattr(answer_cache_module, "_cache", cache)
+    return cache
+
+
+def _agent(tool: SkillTool, llm) -> GenericExpertAgent:
+    agent = GenericExpertAgent("knowledge", "Wissen", "", tools=[tool])
+    agent._render_prompt_from_template = lambda task: "system"
+    agent._get_llm = lambda: llm
+    return agent
+
+
+async def test_similar_questions_hit_per_tenant(cache):
+    await cache.store("studio", "knowledge", "Wann habt ihr am Sonntag geöffnet?", "Sonntag 9-18 Uhr", tokens=500)
+    saved_before = get_metrics().get_counter("answer_cache_saved_tokens_total")
+
+    hit = await cache.lookup("studio", "knowledge", "wann habt ihr am SONNTAG auf")
+    assert hit is not None and hit.content == "Sonntag 9-18 Uhr"
+    assert get_metrics().get_counter("answer_cache_saved_tokens_total") - saved_before == 500
+
+    assert await cache.lookup("studio", "knowledge", "Was kostet die Mitgliedschaft im Monat?") is None
+    assert await cache.lookup("other", "knowledge", "Wann habt ihr am Sonntag geöffnet?") is None
+    assert await cache.lookup("studio", "sales", "Wann habt ihr am Sonntag geöffnet?") is None
+
+
+async def test_knowledge_only_answers_are_served_from_cache(cache):
+    tool = FakeTool("knowledge_search")
+    llm = _llm("knowledge_search", "Wir haben Mo-Fr von 6 bis 23 Uhr geöffnet.")
+    agent = _agent(tool, llm)
+
+    first = await agent.execute(_task("Wie sind eure Öffnungszeiten unter der Woche?"))
+    second = await agent.execute(_task("wie sind eure öffnungszeiten unter der woche"))
+
+    assert first.content == second.content
+    assert second.metadata == {"answer_cache": "hit"}
+    assert llm.chat_with_tools.call_count == 2 and tool.calls == 1
+    assert cache._entries[("studio", "knowledge")]["wie sind eure öffnungszeiten unter der woche"].tokens == 500
+
+
+async def test_member_specific_answers_are_not_cached(cache):
+    # A member tool was involved
+    agent = _agent(FakeTool("member_memory"), _llm("member_memory", "Dein Vertrag läuft bis März."))
+    await agent.execute(_task("Wie lange läuft mein Vertrag noch?"))
+    # The answer addresses the member by name
+    agent = _agent(FakeTool("knowledge_search"), _llm("knowledge_search", "Hallo Anna, wir haben bis 23 Uhr offen."))
+    await agent.execute(_task("Wie lange habt ihr heute offen?", _ctx(user_name="Anna")))
+    # Short follow-ups depend on the conversation
+    agent = _agent(FakeTool("knowledge_search"), _llm("knowledge_search", "Sonntags bis 18 Uhr."))
+    await agent.execute(_task("Und sonntags?", history=({"role": "user", "content": "Öffnungszeiten?"},)))
+
+    assert len(cache) == 0
+
+
+async def test_reingest_invalidates_tenant_and_drops_in_flight_answers(cache):
+    await cache.store("studio", "knowledge", "Was kostet ein Tagesticket?", "15 Euro")
+    await cache.store("other", "knowledge", "Was kostet ein Tagesticket?", "12 Euro")
+    generation = await cache.generation("studio")
+
+    manager = KnowledgeManager.__new__(KnowledgeManager)
+    store = MagicMock()
+    manager._get_store = lambda collection: store
+    assert await manager.add_tenant_knowledge("studio", ["Tagesticket: 18 Euro"]) == 1
+
+    assert await cache.lookup("studio", "knowledge", "Was kostet ein Tagesticket?") is None
+    assert (await cache.lookup("other", "knowledge", "Was kostet ein Tagesticket?")).content == "12 Euro"
+    # An answer generated from the old documents is not stored
+    assert not await cache.store("studio", "knowledge", "Was kostet ein Tagesticket?", "15 Euro", generation=generation)
+    assert await cache.store("studio", "knowledge", "Was kostet ein Tagesticket?", "18 Euro", generation=await cache.generation("studio"))
+
+
+def _shared_caches(n: int) -> list[SemanticAnswerCache]:
+    """Caches of *n* workers sharing one (fake) Redis."""
+    server = fakeredis.FakeServer()
+    return [
+        SemanticAnswerCache(
+            embedder=hash_embedder, threshold=0.9, enabled=True, generation_check_seconds=0,
+            shared=RedisAnswerGenerations(
+                client=fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+                sync_client=fakeredis.FakeRedis(server=server, decode_responses=True),
+            ),
+        )
+        for _ in range(n)
+    ]
+
+
+async def test_invalidation_reaches_other_workers():
+    worker_a, worker_b = _shared_caches(2)
+    generation = await worker_a.generation("studio")
+    await worker_a.store("studio", "knowledge", "Was kostet ein Tagesticket?", "15 Euro", generation=generation)
+    await worker_a.store("other", "knowledge", "Was kostet ein Tagesticket?", "12 Euro")
+    in_flight = await worker_a.generation("other")
+
+    # Re-ingest handled by worker B, from async code and from a sync ingest thread
+    worker_b.invalidate("studio")
+    await worker_b.flush()
+    assert await worker_a.lookup("studio", "knowledge", "Was kostet ein Tagesticket?") is None
+    assert (await worker_a.lookup("other", "knowledge", "Was kostet ein Tagesticket?")).content == "12 Euro"
+
+    await asyncio.to_thread(worker_b.invalidate, None)
+    assert await worker_a.lookup("other", "knowledge", "Was kostet ein Tagesticket?") is None
+    assert not await worker_a.store("other", "knowledge", "Frage", "Antwort", generation=in_flight)
+
+
+async def test_unreachable_redis_disables_the_cache():
+    [cache] = _shared_caches(1)
+    await cache.store("studio", "knowledge", "Was kostet ein Tagesticket?", "15 Euro")
+    cache._shared.get = AsyncMock(side_effect=ConnectionError("redis down"))
+
+    assert await cache.generation("studio") is None
+    assert await cache.lookup("studio", "knowledge", "Was kostet ein Tagesticket?") is None
+    assert not await cache.store("studio", "knowledge", "Was kostet ein Tagesticket?", "16 Euro")
+
+
+async def test_adapter_document_writes_invalidate_tenant(cache):
+    await cache.store("studio", "knowledge", "Was kostet ein Tagesticket?", "15 Euro")
+    adapter = KnowledgeAdapter.__new__(KnowledgeAdapter)
+
+    with patch.object(KnowledgeAdapter, "_resolve_slug", return_value="studio"), \
+         patch("app.knowledge.store.KnowledgeStore"):
+        added = await adapter._add_document(1, content="Tagesticket: 18 Euro")
+        assert added.success
+        assert await cache.lookup("studio", "knowledge", "Was kostet ein Tagesticket?") is None
+
+        await cache.store("studio", "knowledge", "Was kostet ein Tagesticket?", "18 Euro")
+        deleted = await adapter._delete_document(1, doc_ids=[added.data["doc_id"]])
+        assert deleted.success
+        assert await cache.lookup("studio", "knowledge", "Was kostet ein Tagesticket?") is None
@@ -0,0 +1,174 @@
+"""Tests für den AuthContext-Cache und den gebündelten Blacklist-Check (app/core/auth.py)."""
+
+import json
+import queue
+import time
+
+import fakeredis
+import pytest
+import redis
+from fastapi import HTTPException
+from structlog.testing import capture_logs
+
+import app.core.auth as core_auth
+from app.core.auth import AuthContext, decode_access_token, create_access_token
+from app.core.auth_cache import AuthContextCache, apply_invalidation
+from app.core.redis_keys import jti_blacklist_key, user_blacklisted_key
+from app.domains.identity.models import Tenant, UserAccount
+from app.shared.db import open_session
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _CountingRedis(fakeredis.FakeRedis):
+    commands: list[str] = []
+
+    def execute_command(self, *args, **options):
+        self.commands.append(args[0])
+        return super().execute_command(*args, **options)
+
+
+def _ctx(user_id=1, tenant_id=1):
+    return AuthContext(user_id=user_id, email="a@b.c", tenant_id=tenant_id, tenant_slug="t", role="tenant_user")
+
+
+def test_cache_expires_and_is_bounded():
+    clock = _Clock()
+    cache = AuthContextCache(ttl_seconds=5, max_entries=2, clock=clock)
+    cache.put("a", _ctx(), user_ids={1}, tenant_ids={1})
+    cache.put("b", _ctx(), user_ids={2}, tenant_ids={1})
+    assert cache.get("a") is not None  # a is now most recently used
+    cache.put("c", _ctx(), user_ids={3}, tenant_ids={2})
+
+    assert cache.get("b") is None
+    assert len(cache) == 2
+    clock.now += 5.1
+    assert cache.get("a") is None and cache.get("c") is None
+    assert AuthContextCache(ttl_seconds=0).enabled is False
+
+
+def test_invalidation_by_jti_user_and_tenant():
+    cache = AuthContextCache()
+    cache.put("a", _ctx(1, 1), user_ids={1}, tenant_ids={1})
+    cache.put("b", _ctx(2, 1), user_ids={2, 9}, tenant_ids={1, 5})  # impersonated by 9
+    cache.put("c", _ctx(3, 2), user_ids={3}, tenant_ids={2})
+
+    assert cache.invalidate(user_id=9) == 1
+    assert cache.invalidate(jti="nope") == 0
+    assert apply_invalidation(cache, json.dumps({"tenant_id": 1, "user_id": None, "jti": None})) == 1
+    assert apply_invalidation(cache, b"not json") == 0
+    assert cache.get("c") is not None and len(cache) == 1
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = _CountingRedis(decode_responses=True)
+    _CountingRedis.commands = []
+    monkeypatch.setattr(core_auth, "_blacklist_redis_client", client)
+    # fresh outbox and publisher thread, unaffected by earlier commits
+    monkeypatch.setattr(core_auth, "_invalidation_outbox", queue.Queue())
+    monkeypatch.setattr(core_auth, "_invalidation_publisher", None)
+    return client
+
+
+def test_blacklist_check_is_a_single_round_trip(fake_redis):
+    payload = {"jti": "j1", "tenant_id": 7, "sub": "3"}
+    core_auth._check_token_blacklist(payload)
+    assert fake_redis.commands == ["MGET"]
+
+    fake_redis.set(user_blacklisted_key(7, "3"), "1")
+    with pytest.raises(HTTPException, match="User session"):
+        core_auth._check_token_blacklist(payload)
+    fake_redis.set(jti_blacklist_key(7, "j1"), "1")
+    with pytest.raises(HTTPException, match="Token has been revoked"):
+        core_auth._check_token_blacklist(payload)
+
+
+def test_invalidation_is_published_per_tenant(fake_redis):
+    pubsub = fake_redis.pubsub(ignore_subscribe_messages=True)
+    pubsub.psubscribe("t*:auth:invalidate")
+    pubsub.get_message(timeout=0.1)  # subscribe confirmation
+
+    core_auth.invalidate_auth_context(7, user_id=3)
+
+    message = pubsub.get_message(timeout=1.0)
+    assert message["channel"] == "t7:auth:invalidate"
+    assert json.loads(message["data"]) == {"tenant_id": 7, "user_id": 3, "jti": None}
+
+
+def test_invalidation_never_waits_for_redis(fake_redis, monkeypatch):
+    attempts = []
+
+    def down(*args, **kwargs):
+        attempts.append(1)
+        time.sleep(0.2)
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(fake_redis, "publish", down)
+    cache = AuthContextCache()
+    monkeypatch.setattr(core_auth, "_auth_context_cache", cache)
+    cache.put("j1", _ctx(3, 7), user_ids={3}, tenant_ids={7})
+
+    with capture_logs() as logs:
+        started = time.perf_counter()
+        for _ in range(50):
+            core_auth.invalidate_auth_context(7, user_id=3)
+        elapsed = time.perf_counter() - started
+        assert cache.get("j1") is None  # local eviction is immediate
+        deadline = time.monotonic() + 3
+        while not core_auth._invalidation_outbox.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert elapsed < 0.1
+    assert core_auth._invalidation_outbox.empty()
+    # one failed attempt, the rest dropped during the retry delay and logged once
+    assert len(attempts) == 1
+    assert [e["event"] for e in logs].count("auth.invalidation_publish_failed") == 1
+
+
+def test_resolve_context_is_cached_until_user_changes(fake_redis, monkeypatch):
+    monkeypatch.setattr(core_auth, "_invalidation_listener", object())  # no background listener
+    monkeypatch.setattr(core_auth, "_auth_context_cache", AuthContextCache(ttl_seconds=60))
+    opened = []
+
+    def _counting_open_session():
+        opened.append(1)
+        return open_session()
+
+    monkeypatch.setattr(core_auth, "open_session", _counting_open_session)
+
+    from app.core.db import tenant_context
+    ctx_token = tenant_context.set(None)
+    db = open_session()
+    try:
+        user = db.query(UserAccount).filter(UserAccount.role == "system_admin").first()
+        tenant = db.query(Tenant).filter(Tenant.id == user.tenant_id).first()
+        token = create_access_token(
+            user_id=user.id, email=user.email, tenant_id=tenant.id,
+            tenant_slug=tenant.slug, role=user.role,
+        )
+        payload = decode_access_token(token)
+
+        first = core_auth._resolve_context_from_payload(payload)
+        second = core_auth._resolve_context_from_payload(payload)
+        assert len(opened) == 1
+        assert first == second and first is not second
+
+        # Any committed ORM update of the user evicts its cached contexts
+        original_name = user.full_name
+        user.full_name = "Cache Invalidation"
+        db.commit()
+        core_auth._resolve_context_from_payload(payload)
+        assert len(opened) == 2
+
+        user.full_name = original_name
+        db.commit()
+    finally:
+        db.close()
+        tenant_context.reset(ctx_token)
@@ -0,0 +1,179 @@
+"""Tests für den mandantenfähigen Kontext-Prefetch-Cache (app/memory_platform/prefetcher)."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.memory_platform.event_bus import InternalEventBus
+from app.memory_platform.models import MemoryEvent
+from app.memory_platform.prefetcher import ContextPrefetcher
+from app.swarm.contracts import AgentResult, IntentResult, TenantContext
+
+
+def _prefetcher(delay: float = 0.0, **kwargs) -> tuple[ContextPrefetcher, list]:
+    """Prefetcher with a stub loader that records every load."""
+    with patch("app.memory_platform.prefetcher.get_event_bus", return_value=InternalEventBus()):
+        prefetcher = ContextPrefetcher(**kwargs)
+    loads: list[tuple[int, str | None]] = []
+
+    async def _load(tenant_id, member_id, query):
+        loads.append((tenant_id, member_id))
+        await asyncio.sleep(delay)
+        return {
+            "knowledge_context": f"tenant {tenant_id}",
+            "member_facts": [{"subject": member_id, "predicate": "trainiert", "value": query, "confidence": 0.9}],
+            "member_summary": "",
+            "recent_interactions": [],
+            "prefetch_time_ms": 0,
+            "cache_hit": False,
+        }
+
+    prefetcher._load_context = _load
+    return prefetcher, loads
+
+
+async def test_cache_is_isolated_per_tenant():
+    prefetcher, loads = _prefetcher()
+
+    a = await prefetcher.prefetch_context(1, "42", "Yoga")
+    b = await prefetcher.prefetch_context(2, "42", "Boxen")
+    again = await prefetcher.prefetch_context(1, "42", "egal")
+
+    assert loads == [(1, "42"), (2, "42")]
+    assert a["knowledge_context"] == "tenant 1" and b["knowledge_context"] == "tenant 2"
+    assert again["cache_hit"] is True and again["knowledge_context"] == "tenant 1"
+
+
+async def test_lru_eviction_respects_memory_budget():
+    prefetcher, loads = _prefetcher(memory_budget_bytes=700)
+
+    for member in ("a", "b", "c"):
+        await prefetcher.prefetch_context(1, member, "x" * 100)
+    assert prefetcher.cache_stats["bytes"] <= 700
+
+    # "a" was least recently used and had to go; "c" is still cached
+    await prefetcher.prefetch_context(1, "c", "")
+    await prefetcher.prefetch_context(1, "a", "")
+    assert loads == [(1, "a"), (1, "b"), (1, "c"), (1, "a")]
+
+
+async def test_concurrent_requests_share_one_load():
+    prefetcher, loads = _prefetcher(delay=0.05)
+
+    results = await asyncio.gather(*(prefetcher.prefetch_context(1, "42", "Kurs") for _ in range(10)))
+
+    assert loads == [(1, "42")]
+    assert all(r["member_facts"] == results[0]["member_facts"] for r in results)
+    assert prefetcher.cache_stats["inflight"] == 0
+
+
+async def test_memory_written_event_invalidates_members_and_tenant():
+    prefetcher, loads = _prefetcher()
+    bus = prefetcher._event_bus
+    await prefetcher.initialise()
+    for tenant, member in ((1, "a"), (1, "b"), (2, "a")):
+        await prefetcher.prefetch_context(tenant, member, "")
+
+    await bus.publish(MemoryEvent(event_type="memory.written", tenant_id=1, metadata={"member_ids": ["a"]}))
+    assert (1, "a") not in prefetcher._cache and (1, "b") in prefetcher._cache
+
+    # Knowledge writes carry no member ids and drop the whole tenant
+    await bus.publish(MemoryEvent(event_type="memory.written", tenant_id=1, metadata={}))
+    assert list(prefetcher._cache) == [(2, "a")]
+
+
+async def test_write_during_load_is_not_cached():
+    prefetcher, loads = _prefetcher(delay=0.05)
+
+    pending = asyncio.ensure_future(prefetcher.prefetch_context(1, "42", ""))
+    await asyncio.sleep(0.01)
+    prefetcher.invalidate_cache(1, "42")
+    await pending
+
+    assert (1, "42") not in prefetcher._cache
+
+
+async def test_prefetch_overlaps_with_intent_classification():
+    from app.gateway.schemas import InboundMessage, Platform
+    from app.swarm.lead.lead_agent import LeadAgent
+
+    prefetcher, _ = _prefetcher(delay=0.2)
+
+    async def _slow_classify(*args, **kwargs):
+        await asyncio.sleep(0.2)
+        return IntentResult(agent_id="ops", confidence=0.9, extracted={})
+
+    agent = AsyncMock()
+    agent.execute = AsyncMock(return_value=AgentResult(agent_id="ops", content="ok", confidence=0.95))
+    loader = MagicMock()
+    loader.get_agent = MagicMock(return_value=agent)
+    config = MagicMock()
+    config.return_value.get_tenant_config.return_value = {"agent_team": {"agent_ids": ["ops"]}}
+
+    message = InboundMessage(
+        message_id="m1", platform=Platform.WHATSAPP, user_id="u1", content="Buche Yoga", tenant_id=1,
+    )
+    context = TenantContext(
+        tenant_id=1, tenant_slug="studio", plan_slug="pro",
+        active_integrations=frozenset(), settings={}, member_id="42", session_id="s1",
+    )
+
+    with patch("app.swarm.lead.intent_classifier.classify", _slow_classify), \
+         patch("app.swarm.registry.dynamic_loader.get_agent_loader", return_value=loader), \
+         patch("app.swarm.lead.lead_agent.DynamicConfigManager", config), \
+         patch("app.swarm.lead.lead_agent.LeadAgent._get_available_agents", return_value={"ops": "Termine"}), \
+         patch("app.swarm.lead.lead_agent.LeadAgent._build_history", return_value=()), \
+         patch("app.swarm.qa.profiles.QA_PROFILES", {"standard": MagicMock(criteria=frozenset(), max_revision_attempts=0)}), \
+         patch("app.memory_platform.prefetcher._prefetcher", prefetcher):
+        started = time.perf_counter()
+        prefetch = prefetcher.start_prefetch(1, "42", message.content)
+        result = await LeadAgent(llm=AsyncMock()).handle(message, context, prefetch=prefetch)
+        elapsed = time.perf_counter() - started
+
+    assert result.content == "ok"
+    # Sequential retrieval + classification would take >= 0.4 s
+    assert elapsed < 0.35, f"prefetch did not overlap: {elapsed:.2f}s"
+    task = agent.execute.call_args.args[0]
+    assert "Buche Yoga" in task.intent_payload["member_profile"]
+
+
+async def test_cancelled_shared_load_is_a_miss_for_waiters():
+    prefetcher, loads = _prefetcher(delay=0.05)
+
+    owner = asyncio.ensure_future(prefetcher.prefetch_context(1, "42", "Kurs"))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.ensure_future(prefetcher.prefetch_context(1, "42", "Kurs"))
+    await asyncio.sleep(0.01)
+    owner.cancel()
+
+    context = await waiter  # loads on its own instead of raising CancelledError
+    assert owner.cancelled()
+    assert context["knowledge_context"] == "tenant 1"
+    assert loads == [(1, "42"), (1, "42")]
+    assert (1, "42") in prefetcher._cache and prefetcher.cache_stats["inflight"] == 0
+
+
+async def test_cancelled_prefetch_is_skipped_by_lead_agent():
+    from app.swarm.lead.lead_agent import LeadAgent
+
+    prefetcher, _ = _prefetcher(delay=1)
+    with patch("app.memory_platform.prefetcher.get_event_bus", return_value=InternalEventBus()):
+        task = prefetcher.start_prefetch(1, "42", "Kurs")
+        await asyncio.sleep(0.01)
+        prefetcher.discard_prefetch(task)
+        assert await LeadAgent._await_prefetch(task) == ""
+
+
+async def test_aclose_cancels_and_awaits_orphaned_prefetches():
+    prefetcher, _ = _prefetcher(delay=10)
+    with patch("app.memory_platform.prefetcher.get_event_bus", return_value=InternalEventBus()):
+        tasks = [prefetcher.start_prefetch(1, member, "") for member in ("a", "b")]
+        await asyncio.sleep(0.01)
+        assert len(prefetcher._tasks) == 2
+
+        await prefetcher.aclose()
+
+    assert all(task.cancelled() for task in tasks)
+    assert not prefetcher._tasks and prefetcher.cache_stats["inflight"] == 0
@@ -0,0 +1,170 @@
+"""Tests für den gemeinsamen CPU-Executor (app/core/cpu_executor.py)."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+import app.core.auth as core_auth
+import app.core.cpu_executor as cpu_executor
+from app.core.cpu_executor import CategoryLimits, CPUExecutor, ExecutorSaturated
+from app.core.telemetry import get_metrics
+
+
+async def _max_loop_lag(work, interval: float = 0.005) -> tuple[float, object]:
+    """Run ``work`` while a ticker measures how late the event loop wakes it up."""
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def _ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - started - interval)
+
+    ticker = asyncio.create_task(_ticker())
+    await asyncio.sleep(0)
+    try:
+        result = await work
+    finally:
+        done.set()
+        await ticker
+    return max(lags), result
+
+
+async def test_concurrent_logins_do_not_stall_the_event_loop(client):
+    started = time.perf_counter()
+    core_auth.hash_password("calibration")
+    one_hash = time.perf_counter() - started
+
+    logins = asyncio.gather(*(
+        client.post("/auth/login", json={"email": "admin@ariia.local", "password": "Password123"})
+        for _ in range(8)
+    ))
+    max_lag, responses = await _max_loop_lag(logins)
+
+    assert [r.status_code for r in responses] == [200] * 8
+    # Inline PBKDF2 would block the loop for at least one full hash per login
+    assert max_lag < max(0.05, one_hash / 2), f"event loop stalled for {max_lag * 1000:.0f} ms"
+    stats = get_metrics().get_histogram_stats(
+        "cpu_executor_queue_wait_seconds", labels={"category": "password_hash"},
+    )
+    assert stats["count"] >= 8
+
+
+async def test_full_queue_is_rejected_and_wait_time_recorded():
+    executor = CPUExecutor({"t": CategoryLimits(max_workers=1, max_queue=1)})
+    release = threading.Event()
+    metrics = get_metrics()
+    rejected_before = metrics.get_counter("cpu_executor_rejected_total", labels={"category": "t"})
+
+    running = asyncio.ensure_future(executor.run("t", release.wait, 5))
+    queued = asyncio.ensure_future(executor.run("t", lambda: "queued"))
+    await asyncio.sleep(0.05)
+    assert executor.stats()["t"]["in_flight"] == 2
+
+    with pytest.raises(ExecutorSaturated):
+        await executor.run("t", lambda: "rejected")
+    assert metrics.get_counter("cpu_executor_rejected_total", labels={"category": "t"}) == rejected_before + 1
+
+    release.set()
+    assert await running is True
+    assert await queued == "queued"
+    assert executor.stats()["t"]["in_flight"] == 0
+    waits = metrics.get_histogram_stats("cpu_executor_queue_wait_seconds", labels={"category": "t"})
+    assert waits["max"] >= 0.04  # the queued call waited for the blocked worker
+    executor.shutdown()
+
+    with pytest.raises(ValueError):
+        await executor.run("unknown", print)
+
+
+async def test_saturated_password_hashing_maps_to_503(monkeypatch):
+    executor = CPUExecutor({cpu_executor.PASSWORD_HASH: CategoryLimits(max_workers=1, max_queue=0)})
+    monkeypatch.setattr(cpu_executor, "_executor", executor)
+    release = threading.Event()
+
+    blocker = asyncio.ensure_future(executor.run(cpu_executor.PASSWORD_HASH, release.wait, 5))
+    await asyncio.sleep(0.02)
+    with pytest.raises(HTTPException) as exc:
+        await core_auth.verify_password_async("pw", "pbkdf2_sha256$1$AA$AA")
+    assert exc.value.status_code == 503 and exc.value.headers["Retry-After"] == "1"
+
+    release.set()
+    await blocker
+    hashed = await core_auth.hash_password_async("pw")
+    assert await core_auth.verify_password_async("pw", hashed)
+    executor.shutdown()
+
+
+async def test_cancelled_caller_keeps_slot_until_job_finishes():
+    executor = CPUExecutor({"t": CategoryLimits(max_workers=1, max_queue=0)})
+    release = threading.Event()
+
+    caller = asyncio.ensure_future(executor.run("t", release.wait, 5))
+    await asyncio.sleep(0.02)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    # the thread is still busy, so the bound still holds
+    assert executor.stats()["t"]["in_flight"] == 1
+    with pytest.raises(ExecutorSaturated):
+        await executor.run("t", lambda: "rejected")
+
+    release.set()
+    for _ in range(100):
+        if executor.stats()["t"]["in_flight"] == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert await executor.run("t", lambda: "ok") == "ok"
+    executor.shutdown()
+
+
+async def test_retrying_waits_out_saturation(monkeypatch):
+    executor = CPUExecutor({cpu_executor.RENDER: CategoryLimits(max_workers=1, max_queue=0)})
+    monkeypatch.setattr(cpu_executor, "_executor", executor)
+    monkeypatch.setattr(cpu_executor, "RETRY_ATTEMPTS", 3)
+    release = threading.Event()
+
+    blocker = asyncio.ensure_future(executor.run(cpu_executor.RENDER, release.wait, 5))
+    await asyncio.sleep(0.02)
+    asyncio.get_running_loop().call_later(0.3, release.set)
+    assert await cpu_executor.run_cpu_retrying(cpu_executor.RENDER, lambda: "rendered") == "rendered"
+    await blocker
+
+    release.clear()
+    blocker = asyncio.ensure_future(executor.run(cpu_executor.RENDER, release.wait, 5))
+    await asyncio.sleep(0.02)
+    monkeypatch.setattr(cpu_executor, "RETRY_ATTEMPTS", 1)
+    with pytest.raises(ExecutorSaturated):
+        await cpu_executor.run_cpu_retrying(cpu_executor.RENDER, lambda: "rendered")
+    release.set()
+    await blocker
+    executor.shutdown()
+
+
+async def test_saturated_text_ingestion_is_not_stored_as_failed(monkeypatch, tmp_path):
+    from app.memory_platform import ingestion
+
+    executor = CPUExecutor({cpu_executor.DOCUMENT_PARSE: CategoryLimits(max_workers=1, max_queue=0)})
+    monkeypatch.setattr(cpu_executor, "_executor", executor)
+    monkeypatch.setattr(cpu_executor, "RETRY_ATTEMPTS", 1)
+    monkeypatch.setattr(ingestion, "UPLOAD_DIR", str(tmp_path))
+    release = threading.Event()
+    blocker = asyncio.ensure_future(executor.run(cpu_executor.DOCUMENT_PARSE, release.wait, 5))
+    await asyncio.sleep(0.02)
+
+    service = ingestion.IngestionService.__new__(ingestion.IngestionService)
+    service._parser_registry = type("Registry", (), {
+        "parse": staticmethod(lambda **kw: cpu_executor.run_cpu_retrying(cpu_executor.DOCUMENT_PARSE, list)),
+    })()
+    service._documents = {}
+    with pytest.raises(ExecutorSaturated):
+        await service.ingest_text(tenant_id=1, content="Hallo", title="t")
+    assert service._documents == {} and not list(tmp_path.rglob("*.md"))
+
+    release.set()
+    await blocker
+    executor.shutdown()
@@ -0,0 +1,163 @@
+"""Tests für den Redis-basierten Sliding-Window-Rate-Limiter (app/core/rate_limit.py)."""
+
+import fakeredis
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core.rate_limit import (
+    DistributedRateLimiter,
+    InProcessSlidingWindow,
+    RateLimit,
+)
+
+pytest.importorskip("lupa")  # fakeredis needs lupa for EVAL/EVALSHA
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class _CountingRedis(fakeredis.FakeRedis):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.round_trips = 0
+
+    def execute_command(self, *args, **options):
+        self.round_trips += 1
+        return super().execute_command(*args, **options)
+
+
+class _DownRedis:
+    def register_script(self, script):
+        def _call(keys, args):
+            raise ConnectionError("redis down")
+        return _call
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def test_limit_is_shared_between_workers(server):
+    # Two limiter instances = two uvicorn workers talking to the same Redis
+    workers = [DistributedRateLimiter(fakeredis.FakeRedis(server=server)) for _ in range(2)]
+    limit = RateLimit("anon:rate_limit:login:1.2.3.4:", 10, 900)
+
+    allowed = sum(workers[i % 2].check(limit).allowed for i in range(25))
+
+    assert allowed == 10
+    result = workers[0].check(limit)
+    assert not result.allowed and result.violated == limit
+    assert 0 < result.retry_after <= 900
+
+
+def test_batch_check_is_one_round_trip_and_all_or_nothing(server):
+    client = _CountingRedis(server=server)
+    limiter = DistributedRateLimiter(client)
+    per_ip = RateLimit("anon:rate_limit:webhook_ip:9.9.9.9", 100, 60)
+    per_tenant = RateLimit("anon:rate_limit:webhook_tenant:studio", 2, 60)
+
+    limiter.check(per_ip, per_tenant)  # loads the script (EVALSHA -> NOSCRIPT -> EVAL)
+    client.round_trips = 0
+    assert limiter.check(per_ip, per_tenant).allowed
+    assert client.round_trips == 1
+
+    rejected = limiter.check(per_ip, per_tenant)
+    assert not rejected.allowed and rejected.violated == per_tenant
+    # The rejected request did not consume per-IP quota
+    assert client.zcard(per_ip.key) == 2
+    assert 0 < client.pttl(per_ip.key) <= 60_000
+
+
+def test_falls_back_to_in_process_window_when_redis_is_down():
+    limiter = DistributedRateLimiter(_DownRedis(), redis_retry_seconds=60)
+    limit = RateLimit("k", 3, 60)
+
+    results = [limiter.check(limit) for _ in range(4)]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert {r.backend for r in results} == {"memory"}
+
+
+def test_in_process_window_slides_and_prunes():
+    clock = _Clock()
+    window = InProcessSlidingWindow(clock=clock, max_keys=2)
+    limit = RateLimit("a", 2, 10)
+
+    assert window.check((limit,)).allowed
+    clock.now += 5
+    assert window.check((limit,)).allowed
+    blocked = window.check((limit,))
+    assert not blocked.allowed and blocked.retry_after == pytest.approx(5)
+    clock.now += 5.01
+    assert window.check((limit,)).allowed  # first request left the window
+
+    clock.now += 100
+    window.check((RateLimit("b", 1, 10),))
+    window.check((RateLimit("c", 1, 10),))
+    assert len(window) == 2  # "a" expired and was pruned
+
+
+def test_public_api_keys_use_shared_limiter(server, monkeypatch):
+    import app.core.rate_limit as rate_limit
+    from app.platform.api.public_api import APIKeyManager
+
+    monkeypatch.setattr(rate_limit, "_limiter", DistributedRateLimiter(fakeredis.FakeRedis(server=server)))
+    worker_a, worker_b = APIKeyManager(), APIKeyManager()
+    raw_key, api_key = worker_a.create_key(tenant_id=5, name="ci", rate_limit=3)
+    worker_b._keys[api_key.key_hash] = api_key
+
+    assert worker_a.validate_key(raw_key) and worker_b.validate_key(raw_key) and worker_a.validate_key(raw_key)
+    assert worker_b.validate_key(raw_key) is None
+
+
+def test_webhook_ingress_rejects_floods_with_retry_after(server, monkeypatch):
+    import app.core.rate_limit as rate_limit
+    from app.gateway.routers import webhooks
+
+    monkeypatch.setenv("ENVIRONMENT", "production")
+    monkeypatch.setattr(rate_limit, "_limiter", DistributedRateLimiter(fakeredis.FakeRedis(server=server)))
+    monkeypatch.setattr(webhooks, "WEBHOOK_RATE_LIMIT_PER_TENANT", 2)
+
+    def _request(ip):
+        return Request({
+            "type": "http", "method": "POST", "path": "/webhook/telegram/studio",
+            "headers": [(b"x-forwarded-for", ip.encode())], "client": (ip, 1234),
+            "path_params": {"tenant_slug": "studio"},
+        })
+
+    webhooks._enforce_webhook_rate_limit(_request("1.1.1.1"))
+    webhooks._enforce_webhook_rate_limit(_request("2.2.2.2"))
+    with pytest.raises(HTTPException) as exc:
+        webhooks._enforce_webhook_rate_limit(_request("3.3.3.3"))
+    assert exc.value.status_code == 429
+    assert int(exc.value.headers["Retry-After"]) >= 1
+
+
+async def test_async_check_keeps_the_event_loop_free(server, monkeypatch):
+    import threading
+    import app.core.rate_limit as rate_limit
+    from app.gateway import auth as gateway_auth
+
+    class _ThreadRecordingRedis(fakeredis.FakeRedis):
+        threads = set()
+
+        def evalsha(self, *args, **kwargs):
+            self.threads.add(threading.get_ident())
+            return super().evalsha(*args, **kwargs)
+
+    monkeypatch.setenv("ENVIRONMENT", "production")
+    monkeypatch.setattr(rate_limit, "_limiter", DistributedRateLimiter(_ThreadRecordingRedis(server=server)))
+    request = Request({"type": "http", "method": "POST", "path": "/auth/login", "headers": [], "client": ("9.9.9.9", 1)})
+
+    await gateway_auth._check_rate_limit(request, "login", max_requests=1, window_seconds=60)
+    with pytest.raises(HTTPException) as exc:
+        await gateway_auth._check_rate_limit(request, "login", max_requests=1, window_seconds=60)
+    assert exc.value.status_code == 429
+    assert _ThreadRecordingRedis.threads and threading.get_ident() not in _ThreadRecordingRedis.threads
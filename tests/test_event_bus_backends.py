@@ -0,0 +1,243 @@
+"""Tests für Backends, Worker-Pools und Backpressure des InternalEventBus."""
+
+import asyncio
+import random
+import time
+
+import fakeredis
+import pytest
+
+from app.memory_platform.config import EventBusConfig
+from app.memory_platform.event_bus import InternalEventBus, RedisStreamsBackend
+from app.memory_platform.models import DocumentSourceType, IngestionEvent, MemoryEvent
+
+
+def _config(**overrides) -> EventBusConfig:
+    config = EventBusConfig(backend="memory", retry_backoff_seconds=0.0, claim_idle_ms=0)
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return config
+
+
+async def _run_load(concurrency: int, events: int = 2000) -> tuple[float, dict[int, list[int]]]:
+    bus = InternalEventBus(_config(default_concurrency=concurrency, queue_size=256))
+    seen: dict[int, list[int]] = {}
+    rng = random.Random(3)
+
+    async def handler(event):
+        await asyncio.sleep(rng.random() / 1000)
+        seen.setdefault(event.tenant_id, []).append(event.metadata["seq"])
+
+    bus.subscribe("load.test", handler)
+    await bus.start()
+    started = time.perf_counter()
+    for seq in range(events):
+        await bus.publish(MemoryEvent(event_type="load.test", tenant_id=seq % 16, metadata={"seq": seq}))
+    await bus.stop(drain_timeout=30)
+    return events / (time.perf_counter() - started), seen
+
+
+async def test_throughput_and_per_tenant_ordering():
+    sequential, _ = await _run_load(concurrency=1)
+    parallel, seen = await _run_load(concurrency=4)
+
+    assert sum(len(v) for v in seen.values()) == 2000
+    for tenant, seqs in seen.items():
+        assert seqs == sorted(seqs), f"tenant {tenant} out of order"
+    # Four workers overlap the handler waits of different tenants
+    assert parallel > 1.8 * sequential, f"{parallel:.0f} vs {sequential:.0f} events/s"
+
+
+async def test_slow_topic_does_not_stall_other_topics():
+    bus = InternalEventBus(_config(default_concurrency=1))
+    release = asyncio.Event()
+    fast: list[str] = []
+
+    async def slow(event):
+        await release.wait()
+
+    async def quick(event):
+        fast.append(event.event_id)
+
+    bus.subscribe("extraction.requested", slow)
+    bus.subscribe("memory.written", quick)
+    await bus.start()
+    await bus.publish(MemoryEvent(event_type="extraction.requested", tenant_id=1))
+    for _ in range(5):
+        await bus.publish(MemoryEvent(event_type="memory.written", tenant_id=1))
+    await asyncio.sleep(0.05)
+
+    assert len(fast) == 5
+    release.set()
+    await bus.stop()
+
+
+async def test_full_queue_applies_backpressure_to_publishers():
+    bus = InternalEventBus(_config(default_concurrency=1, queue_size=2))
+    release = asyncio.Event()
+
+    async def blocked(event):
+        await release.wait()
+
+    bus.subscribe("bp.test", blocked)
+    await bus.start()
+    for _ in range(3):  # one in the handler, two queued
+        await bus.publish(MemoryEvent(event_type="bp.test", tenant_id=1))
+    await asyncio.sleep(0.01)
+    assert bus.queue_size == 2
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(bus.publish(MemoryEvent(event_type="bp.test", tenant_id=1)), 0.05)
+
+    release.set()
+    await bus.stop()
+    assert bus.queue_size == 0
+
+
+async def test_failed_handlers_are_retried_then_dead_lettered():
+    bus = InternalEventBus(_config(max_retries=2, log_size=3))
+    calls = {"flaky": 0, "broken": 0, "ok": 0}
+
+    async def flaky(event):
+        calls["flaky"] += 1
+        if calls["flaky"] < 3:
+            raise RuntimeError("temporär")
+
+    async def broken(event):
+        calls["broken"] += 1
+        raise ValueError("kaputt")
+
+    async def ok(event):
+        calls["ok"] += 1
+
+    for handler in (flaky, broken, ok):
+        bus.subscribe("retry.test", handler)
+    await bus.start()
+    for _ in range(4):
+        await bus.publish(MemoryEvent(event_type="retry.test", tenant_id=1))
+    await bus.stop()
+
+    # flaky: two failures then success on every following event; ok never re-run
+    assert calls == {"flaky": 6, "broken": 12, "ok": 4}
+    assert len(bus.dead_letters) == 4
+    assert {d.handler.split(".")[-1] for d in bus.dead_letters} == {"broken"}
+    assert bus.dead_letters[0].attempts == 3 and bus.dead_letters[0].error == "kaputt"
+    # The event log is a ring buffer
+    assert len(bus.recent_events) == 3
+
+
+async def test_redis_streams_backend_is_durable_and_acknowledges():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    config = _config(backend="redis", default_concurrency=2, max_retries=0)
+
+    # Published while no consumer is running: the events wait in the stream
+    producer = InternalEventBus(config, RedisStreamsBackend(config, client=client, consumer_name="producer"))
+    await producer.start()
+    for seq in range(20):
+        await producer.publish(MemoryEvent(event_type="stream.test", tenant_id=seq % 3, metadata={"seq": seq}))
+    await producer.publish(IngestionEvent(tenant_id=1, source_type=DocumentSourceType.MANUAL_EDITOR, filename="a.md"))
+    await producer.stop()
+
+    received: list[MemoryEvent] = []
+    ingested: list[MemoryEvent] = []
+
+    async def handler(event):
+        if event.metadata["seq"] == 7:
+            raise RuntimeError("kaputt")
+        received.append(event)
+
+    async def on_ingestion(event):
+        ingested.append(event)
+
+    backend = RedisStreamsBackend(config, client=client, consumer_name="worker-1")
+    backend._block_ms = 10
+    consumer = InternalEventBus(config, backend)
+    consumer.subscribe("stream.test", handler)
+    consumer.subscribe("ingestion.raw", on_ingestion)
+    await consumer.start()
+    for _ in range(100):
+        if len(received) == 19 and ingested:
+            break
+        await asyncio.sleep(0.02)
+    await consumer.stop()
+
+    assert len(received) == 19
+    for tenant in range(3):
+        seqs = [e.metadata["seq"] for e in received if e.tenant_id == tenant]
+        assert seqs == sorted(seqs)
+    # The concrete event type survives the round trip
+    assert isinstance(ingested[0], IngestionEvent) and ingested[0].filename == "a.md"
+    pending = await client.xpending(backend.stream("stream.test"), config.consumer_group)
+    assert pending["pending"] == 0
+    dead = await client.xrange(backend.dead_letter_stream)
+    assert len(dead) == 1 and dead[0][1]["error"] == "kaputt"
+
+
+async def test_redis_streams_backend_reclaims_entries_of_dead_consumers():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    config = _config(backend="redis", claim_idle_ms=0)
+    backend = RedisStreamsBackend(config, client=client, consumer_name="worker-2")
+    backend._block_ms = 10
+    stream = backend.stream("claim.test")
+
+    await client.xgroup_create(stream, config.consumer_group, id="0", mkstream=True)
+    await backend.publish(MemoryEvent(event_type="claim.test", tenant_id=1))
+    # A consumer that crashed after reading but before acknowledging
+    await client.xreadgroup(config.consumer_group, "crashed", {stream: ">"}, count=10)
+
+    received: list[MemoryEvent] = []
+
+    async def handler(event):
+        received.append(event)
+
+    bus = InternalEventBus(config, backend)
+    bus.subscribe("claim.test", handler)
+    await bus.start()
+    for _ in range(50):
+        if received:
+            break
+        await asyncio.sleep(0.02)
+    await bus.stop()
+
+    assert len(received) == 1
+    assert (await client.xpending(stream, config.consumer_group))["pending"] == 0
+
+
+async def test_redis_streams_backend_broadcasts_invalidation_topics():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    config = _config(backend="redis", broadcast_topics=frozenset({"memory.written"}), claim_idle_ms=60_000)
+    # Written before the processes started: not replayed to them
+    await RedisStreamsBackend(config, client=client).publish(MemoryEvent(event_type="memory.written", tenant_id=9))
+
+    buses, written, work = [], {"p1": [], "p2": []}, []
+    for name in ("p1", "p2"):
+        backend = RedisStreamsBackend(config, client=client, consumer_name=name)
+        backend._block_ms = 10
+        bus = InternalEventBus(config, backend)
+
+        async def on_written(event, seen=written[name]):
+            seen.append(event.tenant_id)
+
+        async def on_work(event):
+            work.append(event.tenant_id)
+
+        bus.subscribe("memory.written", on_written)
+        bus.subscribe("work.test", on_work)
+        await bus.start()
+        buses.append(bus)
+    await asyncio.sleep(0.05)
+
+    for tenant in (1, 2, 3):
+        await buses[0].publish(MemoryEvent(event_type="memory.written", tenant_id=tenant))
+        await buses[0].publish(MemoryEvent(event_type="work.test", tenant_id=tenant))
+    for _ in range(100):
+        if all(len(seen) == 3 for seen in written.values()) and len(work) == 3:
+            break
+        await asyncio.sleep(0.02)
+    await asyncio.sleep(0.05)
+    for bus in buses:
+        await bus.stop()
+
+    # Every process sees every invalidation; work topics are still shared
+    assert written == {"p1": [1, 2, 3], "p2": [1, 2, 3]}
+    assert sorted(work) == [1, 2, 3]
@@ -0,0 +1,147 @@
+"""Tests für die gebündelte, nebenläufige Faktenextraktion (app/memory_platform/extraction)."""
+
+import asyncio
+import json
+import re
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.memory_platform.config import get_config
+from app.memory_platform.event_bus import InternalEventBus
+from app.memory_platform.extraction import ExtractionService
+from app.memory_platform.models import ContentChunk, DocumentSourceType, IngestionEvent
+
+_SECTION = re.compile(r"\[\[Abschnitt (\d+)\]\]\n(.*?)(?=\n\n\[\[Abschnitt |\n\n\*\*Anweisungen)", re.S)
+_SINGLE = re.compile(r"\*\*Text:\*\*\n(.*?)\n\n\*\*Anweisungen", re.S)
+
+
+class StubLLM:
+    """Deterministic stand-in for the OpenAI client: one fact per text section."""
+
+    def __init__(self, delay: float = 0.05, max_sections: int | None = None) -> None:
+        self.delay = delay
+        self.max_sections = max_sections
+        self.calls: list[int] = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    @staticmethod
+    def _facts(text: str, chunk: int | None = None) -> list[dict]:
+        fact = {"fact_type": "attribute", "subject": text.split()[0], "predicate": "erwähnt", "value": text[-12:], "confidence": 0.8}
+        if chunk is not None:
+            fact["chunk"] = chunk
+        return [fact]
+
+    async def _create(self, **kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        sections = _SECTION.findall(prompt)
+        self.calls.append(len(sections) or 1)
+        await asyncio.sleep(self.delay)
+        if sections and self.max_sections and len(sections) > self.max_sections:
+            content = "{nicht: json"  # malformed answer for oversized batches
+        elif sections:
+            facts = [f for number, text in sections for f in self._facts(text, int(number))]
+            content = json.dumps({"entities": [], "facts": facts, "relationships": []})
+        else:
+            content = json.dumps({"entities": [], "facts": self._facts(_SINGLE.search(prompt).group(1)), "relationships": []})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _service(llm: StubLLM) -> tuple[ExtractionService, list]:
+    bus = InternalEventBus()
+    published: list = []
+
+    async def _collect(event):
+        published.append(event)
+
+    bus.subscribe("memory.extracted", _collect)
+    service = ExtractionService()
+    service._event_bus = bus
+    service._client = llm
+    return service, published
+
+
+def _event(chunks: int = 16, tenant_id: int = 1) -> IngestionEvent:
+    return IngestionEvent(
+        tenant_id=tenant_id,
+        source_type=DocumentSourceType.FILE_UPLOAD,
+        chunks=[ContentChunk(content=f"Abschnitt{i} handelt von Kursplan Nummer {i:04d} im Studio.") for i in range(chunks)],
+    )
+
+
+def _fact_tuples(result) -> list[tuple]:
+    return [(f.subject, f.predicate, f.value, f.source_chunk_id) for f in result.facts]
+
+
+@pytest.fixture
+def extraction_config(monkeypatch):
+    cfg = get_config().extraction
+    monkeypatch.setattr(cfg, "batch_token_budget", 1)
+    monkeypatch.setattr(cfg, "tenant_concurrency", 1)
+    return cfg
+
+
+async def test_packed_concurrent_output_matches_sequential(extraction_config, monkeypatch):
+    event = _event()
+
+    sequential_llm = StubLLM(delay=0)
+    service, published = _service(sequential_llm)
+    await service._handle_ingestion_event(event)
+    sequential = _fact_tuples(published[0])
+
+    monkeypatch.setattr(extraction_config, "batch_token_budget", 60)
+    monkeypatch.setattr(extraction_config, "tenant_concurrency", 4)
+    packed_llm = StubLLM(delay=0)
+    service, published = _service(packed_llm)
+    await service._handle_ingestion_event(event)
+
+    assert sequential_llm.calls == [1] * 16
+    assert len(packed_llm.calls) < 16 and sum(packed_llm.calls) == 16
+    assert _fact_tuples(published[0]) == sequential
+
+
+async def test_wall_clock_scales_with_tenant_concurrency(extraction_config, monkeypatch):
+    monkeypatch.setattr(extraction_config, "batch_token_budget", 30)  # two chunks per prompt
+
+    timings = {}
+    for concurrency in (1, 4):
+        monkeypatch.setattr(extraction_config, "tenant_concurrency", concurrency)
+        llm = StubLLM(delay=0.05)
+        service, published = _service(llm)
+        started = time.perf_counter()
+        await service._handle_ingestion_event(_event())
+        timings[concurrency] = time.perf_counter() - started
+        assert len(llm.calls) == 8 and len(published[0].facts) == 16
+
+    # 8 calls of 50 ms: ~0.4 s sequentially, ~0.1 s with four slots
+    assert timings[4] < timings[1] / 2.5, timings
+
+
+async def test_malformed_batches_are_split_until_parsable(extraction_config, monkeypatch):
+    monkeypatch.setattr(extraction_config, "batch_token_budget", 10_000)
+    monkeypatch.setattr(extraction_config, "tenant_concurrency", 4)
+    llm = StubLLM(delay=0, max_sections=3)
+    service, published = _service(llm)
+
+    event = _event(chunks=10)
+    await service._handle_ingestion_event(event)
+
+    # 10 -> 5+5 -> 2+3 per half, each accepted
+    assert sorted(llm.calls) == [2, 2, 3, 3, 5, 5, 10]
+    assert [f.source_chunk_id for f in published[0].facts] == [c.chunk_id for c in event.chunks]
+
+
+async def test_already_extracted_chunks_are_skipped(extraction_config):
+    llm = StubLLM(delay=0)
+    service, published = _service(llm)
+    event = _event(chunks=4)
+
+    await service._handle_ingestion_event(event)
+    await service._handle_ingestion_event(_event(chunks=6))
+    # Another tenant with the same content is extracted again
+    await service._handle_ingestion_event(_event(chunks=4, tenant_id=2))
+
+    assert llm.calls == [1] * (4 + 2 + 4)
+    assert [len(e.facts) for e in published] == [4, 2, 4]
+    assert published[1].metadata["skipped_chunks"] == 4
@@ -0,0 +1,269 @@
+"""Tests für den geteilten Ghost-Mode-Zustand (app/platform/ghost_state.py).
+
+Mehrere GhostModeV2-Instanzen teilen sich einen fakeredis-Server wie
+mehrere Gateway-Worker; ein Test startet zusätzlich einen echten
+Kindprozess gegen einen fakeredis-TCP-Server.
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+import fakeredis
+import pytest
+import redis
+import redis.asyncio
+
+from app.platform.ghost_mode_v2 import ConversationMonitor, ConversationStatus, GhostEvent, GhostEventType, GhostModeV2
+from app.platform.ghost_state import GhostSubscriber, LocalGhostState, RedisGhostState
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def _worker(server) -> GhostModeV2:
+    return GhostModeV2(RedisGhostState(fakeredis.FakeAsyncRedis(server=server, decode_responses=True)))
+
+
+async def _until(predicate, timeout: float = 3.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+
+async def test_takeover_on_one_worker_stops_agent_on_another(server):
+    admin, agent = _worker(server), _worker(server)
+
+    await agent.on_user_message(1, "conv-1", "user-1", "Hallo")
+    assert await agent.should_agent_respond("conv-1")
+
+    await admin.intervention.takeover(1, "conv-1", 7, "admin@studio.de")
+    # tenant known from the agent worker's own monitor
+    assert not await agent.should_agent_respond("conv-1")
+    assert await agent.intervention.get_conversation_status("conv-1", 1) == ConversationStatus.TAKEN_OVER
+    assert (await agent.intervention.get_takeover_admin("conv-1", 1))["admin_email"] == "admin@studio.de"
+    # same conversation id in another tenant is unaffected
+    assert await agent.should_agent_respond("conv-1", tenant_id=2)
+
+    await admin.intervention.release(1, "conv-1", 7, "admin@studio.de")
+    assert await agent.should_agent_respond("conv-1", tenant_id=1)
+
+    history = await agent.intervention.get_intervention_history(1, conversation_id="conv-1")
+    assert [h["type"] for h in history] == ["release", "takeover"]
+
+
+async def test_events_fan_out_to_other_workers_per_tenant(server):
+    conversation_worker, dashboard_worker = _worker(server), _worker(server)
+    tenant1, tenant2 = [], []
+
+    async def on_tenant1(event):
+        tenant1.append(event)
+
+    await dashboard_worker.register_listener(1, on_tenant1)
+    await dashboard_worker.register_listener(2, tenant2.append)
+    try:
+        await conversation_worker.on_user_message(1, "conv-1", "user-1", "Was kostet das Abo?")
+        await conversation_worker.on_tool_call(1, "conv-1", "get_prices", {})
+        assert await _until(lambda: len(tenant1) == 2)
+        assert [e["type"] for e in tenant1] == ["ghost.message_in", "ghost.agent_tool_call"]
+        await asyncio.sleep(0.1)
+        assert tenant2 == []
+    finally:
+        await dashboard_worker.close()
+
+
+async def test_slow_listener_does_not_delay_others():
+    gm = GhostModeV2()
+    fast, slow_started = [], asyncio.Event()
+
+    async def slow(event):
+        slow_started.set()
+        await asyncio.sleep(10)
+
+    slow_sub = await gm.register_listener(1, slow)
+    slow_sub.max_queue = 5
+    slow_sub.send_timeout = 60
+    await gm.register_listener(1, fast.append)
+
+    started = time.perf_counter()
+    for i in range(20):
+        await gm.emit_event(GhostEvent(GhostEventType.MESSAGE_IN, tenant_id=1, conversation_id=f"c{i}"))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5
+    assert await _until(lambda: len(fast) == 20)
+    assert slow_started.is_set()
+    # slow client: one in flight, queue capped, the rest dropped
+    assert slow_sub.pending == 5 and slow_sub.dropped == 14
+    await gm.close()
+
+
+async def test_subscriber_coalesces_state_events_and_closes_on_failures():
+    received = []
+    sub = GhostSubscriber(1, received.append)
+    for score in (0.9, 0.5, 0.2):
+        sub.offer({"type": "ghost.quality_alert", "conversation_id": "c1", "data": {"score": score}})
+    sub.offer({"type": "ghost.message_in", "conversation_id": "c1"})
+    sub.offer({"type": "ghost.quality_alert", "conversation_id": "c2", "data": {"score": 0.1}})
+    assert sub.pending == 3 and sub.coalesced == 2
+
+    assert await _until(lambda: len(received) == 3)
+    assert received[0]["data"]["score"] == 0.2  # only the latest state was sent
+
+    closed = []
+
+    def broken(event):
+        raise ConnectionError("socket gone")
+
+    failing = GhostSubscriber(1, broken, max_failures=2, on_close=closed.append)
+    failing.offer({"type": "ghost.message_in"})
+    failing.offer({"type": "ghost.message_in"})
+    assert await _until(lambda: failing.closed)
+    assert closed == [failing]
+    sub.close()
+
+
+async def test_scores_are_tenant_indexed_and_expire_when_idle():
+    clock = [1000.0]
+    monitor = ConversationMonitor(idle_seconds=60, clock=lambda: clock[0])
+    await monitor.record_user_message("a", 1, "Hallo")
+    await monitor.record_user_message("b", 2, "Hi")
+    clock[0] += 50
+    await monitor.record_user_message("c", 1, "Hey")
+
+    assert sorted(s["conversation_id"] for s in await monitor.get_active_scores(1)) == ["a", "c"]
+    clock[0] += 30  # a and b idle for 80s, c for 30s
+    assert [s["conversation_id"] for s in await monitor.get_active_scores(1)] == ["c"]
+    assert await monitor.get_active_scores(2) == []
+    assert monitor.get_score("a") is None and monitor.get_score("c") is not None
+    assert list(monitor._by_tenant) == [1]
+
+
+async def test_shared_scores_visible_to_every_worker_with_idle_expiry(server):
+    clock = [1000.0]
+    workers = []
+    for _ in range(2):
+        state = RedisGhostState(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+        workers.append(ConversationMonitor(state, idle_seconds=60, clock=lambda: clock[0]))
+    first, second = workers
+
+    await first.record_user_message("a", 1, "Das ist schlecht")
+    await second.record_error("b", 1)
+    await second.record_user_message("x", 2, "Hi")
+
+    for monitor in workers:
+        scores = await monitor.get_active_scores(1)
+        assert [s["conversation_id"] for s in scores] == ["b", "a"]  # needs attention first
+        assert [s["conversation_id"] for s in await monitor.get_attention_needed(1)] == ["b"]
+
+    clock[0] += 45
+    await first.record_tool_call("a", 1)
+    clock[0] += 30
+    assert [s["conversation_id"] for s in await second.get_active_scores(1)] == ["a"]
+
+    assert (await first.end_conversation("a"))["conversation_id"] == "a"
+    assert await second.get_active_scores(1) == []
+
+
+async def test_redis_read_failure_fails_open():
+    class Down:
+        async def hgetall(self, key):
+            raise redis.ConnectionError("down")
+
+    gm = GhostModeV2(RedisGhostState(Down()))
+    assert await gm.should_agent_respond("conv-1", tenant_id=1) is True
+
+
+async def test_state_lookups_yield_to_the_event_loop(server):
+    gm = _worker(server)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    task = asyncio.create_task(ticker())
+    try:
+        await gm.intervention.takeover(1, "conv-1", 7, "admin@studio.de")
+        await gm.on_user_message(1, "conv-1", "user-1", "Hallo")
+        assert not await gm.should_agent_respond("conv-1")
+    finally:
+        task.cancel()
+    # other tasks ran while the Redis round trips were in flight
+    assert ticks > 0
+
+
+async def test_local_history_is_capped(monkeypatch):
+    from app.platform import ghost_state
+
+    monkeypatch.setattr(ghost_state, "GHOST_HISTORY_MAX", 3)
+    gm = GhostModeV2(LocalGhostState())
+    for i in range(5):
+        await gm.intervention.inject_message(1, "c1", 1, "admin@studio.de", f"Msg {i}")
+    history = await gm.intervention.get_intervention_history(1)
+    assert [h["content"] for h in history] == ["Msg 4", "Msg 3", "Msg 2"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+CHILD = textwrap.dedent("""
+    import asyncio, sys
+    import redis.asyncio
+    from app.platform.ghost_mode_v2 import GhostModeV2
+    from app.platform.ghost_state import RedisGhostState
+
+    async def main():
+        gm = GhostModeV2(RedisGhostState(redis.asyncio.Redis(port=int(sys.argv[1]), decode_responses=True)))
+        await gm.intervention.takeover(1, "conv-mp", 7, "admin@studio.de")
+        await gm.on_agent_response(1, "conv-mp", "user-1", "Ich übernehme ab hier.")
+
+    asyncio.run(main())
+""")
+
+
+async def test_takeover_and_events_across_processes():
+    port = _free_port()
+    tcp = fakeredis.TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    threading.Thread(target=tcp.serve_forever, daemon=True).start()
+    try:
+        client = redis.asyncio.Redis(port=port, decode_responses=True)
+        gm = GhostModeV2(RedisGhostState(client))
+        received = []
+        await gm.register_listener(1, received.append)
+        await gm.on_user_message(1, "conv-mp", "user-1", "Hallo")
+        assert await _until(lambda: len(received) == 1)
+
+        env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", CHILD, str(port), cwd=REPO_ROOT, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout=60)
+        assert proc.returncode == 0, stderr.decode()[-2000:]
+
+        assert not await gm.should_agent_respond("conv-mp")
+        assert await _until(lambda: any(e["type"] == "ghost.message_out" for e in received))
+        await gm.close()
+        await client.aclose()
+    finally:
+        tcp.shutdown()
+        tcp.server_close()
@@ -0,0 +1,278 @@
+"""Tests für die asynchronen Bildgenerierungs-Jobs (app/media/image_jobs.py).
+
+Ein Fake-Provider mit einstellbarer Verzögerung und Fehlerrate ersetzt
+fal.ai/DALL-E; die Credits werden beim Einreihen reserviert und je nach
+Ausgang verbucht oder erstattet.
+"""
+
+import asyncio
+import io
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from PIL import Image
+
+import app.core.models  # noqa: F401
+from app.core.media_models import ImageGenerationJob, MediaAsset
+from app.domains.billing.models import ImageCreditBalance, ImageCreditTransaction
+from app.media import derivatives, image_jobs, storage
+from app.media.credit_service import get_balance
+from app.media.image_jobs import GeneratedImage, ImageJobFailed, ImageJobRunner, enqueue_image_job
+
+
+def _png() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (16, 16), (10, 120, 200)).save(buf, "PNG")
+    return buf.getvalue()
+
+
+class FakeProvider:
+    """Provider stand-in: sleeps *delay* seconds, fails with probability *failure_rate*."""
+
+    def __init__(self, delay: float = 0.01, failure_rate: float = 0.0, seed: int = 7) -> None:
+        self.delay = delay
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.running: dict[int, int] = {}
+        self.peak: dict[int, int] = {}
+        self.peak_total = 0
+        self.calls = 0
+
+    async def __call__(self, job, db, report) -> GeneratedImage:
+        self.calls += 1
+        tenant = job.tenant_id
+        self.running[tenant] = self.running.get(tenant, 0) + 1
+        self.peak[tenant] = max(self.peak.get(tenant, 0), self.running[tenant])
+        self.peak_total = max(self.peak_total, sum(self.running.values()))
+        try:
+            report(30, "generating")
+            await asyncio.sleep(self.delay)
+            if self.random.random() < self.failure_rate:
+                raise ImageJobFailed("provider unavailable")
+            return GeneratedImage(provider_slug="fake", data=_png(), model="fake-1", revised_prompt=job.request["prompt"])
+        finally:
+            self.running[tenant] -= 1
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with session_factory() as db:
+        db.add_all([ImageCreditBalance(tenant_id=1, balance=10), ImageCreditBalance(tenant_id=2, balance=10)])
+        db.commit()
+    return session_factory
+
+
+@pytest.fixture(autouse=True)
+def media_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "_get_media_root", lambda: tmp_path / "media")
+    return tmp_path / "media"
+
+
+@pytest.fixture(autouse=True)
+def built_derivatives(monkeypatch):
+    calls = []
+
+    async def record(asset_id, tenant_slug, filename):
+        calls.append((asset_id, tenant_slug, filename))
+
+    monkeypatch.setattr(derivatives, "process_asset_derivatives", record)
+    return calls
+
+
+def _enqueue(factory, tenant_id=1, cost=3, prompt="Yoga am Strand"):
+    with factory() as db:
+        return enqueue_image_job(
+            db, tenant_id=tenant_id, kind="generate", credit_cost=cost,
+            request={"prompt": prompt, "mode": "final", "size": "1024x1024", "quality": "standard"},
+        )
+
+
+def test_concurrent_enqueues_cannot_overspend(session_factory):
+    outcomes = []
+    barrier = threading.Barrier(8)
+
+    def attempt():
+        barrier.wait()
+        try:
+            _enqueue(session_factory)
+            outcomes.append("queued")
+        except HTTPException as e:
+            outcomes.append(e.status_code)
+
+    threads = [threading.Thread(target=attempt) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(outcomes, key=str) == [402] * 5 + ["queued"] * 3
+    with session_factory() as db:
+        assert get_balance(db, 1) == 1
+        assert db.query(ImageGenerationJob).count() == 3
+        reserved = db.query(ImageCreditTransaction).filter(ImageCreditTransaction.delta == -3).all()
+        assert len(reserved) == 3 and all(tx.reference_id.startswith("image_job:") for tx in reserved)
+
+
+def test_pending_jobs_per_tenant_are_bounded(session_factory, monkeypatch):
+    monkeypatch.setattr(image_jobs, "IMAGE_JOBS_MAX_PENDING_PER_TENANT", 2)
+    _enqueue(session_factory, cost=1)
+    _enqueue(session_factory, cost=1)
+    with pytest.raises(HTTPException) as exc:
+        _enqueue(session_factory, cost=1)
+    assert exc.value.status_code == 429
+    with session_factory() as db:
+        assert get_balance(db, 1) == 8
+
+
+async def test_success_commits_credits_and_records_asset(session_factory, media_root, built_derivatives):
+    job = _enqueue(session_factory)
+    runner = ImageJobRunner(provider=FakeProvider(), session_factory=session_factory)
+    await runner.submit(job.id, job.tenant_id)
+
+    with session_factory() as db:
+        done = db.get(ImageGenerationJob, job.id)
+        assert (done.status, done.progress, done.credit_state) == ("succeeded", 100, "committed")
+        asset = db.get(MediaAsset, done.asset_id)
+        assert asset.source == "ai_generated" and asset.image_provider_slug == "fake"
+        assert asset.generation_prompt == "Yoga am Strand"
+        assert done.result["url"].endswith(asset.filename)
+        assert (media_root / "studio-a" / "images" / asset.filename).exists()
+        assert get_balance(db, 1) == 7
+    assert built_derivatives == [(asset.id, "studio-a", asset.filename)]
+
+
+async def test_failures_release_reservation(session_factory):
+    jobs = [_enqueue(session_factory, cost=2) for _ in range(3)]
+    runner = ImageJobRunner(provider=FakeProvider(failure_rate=1.0), session_factory=session_factory)
+    for job in jobs:
+        runner.submit(job.id, job.tenant_id)
+    await runner.drain()
+
+    with session_factory() as db:
+        failed = db.query(ImageGenerationJob).all()
+        assert {(j.status, j.credit_state, j.error) for j in failed} == {("failed", "released", "provider unavailable")}
+        assert get_balance(db, 1) == 10
+        refunds = db.query(ImageCreditTransaction).filter(ImageCreditTransaction.reason == "generation_refund").all()
+        assert sorted(tx.reference_id for tx in refunds) == sorted(f"image_job:{j.id}" for j in jobs)
+        assert db.query(MediaAsset).count() == 0
+
+        # Settling twice must not refund twice
+        assert image_jobs.release_reservation(db, failed[0]) is False
+        assert get_balance(db, 1) == 10
+
+
+async def test_mixed_outcomes_balance_matches_successes(session_factory):
+    jobs = [_enqueue(session_factory, cost=1) for _ in range(10)]
+    provider = FakeProvider(failure_rate=0.5, seed=3)
+    runner = ImageJobRunner(provider=provider, session_factory=session_factory, per_tenant=3)
+    for job in jobs:
+        runner.submit(job.id, job.tenant_id)
+    await runner.drain()
+
+    with session_factory() as db:
+        statuses = [j.status for j in db.query(ImageGenerationJob).all()]
+        succeeded = statuses.count("succeeded")
+        assert 0 < succeeded < 10 and statuses.count("failed") == 10 - succeeded
+        assert get_balance(db, 1) == 10 - succeeded
+        assert db.query(MediaAsset).count() == succeeded
+
+
+async def test_per_tenant_concurrency_is_bounded(session_factory):
+    jobs = [_enqueue(session_factory, tenant_id=1, cost=1) for _ in range(5)]
+    jobs += [_enqueue(session_factory, tenant_id=2, cost=1) for _ in range(3)]
+    provider = FakeProvider(delay=0.05)
+    runner = ImageJobRunner(provider=provider, session_factory=session_factory, per_tenant=2, max_concurrency=3)
+    for job in jobs:
+        runner.submit(job.id, job.tenant_id)
+    await runner.drain()
+
+    assert provider.calls == 8
+    assert provider.peak[1] == 2 and provider.peak[2] <= 2
+    assert provider.peak_total == 3  # tenant 2 ran alongside tenant 1's backlog
+
+
+async def test_timeout_fails_job_and_refunds(session_factory):
+    job = _enqueue(session_factory, cost=4)
+    runner = ImageJobRunner(provider=FakeProvider(delay=1.0), session_factory=session_factory, timeout_seconds=0.05)
+    await runner.submit(job.id, job.tenant_id)
+
+    with session_factory() as db:
+        done = db.get(ImageGenerationJob, job.id)
+        assert done.status == "failed" and "timed out" in done.error
+        assert get_balance(db, 1) == 10
+
+
+async def test_progress_is_visible_while_running(session_factory):
+    job = _enqueue(session_factory)
+    runner = ImageJobRunner(provider=FakeProvider(delay=0.2), session_factory=session_factory)
+    task = runner.submit(job.id, job.tenant_id)
+    await asyncio.sleep(0.1)
+
+    with session_factory() as db:
+        running = image_jobs.job_to_dict(db.get(ImageGenerationJob, job.id))
+    assert (running["status"], running["stage"], running["progress"]) == ("running", "generating", 30)
+    assert running["result"] is None
+
+    await task
+    with session_factory() as db:
+        assert image_jobs.job_to_dict(db.get(ImageGenerationJob, job.id))["status"] == "succeeded"
+
+
+def test_reaper_fails_abandoned_jobs(session_factory):
+    abandoned = _enqueue(session_factory, cost=2)
+    running = _enqueue(session_factory, cost=2)
+    waiting = _enqueue(session_factory, cost=2)
+    orphaned = _enqueue(session_factory, cost=2)
+    now = datetime.now(timezone.utc)
+    with session_factory() as db:
+        for job_id, started_at in ((abandoned.id, now - timedelta(hours=1)), (running.id, now)):
+            job = db.get(ImageGenerationJob, job_id)
+            job.status, job.started_at = "running", started_at
+        # Queued behind the concurrency limits for a while, but not past the queued timeout
+        db.get(ImageGenerationJob, waiting.id).created_at = now - timedelta(minutes=30)
+        db.get(ImageGenerationJob, orphaned.id).created_at = now - timedelta(hours=2)
+        db.commit()
+
+        assert image_jobs.fail_stale_jobs(db, older_than_seconds=600, queued_older_than_seconds=3600) == 2
+        assert db.get(ImageGenerationJob, abandoned.id).status == "failed"
+        assert db.get(ImageGenerationJob, orphaned.id).status == "failed"
+        assert db.get(ImageGenerationJob, running.id).status == "running"
+        assert db.get(ImageGenerationJob, waiting.id).status == "queued"
+        assert get_balance(db, 1) == 6
+
+
+async def test_queued_jobs_of_a_dead_process_are_resumed(session_factory, media_root, built_derivatives):
+    # enqueued, but the process died before its runner task ran
+    jobs = [_enqueue(session_factory, cost=2) for _ in range(2)]
+    provider = FakeProvider()
+    runner = ImageJobRunner(provider=provider, session_factory=session_factory)
+
+    assert await runner.resume_queued() == 2
+    runner.submit(jobs[0].id, 1)  # also submitted by a live process: runs only once
+    await runner.drain()
+
+    with session_factory() as db:
+        assert [db.get(ImageGenerationJob, j.id).status for j in jobs] == ["succeeded", "succeeded"]
+        assert get_balance(db, 1) == 6
+    assert provider.calls == 2
+    assert await runner.resume_queued() == 0
+
+
+async def test_success_after_reaper_refund_is_rolled_back(session_factory, media_root, built_derivatives):
+    job = _enqueue(session_factory, cost=3)
+
+    async def reaped_meanwhile(job_, db, report):
+        with session_factory() as other:
+            image_jobs.fail_job(other, other.get(ImageGenerationJob, job_.id), "Job abandoned")
+        return GeneratedImage(provider_slug="fake", data=_png())
+
+    await ImageJobRunner(provider=reaped_meanwhile, session_factory=session_factory).run(job.id)
+
+    with session_factory() as db:
+        done = db.get(ImageGenerationJob, job.id)
+        assert (done.status, done.credit_state) == ("failed", "released")
+        assert get_balance(db, 1) == 10  # refunded once, never charged
+    assert built_derivatives == []
@@ -0,0 +1,170 @@
+"""Tests für den lokalen Fast-Path vor dem LLM-Intent-Classifier (app/swarm/lead/fast_path.py)."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+from app.swarm.contracts import IntentResult, TenantContext
+from app.swarm.lead.fast_path import (
+    CentroidIntentModel,
+    FastPathClassifier,
+    evaluate_offline,
+    load_labelled_examples,
+    tenant_training_pairs,
+    normalize_utterance,
+)
+
+AGENTS = {"ops": "", "sales": "", "medic": "", "knowledge": "", "persona": ""}
+
+TRAINING = {
+    "ops": ["ich möchte einen termin für morgen buchen", "kann ich den kurs am montag buchen",
+            "bitte trag mich für yoga am freitag ein", "gibt es noch plätze im spinning kurs"],
+    "sales": ["wie lange läuft mein vertrag noch", "ich will meine mitgliedschaft kündigen",
+              "was kostet ein upgrade auf premium", "mein vertrag verlängert sich automatisch"],
+    "knowledge": ["wann habt ihr am sonntag auf", "gibt es bei euch eine sauna",
+                  "wo kann ich im studio parken", "habt ihr handtücher zum ausleihen"],
+}
+
+
+def _ctx(tenant_id: int = 1) -> TenantContext:
+    return TenantContext(
+        tenant_id=tenant_id, tenant_slug="studio", plan_slug="pro",
+        active_integrations=frozenset({"magicline"}), settings={},
+    )
+
+
+def _llm(agent_id: str, confidence: float = 0.9) -> AsyncMock:
+    llm = AsyncMock()
+    llm.chat = AsyncMock(return_value=json.dumps({"agent_id": agent_id, "confidence": confidence, "extracted": {}}))
+    return llm
+
+
+def _label(agent_id: str) -> IntentResult:
+    return IntentResult(agent_id=agent_id, confidence=0.9)
+
+
+def _model() -> CentroidIntentModel:
+    return CentroidIntentModel().fit([(text, agent) for agent, texts in TRAINING.items() for text in texts])
+
+
+async def test_rules_answer_greetings_and_unambiguous_keywords_without_llm():
+    classifier = FastPathClassifier(log_path=None)
+    llm = _llm("sales")
+
+    assert (await classifier.classify("Hallo!! 👋", _ctx(), AGENTS, llm=llm)).agent_id == "persona"
+    assert (await classifier.classify("Please cancel my booking", _ctx(), AGENTS, llm=llm)).agent_id == "ops"
+    emergency = await classifier.classify("Notfall im Studio!", _ctx(), AGENTS, llm=llm)
+    assert emergency.agent_id == "medic" and emergency.extracted == {"emergency": True}
+    llm.chat.assert_not_called()
+
+    # Keywords of two agents are ambiguous and go to the LLM
+    await classifier.classify("Schmerz nach dem Training, Termin absagen", _ctx(), AGENTS, llm=llm)
+    llm.chat.assert_called_once()
+
+
+async def test_tenant_cache_avoids_repeat_llm_calls(tmp_path):
+    log = tmp_path / "intents.jsonl"
+    classifier = FastPathClassifier(log_path=str(log))
+    llm = _llm("sales")
+
+    first = await classifier.classify("Wie lange läuft mein Vertrag?", _ctx(1), AGENTS, llm=llm)
+    again = await classifier.classify("wie lange LÄUFT mein vertrag", _ctx(1), AGENTS, llm=llm)
+    await classifier.classify("Wie lange läuft mein Vertrag?", _ctx(2), AGENTS, llm=llm)
+    # An agent the tenant no longer has is not served from the cache
+    await classifier.classify("Wie lange läuft mein Vertrag?", _ctx(1), {"persona": "", "knowledge": ""}, llm=llm)
+
+    assert first.agent_id == again.agent_id == "sales"
+    assert llm.chat.call_count == 3
+    logged = load_labelled_examples(log)
+    assert logged[0]["text"] == "wie lange läuft mein vertrag" and logged[0]["agent_id"] == "sales"
+
+
+async def test_model_tier_answers_confident_predictions_only():
+    classifier = FastPathClassifier(log_path=None)
+    classifier.set_model(1, _model())
+    llm = _llm("persona", 0.8)
+
+    booked = await classifier.classify("Kann ich den Kurs am Dienstag buchen?", _ctx(), AGENTS, llm=llm)
+    assert booked.agent_id == "ops"
+    llm.chat.assert_not_called()
+
+    # Unrelated text stays below the similarity floor and falls through
+    await classifier.classify("Erzähl mir einen Witz über Katzen", _ctx(), AGENTS, llm=llm)
+    # Short replies mid-conversation need the history, so they go to the LLM
+    await classifier.classify("Ja, Montag", _ctx(), AGENTS, history=({"role": "assistant", "content": "Wann?"},), llm=llm)
+    assert llm.chat.call_count == 2
+
+
+def test_model_respects_available_agents():
+    model = _model()
+    agent, confidence = model.predict(normalize_utterance("Gibt es eine Sauna?"))
+    assert agent == "knowledge" and confidence > 0.8
+    agent, _ = model.predict(normalize_utterance("Gibt es eine Sauna?"), allowed=["ops", "sales"])
+    assert agent in {"ops", "sales"}
+
+
+def test_offline_evaluation_reports_accuracy_and_avoided_calls():
+    records = []
+    for ts, (agent, texts) in enumerate(sorted(TRAINING.items()) * 3):
+        for text in texts:
+            records.append({"ts": ts, "tenant_id": 1, "text": text, "agent_id": agent, "confidence": 0.9})
+    records.append({"ts": 99, "tenant_id": 1, "text": "danke", "agent_id": "persona", "confidence": 0.9})
+
+    report = evaluate_offline(records, train_fraction=0.5)
+
+    assert report["train"] + report["test"] == len(records)
+    assert 0.9 <= report["avoided_fraction"] <= 1.0
+    assert report["accuracy"] == 1.0
+    assert report["tiers"]["rules"]["answered"] == 1
+
+
+async def test_models_are_trained_per_tenant(tmp_path):
+    log = tmp_path / "intents.jsonl"
+    with log.open("w", encoding="utf-8") as fh:
+        for agent, texts in TRAINING.items():
+            for text in texts:
+                fh.write(json.dumps({"tenant_id": 1, "text": text, "agent_id": agent, "confidence": 0.9}) + "\n")
+                # Tenant 2 routes the same questions elsewhere
+                fh.write(json.dumps({"tenant_id": 2, "text": text, "agent_id": "persona", "confidence": 0.9}) + "\n")
+    classifier = FastPathClassifier(log_path=str(log))
+    llm = _llm("knowledge")
+
+    with patch("app.swarm.lead.fast_path.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+        booked = await classifier.classify("Kann ich den Kurs am Dienstag buchen?", _ctx(1), AGENTS, llm=llm)
+    assert to_thread.call_count == 2  # log read and fit ran in worker threads
+    assert booked.agent_id == "ops"
+    other = await classifier.classify("Kann ich den Kurs am Dienstag buchen?", _ctx(2), AGENTS, llm=llm)
+    assert other.agent_id == "persona"
+    # No model for a tenant without labels of its own
+    await classifier.classify("Kann ich den Kurs am Dienstag buchen?", _ctx(3), AGENTS, llm=llm)
+    llm.chat.assert_called_once()
+
+
+async def test_refit_uses_the_tenant_window_without_rereading_the_log(tmp_path):
+    log = tmp_path / "intents.jsonl"
+    classifier = FastPathClassifier(log_path=str(log), refit_every=4, training_window=6)
+    llm = _llm("sales")
+    await classifier.classify("hallo", _ctx(1), AGENTS, llm=llm)  # loads the (empty) log
+
+    with patch("app.swarm.lead.fast_path.load_labelled_examples") as reread:
+        for text in TRAINING["sales"] + TRAINING["ops"]:
+            await classifier.record(1, text, _label("sales" if text in TRAINING["sales"] else "ops"))
+        await asyncio.gather(*classifier._refit_tasks.values())
+    reread.assert_not_called()
+
+    assert list(classifier._examples[1])[0][0] == TRAINING["sales"][2]  # window keeps the last 6
+    assert classifier._models[1].trained_on == 6 and 2 not in classifier._models
+
+
+async def test_log_is_rotated_at_its_size_cap(tmp_path):
+    log = tmp_path / "intents.jsonl"
+    classifier = FastPathClassifier(log_path=str(log), log_max_bytes=300)
+    for i in range(12):
+        await classifier.record(1, f"frage nummer {i} zum vertrag", _label("sales"))
+
+    assert log.stat().st_size < 300 + 200
+    rotated = tmp_path / "intents.jsonl.1"
+    assert rotated.exists() and rotated.stat().st_size < 300 + 200
+    records = load_labelled_examples(log)
+    assert records[-1]["text"] == "frage nummer 11 zum vertrag"
+    assert len(tenant_training_pairs(records, window=3)[1]) == 3
@@ -0,0 +1,179 @@
+"""Tests für den begrenzten Knowledge-Gap-Detektor (app/platform/ghost_mode_v2.py).
+
+Muster werden vorkompiliert, Wiederholungen über MinHash-Signaturen in
+einem begrenzten Fenster erkannt und Lücken als Zähler pro Tenant und
+normalisiertem Thema aggregiert und periodisch persistiert.
+"""
+
+import random
+import threading
+
+import pytest
+
+import app.core.models  # noqa: F401
+from app.domains.support.models import KnowledgeGapTopic
+from app.platform.ghost_mode_v2 import GhostModeV2, KnowledgeGapDetector, KnowledgeGapStore
+
+UNSURE = "Das weiß ich leider nicht."
+
+
+def test_category_matcher_matches_ordered_keyword_scan():
+    detector = KnowledgeGapDetector()
+    keywords = [kw for kws in detector.TOPIC_CATEGORIES.values() for kw in kws]
+    rng = random.Random(5)
+    for _ in range(500):
+        text = " ".join(rng.choice(keywords + ["hallo", "wann", "xyz"]) for _ in range(rng.randint(1, 6)))
+        expected = next(
+            (cat for cat, kws in detector.TOPIC_CATEGORIES.items() if any(kw in text for kw in kws)), None,
+        )
+        assert detector._detect_category(text) == expected, text
+
+
+def test_repeated_question_raises_confidence_within_window():
+    detector = KnowledgeGapDetector(query_window=3)
+    question = "Wann hat das Studio am Sonntag geöffnet bitte"
+    first = detector.analyze_exchange(1, "c1", question, UNSURE)
+    again = detector.analyze_exchange(1, "c1", question, UNSURE)
+    assert again.confidence == pytest.approx(first.confidence + 0.3)
+
+    for i in range(3):
+        detector.analyze_exchange(1, "c1", f"Ganz andere Frage Nummer {i} zu Parkplätzen", "Ja, gibt es.")
+    # the question dropped out of the 3-query window
+    assert detector.analyze_exchange(1, "c1", question, UNSURE).confidence == pytest.approx(first.confidence)
+    assert len(detector._recent_queries["c1"]) == 3
+
+
+def test_conversation_windows_are_bounded():
+    detector = KnowledgeGapDetector(max_conversations=10)
+    for i in range(50):
+        detector.analyze_exchange(1, f"c{i}", "Was kostet das?", UNSURE)
+    assert list(detector._recent_queries) == [f"c{i}" for i in range(40, 50)]
+
+
+def test_gaps_aggregate_per_normalized_topic():
+    detector = KnowledgeGapDetector()
+    ids = {
+        detector.analyze_exchange(1, f"c{i}", "Was kostet das Premium-Abo?", UNSURE).gap_id for i in range(3)
+    }
+    other = detector.analyze_exchange(1, "c9", "Parkplatz vor dem Eingang?!", UNSURE)
+    same_topic = detector.analyze_exchange(1, "c10", "parkplatz VOR dem eingang", UNSURE)
+    detector.analyze_exchange(2, "c1", "Was kostet das Premium-Abo?", UNSURE)
+
+    assert len(ids) == 1 and other.gap_id == same_topic.gap_id
+    gaps = detector.get_gaps(1)
+    assert sorted((g.category, g.occurrences) for g in gaps) == [("pricing", 3), ("unknown", 2)]
+    summary = detector.get_gap_summary(1)
+    assert (summary["total_gaps"], summary["topic_count"]) == (5, 2)
+    assert summary["categories"]["pricing"]["count"] == 3
+    assert detector.get_gap_summary(2)["total_gaps"] == 1
+
+    assert detector.resolve_gap(1, ids.pop())
+    assert detector.get_gap_summary(1)["unresolved"] == 2
+    # a new occurrence reopens the topic
+    detector.analyze_exchange(1, "c11", "Was kostet das Premium-Abo?", UNSURE)
+    assert detector.get_gap_summary(1)["unresolved"] == 6
+
+
+def test_topics_per_tenant_are_bounded():
+    detector = KnowledgeGapDetector(max_topics_per_tenant=5)
+    for i in range(20):
+        detector.analyze_exchange(1, f"c{i}", f"Frage zu Thema{i} heute", UNSURE)
+    topics = [g.topic for g in detector.get_gaps(1)]
+    assert sorted(topics) == sorted(f"Frage zu Thema{i} heute" for i in range(15, 20))
+
+
+async def test_flush_persists_deltas_from_several_workers(session_factory):
+    store = KnowledgeGapStore(session_factory)
+    workers = [KnowledgeGapDetector(store=store, flush_interval=0) for _ in range(2)]
+    for worker in workers:
+        for i in range(3):
+            worker.analyze_exchange(1, f"c{i}", "Was kostet das Premium-Abo?", UNSURE)
+        assert await worker.flush() == 1
+    workers[0].analyze_exchange(1, "c1", "Was kostet das Premium-Abo?", UNSURE)
+    await workers[0].flush()
+    assert await workers[0].flush() == 0  # nothing pending
+
+    with session_factory() as db:
+        row = db.query(KnowledgeGapTopic).one()
+        assert (row.tenant_id, row.category, row.occurrences) == (1, "pricing", 7)
+
+    restarted = KnowledgeGapDetector(store=store)
+    [gap] = restarted.get_gaps(1)
+    assert gap.occurrences == 7 and gap.gap_id == workers[0].get_gaps(1)[0].gap_id
+    assert restarted.resolve_gap(1, gap.gap_id)
+    await restarted.flush()
+    with session_factory() as db:
+        assert db.query(KnowledgeGapTopic).one().resolved is True
+
+
+async def test_failed_flush_keeps_deltas():
+    class Down:
+        def __init__(self):
+            self.saved = []
+            self.fail = True
+
+        def load(self, tenant_id, limit):
+            return []
+
+        def save(self, deltas):
+            if self.fail:
+                raise ConnectionError("db down")
+            self.saved.extend(deltas)
+
+    store = Down()
+    detector = KnowledgeGapDetector(store=store)
+    detector.analyze_exchange(1, "c1", "Was kostet das?", UNSURE)
+    assert await detector.flush() == 0
+    detector.analyze_exchange(1, "c2", "Was kostet das?", UNSURE)
+
+    store.fail = False
+    assert await detector.flush() == 1
+    assert store.saved[0].pending_occurrences == 2
+
+
+async def test_ghost_mode_flushes_periodically():
+    clock = [0.0]
+    saved = []
+
+    class Recorder:
+        def load(self, tenant_id, limit):
+            return []
+
+        def save(self, deltas):
+            saved.append(len(deltas))
+
+    gm = GhostModeV2(gap_store=Recorder())
+    gm.gap_detector = KnowledgeGapDetector(store=Recorder(), flush_interval=60, clock=lambda: clock[0])
+    await gm.on_agent_response(1, "c1", "u1", UNSURE, user_message="Was kostet das?")
+    assert saved == []
+
+    clock[0] = 61
+    await gm.on_agent_response(1, "c2", "u2", UNSURE, user_message="Wo ist der Eingang?")
+    await gm._gap_flush
+    assert saved == [2]  # both pending topics in one write
+
+
+async def test_stored_topics_load_off_the_event_loop():
+    loads = []
+
+    class Store:
+        def load(self, tenant_id, limit):
+            loads.append((tenant_id, threading.current_thread() is threading.main_thread()))
+            return []
+
+        def save(self, deltas):
+            pass
+
+    gm = GhostModeV2(gap_store=Store())
+    gm.gap_detector = KnowledgeGapDetector(store=Store())
+    await gm.on_agent_response(1, "c1", "u1", UNSURE, user_message="Was kostet das?")
+    await gm.on_agent_response(1, "c2", "u2", UNSURE, user_message="Was kostet das?")
+    await gm.get_dashboard_state(2)
+    assert loads == [(1, False), (2, False)]  # once per tenant, in a worker thread
+
+
+def test_without_store_nothing_is_kept_for_flushing():
+    detector = KnowledgeGapDetector()
+    gap = detector.analyze_exchange(1, "c1", "Was kostet das?", UNSURE)
+    assert detector.resolve_gap(1, gap.gap_id)
+    assert detector._dirty == {} and not detector.flush_due()
@@ -0,0 +1,173 @@
+"""Tests für die Archivierungs-Pipeline des Librarian (app/memory/librarian_v2.py).
+
+Ein Stub-Summarizer ersetzt das LLM; ein generierter Rückstau veralteter
+Sessions wird seitenweise (Keyset) abgearbeitet, mit einer
+Nachrichten-Abfrage pro Seite und persistiertem Job-Status.
+"""
+
+import asyncio
+import math
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+import app.core.models  # noqa: F401
+from app.domains.support.models import ChatMessage, ChatSession, LibrarianJob
+from app.memory import member_memory_analyzer
+from app.memory.librarian_v2 import DatabaseJobStore, JobStatus, LibrarianWorker, SummarizationStrategy
+
+STALE = datetime.now(timezone.utc) - timedelta(days=3)
+FRESH = datetime.now(timezone.utc) - timedelta(hours=1)
+
+
+class StubSummarizer(SummarizationStrategy):
+    """Summarizer stand-in recording peak concurrency; fails for members in *failing*."""
+
+    def __init__(self, delay: float = 0.005, failing: frozenset[str] = frozenset()) -> None:
+        self.delay = delay
+        self.failing = failing
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def summarize(self, member_id, tenant_id, messages):
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if member_id in self.failing:
+                raise RuntimeError("summarizer down")
+            return f"{member_id}: {len(messages)} Nachrichten"
+        finally:
+            self.running -= 1
+
+
+class BrokenFallback(SummarizationStrategy):
+    async def summarize(self, member_id, tenant_id, messages):
+        raise RuntimeError("fallback down")
+
+
+@pytest.fixture(autouse=True)
+def indexed(monkeypatch):
+    upserts = []
+    monkeypatch.setattr(
+        member_memory_analyzer, "_index_member_memories", lambda slug, facts: upserts.append((slug, dict(facts))),
+    )
+    return upserts
+
+
+@pytest.fixture
+def message_queries(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM chat_messages" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def _backlog(factory, stale: int, *, empty: int = 0, fresh: int = 0) -> None:
+    with factory() as db:
+        for n in range(stale + empty + fresh):
+            tenant_id = 1 + n % 2
+            session = ChatSession(
+                tenant_id=tenant_id, user_id=f"wa-{n}", member_id=f"m{n}",
+                last_message_at=FRESH if n >= stale + empty else STALE, is_active=True,
+            )
+            db.add(session)
+            if n < stale or n >= stale + empty:
+                for i, role in enumerate(("user", "assistant", "user")):
+                    db.add(ChatMessage(
+                        tenant_id=tenant_id, session_id=f"wa-{n}", role=role, content=f"Nachricht {i}",
+                        timestamp=STALE + timedelta(minutes=i),
+                    ))
+        db.commit()
+
+
+def _worker(factory, summarizer, **kwargs) -> LibrarianWorker:
+    return LibrarianWorker(
+        primary_strategy=summarizer, max_retries=0, backoff_base=0.0,
+        job_store=DatabaseJobStore(factory), session_factory=factory, **kwargs,
+    )
+
+
+def test_cycle_drains_backlog_with_one_message_query_per_page(session_factory, message_queries, indexed):
+    _backlog(session_factory, stale=230, empty=7, fresh=5)
+    summarizer = StubSummarizer()
+    worker = _worker(session_factory, summarizer, batch_size=50, concurrency=4)
+
+    results = asyncio.run(worker.run_archival_cycle())
+
+    assert results["sessions_found"] == 230 and results["completed"] == 230
+    assert results["empty_archived"] == 7 and results["failed"] == 0
+    assert results["pages"] == math.ceil(237 / 50)
+    assert len(message_queries) == results["pages"]
+    assert summarizer.calls == 230 and summarizer.peak == 4
+
+    with session_factory() as db:
+        active = db.query(ChatSession).filter(ChatSession.is_active == True).all()  # noqa: E712
+        assert sorted(s.user_id for s in active) == [f"wa-{n}" for n in range(237, 242)]
+        statuses = [row.status for row in db.query(LibrarianJob)]
+        assert statuses.count("completed") == 230 and len(statuses) == 230
+
+    # one vector DB upsert per tenant and page
+    assert {slug for slug, _ in indexed} == {"studio-a", "studio-b"}
+    assert sum(len(facts) for _, facts in indexed) == 230
+    assert all(fact.startswith("[EPISODE") for _, facts in indexed for fact in facts.values())
+
+    assert asyncio.run(worker.run_archival_cycle())["pages"] == 0
+
+
+def test_failed_sessions_stay_active_and_do_not_stall_the_cycle(session_factory):
+    _backlog(session_factory, stale=30)
+    worker = _worker(
+        session_factory, StubSummarizer(failing=frozenset({"m3", "m17"})), batch_size=8,
+    )
+    worker._fallback = BrokenFallback()
+
+    results = asyncio.run(worker.run_archival_cycle())
+    assert (results["completed"], results["failed"], results["pages"]) == (28, 2, 4)
+
+    with session_factory() as db:
+        active = sorted(s.member_id for s in db.query(ChatSession).filter(ChatSession.is_active == True))  # noqa: E712
+        assert active == ["m17", "m3"]
+
+    # the next cycle only retries what is left
+    retry = asyncio.run(_worker(session_factory, StubSummarizer(), batch_size=8).run_archival_cycle())
+    assert (retry["sessions_found"], retry["completed"]) == (2, 2)
+
+
+def test_fallback_summaries_are_archived(session_factory, indexed):
+    _backlog(session_factory, stale=4)
+    worker = _worker(session_factory, StubSummarizer(failing=frozenset({"m0", "m1", "m2", "m3"})))
+    results = asyncio.run(worker.run_archival_cycle())
+    assert results["fallback"] == 4
+    assert all(fact.startswith("[FALLBACK-EPISODE") for _, facts in indexed for fact in facts.values())
+
+
+def test_job_state_survives_a_new_worker(session_factory):
+    store = DatabaseJobStore(session_factory)
+    job = _worker(session_factory, StubSummarizer()).create_job("m1", 1, "wa-1", chat_session_id=5)
+
+    restarted = LibrarianWorker(job_store=DatabaseJobStore(session_factory))
+    loaded = restarted.get_job(job.job_id)
+    assert (loaded.member_id, loaded.tenant_id, loaded.chat_session_id) == ("m1", 1, 5)
+    assert loaded.status == JobStatus.PENDING
+    assert restarted.get_metrics()["pending_jobs"] == 1
+
+    loaded.status = JobStatus.COMPLETED
+    loaded.completed_at = (datetime.now(timezone.utc) - timedelta(days=30)).timestamp()
+    store.save([loaded])
+    assert store.purge((datetime.now(timezone.utc) - timedelta(days=7)).timestamp()) == 1
+    assert store.get(job.job_id) is None
+
+
+def test_max_pages_bounds_a_cycle(session_factory):
+    _backlog(session_factory, stale=25)
+    results = asyncio.run(_worker(session_factory, StubSummarizer(), batch_size=10).run_archival_cycle(max_pages=2))
+    assert (results["pages"], results["completed"]) == (2, 20)
@@ -0,0 +1,179 @@
+"""Tests für gestreamte Medien-Uploads (app/media/storage.py, app/media/derivatives.py).
+
+Uploads werden chunkweise in eine Temp-Datei geschrieben und gehasht,
+pro Tenant per Inhalts-Hash dedupliziert; Metadaten und WebP-Derivate
+entstehen außerhalb des Event-Loops.
+"""
+
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+from PIL import Image
+from starlette.datastructures import UploadFile
+
+import app.core.models  # noqa: F401
+from app.core.auth import AuthContext
+from app.core.media_models import MediaAsset
+from app.domains.identity.models import Tenant
+from app.gateway.routers import media as media_router
+from app.media import storage
+from app.media.derivatives import build_derivatives, process_asset_derivatives
+
+
+def _jpeg(width: int, height: int, color=(200, 30, 30)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+
+def _upload(data: bytes, filename: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+@pytest.fixture
+def media_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "_get_media_root", lambda: tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as session:
+        yield session
+
+
+def _user(tenant_id: int) -> AuthContext:
+    slug = "studio-a" if tenant_id == 1 else "studio-b"
+    return AuthContext(user_id=None, email="owner@example.com", tenant_id=tenant_id, tenant_slug=slug, role="tenant_admin")
+
+
+async def test_stage_upload_hashes_in_chunks(media_root):
+    data = b"x" * 2500 + b"y" * 100
+    staged = await storage.stage_upload(_upload(data, "a.png"), media_root / "t" / "images", ".png", 10_000, chunk_size=1000)
+
+    assert staged.size == len(data)
+    assert staged.sha256 == hashlib.sha256(data).hexdigest()
+    name = await staged.commit()
+    assert (media_root / "t" / "images" / name).read_bytes() == data
+    assert [p.name for p in (media_root / "t" / "images").iterdir()] == [name]
+
+
+async def test_stage_upload_stops_at_size_limit(media_root):
+    class CountingUpload:
+        def __init__(self):
+            self.reads = 0
+
+        async def read(self, size=-1):
+            self.reads += 1
+            return b"z" * size
+
+    upload = CountingUpload()
+    with pytest.raises(storage.UploadTooLarge):
+        await storage.stage_upload(upload, media_root / "images", ".png", 3000, chunk_size=1000)
+    assert upload.reads == 4  # aborted on the first chunk over the limit, not at EOF
+    assert list((media_root / "images").iterdir()) == []
+
+
+async def test_upload_deduplicates_per_tenant(media_root, db):
+    image = _jpeg(64, 32)
+    first = await media_router.upload_media(
+        background_tasks=(tasks := BackgroundTasks()), file=_upload(image, "hero.jpg"), alt_text=None,
+        user=_user(1), db=db,
+    )
+    assert first["deduplicated"] is False
+    assert [t.func for t in tasks.tasks] == [process_asset_derivatives]
+
+    again = await media_router.upload_media(
+        background_tasks=(tasks := BackgroundTasks()), file=_upload(image, "copy.jpg"), alt_text="Hero",
+        user=_user(1), db=db,
+    )
+    assert again["deduplicated"] is True and again["id"] == first["id"]
+    assert tasks.tasks == []
+    assert db.get(MediaAsset, first["id"]).alt_text == "Hero"
+
+    other_tenant = await media_router.upload_media(
+        background_tasks=BackgroundTasks(), file=_upload(image, "hero.jpg"), alt_text=None, user=_user(2), db=db,
+    )
+    assert other_tenant["deduplicated"] is False and other_tenant["id"] != first["id"]
+
+    assert db.query(MediaAsset).count() == 2
+    assert sorted(p.name for p in (media_root / "studio-a" / "images").iterdir()) == [first["filename"]]
+
+    # Original gone from disk: the hash alone does not count as a duplicate
+    (media_root / "studio-a" / "images" / first["filename"]).unlink()
+    reupload = await media_router.upload_media(
+        background_tasks=BackgroundTasks(), file=_upload(image, "hero.jpg"), alt_text=None, user=_user(1), db=db,
+    )
+    assert reupload["deduplicated"] is False
+
+
+async def test_upload_rejects_oversized_and_unsupported_files(media_root, db, monkeypatch):
+    monkeypatch.setattr(storage, "MAX_FILE_SIZE", 1000)
+    with pytest.raises(HTTPException) as exc:
+        await media_router.upload_media(
+            background_tasks=BackgroundTasks(), file=_upload(b"a" * 5000, "big.png"), alt_text=None,
+            user=_user(1), db=db,
+        )
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException):
+        await media_router.upload_media(
+            background_tasks=BackgroundTasks(), file=_upload(b"a", "x.exe"), alt_text=None, user=_user(1), db=db,
+        )
+    assert db.query(MediaAsset).count() == 0
+    assert list((media_root / "studio-a" / "images").iterdir()) == []
+
+
+async def test_document_uploads_share_content_but_not_names(media_root, db):
+    payload = b"%PDF-1.4 fake"
+    first = await media_router.upload_document(file=_upload(payload, "flyer.pdf"), user=_user(1), db=db)
+    second = await media_router.upload_document(file=_upload(payload, "flyer (1).pdf"), user=_user(1), db=db)
+
+    assert (first["deduplicated"], second["deduplicated"]) == (False, True)
+    assert first["url"] != second["url"]
+    doc_dir = media_root / "studio-a" / "documents"
+    blob = doc_dir / ".blobs" / (hashlib.sha256(payload).hexdigest() + ".pdf")
+    assert blob.stat().st_nlink == 3  # one copy on disk, two upload names
+    listed = await media_router.list_documents(user=_user(1), db=db)
+    assert sorted(d["filename"] for d in listed["documents"]) == sorted([first["filename"], second["filename"]])
+
+    await media_router.delete_document(first["filename"], user=_user(1), db=db)
+    assert (doc_dir / second["filename"]).read_bytes() == payload
+    assert not (doc_dir / first["filename"]).exists()
+
+    await media_router.delete_document(second["filename"], user=_user(1), db=db)
+    assert not blob.exists()
+    with pytest.raises(HTTPException) as exc:
+        await media_router.delete_document(second["filename"], user=_user(1), db=db)
+    assert exc.value.status_code == 404
+
+
+def test_build_derivatives_writes_webp_renditions(tmp_path):
+    source = tmp_path / "photo.jpg"
+    source.write_bytes(_jpeg(3000, 2000, color=(240, 240, 240)))
+
+    result = build_derivatives(source)
+
+    meta = result["metadata"]
+    assert (meta["width"], meta["height"]) == (3000, 2000)
+    assert meta["orientation"] == "landscape" and meta["aspect_ratio"] == "3:2"
+    assert meta["brightness"] == "light"
+    assert result["derivatives"] == {"preview": "photo_preview.webp", "thumb": "photo_thumb.webp"}
+    for name, longest in (("photo_preview.webp", 1280), ("photo_thumb.webp", 320)):
+        with Image.open(tmp_path / name) as rendition:
+            assert rendition.format == "WEBP" and max(rendition.size) == longest
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["photo.jpg", "photo_preview.webp", "photo_thumb.webp"]
+
+
+def test_list_entries_point_to_derivatives(media_root):
+    asset = MediaAsset(id=7, tenant_id=1, filename="abc.jpg", source="upload")
+    entry = media_router._asset_to_dict(asset, "studio-a")
+    assert entry["thumbnail_url"] == entry["url"]  # not built yet: fall back to the original
+
+    asset.derivatives = {"thumb": "abc_thumb.webp", "preview": "abc_preview.webp"}
+    entry = media_router._asset_to_dict(asset, "studio-a")
+    assert entry["thumbnail_url"].endswith("/studio-a/images/abc_thumb.webp")
+    assert entry["preview_url"].endswith("/studio-a/images/abc_preview.webp")
+    assert Path(entry["url"]).name == "abc.jpg"
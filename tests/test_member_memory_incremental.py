@@ -0,0 +1,182 @@
+"""Tests für die inkrementelle Member-Memory-Analyse (app/memory/member_memory_analyzer.py).
+
+Ein Stub-LLM ersetzt den echten Extraktor; Wasserzeichen (letzte
+Nachrichten-ID + Hash der CRM-Daten) sorgen dafür, dass unveränderte
+Mitglieder beim nächsten Lauf übersprungen werden.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import app.core.models  # noqa: F401
+from app.domains.identity.models import Tenant
+from app.domains.support.models import ChatMessage, ChatSession, MemberMemoryWatermark, StudioMember
+from app.memory import member_memory_analyzer as analyzer
+
+T0 = datetime(2026, 10, 1, 9, 0, tzinfo=timezone.utc)
+
+
+class StubLLM:
+    """Extractor stand-in that records calls and the peak number of concurrent calls."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: list[tuple[int | None, str]] = []
+        self.chats: dict[str, str] = {}
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, *, member_id, tenant_id, instructions, magic_summary, chat_summary, model):
+        self.calls.append((tenant_id, member_id))
+        self.chats[member_id] = chat_summary
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            return f"- Zusammenfassung: Profil für {member_id}"
+        finally:
+            self.running -= 1
+
+
+@pytest.fixture(autouse=True)
+def memory_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(analyzer, "TENANT_MEMORY_ROOT", str(tmp_path / "tenants"))
+    monkeypatch.setattr(analyzer, "LEGACY_MEMORY_DIR", str(tmp_path / "members"))
+    monkeypatch.setattr(analyzer, "GLOBAL_INSTRUCTIONS_PATH", str(tmp_path / "instructions.md"))
+    monkeypatch.setattr(analyzer, "_index_member_memories", lambda slug, profiles: None)
+    return tmp_path / "tenants"
+
+
+def _add_member(db, tenant_id: int, member_id: str, messages: list[str], *, start: datetime = T0) -> ChatSession:
+    session = ChatSession(tenant_id=tenant_id, user_id=f"wa-{member_id}", member_id=member_id, last_message_at=start)
+    db.add(session)
+    db.flush()
+    for i, text in enumerate(messages):
+        db.add(ChatMessage(
+            tenant_id=tenant_id, session_id=session.user_id, role="user", content=text, timestamp=start + timedelta(minutes=i),
+        ))
+    return session
+
+
+def _run(factory, stub, tenant_id=1, **kwargs):
+    return asyncio.run(analyzer.analyze_all_members_async(tenant_id, session_factory=factory, extractor=stub, **kwargs))
+
+
+def test_unchanged_members_are_skipped(session_factory, memory_root):
+    with session_factory() as db:
+        for n in range(5):
+            _add_member(db, 1, f"m{n}", [f"Hallo von m{n}", "Ich will Muskeln aufbauen"])
+        db.add(StudioMember(tenant_id=1, customer_id=1001, member_number="m0", first_name="Anna", last_name="A"))
+        db.commit()
+
+    first = StubLLM()
+    assert _run(session_factory, first) == {"total": 5, "ok": 5, "err": 0, "skipped": 0}
+    assert sorted(m for _, m in first.calls) == [f"m{n}" for n in range(5)]
+    memory = (memory_root / "studio-a" / "members" / "m0.md").read_text(encoding="utf-8")
+    assert "Profil für m0" in memory and "- Name: Anna A" in memory
+
+    second = StubLLM()
+    assert _run(session_factory, second) == {"total": 5, "ok": 0, "err": 0, "skipped": 5}
+    assert second.calls == []
+
+    # new chat activity for m1, new Magicline data for m0
+    with session_factory() as db:
+        db.add(ChatMessage(tenant_id=1, session_id="wa-m1", role="user", content="Knie tut weh", timestamp=T0 + timedelta(days=1)))
+        db.query(StudioMember).filter_by(member_number="m0").one().is_paused = True
+        db.commit()
+
+    third = StubLLM()
+    assert _run(session_factory, third) == {"total": 5, "ok": 2, "err": 0, "skipped": 3}
+    assert sorted(m for _, m in third.calls) == ["m0", "m1"]
+    assert third.chats["m1"].splitlines()[-1] == "- user: Knie tut weh"
+
+    # a deleted memory file is rebuilt even without new input
+    (memory_root / "studio-a" / "members" / "m3.md").unlink()
+    fourth = StubLLM()
+    _run(session_factory, fourth)
+    assert [m for _, m in fourth.calls] == ["m3"]
+
+
+def test_force_and_single_member_runs_ignore_watermarks(session_factory):
+    with session_factory() as db:
+        for n in range(3):
+            _add_member(db, 1, f"m{n}", ["Hallo"])
+        db.commit()
+    _run(session_factory, StubLLM())
+
+    stub = StubLLM()
+    assert _run(session_factory, stub, member_ids=["m2"], force=True)["ok"] == 1
+    assert stub.calls == [(1, "m2")]
+    assert _run(session_factory, StubLLM(), force=True)["ok"] == 3
+
+
+def test_concurrency_is_bounded(session_factory):
+    with session_factory() as db:
+        for n in range(12):
+            _add_member(db, 1, f"m{n}", ["Hallo"])
+        db.commit()
+
+    stub = StubLLM(delay=0.02)
+    assert _run(session_factory, stub, concurrency=3)["ok"] == 12
+    assert stub.peak == 3
+
+
+def test_chat_history_uses_latest_session_and_recent_messages(session_factory, monkeypatch):
+    monkeypatch.setattr(analyzer, "MEMBER_MEMORY_MAX_MESSAGES", 5)
+    with session_factory() as db:
+        _add_member(db, 1, "m1", ["alte Sitzung"], start=T0 - timedelta(days=30))
+        _add_member(db, 1, "m1", [f"Nachricht {i}" for i in range(8)])
+        # same member id in another tenant stays separate
+        _add_member(db, 2, "m1", ["anderer Tenant"])
+        db.commit()
+
+    stub = StubLLM()
+    _run(session_factory, stub)
+    lines = stub.chats["m1"].splitlines()
+    assert lines == [f"- user: Nachricht {i}" for i in range(3, 8)]
+
+
+def test_all_tenants_and_failures(session_factory, memory_root, monkeypatch):
+    monkeypatch.setattr(analyzer, "_llm_model", lambda tenant_id: "gpt-4o-mini")
+    with session_factory() as db:
+        _add_member(db, 1, "ok-1", ["Hallo"])
+        _add_member(db, 2, "boom", ["Hallo"])
+        db.commit()
+
+    class Failing(StubLLM):
+        async def __call__(self, **kwargs):
+            if kwargs["member_id"] == "boom":
+                raise RuntimeError("llm down")
+            return await super().__call__(**kwargs)
+
+    result = asyncio.run(analyzer.analyze_all_members_async(session_factory=session_factory, extractor=Failing()))
+    assert result == {"total": 2, "ok": 1, "err": 1, "skipped": 0}
+    # LLM failure falls back to the heuristic summary
+    assert "- Hallo" in (memory_root / "studio-b" / "members" / "boom.md").read_text(encoding="utf-8")
+
+    with session_factory() as db:
+        marks = {(wm.tenant_id, wm.member_id): wm.last_message_id for wm in db.query(MemberMemoryWatermark)}
+        assert set(marks) == {(1, "ok-1")} and all(v > 0 for v in marks.values())
+    assert not list(memory_root.rglob("*.tmp"))
+
+    # without a watermark the failed member is retried once the LLM is back
+    stub = StubLLM()
+    result = asyncio.run(analyzer.analyze_all_members_async(session_factory=session_factory, extractor=stub))
+    assert result == {"total": 2, "ok": 1, "err": 0, "skipped": 1}
+    assert stub.calls == [(2, "boom")]
+    assert "Profil für boom" in (memory_root / "studio-b" / "members" / "boom.md").read_text(encoding="utf-8")
+
+
+def test_heuristic_profile_counts_as_done_without_llm(session_factory, monkeypatch):
+    monkeypatch.setattr(analyzer, "_llm_model", lambda tenant_id: None)
+    with session_factory() as db:
+        _add_member(db, 1, "m1", ["Hallo"])
+        db.commit()
+
+    async def no_llm(**kwargs):
+        return None
+
+    assert _run(session_factory, no_llm)["ok"] == 1
+    assert _run(session_factory, no_llm)["skipped"] == 1
@@ -0,0 +1,130 @@
+"""Tests für das indizierte In-Memory-Backend des GraphStore."""
+
+import pytest
+
+from app.memory_platform.models.graph_store import GraphStore
+from app.memory_platform.models.memory_graph import InMemoryGraph, tokenize
+
+
+@pytest.fixture
+def store():
+    s = GraphStore()
+    s._in_memory = True
+    s._initialised = True
+    return s
+
+
+async def _fact(store, fact_id, tenant_id=1, member_id="m1", fact_type="preference",
+                subject="member", predicate="likes", value="yoga", confidence=0.8):
+    await store.upsert_node("Fact", "fact_id", fact_id, {
+        "fact_id": fact_id, "tenant_id": tenant_id, "member_id": member_id,
+        "fact_type": fact_type, "subject": subject, "predicate": predicate,
+        "value": value, "confidence": confidence, "updated_at": "2026-03-01T00:00:00",
+    })
+
+
+async def test_member_facts_use_indexes_and_respect_tenant(store):
+    await _fact(store, "f1", confidence=0.5)
+    await _fact(store, "f2", confidence=0.9, fact_type="goal")
+    await _fact(store, "f3", member_id="m2")
+    await _fact(store, "f4", tenant_id=2)
+
+    facts = await store.get_member_facts(1, "m1")
+    assert [f["fact_id"] for f in facts] == ["f2", "f1"]
+
+    goals = await store.get_member_facts(1, "m1", fact_types=["goal"])
+    assert [f["fact_id"] for f in goals] == ["f2"]
+    assert await store.get_member_facts(2, "m1", limit=5) == [await store.get_node("Fact", "fact_id", "f4")]
+
+
+async def test_upsert_reindexes_changed_properties(store):
+    await _fact(store, "f1", member_id="m1", value="yoga")
+    await _fact(store, "f1", member_id="m2", value="spinning")
+
+    assert await store.get_member_facts(1, "m1") == []
+    assert [f["fact_id"] for f in await store.get_member_facts(1, "m2")] == ["f1"]
+    assert await store.fulltext_search(1, "yoga") == []
+    assert [f["fact_id"] for f in await store.fulltext_search(1, "spinning")] == ["f1"]
+
+
+async def test_query_nodes_combines_indexed_and_residual_filters(store):
+    await _fact(store, "f1", fact_type="goal", subject="weight")
+    await _fact(store, "f2", fact_type="goal", subject="strength")
+    await _fact(store, "f3", fact_type="event", subject="weight")
+
+    results = await store.query_nodes("Fact", {"tenant_id": 1, "fact_type": "goal", "subject": "weight"})
+    assert [n["fact_id"] for n in results] == ["f1"]
+    assert len(await store.query_nodes("Fact", {"tenant_id": 1}, limit=2)) == 2
+    assert await store.query_nodes("Member", {"tenant_id": 1}) == []
+
+
+async def test_fulltext_search_ranks_with_bm25(store):
+    await _fact(store, "f1", value="yoga am Morgen")
+    await _fact(store, "f2", predicate="mag", value="yoga yoga Pilates")
+    await _fact(store, "f3", value="Krafttraining")
+    await _fact(store, "f4", tenant_id=2, value="yoga")
+
+    results = await store.fulltext_search(1, "Yoga Pilates")
+    assert [r["fact_id"] for r in results] == ["f2", "f1"]
+    assert results[0]["_score"] > results[1]["_score"] > 0
+    assert await store.fulltext_search(1, "schwimmen") == []
+    assert [r["fact_id"] for r in await store.fulltext_search(2, "yoga")] == ["f4"]
+
+
+async def test_relationships_merge_and_are_removed_with_nodes(store):
+    await store.upsert_node("Member", "member_id", "m1", {"member_id": "m1", "tenant_id": 1})
+    await _fact(store, "f1")
+    await _fact(store, "f2")
+
+    assert await store.create_relationship("Fact", "fact_id", "f1", "Member", "member_id", "m1", "APPLIES_TO")
+    assert await store.create_relationship("Fact", "fact_id", "f1", "Member", "member_id", "m1", "APPLIES_TO",
+                                           {"confidence": 0.9})
+    assert await store.create_relationship("Fact", "fact_id", "f2", "Member", "member_id", "m1", "APPLIES_TO")
+    # Missing target: nothing is created (same as Neo4j MATCH ... MERGE)
+    assert not await store.create_relationship("Fact", "fact_id", "f1", "Member", "member_id", "nope", "APPLIES_TO")
+
+    incoming = await store.get_related_nodes("Member", "member_id", "m1", rel_type="APPLIES_TO", direction="in")
+    assert sorted(n["fact_id"] for n in incoming) == ["f1", "f2"]
+    assert next(n for n in incoming if n["fact_id"] == "f1")["_rel"]["confidence"] == 0.9
+    outgoing = await store.get_related_nodes("Fact", "fact_id", "f1")
+    assert [n["member_id"] for n in outgoing] == ["m1"]
+
+    stats = await store.get_stats(1)
+    assert stats["node_counts"] == {"Member": 1, "Fact": 2}
+    assert stats["edge_count"] == 2
+
+    assert await store.delete_node("Member", "member_id", "m1")
+    assert await store.get_related_nodes("Fact", "fact_id", "f1") == []
+    assert (await store.get_stats(1))["edge_count"] == 0
+    assert not await store.delete_node("Member", "member_id", "m1")
+
+
+async def test_snapshot_roundtrip(store, tmp_path):
+    await store.upsert_node("Member", "member_id", "m1", {"member_id": "m1", "tenant_id": 1})
+    await _fact(store, "f1", value="Rückentraining")
+    await store.create_relationship("Fact", "fact_id", "f1", "Member", "member_id", "m1", "APPLIES_TO")
+    path = str(tmp_path / "graph.json.gz")
+    assert store.save_snapshot(path)
+
+    restored = GraphStore()
+    restored._in_memory = True
+    restored._load_memory_snapshot(path)
+
+    assert [f["fact_id"] for f in await restored.get_member_facts(1, "m1")] == ["f1"]
+    assert [f["fact_id"] for f in await restored.fulltext_search(1, "rückentraining")] == ["f1"]
+    assert (await restored.get_stats(1))["edge_count"] == 1
+
+
+def test_tokenize_handles_umlauts_and_punctuation():
+    assert tokenize("Mag's Rückentraining, 2x/Woche!") == ["mag", "s", "rückentraining", "2x", "woche"]
+
+
+def test_memory_graph_snapshot_rejects_unknown_version(tmp_path):
+    import gzip
+    import json
+
+    path = tmp_path / "bad.json.gz"
+    with gzip.open(path, "wt") as fh:
+        json.dump({"version": 99}, fh)
+    with pytest.raises(ValueError):
+        InMemoryGraph().load_snapshot(str(path))
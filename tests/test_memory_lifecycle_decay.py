@@ -0,0 +1,183 @@
+"""Tests für den batchweisen, vektorisierten Decay-Zyklus (MemoryLifecycleManager)."""
+
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.memory_platform.lifecycle import (
+    FACT_TYPE_HALF_LIVES,
+    MemoryLifecycleManager,
+    decay_scores_vectorized,
+    exponential_decay,
+    get_half_life,
+    reinforcement_boost,
+)
+
+
+def _reference_score(fact: dict, now: datetime) -> float:
+    hours = (now - fact["updated_at"]).total_seconds() / 3600
+    score = exponential_decay(fact["confidence"], hours, get_half_life(fact["fact_type"]))
+    if fact["access_count_since_decay"] > 0:
+        score = reinforcement_boost(score, fact["access_count_since_decay"])
+    return score
+
+
+def _random_facts(n: int, now: datetime, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    types = list(FACT_TYPE_HALF_LIVES) + ["unknown"]
+    facts = []
+    for i in range(n):
+        facts.append({
+            "fact_id": f"f{i:06d}",
+            "tenant_id": 1,
+            "contact_id": f"c{i % 50}",
+            "subject": "member",
+            "predicate": f"p{i % 7}",
+            "fact_type": rng.choice(types),
+            "confidence": round(rng.uniform(0.2, 1.0), 3),
+            "decay_score": 1.0,
+            "updated_at": now - timedelta(hours=rng.uniform(0, 24 * 400)),
+            "access_count_since_decay": rng.choice([0, 0, 0, 1, 3]),
+        })
+    return facts
+
+
+def test_vectorized_matches_scalar_functions():
+    now = datetime(2026, 3, 1)
+    facts = _random_facts(2000, now)
+    expected = np.array([_reference_score(f, now) for f in facts])
+
+    actual = decay_scores_vectorized(
+        confidence=[f["confidence"] for f in facts],
+        hours_since_update=[(now - f["updated_at"]).total_seconds() / 3600 for f in facts],
+        half_life_hours=[get_half_life(f["fact_type"]) for f in facts],
+        access_count=[f["access_count_since_decay"] for f in facts],
+    )
+
+    np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+
+def test_vectorized_keeps_fresh_scores_and_clamps():
+    scores = decay_scores_vectorized([0.8, 0.9, 0.9], [0.0, 1e6, 10.0], [720.0, 720.0, 720.0], [0, 0, 20])
+    assert scores[0] == pytest.approx(0.8)
+    assert scores[1] == pytest.approx(0.05)
+    assert scores[2] == pytest.approx(1.0)
+
+
+@pytest.fixture
+async def fact_db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'facts.db'}")
+    async with engine.begin() as conn:
+        await conn.execute(text("""
+            CREATE TABLE memory_facts (
+                fact_id TEXT PRIMARY KEY,
+                tenant_id INTEGER,
+                contact_id TEXT,
+                subject TEXT,
+                predicate TEXT,
+                fact_type TEXT,
+                confidence REAL,
+                decay_score REAL,
+                updated_at TIMESTAMP,
+                access_count_since_decay INTEGER,
+                archived BOOLEAN DEFAULT 0,
+                archived_at TIMESTAMP
+            )
+        """))
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    yield factory
+    await engine.dispose()
+
+
+async def _insert(factory, facts: list[dict]) -> None:
+    async with factory() as session:
+        await session.execute(
+            text("""
+                INSERT INTO memory_facts (fact_id, tenant_id, contact_id, subject, predicate, fact_type,
+                                          confidence, decay_score, updated_at, access_count_since_decay, archived)
+                VALUES (:fact_id, :tenant_id, :contact_id, :subject, :predicate, :fact_type,
+                        :confidence, :decay_score, :updated_at, :access_count_since_decay, false)
+            """),
+            facts,
+        )
+        await session.commit()
+
+
+async def _rows(factory) -> dict[str, dict]:
+    async with factory() as session:
+        result = await session.execute(text("SELECT * FROM memory_facts"))
+        return {r.fact_id: dict(r._mapping) for r in result.fetchall()}
+
+
+async def test_decay_cycle_streams_batches_and_matches_reference(fact_db):
+    now = datetime.utcnow()
+    # Eindeutige (contact, subject, predicate) damit die Konsolidierung nichts archiviert
+    facts = _random_facts(1234, now)
+    for i, f in enumerate(facts):
+        f["predicate"] = f"p{i}"
+    await _insert(fact_db, facts)
+
+    manager = MemoryLifecycleManager(db_session_factory=fact_db, batch_size=100)
+    stats = await manager.run_decay_cycle(tenant_id=1)
+
+    rows = await _rows(fact_db)
+    expected_decayed = 0
+    expected_archived = 0
+    for f in facts:
+        score = _reference_score(f, now)
+        row = rows[f["fact_id"]]
+        if abs(score - f["decay_score"]) > 0.01:
+            expected_decayed += 1
+            assert row["decay_score"] == pytest.approx(score, abs=1e-4)
+            assert row["access_count_since_decay"] == 0
+        else:
+            assert row["decay_score"] == f["decay_score"]
+        if score < manager.archive_threshold:
+            expected_archived += 1
+            assert row["archived"]
+        else:
+            assert not row["archived"]
+
+    assert stats["errors"] == 0
+    assert stats["facts_processed"] == len(facts)
+    assert stats["facts_decayed"] == expected_decayed
+    assert stats["facts_archived"] == expected_archived
+    assert stats["facts_consolidated"] == 0
+
+
+async def test_consolidation_archives_lower_confidence_duplicates(fact_db):
+    now = datetime.utcnow()
+    base = {
+        "tenant_id": 1, "contact_id": "c1", "subject": "member", "predicate": "likes",
+        "fact_type": "relationship", "decay_score": 1.0, "updated_at": now,
+        "access_count_since_decay": 0,
+    }
+    await _insert(fact_db, [
+        {**base, "fact_id": "a", "confidence": 0.9},
+        {**base, "fact_id": "b", "confidence": 0.7},
+        {**base, "fact_id": "c", "confidence": 0.5},
+        {**base, "fact_id": "d", "confidence": 0.5, "predicate": "dislikes"},
+        {**base, "fact_id": "e", "confidence": 0.4, "tenant_id": 2},
+        {**base, "fact_id": "f", "confidence": 0.3, "tenant_id": 2},
+    ])
+
+    manager = MemoryLifecycleManager(db_session_factory=fact_db)
+    stats = await manager.run_decay_cycle(tenant_id=1)
+
+    rows = await _rows(fact_db)
+    assert stats["facts_consolidated"] == 2
+    assert not rows["a"]["archived"]
+    assert rows["b"]["archived"] and rows["c"]["archived"]
+    assert not rows["d"]["archived"]
+    # Anderer Mandant bleibt unberührt
+    assert not rows["e"]["archived"] and not rows["f"]["archived"]
+
+
+async def test_decay_cycle_without_session_factory_is_noop():
+    stats = await MemoryLifecycleManager().run_decay_cycle(tenant_id=1)
+    assert stats["facts_processed"] == 0
+    assert stats["errors"] == 0
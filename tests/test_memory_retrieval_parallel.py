@@ -0,0 +1,114 @@
+"""Tests für die parallele Hybrid-Suche mit Deadlines pro Quelle (RetrievalService)."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.memory_platform.config import get_config
+from app.memory_platform.models import SearchQuery
+from app.memory_platform.retrieval import RetrievalService
+
+
+class _FakeGraph:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.member_fact_calls = 0
+
+    async def get_member_facts(self, tenant_id, member_id, fact_types=None, limit=50):
+        self.member_fact_calls += 1
+        await asyncio.sleep(self.delay)
+        return [
+            {"fact_id": f"f{i}", "fact_type": "preference", "subject": "member",
+             "predicate": "mag", "value": f"kurs {i}", "confidence": 0.9 - i * 0.01}
+            for i in range(min(limit, 60))
+        ]
+
+    async def query_nodes(self, label, filters, limit=100):
+        await asyncio.sleep(self.delay)
+        return [{"name": "Yoga", "entity_type": "topic"}]
+
+    async def fulltext_search(self, tenant_id, query_text, limit=10):
+        await asyncio.sleep(self.delay)
+        return [{"fact_id": "k1", "subject": "studio", "predicate": "bietet", "value": "yoga", "_score": 2.0}]
+
+
+class _FakeVector:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    async def search(self, tenant_id, query, top_k=10, namespace="knowledge", filters=None):
+        await asyncio.sleep(self.delay)
+        return [{"content": f"{namespace} treffer", "score": 0.8, "metadata": {"document_id": "d1"}}]
+
+
+@pytest.fixture
+def retrieval_cfg():
+    cfg = get_config().retrieval
+    saved = (cfg.vector_timeout_ms, cfg.graph_timeout_ms, cfg.keyword_timeout_ms, cfg.enable_reranking)
+    cfg.enable_reranking = False
+    yield cfg
+    cfg.vector_timeout_ms, cfg.graph_timeout_ms, cfg.keyword_timeout_ms, cfg.enable_reranking = saved
+
+
+def _service(graph, vector) -> RetrievalService:
+    service = RetrievalService()
+    service._graph = graph
+    service._vector = vector
+    return service
+
+
+async def test_sources_run_concurrently_and_share_member_facts(retrieval_cfg):
+    graph, vector = _FakeGraph(delay=0.1), _FakeVector(delay=0.1)
+    service = _service(graph, vector)
+
+    started = time.perf_counter()
+    response = await service.search(SearchQuery(query="yoga", tenant_id=1, member_id="m1", top_k=5))
+    elapsed = time.perf_counter() - started
+
+    # vector (2 namespaces), member facts and keyword overlap: ~1 delay, not 4
+    assert elapsed < 0.3
+    assert graph.member_fact_calls == 1
+    assert len(response.facts) == 50
+    assert sum(1 for r in response.results if r.source == "graph") <= 5
+    assert set(response.source_latency_ms) == {"vector", "graph", "keyword"}
+    assert all(v >= 90 for v in response.source_latency_ms.values())
+    assert response.degraded_sources == []
+
+
+async def test_slow_source_is_dropped_after_deadline(retrieval_cfg):
+    retrieval_cfg.vector_timeout_ms = 50
+    service = _service(_FakeGraph(), _FakeVector(delay=1.0))
+
+    started = time.perf_counter()
+    response = await service.search(SearchQuery(query="yoga", tenant_id=1, top_k=5))
+
+    assert time.perf_counter() - started < 0.5
+    assert response.degraded_sources == ["vector"]
+    assert {r.source for r in response.results} == {"graph", "fulltext"}
+    assert response.source_latency_ms["vector"] < 500
+
+
+async def test_failing_source_degrades_without_raising(retrieval_cfg):
+    class _BrokenGraph(_FakeGraph):
+        async def get_member_facts(self, *args, **kwargs):
+            raise RuntimeError("neo4j down")
+
+    service = _service(_BrokenGraph(), _FakeVector())
+    response = await service.search(SearchQuery(query="yoga", tenant_id=1, member_id="m1"))
+
+    assert response.degraded_sources == ["graph"]
+    assert response.facts == []
+    assert any(r.result_type == "knowledge" for r in response.results)
+
+
+async def test_vector_only_query_skips_graph_sources(retrieval_cfg):
+    graph = _FakeGraph()
+    service = _service(graph, _FakeVector())
+    response = await service.search(SearchQuery(
+        query="yoga", tenant_id=1, search_type="vector", include_facts=False,
+    ))
+
+    assert set(response.source_latency_ms) == {"vector"}
+    assert [r.result_type for r in response.results] == ["knowledge"]
+    assert graph.member_fact_calls == 0
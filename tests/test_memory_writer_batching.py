@@ -0,0 +1,166 @@
+"""Tests für gebündelte Graph-Writes (UNWIND) im MemoryWriterService."""
+
+from unittest.mock import AsyncMock
+
+from app.memory_platform.models import (
+    EnrichmentResult,
+    ExtractedEntity,
+    ExtractedFact,
+    ExtractedRelationship,
+    FactType,
+)
+from app.memory_platform.models.graph_store import GraphStore, GraphWriteBatch
+from app.memory_platform.writer import MemoryWriterService
+
+
+class _FakeResult:
+    async def consume(self):
+        return None
+
+
+class _FakeTx:
+    def __init__(self, log):
+        self.log = log
+
+    async def run(self, query, params):
+        self.log.append((query, params))
+        return _FakeResult()
+
+
+class _FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def __aenter__(self):
+        self.driver.sessions += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_write(self, fn):
+        self.driver.transactions += 1
+        return await fn(_FakeTx(self.driver.queries))
+
+    async def run(self, query, params=None):
+        self.driver.queries.append((query, params))
+        return _FakeResult()
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.sessions = 0
+        self.transactions = 0
+        self.queries: list[tuple[str, dict]] = []
+
+    def session(self, database=None):
+        return _FakeSession(self)
+
+
+def _event(n_facts: int = 200) -> EnrichmentResult:
+    return EnrichmentResult(
+        tenant_id=7,
+        entities=[
+            ExtractedEntity(entity_id="e1", name="Yoga", entity_type="topic"),
+            ExtractedEntity(entity_id="e2", name="Anna", entity_type="person"),
+        ],
+        facts=[
+            ExtractedFact(
+                fact_id=f"f{i}", fact_type=FactType.PREFERENCE, subject="member",
+                predicate="mag", value=f"kurs {i}", confidence=0.8,
+                member_id=f"m{i % 3}",
+            )
+            for i in range(n_facts)
+        ],
+        relationships=[
+            ExtractedRelationship(source_entity="Anna", target_entity="Yoga", relationship_type="likes to; DROP"),
+        ],
+        metadata={"document_id": "doc-1", "source_type": "file_upload"},
+    )
+
+
+def _writer(graph: GraphStore) -> MemoryWriterService:
+    writer = MemoryWriterService()
+    writer._graph = graph
+    writer._vector = AsyncMock()
+    writer._event_bus = AsyncMock()
+    return writer
+
+
+async def test_enrichment_event_is_one_neo4j_transaction():
+    graph = GraphStore()
+    graph._driver = _FakeDriver()
+    graph._initialised = True
+    writer = _writer(graph)
+
+    await writer._handle_enrichment_event(_event(200))
+
+    driver = graph._driver
+    assert driver.sessions == 1
+    assert driver.transactions == 1
+    # Tenant, Entity, Fact, Member, Document nodes + 4 relationship groups
+    assert len(driver.queries) == 9
+    assert all(q.startswith("UNWIND $rows AS row") for q, _ in driver.queries)
+    rows_by_query = {q: p["rows"] for q, p in driver.queries}
+    fact_rows = next(r for q, r in rows_by_query.items() if "MERGE (n:Fact" in q)
+    assert len(fact_rows) == 200
+    member_rows = next(r for q, r in rows_by_query.items() if "MERGE (n:Member" in q)
+    assert sorted(r["member_id"] for r in member_rows) == ["m0", "m1", "m2"]
+    # LLM-provided relationship types are sanitised before interpolation
+    assert any("[r:LIKES_TO__DROP]" in q for q in rows_by_query)
+
+    writer._vector.upsert.assert_awaited_once()
+    assert len(writer._vector.upsert.await_args.kwargs["ids"]) == 200
+    writer._event_bus.publish.assert_awaited_once()
+
+
+async def test_enrichment_event_in_memory_matches_single_writes():
+    graph = GraphStore()
+    graph._in_memory = True
+    graph._initialised = True
+    writer = _writer(graph)
+
+    await writer._handle_enrichment_event(_event(10))
+
+    facts = await graph.get_member_facts(7, "m1")
+    assert sorted(f["fact_id"] for f in facts) == ["f1", "f4", "f7"]
+    members = await graph.get_related_nodes("Fact", "fact_id", "f1", rel_type="APPLIES_TO")
+    assert [m["member_id"] for m in members] == ["m1"]
+    tenant_links = await graph.get_related_nodes("Tenant", "tenant_id", "7", rel_type="BELONGS_TO", direction="in")
+    assert len(tenant_links) == 12  # 10 facts + 2 entities
+    liked = await graph.get_related_nodes("Entity", "entity_id", "e2", rel_type="LIKES_TO__DROP")
+    assert [e["name"] for e in liked] == ["Yoga"]
+    assert await graph.get_node("Document", "document_id", "doc-1") is not None
+
+
+async def test_bulk_helpers_merge_duplicate_rows():
+    graph = GraphStore()
+    graph._in_memory = True
+    written = await graph.upsert_nodes_bulk("Member", "member_id", [
+        {"member_id": "m1", "tenant_id": 1, "name": "A"},
+        {"member_id": "m1", "tenant_id": 1, "tier": "gold"},
+        {"member_id": "m2", "tenant_id": 1},
+    ])
+    assert written == 2
+    node = await graph.get_node("Member", "member_id", "m1")
+    assert node["name"] == "A" and node["tier"] == "gold"
+
+    created = await graph.create_relationships_bulk(
+        "Member", "member_id", "Member", "member_id", "KNOWS",
+        [{"source": "m1", "target": "m2", "props": {"since": 2020}}, {"source": "m1", "target": "missing"}],
+    )
+    assert created == 1
+
+
+async def test_write_batch_failure_reports_zero_counts():
+    class _BrokenDriver(_FakeDriver):
+        def session(self, database=None):
+            raise RuntimeError("neo4j down")
+
+    graph = GraphStore()
+    graph._driver = _BrokenDriver()
+    batch = GraphWriteBatch()
+    batch.add_node("Fact", "fact_id", "f1", {"tenant_id": 1})
+
+    assert await graph.write_batch(batch) == {"nodes": 0, "relationships": 0}
+    assert await graph.write_batch(GraphWriteBatch()) == {"nodes": 0, "relationships": 0}
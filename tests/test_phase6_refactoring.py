@@ -377,51 +377,51 @@ class TestInterventionEngine:
     def test_inject_message(self):
         from app.platform.ghost_mode_v2 import InterventionEngine
         engine = InterventionEngine()
-        record = engine.inject_message(
+        record = run_async(engine.inject_message(
             tenant_id=1, conversation_id="conv-1",
             admin_user_id=1, admin_email="admin@test.de",
             content="Hier ist die Antwort...",
-        )
+        ))
         assert record.intervention_id
         assert record.content == "Hier ist die Antwort..."
 
     def test_takeover_and_release(self):
         from app.platform.ghost_mode_v2 import InterventionEngine, ConversationStatus
         engine = InterventionEngine()
-        engine.takeover(1, "conv-1", 1, "admin@test.de")
-        assert engine.is_taken_over("conv-1")
-        assert engine.is_paused("conv-1")
-        assert engine.get_conversation_status("conv-1") == ConversationStatus.TAKEN_OVER
+        run_async(engine.takeover(1, "conv-1", 1, "admin@test.de"))
+        assert run_async(engine.is_taken_over("conv-1"))
+        assert run_async(engine.is_paused("conv-1"))
+        assert run_async(engine.get_conversation_status("conv-1")) == ConversationStatus.TAKEN_OVER
 
-        engine.release(1, "conv-1", 1, "admin@test.de")
-        assert not engine.is_taken_over("conv-1")
-        assert not engine.is_paused("conv-1")
-        assert engine.get_conversation_status("conv-1") == ConversationStatus.ACTIVE
+        run_async(engine.release(1, "conv-1", 1, "admin@test.de"))
+        assert not run_async(engine.is_taken_over("conv-1"))
+        assert not run_async(engine.is_paused("conv-1"))
+        assert run_async(engine.get_conversation_status("conv-1")) == ConversationStatus.ACTIVE
 
     def test_pause_and_resume(self):
         from app.platform.ghost_mode_v2 import InterventionEngine
         engine = InterventionEngine()
-        engine.pause_agent(1, "conv-2", "admin@test.de")
-        assert engine.is_paused("conv-2")
-        engine.resume_agent(1, "conv-2", "admin@test.de")
-        assert not engine.is_paused("conv-2")
+        run_async(engine.pause_agent(1, "conv-2", "admin@test.de"))
+        assert run_async(engine.is_paused("conv-2"))
+        run_async(engine.resume_agent(1, "conv-2", "admin@test.de"))
+        assert not run_async(engine.is_paused("conv-2"))
 
     def test_force_escalate(self):
         from app.platform.ghost_mode_v2 import InterventionEngine, ConversationStatus
         engine = InterventionEngine()
-        record = engine.force_escalate(1, "conv-3", "admin@test.de", "Kunde sehr verärgert")
+        record = run_async(engine.force_escalate(1, "conv-3", "admin@test.de", "Kunde sehr verärgert"))
         assert record.content == "Kunde sehr verärgert"
-        assert engine.get_conversation_status("conv-3") == ConversationStatus.ESCALATED
+        assert run_async(engine.get_conversation_status("conv-3")) == ConversationStatus.ESCALATED
 
     def test_intervention_history(self):
         from app.platform.ghost_mode_v2 import InterventionEngine
         engine = InterventionEngine()
-        engine.inject_message(1, "conv-1", 1, "admin@test.de", "Msg 1")
-        engine.inject_message(1, "conv-1", 1, "admin@test.de", "Msg 2")
-        engine.inject_message(1, "conv-2", 1, "admin@test.de", "Msg 3")
-        history = engine.get_intervention_history(1)
+        run_async(engine.inject_message(1, "conv-1", 1, "admin@test.de", "Msg 1"))
+        run_async(engine.inject_message(1, "conv-1", 1, "admin@test.de", "Msg 2"))
+        run_async(engine.inject_message(1, "conv-2", 1, "admin@test.de", "Msg 3"))
+        history = run_async(engine.get_intervention_history(1))
         assert len(history) == 3
-        history_conv1 = engine.get_intervention_history(1, conversation_id="conv-1")
+        history_conv1 = run_async(engine.get_intervention_history(1, conversation_id="conv-1"))
         assert len(history_conv1) == 2
 
 
@@ -431,7 +431,7 @@ class TestConversationMonitor:
     def test_record_user_message(self):
         from app.platform.ghost_mode_v2 import ConversationMonitor
         monitor = ConversationMonitor()
-        monitor.record_user_message("conv-1", 1, "Hallo, ich brauche Hilfe")
+        run_async(monitor.record_user_message("conv-1", 1, "Hallo, ich brauche Hilfe"))
         score = monitor.get_score("conv-1")
         assert score is not None
         assert score.user_message_count == 1
@@ -439,23 +439,23 @@ class TestConversationMonitor:
     def test_record_agent_response(self):
         from app.platform.ghost_mode_v2 import ConversationMonitor
         monitor = ConversationMonitor()
-        monitor.record_user_message("conv-1", 1, "Hallo")
+        run_async(monitor.record_user_message("conv-1", 1, "Hallo"))
         time.sleep(0.01)
-        monitor.record_agent_response("conv-1", 1, "Hallo! Wie kann ich helfen?")
+        run_async(monitor.record_agent_response("conv-1", 1, "Hallo! Wie kann ich helfen?"))
         score = monitor.get_score("conv-1")
         assert score.agent_message_count == 1
 
     def test_negative_sentiment_detection(self):
         from app.platform.ghost_mode_v2 import ConversationMonitor
         monitor = ConversationMonitor()
-        monitor.record_user_message("conv-1", 1, "Das ist schlecht und enttäuschend")
+        run_async(monitor.record_user_message("conv-1", 1, "Das ist schlecht und enttäuschend"))
         score = monitor.get_score("conv-1")
         assert score.sentiment_score < 0.5
 
     def test_positive_sentiment_detection(self):
         from app.platform.ghost_mode_v2 import ConversationMonitor
         monitor = ConversationMonitor()
-        monitor.record_user_message("conv-1", 1, "Super, danke, das ist perfekt!")
+        run_async(monitor.record_user_message("conv-1", 1, "Super, danke, das ist perfekt!"))
         score = monitor.get_score("conv-1")
         assert score.sentiment_score > 0.5
 
@@ -464,30 +464,30 @@ class TestConversationMonitor:
         monitor = ConversationMonitor()
         score = monitor.get_or_create_score("conv-1", 1)
         initial_resolution = score.resolution_score
-        monitor.record_tool_call("conv-1", 1)
+        run_async(monitor.record_tool_call("conv-1", 1))
         assert score.resolution_score > initial_resolution
 
     def test_error_triggers_attention(self):
         from app.platform.ghost_mode_v2 import ConversationMonitor
         monitor = ConversationMonitor()
-        monitor.record_error("conv-1", 1)
+        run_async(monitor.record_error("conv-1", 1))
         score = monitor.get_score("conv-1")
         assert score.needs_attention is True
 
     def test_get_active_scores(self):
         from app.platform.ghost_mode_v2 import ConversationMonitor
         monitor = ConversationMonitor()
-        monitor.record_user_message("conv-1", 1, "Hallo")
-        monitor.record_user_message("conv-2", 1, "Hi")
-        monitor.record_user_message("conv-3", 2, "Hey")
-        scores = monitor.get_active_scores(1)
+        run_async(monitor.record_user_message("conv-1", 1, "Hallo"))
+        run_async(monitor.record_user_message("conv-2", 1, "Hi"))
+        run_async(monitor.record_user_message("conv-3", 2, "Hey"))
+        scores = run_async(monitor.get_active_scores(1))
         assert len(scores) == 2
 
     def test_end_conversation(self):
         from app.platform.ghost_mode_v2 import ConversationMonitor
         monitor = ConversationMonitor()
-        monitor.record_user_message("conv-1", 1, "Test")
-        final = monitor.end_conversation("conv-1")
+        run_async(monitor.record_user_message("conv-1", 1, "Test"))
+        final = run_async(monitor.end_conversation("conv-1"))
         assert final is not None
         assert monitor.get_score("conv-1") is None
 
@@ -505,21 +505,21 @@ class TestGhostModeV2:
     def test_should_agent_respond_default(self):
         from app.platform.ghost_mode_v2 import GhostModeV2
         gm = GhostModeV2()
-        assert gm.should_agent_respond("conv-1") is True
+        assert run_async(gm.should_agent_respond("conv-1")) is True
 
     def test_should_agent_respond_after_takeover(self):
         from app.platform.ghost_mode_v2 import GhostModeV2
         gm = GhostModeV2()
-        gm.intervention.takeover(1, "conv-1", 1, "admin@test.de")
-        assert gm.should_agent_respond("conv-1") is False
-        gm.intervention.release(1, "conv-1", 1, "admin@test.de")
-        assert gm.should_agent_respond("conv-1") is True
+        run_async(gm.intervention.takeover(1, "conv-1", 1, "admin@test.de"))
+        assert run_async(gm.should_agent_respond("conv-1")) is False
+        run_async(gm.intervention.release(1, "conv-1", 1, "admin@test.de"))
+        assert run_async(gm.should_agent_respond("conv-1")) is True
 
     def test_dashboard_state(self):
         from app.platform.ghost_mode_v2 import GhostModeV2
         gm = GhostModeV2()
-        gm.monitor.record_user_message("conv-1", 1, "Hallo")
-        state = gm.get_dashboard_state(1)
+        run_async(gm.monitor.record_user_message("conv-1", 1, "Hallo"))
+        state = run_async(gm.get_dashboard_state(1))
         assert "active_conversations" in state
         assert "attention_needed" in state
         assert "knowledge_gaps" in state
@@ -560,8 +560,11 @@ class TestGhostModeV2:
         async def listener(event):
             received_events.append(event)
 
-        gm.register_listener(1, listener)
-        run_async(gm.on_user_message(1, "conv-1", "user-1", "Test"))
+        async def scenario():
+            await gm.register_listener(1, listener)
+            await gm.on_user_message(1, "conv-1", "user-1", "Test")
+
+        run_async(scenario())
         assert len(received_events) >= 1
         assert received_events[0]["type"] == "ghost.message_in"
 
@@ -0,0 +1,156 @@
+"""Tests für den lokalen Stripe-Spiegel der Umsatz-Analytics (app/billing/stripe_mirror.py).
+
+Aufgezeichnete Stripe-Events laufen durch den Webhook-Prozessor; die
+SQL-Aggregate des Spiegels müssen dem entsprechen, was das Dashboard
+bisher aus der Stripe-API berechnet hat.
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+import stripe
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import app.billing.models  # noqa: F401  (registers the billing tables)
+import app.core.models  # noqa: F401
+from app.billing.models import StripeSubscriptionMirror, StripeSyncCursor
+from app.billing.stripe_mirror import INVOICES, SUBSCRIPTIONS, stripe_mirror
+from app.billing.webhook_processor import webhook_processor
+from app.core.db import Base
+
+EVENTS = json.loads((Path(__file__).parent / "fixtures" / "stripe_events.json").read_text())
+NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+SINCE = [datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 12, 1, tzinfo=timezone.utc), datetime(2026, 2, 1, tzinfo=timezone.utc)]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _stripe_state() -> dict[str, list[dict]]:
+    """Latest version of every object, i.e. what the Stripe API lists today."""
+    latest: dict[str, dict] = {}
+    for event in sorted(EVENTS, key=lambda e: e["created"]):
+        obj = event["data"]["object"]
+        latest[obj["id"]] = obj
+    return {
+        SUBSCRIPTIONS: [o for o in latest.values() if o["object"] == "subscription"],
+        INVOICES: [o for o in latest.values() if o["object"] == "invoice"],
+    }
+
+
+# ── Reference: the per-request computation the dashboard used before ──
+
+def _reference_mrr(subs) -> tuple[int, int]:
+    mrr = paying = 0
+    for s in subs:
+        if s["status"] != "active":
+            continue
+        for item in s.get("items", {}).get("data", []):
+            price = item.get("price", {})
+            amount = price.get("unit_amount", 0)
+            mrr += amount // 12 if price.get("recurring", {}).get("interval", "month") == "year" else amount
+        paying += 1
+    return mrr, paying
+
+
+def _paid(invoices, since: datetime):
+    return [i for i in invoices if i["status"] == "paid" and i["created"] >= int(since.timestamp())]
+
+
+def _reference_monthly(invoices, since: datetime) -> dict[str, int]:
+    monthly: dict[str, int] = {}
+    for inv in _paid(invoices, since):
+        dt = datetime.fromtimestamp(inv.get("status_transitions", {}).get("paid_at") or inv["created"], tz=timezone.utc)
+        key = f"{dt.year}-{dt.month:02d}"
+        monthly[key] = monthly.get(key, 0) + inv["amount_paid"]
+    return monthly
+
+
+def _reference_by_customer(invoices, since: datetime) -> dict[str, int]:
+    totals: dict[str, int] = {}
+    for inv in _paid(invoices, since):
+        totals[inv["customer"]] = totals.get(inv["customer"], 0) + inv["amount_paid"]
+    return totals
+
+
+def _assert_matches_stripe(db: Session) -> None:
+    state = _stripe_state()
+    assert stripe_mirror.mrr(db) == _reference_mrr(state[SUBSCRIPTIONS])
+    for since in SINCE:
+        assert stripe_mirror.paid_revenue_cents(db, since) == sum(i["amount_paid"] for i in _paid(state[INVOICES], since))
+        assert stripe_mirror.paid_revenue_by_month(db, since) == _reference_monthly(state[INVOICES], since)
+        assert stripe_mirror.paid_revenue_by_customer(db, since) == _reference_by_customer(state[INVOICES], since)
+
+
+async def test_webhook_events_keep_mirror_in_line_with_stripe(db):
+    for event in EVENTS:
+        await webhook_processor.process_event(db, json.loads(json.dumps(event)))
+
+    _assert_matches_stripe(db)
+    # Webhook rows alone are not a complete mirror
+    assert not stripe_mirror.backfill_completed(db)
+    # Yearly plan counts 1/12; the late "active" update does not revive sub_C
+    assert stripe_mirror.mrr(db) == (4900 + 99000 // 12, 2)
+    assert db.query(StripeSubscriptionMirror).filter_by(stripe_subscription_id="sub_C").one().status == "canceled"
+    # Customers without a local subscription count too; the replayed "open" state is ignored
+    assert stripe_mirror.paid_revenue_by_customer(db, SINCE[0]) == {"cus_A": 4 * 4900, "cus_B": 99000, "cus_C": 2900}
+
+
+class FakeStripeList:
+    """Stripe list endpoint: newest first, paged with ``starting_after``."""
+
+    def __init__(self, objects):
+        self.objects = sorted(objects, key=lambda o: (-o["created"], o["id"]))
+        self.calls = []
+
+    def list(self, limit, starting_after=None, **params):
+        self.calls.append({"starting_after": starting_after, **params})
+        objects = self.objects
+        if "created" in params:
+            objects = [o for o in objects if o["created"] >= params["created"]["gte"]]
+        start = [o["id"] for o in objects].index(starting_after) + 1 if starting_after else 0
+        page = {"object": "list", "data": objects[start:start + limit], "has_more": start + limit < len(objects)}
+        return stripe.StripeObject.construct_from(page, "sk_test")
+
+
+class FakeStripe:
+    def __init__(self):
+        state = _stripe_state()
+        self.Subscription = FakeStripeList(state[SUBSCRIPTIONS])
+        self.Invoice = FakeStripeList(state[INVOICES])
+
+
+async def test_reconciliation_backfills_from_cursor(db):
+    fake = FakeStripe()
+
+    # Interrupted after one page per resource: the cursor remembers where it stopped
+    assert stripe_mirror.reconcile(db, fake, now=NOW, page_size=2, max_pages=1) == {SUBSCRIPTIONS: 2, INVOICES: 2}
+    cursor = db.get(StripeSyncCursor, INVOICES)
+    assert cursor.starting_after == fake.Invoice.objects[1]["id"]
+    assert cursor.last_completed_at is None
+    assert not stripe_mirror.backfill_completed(db)
+
+    stripe_mirror.reconcile(db, fake, now=NOW, page_size=2)
+    assert stripe_mirror.backfill_completed(db)
+    assert fake.Invoice.calls[1]["starting_after"] == fake.Invoice.objects[1]["id"]
+    assert cursor.starting_after is None and cursor.last_completed_at is not None
+    _assert_matches_stripe(db)
+
+    # Later passes only re-read the lookback window
+    stripe_mirror.reconcile(db, fake, now=NOW, page_size=50)
+    backfill_since, lookback_since = fake.Invoice.calls[0]["created"]["gte"], fake.Invoice.calls[-1]["created"]["gte"]
+    assert (lookback_since - backfill_since) // 86400 == 400 - 45
+    _assert_matches_stripe(db)
+
+    # A stale webhook arriving after reconciliation does not win
+    late = next(e for e in EVENTS if e["id"] == "evt_9")
+    await webhook_processor.process_event(db, json.loads(json.dumps(late)))
+    assert db.query(StripeSubscriptionMirror).filter_by(stripe_subscription_id="sub_C").one().status == "canceled"
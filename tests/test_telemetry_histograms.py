@@ -0,0 +1,99 @@
+"""Tests für die Histogramme und Sharded Counter des MetricsCollector (app/core/telemetry.py)."""
+
+import random
+import threading
+
+import pytest
+
+from app.core.telemetry import DDSketch, MetricsCollector
+
+
+def test_sketch_quantiles_stay_within_relative_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3, 1.5) for _ in range(50_000)]
+    sketch = DDSketch(relative_accuracy=0.01)
+    for v in values:
+        sketch.add(v)
+
+    ordered = sorted(values)
+    for q in (0.5, 0.9, 0.95, 0.99):
+        exact = ordered[int(q * len(ordered))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+    assert len(sketch) < 1000
+
+
+def test_sketch_merge_matches_single_sketch():
+    rng = random.Random(1)
+    values = [rng.uniform(-50, 500) for _ in range(10_000)] + [0.0] * 100
+    whole, left, right = DDSketch(), DDSketch(), DDSketch()
+    for i, v in enumerate(values):
+        whole.add(v)
+        (left if i % 2 else right).add(v)
+    left.merge(right)
+
+    assert left.count == whole.count
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        assert left.quantile(q) == whole.quantile(q)
+
+
+def test_sketch_memory_is_bounded():
+    sketch = DDSketch(relative_accuracy=0.001, max_bins=64)
+    for i in range(1, 100_000):
+        sketch.add(i * 1.5)
+    assert len(sketch) <= 64
+    assert sketch.count == 99_999
+    assert sketch.quantile(0.99) == pytest.approx(148_500, rel=0.001)
+
+
+def test_prometheus_histogram_exposition():
+    m = MetricsCollector()
+    for v in (3, 7, 40, 40, 800, 20_000):
+        m.observe("http_request_duration_ms", v, labels={"path": '/a"b', "method": "GET"})
+    m.observe("queue_wait_seconds", 0.2)
+
+    out = m.to_prometheus()
+
+    assert out.count("# TYPE http_request_duration_ms histogram") == 1
+    series = 'method="GET",path="/a\\"b"'
+    assert f'http_request_duration_ms_bucket{{{series},le="5.0"}} 1' in out
+    assert f'http_request_duration_ms_bucket{{{series},le="50.0"}} 4' in out
+    assert f'http_request_duration_ms_bucket{{{series},le="10000.0"}} 5' in out
+    assert f'http_request_duration_ms_bucket{{{series},le="+Inf"}} 6' in out
+    assert f"http_request_duration_ms_sum{{{series}}} 20890.0" in out
+    assert f"http_request_duration_ms_count{{{series}}} 6" in out
+    # Unlabelled series in seconds get the default seconds buckets
+    assert 'queue_wait_seconds_bucket{le="0.25"} 1' in out
+    assert 'queue_wait_seconds_bucket{le="0.1"} 0' in out
+
+
+def test_large_series_use_sketch_with_exact_min_max():
+    m = MetricsCollector(exact_sample_limit=16)
+    for v in range(1, 100_001):
+        m.observe("latency_ms", float(v))
+
+    snap = m.get_histogram("latency_ms")
+    assert snap.exact is None
+    assert snap.count == 100_000 and snap.min == 1 and snap.max == 100_000
+    assert snap.quantile(0.99) == pytest.approx(99_001, rel=0.01)
+    assert sum(snap.buckets) == 100_000
+
+
+def test_counters_and_histograms_are_exact_across_threads():
+    m = MetricsCollector()
+
+    def _work():
+        for _ in range(10_000):
+            m.increment("jobs_total", labels={"kind": "x"})
+            m.observe("job_ms", 12.0)
+
+    threads = [threading.Thread(target=_work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Finished threads are folded into the retired shard without losing data
+    assert m.get_counter("jobs_total", labels={"kind": "x"}) == 80_000
+    assert m.get_histogram_stats("job_ms")["count"] == 80_000
+    assert len(m._shards) <= 1
+    assert 'jobs_total{kind="x"} 80000.0' in m.to_prometheus()
@@ -0,0 +1,204 @@
+"""Tests für den persistenten RTSP-Reader und das gebündelte Multi-Kamera-Zählen.
+
+Synthetische Frames (numpy-Arrays) ersetzen OpenCV; der Prozessor läuft
+im Stub-Modus bzw. zeichnet die Batch-Größen auf.
+"""
+
+import time
+
+import numpy as np
+
+from app.vision.privacy import PrivacyEngine
+from app.vision.processor import VisionProcessor
+from app.vision.rtsp import RTSPConnector, RTSPFrameReader, StubFrameReader
+from app.vision.scheduler import CameraConfig, CameraScheduler
+
+
+class SyntheticCapture:
+    """cv2.VideoCapture stand-in producing numbered frames."""
+
+    def __init__(self, frames: int = 10_000, opened: bool = True, fps: float = 500.0) -> None:
+        self.remaining = frames
+        self.opened = opened
+        self.delay = 1 / fps
+        self.index = 0
+        self.released = False
+
+    def isOpened(self) -> bool:
+        return self.opened
+
+    def read(self):
+        if self.remaining <= 0:
+            return False, None
+        time.sleep(self.delay)
+        self.remaining -= 1
+        self.index += 1
+        return True, np.full((4, 4, 3), self.index % 256, dtype=np.uint8)
+
+    def release(self) -> None:
+        self.released = True
+
+
+def _wait(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_reader_opens_once_and_keeps_only_latest_frame():
+    opened = []
+
+    def factory():
+        opened.append(SyntheticCapture())
+        return opened[-1]
+
+    reader = RTSPFrameReader("synthetic", capture_factory=factory).start()
+    try:
+        assert _wait(lambda: reader.frames_decoded >= 20)
+        first = reader.wait_frame(timeout=1)
+        second = reader.wait_frame(timeout=1)
+        assert first is not None and second is not None
+        assert second[0, 0, 0] != first[0, 0, 0]
+        assert len(opened) == 1 and reader.reconnects == 0
+    finally:
+        reader.stop()
+    assert opened[0].released
+    assert reader.take() is None  # nothing retained after stop
+
+
+def test_reader_reconnects_with_backoff():
+    attempts = []
+
+    def factory():
+        attempts.append(time.monotonic())
+        # Two failed opens, then a stream that ends after a few frames, then a good one
+        if len(attempts) <= 2:
+            return SyntheticCapture(opened=False)
+        if len(attempts) == 3:
+            return SyntheticCapture(frames=3)
+        return SyntheticCapture()
+
+    reader = RTSPFrameReader("flaky", capture_factory=factory, backoff_min=0.02, backoff_max=0.05).start()
+    try:
+        assert _wait(lambda: len(attempts) >= 4 and reader.connected)
+        assert reader.wait_frame(timeout=1) is not None
+    finally:
+        reader.stop()
+    assert reader.reconnects >= 3
+    # Backoff grows between the failed attempts
+    assert attempts[1] - attempts[0] >= 0.02
+    assert attempts[2] - attempts[1] >= 0.04
+
+
+def test_take_drops_stale_frames():
+    reader = RTSPFrameReader("synthetic", capture_factory=lambda: SyntheticCapture(frames=1)).start()
+    try:
+        assert _wait(lambda: reader.frames_decoded == 1)
+        time.sleep(0.05)
+        assert reader.take(max_age=0.01) is None
+    finally:
+        reader.stop()
+
+
+class RecordingProcessor(VisionProcessor):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[list] = []
+
+    def process_batch(self, frames):
+        self.batches.append(list(frames))
+        return super().process_batch(frames)
+
+
+class FixedReader:
+    """Reader with a fresh synthetic frame on every take."""
+
+    def __init__(self) -> None:
+        self.taken = 0
+        self.stopped = False
+
+    def start(self):
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self.stopped = True
+
+    def take(self, max_age=None):
+        self.taken += 1
+        return np.zeros((2, 2, 3), dtype=np.uint8)
+
+
+def test_scheduler_batches_due_cameras_at_their_rates():
+    processor = RecordingProcessor()
+    privacy = PrivacyEngine(processor, RTSPConnector())
+    readers: dict[str, FixedReader] = {}
+
+    def reader_factory(config):
+        readers[config.camera_id] = FixedReader()
+        return readers[config.camera_id]
+
+    clock = [100.0]
+    scheduler = CameraScheduler(privacy, max_batch=4, reader_factory=reader_factory, clock=lambda: clock[0])
+    for i in range(5):
+        scheduler.add_camera(CameraConfig(camera_id=f"cam{i}", interval_seconds=10 if i < 3 else 30))
+
+    results = scheduler.tick()
+    assert sorted(results) == [f"cam{i}" for i in range(5)]
+    assert [len(b) for b in processor.batches] == [4, 1]
+    assert all(r.source == "stub" for r in results.values())
+    assert scheduler.latest("cam4").total_count == 3
+
+    clock[0] = 105.0
+    assert scheduler.tick() == {}
+    assert scheduler.seconds_until_due() == 5.0
+
+    clock[0] = 110.0
+    assert sorted(scheduler.tick()) == ["cam0", "cam1", "cam2"]
+    assert [len(b) for b in processor.batches] == [4, 1, 3]
+    assert readers["cam4"].taken == 1
+
+    # Retention: every frame was audited as discarded, none is kept
+    audit = privacy.get_audit_log()
+    assert len(audit) == 8 and all(e["frame_discarded"] for e in audit)
+    assert all(e["frame_size_bytes"] == 12 for e in audit)
+
+    scheduler.close()
+    assert all(r.stopped for r in readers.values()) and scheduler.camera_ids == []
+
+
+def test_scheduler_skips_cameras_without_frames():
+    class DeadReader(FixedReader):
+        def take(self, max_age=None):
+            return None
+
+    processor = RecordingProcessor()
+    scheduler = CameraScheduler(
+        PrivacyEngine(processor, RTSPConnector()), reader_factory=lambda c: DeadReader(), clock=lambda: 0.0,
+    )
+    scheduler.add_camera(CameraConfig(camera_id="dead", interval_seconds=5))
+    assert scheduler.tick() == {}
+    assert processor.batches == []
+    assert scheduler.seconds_until_due() == 5.0
+
+
+def test_batch_failure_returns_error_results_and_clears_frames():
+    class BrokenProcessor(VisionProcessor):
+        def process_batch(self, frames):
+            raise RuntimeError("gpu gone")
+
+    privacy = PrivacyEngine(BrokenProcessor(), RTSPConnector())
+    frames = {"a": b"x", "b": b"y"}
+    results = privacy.safe_process_batch(frames)
+    assert {r.source for r in results.values()} == {"error"}
+    assert frames == {}
+
+
+def test_stub_connector_uses_stub_reader():
+    reader = RTSPConnector().reader()
+    assert isinstance(reader, StubFrameReader)
+    frame = reader.start().take()
+    assert frame[:2] == b"\xff\xd8"
+    assert VisionProcessor().process_batch([frame, frame])[1].source == "stub"
@@ -17,21 +17,18 @@ async def test_process_voice_message_success():
         mock_stt_instance.transcribe.return_value = ("Hello World", "de")
         mock_get_stt.return_value = mock_stt_instance
 
-        # Mock file operations to avoid actual I/O
-        with patch("builtins.open", new_callable=MagicMock):
-            with patch("os.remove") as mock_remove:
-                with patch("os.path.exists", return_value=True):
+        # Execute — returns dict {"text": ..., "language": ...}
+        result = await process_voice_message("file_123", bot)
 
-                    # Execute — returns dict {"text": ..., "language": ...}
-                    result = await process_voice_message("file_123", bot)
-
-                    # Verify
-                    assert result["text"] == "Hello World"
-                    assert result["language"] == "de"
-                    bot.get_file.assert_called_once_with("file_123")
-                    bot.download_file.assert_called_once_with("voice/test.ogg")
-                    mock_stt_instance.transcribe.assert_called_once()
-                    mock_remove.assert_called_once()  # Cleanup
+        # Verify
+        assert result["text"] == "Hello World"
+        assert result["language"] == "de"
+        bot.get_file.assert_called_once_with("file_123")
+        bot.download_file.assert_called_once_with("voice/test.ogg")
+        mock_stt_instance.transcribe.assert_called_once()
+        # Transcribed from memory, no temp file
+        (audio,), _ = mock_stt_instance.transcribe.call_args
+        assert audio.read() == b"fake_audio_content"
 
 @pytest.mark.asyncio
 async def test_process_voice_message_file_not_found():
@@ -0,0 +1,167 @@
+"""Tests für die nicht-blockierende Voice-Pipeline (app/voice/pipeline.py).
+
+STT/TTS laufen auf dem Voice-Worker-Pool; die Stubs schlafen künstlich,
+damit sich Blockieren des Event-Loops und Überlappung messen lassen.
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.voice.pipeline import VoicePipeline, speak_sentences, split_sentences
+from app.voice.stt import SpeechToText, TranscriptResult
+from app.voice.tts import TextToSpeech, TTSDiskCache
+from app.voice.workers import VoiceWorkerPool
+
+DELAY = 0.15
+
+
+class SlowSTT(SpeechToText):
+    def transcribe(self, audio_data: bytes) -> TranscriptResult:
+        time.sleep(DELAY)
+        return TranscriptResult(
+            text="Wie sind die Öffnungszeiten?", language="de", confidence=0.9, duration_ms=150, source="stub",
+        )
+
+
+class SlowTTS(TextToSpeech):
+    def __init__(self) -> None:
+        self.log: list[tuple[str, str, float]] = []
+
+    def synthesize_pcm(self, text: str, voice_id: str = "stub") -> tuple[bytes, int]:
+        self.log.append(("synth_start", text, time.perf_counter()))
+        time.sleep(DELAY)
+        self.log.append(("synth_end", text, time.perf_counter()))
+        return text.encode(), self.sample_rate
+
+
+class RecordingEncoder:
+    """Fake Opus encoder: feeding takes as long as synthesizing."""
+
+    def __init__(self, log: list, sample_rate: int) -> None:
+        self.log = log
+        self.sample_rate = sample_rate
+        self.fed: list[bytes] = []
+        self.aborted = False
+
+    def feed(self, pcm: bytes) -> None:
+        self.log.append(("feed_start", pcm.decode(), time.perf_counter()))
+        time.sleep(DELAY)
+        self.fed.append(pcm)
+        self.log.append(("feed_end", pcm.decode(), time.perf_counter()))
+
+    def close(self) -> bytes:
+        return b"|".join(self.fed)
+
+    def abort(self) -> None:
+        self.aborted = True
+
+
+@pytest.fixture
+def pool():
+    pool = VoiceWorkerPool(workers=2, max_pending=8)
+    yield pool
+    pool.shutdown()
+
+
+async def _max_loop_lag(coro) -> tuple[object, float]:
+    """Run *coro* while a ticker measures how long the loop was unavailable."""
+    lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal lag
+        while not done:
+            t = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag = max(lag, time.perf_counter() - t - 0.01)
+
+    task = asyncio.create_task(ticker())
+    try:
+        result = await coro
+    finally:
+        done = True
+        await task
+    return result, lag
+
+
+async def test_pipeline_keeps_event_loop_responsive(pool):
+    pipeline = VoicePipeline(stt=SlowSTT(), tts=SlowTTS(), pool=pool)
+    response = "Wir haben Montag bis Freitag geöffnet. Am Wochenende ab neun Uhr."
+
+    async def answer(_: str) -> str:
+        return response
+
+    result, lag = await _max_loop_lag(pipeline.process(b"ogg", process_fn=answer))
+
+    assert result.transcript.text == "Wie sind die Öffnungszeiten?"
+    assert result.speech.audio_data[:4] == b"RIFF"
+    assert result.stages["stt"] >= DELAY * 1000 * 0.9
+    assert lag < DELAY / 2
+
+
+async def test_sentences_are_encoded_in_order_while_next_is_synthesized(pool):
+    tts = SlowTTS()
+    encoders: list[RecordingEncoder] = []
+
+    def factory(sample_rate: int) -> RecordingEncoder:
+        encoders.append(RecordingEncoder(tts.log, sample_rate))
+        return encoders[0]
+
+    sentences = ["Eins ist hier.", "Zwei ist dort.", "Drei kommt zuletzt."]
+    audio = await speak_sentences(sentences, tts.synthesize_pcm, factory, pool=pool)
+
+    assert audio == b"|".join(s.encode() for s in sentences)
+    assert len(encoders) == 1 and encoders[0].sample_rate == tts.sample_rate
+
+    at = {(kind, text): t for kind, text, t in tts.log}
+    for current, following in zip(sentences, sentences[1:]):
+        # feeding sentence n overlaps synthesis of sentence n+1
+        assert at[("feed_start", current)] < at[("synth_end", following)]
+        assert at[("synth_start", following)] < at[("feed_end", current)]
+        assert at[("feed_end", current)] <= at[("feed_start", following)]
+
+
+async def test_failed_synthesis_aborts_encoder(pool):
+    tts = SlowTTS()
+    encoders: list[RecordingEncoder] = []
+
+    def synthesize(text: str) -> tuple[bytes, int]:
+        if text.startswith("Zwei"):
+            raise RuntimeError("voice model crashed")
+        return tts.synthesize_pcm(text)
+
+    def factory(sample_rate: int) -> RecordingEncoder:
+        encoders.append(RecordingEncoder(tts.log, sample_rate))
+        return encoders[0]
+
+    with pytest.raises(RuntimeError):
+        await speak_sentences(["Eins.", "Zwei."], synthesize, factory, pool=pool)
+    assert encoders[0].aborted
+
+
+def test_split_sentences():
+    assert split_sentences("Hallo! Wie geht es dir heute? Mir geht es gut.") == [
+        "Hallo! Wie geht es dir heute?",
+        "Mir geht es gut.",
+    ]
+    assert split_sentences("Kurs um 9.30 Uhr. 2. Etage ist offen.") == ["Kurs um 9.30 Uhr.", "2. Etage ist offen."]
+    long = "Erstens, " + "sehr lange Aufzählung " * 20 + "am Ende."
+    parts = split_sentences(long, max_chars=80)
+    assert all(len(p) <= 80 for p in parts)
+    assert " ".join(parts) == " ".join(long.split())
+
+
+def test_tts_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = TTSDiskCache(str(tmp_path), max_bytes=30, max_files=10)
+    for i, name in enumerate(["a.ogg", "b.ogg", "c.ogg"]):
+        cache.put(name, b"x" * 10)
+        os.utime(tmp_path / name, (1000 + i, 1000 + i))
+
+    assert cache.get("a.ogg")  # touching "a" makes "b" the oldest
+    cache.put("d.ogg", b"x" * 10)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.ogg", "c.ogg", "d.ogg"]
+    assert cache.get("b.ogg") is None